@@ -1,8 +1,9 @@
 """Automatically generated __init__.py"""
 __all__ = ['ConfluenceAdapter', 'ContentResolver', 'ContentResolverFactory', 'ContentSourceAdapter', 'DatabaseAdapter',
-           'EnhancedContentResolver', 'FileAdapter', 'JiraAdapter', 'MongoDBAdapter', 'S3Adapter', 'ServiceNowAdapter',
-           'WebAdapter', 'base', 'confluence', 'create_content_resolver', 'database', 'enhanced_content', 'factory',
-           'file', 'jira', 'mongodb', 's3', 'servicenow', 'web']
+           'DocumentSourceCache', 'EnhancedContentResolver', 'FileAdapter', 'JiraAdapter', 'MongoDBAdapter',
+           'S3Adapter', 'ServiceNowAdapter', 'WebAdapter', 'base', 'clear_content_resolvers', 'confluence',
+           'create_content_resolver', 'database', 'enhanced_content', 'factory', 'file', 'jira', 'mongodb', 's3',
+           'servicenow', 'source_cache', 'web']
 
 from . import base
 from . import confluence
@@ -14,6 +15,7 @@ from . import jira
 from . import mongodb
 from . import s3
 from . import servicenow
+from . import source_cache
 from . import web
 from .base import ContentResolver
 from .base import ContentSourceAdapter
@@ -21,10 +23,12 @@ from .confluence import ConfluenceAdapter
 from .database import DatabaseAdapter
 from .enhanced_content import EnhancedContentResolver
 from .factory import ContentResolverFactory
+from .factory import clear_content_resolvers
 from .factory import create_content_resolver
 from .file import FileAdapter
 from .jira import JiraAdapter
 from .mongodb import MongoDBAdapter
 from .s3 import S3Adapter
 from .servicenow import ServiceNowAdapter
+from .source_cache import DocumentSourceCache
 from .web import WebAdapter
@@ -5,7 +5,7 @@ This module defines the abstract base class for all content source adapters.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 
 class ContentSourceAdapter(ABC):
@@ -159,6 +159,9 @@ This module defines the abstract base class for all content resolvers.
 class ContentResolver(ABC):
     """Abstract base class for content resolvers."""
 
+    # Set on resolvers shared through create_content_resolver(); their cleanup() does nothing
+    shared = False
+
     @abstractmethod
     def resolve_content(self, content_location: str, text: bool) -> str:
         """
@@ -173,6 +176,22 @@ class ContentResolver(ABC):
         """
         pass
 
+    def resolve_content_batch(self, content_locations: List[str], text: bool = True) -> List[str]:
+        """
+        Resolve several content pointers.
+
+        The default implementation resolves them one at a time; resolvers that can share
+        work between locations of the same source override it.
+
+        Args:
+            content_locations: Content location pointers in JSON format
+            text: if True returns the semantic text representation, else the native content representation
+
+        Returns:
+            Resolved content for each location, in order
+        """
+        return [self.resolve_content(content_location, text) for content_location in content_locations]
+
     @abstractmethod
     def supports_location(self, content_location: str) -> bool:
         """
@@ -222,7 +241,8 @@ class ContentResolver(ABC):
         """
         Clean up resources used by this resolver.
 
-        This should be called when the resolver is no longer needed.
+        This should be called when the resolver is no longer needed. Shared
+        resolvers are only cleaned up by clear_content_resolvers().
         """
         pass
 
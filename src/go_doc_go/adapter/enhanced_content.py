@@ -8,10 +8,13 @@ with document parsers to support a wide variety of content sources and formats.
 import json
 import logging
 import os
-from typing import Dict, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
 
 from .base import ContentResolver
 from .base import ContentSourceAdapter
+from .source_cache import DocumentSourceCache
 from ..document_parser.base import DocumentParser
 from ..document_parser.document_type_detector import DocumentTypeDetector
 
@@ -41,12 +44,27 @@ class EnhancedContentResolver(ContentResolver):
         self.path_mappings = path_mappings or {}
         self.config = config or {}
         self.cache = {}  # Cache for resolved content
+        self._cache_lock = threading.Lock()
 
         # Default cache settings
         self.cache_enabled = self.config.get("cache_enabled", True)
         self.max_cache_size = self.config.get("max_cache_size", 1000)
         self.cache_ttl = self.config.get("cache_ttl", 3600)  # 1 hour in seconds
 
+        # Number of sources resolved in parallel by resolve_content_batch
+        self.resolve_workers = self.config.get("resolve_workers", 4)
+
+        # Shared cache of fetched sources and opened documents, so resolving the
+        # elements of one document fetches and opens it once
+        self.source_cache = None
+        if self.cache_enabled:
+            self.source_cache = DocumentSourceCache(
+                max_bytes=int(self.config.get("source_cache_max_mb", 256) * 1024 * 1024),
+                ttl=self.cache_ttl
+            )
+        for parser in self.parsers.values():
+            parser.document_cache = self.source_cache
+
     def resolve_content(self, content_location: Dict[str, Any] | str, text: bool = True) -> str:
         """
         Resolve content using appropriate adapter and parser.
@@ -55,6 +73,71 @@ class EnhancedContentResolver(ContentResolver):
             content_location: JSON-formatted content location pointer
             text: Returns the semantic text representation if True else the native content representation
 
+        Returns:
+            Resolved content as string
+        """
+        return self._resolve_content(content_location, text, self.source_cache)
+
+    def resolve_content_batch(self, content_locations: List[Dict[str, Any] | str], text: bool = True) -> List[str]:
+        """
+        Resolve several content locations, grouped by source document.
+
+        The locations of one source are resolved one after another, so the source is
+        fetched (and opened) once per batch even when the source cache is disabled;
+        different sources are resolved in parallel.
+
+        Args:
+            content_locations: JSON-formatted content location pointers
+            text: Returns the semantic text representation if True else the native content representation
+
+        Returns:
+            Resolved content for each location, in order
+        """
+        results = [""] * len(content_locations)
+
+        # Group location indexes by their (remapped) source
+        groups: Dict[str, List[int]] = {}
+        parsed = []
+        for index, content_location in enumerate(content_locations):
+            if isinstance(content_location, str) and content_location:
+                content_location = json.loads(content_location)
+            parsed.append(content_location)
+            if content_location:
+                source = self._apply_path_mappings(content_location).get("source", "")
+                groups.setdefault(source, []).append(index)
+
+        # Without a shared source cache, a cache for this batch still fetches each source once
+        source_cache = self.source_cache
+        if source_cache is None:
+            source_cache = DocumentSourceCache(ttl=None)
+
+        def resolve_group(indexes: List[int]) -> None:
+            for index in indexes:
+                results[index] = self._resolve_content(parsed[index], text, source_cache)
+
+        if self.resolve_workers > 1 and len(groups) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.resolve_workers, len(groups)),
+                                    thread_name_prefix='resolve') as executor:
+                # list() re-raises exceptions from the workers
+                list(executor.map(resolve_group, groups.values()))
+        else:
+            for indexes in groups.values():
+                resolve_group(indexes)
+
+        if source_cache is not self.source_cache:
+            source_cache.clear()
+        return results
+
+    def _resolve_content(self, content_location: Dict[str, Any] | str, text: bool,
+                         source_cache: Optional[DocumentSourceCache]) -> str:
+        """
+        Resolve content using appropriate adapter and parser.
+
+        Args:
+            content_location: JSON-formatted content location pointer
+            text: Returns the semantic text representation if True else the native content representation
+            source_cache: Cache used to fetch the source (None to fetch it directly)
+
         Returns:
             Resolved content as string
         """
@@ -68,8 +151,10 @@ class EnhancedContentResolver(ContentResolver):
         # Check cache if enabled
         if self.cache_enabled:
             cache_key = self._get_cache_key(content_location, text)
-            if cache_key in self.cache:
+            try:
                 return self.cache[cache_key]
+            except KeyError:
+                pass
 
         try:
             # Parse location
@@ -96,7 +181,7 @@ class EnhancedContentResolver(ContentResolver):
             element_type = location_data.get("type", "")
             if element_type == "root":
                 # Get content directly from adapter
-                content_info = adapter.get_content(location_data)
+                content_info = self._get_source_content(adapter, source_type, location_data, source_cache)
                 content = content_info.get("content", "")
 
                 # Convert to string if binary
@@ -113,7 +198,7 @@ class EnhancedContentResolver(ContentResolver):
                 return content
 
             # For specific element types, get content and pass to appropriate parser
-            content_info = adapter.get_content(location_data)
+            content_info = self._get_source_content(adapter, source_type, location_data, source_cache)
             content = content_info.get("content", "")
             metadata = content_info.get("metadata", {})
             content_type = DocumentTypeDetector.detect_from_content(content, metadata)
@@ -173,7 +258,7 @@ class EnhancedContentResolver(ContentResolver):
             element_type = location_data.get("type", "")
             if element_type != "root":
                 # Get content type
-                content_info = adapter.get_content(location_data)
+                content_info = self._get_source_content(adapter, source_type, location_data, self.source_cache)
                 content_type = content_info.get("content_type", "")
 
                 # If no content type provided, detect it
@@ -278,21 +363,53 @@ class EnhancedContentResolver(ContentResolver):
             self.clear_cache()
 
     def clear_cache(self) -> None:
-        """Clear the content cache."""
-        self.cache = {}
+        """Clear the content cache and the source cache."""
+        with self._cache_lock:
+            self.cache = {}
+        if self.source_cache is not None:
+            self.source_cache.clear()
 
     def cleanup(self) -> None:
         """
         Clean up resources used by adapters.
 
-        This should be called when the resolver is no longer needed.
+        This should be called when the resolver is no longer needed. Shared
+        resolvers are left intact for their other users; clear_content_resolvers()
+        cleans them up.
         """
+        if self.shared:
+            logger.debug("Skipping cleanup of shared content resolver")
+            return
+
+        if self.source_cache is not None:
+            self.source_cache.clear()
+
         for adapter in self.adapters.values():
             try:
                 adapter.cleanup()
             except Exception as e:
                 logger.warning(f"Error cleaning up adapter: {str(e)}")
 
+    @staticmethod
+    def _get_source_content(adapter: ContentSourceAdapter, source_type: str, location_data: Dict[str, Any],
+                            source_cache: Optional[DocumentSourceCache]) -> Dict[str, Any]:
+        """
+        Get the content of a location's source, reusing a previous fetch of the same source.
+
+        Args:
+            adapter: Adapter serving the source
+            source_type: Source type of the adapter
+            location_data: Location data with path mappings applied
+            source_cache: Cache of fetched sources (None to fetch directly)
+
+        Returns:
+            Content dictionary as returned by the adapter
+        """
+        if source_cache is None:
+            return adapter.get_content(location_data)
+        return source_cache.get_source(source_type, location_data.get("source", ""),
+                                       lambda: adapter.get_content(location_data))
+
     def _apply_path_mappings(self, location_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Apply path mappings to location data.
@@ -354,16 +471,17 @@ class EnhancedContentResolver(ContentResolver):
             key: Cache key
             value: Value to cache
         """
-        # Add to cache
-        self.cache[key] = value
-
-        # Trim cache if it exceeds max size
-        if len(self.cache) > self.max_cache_size:
-            # Simple LRU implementation: remove oldest entries
-            excess = len(self.cache) - self.max_cache_size
-            keys_to_remove = list(self.cache.keys())[:excess]
-            for k in keys_to_remove:
-                del self.cache[k]
+        with self._cache_lock:
+            # Add to cache
+            self.cache[key] = value
+
+            # Trim cache if it exceeds max size
+            if len(self.cache) > self.max_cache_size:
+                # Simple LRU implementation: remove oldest entries
+                excess = len(self.cache) - self.max_cache_size
+                keys_to_remove = list(self.cache.keys())[:excess]
+                for k in keys_to_remove:
+                    self.cache.pop(k, None)
 
     @staticmethod
     def _get_cache_key(content_location: Dict[str, any], text: bool) -> str:
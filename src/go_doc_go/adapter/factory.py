@@ -1,7 +1,9 @@
 """
 Factory for creating content resolvers.
 """
+import json
 import logging
+import threading
 from typing import Dict, Any
 
 from .base import ContentResolver
@@ -30,6 +32,11 @@ from ..document_parser.xml import XmlParser
 
 logger = logging.getLogger(__name__)
 
+# Process-wide resolvers, keyed by their configuration, so the caches of
+# fetched sources and opened documents are shared by all callers
+_resolvers: Dict[str, ContentResolver] = {}
+_resolvers_lock = threading.Lock()
+
 
 class ContentResolverFactory:
     """Factory class for creating content resolvers and their components."""
@@ -181,7 +188,11 @@ class ContentResolverFactory:
 
 def create_content_resolver(config: Config) -> ContentResolver:
     """
-    Create content resolver from configuration.
+    Get the content resolver for a configuration.
+
+    Resolvers are shared within the process: calls with the same content
+    sources, path mappings and resolver settings return the same instance.
+    Its cleanup() does nothing; clear_content_resolvers() releases it.
 
     Args:
         config: Configuration object
@@ -189,4 +200,42 @@ def create_content_resolver(config: Config) -> ContentResolver:
     Returns:
         ContentResolver instance
     """
-    return ContentResolverFactory.create_resolver_from_config(config)
+    key = _resolver_key(config)
+    with _resolvers_lock:
+        resolver = _resolvers.get(key)
+        if resolver is None:
+            resolver = ContentResolverFactory.create_resolver_from_config(config)
+            resolver.shared = True
+            _resolvers[key] = resolver
+    return resolver
+
+
+def clear_content_resolvers() -> None:
+    """Clean up and forget all shared content resolvers."""
+    with _resolvers_lock:
+        resolvers = list(_resolvers.values())
+        _resolvers.clear()
+    for resolver in resolvers:
+        resolver.shared = False
+        try:
+            resolver.cleanup()
+        except Exception as e:
+            logger.warning(f"Error cleaning up content resolver: {str(e)}")
+
+
+def _resolver_key(config: Config) -> str:
+    """
+    Build the key identifying the resolver for a configuration.
+
+    Args:
+        config: Configuration object
+
+    Returns:
+        Key string
+    """
+    settings = {
+        "content_sources": config.config.get('content_sources', []),
+        "path_mappings": config.config.get('path_mappings', {}),
+        "resolver_config": config.config.get('resolver_config', {})
+    }
+    return json.dumps(settings, sort_keys=True, default=str)
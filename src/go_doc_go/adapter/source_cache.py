@@ -0,0 +1,298 @@
+"""
+Document source cache for the content resolver.
+
+Resolving the elements of one document repeatedly needs the same source: the
+adapter fetch returns the whole file or blob, and binary formats (PDF, DOCX,
+PPTX, XLSX) must be opened before a single element can be read. This module
+caches both, bounded by an approximate byte budget:
+
+- fetched sources, keyed by source type and URI, with the file modification
+  time (for local files) or a time-to-live as the freshness check; the content
+  hash is computed once per fetch and stored in the content dictionary
+- opened document handles, keyed by parser and content hash, lent to one
+  user at a time and closed when evicted
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _CachedDocument:
+    """An opened document handle and the lock held while it is lent out."""
+
+    def __init__(self, handle: Any, size: int):
+        self.handle = handle
+        self.size = size
+        # Reentrant, so a thread can acquire a document it already holds (e.g. for a child element)
+        self.lock = threading.RLock()
+        self.loans = 0  # Outstanding acquires, updated under the cache lock
+
+
+class DocumentSourceCache:
+    """Byte-bounded LRU cache of fetched sources and opened document handles."""
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, ttl: Optional[float] = 3600):
+        """
+        Initialize the source cache.
+
+        Args:
+            max_bytes: Approximate size limit for cached sources and documents
+            ttl: Seconds a fetched source is reused without a freshness check (None for no limit).
+                 Local files are also revalidated against their modification time and size.
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        # Entries are ("source", key) -> (content_info, size, version, fetched_at)
+        # and ("document", key) -> _CachedDocument; both share the byte budget
+        self._entries: "OrderedDict[Tuple[str, Any], Any]" = OrderedDict()
+        self._lent: Dict[int, _CachedDocument] = {}
+        # Content hashes of cached sources by id() of their content, with the content itself
+        self._content_hashes: Dict[int, Tuple[Any, str]] = {}
+        self._size = 0
+        self._lock = threading.RLock()
+
+        # Counters
+        self.source_hits = 0
+        self.source_misses = 0
+        self.document_hits = 0
+        self.document_misses = 0
+        self.evictions = 0
+
+    def get_source(self, source_type: str, source: str,
+                   fetch: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Get the fetched content of a source, calling fetch on a miss.
+
+        A cached content dictionary gets a "content_hash" entry, so documents
+        opened from it are found without hashing the content again.
+
+        Args:
+            source_type: Adapter type that serves the source
+            source: Source URI
+            fetch: Function returning the adapter's content dictionary
+
+        Returns:
+            Content dictionary as returned by the adapter
+        """
+        key = ("source", (source_type, source))
+        version = self._file_version(source) if source_type == 'file' else None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                content_info, _, cached_version, fetched_at = entry
+                fresh = self.ttl is None or time.monotonic() - fetched_at < self.ttl
+                if fresh and cached_version == version:
+                    self._entries.move_to_end(key)
+                    self.source_hits += 1
+                    return content_info
+                self._remove(key)
+            self.source_misses += 1
+
+        content_info = fetch()
+        content = content_info.get("content")
+        size = self._content_size(content)
+        if size <= self.max_bytes:
+            if isinstance(content, (str, bytes)):
+                content_info["content_hash"] = self._hash(content)
+            with self._lock:
+                self._remove(key)
+                self._entries[key] = (content_info, size, version, time.monotonic())
+                self._size += size
+                if "content_hash" in content_info:
+                    self._content_hashes[id(content)] = (content, content_info["content_hash"])
+                evicted = self._evict()
+            self._close_all(evicted)
+        return content_info
+
+    def acquire_document(self, owner: Any, content: Any, opener: Callable[[bytes], Any],
+                         content_hash: Optional[str] = None) -> Any:
+        """
+        Get an opened document for content, opening it on a miss.
+
+        The handle is lent to the caller until release_document is called; other
+        threads asking for the same document wait until then. A thread that already
+        holds the document gets the same handle and must release it once per acquire.
+
+        Args:
+            owner: Parser that opens and reads the document
+            content: Source content (bytes or string)
+            opener: Function opening a document handle from bytes
+            content_hash: Hash of content; when not given, the hash stored when the
+                          content was fetched through get_source is used, and only
+                          content that was not is hashed here
+
+        Returns:
+            Opened document handle
+        """
+        if content_hash is None:
+            with self._lock:
+                known = self._content_hashes.get(id(content))
+            content_hash = known[1] if known is not None and known[0] is content else self._hash(content)
+        key = ("document", (id(owner), content_hash))
+
+        while True:
+            with self._lock:
+                cached = self._entries.get(key)
+                if cached is not None:
+                    self._entries.move_to_end(key)
+                    self.document_hits += 1
+                else:
+                    self.document_misses += 1
+
+            if cached is None:
+                data = content.encode('utf-8') if isinstance(content, str) else content
+                cached = _CachedDocument(opener(data), len(data))
+                with self._lock:
+                    existing = self._entries.get(key)
+                    if existing is None:
+                        self._entries[key] = cached
+                        self._size += cached.size
+                if existing is not None:
+                    # Opened concurrently by another caller; use theirs
+                    self._close(cached)
+                    cached = existing
+
+            cached.lock.acquire()
+            with self._lock:
+                # The document may have been evicted and closed while waiting
+                if self._entries.get(key) is cached:
+                    cached.loans += 1
+                    self._lent[id(cached.handle)] = cached
+                    return cached.handle
+            cached.lock.release()
+
+    def release_document(self, handle: Any) -> None:
+        """
+        Return a document handle obtained from acquire_document.
+
+        Args:
+            handle: Document handle to return
+        """
+        with self._lock:
+            cached = self._lent.get(id(handle))
+            if cached is None:
+                return
+            cached.loans -= 1
+            if not cached.loans:
+                del self._lent[id(handle)]
+        cached.lock.release()
+
+        with self._lock:
+            evicted = self._evict()
+        self._close_all(evicted)
+
+    def clear(self) -> None:
+        """Remove all cached sources and close all cached documents."""
+        with self._lock:
+            evicted = [entry for entry in self._entries.values() if isinstance(entry, _CachedDocument)]
+            self._entries.clear()
+            self._content_hashes.clear()
+            self._size = 0
+        self._close_all(evicted)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with hit and miss counts, evictions, entries and size in bytes
+        """
+        with self._lock:
+            return {
+                "source_hits": self.source_hits,
+                "source_misses": self.source_misses,
+                "document_hits": self.document_hits,
+                "document_misses": self.document_misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _remove(self, key: Tuple[str, Any]) -> None:
+        """Remove a source entry. Must be called with the lock held."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry[1]
+            self._forget_hash(entry[0])
+
+    def _forget_hash(self, content_info: Dict[str, Any]) -> None:
+        """Drop the stored hash of a source's content. Must be called with the lock held."""
+        content = content_info.get("content")
+        known = self._content_hashes.get(id(content))
+        if known is not None and known[0] is content:
+            del self._content_hashes[id(content)]
+
+    def _evict(self) -> list:
+        """
+        Evict least recently used entries until the cache fits its budget.
+        Must be called with the lock held.
+
+        Returns:
+            Evicted documents, to be closed after the lock is released
+        """
+        evicted = []
+        for key in list(self._entries):
+            if self._size <= self.max_bytes:
+                break
+            entry = self._entries[key]
+            if isinstance(entry, _CachedDocument):
+                if entry.loans:
+                    continue  # Lent out; evict later
+                evicted.append(entry)
+                self._size -= entry.size
+            else:
+                self._size -= entry[1]
+                self._forget_hash(entry[0])
+            del self._entries[key]
+            self.evictions += 1
+        return evicted
+
+    def _close_all(self, documents: list) -> None:
+        """Close evicted documents."""
+        for cached in documents:
+            with cached.lock:
+                self._close(cached)
+
+    @staticmethod
+    def _close(cached: _CachedDocument) -> None:
+        """Close a document handle if it supports closing."""
+        close = getattr(cached.handle, "close", None)
+        if close is not None:
+            try:
+                close()
+            except Exception as e:
+                logger.debug(f"Error closing cached document: {str(e)}")
+
+    @staticmethod
+    def _file_version(source: str) -> Optional[Tuple[int, int]]:
+        """Get the modification time and size of a local file, if it exists."""
+        try:
+            stat = os.stat(source)
+            return stat.st_mtime_ns, stat.st_size
+        except (OSError, ValueError, TypeError):
+            return None
+
+    @staticmethod
+    def _hash(content: Any) -> str:
+        """Hash source content (bytes or string)."""
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        return hashlib.sha1(data).hexdigest()
+
+    @staticmethod
+    def _content_size(content: Any) -> int:
+        """Approximate the size of fetched content in bytes."""
+        if isinstance(content, (bytes, bytearray)):
+            return len(content)
+        if isinstance(content, str):
+            return len(content)
+        return len(str(content or ""))
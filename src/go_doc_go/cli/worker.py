@@ -32,6 +32,9 @@ Examples:
   # Run multiple workers in the same process
   python -m go_doc_go.cli.worker --workers 4
   
+  # Run one worker process per core, sharing one embedding model
+  python -m go_doc_go.cli.worker --workers 8 --processes
+  
   # Run with custom worker ID
   python -m go_doc_go.cli.worker --worker-id worker-prod-01
 
@@ -49,7 +52,13 @@ Environment Variables:
         "--workers", "-w",
         type=int,
         default=1,
-        help="Number of worker threads to run in this process (default: 1)"
+        help="Number of workers to run (default: 1)"
+    )
+    
+    parser.add_argument(
+        "--processes", "-p",
+        action="store_true",
+        help="Run each worker in its own process instead of a thread, to use several CPU cores"
     )
     
     parser.add_argument(
@@ -165,7 +174,7 @@ Environment Variables:
             # Multi-worker mode
             logger.info(f"Starting {args.workers} document workers")
             
-            manager = WorkerManager(config, args.workers)
+            manager = WorkerManager(config, args.workers, mode="process" if args.processes else "thread")
             
             # Note: max_documents limitation not supported in multi-worker mode
             if args.max_documents:
@@ -182,6 +191,8 @@ Environment Variables:
             logger.info(f"  Elements created: {combined_stats.get('elements_created', 0)}")
             logger.info(f"  Relationships created: {combined_stats.get('relationships_created', 0)}")
             logger.info(f"  Links discovered: {combined_stats.get('links_discovered', 0)}")
+            if args.processes:
+                logger.info(f"  Worker restarts: {combined_stats.get('worker_restarts', 0)}")
             
             # Print summary to stdout for visibility
             print(f"\n🎉 All Document Workers Completed!")
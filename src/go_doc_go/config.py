@@ -384,7 +384,14 @@ class Config:
         if config_file and os.path.exists(config_file):
             loader.load_config_file(config_file)
         
-        return loader.get_registry()
+        # Compile the extraction engine once at load time
+        registry = loader.get_registry()
+        engine_config = extraction_config.get('engine', {})
+        registry.compile(
+            workers=engine_config.get('workers', 0),
+            process_threshold=engine_config.get('process_threshold', 500)
+        )
+        return registry
 
     def add_content_source(self, source_config: Dict[str, Any]) -> None:
         """
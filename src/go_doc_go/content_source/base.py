@@ -1,6 +1,6 @@
 import hashlib
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 
 
 class ContentSource(ABC):
@@ -40,6 +40,18 @@ class ContentSource(ABC):
         """
         pass
 
+    def iter_documents(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over available documents in this source.
+
+        Sources that page through a remote listing override this to yield
+        documents as pages arrive instead of building the whole list first.
+
+        Returns:
+            Iterator of document identifiers and metadata
+        """
+        yield from self.list_documents()
+
     @abstractmethod
     def has_changed(self, source_id: str, last_modified: Optional[float] = None) -> bool:
         """
@@ -8,7 +8,7 @@ import logging
 import os
 import re
 import tempfile
-from typing import Dict, Any, List, Optional, TYPE_CHECKING
+from typing import Dict, Any, Iterator, List, Optional, TYPE_CHECKING
 from urllib.parse import urlparse
 
 import time
@@ -304,6 +304,20 @@ class S3ContentSource(ContentSource):
         Returns:
             List of document identifiers and metadata
 
+        Raises:
+            ValueError: If S3 is not configured
+        """
+        results = list(self.iter_documents())
+        logger.info(f"Found {len(results)} S3 objects")
+        return results
+
+    def iter_documents(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over available documents in S3, one listing page at a time.
+
+        Returns:
+            Iterator of document identifiers and metadata
+
         Raises:
             ValueError: If S3 is not configured
         """
@@ -312,7 +326,6 @@ class S3ContentSource(ContentSource):
 
         logger.debug(f"Listing S3 objects in bucket: {self.bucket_name}, prefix: {self.prefix}")
 
-        results = []
         try:
             # Set up paginator for listing objects
             paginator = self.s3_client.get_paginator('list_objects_v2')
@@ -321,7 +334,7 @@ class S3ContentSource(ContentSource):
             page_iterator = paginator.paginate(
                 Bucket=self.bucket_name,
                 Prefix=self.prefix,
-                PaginationConfig={'MaxItems': 1000}
+                PaginationConfig={'PageSize': 1000}
             )
 
             # Process each page
@@ -371,14 +384,11 @@ class S3ContentSource(ContentSource):
                     elif extension in ['txt']:
                         doc_type = "text"
 
-                    results.append({
+                    yield {
                         "id": qualified_source,
                         "metadata": metadata,
                         "doc_type": doc_type
-                    })
-
-            logger.info(f"Found {len(results)} S3 objects")
-            return results
+                    }
 
         except Exception as e:
             logger.error(f"Error listing S3 objects: {str(e)}")
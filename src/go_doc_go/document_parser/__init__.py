@@ -6,8 +6,8 @@ __all__ = ['CsvParser', 'DateExtractor', 'DocumentParser', 'DocumentTypeDetector
            'create_semantic_time_expression', 'create_semantic_time_range_expression', 'csv', 'demo',
            'detect_temporal_type', 'document_type_detector', 'docx', 'extract_dates', 'extract_dates_as_dicts',
            'extract_dates_from_text', 'factory', 'get_parser_for_content', 'html', 'initialize_magic', 'json',
-           'lru_cache', 'markdown', 'parse_time_range', 'pdf', 'pptx', 'temporal_semantics', 'text', 'ttl_cache',
-           'xlsx', 'xml']
+           'lru_cache', 'markdown', 'might_contain_dates', 'parse_time_range', 'pdf', 'pptx', 'temporal_semantics',
+           'text', 'ttl_cache', 'xlsx', 'xml']
 
 from . import base
 from . import csv
@@ -35,6 +35,7 @@ from .extract_dates import ExtractedDate
 from .extract_dates import demo
 from .extract_dates import extract_dates_as_dicts
 from .extract_dates import extract_dates_from_text
+from .extract_dates import might_contain_dates
 from .factory import create_parser
 from .factory import get_parser_for_content
 from .html import HtmlParser
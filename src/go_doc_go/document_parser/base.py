@@ -15,6 +15,10 @@ from typing import Dict, List, Any, Optional, Union
 class DocumentParser(ABC):
     """Abstract base class for document parsers."""
 
+    # Shared cache of opened documents, set by the content resolver so that
+    # element resolutions on the same source reuse one opened document
+    document_cache = None
+
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """
         Initialize the document parser.
@@ -131,6 +135,46 @@ class DocumentParser(ABC):
         """
         pass
 
+    def _open_document(self, content: bytes) -> Any:
+        """
+        Open a document handle from source bytes, for reuse across element resolutions.
+
+        Args:
+            content: Source content
+
+        Returns:
+            Opened document handle
+
+        Raises:
+            NotImplementedError: If the parser does not open documents
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not open documents")
+
+    def _acquire_cached_document(self, source_content: Union[str, bytes],
+                                 content_hash: Optional[str] = None) -> Any:
+        """
+        Get an opened document for source content from the document cache.
+
+        The document must be returned with _release_cached_document.
+
+        Args:
+            source_content: Source content
+            content_hash: Optional hash of the source content, if already known
+
+        Returns:
+            Opened document handle
+        """
+        return self.document_cache.acquire_document(self, source_content, self._open_document, content_hash)
+
+    def _release_cached_document(self, document: Any) -> None:
+        """
+        Return a document obtained from _acquire_cached_document.
+
+        Args:
+            document: Opened document handle
+        """
+        self.document_cache.release_document(document)
+
     @staticmethod
     def get_document_binary(content_location: Dict[str, Any]) -> bytes:
         """
@@ -47,6 +47,9 @@ class CsvParser(DocumentParser):
         self.max_year = self.config.get("max_year", 2100)
         self.fiscal_year_start_month = self.config.get("fiscal_year_start_month", 10)
         self.default_locale = self.config.get("default_locale", "US")
+        self.date_cache_size = self.config.get("date_cache_size", 10000)
+        self.date_time_budget = self.config.get("date_time_budget", 60.0)  # Seconds per document
+        self.date_workers = self.config.get("date_workers", 0)
 
         # Initialize date extractor if enabled
         self.date_extractor = None
@@ -57,7 +60,10 @@ class CsvParser(DocumentParser):
                     min_year=self.min_year,
                     max_year=self.max_year,
                     fiscal_year_start_month=self.fiscal_year_start_month,
-                    default_locale=self.default_locale
+                    default_locale=self.default_locale,
+                    cache_size=self.date_cache_size,
+                    time_budget=self.date_time_budget,
+                    workers=self.date_workers
                 )
                 # logger.debug("Date extraction enabled with comprehensive temporal analysis")
             except ImportError as e:
@@ -589,32 +595,28 @@ class CsvParser(DocumentParser):
                 # Extract text content from the entire CSV for date extraction
                 full_text = self._extract_full_text_from_csv(csv_data, header_row)
 
-                # Extract dates from the full CSV
-                if full_text.strip():
-                    document_dates = self.date_extractor.extract_dates_as_dicts(full_text)
-                    if document_dates:
-                        element_dates[root_id] = document_dates
-                        logger.debug(f"Extracted {len(document_dates)} dates from CSV document")
-
-                # Extract dates from individual cells that contain text
+                # Collect the full CSV and the individual cells and rows that contain text
+                texts = {root_id: full_text} if full_text.strip() else {}
                 for element in elements:
                     if element["element_type"] == ElementType.TABLE_CELL.value:
                         cell_text = self._get_cell_text_for_dates(element, csv_data, header_row)
 
                         if cell_text and cell_text.strip():
-                            cell_dates = self.date_extractor.extract_dates_as_dicts(cell_text)
-                            if cell_dates:
-                                element_dates[element["element_id"]] = cell_dates
-                                logger.debug(f"Extracted {len(cell_dates)} dates from cell")
+                            texts[element["element_id"]] = cell_text
 
                     elif element["element_type"] == ElementType.TABLE_ROW.value:
                         row_text = self._get_row_text_for_dates(element, csv_data, header_row)
 
                         if row_text and row_text.strip():
-                            row_dates = self.date_extractor.extract_dates_as_dicts(row_text)
-                            if row_dates:
-                                element_dates[element["element_id"]] = row_dates
-                                logger.debug(f"Extracted {len(row_dates)} dates from row")
+                            texts[element["element_id"]] = row_text
+
+                # Extract dates from all texts in one batch; repeated cell values are analyzed once
+                element_ids = list(texts)
+                results = self.date_extractor.extract_dates_batch_as_dicts(list(texts.values()))
+                for element_id, dates in zip(element_ids, results):
+                    if dates:
+                        element_dates[element_id] = dates
+                        logger.debug(f"Extracted {len(dates)} dates from element {element_id}")
 
             except Exception as e:
                 logger.warning(f"Error during date extraction: {e}")
@@ -4,6 +4,7 @@ DOCX document parser module for the document pointer system.
 This module parses DOCX documents into structured elements with comprehensive date extraction.
 """
 
+import io
 import json
 import logging
 import os
@@ -66,6 +67,9 @@ class DocxParser(DocumentParser):
         self.max_year = self.config.get("max_year", 2100)
         self.fiscal_year_start_month = self.config.get("fiscal_year_start_month", 10)
         self.default_locale = self.config.get("default_locale", "US")
+        self.date_cache_size = self.config.get("date_cache_size", 10000)
+        self.date_time_budget = self.config.get("date_time_budget", 60.0)  # Seconds per document
+        self.date_workers = self.config.get("date_workers", 0)
 
         # Initialize date extractor if enabled
         self.date_extractor = None
@@ -76,7 +80,10 @@ class DocxParser(DocumentParser):
                     min_year=self.min_year,
                     max_year=self.max_year,
                     fiscal_year_start_month=self.fiscal_year_start_month,
-                    default_locale=self.default_locale
+                    default_locale=self.default_locale,
+                    cache_size=self.date_cache_size,
+                    time_budget=self.date_time_budget,
+                    workers=self.date_workers
                 )
                 # logger.debug("Date extraction enabled with comprehensive temporal analysis")
             except ImportError as e:
@@ -211,14 +218,8 @@ class DocxParser(DocumentParser):
                     # Extract text content from the entire document for date extraction
                     full_text = self._extract_full_text(doc)
 
-                    # Extract dates from the full document
-                    if full_text.strip():
-                        document_dates = self.date_extractor.extract_dates_as_dicts(full_text)
-                        if document_dates:
-                            element_dates[root_id] = document_dates
-                            logger.debug(f"Extracted {len(document_dates)} dates from DOCX document")
-
-                    # Extract dates from individual elements
+                    # Collect the full document and individual element texts
+                    texts = {root_id: full_text} if full_text.strip() else {}
                     for element in elements:
                         element_id = element["element_id"]
                         element_type = element["element_type"]
@@ -230,10 +231,15 @@ class DocxParser(DocumentParser):
                             element_text = self._get_element_text_for_dates(element, doc)
 
                             if element_text and element_text.strip():
-                                element_specific_dates = self.date_extractor.extract_dates_as_dicts(element_text)
-                                if element_specific_dates:
-                                    element_dates[element_id] = element_specific_dates
-                                    logger.debug(f"Extracted {len(element_specific_dates)} dates from {element_type} element")
+                                texts[element_id] = element_text
+
+                    # Extract dates from all texts in one batch
+                    element_ids = list(texts)
+                    results = self.date_extractor.extract_dates_batch_as_dicts(list(texts.values()))
+                    for element_id, element_specific_dates in zip(element_ids, results):
+                        if element_specific_dates:
+                            element_dates[element_id] = element_specific_dates
+                            logger.debug(f"Extracted {len(element_specific_dates)} dates from element {element_id}")
 
                 except Exception as e:
                     logger.warning(f"Error during date extraction: {e}")
@@ -403,6 +409,18 @@ class DocxParser(DocumentParser):
         # Fallback to content preview
         return element.get("content_preview", "")
 
+    def _open_document(self, content: bytes) -> Any:
+        """
+        Open a DOCX document from source bytes.
+
+        Args:
+            content: Source content
+
+        Returns:
+            Opened document
+        """
+        return docx.Document(io.BytesIO(content))
+
     def _resolve_element_content(self, location_data: Dict[str, Any],
                                  source_content: Optional[Union[str, bytes]]) -> str:
         """
@@ -421,6 +439,7 @@ class DocxParser(DocumentParser):
         # Load the document if source content is not provided
         doc = None
         temp_file = None
+        cached_document = None
         try:
             if source_content is None:
                 # Check if source is a file path
@@ -431,6 +450,12 @@ class DocxParser(DocumentParser):
                         raise ValueError(f"Error loading DOCX document: {str(e)}")
                 else:
                     raise ValueError(f"Source file not found: {source}")
+            elif self.document_cache is not None:
+                # Reuse the document opened for other elements of the same source
+                try:
+                    doc = cached_document = self._acquire_cached_document(source_content)
+                except Exception as e:
+                    raise ValueError(f"Error loading DOCX document: {str(e)}")
             else:
                 # Save content to a temporary file
                 if not os.path.exists(self.temp_dir):
@@ -585,6 +610,10 @@ class DocxParser(DocumentParser):
                 return "\n".join(p.text for p in doc.paragraphs)
 
         finally:
+            # Return the cached document for other elements
+            if cached_document is not None:
+                self._release_cached_document(cached_document)
+
             # Clean up temporary file
             if temp_file and os.path.exists(temp_file):
                 try:
@@ -6,11 +6,16 @@ converting them into a standardized format with enhanced temporal concepts
 for storage with embeddings.
 """
 
+import hashlib
 import logging
 import re
-from dataclasses import dataclass
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import date, datetime
+from typing import List, Dict, Any, Optional, Tuple
 
 try:
     import datefinder
@@ -19,6 +24,66 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Every date found by datefinder or the vague reference patterns contains a digit,
+# an English month or weekday name (or its abbreviation) or a season
+_DATE_HINT = re.compile(
+    r'\d|jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec|mon|tue|wed|thu|fri|sat|sun'
+    r'|spring|summer|fall|autumn|winter',
+    re.IGNORECASE
+)
+
+
+def might_contain_dates(text: str) -> bool:
+    """
+    Cheap check whether text can contain a date.
+
+    Args:
+        text: Text to check
+
+    Returns:
+        False if no date can be extracted from the text
+    """
+    return bool(text) and _DATE_HINT.search(text) is not None
+
+
+class _DateCache:
+    """Thread-safe LRU cache of extraction results, shared by all extractors in a process."""
+
+    def __init__(self):
+        self._entries: "OrderedDict[Tuple, List[ExtractedDate]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple) -> Optional[List["ExtractedDate"]]:
+        with self._lock:
+            dates = self._entries.get(key)
+            if dates is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dates
+
+    def put(self, key: Tuple, dates: List["ExtractedDate"], max_size: int) -> None:
+        with self._lock:
+            self._entries[key] = dates
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_cache = _DateCache()
+
 
 @dataclass
 class ExtractedDate:
@@ -136,7 +201,11 @@ class DateExtractor:
                  min_year: int = 1900,
                  max_year: int = 2100,
                  fiscal_year_start_month: int = 10,  # October (US federal)
-                 default_locale: str = "US"):
+                 default_locale: str = "US",
+                 cache_size: int = 10000,
+                 time_budget: Optional[float] = None,
+                 workers: int = 0,
+                 process_threshold: int = 200):
         """
         Initialize the date extractor.
 
@@ -146,12 +215,20 @@ class DateExtractor:
             max_year: Maximum valid year for extracted dates
             fiscal_year_start_month: Month when fiscal year starts (1-12)
             default_locale: Default locale for date format detection
+            cache_size: Maximum number of cached extraction results (0 = no caching)
+            time_budget: Default seconds allowed for one batch (None = unlimited)
+            workers: Number of worker processes for batch extraction (0 = in-process)
+            process_threshold: Minimum number of distinct texts in a batch before the process pool is used
         """
         self.context_chars = context_chars
         self.min_year = min_year
         self.max_year = max_year
         self.fiscal_year_start_month = fiscal_year_start_month
         self.default_locale = default_locale
+        self.cache_size = cache_size
+        self.time_budget = time_budget
+        self.workers = workers
+        self.process_threshold = process_threshold
 
     def extract_dates(self, text: str) -> List[ExtractedDate]:
         """
@@ -163,6 +240,100 @@ class DateExtractor:
         Returns:
             List of ExtractedDate objects
         """
+        return self._extract_cached(text)
+
+    def extract_dates_batch(self, texts: List[str],
+                            time_budget: Optional[float] = None) -> List[List[ExtractedDate]]:
+        """
+        Extract dates from all texts of a document at once.
+
+        Repeated texts are extracted once. Large batches are split across a process
+        pool when workers are configured; if the pool cannot be used the batch is
+        extracted in-process. When the time budget runs out, the remaining texts
+        get no dates.
+
+        Args:
+            texts: Texts to extract dates from
+            time_budget: Seconds allowed for the batch (None = the extractor's default)
+
+        Returns:
+            List of ExtractedDate lists, one per text
+        """
+        if time_budget is None:
+            time_budget = self.time_budget
+        deadline = time.monotonic() + time_budget if time_budget else None
+
+        unique = list(dict.fromkeys(text for text in texts if might_contain_dates(text)))
+        results: Dict[str, List[ExtractedDate]] = {}
+        if self.workers > 1 and len(unique) >= max(self.process_threshold, 2):
+            try:
+                results = self._extract_in_pool(unique, deadline)
+            except Exception as e:
+                logger.warning(f"Process pool date extraction failed, extracting in-process: {e}")
+
+        skipped = 0
+        for text in unique:
+            if text in results:
+                continue
+            if deadline is not None and time.monotonic() >= deadline:
+                skipped += 1
+                continue
+            results[text] = self._extract_cached(text, deadline)
+        if skipped:
+            logger.warning(f"Date extraction time budget of {time_budget}s exceeded, "
+                           f"skipped {skipped} of {len(unique)} texts")
+
+        return [[replace(d) for d in results.get(text, [])] for text in texts]
+
+    def extract_dates_batch_as_dicts(self, texts: List[str],
+                                     time_budget: Optional[float] = None) -> List[List[Dict[str, Any]]]:
+        """
+        Extract dates from a batch of texts and return them as dictionaries.
+
+        Args:
+            texts: Texts to extract dates from
+            time_budget: Seconds allowed for the batch (None = the extractor's default)
+
+        Returns:
+            List of date dictionary lists, one per text
+        """
+        return [[d.to_dict() for d in dates] for dates in self.extract_dates_batch(texts, time_budget)]
+
+    @staticmethod
+    def cache_info() -> Dict[str, int]:
+        """
+        Get statistics of the shared result cache.
+
+        Returns:
+            Dictionary with hits, misses and size
+        """
+        return {'hits': _cache.hits, 'misses': _cache.misses, 'size': len(_cache)}
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Clear the shared result cache."""
+        _cache.clear()
+
+    def _extract_cached(self, text: str, deadline: Optional[float] = None) -> List[ExtractedDate]:
+        """Extract dates, skipping text without date hints and reusing cached results."""
+        if not might_contain_dates(text):
+            return []
+        if self.cache_size <= 0:
+            return self._extract(text, deadline)
+
+        # Missing date components are filled in from today, so results are only reused on the same day
+        key = (self.context_chars, self.min_year, self.max_year, self.fiscal_year_start_month,
+               self.default_locale, date.today(), hashlib.blake2b(text.encode('utf-8', 'surrogatepass')).digest())
+        dates = _cache.get(key)
+        if dates is None:
+            dates = self._extract(text, deadline)
+            if deadline is None or time.monotonic() < deadline:
+                # Results cut short by the deadline are incomplete
+                _cache.put(key, dates, self.cache_size)
+        return [replace(d) for d in dates]
+
+    def _extract(self, text: str, deadline: Optional[float] = None) -> List[ExtractedDate]:
+        """Extract dates from text, stopping at the deadline."""
         extracted_dates = []
 
         try:
@@ -185,6 +356,10 @@ class DateExtractor:
 
                     extracted_dates.append(extracted_date)
 
+                if deadline is not None and time.monotonic() >= deadline:
+                    logger.warning("Date extraction time budget exceeded, keeping dates found so far")
+                    return extracted_dates
+
             # Also look for vague temporal references that datefinder might miss
             vague_dates = self._extract_vague_temporal_references(text)
             extracted_dates.extend(vague_dates)
@@ -194,6 +369,20 @@ class DateExtractor:
 
         return extracted_dates
 
+    def _extract_in_pool(self, texts: List[str], deadline: Optional[float]) -> Dict[str, List[ExtractedDate]]:
+        """Extract distinct texts in worker processes."""
+        chunk_size = -(-len(texts) // (self.workers * 4))
+        chunks = [texts[start:start + chunk_size] for start in range(0, len(texts), chunk_size)]
+        # Monotonic clocks are not comparable across processes, so workers get the remaining seconds
+        remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+
+        results = {}
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for chunk, chunk_results in zip(chunks, executor.map(_extract_chunk, [self] * len(chunks), chunks,
+                                                                 [remaining] * len(chunks))):
+                results.update((text, dates) for text, dates in zip(chunk, chunk_results) if dates is not None)
+        return results
+
     def _analyze_date_comprehensively(self, original_text: str, date_obj: datetime,
                                      start_pos: int, end_pos: int, context: str) -> ExtractedDate:
         """Perform comprehensive analysis of a date to extract all temporal metadata."""
@@ -640,6 +829,19 @@ class DateExtractor:
         return context.strip()
 
 
+def _extract_chunk(extractor: DateExtractor, texts: List[str],
+                   remaining: Optional[float]) -> List[Optional[List[ExtractedDate]]]:
+    """Extract a chunk of texts in a pool worker; texts reached after the deadline get None."""
+    deadline = None if remaining is None else time.monotonic() + remaining
+    results = []
+    for text in texts:
+        if deadline is not None and time.monotonic() >= deadline:
+            results.append(None)
+        else:
+            results.append(extractor._extract_cached(text, deadline))
+    return results
+
+
 # Convenience functions for simple use cases
 def extract_dates_from_text(text: str, **kwargs) -> List[ExtractedDate]:
     """
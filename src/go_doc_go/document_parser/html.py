@@ -46,6 +46,9 @@ class HtmlParser(DocumentParser):
         self.max_year = self.config.get("max_year", 2100)
         self.fiscal_year_start_month = self.config.get("fiscal_year_start_month", 10)
         self.default_locale = self.config.get("default_locale", "US")
+        self.date_cache_size = self.config.get("date_cache_size", 10000)
+        self.date_time_budget = self.config.get("date_time_budget", 60.0)  # Seconds per document
+        self.date_workers = self.config.get("date_workers", 0)
 
         # Initialize date extractor if enabled
         self.date_extractor = None
@@ -56,13 +59,19 @@ class HtmlParser(DocumentParser):
                     min_year=self.min_year,
                     max_year=self.max_year,
                     fiscal_year_start_month=self.fiscal_year_start_month,
-                    default_locale=self.default_locale
+                    default_locale=self.default_locale,
+                    cache_size=self.date_cache_size,
+                    time_budget=self.date_time_budget,
+                    workers=self.date_workers
                 )
                 # logger.debug("Date extraction enabled with comprehensive temporal analysis")
             except ImportError as e:
                 logger.warning(f"Date extraction disabled: {e}")
                 self.extract_dates = False
 
+        # Texts queued for date extraction: (text, element ID, element_dates to update)
+        self._pending_dates: List[Tuple[str, str, Dict[str, List[Dict[str, Any]]]]] = []
+
         # Initialize caches
         if self.enable_caching:
             self.document_cache = LRUCache(max_size=self.max_cache_size, ttl=self.cache_ttl)
@@ -72,7 +81,10 @@ class HtmlParser(DocumentParser):
 
     def _extract_dates_from_text(self, text: str, element_id: str, element_dates: Dict[str, List[Dict[str, Any]]]):
         """
-        Extract dates from text content and add to element_dates.
+        Queue text content for date extraction.
+
+        Queued texts are extracted in one batch by _extract_pending_dates() at the
+        end of parsing, which adds the dates to element_dates.
 
         Args:
             text: Text content to extract dates from
@@ -82,13 +94,26 @@ class HtmlParser(DocumentParser):
         if not self.extract_dates or not self.date_extractor or not text.strip():
             return
 
+        self._pending_dates.append((text, element_id, element_dates))
+
+    def _extract_pending_dates(self):
+        """
+        Extract dates from all queued texts in one batch and add them to their element_dates.
+        """
+        pending, self._pending_dates = self._pending_dates, []
+        if not pending:
+            return
+
         try:
-            dates = self.date_extractor.extract_dates_as_dicts(text)
+            results = self.date_extractor.extract_dates_batch_as_dicts([text for text, _, _ in pending])
+        except Exception as e:
+            logger.warning(f"Error extracting dates from {len(pending)} elements: {e}")
+            return
+
+        for (_, element_id, element_dates), dates in zip(pending, results):
             if dates:
                 element_dates[element_id] = dates
                 logger.debug(f"Extracted {len(dates)} dates from element {element_id}")
-        except Exception as e:
-            logger.warning(f"Error extracting dates from element {element_id}: {e}")
 
     def clear_caches(self):
         """Clear all caches."""
@@ -619,17 +644,14 @@ class HtmlParser(DocumentParser):
         # Initialize relationships list and element_dates dictionary
         relationships = []
         element_dates = {}
+        self._pending_dates = []
 
-        # Extract dates from full document content first
+        # Queue full document content for date extraction first
         if self.extract_dates and self.date_extractor:
             try:
                 # Get plain text from HTML for date extraction
                 soup = self._get_or_create_soup(content)
-                document_text = soup.get_text()
-                document_dates = self.date_extractor.extract_dates_as_dicts(document_text)
-                if document_dates:
-                    element_dates[root_id] = document_dates
-                    logger.debug(f"Extracted {len(document_dates)} dates from document")
+                self._extract_dates_from_text(soup.get_text(), root_id, element_dates)
             except Exception as e:
                 logger.warning(f"Error during document date extraction: {e}")
 
@@ -652,6 +674,9 @@ class HtmlParser(DocumentParser):
         # Parse HTML elements with relationships and date extraction
         parsed_elements, element_links, element_relationships = self._parse_document(soup, doc_id, root_id, source_id, element_dates)
         elements.extend(parsed_elements)
+
+        # Extract dates from the document and all element texts in one batch
+        self._extract_pending_dates()
         relationships.extend(element_relationships)
 
         # Update link source_ids with the correct element IDs
@@ -85,6 +85,9 @@ class JSONParser(DocumentParser):
         self.max_year = self.config.get("max_year", 2100)
         self.fiscal_year_start_month = self.config.get("fiscal_year_start_month", 10)
         self.default_locale = self.config.get("default_locale", "US")
+        self.date_cache_size = self.config.get("date_cache_size", 10000)
+        self.date_time_budget = self.config.get("date_time_budget", 60.0)  # Seconds per document
+        self.date_workers = self.config.get("date_workers", 0)
 
         # Initialize date extractor if enabled
         self.date_extractor = None
@@ -95,13 +98,19 @@ class JSONParser(DocumentParser):
                     min_year=self.min_year,
                     max_year=self.max_year,
                     fiscal_year_start_month=self.fiscal_year_start_month,
-                    default_locale=self.default_locale
+                    default_locale=self.default_locale,
+                    cache_size=self.date_cache_size,
+                    time_budget=self.date_time_budget,
+                    workers=self.date_workers
                 )
                 # logger.debug("Date extraction enabled with comprehensive temporal analysis")
             except ImportError as e:
                 logger.warning(f"Date extraction disabled: {e}")
                 self.extract_dates = False
 
+        # Texts queued for date extraction: (text, element ID, element_dates to update)
+        self._pending_dates: List[Tuple[str, str, Dict[str, List[Dict[str, Any]]]]] = []
+
         # Performance monitoring
         self.enable_performance_monitoring = self.config.get("enable_performance_monitoring", False)
         self.performance_stats = {
@@ -123,7 +132,10 @@ class JSONParser(DocumentParser):
 
     def _extract_dates_from_text(self, text: str, element_id: str, element_dates: Dict[str, List[Dict[str, Any]]]):
         """
-        Extract dates from text content and add to element_dates.
+        Queue text content for date extraction.
+
+        Queued texts are extracted in one batch by _extract_pending_dates() at the
+        end of parsing, which adds the dates to element_dates.
 
         Args:
             text: Text content to extract dates from
@@ -133,13 +145,26 @@ class JSONParser(DocumentParser):
         if not self.extract_dates or not self.date_extractor or not text.strip():
             return
 
+        self._pending_dates.append((text, element_id, element_dates))
+
+    def _extract_pending_dates(self):
+        """
+        Extract dates from all queued texts in one batch and add them to their element_dates.
+        """
+        pending, self._pending_dates = self._pending_dates, []
+        if not pending:
+            return
+
         try:
-            dates = self.date_extractor.extract_dates_as_dicts(text)
+            results = self.date_extractor.extract_dates_batch_as_dicts([text for text, _, _ in pending])
+        except Exception as e:
+            logger.warning(f"Error extracting dates from {len(pending)} elements: {e}")
+            return
+
+        for (_, element_id, element_dates), dates in zip(pending, results):
             if dates:
                 element_dates[element_id] = dates
                 logger.debug(f"Extracted {len(dates)} dates from element {element_id}")
-        except Exception as e:
-            logger.warning(f"Error extracting dates from element {element_id}: {e}")
 
     def _extract_dates_from_json_value(self, value: Any, element_id: str, element_dates: Dict[str, List[Dict[str, Any]]]):
         """
@@ -858,26 +883,22 @@ class JSONParser(DocumentParser):
         # Initialize relationships list and element_dates dictionary
         relationships = []
         element_dates = {}
+        self._pending_dates = []
 
-        # Extract dates from the full JSON document first
+        # Queue the full JSON document for date extraction first
         if self.extract_dates and self.date_extractor:
-            start_date_time = time.time()
-            try:
-                # Convert JSON to string and extract dates
-                json_string = json.dumps(json_data) if not isinstance(content, str) else content
-                document_dates = self.date_extractor.extract_dates_as_dicts(json_string)
-                if document_dates:
-                    element_dates[root_id] = document_dates
-                    logger.debug(f"Extracted {len(document_dates)} dates from JSON document")
-            except Exception as e:
-                logger.warning(f"Error during document date extraction: {e}")
-
-            if self.enable_performance_monitoring:
-                self.performance_stats["total_date_extraction_time"] += time.time() - start_date_time
+            json_string = json.dumps(json_data) if not isinstance(content, str) else content
+            self._extract_dates_from_text(json_string, root_id, element_dates)
 
         # Parse JSON structure recursively with relationships and date extraction
         self._parse_json_element(json_data, doc_id, root_id, source_id, elements, relationships, "$", 0, element_dates)
 
+        # Extract dates from the document and all element texts in one batch
+        start_date_time = time.time()
+        self._extract_pending_dates()
+        if self.enable_performance_monitoring:
+            self.performance_stats["total_date_extraction_time"] += time.time() - start_date_time
+
         # Extract links from the document
         extract_links_start = time.time()
         links = self._extract_links(json.dumps(json_data), root_id)
@@ -5,11 +5,12 @@ This module parses PowerPoint (PPTX) documents into structured elements
 with comprehensive date extraction and temporal analysis.
 """
 
+import io
 import json
 import logging
 import os
 import re
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Tuple, Union
 
 from ..relationships import RelationshipType
 from ..storage import ElementType
@@ -70,6 +71,9 @@ class PptxParser(DocumentParser):
         self.max_year = self.config.get("max_year", 2100)
         self.fiscal_year_start_month = self.config.get("fiscal_year_start_month", 10)
         self.default_locale = self.config.get("default_locale", "US")
+        self.date_cache_size = self.config.get("date_cache_size", 10000)
+        self.date_time_budget = self.config.get("date_time_budget", 60.0)  # Seconds per document
+        self.date_workers = self.config.get("date_workers", 0)
 
         # Initialize date extractor if enabled
         self.date_extractor = None
@@ -80,13 +84,19 @@ class PptxParser(DocumentParser):
                     min_year=self.min_year,
                     max_year=self.max_year,
                     fiscal_year_start_month=self.fiscal_year_start_month,
-                    default_locale=self.default_locale
+                    default_locale=self.default_locale,
+                    cache_size=self.date_cache_size,
+                    time_budget=self.date_time_budget,
+                    workers=self.date_workers
                 )
                 # logger.debug("Date extraction enabled with comprehensive temporal analysis")
             except ImportError as e:
                 logger.warning(f"Date extraction disabled: {e}")
                 self.extract_dates = False
 
+        # Texts queued for date extraction: (text, element ID, element_dates to update)
+        self._pending_dates: List[Tuple[str, str, Dict[str, List[Dict[str, Any]]]]] = []
+
     def _resolve_element_text(self, location_data: Dict[str, Any], source_content: Optional[Union[str, bytes]] = None) -> str:
         """
         Resolve the plain text representation of a PPTX element.
@@ -138,6 +148,18 @@ class PptxParser(DocumentParser):
         # Default
         return content.strip()
 
+    def _open_document(self, content: bytes) -> Any:
+        """
+        Open a PPTX presentation from source bytes.
+
+        Args:
+            content: Source content
+
+        Returns:
+            Opened presentation
+        """
+        return Presentation(io.BytesIO(content))
+
     def _resolve_element_content(self, location_data: Dict[str, Any],
                                  source_content: Optional[Union[str, bytes]] = None) -> str:
         """
@@ -157,6 +179,7 @@ class PptxParser(DocumentParser):
         # Load the document if source content is not provided
         presentation = None
         temp_file = None
+        cached_document = None
         try:
             if source_content is None:
                 # Check if source is a file path
@@ -167,6 +190,12 @@ class PptxParser(DocumentParser):
                         raise ValueError(f"Error loading PPTX document: {str(e)}")
                 else:
                     raise ValueError(f"Source file not found: {source}")
+            elif self.document_cache is not None:
+                # Reuse the document opened for other elements of the same source
+                try:
+                    presentation = cached_document = self._acquire_cached_document(source_content)
+                except Exception as e:
+                    raise ValueError(f"Error loading PPTX document: {str(e)}")
             else:
                 # Save content to a temporary file
                 if not os.path.exists(self.temp_dir):
@@ -456,6 +485,10 @@ class PptxParser(DocumentParser):
                 return f"PowerPoint presentation with {len(presentation.slides)} slides"
 
         finally:
+            # Return the cached document for other elements
+            if cached_document is not None:
+                self._release_cached_document(cached_document)
+
             # Clean up temporary file
             if temp_file and os.path.exists(temp_file):
                 try:
@@ -538,7 +571,10 @@ class PptxParser(DocumentParser):
 
     def _extract_dates_from_text(self, text: str, element_id: str, element_dates: Dict[str, List[Dict[str, Any]]]):
         """
-        Extract dates from text content and add to element_dates.
+        Queue text content for date extraction.
+
+        Queued texts are extracted in one batch by _extract_pending_dates() at the
+        end of parsing, which adds the dates to element_dates.
 
         Args:
             text: Text content to extract dates from
@@ -548,13 +584,26 @@ class PptxParser(DocumentParser):
         if not self.extract_dates or not self.date_extractor or not text.strip():
             return
 
+        self._pending_dates.append((text, element_id, element_dates))
+
+    def _extract_pending_dates(self):
+        """
+        Extract dates from all queued texts in one batch and add them to their element_dates.
+        """
+        pending, self._pending_dates = self._pending_dates, []
+        if not pending:
+            return
+
         try:
-            dates = self.date_extractor.extract_dates_as_dicts(text)
+            results = self.date_extractor.extract_dates_batch_as_dicts([text for text, _, _ in pending])
+        except Exception as e:
+            logger.warning(f"Error extracting dates from {len(pending)} elements: {e}")
+            return
+
+        for (_, element_id, element_dates), dates in zip(pending, results):
             if dates:
                 element_dates[element_id] = dates
                 logger.debug(f"Extracted {len(dates)} dates from element {element_id}")
-        except Exception as e:
-            logger.warning(f"Error extracting dates from element {element_id}: {e}")
 
     @staticmethod
     def _extract_document_links(presentation, elements: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -691,11 +740,15 @@ class PptxParser(DocumentParser):
         # Initialize relationships list and element_dates dictionary
         relationships = []
         element_dates = {}
+        self._pending_dates = []
 
         # Parse document elements and create relationships
         new_elements = self._parse_presentation(presentation, doc_id, root_id, source_id, relationships, element_dates)
         elements.extend(new_elements)
 
+        # Extract dates from all element texts in one batch
+        self._extract_pending_dates()
+
         # Extract links from the document using the helper method
         links = self._extract_document_links(presentation, elements)
 
@@ -42,6 +42,9 @@ class TextParser(DocumentParser):
         self.max_year = self.config.get("max_year", 2100)
         self.fiscal_year_start_month = self.config.get("fiscal_year_start_month", 10)
         self.default_locale = self.config.get("default_locale", "US")
+        self.date_cache_size = self.config.get("date_cache_size", 10000)
+        self.date_time_budget = self.config.get("date_time_budget", 60.0)  # Seconds per document
+        self.date_workers = self.config.get("date_workers", 0)
 
         # Initialize date extractor if enabled
         self.date_extractor = None
@@ -52,7 +55,10 @@ class TextParser(DocumentParser):
                     min_year=self.min_year,
                     max_year=self.max_year,
                     fiscal_year_start_month=self.fiscal_year_start_month,
-                    default_locale=self.default_locale
+                    default_locale=self.default_locale,
+                    cache_size=self.date_cache_size,
+                    time_budget=self.date_time_budget,
+                    workers=self.date_workers
                 )
                 # logger.debug("Date extraction enabled with comprehensive temporal analysis")
             except ImportError as e:
@@ -318,25 +324,19 @@ class TextParser(DocumentParser):
         element_dates = {}
         if self.extract_dates and self.date_extractor:
             try:
-                # Extract dates from the full document
-                document_dates = self.date_extractor.extract_dates_as_dicts(content)
-                if document_dates:
-                    element_dates[root_id] = document_dates
-                    logger.debug(f"Extracted {len(document_dates)} dates from document")
-
-                # Extract dates from individual paragraphs
+                # Extract dates from the full document and individual paragraphs in one batch
+                para_elements = {elem["metadata"]["index"]: elem for elem in paragraph_elements}
+                texts = {root_id: content}
                 for i, paragraph in enumerate(paragraphs):
-                    if paragraph.strip():  # Skip empty paragraphs
-                        para_dates = self.date_extractor.extract_dates_as_dicts(paragraph)
-                        if para_dates:
-                            # Find the corresponding paragraph element
-                            para_element = next(
-                                (elem for elem in paragraph_elements if elem["metadata"]["index"] == i),
-                                None
-                            )
-                            if para_element:
-                                element_dates[para_element["element_id"]] = para_dates
-                                logger.debug(f"Extracted {len(para_dates)} dates from paragraph {i}")
+                    if paragraph.strip() and i in para_elements:  # Skip empty paragraphs
+                        texts[para_elements[i]["element_id"]] = paragraph
+
+                element_ids = list(texts)
+                results = self.date_extractor.extract_dates_batch_as_dicts(list(texts.values()))
+                for element_id, dates in zip(element_ids, results):
+                    if dates:
+                        element_dates[element_id] = dates
+                        logger.debug(f"Extracted {len(dates)} dates from element {element_id}")
 
             except Exception as e:
                 logger.warning(f"Error during date extraction: {e}")
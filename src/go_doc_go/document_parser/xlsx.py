@@ -4,6 +4,7 @@ XLSX document parser module for the document pointer system.
 This module parses Excel (XLSX) files into structured elements with comprehensive date extraction.
 """
 
+import io
 import json
 import logging
 import os
@@ -61,6 +62,9 @@ class XlsxParser(DocumentParser):
         self.max_year = self.config.get("max_year", 2100)
         self.fiscal_year_start_month = self.config.get("fiscal_year_start_month", 10)
         self.default_locale = self.config.get("default_locale", "US")
+        self.date_cache_size = self.config.get("date_cache_size", 10000)
+        self.date_time_budget = self.config.get("date_time_budget", 60.0)  # Seconds per document
+        self.date_workers = self.config.get("date_workers", 0)
 
         # Initialize date extractor if enabled
         self.date_extractor = None
@@ -71,7 +75,10 @@ class XlsxParser(DocumentParser):
                     min_year=self.min_year,
                     max_year=self.max_year,
                     fiscal_year_start_month=self.fiscal_year_start_month,
-                    default_locale=self.default_locale
+                    default_locale=self.default_locale,
+                    cache_size=self.date_cache_size,
+                    time_budget=self.date_time_budget,
+                    workers=self.date_workers
                 )
                 # logger.debug("Date extraction enabled with comprehensive temporal analysis for XLSX")
             except ImportError as e:
@@ -343,16 +350,10 @@ class XlsxParser(DocumentParser):
         element_dates = {}
         if self.extract_dates and self.date_extractor:
             try:
-                # Extract dates from the entire workbook content
+                # Extract dates from the entire workbook content and the individual elements in one batch
                 full_text = self._extract_workbook_text(workbook)
-                if full_text.strip():
-                    document_dates = self.date_extractor.extract_dates_as_dicts(full_text)
-                    if document_dates:
-                        element_dates[root_id] = document_dates
-                        logger.debug(f"Extracted {len(document_dates)} dates from XLSX document")
-
-                # Extract dates from individual elements
-                self._extract_dates_from_elements(elements, element_dates)
+                texts = {root_id: full_text} if full_text.strip() else {}
+                self._extract_dates_from_elements(elements, element_dates, texts)
 
             except Exception as e:
                 logger.warning(f"Error during XLSX date extraction: {e}")
@@ -446,17 +447,24 @@ class XlsxParser(DocumentParser):
 
         return " ".join(all_text)
 
-    def _extract_dates_from_elements(self, elements: List[Dict[str, Any]], element_dates: Dict[str, List[Dict[str, Any]]]):
+    def _extract_dates_from_elements(self, elements: List[Dict[str, Any]],
+                                     element_dates: Dict[str, List[Dict[str, Any]]],
+                                     texts: Optional[Dict[str, str]] = None):
         """
         Extract dates from individual XLSX elements.
 
+        The texts of all elements are extracted in one batch, so repeated cell values
+        are only analyzed once and the document's date time budget applies.
+
         Args:
             elements: List of document elements
             element_dates: Dictionary to store extracted dates by element ID
+            texts: Optional texts by element ID to extract in the same batch
         """
         if not self.date_extractor:
             return
 
+        texts = dict(texts or {})
         for element in elements:
             element_id = element.get("element_id")
             element_type = element.get("element_type", "")
@@ -474,17 +482,19 @@ class XlsxParser(DocumentParser):
                     text_content = self._resolve_element_text(location_data)
 
                     if text_content and text_content.strip():
-                        # Extract dates from this element's text
-                        element_date_list = self.date_extractor.extract_dates_as_dicts(text_content)
-
-                        if element_date_list:
-                            element_dates[element_id] = element_date_list
-                            logger.debug(f"Extracted {len(element_date_list)} dates from {element_type} element")
+                        texts[element_id] = text_content
 
                 except Exception as e:
-                    logger.debug(f"Error extracting dates from element {element_id}: {e}")
+                    logger.debug(f"Error resolving text of element {element_id}: {e}")
                     continue
 
+        element_ids = list(texts)
+        results = self.date_extractor.extract_dates_batch_as_dicts([texts[element_id] for element_id in element_ids])
+        for element_id, element_date_list in zip(element_ids, results):
+            if element_date_list:
+                element_dates[element_id] = element_date_list
+                logger.debug(f"Extracted {len(element_date_list)} dates from element {element_id}")
+
     """
     Fix all ReadOnly worksheet compatibility issues in the Excel parser.
     """
@@ -1280,6 +1290,18 @@ class XlsxParser(DocumentParser):
         # Default: return the content as is
         return content.strip()
 
+    def _open_document(self, content: bytes) -> Any:
+        """
+        Open a XLSX workbook from source bytes.
+
+        Args:
+            content: Source content
+
+        Returns:
+            Opened workbook
+        """
+        return openpyxl.load_workbook(io.BytesIO(content), read_only=True, data_only=not self.extract_formulas)
+
     def _resolve_element_content(self, location_data: Dict[str, Any],
                                  source_content: Optional[Union[str, bytes]]) -> str:
         """
@@ -1299,6 +1321,7 @@ class XlsxParser(DocumentParser):
         # Load the document if source content is not provided
         wb = None
         temp_file = None
+        cached_document = None
         try:
             if source_content is None:
                 # Check if source is a file path
@@ -1309,6 +1332,12 @@ class XlsxParser(DocumentParser):
                         raise ValueError(f"Error loading XLSX document: {str(e)}")
                 else:
                     raise ValueError(f"Source file not found: {source}")
+            elif self.document_cache is not None:
+                # Reuse the document opened for other elements of the same source
+                try:
+                    wb = cached_document = self._acquire_cached_document(source_content)
+                except Exception as e:
+                    raise ValueError(f"Error loading XLSX document: {str(e)}")
             else:
                 # Save content to a temporary file
                 if not os.path.exists(self.temp_dir):
@@ -1462,8 +1491,10 @@ class XlsxParser(DocumentParser):
                 return "\n".join(sheet_content)
 
         finally:
-            # Close workbook
-            if wb:
+            # Close workbook; cached workbooks stay open for other elements
+            if cached_document is not None:
+                self._release_cached_document(cached_document)
+            elif wb:
                 wb.close()
 
             # Clean up temporary file
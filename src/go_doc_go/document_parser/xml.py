@@ -66,6 +66,9 @@ class XmlParser(DocumentParser):
         self.max_year = self.config.get("max_year", 2100)
         self.fiscal_year_start_month = self.config.get("fiscal_year_start_month", 10)
         self.default_locale = self.config.get("default_locale", "US")
+        self.date_cache_size = self.config.get("date_cache_size", 10000)
+        self.date_time_budget = self.config.get("date_time_budget", 60.0)  # Seconds per document
+        self.date_workers = self.config.get("date_workers", 0)
 
         # Initialize date extractor if enabled
         self.date_extractor = None
@@ -76,7 +79,10 @@ class XmlParser(DocumentParser):
                     min_year=self.min_year,
                     max_year=self.max_year,
                     fiscal_year_start_month=self.fiscal_year_start_month,
-                    default_locale=self.default_locale
+                    default_locale=self.default_locale,
+                    cache_size=self.date_cache_size,
+                    time_budget=self.date_time_budget,
+                    workers=self.date_workers
                 )
                 # logger.debug("Date extraction enabled with comprehensive temporal analysis for XML")
             except ImportError as e:
@@ -217,17 +223,24 @@ class XmlParser(DocumentParser):
 
         return " ".join(all_text)
 
-    def _extract_dates_from_elements(self, elements: List[Dict[str, Any]], element_dates: Dict[str, List[Dict[str, Any]]]):
+    def _extract_dates_from_elements(self, elements: List[Dict[str, Any]],
+                                     element_dates: Dict[str, List[Dict[str, Any]]],
+                                     texts: Optional[Dict[str, str]] = None):
         """
         Extract dates from individual XML elements.
 
+        The texts of all elements are extracted in one batch, so repeated texts
+        are only analyzed once and the document's date time budget applies.
+
         Args:
             elements: List of document elements
             element_dates: Dictionary to store extracted dates by element ID
+            texts: Optional texts by element ID to extract in the same batch
         """
         if not self.date_extractor:
             return
 
+        texts = dict(texts or {})
         for element in elements:
             element_id = element.get("element_id")
             element_type = element.get("element_type", "")
@@ -244,17 +257,19 @@ class XmlParser(DocumentParser):
                     text_content = self._resolve_element_text(location_data, None)
 
                     if text_content and text_content.strip():
-                        # Extract dates from this element's text
-                        element_date_list = self.date_extractor.extract_dates_as_dicts(text_content)
-
-                        if element_date_list:
-                            element_dates[element_id] = element_date_list
-                            logger.debug(f"Extracted {len(element_date_list)} dates from {element_type} element")
+                        texts[element_id] = text_content
 
                 except Exception as e:
-                    logger.debug(f"Error extracting dates from element {element_id}: {e}")
+                    logger.debug(f"Error resolving text of element {element_id}: {e}")
                     continue
 
+        element_ids = list(texts)
+        results = self.date_extractor.extract_dates_batch_as_dicts([texts[element_id] for element_id in element_ids])
+        for element_id, element_date_list in zip(element_ids, results):
+            if element_date_list:
+                element_dates[element_id] = element_date_list
+                logger.debug(f"Extracted {len(element_date_list)} dates from element {element_id}")
+
     @staticmethod
     def _prepare_namespace_dict(namespaces: Optional[Dict[str, str]]) -> Dict[str, str]:
         """
@@ -1386,14 +1401,10 @@ class XmlParser(DocumentParser):
             try:
                 # Extract dates from the entire XML document
                 full_text = self._extract_xml_text(content)
-                if full_text.strip():
-                    document_dates = self.date_extractor.extract_dates_as_dicts(full_text)
-                    if document_dates:
-                        element_dates[root_id] = document_dates
-                        logger.debug(f"Extracted {len(document_dates)} dates from XML document")
-
-                # Extract dates from individual elements
-                self._extract_dates_from_elements(elements, element_dates)
+
+                # Extract dates from the document and individual elements in one batch
+                texts = {root_id: full_text} if full_text.strip() else {}
+                self._extract_dates_from_elements(elements, element_dates, texts)
 
             except Exception as e:
                 logger.warning(f"Error during XML date extraction: {e}")
@@ -22,6 +22,8 @@ from .loader import (
     OntologyManager
 )
 
+from .compiled import CompiledOntology
+
 from .evaluator import (
     OntologyEvaluator,
     ElementTermMapping,
@@ -50,6 +52,7 @@ __all__ = [
     'OntologyManager',
     
     # Evaluator classes
+    'CompiledOntology',
     'OntologyEvaluator',
     'ElementTermMapping',
     'DomainRelationship',
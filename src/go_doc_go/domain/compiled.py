@@ -0,0 +1,228 @@
+"""
+Compiled form of a domain ontology for fast element evaluation.
+
+Evaluating an ontology rule by rule costs one regex search per pattern rule and
+one cosine similarity per semantic rule for every element. The compiled form
+prepares the ontology once:
+
+- pattern (regex and keyword) rules are grouped per element type and joined into
+  one alternation regex per case sensitivity, so an element that matches no rule
+  is rejected in a single scan
+- all semantic phrases (mapping rules and relationship endpoints) are embedded
+  once into a normalized phrase matrix, so the similarities of an element to
+  every phrase come from one matrix product
+"""
+import logging
+import re
+from typing import Dict, List, Optional, Any, Tuple
+
+import numpy as np
+
+from .ontology import DomainOntology, MappingRule, RuleType
+
+logger = logging.getLogger(__name__)
+
+# Pattern features that cannot be embedded in a combined alternation
+_STANDALONE_PATTERN = re.compile(r"^\(\?[aiLmsux]+\)|\(\?P[<=]|\\[1-9]|\(\?\(")
+
+
+class _PatternGroup:
+    """Pattern rules sharing regex flags, combined into one alternation."""
+
+    def __init__(self, rules: List[Tuple[int, MappingRule]], flags: int, combine: bool = True):
+        self.rules = rules
+        self.combined = None
+        if not rules or not combine:
+            return
+
+        # Zero-width lookahead reports every position where any rule matches
+        alternatives = '|'.join(f"(?P<r{index}>{rule.get_pattern().pattern})" for index, rule in rules)
+        try:
+            self.combined = re.compile(f"(?=(?:{alternatives}))", flags)
+        except re.error as e:
+            logger.debug(f"Could not combine {len(rules)} pattern rules, evaluating them separately: {e}")
+
+    def matching_rules(self, text: str) -> List[int]:
+        """
+        Find the rules whose pattern occurs in text.
+
+        Args:
+            text: Element text
+
+        Returns:
+            Indexes of the matching rules
+        """
+        if not self.rules or not text:
+            return []
+        if self.combined is None:
+            return [index for index, rule in self.rules if rule.get_pattern().search(text)]
+
+        matched = set()
+        first_position = None
+        for match in self.combined.finditer(text):
+            if first_position is None:
+                first_position = match.start()
+            matched.add(int(match.lastgroup[1:]))
+        if first_position is None:
+            return []
+
+        # Another rule may match at a position already claimed by an earlier alternative
+        return [index for index, rule in self.rules
+                if index in matched or rule.get_pattern().search(text, first_position)]
+
+
+class CompiledOntology:
+    """Per-element-type rule indexes and the phrase embedding matrix of an ontology."""
+
+    def __init__(self, ontology: DomainOntology, embedding_provider: Optional[Any] = None):
+        """
+        Compile an ontology.
+
+        Args:
+            ontology: Domain ontology to compile
+            embedding_provider: Optional provider for semantic phrase embeddings
+        """
+        self.ontology = ontology
+        self.embedding_provider = embedding_provider
+
+        # Mapping rules in evaluation order: (term_id, rule)
+        self.rules: List[Tuple[str, MappingRule]] = [
+            (term_id, rule)
+            for term_id, rules in ontology._mappings_by_term.items()
+            for rule in rules
+        ]
+
+        # Semantic phrases used by mapping rules and relationship endpoints
+        phrases = [rule.semantic_phrase for _, rule in self.rules if rule.type == RuleType.SEMANTIC]
+        for rule in ontology.relationship_rules:
+            phrases.extend([rule.source.semantic_phrase, rule.target.semantic_phrase])
+        self.phrase_index: Dict[str, int] = {}
+        for phrase in phrases:
+            if phrase and phrase not in self.phrase_index:
+                self.phrase_index[phrase] = len(self.phrase_index)
+
+        self._phrase_matrix: Optional[np.ndarray] = None
+        self._phrases_embedded = False
+        self._by_element_type: Dict[str, Tuple[List[int], List[_PatternGroup]]] = {}
+
+    def rules_for_element_type(self, element_type: str) -> Tuple[List[int], List[_PatternGroup]]:
+        """
+        Get the rules applying to an element type (compiled on first use).
+
+        Args:
+            element_type: Element type
+
+        Returns:
+            Tuple of (indexes of the applicable rules, pattern groups of its pattern rules)
+        """
+        compiled = self._by_element_type.get(element_type)
+        if compiled is None:
+            indexes = [index for index, (_, rule) in enumerate(self.rules)
+                       if rule.matches_element_type(element_type)]
+
+            by_flags: Dict[int, List[Tuple[int, MappingRule]]] = {}
+            standalone = []
+            for index in indexes:
+                rule = self.rules[index][1]
+                if rule.type not in (RuleType.REGEX, RuleType.KEYWORDS):
+                    continue
+                pattern = rule.get_pattern()
+                if pattern is None or not pattern.pattern:
+                    continue
+                if _STANDALONE_PATTERN.search(pattern.pattern):
+                    standalone.append((index, rule))
+                else:
+                    by_flags.setdefault(pattern.flags, []).append((index, rule))
+
+            groups = [_PatternGroup(rules, flags) for flags, rules in by_flags.items()]
+            if standalone:
+                groups.append(_PatternGroup(standalone, 0, combine=False))
+
+            compiled = (indexes, groups)
+            self._by_element_type[element_type] = compiled
+        return compiled
+
+    def matching_pattern_rules(self, element_type: str, text: str) -> set:
+        """
+        Find the pattern rules for an element type that match text.
+
+        Args:
+            element_type: Element type
+            text: Element text
+
+        Returns:
+            Set of rule indexes
+        """
+        _, groups = self.rules_for_element_type(element_type)
+        matched = set()
+        for group in groups:
+            matched.update(group.matching_rules(text))
+        return matched
+
+    @property
+    def phrase_matrix(self) -> Optional[np.ndarray]:
+        """Normalized phrase embeddings (one row per phrase), embedded on first use."""
+        if not self._phrases_embedded and self.embedding_provider and self.phrase_index:
+            self._phrase_matrix = self._embed_phrases(list(self.phrase_index))
+            self._phrases_embedded = True
+        return self._phrase_matrix
+
+    def phrase_similarities(self, embeddings: List[Any]) -> List[Optional[np.ndarray]]:
+        """
+        Compute the similarity of each embedding to every phrase with one matrix product.
+
+        Args:
+            embeddings: Element embeddings (None for elements without one)
+
+        Returns:
+            Per embedding, a vector of phrase similarities (NaN for phrases that could
+            not be embedded), or None if the element has no usable embedding
+        """
+        results: List[Optional[np.ndarray]] = [None] * len(embeddings)
+        matrix = self.phrase_matrix
+        if matrix is None:
+            return results
+
+        rows = [i for i, embedding in enumerate(embeddings)
+                if embedding is not None and np.size(embedding) == matrix.shape[1]]
+        if len(rows) < sum(embedding is not None for embedding in embeddings):
+            logger.debug(f"Skipping embeddings whose dimensions differ from the phrase embeddings "
+                         f"({matrix.shape[1]})")
+        if not rows:
+            return results
+
+        vectors = np.array([np.asarray(embeddings[i], dtype=np.float32).ravel() for i in rows])
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        similarities = vectors @ matrix.T
+        for row, i in enumerate(rows):
+            results[i] = similarities[row]
+        return results
+
+    def _embed_phrases(self, phrases: List[str]) -> Optional[np.ndarray]:
+        """Embed phrases into a normalized matrix; rows of failed phrases are NaN."""
+        embeddings: List[Optional[Any]] = [None] * len(phrases)
+        generate_batch = getattr(self.embedding_provider, 'generate_batch', None)
+        try:
+            if generate_batch is None:
+                raise AttributeError("generate_batch not available")
+            embeddings = list(generate_batch(phrases))
+        except Exception as e:
+            logger.debug(f"Embedding phrases one at a time: {e}")
+            for i, phrase in enumerate(phrases):
+                try:
+                    embeddings[i] = self.embedding_provider.generate(phrase)
+                except Exception as phrase_error:
+                    logger.error(f"Failed to generate embedding for phrase: {phrase_error}")
+
+        dimensions = next((np.size(e) for e in embeddings if e is not None), None)
+        if dimensions is None:
+            return None
+
+        matrix = np.full((len(phrases), dimensions), np.nan, dtype=np.float32)
+        for i, embedding in enumerate(embeddings):
+            if embedding is not None and np.size(embedding) == dimensions:
+                matrix[i] = np.asarray(embedding, dtype=np.float32).ravel()
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
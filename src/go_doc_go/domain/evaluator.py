@@ -7,15 +7,20 @@ from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 import logging
 
+from .compiled import CompiledOntology
 from .ontology import (
     DomainOntology, 
     MappingRule, 
     RuleType,
+    RelationshipEndpoint,
     RelationshipRule
 )
 
 logger = logging.getLogger(__name__)
 
+# Constraint group of elements that cannot take part in a relationship
+_NO_GROUP = object()
+
 
 @dataclass
 class ElementTermMapping:
@@ -70,6 +75,11 @@ class DomainRelationship:
 class OntologyEvaluator:
     """
     Evaluates elements against domain ontology rules.
+
+    The ontology is compiled once (see CompiledOntology): pattern rules are matched
+    with one combined regex per element type and semantic rules are scored with one
+    matrix product against the phrase embeddings. The phrase similarities of mapped
+    elements are kept so relationship discovery does not recompute them.
     """
     
     def __init__(self, ontology: DomainOntology, 
@@ -83,9 +93,10 @@ class OntologyEvaluator:
         """
         self.ontology = ontology
         self.embedding_provider = embedding_provider
+        self.compiled = CompiledOntology(ontology, embedding_provider)
         
-        # Cache for semantic phrase embeddings
-        self._phrase_embeddings: Dict[str, np.ndarray] = {}
+        # Phrase similarity vectors of evaluated elements, keyed by element_id
+        self._element_similarities: Dict[str, Optional[np.ndarray]] = {}
     
     def map_element_to_terms(self, element: Dict[str, Any]) -> List[ElementTermMapping]:
         """
@@ -102,31 +113,58 @@ class OntologyEvaluator:
         Returns:
             List of term mappings (can be multiple terms per element)
         """
-        mappings = []
+        return self.map_elements_to_terms([element])[0]
+    
+    def map_elements_to_terms(self, elements: List[Dict[str, Any]]) -> List[List[ElementTermMapping]]:
+        """
+        Map a batch of elements to domain terms, scoring all semantic rules with one matrix product.
         
-        for term_id, rules in self.ontology._mappings_by_term.items():
-            for rule in rules:
-                # Check element type filter
-                if not rule.matches_element_type(element.get('element_type', '')):
-                    continue
-                
-                # Evaluate rule
-                confidence = self._evaluate_mapping_rule(element, rule)
+        Args:
+            elements: Element dictionaries as accepted by map_element_to_terms
+            
+        Returns:
+            Term mappings for each element, in input order
+        """
+        compiled = self.compiled
+        has_semantic_rules = any(rule.type == RuleType.SEMANTIC for _, rule in compiled.rules)
+        if has_semantic_rules and not self.embedding_provider:
+            logger.warning("No embedding provider for semantic matching")
+        
+        similarities = compiled.phrase_similarities([element.get('embedding') for element in elements]) \
+            if has_semantic_rules else [None] * len(elements)
+        
+        results = []
+        for element, element_similarities in zip(elements, similarities):
+            element_type = element.get('element_type', '')
+            if element_similarities is not None:
+                self._element_similarities[element['element_id']] = element_similarities
+            
+            rule_indexes, _ = compiled.rules_for_element_type(element_type)
+            matched_patterns = compiled.matching_pattern_rules(element_type, element.get('text', ''))
+            
+            mappings = []
+            for index in rule_indexes:
+                term_id, rule = compiled.rules[index]
+                confidence = self._rule_confidence(rule, index, matched_patterns, element_similarities)
                 
                 if confidence is not None:
-                    mapping = ElementTermMapping(
+                    mappings.append(ElementTermMapping(
                         element_pk=element['element_pk'],
                         element_id=element['element_id'],
                         term_id=term_id,
                         domain=self.ontology.name,
                         confidence=confidence,
                         mapping_rule=rule.type.value
-                    )
-                    mappings.append(mapping)
+                    ))
                     logger.debug(f"Mapped element {element['element_id']} to term {term_id} "
                                f"with confidence {confidence:.3f} using {rule.type.value}")
+            results.append(mappings)
         
-        return mappings
+        return results
+    
+    def reset_element_scores(self) -> None:
+        """Forget the phrase similarities kept for evaluated elements."""
+        self._element_similarities.clear()
     
     def discover_relationships(self, 
                               elements_with_terms: Dict[str, List[Tuple[Dict, ElementTermMapping]]],
@@ -134,6 +172,10 @@ class OntologyEvaluator:
         """
         Discover relationships between elements based on their term mappings.
         
+        Candidates are filtered by their endpoint similarity once, then paired only
+        within the same constraint group (document or parent) instead of across the
+        full cross product.
+        
         Args:
             elements_with_terms: Dictionary mapping term_id to list of (element, mapping) tuples
             element_lookup: Dictionary for quick element lookup by ID
@@ -142,26 +184,49 @@ class OntologyEvaluator:
             List of discovered domain relationships
         """
         relationships = []
+        if not self.ontology.relationship_rules:
+            return relationships
+        if not self.embedding_provider:
+            logger.warning("No embedding provider for relationship evaluation")
+            return relationships
         
         for rule in self.ontology.relationship_rules:
-            # Get candidate source and target elements
-            source_candidates = elements_with_terms.get(rule.source.term_id, [])
-            target_candidates = elements_with_terms.get(rule.target.term_id, [])
+            # Get candidate source and target elements above their endpoint thresholds
+            source_candidates = self._endpoint_candidates(elements_with_terms.get(rule.source.term_id, []),
+                                                          rule.source)
+            if not source_candidates:
+                continue
+            target_candidates = self._endpoint_candidates(elements_with_terms.get(rule.target.term_id, []),
+                                                          rule.target)
+            if not target_candidates:
+                continue
+            
+            # Index targets by the group a source must share with them
+            targets_by_group: Dict[Any, List[Tuple[Dict, ElementTermMapping, float]]] = {}
+            for candidate in target_candidates:
+                group = self._constraint_group(candidate[0], rule.constraints)
+                if group is not _NO_GROUP:
+                    targets_by_group.setdefault(group, []).append(candidate)
             
-            for source_elem, source_mapping in source_candidates:
-                for target_elem, target_mapping in target_candidates:
+            for source_elem, source_mapping, source_similarity in source_candidates:
+                group = self._constraint_group(source_elem, rule.constraints)
+                if group is _NO_GROUP:
+                    continue
+                
+                for target_elem, target_mapping, target_similarity in targets_by_group.get(group, []):
                     # Skip self-relationships
                     if source_elem['element_id'] == target_elem['element_id']:
                         continue
                     
-                    # Check constraints
+                    # Check remaining constraints (direction)
                     if not self._check_constraints(source_elem, target_elem, rule.constraints):
                         continue
                     
                     # Evaluate relationship
                     relationship = self._evaluate_relationship_rule(
-                        source_elem, target_elem, 
-                        source_mapping, target_mapping, 
+                        source_elem, target_elem,
+                        source_mapping, target_mapping,
+                        source_similarity, target_similarity,
                         rule
                     )
                     
@@ -184,97 +249,78 @@ class OntologyEvaluator:
         
         return relationships
     
-    def _evaluate_mapping_rule(self, element: Dict[str, Any], rule: MappingRule) -> Optional[float]:
+    def _rule_confidence(self, rule: MappingRule, index: int, matched_patterns: set,
+                         similarities: Optional[np.ndarray]) -> Optional[float]:
         """
-        Evaluate a single mapping rule against an element.
+        Get the confidence of a mapping rule for an element from its precomputed matches.
         
         Returns:
             Confidence score if rule matches, None otherwise
         """
-        element_text = element.get('text', '')
-        
         if rule.type == RuleType.SEMANTIC:
-            # Semantic similarity matching
-            if not self.embedding_provider:
-                logger.warning("No embedding provider for semantic matching")
-                return None
-                
-            element_embedding = element.get('embedding')
-            if element_embedding is None:
-                return None
-                
-            # Get or compute phrase embedding
-            phrase_embedding = self._get_phrase_embedding(rule.semantic_phrase)
-            if phrase_embedding is None:
+            phrase = self.compiled.phrase_index.get(rule.semantic_phrase)
+            if similarities is None or rule.confidence_threshold is None or phrase is None:
+                # No phrase to compare with (e.g. an empty semantic_phrase): the rule does not match
                 return None
-                
-            # Calculate similarity
-            similarity = self._cosine_similarity(element_embedding, phrase_embedding)
-            
-            # Check threshold
+            similarity = float(similarities[phrase])
             if similarity >= rule.confidence_threshold:
                 return similarity
             return None
             
-        elif rule.type == RuleType.REGEX:
-            # Regex pattern matching
-            pattern = rule.get_pattern()
-            if pattern and pattern.search(element_text):
-                return 1.0
-            return None
-            
-        elif rule.type == RuleType.KEYWORDS:
-            # Keywords matching (internally uses regex)
-            pattern = rule.get_pattern()
-            if pattern and pattern.search(element_text):
-                return 1.0
-            return None
+        elif rule.type in (RuleType.REGEX, RuleType.KEYWORDS):
+            return 1.0 if index in matched_patterns else None
             
         else:
             logger.warning(f"Unknown rule type: {rule.type}")
             return None
     
+    def _endpoint_candidates(self, candidates: List[Tuple[Dict, ElementTermMapping]],
+                             endpoint: RelationshipEndpoint) -> List[Tuple[Dict, ElementTermMapping, float]]:
+        """
+        Keep the candidates whose similarity to the endpoint phrase reaches its threshold.
+        
+        Returns:
+            List of (element, mapping, similarity) tuples
+        """
+        if not candidates:
+            return []
+        
+        # Score elements not seen by map_elements_to_terms from their own embeddings
+        missing = [elem for elem, _ in candidates
+                   if elem['element_id'] not in self._element_similarities and elem.get('embedding') is not None]
+        if missing:
+            scored = self.compiled.phrase_similarities([elem['embedding'] for elem in missing])
+            for elem, similarities in zip(missing, scored):
+                self._element_similarities[elem['element_id']] = similarities
+        
+        phrase = self.compiled.phrase_index.get(endpoint.semantic_phrase)
+        if phrase is None:
+            return []
+        
+        results = []
+        for elem, mapping in candidates:
+            similarities = self._element_similarities.get(elem['element_id'])
+            if similarities is None:
+                continue
+            similarity = float(similarities[phrase])
+            if similarity >= endpoint.confidence_threshold:
+                results.append((elem, mapping, similarity))
+        return results
+    
     def _evaluate_relationship_rule(self, 
                                    source_elem: Dict[str, Any],
                                    target_elem: Dict[str, Any],
                                    source_mapping: ElementTermMapping,
                                    target_mapping: ElementTermMapping,
+                                   source_similarity: float,
+                                   target_similarity: float,
                                    rule: RelationshipRule) -> Optional[DomainRelationship]:
         """
-        Evaluate a relationship rule for a pair of elements.
+        Evaluate a relationship rule for a pair of elements whose endpoint similarities passed.
         
         Returns:
             DomainRelationship if rule matches with sufficient confidence, None otherwise
         """
-        if not self.embedding_provider:
-            logger.warning("No embedding provider for relationship evaluation")
-            return None
-        
-        # Get element embeddings
-        source_embedding = source_elem.get('embedding')
-        target_embedding = target_elem.get('embedding')
-        
-        if source_embedding is None or target_embedding is None:
-            return None
-        
-        # Evaluate source semantic similarity
-        source_phrase_embedding = self._get_phrase_embedding(rule.source.semantic_phrase)
-        if source_phrase_embedding is None:
-            return None
-        source_similarity = self._cosine_similarity(source_embedding, source_phrase_embedding)
-        
-        if source_similarity < rule.source.confidence_threshold:
-            return None
-        
-        # Evaluate target semantic similarity
-        target_phrase_embedding = self._get_phrase_embedding(rule.target.semantic_phrase)
-        if target_phrase_embedding is None:
-            return None
-        target_similarity = self._cosine_similarity(target_embedding, target_phrase_embedding)
-        
-        if target_similarity < rule.target.confidence_threshold:
-            return None
-        
         # Calculate combined confidence
         combined_confidence = rule.confidence.calculate(source_similarity, target_similarity)
         
@@ -299,6 +345,30 @@ class OntologyEvaluator:
             }
         )
     
+    @staticmethod
+    def _constraint_group(elem: Dict[str, Any], constraints: Optional[Any]) -> Any:
+        """
+        Get the group an element must share with a related element under the hierarchy constraint.
+        
+        Returns:
+            Group key (None when unconstrained), or _NO_GROUP if the element cannot be related
+        """
+        if not constraints or constraints.hierarchy_level is None:
+            return None
+        
+        # -1 = same document
+        if constraints.hierarchy_level == -1:
+            return elem.get('doc_id')
+        
+        # 0 = same parent, 1 = same grandparent, etc. (compared on the parent for now)
+        if constraints.hierarchy_level >= 0:
+            parent_id = elem.get('parent_id')
+            if constraints.hierarchy_level > 0 and not parent_id:
+                return _NO_GROUP
+            return parent_id
+        
+        return None
+    
     def _check_constraints(self, source_elem: Dict[str, Any], 
                           target_elem: Dict[str, Any],
                           constraints: Optional[Any]) -> bool:
@@ -366,22 +436,6 @@ class OntologyEvaluator:
         
         return ancestor1 == ancestor2
     
-    def _get_phrase_embedding(self, phrase: str) -> Optional[np.ndarray]:
-        """Get or compute embedding for a semantic phrase."""
-        if phrase in self._phrase_embeddings:
-            return self._phrase_embeddings[phrase]
-        
-        if self.embedding_provider:
-            try:
-                embedding = self.embedding_provider.generate(phrase)
-                self._phrase_embeddings[phrase] = embedding
-                return embedding
-            except Exception as e:
-                logger.error(f"Failed to generate embedding for phrase: {e}")
-                return None
-        
-        return None
-    
     @staticmethod
     def _cosine_similarity(vec1: np.ndarray, vec2: np.ndarray) -> float:
         """Calculate cosine similarity between two vectors."""
@@ -1,17 +1,34 @@
 """Automatically generated __init__.py"""
-__all__ = ['ContextualEmbeddingGenerator', 'EmbeddingGenerator', 'FastEmbedGenerator', 'HuggingFaceEmbeddingGenerator',
-           'OpenAIEmbeddingGenerator', 'base', 'contextual_embedding', 'factory', 'fastembed',
-           'get_embedding_generator', 'hugging_face', 'openai']
+__all__ = ['ContextualEmbeddingGenerator', 'EmbeddingCache', 'EmbeddingGenerator', 'EmbeddingScheduler',
+           'EmbeddingServer', 'EmbeddingTicket', 'FastEmbedGenerator', 'HuggingFaceEmbeddingGenerator',
+           'MemoryEmbeddingCache', 'OpenAIEmbeddingGenerator', 'RemoteEmbeddingGenerator', 'SQLiteEmbeddingCache',
+           'TieredEmbeddingCache', 'base', 'cache', 'contextual_embedding', 'create_embedding_cache',
+           'create_embedding_provider', 'estimate_tokens', 'factory', 'fastembed', 'get_embedding_generator',
+           'hugging_face', 'openai', 'scheduler', 'server']
 
 from . import base
+from . import cache
 from . import contextual_embedding
 from . import factory
 from . import fastembed
 from . import hugging_face
 from . import openai
+from . import scheduler
+from . import server
 from .base import EmbeddingGenerator
+from .cache import EmbeddingCache
+from .cache import MemoryEmbeddingCache
+from .cache import SQLiteEmbeddingCache
+from .cache import TieredEmbeddingCache
+from .cache import create_embedding_cache
 from .contextual_embedding import ContextualEmbeddingGenerator
+from .factory import create_embedding_provider
 from .factory import get_embedding_generator
 from .fastembed import FastEmbedGenerator
 from .hugging_face import HuggingFaceEmbeddingGenerator
 from .openai import OpenAIEmbeddingGenerator
+from .scheduler import EmbeddingScheduler
+from .scheduler import EmbeddingTicket
+from .scheduler import estimate_tokens
+from .server import EmbeddingServer
+from .server import RemoteEmbeddingGenerator
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 
 from ..config import Config
 
@@ -9,6 +9,12 @@ class EmbeddingGenerator(ABC):
 
     _config: Config
 
+    # Optional EmbeddingScheduler that batches texts across calls and documents
+    scheduler = None
+
+    # Whether generate_from_elements only depends on each element's own content
+    embeds_element_content = False
+
     def __init__(self, _config: Config):
         """
         Initialize the base class with a config.
@@ -84,3 +90,50 @@ class EmbeddingGenerator(ABC):
             Dictionary mapping element_id to embedding
         """
         pass
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for texts through the scheduler, if one is attached.
+
+        Args:
+            texts: List of input texts
+
+        Returns:
+            List of vector embeddings
+        """
+        if not texts:
+            return []
+        if self.scheduler is not None:
+            return self.scheduler.embed(texts)
+        return self.generate_batch(texts)
+
+    @staticmethod
+    def select_element_content(elements: List[Dict[str, Any]]) -> List[Tuple[int, str]]:
+        """
+        Select the elements that are embedded from their own content.
+
+        Args:
+            elements: List of document elements
+
+        Returns:
+            List of (element index, content) pairs, skipping root and empty elements
+        """
+        return [
+            (index, element.get("content_preview", ""))
+            for index, element in enumerate(elements)
+            if element["element_type"] != "root" and element.get("content_preview", "")
+        ]
+
+    def generate_from_element_content(self, elements: List[Dict[str, Any]]) -> Dict[int, List[float]]:
+        """
+        Embed the content of each non-root element in batches.
+
+        Args:
+            elements: List of document elements with element_pk assigned
+
+        Returns:
+            Dictionary mapping element_pk to embedding
+        """
+        selected = self.select_element_content(elements)
+        vectors = self.embed_texts([content for _, content in selected])
+        return {elements[index]["element_pk"]: vector for (index, _), vector in zip(selected, vectors)}
@@ -0,0 +1,472 @@
+"""
+Embedding caches for the embedding generators.
+
+Generators look up embeddings by the hash of the input text. Caches are bound
+to one (model name, dimensions) namespace, so the same text embedded by
+different models never collides. Three implementations are provided:
+
+- MemoryEmbeddingCache: bounded, thread-safe in-process LRU
+- SQLiteEmbeddingCache: single-file persistent cache shared by runs, threads
+  and processes (WAL mode), with a size cap and LRU or LFU eviction
+- TieredEmbeddingCache: a memory tier in front of a persistent tier
+
+Configuration lives under ``embedding.cache``::
+
+    embedding:
+      cache:
+        memory_entries: 10000                # in-process front tier
+        path: "./data/embedding_cache.db"    # enables the persistent tier
+        max_size_mb: 1024                    # persistent size cap
+        eviction: "lru"                      # or "lfu"
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..storage.embedding_matrix import pack_embedding, unpack_embedding
+
+logger = logging.getLogger(__name__)
+
+EVICTION_POLICIES = ('lru', 'lfu')
+
+
+class EmbeddingCache(ABC):
+    """Abstract base class for embedding caches keyed by text hash."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[List[float]]:
+        """
+        Get a cached embedding.
+
+        Args:
+            key: Text hash
+
+        Returns:
+            Embedding, or None on a miss
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: str, embedding: List[float]) -> None:
+        """
+        Cache an embedding.
+
+        Args:
+            key: Text hash
+            embedding: Embedding vector
+        """
+        pass
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, List[float]]:
+        """
+        Get several cached embeddings.
+
+        Args:
+            keys: Text hashes
+
+        Returns:
+            Dictionary of the keys that were found
+        """
+        found = {}
+        for key in keys:
+            embedding = self.get(key)
+            if embedding is not None:
+                found[key] = embedding
+        return found
+
+    def set_many(self, embeddings: Dict[str, List[float]]) -> None:
+        """
+        Cache several embeddings.
+
+        Args:
+            embeddings: Dictionary mapping text hash to embedding
+        """
+        for key, embedding in embeddings.items():
+            self.set(key, embedding)
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove all embeddings in this cache's namespace."""
+        pass
+
+    @abstractmethod
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get cache metrics.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate and size information
+        """
+        pass
+
+    def close(self) -> None:
+        """Release resources held by the cache."""
+        pass
+
+    @staticmethod
+    def _hit_rate(hits: int, misses: int) -> float:
+        total = hits + misses
+        return hits / total if total else 0.0
+
+
+class MemoryEmbeddingCache(EmbeddingCache):
+    """Bounded, thread-safe in-process LRU cache."""
+
+    def __init__(self, max_entries: int = 10000):
+        """
+        Initialize the memory cache.
+
+        Args:
+            max_entries: Maximum number of cached embeddings
+        """
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be at least 1, got {max_entries}")
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return embedding
+
+    def set(self, key: str, embedding: List[float]) -> None:
+        with self._lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self._hit_rate(self.hits, self.misses),
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "evictions": self.evictions,
+            }
+
+
+class SQLiteEmbeddingCache(EmbeddingCache):
+    """
+    Persistent embedding cache in a single SQLite file.
+
+    The file can be shared by any number of threads and processes: it uses WAL
+    journaling and a busy timeout, and every process keeps its own connection.
+    Access times and hit counts for eviction are recorded in batches to keep
+    reads from turning into a write per lookup.
+    """
+
+    # Pending access updates written together
+    TOUCH_BATCH_SIZE = 256
+
+    # After exceeding the cap, evict down to this fraction of it
+    EVICTION_TARGET = 0.9
+
+    def __init__(self, path: str, model_name: str, dimensions: int, max_size_mb: float = 1024,
+                 eviction: str = 'lru', timeout: float = 30.0):
+        """
+        Initialize the persistent cache.
+
+        Args:
+            path: Path of the SQLite cache file
+            model_name: Embedding model name (part of the cache key)
+            dimensions: Embedding dimensions (part of the cache key)
+            max_size_mb: Size cap for stored embeddings across all models, in megabytes
+            eviction: Eviction policy, 'lru' or 'lfu'
+            timeout: Seconds to wait for a lock held by another process
+        """
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError(f"eviction must be one of {EVICTION_POLICIES}, got {eviction!r}")
+
+        self.path = path
+        self.model_name = model_name
+        self.dimensions = dimensions
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.eviction = eviction
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._touched: Dict[str, int] = {}
+        self._lock = threading.RLock()
+
+        # Running estimate of the stored size; the exact size is only computed near the cap
+        self._approx_bytes: Optional[int] = None
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                model TEXT NOT NULL,
+                dimensions INTEGER NOT NULL,
+                text_hash TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                last_access REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (model, dimensions, text_hash)
+            );
+            CREATE INDEX IF NOT EXISTS idx_embedding_cache_last_access ON embedding_cache(last_access);
+        """)
+
+    def get(self, key: str) -> Optional[List[float]]:
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, List[float]]:
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock:
+            # Stay well below SQLite's bound parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ', '.join('?' * len(chunk))
+                rows = self.conn.execute(
+                    f"SELECT text_hash, embedding FROM embedding_cache "
+                    f"WHERE model = ? AND dimensions = ? AND text_hash IN ({placeholders})",
+                    [self.model_name, self.dimensions, *chunk]
+                ).fetchall()
+                for text_hash, blob in rows:
+                    found[text_hash] = unpack_embedding(blob)
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+            for key in found:
+                self._touched[key] = self._touched.get(key, 0) + 1
+            if len(self._touched) >= self.TOUCH_BATCH_SIZE:
+                self._write(lambda: None)
+        return found
+
+    def set(self, key: str, embedding: List[float]) -> None:
+        self.set_many({key: embedding})
+
+    def set_many(self, embeddings: Dict[str, List[float]]) -> None:
+        if not embeddings:
+            return
+        now = time.time()
+        rows = [(self.model_name, self.dimensions, key, pack_embedding(embedding), now)
+                for key, embedding in embeddings.items()]
+
+        def insert():
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO embedding_cache (model, dimensions, text_hash, embedding, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+
+        with self._lock:
+            self._write(insert)
+            if self._approx_bytes is None:
+                self._approx_bytes = self._stored_size()[1]
+            else:
+                self._approx_bytes += sum(len(row[3]) for row in rows)
+            if self._approx_bytes > self.max_bytes:
+                self._evict_if_needed()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._touched.clear()
+            self._write(lambda: self.conn.execute(
+                "DELETE FROM embedding_cache WHERE model = ? AND dimensions = ?",
+                (self.model_name, self.dimensions)
+            ))
+
+    def get_statistics(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size_bytes = self._stored_size()
+            model_entries = self.conn.execute(
+                "SELECT COUNT(*) FROM embedding_cache WHERE model = ? AND dimensions = ?",
+                (self.model_name, self.dimensions)
+            ).fetchone()[0]
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self._hit_rate(self.hits, self.misses),
+                "entries": model_entries,
+                "total_entries": entries,
+                "size_bytes": size_bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+                "eviction": self.eviction,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self.conn is None:
+                return
+            try:
+                self._write(lambda: None)
+            finally:
+                self.conn.close()
+                self.conn = None
+
+    def _write(self, operation) -> None:
+        """
+        Run a write in one transaction together with any pending access updates.
+
+        Must be called with the lock held.
+        """
+        touched, self._touched = self._touched, {}
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            if touched:
+                self.conn.executemany(
+                    "UPDATE embedding_cache SET last_access = ?, hits = hits + ? "
+                    "WHERE model = ? AND dimensions = ? AND text_hash = ?",
+                    [(now, count, self.model_name, self.dimensions, key) for key, count in touched.items()]
+                )
+            operation()
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def _stored_size(self):
+        """Return the number of stored embeddings and their total size in bytes."""
+        return self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(embedding)), 0) FROM embedding_cache"
+        ).fetchone()
+
+    def _evict_if_needed(self) -> None:
+        """Evict the least recently (or frequently) used embeddings once over the size cap."""
+        entries, size_bytes = self._stored_size()
+        self._approx_bytes = size_bytes
+        if size_bytes <= self.max_bytes or not entries:
+            return
+
+        average = size_bytes / entries
+        count = int((size_bytes - self.max_bytes * self.EVICTION_TARGET) / average) + 1
+        order = "last_access" if self.eviction == 'lru' else "hits, last_access"
+
+        def evict():
+            self.conn.execute(
+                f"DELETE FROM embedding_cache WHERE rowid IN "
+                f"(SELECT rowid FROM embedding_cache ORDER BY {order} LIMIT ?)",
+                (count,)
+            )
+
+        self._write(evict)
+        self._approx_bytes = self._stored_size()[1]
+        self.evictions += count
+        logger.debug(f"Evicted {count} embeddings from cache {self.path}")
+
+
+class TieredEmbeddingCache(EmbeddingCache):
+    """Bounded memory tier in front of a persistent cache."""
+
+    def __init__(self, front: MemoryEmbeddingCache, back: EmbeddingCache):
+        """
+        Initialize the tiered cache.
+
+        Args:
+            front: In-process memory tier
+            back: Persistent tier
+        """
+        self.front = front
+        self.back = back
+
+    def get(self, key: str) -> Optional[List[float]]:
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, List[float]]:
+        found = {}
+        missing = []
+        for key in keys:
+            embedding = self.front.get(key)
+            if embedding is not None:
+                found[key] = embedding
+            else:
+                missing.append(key)
+
+        if missing:
+            promoted = self.back.get_many(missing)
+            for key, embedding in promoted.items():
+                self.front.set(key, embedding)
+            found.update(promoted)
+        return found
+
+    def set(self, key: str, embedding: List[float]) -> None:
+        self.set_many({key: embedding})
+
+    def set_many(self, embeddings: Dict[str, List[float]]) -> None:
+        for key, embedding in embeddings.items():
+            self.front.set(key, embedding)
+        self.back.set_many(embeddings)
+
+    def clear(self) -> None:
+        self.front.clear()
+        self.back.clear()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        front = self.front.get_statistics()
+        back = self.back.get_statistics()
+        hits = front["hits"] + back["hits"]
+        return {
+            "hits": hits,
+            "misses": back["misses"],
+            "hit_rate": self._hit_rate(hits, back["misses"]),
+            "memory": front,
+            "persistent": back,
+        }
+
+    def close(self) -> None:
+        self.back.close()
+
+
+def create_embedding_cache(config, model_name: str, dimensions: int) -> EmbeddingCache:
+    """
+    Create the embedding cache for a generator from the ``embedding.cache`` configuration.
+
+    Args:
+        config: Configuration object (may be None)
+        model_name: Embedding model name
+        dimensions: Embedding dimensions
+
+    Returns:
+        Memory cache, or a tiered cache when a persistent path is configured
+    """
+    embedding_config = config.config.get("embedding", {}) if config is not None and hasattr(config, "config") else {}
+    cache_config = embedding_config.get("cache") or {}
+
+    front = MemoryEmbeddingCache(cache_config.get("memory_entries", 10000))
+    path = cache_config.get("path")
+    if not path:
+        return front
+
+    back = SQLiteEmbeddingCache(
+        path,
+        model_name,
+        dimensions,
+        max_size_mb=cache_config.get("max_size_mb", 1024),
+        eviction=cache_config.get("eviction", "lru")
+    )
+    logger.info(f"Using persistent embedding cache at {path}")
+    return TieredEmbeddingCache(front, back)
@@ -518,20 +518,25 @@ class ContextualEmbeddingGenerator(EmbeddingGenerator):
         Generate contextual embeddings for document elements, with size handling:
         - Skip root elements that exceed the size threshold
         - Truncate non-root elements that exceed the size threshold
-        
+
+        The context index is built once per document, so selecting the context of
+        each element is proportional to the number of context elements. The combined
+        texts are embedded together through the base generator's batched path.
+
         Args:
             elements: List of document elements to generate embeddings for
             db: Optional database connection for cross-document relationships
         """
-        # Build element hierarchy
-        hierarchy = self._build_element_hierarchy(elements)
+        # Build element hierarchy and neighbour lists once for the document
+        index = self._build_context_index(elements)
         resolver = create_content_resolver(self._config)
 
         # Define maximum content size for effective embedding (approximate word count)
         max_words_for_embedding = 500
 
-        # Generate embeddings with context
-        embeddings = {}
+        # Combined texts to embed, keyed by element_pk
+        element_pks = []
+        combined_texts = []
 
         for element in elements:
             element_pk = element["element_pk"]
@@ -554,7 +559,7 @@ class ContextualEmbeddingGenerator(EmbeddingGenerator):
                 content = " ".join(content.split()[:max_words_for_embedding])
 
             # Get context elements
-            context_elements = self._get_context_elements(element, elements, hierarchy, db)
+            context_elements = self._get_context_elements(element, elements, index["hierarchy"], db, index)
 
             # Get context contents using the resolver for text
             context_contents = []
@@ -567,11 +572,15 @@ class ContextualEmbeddingGenerator(EmbeddingGenerator):
                         ctx_content = " ".join(ctx_content.split()[:max_words_for_embedding])
                     context_contents.append(ctx_content)
 
-            # Generate embedding with context
-            embedding = self.generate(content, context_contents)
-            embeddings[element_pk] = embedding
+            element_pks.append(element_pk)
+            if context_contents:
+                combined_texts.append(self._combine_text_with_context(content, context_contents))
+            else:
+                combined_texts.append(content)
 
-        return embeddings
+        # Generate embeddings for all combined texts in batches
+        vectors = self.base_generator.embed_texts(combined_texts)
+        return dict(zip(element_pks, vectors))
 
     @staticmethod
     def _build_element_hierarchy(elements: List[Dict[str, Any]]) -> Dict[str, List[str]]:
@@ -598,10 +607,75 @@ class ContextualEmbeddingGenerator(EmbeddingGenerator):
 
         return hierarchy
 
+    def _build_context_index(self, elements: List[Dict[str, Any]],
+                             hierarchy: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
+        """
+        Build the per-document lookups used to select context elements.
+
+        Neighbour lists hold only meaningful elements (see _is_meaningful_context) and
+        are limited to the configured predecessor, successor and child counts.
+
+        Args:
+            elements: List of document elements in document order
+            hierarchy: Element hierarchy (built from elements if not provided)
+
+        Returns:
+            Dictionary with the hierarchy, element_id to element and element_id to
+            position maps, and the meaningful predecessors and successors of each
+            position and children of each element_id
+        """
+        if hierarchy is None:
+            hierarchy = self._build_element_hierarchy(elements)
+
+        id_to_element = {e["element_id"]: e for e in elements}
+        positions = {}
+        for i, e in enumerate(elements):
+            positions.setdefault(e["element_id"], i)
+
+        meaningful = [self._is_meaningful_context(e) for e in elements]
+
+        # Nearest meaningful elements before each position, closest first
+        predecessors = []
+        recent = []
+        for i, element in enumerate(elements):
+            predecessors.append(recent[::-1])
+            if meaningful[i] and self.predecessor_count > 0:
+                recent = (recent + [element])[-self.predecessor_count:]
+
+        # Nearest meaningful elements after each position, closest first
+        successors = [None] * len(elements)
+        upcoming = []
+        for i in range(len(elements) - 1, -1, -1):
+            successors[i] = upcoming
+            if meaningful[i] and self.successor_count > 0:
+                upcoming = ([elements[i]] + upcoming)[:self.successor_count]
+
+        children = {}
+        if self.child_count > 0:
+            for parent_id, child_ids in hierarchy.items():
+                selected = []
+                for child_id in child_ids:
+                    child_element = id_to_element.get(child_id)
+                    if child_element and self._is_meaningful_context(child_element):
+                        selected.append(child_element)
+                        if len(selected) >= self.child_count:
+                            break
+                children[parent_id] = selected
+
+        return {
+            "hierarchy": hierarchy,
+            "id_to_element": id_to_element,
+            "positions": positions,
+            "predecessors": predecessors,
+            "successors": successors,
+            "children": children
+        }
+
     def _get_context_elements(self, element: Dict[str, Any],
                               all_elements: List[Dict[str, Any]],
                               hierarchy: Dict[str, List[str]],
-                              db=None) -> List[Dict[str, Any]]:
+                              db=None,
+                              index: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
         Get context elements for an element.
 
@@ -617,15 +691,17 @@ class ContextualEmbeddingGenerator(EmbeddingGenerator):
             all_elements: List of all elements
             hierarchy: Element hierarchy
             db: Database connection for cross-document relationships (optional)
+            index: Context index from _build_context_index (built from all_elements if not provided)
 
         Returns:
             List of context elements
         """
-        element_id = element["element_id"]
-        context_ids = set()
+        if index is None:
+            index = self._build_context_index(all_elements, hierarchy)
 
-        # Build a mapping from element_id to element for quicker lookups
-        id_to_element = {e["element_id"]: e for e in all_elements}
+        element_id = element["element_id"]
+        id_to_element = index["id_to_element"]
+        context_ids = {}
 
         # Add ancestors up to configured depth
         current_element = element
@@ -643,10 +719,8 @@ class ContextualEmbeddingGenerator(EmbeddingGenerator):
                 break  # Parent not found
 
             # Only include parent if it has content and is not an empty container
-            if (parent_element.get("content_preview") and
-                    parent_element["element_type"] != "root" and
-                    not self._is_empty_container(parent_element)):
-                context_ids.add(parent_id)
+            if self._is_meaningful_context(parent_element):
+                context_ids[parent_id] = parent_element
                 ancestors_added += 1
 
             # Move up to the next level, even if we skipped this parent
@@ -657,70 +731,18 @@ class ContextualEmbeddingGenerator(EmbeddingGenerator):
             if current_depth > 10:  # Arbitrary depth limit
                 break
 
-        # Find meaningful predecessors and successors
-        current_index = -1
-        for i, e in enumerate(all_elements):
-            if e["element_id"] == element_id:
-                current_index = i
-                break
-
-        if current_index >= 0:
-            # Get meaningful predecessors (elements that come before)
-            pred_count = 0
-            i = current_index - 1
-
-            while i >= 0 and pred_count < self.predecessor_count:
-                pred_element = all_elements[i]
-
-                # Skip elements that:
-                # 1. Are root elements
-                # 2. Don't have content (empty content_preview)
-                # 3. Are just container elements
-                if (pred_element["element_type"] != "root" and
-                        pred_element.get("content_preview") and
-                        not self._is_empty_container(pred_element)):
-                    context_ids.add(pred_element["element_id"])
-                    pred_count += 1
-
-                i -= 1
-
-            # Get meaningful successors (elements that come after)
-            succ_count = 0
-            i = current_index + 1
-
-            while i < len(all_elements) and succ_count < self.successor_count:
-                succ_element = all_elements[i]
-
-                # Same filtering as for predecessors
-                if (succ_element["element_type"] != "root" and
-                        succ_element.get("content_preview") and
-                        not self._is_empty_container(succ_element)):
-                    context_ids.add(succ_element["element_id"])
-                    succ_count += 1
-
-                i += 1
+        # Add meaningful predecessors and successors
+        current_index = index["positions"].get(element_id)
+        if current_index is not None:
+            for neighbour in index["predecessors"][current_index] + index["successors"][current_index]:
+                context_ids.setdefault(neighbour["element_id"], neighbour)
 
         # Add a limited number of meaningful children
-        if element_id in hierarchy and self.child_count > 0:
-            children_added = 0
-
-            for child_id in hierarchy[element_id]:
-                # Apply same filtering as for predecessors/successors
-                child_element = id_to_element.get(child_id)
-                if (child_element and
-                        child_element["element_type"] != "root" and
-                        child_element.get("content_preview") and
-                        not self._is_empty_container(child_element)):
-                    context_ids.add(child_id)
-                    children_added += 1
-                    if children_added >= self.child_count:
-                        break
-
-        # Convert IDs to elements
-        context_elements = []
-        for context_id in context_ids:
-            if context_id in id_to_element:
-                context_elements.append(id_to_element[context_id])
+        for child_element in index["children"].get(element_id, []):
+            context_ids.setdefault(child_element["element_id"], child_element)
+
+        # Context elements in order: ancestors, predecessors, successors, children
+        context_elements = list(context_ids.values())
 
         # Add cross-document relationships if database is available
         if db and hasattr(element, 'get') and element.get('element_pk'):
@@ -815,3 +837,19 @@ class ContextualEmbeddingGenerator(EmbeddingGenerator):
             return not content or content in ["", "..."]
 
         return False
+
+    @classmethod
+    def _is_meaningful_context(cls, element: Dict[str, Any]) -> bool:
+        """
+        Check if an element is worth including as context: not a root, has
+        content, and is not an empty container.
+
+        Args:
+            element: The element to check
+
+        Returns:
+            True if the element can be used as context, False otherwise
+        """
+        return (element["element_type"] != "root" and
+                bool(element.get("content_preview")) and
+                not cls._is_empty_container(element))
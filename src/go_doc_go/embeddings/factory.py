@@ -4,8 +4,11 @@ This module generates vector embeddings for document elements,
 with support for different embedding models and contextual embeddings.
 """
 import logging
+from typing import Optional
+
 from .base import EmbeddingGenerator
 from .contextual_embedding import ContextualEmbeddingGenerator
+from .scheduler import EmbeddingScheduler
 from ..config import Config
 
 logger = logging.getLogger(__name__)
@@ -37,9 +40,9 @@ except ImportError:
     logger.warning("FastEmbed not available. Install with: pip install fastembed")
 
 
-def get_embedding_generator(config: Config) -> EmbeddingGenerator:
+def create_embedding_provider(config: Config) -> EmbeddingGenerator:
     """
-    Factory function to create embedding generator from configuration.
+    Create the generator of the configured embedding provider, without batching or context.
 
     Args:
         config: Configuration object
@@ -91,6 +94,34 @@ def get_embedding_generator(config: Config) -> EmbeddingGenerator:
         base_generator = HuggingFaceEmbeddingGenerator(config, model)
         logger.info(f"Created Hugging Face embedding generator with model {model}")
 
+    return base_generator
+
+
+def get_embedding_generator(config: Config, base_generator: Optional[EmbeddingGenerator] = None) -> EmbeddingGenerator:
+    """
+    Factory function to create embedding generator from configuration.
+
+    Args:
+        config: Configuration object
+        base_generator: Optional generator to use instead of creating the configured
+            provider, such as a client of a shared EmbeddingServer
+
+    Returns:
+        EmbeddingGenerator instance
+    """
+    embeddings = config.config.get("embedding", {})
+
+    if base_generator is None:
+        base_generator = create_embedding_provider(config)
+
+    # Batch texts across elements and documents into size- and token-bounded batches
+    base_generator.scheduler = EmbeddingScheduler(
+        base_generator,
+        max_batch_size=embeddings.get("batch_size", 32),
+        max_batch_tokens=embeddings.get("max_batch_tokens", 8192),
+        max_wait=embeddings.get("max_batch_wait_time", 0) / 1000.0
+    )
+
     # Add contextual embedding if configured
     if embeddings.get("contextual", False):
         window_size = embeddings.get("window_size", 3)
@@ -3,6 +3,7 @@ import logging
 from typing import List, Dict, Any, Optional
 
 from .base import EmbeddingGenerator
+from .cache import create_embedding_cache
 from ..config import Config
 
 logger = logging.getLogger(__name__)
@@ -21,6 +22,8 @@ except ImportError:
 class FastEmbedGenerator(EmbeddingGenerator):
     """Embedding generator using FastEmbed models."""
 
+    embeds_element_content = True
+
     # Default model dimensions (can be overridden in config)
     MODEL_DIMENSIONS = {
         "BAAI/bge-small-en-v1.5": 384,
@@ -49,12 +52,14 @@ class FastEmbedGenerator(EmbeddingGenerator):
         self.model_name = model_name
         self.configured_dimensions = dimensions
         self.cache_dir = cache_dir
-        self.cache = {}  # Simple cache for embeddings
         self.model = None
 
         # Load the model
         self._load_model()
 
+        # Bounded memory cache, backed by a persistent cache when embedding.cache.path is set
+        self.cache = create_embedding_cache(_config, self.model_name, self.get_dimensions())
+
     def _load_model(self) -> None:
         """Load the FastEmbed model."""
         try:
@@ -76,8 +81,9 @@ class FastEmbedGenerator(EmbeddingGenerator):
 
         # Check cache
         cache_key = self._get_cache_key(text)
-        if cache_key in self.cache:
-            return self.cache[cache_key]
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
 
         # Generate embedding
         try:
@@ -93,7 +99,7 @@ class FastEmbedGenerator(EmbeddingGenerator):
             embedding = embeddings[0].tolist()
 
             # Cache embedding
-            self.cache[cache_key] = embedding
+            self.cache.set(cache_key, embedding)
 
             return embedding
 
@@ -107,7 +113,8 @@ class FastEmbedGenerator(EmbeddingGenerator):
         if not texts:
             return []
 
-        # Check cache for each text
+        # Check cache for all texts at once
+        cached = self.cache.get_many(self._get_cache_key(text) for text in texts if text)
         results = []
         uncached_texts = []
         uncached_indices = []
@@ -118,8 +125,8 @@ class FastEmbedGenerator(EmbeddingGenerator):
                 results.append([0.0] * self.get_dimensions())
             else:
                 cache_key = self._get_cache_key(text)
-                if cache_key in self.cache:
-                    results.append(self.cache[cache_key])
+                if cache_key in cached:
+                    results.append(cached[cache_key])
                 else:
                     # Mark for batch processing
                     uncached_texts.append(text)
@@ -137,11 +144,12 @@ class FastEmbedGenerator(EmbeddingGenerator):
                 embeddings = list(self.model.embed(uncached_texts))
 
                 # Update results and cache
+                new_embeddings = {}
                 for i, embedding in zip(uncached_indices, embeddings):
                     embedding_list = embedding.tolist()
                     results[i] = embedding_list
-                    cache_key = self._get_cache_key(texts[i])
-                    self.cache[cache_key] = embedding_list
+                    new_embeddings[self._get_cache_key(texts[i])] = embedding_list
+                self.cache.set_many(new_embeddings)
 
             except Exception as e:
                 logger.error(f"Error generating batch FastEmbed embeddings: {str(e)}")
@@ -167,7 +175,7 @@ class FastEmbedGenerator(EmbeddingGenerator):
 
     def clear_cache(self) -> None:
         """Clear the embedding cache."""
-        self.cache = {}
+        self.cache.clear()
 
     @staticmethod
     def _get_cache_key(text: str) -> str:
@@ -184,22 +192,5 @@ class FastEmbedGenerator(EmbeddingGenerator):
 
     def generate_from_elements(self, elements: List[Dict[str, Any]], db=None) -> Dict[str, List[float]]:
         """Generate embeddings for document elements."""
-        embeddings = {}
-
-        for element in elements:
-            element_pk = element["element_pk"]
-
-            # Skip root element
-            if element["element_type"] == "root":
-                continue
-
-            # Get content from preview
-            content = element.get("content_preview", "")
-            if not content:
-                continue
-
-            # Generate embedding directly from content
-            embedding = self.generate(content)
-            embeddings[element_pk] = embedding
-
-        return embeddings
+        # Embed non-root content previews in batches (through the scheduler when one is attached)
+        return self.generate_from_element_content(elements)
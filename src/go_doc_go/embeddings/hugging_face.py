@@ -3,6 +3,7 @@ import logging
 from typing import List, Dict, Any
 
 from .base import EmbeddingGenerator
+from .cache import create_embedding_cache
 from ..config import Config
 
 logger = logging.getLogger(__name__)
@@ -21,6 +22,8 @@ except ImportError:
 class HuggingFaceEmbeddingGenerator(EmbeddingGenerator):
     """Embedding generator using Hugging Face Sentence Transformers."""
 
+    embeds_element_content = True
+
     def __init__(self, _config: Config, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
         """
         Initialize the Hugging Face embedding generator.
@@ -34,11 +37,13 @@ class HuggingFaceEmbeddingGenerator(EmbeddingGenerator):
 
         self.model_name = model_name
         self.model = None
-        self.cache = {}  # Simple cache for embeddings
 
         # Load model
         self._load_model()
 
+        # Bounded memory cache, backed by a persistent cache when embedding.cache.path is set
+        self.cache = create_embedding_cache(_config, self.model_name, self.get_dimensions())
+
     def generate(self, text: str) -> List[float]:
         """Generate embedding for text."""
         if not text:
@@ -47,8 +52,9 @@ class HuggingFaceEmbeddingGenerator(EmbeddingGenerator):
 
         # Check cache
         cache_key = self._get_cache_key(text)
-        if cache_key in self.cache:
-            return self.cache[cache_key]
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
 
         # Generate embedding
         try:
@@ -83,7 +89,7 @@ class HuggingFaceEmbeddingGenerator(EmbeddingGenerator):
                 embedding = embedding.tolist()
 
             # Cache embedding
-            self.cache[cache_key] = embedding
+            self.cache.set(cache_key, embedding)
 
             return embedding
 
@@ -97,7 +103,8 @@ class HuggingFaceEmbeddingGenerator(EmbeddingGenerator):
         if not texts:
             return []
 
-        # Check cache for each text
+        # Check cache for all texts at once
+        cached = self.cache.get_many(self._get_cache_key(text) for text in texts if text)
         results = []
         uncached_texts = []
         uncached_indices = []
@@ -108,8 +115,8 @@ class HuggingFaceEmbeddingGenerator(EmbeddingGenerator):
                 results.append([0.0] * self.get_dimensions())
             else:
                 cache_key = self._get_cache_key(text)
-                if cache_key in self.cache:
-                    results.append(self.cache[cache_key])
+                if cache_key in cached:
+                    results.append(cached[cache_key])
                 else:
                     # Mark for batch processing
                     uncached_texts.append(text)
@@ -151,10 +158,11 @@ class HuggingFaceEmbeddingGenerator(EmbeddingGenerator):
                     embeddings = embeddings.tolist()
 
                 # Update results and cache
+                new_embeddings = {}
                 for i, embedding in zip(uncached_indices, embeddings):
                     results[i] = embedding
-                    cache_key = self._get_cache_key(texts[i])
-                    self.cache[cache_key] = embedding
+                    new_embeddings[self._get_cache_key(texts[i])] = embedding
+                self.cache.set_many(new_embeddings)
 
             except Exception as e:
                 logger.error(f"Error generating batch embeddings: {str(e)}")
@@ -178,7 +186,7 @@ class HuggingFaceEmbeddingGenerator(EmbeddingGenerator):
 
     def clear_cache(self) -> None:
         """Clear the embedding cache."""
-        self.cache = {}
+        self.cache.clear()
 
     def _load_model(self) -> None:
         """Load the embedding model."""
@@ -208,22 +216,5 @@ class HuggingFaceEmbeddingGenerator(EmbeddingGenerator):
 
     def generate_from_elements(self, elements: List[Dict[str, Any]], db=None) -> Dict[str, List[float]]:
         """Generate embeddings for document elements."""
-        embeddings = {}
-
-        for element in elements:
-            element_pk = element["element_pk"]
-
-            # Skip root element
-            if element["element_type"] == "root":
-                continue
-
-            # Get content from preview
-            content = element.get("content_preview", "")
-            if not content:
-                continue
-
-            # Generate embedding directly from content
-            embedding = self.generate(content)
-            embeddings[element_pk] = embedding
-
-        return embeddings
+        # Embed non-root content previews in batches (through the scheduler when one is attached)
+        return self.generate_from_element_content(elements)
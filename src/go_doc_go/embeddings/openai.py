@@ -4,6 +4,7 @@ import os
 from typing import List, Dict, Any, Optional
 
 from .base import EmbeddingGenerator
+from .cache import create_embedding_cache
 from ..config import Config
 
 logger = logging.getLogger(__name__)
@@ -22,6 +23,8 @@ except ImportError:
 class OpenAIEmbeddingGenerator(EmbeddingGenerator):
     """Embedding generator using OpenAI's embedding models."""
 
+    embeds_element_content = True
+
     # Default model dimensions (can be overridden in config)
     MODEL_DIMENSIONS = {
         "text-embedding-ada-002": 1536,
@@ -47,11 +50,13 @@ class OpenAIEmbeddingGenerator(EmbeddingGenerator):
         self.model_name = model_name
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
         self.configured_dimensions = dimensions
-        self.cache = {}  # Simple cache for embeddings
 
         # Set up the client
         self._initialize_client()
 
+        # Bounded memory cache, backed by a persistent cache when embedding.cache.path is set
+        self.cache = create_embedding_cache(_config, self.model_name, self.get_dimensions())
+
     def _initialize_client(self) -> None:
         """Initialize the OpenAI client."""
         if not self.api_key:
@@ -68,8 +73,9 @@ class OpenAIEmbeddingGenerator(EmbeddingGenerator):
 
         # Check cache
         cache_key = self._get_cache_key(text)
-        if cache_key in self.cache:
-            return self.cache[cache_key]
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
 
         # Generate embedding
         try:
@@ -83,7 +89,7 @@ class OpenAIEmbeddingGenerator(EmbeddingGenerator):
             embedding = response.data[0].embedding
 
             # Cache embedding
-            self.cache[cache_key] = embedding
+            self.cache.set(cache_key, embedding)
 
             return embedding
 
@@ -97,7 +103,8 @@ class OpenAIEmbeddingGenerator(EmbeddingGenerator):
         if not texts:
             return []
 
-        # Check cache for each text
+        # Check cache for all texts at once
+        cached = self.cache.get_many(self._get_cache_key(text) for text in texts if text)
         results = list()
         uncached_texts = list()
         uncached_indices = list()
@@ -108,8 +115,8 @@ class OpenAIEmbeddingGenerator(EmbeddingGenerator):
                 results.append([0.0] * self.get_dimensions())
             else:
                 cache_key = self._get_cache_key(text)
-                if cache_key in self.cache:
-                    results.append(self.cache[cache_key])
+                if cache_key in cached:
+                    results.append(cached[cache_key])
                 else:
                     # Mark for batch processing
                     uncached_texts.append(text)
@@ -129,10 +136,11 @@ class OpenAIEmbeddingGenerator(EmbeddingGenerator):
                 embeddings = [item.embedding for item in response.data]
 
                 # Update results and cache
+                new_embeddings = {}
                 for i, idx in enumerate(uncached_indices):
                     results[idx] = embeddings[i]
-                    cache_key = self._get_cache_key(texts[idx])
-                    self.cache[cache_key] = embeddings[i]
+                    new_embeddings[self._get_cache_key(texts[idx])] = embeddings[i]
+                self.cache.set_many(new_embeddings)
 
             except Exception as e:
                 logger.error(f"Error generating batch OpenAI embeddings: {str(e)}")
@@ -158,7 +166,7 @@ class OpenAIEmbeddingGenerator(EmbeddingGenerator):
 
     def clear_cache(self) -> None:
         """Clear the embedding cache."""
-        self.cache = {}
+        self.cache.clear()
 
     @staticmethod
     def _get_cache_key(text: str) -> str:
@@ -175,22 +183,5 @@ class OpenAIEmbeddingGenerator(EmbeddingGenerator):
 
     def generate_from_elements(self, elements: List[Dict[str, Any]], db=None) -> Dict[str, List[float]]:
         """Generate embeddings for document elements."""
-        embeddings = {}
-
-        for element in elements:
-            element_pk = element["element_pk"]
-
-            # Skip root element
-            if element["element_type"] == "root":
-                continue
-
-            # Get content from preview
-            content = element.get("content_preview", "")
-            if not content:
-                continue
-
-            # Generate embedding directly from content
-            embedding = self.generate(content)
-            embeddings[element_pk] = embedding
-
-        return embeddings
+        # Embed non-root content previews in batches (through the scheduler when one is attached)
+        return self.generate_from_element_content(elements)
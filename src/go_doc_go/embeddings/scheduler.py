@@ -0,0 +1,272 @@
+"""
+Embedding scheduler that batches texts across elements and documents.
+
+Callers submit texts and receive a ticket; pending texts from all callers are
+grouped into batches bounded by size and by an estimated token budget, and
+each batch is embedded with a single ``generate_batch`` call. Batches are run
+by the threads that wait for results, so no background thread is needed:
+
+- a batch runs as soon as it is full (size or token budget)
+- otherwise it runs when a caller waits and the oldest pending text has been
+  queued for at least ``max_wait`` seconds (0 means immediately)
+
+Submitting several documents before waiting on any of them therefore embeds
+them together.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import List, Optional, Callable, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text (about four characters per token).
+
+    Args:
+        text: Input text
+
+    Returns:
+        Estimated token count (at least 1)
+    """
+    return max(1, len(text) // 4)
+
+
+class EmbeddingTicket:
+    """Handle for the embeddings of one submission."""
+
+    def __init__(self, scheduler: 'EmbeddingScheduler', count: int):
+        self._scheduler = scheduler
+        self.vectors: List[Optional[List[float]]] = [None] * count
+        self.queued = count
+        self.remaining = count
+        self.error: Optional[BaseException] = None
+
+    @property
+    def done(self) -> bool:
+        """Whether all embeddings for this submission are available."""
+        return self.remaining == 0 or self.error is not None
+
+    def result(self, timeout: Optional[float] = None) -> List[List[float]]:
+        """
+        Wait for the embeddings, running pending batches if needed.
+
+        Args:
+            timeout: Maximum time to wait in seconds (None waits indefinitely)
+
+        Returns:
+            Embeddings in submission order
+        """
+        return self._scheduler.wait(self, timeout)
+
+
+class EmbeddingScheduler:
+    """Token-budgeted batching of embedding requests for one generator."""
+
+    def __init__(self, generator, max_batch_size: int = 32, max_batch_tokens: int = 8192,
+                 max_wait: float = 0.0, token_counter: Optional[Callable[[str], int]] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            generator: Embedding generator whose generate_batch is called
+            max_batch_size: Maximum number of texts per batch
+            max_batch_tokens: Maximum estimated tokens per batch (longest text times batch size)
+            max_wait: Seconds a pending text may wait for more texts before its batch runs
+            token_counter: Function estimating the tokens of a text
+        """
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be at least 1, got {max_batch_size}")
+        if max_batch_tokens < 1:
+            raise ValueError(f"max_batch_tokens must be at least 1, got {max_batch_tokens}")
+
+        self.generator = generator
+        self.max_batch_size = max_batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.max_wait = max_wait
+        self.token_counter = token_counter or estimate_tokens
+
+        # Pending items: (ticket, index, text, tokens, submitted_at)
+        self._pending = deque()
+        self._cond = threading.Condition()
+
+        # Throughput counters
+        self._texts = 0
+        self._batches = 0
+        self._tokens = 0
+        self._padded_tokens = 0
+        self._busy_seconds = 0.0
+
+    def submit(self, texts: List[str]) -> EmbeddingTicket:
+        """
+        Queue texts for embedding.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Ticket that yields the embeddings in the same order
+        """
+        ticket = EmbeddingTicket(self, len(texts))
+        now = time.monotonic()
+        with self._cond:
+            for index, text in enumerate(texts):
+                self._pending.append((ticket, index, text, self.token_counter(text or ''), now))
+
+        # Run batches that are already full
+        while True:
+            with self._cond:
+                batch = self._take_batch(full_only=True)
+            if not batch:
+                break
+            self._run(batch)
+        return ticket
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts, batching them with texts queued by other callers.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Embeddings in the same order as texts
+        """
+        if not texts:
+            return []
+        return self.submit(texts).result()
+
+    def wait(self, ticket: EmbeddingTicket, timeout: Optional[float] = None) -> List[List[float]]:
+        """
+        Wait until a ticket is complete, running pending batches when they are due.
+
+        Args:
+            ticket: Ticket returned by submit
+            timeout: Maximum time to wait in seconds (None waits indefinitely)
+
+        Returns:
+            Embeddings in submission order
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._cond:
+                if ticket.done:
+                    break
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("Timed out waiting for embeddings")
+
+                batch = None
+                if ticket.queued:
+                    age = time.monotonic() - self._pending[0][4]
+                    if age >= self.max_wait:
+                        batch = self._take_batch(full_only=False)
+                    else:
+                        delay = self.max_wait - age
+                        self._cond.wait(delay if remaining is None else min(delay, remaining))
+                        continue
+                else:
+                    # Another caller is embedding the rest of this ticket
+                    self._cond.wait(remaining)
+                    continue
+
+            self._run(batch)
+
+        if ticket.error is not None:
+            raise ticket.error
+        return ticket.vectors
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get throughput counters.
+
+        Returns:
+            Dictionary with text, batch and token counts, texts per second of
+            embedding time, average batch size and the share of padding tokens
+        """
+        with self._cond:
+            return {
+                "texts": self._texts,
+                "batches": self._batches,
+                "tokens": self._tokens,
+                "padded_tokens": self._padded_tokens,
+                "busy_seconds": self._busy_seconds,
+                "texts_per_second": self._texts / self._busy_seconds if self._busy_seconds else 0.0,
+                "average_batch_size": self._texts / self._batches if self._batches else 0.0,
+                "padding_waste": 1.0 - self._tokens / self._padded_tokens if self._padded_tokens else 0.0,
+                "pending": len(self._pending),
+            }
+
+    def reset_statistics(self) -> None:
+        """Reset the throughput counters."""
+        with self._cond:
+            self._texts = self._batches = self._tokens = self._padded_tokens = 0
+            self._busy_seconds = 0.0
+
+    def _take_batch(self, full_only: bool) -> list:
+        """
+        Remove the next batch from the pending queue. Must be called with the lock held.
+
+        The batch grows while both the size limit and the token budget (the
+        longest text times the batch size, as padded by the model) allow it.
+
+        Args:
+            full_only: Only return a batch if it is full
+
+        Returns:
+            List of pending items, possibly empty
+        """
+        batch = []
+        longest = 0
+        full = False
+        for item in self._pending:
+            tokens = item[3]
+            if len(batch) >= self.max_batch_size or (batch and max(longest, tokens) * (len(batch) + 1) >
+                                                     self.max_batch_tokens):
+                full = True
+                break
+            batch.append(item)
+            longest = max(longest, tokens)
+
+        if not batch or (full_only and not full):
+            return []
+
+        for ticket, _, _, _, _ in batch:
+            self._pending.popleft()
+            ticket.queued -= 1
+        return batch
+
+    def _run(self, batch: list) -> None:
+        """Embed a batch and deliver the results to its tickets."""
+        texts = [item[2] for item in batch]
+        tokens = [item[3] for item in batch]
+
+        start = time.perf_counter()
+        try:
+            vectors = self.generator.generate_batch(texts)
+            error = None
+        except Exception as e:
+            logger.error(f"Error generating batch of {len(texts)} embeddings: {str(e)}")
+            vectors = None
+            error = e
+        elapsed = time.perf_counter() - start
+
+        with self._cond:
+            for position, (ticket, index, _, _, _) in enumerate(batch):
+                if error is not None:
+                    ticket.error = error
+                else:
+                    ticket.vectors[index] = vectors[position]
+                ticket.remaining -= 1
+
+            self._texts += len(batch)
+            self._batches += 1
+            self._tokens += sum(tokens)
+            self._padded_tokens += max(tokens) * len(tokens)
+            self._busy_seconds += elapsed
+            self._cond.notify_all()
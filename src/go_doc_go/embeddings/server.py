@@ -0,0 +1,313 @@
+"""
+Embedding server shared by the worker processes on one host.
+
+Worker processes get around the GIL but would each load their own copy of the
+embedding model. Instead, one server process loads the model and the workers
+send their texts to it through RemoteEmbeddingGenerator. The server reads the
+requests of all workers before embedding any of them, so the scheduler groups
+texts from different workers into the same model batches.
+"""
+
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+from multiprocessing.connection import Client, Listener, wait
+from typing import Any, Dict, List, Tuple
+
+from .base import EmbeddingGenerator
+from .scheduler import EmbeddingScheduler, EmbeddingTicket
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def serve_embeddings(config_data: Dict[str, Any], authkey: bytes, ready) -> None:
+    """
+    Entry point of the embedding server process.
+
+    Loads the configured embedding model, reports the listening address through
+    ready and answers requests until the process is terminated.
+
+    Args:
+        config_data: Configuration dictionary
+        authkey: Key workers authenticate with
+        ready: Connection receiving ('ready', address) or ('error', message)
+    """
+    from .factory import create_embedding_provider
+
+    # Workers finish their documents on Ctrl-C; the manager stops the server afterwards
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.set())
+
+    try:
+        config = Config()
+        config.config = config_data
+        embeddings = config_data.get("embedding", {})
+
+        generator = create_embedding_provider(config)
+        generator.scheduler = EmbeddingScheduler(
+            generator,
+            max_batch_size=embeddings.get("batch_size", 32),
+            max_batch_tokens=embeddings.get("max_batch_tokens", 8192)
+        )
+        listener = Listener(family='AF_UNIX' if hasattr(socket, 'AF_UNIX') else 'AF_INET', authkey=authkey)
+    except Exception as e:
+        ready.send(('error', str(e)))
+        return
+
+    ready.send(('ready', listener.address))
+    ready.close()
+    logger.info(f"Embedding server for {generator.get_model_name()} listening at {listener.address}")
+
+    try:
+        run_embedding_server(generator, listener, stopping)
+    finally:
+        cache = getattr(generator, 'cache', None)
+        if cache is not None:
+            cache.close()
+
+
+def run_embedding_server(generator: EmbeddingGenerator, listener: Listener, stopping: threading.Event) -> None:
+    """
+    Answer embedding requests of the clients connecting to listener until stopping is set.
+
+    Args:
+        generator: Embedding generator with a scheduler attached
+        listener: Listener the clients connect to (closed on return)
+        stopping: Event that stops the server
+    """
+    scheduler = generator.scheduler
+    info = {"model_name": generator.get_model_name(), "dimensions": generator.get_dimensions()}
+    connections = []
+    lock = threading.Lock()
+
+    def accept_loop():
+        while not stopping.is_set():
+            try:
+                conn = listener.accept()
+            except Exception as e:
+                if stopping.is_set():
+                    return
+                logger.warning(f"Embedding server rejected a connection: {str(e)}")
+                continue
+            with lock:
+                connections.append(conn)
+
+    threading.Thread(target=accept_loop, name="embedding-server-accept", daemon=True).start()
+
+    try:
+        while not stopping.is_set():
+            with lock:
+                current = list(connections)
+            if not current:
+                stopping.wait(0.1)
+                continue
+
+            requests = []
+            for conn in wait(current, timeout=0.1):
+                try:
+                    requests.append((conn, conn.recv()))
+                except (EOFError, OSError):
+                    # The worker exited
+                    with lock:
+                        connections.remove(conn)
+                    conn.close()
+
+            # Submit all requests before waiting on any, so texts of different workers share batches
+            pending = []
+            for conn, (operation, payload) in requests:
+                if operation == 'embed':
+                    pending.append((conn, scheduler.submit(payload)))
+                elif operation == 'info':
+                    pending.append((conn, info))
+                elif operation == 'clear_cache':
+                    generator.clear_cache()
+                    pending.append((conn, None))
+                elif operation == 'statistics':
+                    pending.append((conn, scheduler.get_statistics()))
+                else:
+                    pending.append((conn, ValueError(f"Unknown embedding server operation: {operation}")))
+
+            for conn, result in pending:
+                try:
+                    if isinstance(result, Exception):
+                        raise result
+                    if isinstance(result, EmbeddingTicket):
+                        result = result.result()
+                    response = ('ok', result)
+                except Exception as e:
+                    response = ('error', str(e))
+                try:
+                    conn.send(response)
+                except OSError:
+                    with lock:
+                        if conn in connections:
+                            connections.remove(conn)
+    finally:
+        stopping.set()
+        listener.close()
+        with lock:
+            for conn in connections:
+                conn.close()
+
+
+class EmbeddingServer:
+    """
+    Handle for an embedding server process started by a worker manager.
+
+    start() returns once the model is loaded, so worker processes started
+    afterwards never wait for the model or load it themselves.
+    """
+
+    def __init__(self, config_data: Dict[str, Any], context=None):
+        """
+        Initialize the server handle.
+
+        Args:
+            config_data: Configuration dictionary (the embedding section selects the model)
+            context: Optional multiprocessing context (spawn by default)
+        """
+        self.config_data = config_data
+        self.context = context or multiprocessing.get_context("spawn")
+        self.authkey = os.urandom(32)
+        self.address = None
+        self.process = None
+
+    @property
+    def connection_info(self) -> Tuple[Any, bytes]:
+        """Address and key that RemoteEmbeddingGenerator connects with."""
+        return self.address, self.authkey
+
+    def start(self, timeout: float = 600.0) -> None:
+        """
+        Start the server process and wait until the model is loaded.
+
+        Args:
+            timeout: Maximum seconds to wait for the model to load
+
+        Raises:
+            RuntimeError: If the server fails to start
+        """
+        receiver, sender = self.context.Pipe(duplex=False)
+        self.process = self.context.Process(target=serve_embeddings, name="embedding-server",
+                                            args=(self.config_data, self.authkey, sender), daemon=True)
+        self.process.start()
+        sender.close()
+
+        if not receiver.poll(timeout):
+            self.stop()
+            raise RuntimeError(f"Embedding server did not start within {timeout} seconds")
+        try:
+            status, result = receiver.recv()
+        except EOFError:
+            self.process.join(5)
+            status, result = 'error', f"process exited with code {self.process.exitcode}"
+        finally:
+            receiver.close()
+
+        if status != 'ready':
+            self.stop()
+            raise RuntimeError(f"Embedding server failed to start: {result}")
+
+        self.address = result
+        logger.info(f"Started embedding server at {self.address}")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        Stop the server process.
+
+        Args:
+            timeout: Seconds to wait for the process to exit before killing it
+        """
+        if self.process is None:
+            return
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join()
+        self.process = None
+        logger.info("Stopped embedding server")
+
+
+class RemoteEmbeddingGenerator(EmbeddingGenerator):
+    """Embedding generator that embeds texts in a shared EmbeddingServer."""
+
+    embeds_element_content = True
+
+    def __init__(self, _config: Config, address: Any, authkey: bytes):
+        """
+        Initialize the client and read the model details from the server.
+
+        Args:
+            _config: The Config
+            address: Address of the embedding server
+            authkey: Key of the embedding server
+        """
+        super().__init__(_config)
+        self.address = address
+        self.authkey = authkey
+        self._conn = None
+        self._lock = threading.Lock()
+
+        info = self._request('info')
+        self.model_name = info["model_name"]
+        self.dimensions = info["dimensions"]
+
+    def _request(self, operation: str, payload: Any = None) -> Any:
+        """Send a request to the server and return its result."""
+        with self._lock:
+            if self._conn is None:
+                self._conn = Client(self.address, authkey=self.authkey)
+            self._conn.send((operation, payload))
+            status, result = self._conn.recv()
+        if status == 'error':
+            raise RuntimeError(f"Embedding server error: {result}")
+        return result
+
+    def generate(self, text: str) -> List[float]:
+        """Generate embedding for text."""
+        return self.generate_batch([text])[0]
+
+    def generate_batch(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for multiple texts."""
+        if not texts:
+            return []
+        return self._request('embed', list(texts))
+
+    def get_dimensions(self) -> int:
+        """Get embedding dimensions."""
+        return self.dimensions
+
+    def get_model_name(self) -> str:
+        """Get embedding model name."""
+        return self.model_name
+
+    def clear_cache(self) -> None:
+        """Clear the embedding cache of the server."""
+        self._request('clear_cache')
+
+    def get_server_statistics(self) -> Dict[str, Any]:
+        """
+        Get the throughput counters of the server's scheduler.
+
+        Returns:
+            Scheduler statistics across all workers
+        """
+        return self._request('statistics')
+
+    def generate_from_elements(self, elements: List[Dict[str, Any]], db=None) -> Dict[str, List[float]]:
+        """Generate embeddings for document elements."""
+        return self.generate_from_element_content(elements)
+
+    def close(self) -> None:
+        """Close the connection to the server."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
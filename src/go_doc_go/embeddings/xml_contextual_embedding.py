@@ -533,15 +533,16 @@ class XMLContextualEmbeddingGenerator(ContextualEmbeddingGenerator):
             # Use parent implementation for non-XML mode
             return super().generate_from_elements(elements, db)
         
-        # Build element hierarchy
-        hierarchy = self._build_element_hierarchy(elements)
+        # Build element hierarchy and neighbour lists once for the document
+        index = self._build_context_index(elements)
         resolver = create_content_resolver(self._config)
         
         # Maximum content size for effective embedding
         max_words_for_embedding = 500
         
-        # Generate embeddings with XML context
-        embeddings = {}
+        # XML contexts to embed, keyed by element_pk
+        element_pks = []
+        xml_contexts = []
         
         for element in elements:
             element_pk = element["element_pk"]
@@ -561,7 +562,7 @@ class XMLContextualEmbeddingGenerator(ContextualEmbeddingGenerator):
                 content = " ".join(content.split()[:max_words_for_embedding])
             
             # Get context elements (including cross-document if db provided)
-            context_elements = self._get_context_elements(element, elements, hierarchy, db)
+            context_elements = self._get_context_elements(element, elements, index["hierarchy"], db, index)
             
             # Separate contexts by type
             intra_doc_contexts = {"parent": [], "sibling": [], "child": []}
@@ -613,8 +614,9 @@ class XMLContextualEmbeddingGenerator(ContextualEmbeddingGenerator):
                 doc_id=element.get("doc_id", "")
             )
             
-            # Generate embedding using base generator
-            embedding = self.base_generator.generate(xml_context)
-            embeddings[element_pk] = embedding
-            
-        return embeddings
\ No newline at end of file
+            element_pks.append(element_pk)
+            xml_contexts.append(xml_context)
+        
+        # Generate embeddings for all XML contexts in batches using the base generator
+        vectors = self.base_generator.embed_texts(xml_contexts)
+        return dict(zip(element_pks, vectors))
\ No newline at end of file
@@ -100,6 +100,16 @@ class EntityExtractor(ABC):
             True if values match after normalization
         """
         return self.normalize(value1) == self.normalize(value2)
+    
+    @property
+    def scan_patterns(self) -> Optional[List[Pattern]]:
+        """
+        Return the compiled patterns that every extracted entity is matched by.
+        
+        The extraction engine only runs the extractor on texts in which one of these
+        patterns occurs. None means the extractor runs on every text.
+        """
+        return None
 
 
 class RegexExtractor(EntityExtractor):
@@ -149,6 +159,10 @@ class RegexExtractor(EntityExtractor):
     def description(self) -> str:
         return self._description
     
+    @property
+    def scan_patterns(self) -> Optional[List[Pattern]]:
+        return self.patterns
+    
     def extract(self, text: str) -> List[ExtractedEntity]:
         """Extract entities using regex patterns."""
         entities = []
@@ -186,6 +200,8 @@ class ExtractorRegistry:
         """Initialize empty registry."""
         self._extractors: Dict[str, EntityExtractor] = {}
         self._type_extractors: Dict[str, List[str]] = {}  # entity_type -> [extractor_names]
+        self._engine = None  # Compiled extraction engine, built on first use
+        self._engine_options: Dict[str, Any] = {}
     
     def register(self, name: str, extractor: EntityExtractor):
         """
@@ -199,6 +215,7 @@ class ExtractorRegistry:
             logger.warning(f"Overwriting existing extractor: {name}")
         
         self._extractors[name] = extractor
+        self._engine = None
         
         # Track by entity type
         entity_type = extractor.entity_type
@@ -222,6 +239,36 @@ class ExtractorRegistry:
         """Get all registered extractors."""
         return self._extractors.copy()
     
+    def compile(self, workers: Optional[int] = None, process_threshold: Optional[int] = None):
+        """
+        Compile the enabled extractors into an extraction engine.
+        
+        The engine is rebuilt when extractors are registered afterwards.
+        
+        Args:
+            workers: Number of worker processes for batch extraction (0 = in-process)
+            process_threshold: Minimum number of texts in a batch before the process pool is used
+            
+        Returns:
+            The compiled ExtractionEngine
+        """
+        from .engine import ExtractionEngine
+        
+        if workers is not None:
+            self._engine_options['workers'] = workers
+        if process_threshold is not None:
+            self._engine_options['process_threshold'] = process_threshold
+        
+        self._engine = ExtractionEngine(self._extractors, **self._engine_options)
+        return self._engine
+    
+    @property
+    def engine(self):
+        """Get the compiled extraction engine, compiling it if needed."""
+        if self._engine is None:
+            self.compile()
+        return self._engine
+    
     def extract_all(self, text: str, 
                    entity_types: Optional[List[str]] = None) -> List[ExtractedEntity]:
         """
@@ -234,21 +281,25 @@ class ExtractorRegistry:
         Returns:
             List of all extracted entities
         """
-        entities = []
-        
-        if entity_types:
-            # Extract specific types
-            for entity_type in entity_types:
-                for extractor in self.get_by_type(entity_type):
-                    if extractor.enabled:
-                        entities.extend(extractor.extract(text))
-        else:
-            # Extract all types
-            for extractor in self._extractors.values():
-                if extractor.enabled:
-                    entities.extend(extractor.extract(text))
+        return self.engine.extract(text, entity_types)
+    
+    def extract_batch(self, texts: List[str],
+                      entity_types: Optional[List[str]] = None) -> List[List[ExtractedEntity]]:
+        """
+        Run all extractors on a batch of texts.
         
-        return entities
+        Args:
+            texts: Texts to extract from
+            entity_types: Optional list of entity types to extract (None = all)
+            
+        Returns:
+            List of extracted entities per text
+        """
+        return self.engine.extract_batch(texts, entity_types)
+    
+    def get_statistics(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-extractor call counts and timings of the extraction engine."""
+        return self.engine.get_statistics()
 
 
 class CompositeExtractor(EntityExtractor):
@@ -283,6 +334,18 @@ class CompositeExtractor(EntityExtractor):
     def description(self) -> str:
         return self._description
     
+    @property
+    def scan_patterns(self) -> Optional[List[Pattern]]:
+        patterns = []
+        for extractor in self.extractors:
+            if not extractor.enabled:
+                continue
+            extractor_patterns = extractor.scan_patterns
+            if extractor_patterns is None:
+                return None
+            patterns.extend(extractor_patterns)
+        return patterns
+    
     def extract(self, text: str) -> List[ExtractedEntity]:
         """Run all sub-extractors and combine results."""
         entities = []
@@ -0,0 +1,351 @@
+"""
+Compiled extraction engine for an extractor registry.
+
+Running every extractor over every text costs one scan per pattern plus the
+extract() call of each extractor, even though most extractors find nothing in
+most texts. The engine analyzes the scan patterns of all enabled extractors once:
+
+- the literals every match of a pattern must contain (a word, one of several
+  alternatives, or a digit) are collected, and a text is prefiltered with cheap
+  substring tests; only extractors with a pattern whose literals all occur, and
+  extractors without scan patterns, run extract()
+- the texts of a document can be extracted as one batch, optionally in a process pool
+- calls, matches and time spent are recorded per extractor to find slow patterns
+
+A combined alternation of all patterns is not used: Python's backtracking regex
+engine tries every alternative at every position, which is slower than the
+separate scans it would replace.
+"""
+import logging
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, FrozenSet, List, Optional, Pattern, Tuple
+
+try:
+    from re import _parser as sre_parse, _constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse
+    import sre_constants
+
+from .base import EntityExtractor, ExtractedEntity
+
+logger = logging.getLogger(__name__)
+
+# A required factor of a pattern: one of the alternatives occurs (lowercased when case-insensitive)
+Factor = Tuple[FrozenSet[str], bool]
+
+# Factor for patterns requiring a digit
+_DIGIT_FACTOR: Factor = (frozenset(), False)
+_DIGIT = re.compile(r'\d')
+
+# Non-ASCII characters that case-insensitively match an ASCII letter but do not lowercase to it
+_CASE_FOLDS = {0x0131: 'i', 0x017F: 's'}
+
+# Engine used by process pool workers (set by the pool initializer)
+_worker_engine: Optional['ExtractionEngine'] = None
+
+
+def required_factors(pattern: Pattern) -> List[Factor]:
+    """
+    Find literals that every match of a pattern contains.
+
+    Args:
+        pattern: Compiled pattern
+
+    Returns:
+        List of factors, each a set of alternatives one of which occurs in every match
+        (empty if nothing is known about the pattern)
+    """
+    if not isinstance(pattern.pattern, str):
+        return []
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    except Exception as e:
+        logger.debug(f"Could not analyze pattern {pattern.pattern!r}: {e}")
+        return []
+
+    factors = _sequence_factors(parsed, bool(pattern.flags & re.IGNORECASE))
+    return list(dict.fromkeys(factor for factor in factors if _usable(factor)))
+
+
+def _usable(factor: Factor) -> bool:
+    """Case-insensitive factors are only tested on ASCII literals."""
+    alternatives, ignorecase = factor
+    return factor == _DIGIT_FACTOR or not ignorecase or all(a.isascii() for a in alternatives)
+
+
+def _sequence_factors(items, ignorecase: bool) -> List[Factor]:
+    """Collect the factors of a parsed sequence."""
+    factors = []
+    run = []
+
+    def flush():
+        if run:
+            literal = ''.join(run)
+            factors.append((frozenset([literal.lower() if ignorecase else literal]), ignorecase))
+            run.clear()
+
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            run.append(chr(av))
+            continue
+        flush()
+
+        if op is sre_constants.SUBPATTERN:
+            _, add_flags, del_flags, content = av
+            factors.extend(_sequence_factors(content, _group_ignorecase(ignorecase, add_flags, del_flags)))
+        elif op is sre_constants.BRANCH:
+            factor = _branch_factor(av[1], ignorecase)
+            if factor:
+                factors.append(factor)
+        elif op is sre_constants.IN:
+            factor = _set_factor(av, ignorecase)
+            if factor:
+                factors.append(factor)
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT) and av[0] >= 1:
+            factors.extend(_sequence_factors(av[2], ignorecase))
+    flush()
+    return factors
+
+
+def _group_ignorecase(ignorecase: bool, add_flags: int, del_flags: int) -> bool:
+    """Case sensitivity inside a group with local flags."""
+    if add_flags & re.IGNORECASE:
+        return True
+    if del_flags & re.IGNORECASE:
+        return False
+    return ignorecase
+
+
+def _branch_factor(branches, ignorecase: bool) -> Optional[Factor]:
+    """Combine the first factor of each branch into one factor of the alternation."""
+    firsts = []
+    for branch in branches:
+        factors = [factor for factor in _sequence_factors(branch, ignorecase) if _usable(factor)]
+        if not factors:
+            return None
+        firsts.append(factors[0])
+
+    if all(factor == _DIGIT_FACTOR for factor in firsts):
+        return _DIGIT_FACTOR
+    if any(factor == _DIGIT_FACTOR or factor[1] != ignorecase for factor in firsts):
+        return None
+    return frozenset().union(*(alternatives for alternatives, _ in firsts)), ignorecase
+
+
+def _set_factor(items, ignorecase: bool) -> Optional[Factor]:
+    """Get the factor of a character set of literals, small ranges or digits."""
+    if items == [(sre_constants.CATEGORY, sre_constants.CATEGORY_DIGIT)]:
+        return _DIGIT_FACTOR
+
+    characters = set()
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            characters.add(chr(av))
+        elif op is sre_constants.RANGE and av[1] - av[0] < 10:
+            characters.update(chr(c) for c in range(av[0], av[1] + 1))
+        else:
+            return None
+    if ignorecase:
+        characters = {c.lower() for c in characters}
+    return frozenset(characters), ignorecase
+
+
+class _TextProbe:
+    """Tests factors against one text, caching the results."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self._lowered: Optional[str] = None
+        self._results: Dict[Factor, bool] = {}
+
+    def satisfies(self, factors: List[Factor]) -> bool:
+        """Check that every factor occurs in the text."""
+        for factor in factors:
+            present = self._results.get(factor)
+            if present is None:
+                present = self._results[factor] = self._present(factor)
+            if not present:
+                return False
+        return True
+
+    def _present(self, factor: Factor) -> bool:
+        if factor == _DIGIT_FACTOR:
+            return _DIGIT.search(self.text) is not None
+
+        alternatives, ignorecase = factor
+        text = self.text
+        if ignorecase:
+            if self._lowered is None:
+                self._lowered = text.lower() if text.isascii() else text.lower().translate(_CASE_FOLDS)
+            text = self._lowered
+        return any(alternative in text for alternative in alternatives)
+
+
+class ExtractionEngine:
+    """Runs the enabled extractors of a registry, skipping those that cannot match a text."""
+
+    def __init__(self, extractors: Dict[str, EntityExtractor],
+                 workers: int = 0, process_threshold: int = 500):
+        """
+        Analyze the scan patterns of the enabled extractors.
+
+        Args:
+            extractors: Extractors by name, in registration order
+            workers: Number of worker processes for batch extraction (0 = in-process)
+            process_threshold: Minimum number of texts in a batch before the process pool is used
+        """
+        self.names = [name for name, extractor in extractors.items() if extractor.enabled]
+        self.extractors = [extractors[name] for name in self.names]
+        self.workers = workers
+        self.process_threshold = process_threshold
+
+        # Per extractor, the factors of each scan pattern (None = runs on every text)
+        self.pattern_factors: List[Optional[List[List[Factor]]]] = []
+        for extractor in self.extractors:
+            patterns = extractor.scan_patterns
+            if patterns is None:
+                self.pattern_factors.append(None)
+                continue
+            factors = [required_factors(re.compile(p) if isinstance(p, str) else p) for p in patterns]
+            self.pattern_factors.append(None if any(not f for f in factors) else factors)
+
+        self._statistics: Dict[str, Dict[str, Any]] = {}
+        self.reset_statistics()
+        filtered = sum(factors is not None for factors in self.pattern_factors)
+        logger.debug(f"Compiled {len(self.extractors)} extractors, {filtered} with literal prefilters")
+
+    def candidate_extractors(self, text: str) -> List[int]:
+        """
+        Find the extractors that need to run on a text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Extractor indexes in registration order
+        """
+        probe = _TextProbe(text)
+        return [
+            index for index, factors in enumerate(self.pattern_factors)
+            if factors is None or any(probe.satisfies(pattern_factors) for pattern_factors in factors)
+        ]
+
+    def extract(self, text: str, entity_types: Optional[List[str]] = None) -> List[ExtractedEntity]:
+        """
+        Run the extractors whose patterns can match text.
+
+        Args:
+            text: Text to extract from
+            entity_types: Optional list of entity types to extract (None = all)
+
+        Returns:
+            List of extracted entities
+        """
+        entities = []
+        if not text:
+            return entities
+
+        start = time.perf_counter()
+        candidates = self.candidate_extractors(text)
+        self._statistics['_scan']['calls'] += 1
+        self._statistics['_scan']['seconds'] += time.perf_counter() - start
+
+        if entity_types:
+            # Preserve the requested type order
+            by_type: Dict[str, List[int]] = {}
+            for index in candidates:
+                by_type.setdefault(self.extractors[index].entity_type, []).append(index)
+            candidates = [index for entity_type in entity_types for index in by_type.get(entity_type, [])]
+
+        for index in candidates:
+            entities.extend(self._run(index, text))
+        return entities
+
+    def extract_batch(self, texts: List[str],
+                      entity_types: Optional[List[str]] = None) -> List[List[ExtractedEntity]]:
+        """
+        Extract entities from a batch of texts.
+
+        Large batches are split across a process pool when workers are configured;
+        if the pool cannot be used the batch is extracted in-process.
+
+        Args:
+            texts: Texts to extract from
+            entity_types: Optional list of entity types to extract (None = all)
+
+        Returns:
+            List of extracted entities per text
+        """
+        if self.workers > 1 and len(texts) >= max(self.process_threshold, 2):
+            try:
+                return self._extract_in_pool(texts, entity_types)
+            except Exception as e:
+                logger.warning(f"Process pool extraction failed, extracting in-process: {e}")
+
+        return [self.extract(text, entity_types) for text in texts]
+
+    def get_statistics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-extractor statistics.
+
+        Returns:
+            Dictionary of extractor name to calls, matches, entities and seconds,
+            with the combined scan under '_scan'
+        """
+        return {name: dict(stats) for name, stats in self._statistics.items()}
+
+    def reset_statistics(self) -> None:
+        """Reset the per-extractor statistics."""
+        self._statistics = {'_scan': {'calls': 0, 'seconds': 0.0}}
+        for name in self.names:
+            self._statistics[name] = {'calls': 0, 'matches': 0, 'entities': 0, 'seconds': 0.0}
+
+    def _run(self, index: int, text: str) -> List[ExtractedEntity]:
+        """Run one extractor and record its statistics."""
+        name = self.names[index]
+        start = time.perf_counter()
+        entities = self.extractors[index].extract(text)
+        stats = self._statistics[name]
+        stats['calls'] += 1
+        stats['seconds'] += time.perf_counter() - start
+        if entities:
+            stats['matches'] += 1
+            stats['entities'] += len(entities)
+        return entities
+
+    def _extract_in_pool(self, texts: List[str],
+                         entity_types: Optional[List[str]]) -> List[List[ExtractedEntity]]:
+        """Extract a batch in worker processes and merge their statistics."""
+        chunk_size = -(-len(texts) // (self.workers * 4))
+        chunks = [texts[start:start + chunk_size] for start in range(0, len(texts), chunk_size)]
+
+        results = []
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(self,)) as executor:
+            for chunk_results, statistics in executor.map(_extract_chunk, chunks,
+                                                          [entity_types] * len(chunks)):
+                results.extend(chunk_results)
+                self._merge_statistics(statistics)
+        return results
+
+    def _merge_statistics(self, statistics: Dict[str, Dict[str, Any]]) -> None:
+        """Add statistics collected by a worker."""
+        for name, stats in statistics.items():
+            totals = self._statistics.setdefault(name, dict.fromkeys(stats, 0))
+            for key, value in stats.items():
+                totals[key] += value
+
+
+def _init_worker(engine: ExtractionEngine) -> None:
+    """Install the engine in a pool worker."""
+    global _worker_engine
+    _worker_engine = engine
+
+
+def _extract_chunk(texts: List[str], entity_types: Optional[List[str]]):
+    """Extract a chunk of texts in a pool worker, returning results and statistics."""
+    _worker_engine.reset_statistics()
+    results = [_worker_engine.extract(text, entity_types) for text in texts]
+    return results, _worker_engine.get_statistics()
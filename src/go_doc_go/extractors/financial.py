@@ -3,7 +3,7 @@ Financial domain extractors for monetary values, percentages, tickers, etc.
 """
 
 import re
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Pattern
 from decimal import Decimal
 from .base import EntityExtractor, ExtractedEntity, RegexExtractor
 
@@ -29,6 +29,8 @@ class MonetaryValueExtractor(EntityExtractor):
         'billion': 1000000000,
     }
     
+    COMPILED_PATTERNS = [(re.compile(pattern, re.IGNORECASE), format_type) for pattern, format_type in PATTERNS]
+    
     @property
     def entity_type(self) -> str:
         return "monetary_value"
@@ -37,12 +39,15 @@ class MonetaryValueExtractor(EntityExtractor):
     def description(self) -> str:
         return "Extracts monetary values in various formats"
     
+    @property
+    def scan_patterns(self) -> List[Pattern]:
+        return [regex for regex, _ in self.COMPILED_PATTERNS]
+    
     def extract(self, text: str) -> List[ExtractedEntity]:
         """Extract monetary values from text."""
         entities = []
         
-        for pattern, format_type in self.PATTERNS:
-            regex = re.compile(pattern, re.IGNORECASE)
+        for regex, format_type in self.COMPILED_PATTERNS:
             for match in regex.finditer(text):
                 raw_value = match.group(0)
                 
@@ -209,6 +214,11 @@ class CompanyNameNormalizer(EntityExtractor):
         r'\s+Holdings?',
     ]
     
+    # Capitalized phrases that might be company names
+    COMPANY_PATTERN = re.compile(
+        r'\b[A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)*(?:\s+(?:Inc|Corp|Company|Co|Ltd|LLC|Group))\.?\b'
+    )
+    
     @property
     def entity_type(self) -> str:
         return "company_name"
@@ -217,17 +227,17 @@ class CompanyNameNormalizer(EntityExtractor):
     def description(self) -> str:
         return "Normalizes company names to canonical forms"
     
+    @property
+    def scan_patterns(self) -> List[Pattern]:
+        return [self.COMPANY_PATTERN]
+    
     def extract(self, text: str) -> List[ExtractedEntity]:
         """Extract and normalize company names."""
         # This would typically use NER or a company database
         # For now, we'll just normalize any text that looks like a company name
         entities = []
         
-        # Look for capitalized phrases that might be company names
-        pattern = r'\b[A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)*(?:\s+(?:Inc|Corp|Company|Co|Ltd|LLC|Group))\.?\b'
-        regex = re.compile(pattern)
-        
-        for match in regex.finditer(text):
+        for match in self.COMPANY_PATTERN.finditer(text):
             raw_value = match.group(0)
             
             entity = ExtractedEntity(
@@ -3,7 +3,7 @@ Legal domain extractors for case citations, statutes, regulations, etc.
 """
 
 import re
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Pattern
 from .base import EntityExtractor, ExtractedEntity, RegexExtractor
 
 
@@ -27,6 +27,8 @@ class CaseCitationExtractor(EntityExtractor):
         (r'C-\d+/\d+', 'european_court'),
     ]
     
+    COMPILED_PATTERNS = [(re.compile(pattern), format_type) for pattern, format_type in PATTERNS]
+    
     @property
     def entity_type(self) -> str:
         return "case_citation"
@@ -35,12 +37,15 @@ class CaseCitationExtractor(EntityExtractor):
     def description(self) -> str:
         return "Extracts legal case citations"
     
+    @property
+    def scan_patterns(self) -> List[Pattern]:
+        return [regex for regex, _ in self.COMPILED_PATTERNS]
+    
     def extract(self, text: str) -> List[ExtractedEntity]:
         """Extract case citations from text."""
         entities = []
         
-        for pattern, format_type in self.PATTERNS:
-            regex = re.compile(pattern)
+        for regex, format_type in self.COMPILED_PATTERNS:
             for match in regex.finditer(text):
                 raw_value = match.group(0)
                 
@@ -138,6 +143,11 @@ class CourtNameExtractor(EntityExtractor):
         'European Court of Justice',
     ]
     
+    # Court names with word boundaries and flexible whitespace
+    COURT_PATTERNS = [
+        re.compile(r'\b' + court.replace(' ', r'\s+') + r'\b', re.IGNORECASE) for court in COURTS
+    ]
+    
     @property
     def entity_type(self) -> str:
         return "court_name"
@@ -146,15 +156,15 @@ class CourtNameExtractor(EntityExtractor):
     def description(self) -> str:
         return "Extracts court names and jurisdictions"
     
+    @property
+    def scan_patterns(self) -> List[Pattern]:
+        return self.COURT_PATTERNS
+    
     def extract(self, text: str) -> List[ExtractedEntity]:
         """Extract court names from text."""
         entities = []
         
-        for court_pattern in self.COURTS:
-            # Add word boundaries and make case-insensitive
-            pattern = r'\b' + court_pattern.replace(' ', r'\s+') + r'\b'
-            regex = re.compile(pattern, re.IGNORECASE)
-            
+        for regex in self.COURT_PATTERNS:
             for match in regex.finditer(text):
                 raw_value = match.group(0)
                 
@@ -3,7 +3,7 @@ Medical domain extractors for drug names, dosages, medical codes, etc.
 """
 
 import re
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Pattern
 from .base import EntityExtractor, ExtractedEntity, RegexExtractor
 
 
@@ -22,6 +22,8 @@ class DrugNameExtractor(EntityExtractor):
         (r'\b[A-Za-z]+\s+\d+\s*(?:mg|mcg|g|ml|IU|units?)\b', 'with_strength'),
     ]
     
+    COMPILED_PATTERNS = [(re.compile(pattern), format_type) for pattern, format_type in PATTERNS]
+    
     # Common drug name endings for validation
     DRUG_SUFFIXES = [
         'mab', 'nib', 'ib', 'ol', 'pril', 'sartan', 'statin', 'azole',
@@ -37,13 +39,16 @@ class DrugNameExtractor(EntityExtractor):
     def description(self) -> str:
         return "Extracts pharmaceutical drug names"
     
+    @property
+    def scan_patterns(self) -> List[Pattern]:
+        return [regex for regex, _ in self.COMPILED_PATTERNS]
+    
     def extract(self, text: str) -> List[ExtractedEntity]:
         """Extract drug names from text."""
         entities = []
         seen = set()  # Avoid duplicates
         
-        for pattern, format_type in self.PATTERNS:
-            regex = re.compile(pattern)
+        for regex, format_type in self.COMPILED_PATTERNS:
             for match in regex.finditer(text):
                 raw_value = match.group(0)
                 
@@ -157,6 +162,8 @@ class MedicalCodeExtractor(EntityExtractor):
         (r'\bDRG\s*\d{3}\b', 'drg'),
     ]
     
+    COMPILED_PATTERNS = [(re.compile(pattern), code_type) for pattern, code_type in PATTERNS]
+    
     @property
     def entity_type(self) -> str:
         return "medical_code"
@@ -165,12 +172,15 @@ class MedicalCodeExtractor(EntityExtractor):
     def description(self) -> str:
         return "Extracts medical coding system codes"
     
+    @property
+    def scan_patterns(self) -> List[Pattern]:
+        return [regex for regex, _ in self.COMPILED_PATTERNS]
+    
     def extract(self, text: str) -> List[ExtractedEntity]:
         """Extract medical codes from text."""
         entities = []
         
-        for pattern, code_type in self.PATTERNS:
-            regex = re.compile(pattern)
+        for regex, code_type in self.COMPILED_PATTERNS:
             for match in regex.finditer(text):
                 raw_value = match.group(0)
                 
@@ -271,6 +281,8 @@ class MedicalConditionExtractor(EntityExtractor):
         (r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+[Dd]isorder\b', 'disorder'),
     ]
     
+    COMPILED_PATTERNS = [(re.compile(pattern), condition_type) for pattern, condition_type in CONDITION_PATTERNS]
+    
     @property
     def entity_type(self) -> str:
         return "medical_condition"
@@ -279,13 +291,16 @@ class MedicalConditionExtractor(EntityExtractor):
     def description(self) -> str:
         return "Extracts medical conditions and diseases"
     
+    @property
+    def scan_patterns(self) -> List[Pattern]:
+        return [regex for regex, _ in self.COMPILED_PATTERNS]
+    
     def extract(self, text: str) -> List[ExtractedEntity]:
         """Extract medical conditions from text."""
         entities = []
         seen = set()
         
-        for pattern, condition_type in self.CONDITION_PATTERNS:
-            regex = re.compile(pattern)
+        for regex, condition_type in self.COMPILED_PATTERNS:
             for match in regex.finditer(text):
                 raw_value = match.group(0)
                 
@@ -3,7 +3,7 @@ Temporal extractors for dates, time periods, quarters, etc.
 """
 
 import re
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Pattern
 from datetime import datetime, date
 from dateutil import parser as date_parser
 from .base import EntityExtractor, ExtractedEntity, RegexExtractor
@@ -28,6 +28,8 @@ class DateExtractor(EntityExtractor):
         (r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\.?\s+\d{1,2},?\s+\d{4}', 'abbreviated'),
     ]
     
+    COMPILED_PATTERNS = [(re.compile(pattern, re.IGNORECASE), format_type) for pattern, format_type in PATTERNS]
+    
     @property
     def entity_type(self) -> str:
         return "date"
@@ -36,12 +38,15 @@ class DateExtractor(EntityExtractor):
     def description(self) -> str:
         return "Extracts dates in various formats"
     
+    @property
+    def scan_patterns(self) -> List[Pattern]:
+        return [regex for regex, _ in self.COMPILED_PATTERNS]
+    
     def extract(self, text: str) -> List[ExtractedEntity]:
         """Extract dates from text."""
         entities = []
         
-        for pattern, format_type in self.PATTERNS:
-            regex = re.compile(pattern, re.IGNORECASE)
+        for regex, format_type in self.COMPILED_PATTERNS:
             for match in regex.finditer(text):
                 raw_value = match.group(0)
                 
@@ -184,6 +189,8 @@ class RelativeDateExtractor(EntityExtractor):
         (r'\b(beginning|start|end)\s+of\s+(the\s+)?(week|month|year|quarter)\b', 'boundary'),
     ]
     
+    COMPILED_PATTERNS = [(re.compile(pattern, re.IGNORECASE), format_type) for pattern, format_type in PATTERNS]
+    
     @property
     def entity_type(self) -> str:
         return "relative_date"
@@ -192,12 +199,15 @@ class RelativeDateExtractor(EntityExtractor):
     def description(self) -> str:
         return "Extracts relative date references"
     
+    @property
+    def scan_patterns(self) -> List[Pattern]:
+        return [regex for regex, _ in self.COMPILED_PATTERNS]
+    
     def extract(self, text: str) -> List[ExtractedEntity]:
         """Extract relative dates from text."""
         entities = []
         
-        for pattern, format_type in self.PATTERNS:
-            regex = re.compile(pattern, re.IGNORECASE)
+        for regex, format_type in self.COMPILED_PATTERNS:
             for match in regex.finditer(text):
                 raw_value = match.group(0)
                 
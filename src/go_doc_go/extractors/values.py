@@ -124,6 +124,12 @@ class ValueExtractor:
             ''',
             re.VERBOSE
         )
+        
+        # Pattern for multipliers like "3.5x" or "10 times"
+        self.multiplier_pattern = re.compile(
+            r'(?P<number>\d+(?:\.\d+)?)\s*(?P<x>x|times|fold)',
+            re.IGNORECASE
+        )
     
     def extract_all(self, text: str) -> List[ExtractedValue]:
         """
@@ -237,13 +243,7 @@ class ValueExtractor:
         """Extract values with multipliers (e.g., '3.5x revenue')."""
         values = []
         
-        # Pattern for multipliers like "3.5x" or "10 times"
-        multiplier_pattern = re.compile(
-            r'(?P<number>\d+(?:\.\d+)?)\s*(?P<x>x|times|fold)',
-            re.IGNORECASE
-        )
-        
-        for match in multiplier_pattern.finditer(text):
+        for match in self.multiplier_pattern.finditer(text):
             try:
                 number = Decimal(match.group('number'))
                 
@@ -7,6 +7,7 @@ from go_doc_go.config import Config
 from go_doc_go.embeddings import EmbeddingGenerator
 from go_doc_go.relationships import create_relationship_detector
 from go_doc_go.content_source.factory import get_content_source
+from go_doc_go.pipeline import IngestionPipeline, PipelineSettings, split_embedding_detector, store_parsed_document
 
 # Load environment variables from .env file
 load_dotenv()
@@ -27,7 +28,7 @@ def ingest_documents(config: Config, source_configs=None, max_link_depth=None,
         config: Configuration object
         source_configs: Optional list of content source configs (overrides config)
         max_link_depth: Optional override for link depth (overrides source config)
-        processing_mode: Processing mode ('single', 'distributed', or 'worker'). 
+        processing_mode: Processing mode ('single', 'pipeline', 'distributed', or 'worker').
                         Overrides config if specified.
 
     Returns:
@@ -62,13 +63,18 @@ def ingest_documents(config: Config, source_configs=None, max_link_depth=None,
         return _ingest_documents_distributed(config, source_configs, max_link_depth)
     elif mode == 'worker':
         return _ingest_documents_worker(config)
+    elif mode == 'pipeline':
+        return _ingest_documents_single(config, source_configs, max_link_depth, pipelined=True)
     else:
         return _ingest_documents_single(config, source_configs, max_link_depth)
 
 
-def _ingest_documents_single(config: Config, source_configs=None, max_link_depth=None):
+def _ingest_documents_single(config: Config, source_configs=None, max_link_depth=None, pipelined=False):
     """
-    Single-process document ingestion (original implementation).
+    Single-process document ingestion.
+
+    With pipelined=True, fetching, parsing and storage overlap in a staged pipeline
+    whose per-stage concurrency is read from the 'processing' config section.
     """
     logger.debug("Using single-process document ingestion")
     
@@ -136,44 +142,68 @@ def _ingest_documents_single(config: Config, source_configs=None, max_link_depth
     global_processed_docs = set()
     logger.debug("Initialized global processed document tracking")
 
-    # Process each content source
-    for idx, source_config in enumerate(sources_to_process):
-        # Per-source tracking to prevent re-processing within the same source
-        processed_docs = set()
-        source_type = source_config.get('type')
-        source_name = source_config.get('name')
-        logger.debug(f"Processing source {idx + 1}/{len(sources_to_process)}: {source_name} ({source_type})")
-
-        # Override max_link_depth if specified
-        if max_link_depth is not None:
-            original_depth = source_config.get('max_link_depth', 1)
-            source_config['max_link_depth'] = max_link_depth
-            logger.debug(f"Overriding max_link_depth from {original_depth} to {max_link_depth}")
-
-        # Create content source
-        logger.debug(f"Creating content source for {source_name}")
-        source = get_content_source(source_config)
-        logger.debug(f"Content source created: {source}")
-
-        # Get document list
-        logger.debug(f"Listing documents from source {source_name}")
-        documents = source.list_documents()
-        logger.info(f"Found {len(documents)} documents in source {source_name}")
-
-        # Process each document
-        logger.debug(f"Starting to process {len(documents)} documents from source {source_name}")
-
-        for doc_idx, doc in enumerate(documents):
-            doc_id = doc['id']
-            logger.debug(f"Processing document {doc_idx + 1}/{len(documents)}: {doc_id}")
-            _ingest_document_recursively(
-                source, doc_id, db, relationship_detector, embedding_generator,
-                processed_docs, stats, source_config.get('max_link_depth', 1),
-                global_visited_docs, source_config, global_processed_docs  # ← Added global_processed_docs parameter
-            )
-            logger.debug(f"Completed document {doc_idx + 1}/{len(documents)}: {doc_id}")
+    # Staged pipeline shared by all sources (pipeline mode only)
+    pipeline = None
+    if pipelined:
+        settings = PipelineSettings.from_config(config.config.get('processing', {}))
+        logger.info(f"Using ingestion pipeline: {settings}")
+        pipeline = IngestionPipeline(db, relationship_detector, embedding_generator, stats, settings)
+
+    # Semantic detectors reuse the stored embeddings (the pipeline splits its own detector)
+    embedding_detector = None
+    if not pipeline:
+        relationship_detector, embedding_detector = split_embedding_detector(relationship_detector,
+                                                                             embedding_generator)
+
+    try:
+        # Process each content source
+        for idx, source_config in enumerate(sources_to_process):
+            # Per-source tracking to prevent re-processing within the same source
+            processed_docs = set()
+            source_type = source_config.get('type')
+            source_name = source_config.get('name')
+            logger.debug(f"Processing source {idx + 1}/{len(sources_to_process)}: {source_name} ({source_type})")
+
+            # Override max_link_depth if specified
+            if max_link_depth is not None:
+                original_depth = source_config.get('max_link_depth', 1)
+                source_config['max_link_depth'] = max_link_depth
+                logger.debug(f"Overriding max_link_depth from {original_depth} to {max_link_depth}")
+
+            # Create content source
+            logger.debug(f"Creating content source for {source_name}")
+            source = get_content_source(source_config)
+            logger.debug(f"Content source created: {source}")
 
-        logger.debug(f"Completed processing source {source_name}")
+            # Get document list
+            logger.debug(f"Listing documents from source {source_name}")
+            documents = source.list_documents()
+            logger.info(f"Found {len(documents)} documents in source {source_name}")
+
+            # Process each document
+            logger.debug(f"Starting to process {len(documents)} documents from source {source_name}")
+
+            if pipeline:
+                pipeline.run_source(source, source_config, [doc['id'] for doc in documents], processed_docs,
+                                    global_visited_docs, global_processed_docs)
+                logger.debug(f"Completed processing source {source_name}")
+                continue
+
+            for doc_idx, doc in enumerate(documents):
+                doc_id = doc['id']
+                logger.debug(f"Processing document {doc_idx + 1}/{len(documents)}: {doc_id}")
+                _ingest_document_recursively(
+                    source, doc_id, db, relationship_detector, embedding_generator,
+                    processed_docs, stats, source_config.get('max_link_depth', 1),
+                    global_visited_docs, source_config, global_processed_docs,
+                    embedding_detector=embedding_detector
+                )
+                logger.debug(f"Completed document {doc_idx + 1}/{len(documents)}: {doc_id}")
+
+            logger.debug(f"Completed processing source {source_name}")
+    finally:
+        if pipeline:
+            pipeline.close()
 
     # Generate cross-document container relationships if embedding is enabled
     if embedding_generator and stats['documents'] > 0:
@@ -203,7 +233,8 @@ def _ingest_documents_single(config: Config, source_configs=None, max_link_depth
 
 def _ingest_document_recursively(source, doc_id, db, relationship_detector,
                                  embedding_generator: EmbeddingGenerator, processed_docs, stats,
-                                 max_depth, global_visited_docs, source_config, global_processed_docs, current_depth=0):
+                                 max_depth, global_visited_docs, source_config, global_processed_docs, current_depth=0,
+                                 embedding_detector=None):
     """
     Recursively ingest a document and its linked documents with global visited tracking.
     Skip documents that haven't changed since their last processing.
@@ -221,6 +252,7 @@ def _ingest_document_recursively(source, doc_id, db, relationship_detector,
         source_config: Source configuration containing topics and other settings
         global_processed_docs: Global set of all processed document IDs across sources
         current_depth: Current depth in the recursion
+        embedding_detector: Optional detector run on the stored embeddings
     """
     from .document_parser.factory import get_parser_for_content
 
@@ -304,7 +336,6 @@ def _ingest_document_recursively(source, doc_id, db, relationship_detector,
         # Detect relationships
         links = parsed_doc.get('links', [])
         relationships = parsed_doc.get('relationships', [])
-        element_dates = parsed_doc.get('element_dates', [])
         logger.debug(f"Detecting relationships. Found {len(links)} links in document")
         relationships.extend(relationship_detector.detect_relationships(
             parsed_doc['document'],
@@ -313,45 +344,10 @@ def _ingest_document_recursively(source, doc_id, db, relationship_detector,
         ))
         logger.debug(f"Detected {len(relationships)} relationships")
 
-        # Store document
-        logger.debug(f"Storing document in database: {doc_id}")
-        db.store_document(parsed_doc['document'], parsed_doc['elements'], relationships, element_dates)
-        logger.debug(f"Document stored: {doc_id}")
-
-        # Update processing history
-        content_hash = doc_content.get("content_hash", "")
-        if content_hash:
-            db.update_processing_history(doc_id, content_hash)
-
-        # Generate embeddings if enabled
-        if embedding_generator:
-            logger.debug(f"Generating embeddings for {len(parsed_doc['elements'])} elements")
-
-            # Generate embeddings using a consistent interface
-            embeddings = embedding_generator.generate_from_elements(parsed_doc['elements'], db)
-
-            # Get topics from source configuration
-            source_topics = source_config.get('topics', [])
-            logger.debug(f"Using topics from source config: {source_topics}")
-
-            # Store embeddings with topics (use enhanced method if database supports it)
-            if hasattr(db, 'store_embedding_with_topics') and db.supports_topics():
-                # Use the enhanced method with topics
-                for element_id, embedding in embeddings.items():
-                    db.store_embedding_with_topics(element_id, embedding, source_topics, 1.0)
-                logger.debug(f"Generated and stored {len(embeddings)} embeddings with topics: {source_topics}")
-            else:
-                # Fall back to basic method if topics not supported
-                for element_id, embedding in embeddings.items():
-                    db.store_embedding(element_id, embedding)
-                logger.debug(f"Generated and stored {len(embeddings)} embeddings (topics not supported by database)")
-
-        # Update statistics
-        stats['documents'] += 1
-        stats['elements'] += len(parsed_doc['elements'])
-        stats['relationships'] += len(relationships)
-        logger.debug(
-            f"Updated stats: docs={stats['documents']}, elements={stats['elements']}, relationships={stats['relationships']}")
+        # Store document, dates and embeddings, then update history and statistics
+        store_parsed_document(db, doc_id, doc_content, parsed_doc, relationships,
+                              embedding_generator, source_config, stats,
+                              embedding_detector=embedding_detector)
 
         # Follow links if not at max depth
         if current_depth < max_depth:
@@ -372,7 +368,8 @@ def _ingest_document_recursively(source, doc_id, db, relationship_detector,
                 _ingest_document_recursively(
                     source, linked_id, db, relationship_detector,
                     embedding_generator, processed_docs, stats,
-                    max_depth, global_visited_docs, source_config, global_processed_docs, current_depth + 1  # ← Pass global_processed_docs to recursive calls
+                    max_depth, global_visited_docs, source_config, global_processed_docs, current_depth + 1,  # ← Pass global_processed_docs to recursive calls
+                    embedding_detector=embedding_detector
                 )
                 logger.debug(f"Completed processing linked document: {linked_id}")
         else:
@@ -399,128 +396,8 @@ def _compute_cross_document_container_relationships(db, processed_doc_ids, confi
         Number of relationships created
     """
     logger.info(f"Computing cross-document container relationships for {len(processed_doc_ids)} documents")
-    logger.debug(f"Input processed_doc_ids: {processed_doc_ids}")
-
-    # Container element types we're interested in
-    container_types = ["body", "div", "list", "header", "section", "title", "h1", "h2", "h3", "h4", "h5", "h6"]
-    logger.debug(f"Looking for container types: {container_types}")
-    
-    similarity_threshold = (config.config.get('relationship_detection', {})
-                            .get('cross_document_semantic', {}).get('similarity_threshold'))
-    logger.debug(f"Similarity threshold from config: {similarity_threshold}")
-    logger.debug(f"Config relationship_detection section: {config.config.get('relationship_detection', {})}")
-    
-    if similarity_threshold is None:
-        logger.warning("Similarity threshold not configured - skipping cross-document relationship generation")
-        return 0
-
-    # Get all container elements from processed documents
-    processed_containers = []
-
-    for doc_id in processed_doc_ids:
-        # Get elements from the document
-        elements = db.get_document_elements(doc_id)
-
-        # Filter for container elements
-        containers = [e for e in elements if e["element_type"] in container_types]
-
-        # Store with document context
-        for container in containers:
-            processed_containers.append({
-                "element": container,
-                "doc_id": doc_id
-            })
-
-    logger.debug(f"Found {len(processed_containers)} container elements in processed documents")
-
-    # Delete existing semantic relationships for processed elements
-    for container_info in processed_containers:
-        container = container_info["element"]
-        element_id = container["element_id"]
-        try:
-            db.delete_relationships_for_element(element_id, "semantic_section")
-        except Exception as e:
-            logger.warning(f"Failed to delete existing relationships for element {element_id}: {e}")
-
-    # Compute new relationships
-    new_relationships = []
-    relationship_count = 0
-
-    # Create a map of processed containers by element_id for quick lookup
-    processed_container_map = {
-        container_info["element"]["element_id"]: container_info
-        for container_info in processed_containers
-    }
-
-    # For each processed container
-    for container_info in processed_containers:
-        container = container_info["element"]
-        source = container_info["doc_id"]
-        element_id = container["element_id"]
-        element_pk = container["element_pk"]
-
-        # Get embedding
-        embedding = db.get_embedding(element_pk)
-        if not embedding:
-            continue
-
-        # Search for similar containers in other documents
-        filter_criteria = {
-            "element_type": container_types,
-            "exclude_doc_id": [source]  # Exclude containers from the same document
-        }
-
-        similar_containers = db.search_by_embedding(
-            embedding,
-            limit=20,
-            filter_criteria=filter_criteria
-        )
-
-        # Process results
-        for target_id, similarity in similar_containers:
-            # Skip if similarity is below threshold
-            if similarity < similarity_threshold:
-                continue
-
-            # Skip if this is another processed container we've already compared to
-            if target_id in processed_container_map:
-                # # Only create the relationship once (when we process the first element)
-                # if target_id < element_id:
-                #     continue
-                target_element = db.get_element(target_id)
-                target_doc_id = processed_container_map[target_id]["doc_id"]
-            else:
-                # Get document ID for this container
-                target_element = db.get_element(target_id)
-                if not target_element:
-                    continue
-
-                target_doc_id = target_element["doc_id"]
-
-            # Create relationship
-            new_relationships.append({
-                "relationship_id": f"sem_rel_{element_id}_{target_element['element_id']}",
-                "source_id": element_id,
-                "relationship_type": "semantic_section",
-                "target_reference": target_element['element_id'],
-                "metadata": {
-                    "similarity_score": similarity,
-                    "cross_document": True,
-                    "source_doc_id": source,
-                    "target_doc_id": target_doc_id
-                }
-            })
-            relationship_count += 1
-
-    # Store all new relationships
-    for relationship in new_relationships:
-        try:
-            db.store_relationship(relationship)
-        except Exception as e:
-            logger.warning(f"Failed to store cross-document relationship {relationship.get('relationship_id', 'unknown')}: {e}")
-
-    logger.info(f"Created {relationship_count} cross-document semantic relationships")
-    return relationship_count
+    from .relationships.cross_document import compute_cross_document_relationships
+    return compute_cross_document_relationships(db, processed_doc_ids, config)
 
 
 def _ingest_documents_distributed(config: Config, source_configs=None, max_link_depth=None):
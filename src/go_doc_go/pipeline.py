@@ -0,0 +1,515 @@
+"""
+Pipelined ingestion engine for single-process ingestion.
+
+Documents move through bounded stages instead of being handled strictly one
+after another:
+
+- an I/O thread pool checks for changes (``has_changed``) and fetches content
+- a parse pool (processes by default) parses documents and runs the stateless
+  relationship detectors
+- the calling thread is the single storage writer; it runs the detectors that
+  need the database or embedding model and stores each document with
+  ``store_document_batch``, embedding a whole write batch through the
+  embedding scheduler when the generator allows it
+
+Admission decisions (the visited, processed and depth checks) are made on the
+calling thread only, so the per-source and global sets keep the same meaning
+as in the recursive path. Content sources still add linked documents to the
+global visited set from ``follow_links``, which runs in the I/O pool.
+"""
+
+import logging
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+from .relationships.base import RelationshipDetector
+from .relationships.composite import CompositeRelationshipDetector
+from .relationships.explicit import ExplicitLinkDetector
+from .relationships.semantic import SemanticRelationshipDetector
+from .relationships.structural import StructuralRelationshipDetector
+
+logger = logging.getLogger(__name__)
+
+# Detectors that only depend on their configuration and can run in the parse pool
+PORTABLE_DETECTORS = (ExplicitLinkDetector, StructuralRelationshipDetector)
+
+PARSE_EXECUTORS = ('process', 'thread')
+
+# Stages tracked for in-flight futures
+_FETCH = 'fetch'
+_PARSE = 'parse'
+_LINKS = 'links'
+
+# Relationship detector installed in parse worker processes
+_worker_detector = None
+
+
+@dataclass
+class PipelineSettings:
+    """Per-stage concurrency settings, read from the ``processing`` config section."""
+    io_workers: int = 8
+    parse_workers: int = field(default_factory=lambda: os.cpu_count() or 1)
+    parse_executor: str = 'process'
+    queue_size: int = 32
+    write_batch_size: int = 8
+
+    @classmethod
+    def from_config(cls, processing: Optional[Dict[str, Any]]) -> 'PipelineSettings':
+        """
+        Build settings from the ``processing`` section of the configuration.
+
+        Args:
+            processing: Processing configuration dictionary
+
+        Returns:
+            PipelineSettings instance
+        """
+        processing = processing or {}
+        settings = cls()
+        for name in ('io_workers', 'parse_workers', 'queue_size', 'write_batch_size'):
+            value = processing.get(name)
+            if value is None:
+                continue
+            if int(value) < 1:
+                raise ValueError(f"processing.{name} must be at least 1, got {value}")
+            setattr(settings, name, int(value))
+
+        settings.parse_executor = processing.get('parse_executor', settings.parse_executor)
+        if settings.parse_executor not in PARSE_EXECUTORS:
+            raise ValueError(
+                f"processing.parse_executor must be one of {PARSE_EXECUTORS}, got {settings.parse_executor!r}"
+            )
+        return settings
+
+
+def split_relationship_detector(detector) -> Tuple[Optional[CompositeRelationshipDetector],
+                                                   Optional[CompositeRelationshipDetector]]:
+    """
+    Split a relationship detector into the part that can run in the parse pool
+    and the part that must run next to the database and embedding model.
+
+    Detector order is preserved: portable detectors come first in the factory.
+
+    Args:
+        detector: Relationship detector (usually a CompositeRelationshipDetector)
+
+    Returns:
+        Tuple of (portable detector, local detector); either may be None
+    """
+    if detector is None:
+        return None, None
+
+    detectors = detector.detectors if isinstance(detector, CompositeRelationshipDetector) else [detector]
+    portable = [d for d in detectors if isinstance(d, PORTABLE_DETECTORS)]
+    local = [d for d in detectors if not isinstance(d, PORTABLE_DETECTORS)]
+
+    return (CompositeRelationshipDetector(portable) if portable else None,
+            CompositeRelationshipDetector(local) if local else None)
+
+
+def split_embedding_detector(detector, embedding_generator) -> Tuple[Optional[RelationshipDetector],
+                                                                     Optional[CompositeRelationshipDetector]]:
+    """
+    Split off the semantic detectors that reuse the embeddings stored for a document.
+
+    Those detectors run in store_parsed_document on the embeddings just generated
+    for storage, instead of embedding the elements a second time. This is only done
+    when the generator embeds each element's own content; embeddings that include
+    surrounding context would make neighbouring elements look more similar.
+
+    Args:
+        detector: Relationship detector (usually a CompositeRelationshipDetector)
+        embedding_generator: Generator of the stored embeddings, or None if embeddings are disabled
+
+    Returns:
+        Tuple of (remaining detector, embedding detector); the embedding detector may be None
+    """
+    if detector is None:
+        return None, None
+    if not embedding_generator or not embedding_generator.embeds_element_content:
+        return detector, None
+
+    detectors = detector.detectors if isinstance(detector, CompositeRelationshipDetector) else [detector]
+    reusing = [d for d in detectors if isinstance(d, SemanticRelationshipDetector) and d.reuse_embeddings]
+    if not reusing:
+        return detector, None
+
+    remaining = [d for d in detectors if d not in reusing]
+    return CompositeRelationshipDetector(remaining), CompositeRelationshipDetector(reusing)
+
+
+def _init_parse_worker(detector) -> None:
+    """Install the portable relationship detector in a parse worker process."""
+    global _worker_detector
+    _worker_detector = detector
+
+
+def _parse_document(doc_content: Dict[str, Any], detector=None) -> Dict[str, Any]:
+    """
+    Parse a document and run the portable relationship detectors.
+
+    Args:
+        doc_content: Document content as returned by the content source
+        detector: Relationship detector (defaults to the worker's detector)
+
+    Returns:
+        Parsed document with detected relationships added to 'relationships'
+    """
+    from .document_parser.factory import get_parser_for_content
+
+    detector = detector or _worker_detector
+    parser = get_parser_for_content(doc_content)
+    parsed_doc = parser.parse(doc_content)
+
+    relationships = parsed_doc.get('relationships', [])
+    if detector:
+        relationships.extend(detector.detect_relationships(
+            parsed_doc['document'],
+            parsed_doc['elements'],
+            parsed_doc.get('links', [])
+        ))
+    parsed_doc['relationships'] = relationships
+    return parsed_doc
+
+
+def _fetch_if_changed(source, doc_id: str, last_processed_info: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Fetch a document unless it is unchanged since its last processing.
+
+    Args:
+        source: Content source
+        doc_id: Document ID
+        last_processed_info: Processing history for the document, if any
+
+    Returns:
+        Document content, or None if the document is unchanged
+    """
+    if last_processed_info:
+        try:
+            if not source.has_changed(doc_id, last_processed_info.get("last_modified")):
+                logger.debug(f"Document unchanged since last processing: {doc_id}")
+                return None
+
+            if "content_hash" in last_processed_info:
+                try:
+                    doc_content = source.fetch_document(doc_id)
+                    if doc_content.get("content_hash") == last_processed_info["content_hash"]:
+                        logger.debug(f"Document content unchanged (verified by hash): {doc_id}")
+                        return None
+                    # The peeked content is the document to process
+                    return doc_content
+                except Exception as e:
+                    logger.warning(f"Error peeking at document content: {str(e)}")
+        except Exception as e:
+            logger.warning(f"Error checking if document has changed: {str(e)}")
+
+    return source.fetch_document(doc_id)
+
+
+def store_parsed_document(db, doc_id: str, doc_content: Dict[str, Any], parsed_doc: Dict[str, Any],
+                          relationships: List[Dict[str, Any]], embedding_generator, source_config: Dict[str, Any],
+                          stats: Dict[str, int], embedding_fn: Optional[Callable] = None,
+                          embedding_detector=None) -> None:
+    """
+    Store a parsed document with its dates and embeddings and update statistics.
+
+    Args:
+        db: Document database
+        doc_id: Document ID
+        doc_content: Fetched document content
+        parsed_doc: Parsed document
+        relationships: All relationships detected for the document
+        embedding_generator: Embedding generator, or None if embeddings are disabled
+        source_config: Source configuration containing topics
+        stats: Statistics dictionary to update
+        embedding_fn: Optional function producing the embeddings, replacing the generator's
+        embedding_detector: Optional detector run on the stored embeddings (see split_embedding_detector)
+    """
+    element_dates = parsed_doc.get('element_dates', [])
+
+    # Embeddings are generated once element_pk values are assigned (uses a consistent interface)
+    source_topics = source_config.get('topics', [])
+    if embedding_generator and embedding_fn is None:
+        logger.debug(f"Generating embeddings for {len(parsed_doc['elements'])} elements")
+        logger.debug(f"Using topics from source config: {source_topics}")
+
+        def embedding_fn(elements):
+            return embedding_generator.generate_from_elements(elements, db)
+
+    # Store document, dates and embeddings together (batched where the database supports it)
+    logger.debug(f"Storing document in database: {doc_id}")
+    embeddings = db.store_document_batch(
+        parsed_doc['document'], parsed_doc['elements'], relationships, element_dates or None,
+        embedding_fn=embedding_fn, topics=source_topics, confidence=1.0
+    )
+    logger.debug(f"Document stored: {doc_id}")
+    if embedding_generator:
+        logger.debug(f"Generated and stored {len(embeddings)} embeddings with topics: {source_topics}")
+
+    # Detect semantic relationships from the stored embeddings
+    if embedding_detector and embeddings:
+        semantic_relationships = embedding_detector.detect_relationships(
+            parsed_doc['document'], parsed_doc['elements'], parsed_doc.get('links', []), embeddings=embeddings
+        )
+        if semantic_relationships:
+            db.replace_relationships(
+                sorted({relationship['source_id'] for relationship in semantic_relationships}),
+                'semantic_similarity', semantic_relationships
+            )
+        relationships = relationships + semantic_relationships
+        logger.debug(f"Detected {len(semantic_relationships)} relationships from stored embeddings")
+
+    # Update processing history
+    content_hash = doc_content.get("content_hash", "")
+    if content_hash:
+        db.update_processing_history(doc_id, content_hash)
+
+    # Update statistics
+    stats['documents'] += 1
+    stats['elements'] += len(parsed_doc['elements'])
+    stats['relationships'] += len(relationships)
+    logger.debug(f"Updated stats: docs={stats['documents']}, elements={stats['elements']}, "
+                 f"relationships={stats['relationships']}")
+
+
+class IngestionPipeline:
+    """
+    Staged ingestion pipeline with bounded work between stages.
+
+    The database is only used from the thread that calls run_source, so
+    backends with thread-bound connections (such as SQLite) work unchanged.
+    """
+
+    def __init__(self, db, relationship_detector, embedding_generator, stats: Dict[str, int],
+                 settings: Optional[PipelineSettings] = None):
+        """
+        Initialize the pipeline.
+
+        Args:
+            db: Document database
+            relationship_detector: Relationship detector
+            embedding_generator: Embedding generator, or None if embeddings are disabled
+            stats: Statistics dictionary to update
+            settings: Stage concurrency settings
+        """
+        self.db = db
+        self.embedding_generator = embedding_generator
+        self.stats = stats
+        self.settings = settings or PipelineSettings()
+        relationship_detector, self.embedding_detector = split_embedding_detector(relationship_detector,
+                                                                                  embedding_generator)
+        self.portable_detector, self.local_detector = split_relationship_detector(relationship_detector)
+
+        self._io_pool = ThreadPoolExecutor(max_workers=self.settings.io_workers, thread_name_prefix='ingest-io')
+        self._parse_pool = None
+        self._parse_in_process = self.settings.parse_executor == 'process'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the stage pools."""
+        self._io_pool.shutdown(wait=True)
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=True)
+            self._parse_pool = None
+
+    def run_source(self, source, source_config: Dict[str, Any], doc_ids: List[str], processed_docs: set,
+                   global_visited_docs: set, global_processed_docs: set) -> None:
+        """
+        Ingest documents from one content source, following links to the source's max depth.
+
+        Args:
+            source: Content source
+            source_config: Source configuration
+            doc_ids: Root document IDs listed by the source
+            processed_docs: Set of processed document IDs for this source
+            global_visited_docs: Global set of all visited document IDs
+            global_processed_docs: Global set of all processed document IDs across sources
+        """
+        max_depth = source_config.get('max_link_depth', 1)
+        pending = deque((doc_id, 0) for doc_id in doc_ids)
+        in_flight = {}
+        ready = deque()
+
+        while pending or in_flight or ready:
+            # Admit documents while the pipeline has room
+            while pending and len(in_flight) + len(ready) < self.settings.queue_size:
+                doc_id, depth = pending.popleft()
+                if self._admit(doc_id, depth, max_depth, processed_docs, global_visited_docs):
+                    last_processed_info = self.db.get_last_processed_info(doc_id)
+                    future = self._io_pool.submit(_fetch_if_changed, source, doc_id, last_processed_info)
+                    in_flight[future] = (_FETCH, doc_id, depth, None)
+
+            # Single writer: store a batch of parsed documents, embedding them together
+            batch = [ready.popleft() for _ in range(min(self.settings.write_batch_size, len(ready)))]
+            embedding_fns = self._submit_embeddings([parsed_doc for _, _, _, parsed_doc in batch])
+            for (doc_id, depth, doc_content, parsed_doc), embedding_fn in zip(batch, embedding_fns):
+                if self._write(doc_id, doc_content, parsed_doc, source_config, embedding_fn) and depth < max_depth:
+                    future = self._io_pool.submit(
+                        source.follow_links, doc_content['content'], doc_id, depth, global_visited_docs
+                    )
+                    in_flight[future] = (_LINKS, doc_id, depth, None)
+
+            if not in_flight:
+                continue
+
+            # Only block when there is nothing left to write
+            done, _ = wait(list(in_flight), timeout=0 if ready else None, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, doc_id, depth, doc_content = in_flight.pop(future)
+                if stage == _FETCH:
+                    self._fetched(future, doc_id, depth, global_processed_docs, in_flight)
+                elif stage == _PARSE:
+                    self._parsed(future, doc_id, depth, doc_content, in_flight, ready)
+                else:
+                    self._linked(future, doc_id, depth, pending)
+
+    @staticmethod
+    def _admit(doc_id: str, depth: int, max_depth: int, processed_docs: set, global_visited_docs: set) -> bool:
+        """Apply the visited/depth rules and claim the document."""
+        if doc_id in processed_docs:
+            logger.debug(f"Skipping already processed document in this source: {doc_id}")
+            return False
+        if depth > 0 and doc_id in global_visited_docs:
+            logger.debug(f"Skipping globally visited document: {doc_id}")
+            return False
+        if depth > max_depth:
+            logger.debug(f"Skipping document due to max depth reached: {doc_id} (depth: {depth}/{max_depth})")
+            return False
+
+        processed_docs.add(doc_id)
+        global_visited_docs.add(doc_id)
+        return True
+
+    def _fetched(self, future, doc_id: str, depth: int, global_processed_docs: set, in_flight: dict) -> None:
+        """Handle a completed change check and fetch."""
+        try:
+            doc_content = future.result()
+        except Exception as e:
+            global_processed_docs.add(doc_id)
+            logger.error(f"Error processing document {doc_id}: {str(e)}")
+            return
+
+        if doc_content is None:
+            self.stats['unchanged_documents'] += 1
+            return
+
+        global_processed_docs.add(doc_id)
+        logger.debug(f"Document content fetched, size: {len(doc_content.get('content', ''))}")
+        in_flight[self._submit_parse(doc_content)] = (_PARSE, doc_id, depth, doc_content)
+
+    def _parsed(self, future, doc_id: str, depth: int, doc_content: Dict[str, Any], in_flight: dict,
+                ready: deque) -> None:
+        """Handle a completed parse."""
+        try:
+            parsed_doc = future.result()
+        except BrokenProcessPool as e:
+            if self._parse_in_process:
+                logger.warning(f"Parse process pool failed ({str(e)}); parsing in threads from now on")
+                self._parse_pool.shutdown(wait=False)
+                self._parse_pool = None
+                self._parse_in_process = False
+            in_flight[self._submit_parse(doc_content)] = (_PARSE, doc_id, depth, doc_content)
+            return
+        except Exception as e:
+            logger.error(f"Error processing document {doc_id}: {str(e)}")
+            return
+
+        logger.debug(f"Document parsed. Found {len(parsed_doc.get('elements', []))} elements")
+        ready.append((doc_id, depth, doc_content, parsed_doc))
+
+    @staticmethod
+    def _linked(future, doc_id: str, depth: int, pending: deque) -> None:
+        """Queue linked documents ahead of the remaining root documents."""
+        try:
+            linked_docs = future.result()
+        except Exception as e:
+            logger.error(f"Error following links for document {doc_id}: {str(e)}")
+            return
+
+        logger.debug(f"Found {len(linked_docs)} linked documents to follow")
+        pending.extendleft((linked_doc['id'], depth + 1) for linked_doc in reversed(linked_docs))
+
+    def _submit_embeddings(self, parsed_docs: List[Dict[str, Any]]) -> List[Optional[Callable]]:
+        """
+        Queue the element content of several documents with the embedding scheduler.
+
+        Texts from all documents are submitted before any result is awaited, so the
+        scheduler embeds them in shared batches. Generators that need element context
+        (or have no scheduler) embed each document while it is stored instead.
+
+        Args:
+            parsed_docs: Parsed documents about to be written
+
+        Returns:
+            One embedding function (or None) per document
+        """
+        generator = self.embedding_generator
+        if not generator or generator.scheduler is None or not generator.embeds_element_content:
+            return [None] * len(parsed_docs)
+
+        embedding_fns = []
+        for parsed_doc in parsed_docs:
+            selected = generator.select_element_content(parsed_doc['elements'])
+            ticket = generator.scheduler.submit([content for _, content in selected])
+
+            def embedding_fn(elements, selected=selected, ticket=ticket):
+                vectors = ticket.result()
+                return {elements[index]['element_pk']: vector for (index, _), vector in zip(selected, vectors)}
+
+            embedding_fns.append(embedding_fn)
+        return embedding_fns
+
+    def _write(self, doc_id: str, doc_content: Dict[str, Any], parsed_doc: Dict[str, Any],
+               source_config: Dict[str, Any], embedding_fn: Optional[Callable] = None) -> bool:
+        """
+        Run the local relationship detectors and store a parsed document.
+
+        Returns:
+            True if the document was stored
+        """
+        try:
+            relationships = parsed_doc['relationships']
+            if self.local_detector:
+                relationships.extend(self.local_detector.detect_relationships(
+                    parsed_doc['document'],
+                    parsed_doc['elements'],
+                    parsed_doc.get('links', [])
+                ))
+            logger.debug(f"Detected {len(relationships)} relationships")
+
+            store_parsed_document(self.db, doc_id, doc_content, parsed_doc, relationships,
+                                  self.embedding_generator, source_config, self.stats, embedding_fn,
+                                  self.embedding_detector)
+            return True
+        except Exception as e:
+            logger.error(f"Error processing document {doc_id}: {str(e)}")
+            import traceback
+            logger.debug(f"Exception traceback for {doc_id}: {traceback.format_exc()}")
+            return False
+
+    def _submit_parse(self, doc_content: Dict[str, Any]):
+        """Submit a document to the parse pool, creating the pool on first use."""
+        if self._parse_pool is None:
+            if self._parse_in_process:
+                self._parse_pool = ProcessPoolExecutor(
+                    max_workers=self.settings.parse_workers,
+                    initializer=_init_parse_worker,
+                    initargs=(self.portable_detector,)
+                )
+            else:
+                self._parse_pool = ThreadPoolExecutor(
+                    max_workers=self.settings.parse_workers, thread_name_prefix='ingest-parse'
+                )
+
+        if self._parse_in_process:
+            return self._parse_pool.submit(_parse_document, doc_content)
+        return self._parse_pool.submit(_parse_document, doc_content, self.portable_detector)
@@ -1,16 +1,20 @@
 """Automatically generated __init__.py"""
-__all__ = ['CompositeRelationshipDetector', 'ExplicitLinkDetector', 'RelationshipDetector', 'RelationshipType',
-           'SemanticRelationshipDetector', 'StructuralRelationshipDetector', 'base', 'composite',
-           'create_relationship_detector', 'explicit', 'factory', 'semantic', 'structural']
+__all__ = ['CompositeRelationshipDetector', 'CrossDocumentSettings', 'ExplicitLinkDetector', 'RelationshipDetector',
+           'RelationshipType', 'SemanticRelationshipDetector', 'StructuralRelationshipDetector', 'base', 'composite',
+           'compute_cross_document_relationships', 'create_relationship_detector', 'cross_document', 'explicit',
+           'factory', 'semantic', 'structural']
 
 from . import base
 from . import composite
+from . import cross_document
 from . import explicit
 from . import factory
 from . import semantic
 from . import structural
 from .base import RelationshipDetector
 from .composite import CompositeRelationshipDetector
+from .cross_document import CrossDocumentSettings
+from .cross_document import compute_cross_document_relationships
 from .explicit import ExplicitLinkDetector
 from .factory import create_relationship_detector
 from .semantic import SemanticRelationshipDetector
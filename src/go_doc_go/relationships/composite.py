@@ -1,5 +1,5 @@
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from .base import RelationshipDetector
 
@@ -20,13 +20,17 @@ class CompositeRelationshipDetector(RelationshipDetector):
 
     def detect_relationships(self, document: Dict[str, Any],
                              elements: List[Dict[str, Any]],
-                             links: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """Run all detectors and combine their results."""
+                             links: List[Dict[str, Any]] = None,
+                             embeddings: Optional[Dict[Any, Any]] = None) -> List[Dict[str, Any]]:
+        """Run all detectors and combine their results, passing precomputed embeddings on if given."""
         all_relationships = []
 
         for detector in self.detectors:
             try:
-                relationships = detector.detect_relationships(document, elements, links)
+                if embeddings is not None:
+                    relationships = detector.detect_relationships(document, elements, links, embeddings=embeddings)
+                else:
+                    relationships = detector.detect_relationships(document, elements, links)
                 all_relationships.extend(relationships)
             except Exception as e:
                 logger.error(f"Error in detector {detector.__class__.__name__}: {str(e)}")
@@ -0,0 +1,232 @@
+"""
+Cross-document semantic relationships between container elements.
+
+After ingestion, containers (sections, headers, lists, ...) are linked to the most
+similar containers of other documents with ``semantic_section`` relationships.
+This module runs that pass as one batch similarity join:
+
+- the embeddings of all containers are loaded once as a matrix
+- the query containers are scored against it in blocks of matrix products,
+  keeping the top k per container and excluding the container's own document
+- the relationships of the query containers are replaced in bulk
+
+In incremental mode (the default) only containers of the documents processed in
+this run are queried against the whole index; otherwise every container is.
+Backends that cannot load embeddings in bulk fall back to one vector search per
+container.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+
+from ..config import Config
+from ..storage.embedding_matrix import NUMPY_AVAILABLE, top_k_similarity_join, unpack_embedding
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Container element types linked across documents
+CONTAINER_TYPES = ["body", "div", "list", "header", "section", "title", "h1", "h2", "h3", "h4", "h5", "h6"]
+
+RELATIONSHIP_TYPE = "semantic_section"
+
+
+@dataclass
+class CrossDocumentSettings:
+    """Settings for the cross-document semantic relationship pass."""
+
+    similarity_threshold: float
+    top_k: int = 20
+    incremental: bool = True
+    block_memory_mb: int = 256
+
+    @classmethod
+    def from_config(cls, config: Config) -> Optional['CrossDocumentSettings']:
+        """
+        Read settings from relationship_detection.cross_document_semantic.
+
+        Args:
+            config: Configuration object
+
+        Returns:
+            Settings, or None if no similarity threshold is configured
+        """
+        section = config.config.get('relationship_detection', {}).get('cross_document_semantic', {}) or {}
+        if section.get('similarity_threshold') is None:
+            return None
+
+        return cls(
+            similarity_threshold=section['similarity_threshold'],
+            top_k=section.get('top_k', 20),
+            incremental=section.get('incremental', True),
+            block_memory_mb=section.get('block_memory_mb', 256)
+        )
+
+
+def compute_cross_document_relationships(db, processed_doc_ids: List[str], config: Config) -> int:
+    """
+    Compute semantic relationships between containers across documents.
+
+    Args:
+        db: DocumentDatabase instance
+        processed_doc_ids: IDs of the documents processed in this run
+        config: Configuration object
+
+    Returns:
+        Number of relationships created
+    """
+    settings = CrossDocumentSettings.from_config(config)
+    if settings is None:
+        logger.warning("Similarity threshold not configured - skipping cross-document relationship generation")
+        return 0
+
+    containers = db.get_embeddings_by_element_type(CONTAINER_TYPES)
+    if containers is None:
+        source_ids, relationships = _search_per_container(db, processed_doc_ids, settings)
+    else:
+        source_ids, relationships = _similarity_join(containers, set(processed_doc_ids), settings)
+
+    logger.debug(f"Replacing {RELATIONSHIP_TYPE} relationships for {len(source_ids)} containers")
+    try:
+        db.replace_relationships(source_ids, RELATIONSHIP_TYPE, relationships)
+    except Exception as e:
+        logger.warning(f"Failed to store cross-document relationships: {e}")
+        return 0
+
+    logger.info(f"Created {len(relationships)} cross-document semantic relationships")
+    return len(relationships)
+
+
+def _similarity_join(containers: List[Tuple[int, str, str, Any]], processed_doc_ids: set,
+                     settings: CrossDocumentSettings) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """
+    Match query containers against all containers with a blocked top-k join.
+
+    Args:
+        containers: (element_pk, element_id, doc_id, embedding) for every container with an embedding
+        processed_doc_ids: Documents whose containers are queried in incremental mode
+        settings: Pass settings
+
+    Returns:
+        Tuple of (query container element IDs, new relationships)
+    """
+    # Only vectors of the most common dimension can be compared
+    vectors = [unpack_embedding(embedding) for _, _, _, embedding in containers]
+    dimensions = {}
+    for vector in vectors:
+        dimensions[len(vector)] = dimensions.get(len(vector), 0) + 1
+    if not dimensions:
+        return [], []
+    dimension = max(dimensions, key=dimensions.get)
+    index = [i for i, vector in enumerate(vectors) if len(vector) == dimension]
+    if len(index) < len(vectors):
+        logger.warning(f"Skipping {len(vectors) - len(index)} container embeddings with dimensions other than "
+                       f"{dimension}")
+
+    queries = [i for i in index if not settings.incremental or containers[i][2] in processed_doc_ids]
+    if not queries:
+        return [], []
+
+    # Containers of one document share a group, so same-document pairs are excluded in bulk
+    doc_codes = {}
+    groups = [doc_codes.setdefault(containers[i][2], len(doc_codes)) for i in index]
+    position = {row: position for position, row in enumerate(index)}
+    query_groups = [groups[position[i]] for i in queries]
+    logger.debug(f"Joining {len(queries)} query containers against {len(index)} containers")
+
+    if NUMPY_AVAILABLE:
+        matrix = np.asarray([vectors[i] for i in index], dtype=np.float32)
+        matches = top_k_similarity_join(
+            matrix[[position[i] for i in queries]], matrix, settings.top_k,
+            query_groups=query_groups, index_groups=groups,
+            min_similarity=settings.similarity_threshold,
+            block_bytes=settings.block_memory_mb * 1024 * 1024
+        )
+    else:
+        matches = [_top_k_python(vectors[i], [vectors[j] for j in index], settings.top_k,
+                                 [group != query_group for group in groups], settings.similarity_threshold)
+                   for i, query_group in zip(queries, query_groups)]
+
+    relationships = []
+    for query, query_matches in zip(queries, matches):
+        _, element_id, doc_id, _ = containers[query]
+        for row, similarity in query_matches:
+            _, target_id, target_doc_id, _ = containers[index[row]]
+            relationships.append(_relationship(element_id, doc_id, target_id, target_doc_id, similarity))
+
+    return [containers[i][1] for i in queries], relationships
+
+
+def _top_k_python(query: List[float], vectors: List[List[float]], k: int, allowed: List[bool],
+                  min_similarity: float) -> List[Tuple[int, float]]:
+    """Top-k cosine matches of one query without NumPy."""
+    query_norm = sum(x * x for x in query) ** 0.5
+    scored = []
+    for row, vector in enumerate(vectors):
+        if not allowed[row]:
+            continue
+        norm = query_norm * sum(x * x for x in vector) ** 0.5
+        similarity = sum(a * b for a, b in zip(query, vector)) / norm if norm else 0.0
+        if similarity >= min_similarity:
+            scored.append((row, similarity))
+    scored.sort(key=lambda item: item[1], reverse=True)
+    return scored[:k]
+
+
+def _search_per_container(db, processed_doc_ids: List[str],
+                          settings: CrossDocumentSettings) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """
+    Match each container of the processed documents with a vector search.
+
+    Used for backends without bulk embedding access; the full (non-incremental)
+    mode is not available here.
+
+    Returns:
+        Tuple of (query container element IDs, new relationships)
+    """
+    source_ids = []
+    relationships = []
+
+    for doc_id in processed_doc_ids:
+        containers = [e for e in db.get_document_elements(doc_id) if e["element_type"] in CONTAINER_TYPES]
+        for container in containers:
+            source_ids.append(container["element_id"])
+            embedding = db.get_embedding(container["element_pk"])
+            if not embedding:
+                continue
+
+            similar_containers = db.search_by_embedding(
+                embedding,
+                limit=settings.top_k,
+                filter_criteria={"element_type": CONTAINER_TYPES, "exclude_doc_id": [doc_id]}
+            )
+            for target_pk, similarity in similar_containers:
+                if similarity < settings.similarity_threshold:
+                    continue
+                target_element = db.get_element(target_pk)
+                if not target_element:
+                    continue
+                relationships.append(_relationship(container["element_id"], doc_id, target_element["element_id"],
+                                                   target_element["doc_id"], similarity))
+
+    return source_ids, relationships
+
+
+def _relationship(source_id: str, source_doc_id: str, target_id: str, target_doc_id: str,
+                  similarity: float) -> Dict[str, Any]:
+    """Build a cross-document semantic relationship."""
+    return {
+        "relationship_id": f"sem_rel_{source_id}_{target_id}",
+        "source_id": source_id,
+        "relationship_type": RELATIONSHIP_TYPE,
+        "target_reference": target_id,
+        "metadata": {
+            "similarity_score": similarity,
+            "cross_document": True,
+            "source_doc_id": source_doc_id,
+            "target_doc_id": target_doc_id
+        }
+    }
@@ -85,11 +85,25 @@ class DomainRelationshipDetector(RelationshipDetector):
         
         all_relationships = []
         
+        # Create a pseudo-element for the document itself for document-level entity extraction
+        doc_element = {
+            'element_id': f"doc_{document.get('doc_id', 'unknown')}",
+            'element_type': 'document',
+            'doc_id': document.get('doc_id'),
+            'metadata': document.get('metadata', {}),
+            'content_preview': document.get('source', '')
+        }
+        elements_with_doc = [doc_element] + elements
+        
+        # Registry extraction does not depend on the ontology, so it runs once per document
+        extracted = None
+        
         for ontology in ontologies:
             logger.info(f"Processing ontology: {ontology.name} v{ontology.version}")
             
             # Get or create evaluator for this ontology
             evaluator = self._get_evaluator(ontology)
+            evaluator.reset_element_scores()
             
             # Phase 1: Map elements to terms
             element_mappings = self._map_elements_to_terms(elements, evaluator)
@@ -102,16 +116,9 @@ class DomainRelationshipDetector(RelationshipDetector):
             self._store_mappings(element_mappings)
             
             # Phase 1.5: Extract entities from elements and document
-            # Create a pseudo-element for the document itself for document-level entity extraction
-            doc_element = {
-                'element_id': f"doc_{document.get('doc_id', 'unknown')}",
-                'element_type': 'document',
-                'doc_id': document.get('doc_id'),
-                'metadata': document.get('metadata', {}),
-                'content_preview': document.get('source', '')
-            }
-            elements_with_doc = [doc_element] + elements
-            entities = self._extract_entities(elements_with_doc, ontology)
+            if extracted is None:
+                extracted = self._extract_registry_entities(elements_with_doc)
+            entities = self._extract_entities(elements_with_doc, ontology, extracted)
             if entities:
                 logger.info(f"Extracted {len(entities)} entities in {ontology.name}")
                 
@@ -162,22 +169,23 @@ class DomainRelationshipDetector(RelationshipDetector):
         """
         all_mappings = []
         
-        for element in elements:
-            # Prepare element data for evaluation
-            element_data = self._prepare_element_for_mapping(element)
-            
-            # Get mappings for this element
-            mappings = evaluator.map_element_to_terms(element_data)
+        for start in range(0, len(elements), self.batch_size):
+            batch = elements[start:start + self.batch_size]
             
-            # Filter by minimum confidence
-            filtered_mappings = [
-                m for m in mappings 
-                if m.confidence >= self.min_mapping_confidence
-            ]
-            
-            if filtered_mappings:
-                logger.debug(f"Element {element['element_id']} mapped to {len(filtered_mappings)} terms")
-                all_mappings.extend(filtered_mappings)
+            # Prepare element data for evaluation
+            element_data = [self._prepare_element_for_mapping(element) for element in batch]
+            
+            # Get mappings for the batch (semantic rules are scored together)
+            for element, mappings in zip(batch, evaluator.map_elements_to_terms(element_data)):
+                # Filter by minimum confidence
+                filtered_mappings = [
+                    m for m in mappings 
+                    if m.confidence >= self.min_mapping_confidence
+                ]
+                
+                if filtered_mappings:
+                    logger.debug(f"Element {element['element_id']} mapped to {len(filtered_mappings)} terms")
+                    all_mappings.extend(filtered_mappings)
         
         return all_mappings
     
@@ -297,6 +305,7 @@ class DomainRelationshipDetector(RelationshipDetector):
             logger.info(f"Cross-document processing with ontology: {ontology.name}")
             
             evaluator = self._get_evaluator(ontology)
+            evaluator.reset_element_scores()
             
             # Map all elements to terms
             element_mappings = self._map_elements_to_terms(all_elements, evaluator)
@@ -314,9 +323,10 @@ class DomainRelationshipDetector(RelationshipDetector):
             
             # Filter for cross-document relationships
             cross_doc_rels = []
+            element_documents = {element['element_id']: element.get('doc_id') for element in all_elements}
             for rel in relationships:
-                source_doc = self._get_element_document(rel['source_id'], all_elements)
-                target_doc = self._get_element_document(rel['target_reference'], all_elements)
+                source_doc = element_documents.get(rel['source_id'])
+                target_doc = element_documents.get(rel['target_reference'])
                 
                 if source_doc and target_doc and source_doc != target_doc:
                     rel['metadata'] = rel.get('metadata', {})
@@ -386,32 +396,44 @@ class DomainRelationshipDetector(RelationshipDetector):
         
         return report
     
-    def _extract_entities(self, elements: List[Dict[str, Any]], ontology) -> List[Dict[str, Any]]:
+    def _extract_registry_entities(self, elements: List[Dict[str, Any]]) -> List[List[Any]]:
+        """
+        Extract entities from elements with the extractor registry in one batch.
+        
+        Args:
+            elements: List of element dictionaries
+            
+        Returns:
+            List of extracted entities per element
+        """
+        if not self.extractor_registry:
+            return [[] for _ in elements]
+        
+        texts = [element.get('content_preview', '') or '' for element in elements]
+        return self.extractor_registry.extract_batch(texts)
+    
+    def _extract_entities(self, elements: List[Dict[str, Any]], ontology,
+                          extracted: Optional[List[List[Any]]] = None) -> List[Dict[str, Any]]:
         """
         Extract entities from elements based on ontology derived entity rules and extractors.
         
         Args:
             elements: List of element dictionaries
             ontology: Domain ontology
+            extracted: Optional registry entities per element (extracted if not given)
             
         Returns:
             List of extracted entities
         """
         entities = {}  # For deduplication
         
-        # First, extract entities using the extractor registry if available
+        # First, use the entities extracted by the extractor registry if available
         if self.extractor_registry:
-            from ..extractors.normalizers import normalize
+            if extracted is None:
+                extracted = self._extract_registry_entities(elements)
             
-            for element in elements:
-                text = element.get('content_preview', '')
-                if not text:
-                    continue
-                
-                # Extract entities using all registered extractors
-                extracted = self.extractor_registry.extract_all(text)
-                
-                for entity in extracted:
+            for element, element_entities in zip(elements, extracted):
+                for entity in element_entities:
                     # Create entity data from extracted entity
                     entity_data = {
                         'entity_id': f"{entity.entity_type}_{entity.normalized_value.replace(' ', '_')}",
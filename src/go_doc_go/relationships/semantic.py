@@ -1,6 +1,6 @@
 import logging
 import uuid
-from typing import Dict, Any, List, Tuple, Union, TYPE_CHECKING
+from typing import Dict, Any, List, Optional, Tuple, Union, TYPE_CHECKING
 
 # Import types for type checking only - these won't be imported at runtime
 if TYPE_CHECKING:
@@ -14,6 +14,7 @@ else:
     VectorType = List[float]  # Generic list of floats for vectors
 
 from .base import RelationshipDetector
+from ..storage.embedding_matrix import top_k_similarity_join
 
 logger = logging.getLogger(__name__)
 
@@ -38,17 +39,33 @@ class SemanticRelationshipDetector(RelationshipDetector):
 
         Args:
             embedding_generator: Embedding generator
-            config: Configuration dictionary
+            config: Configuration dictionary. reuse_embeddings (default True) lets ingestion
+                    run this detector on the embeddings it stores instead of embedding again.
         """
         self.embedding_generator = embedding_generator
         self.config = config or {}
         self.similarity_threshold = self.config.get("similarity_threshold", 0.7)
         self.max_relationships = self.config.get("max_relationships", 5)
+        self.reuse_embeddings = self.config.get("reuse_embeddings", True)
+        self.block_memory_mb = self.config.get("block_memory_mb", 64)
 
     def detect_relationships(self, document: Dict[str, Any],
                              elements: List[Dict[str, Any]],
-                             links: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """Detect semantic relationships between elements."""
+                             links: List[Dict[str, Any]] = None,
+                             embeddings: Optional[Dict[Any, VectorType]] = None) -> List[Dict[str, Any]]:
+        """
+        Detect semantic relationships between elements.
+
+        Args:
+            document: Document metadata
+            elements: Document elements
+            links: Optional list of links extracted by the parser
+            embeddings: Optional embeddings already computed for the document, keyed by
+                        element_pk or element_id; only elements without one are embedded
+
+        Returns:
+            List of detected relationships
+        """
         relationships = []
         doc_id = document["doc_id"]
 
@@ -56,8 +73,9 @@ class SemanticRelationshipDetector(RelationshipDetector):
         if not elements:
             return relationships
 
-        # Generate embeddings for all elements
+        embeddings = embeddings or {}
         element_texts = {}
+        element_embeddings = {}
         elements_to_embed = []
 
         for element in elements:
@@ -70,24 +88,23 @@ class SemanticRelationshipDetector(RelationshipDetector):
                 continue
 
             element_texts[element_id] = content_preview
-            elements_to_embed.append((element_id, content_preview))
-
-        # Skip if no elements to embed
-        if not elements_to_embed:
+            embedding = embeddings.get(element.get("element_pk"))
+            if embedding is None:
+                embedding = embeddings.get(element_id)
+            if embedding is not None:
+                element_embeddings[element_id] = embedding
+            else:
+                elements_to_embed.append((element_id, content_preview))
+
+        # Skip if no elements to compare
+        if not element_embeddings and not elements_to_embed:
             return relationships
 
-        # Generate embeddings
-        element_ids = [e[0] for e in elements_to_embed]
-        texts = [e[1] for e in elements_to_embed]
-
         try:
-            embeddings = self.embedding_generator.generate_batch(texts)
-
-            # Create mapping of element ID to embedding
-            element_embeddings = {
-                element_id: embedding
-                for element_id, embedding in zip(element_ids, embeddings)
-            }
+            # Generate embeddings for elements without precomputed ones
+            if elements_to_embed:
+                generated = self.embedding_generator.generate_batch([text for _, text in elements_to_embed])
+                element_embeddings.update(zip((element_id for element_id, _ in elements_to_embed), generated))
 
             # Calculate pairwise similarities
             similarities = self._calculate_similarities(element_embeddings)
@@ -125,36 +142,55 @@ class SemanticRelationshipDetector(RelationshipDetector):
     def _calculate_similarities(self, element_embeddings: Dict[str, List[float]]) -> List[
         Tuple[Tuple[str, str], float]]:
         """
-        Calculate pairwise similarities between elements.
+        Find the most similar other elements for every element.
+
+        Each element keeps at most max_relationships matches at or above the similarity
+        threshold. A pair found from both sides is reported once, from the earlier element.
+        With NumPy, similarities are computed as a blocked matrix product so memory stays
+        bounded for large documents.
 
         Args:
             element_embeddings: Dict mapping element ID to embedding
 
         Returns:
-            List of ((source_id, target_id), similarity) tuples, sorted by similarity
+            List of ((source_id, target_id), similarity) tuples, in element order and
+            highest similarity first per source
         """
         element_ids = list(element_embeddings.keys())
-        similarities = []
-
-        # Calculate similarities for all pairs
-        for i, source_id in enumerate(element_ids):
-            source_embedding = element_embeddings[source_id]
-
-            # Only calculate for elements after this one (avoid duplicates)
-            for target_id in element_ids[i + 1:]:
-                target_embedding = element_embeddings[target_id]
-
-                # Calculate cosine similarity
-                similarity = self._cosine_similarity(source_embedding, target_embedding)
+        if len(element_ids) < 2 or self.max_relationships <= 0:
+            return []
 
-                # Add to results
-                similarities.append(((source_id, target_id), similarity))
+        if NUMPY_AVAILABLE:
+            # Each element is its own group so self-matches are excluded
+            groups = np.arange(len(element_ids))
+            matches = top_k_similarity_join(
+                [element_embeddings[element_id] for element_id in element_ids],
+                [element_embeddings[element_id] for element_id in element_ids],
+                self.max_relationships,
+                query_groups=groups, index_groups=groups,
+                min_similarity=self.similarity_threshold,
+                block_bytes=self.block_memory_mb * 1024 * 1024
+            )
+        else:
+            matches = []
+            for i, source_id in enumerate(element_ids):
+                scored = [(j, self._cosine_similarity(element_embeddings[source_id], element_embeddings[target_id]))
+                          for j, target_id in enumerate(element_ids) if j != i]
+                scored = [(j, similarity) for j, similarity in scored if similarity >= self.similarity_threshold]
+                scored.sort(key=lambda x: x[1], reverse=True)
+                matches.append(scored[:self.max_relationships])
 
-        # Sort by similarity (highest first)
-        similarities.sort(key=lambda x: x[1], reverse=True)
+        similarities = []
+        seen = set()
+        for i, row_matches in enumerate(matches):
+            for j, similarity in row_matches:
+                pair = (min(i, j), max(i, j))
+                if pair in seen:
+                    continue
+                seen.add(pair)
+                similarities.append(((element_ids[i], element_ids[j]), similarity))
 
-        # Limit to max relationships
-        return similarities[:self.max_relationships * len(element_ids)]
+        return similarities
 
     def _cosine_similarity(self, vec1: Union[VectorType, 'np.ndarray'],
                            vec2: Union[VectorType, 'np.ndarray']) -> float:
@@ -9,6 +9,7 @@ from pydantic import BaseModel, Field, PrivateAttr
 from .adapter import create_content_resolver, ContentResolver
 from .config import Config
 from .storage import ElementRelationship, DocumentDatabase, ElementHierarchical, ElementFlat, flatten_hierarchy
+from .storage.search_cache import SearchResultCache, get_query_embedding_cache
 # Import the Pydantic models
 from .storage.search import (
     SearchQueryRequest,
@@ -314,6 +315,7 @@ class SearchHelper:
     _instance = None
     _db = None
     _content_resolver = None
+    _result_cache: Optional[SearchResultCache] = None
 
     def __new__(cls):
         """Implement singleton pattern."""
@@ -334,6 +336,14 @@ class SearchHelper:
             cls._content_resolver = create_content_resolver(_config)
             logger.info("Content resolver initialized as singleton")
 
+        if cls._result_cache is None:
+            cache_config = _config.config.get('search', {}).get('cache', {})
+            get_query_embedding_cache().configure(cache_config.get('query_embedding_entries', 1000),
+                                                  cache_config.get('query_embedding_ttl', 3600))
+            cls._result_cache = SearchResultCache(cache_config.get('result_entries', 0),
+                                                  cache_config.get('result_ttl', 300))
+            logger.info(f"Search result cache initialized (entries: {cls._result_cache.max_entries})")
+
     @classmethod
     def get_database(cls):
         """Get the singleton database instance."""
@@ -348,6 +358,20 @@ class SearchHelper:
             cls._initialize_dependencies()
         return cls._content_resolver
 
+    @classmethod
+    def get_cache_statistics(cls) -> Dict[str, Any]:
+        """Get hit/miss statistics of the query embedding and search result caches."""
+        return {
+            'query_embeddings': get_query_embedding_cache().get_statistics(),
+            'results': cls._result_cache.get_statistics() if cls._result_cache else None
+        }
+
+    @classmethod
+    def release_connection(cls) -> None:
+        """Return connections held by the calling thread, e.g. at the end of a request."""
+        if cls._db is not None:
+            cls._db.release_connection()
+
     # DOCUMENT MATERIALIZATION METHODS
 
     @classmethod
@@ -549,27 +573,11 @@ class SearchHelper:
             result_tuples = [(item.element_pk, item.final_score) for item in pydantic_response.results]
 
             # Build search tree and resolve content if requested (SearchHelper value-add)
-            def resolve_elements(items: List[ElementHierarchical]):
-                for item in items:
-                    if item.child_elements:
-                        resolve_elements(item.child_elements)
-                    if text and item.content_location:
-                        try:
-                            item.text = resolver.resolve_content(item.content_location, text=True)
-                        except Exception as e:
-                            logger.warning(f"Failed to resolve text for {item.content_location}: {e}")
-                    if content and item.content_location:
-                        try:
-                            item.content = resolver.resolve_content(item.content_location, text=False)
-                        except Exception as e:
-                            logger.warning(f"Failed to resolve content for {item.content_location}: {e}")
-
-            # Get document outline/hierarchy
             search_tree = db.get_results_outline(result_tuples) if result_tuples else []
 
             # Resolve content if requested
             if text or content:
-                resolve_elements(search_tree)
+                cls._resolve_tree_content(resolver, search_tree, text, content)
 
             # Get document sources for these elements
             document_sources = cls._get_document_sources_for_elements([pk for pk, _ in result_tuples])
@@ -969,6 +977,43 @@ class SearchHelper:
         db = cls.get_database()
         resolver = cls.get_content_resolver()
 
+        # Serve repeated requests from the result cache; the store generation in the key
+        # invalidates entries when documents are stored or deleted
+        cache_key = None
+        if cls._result_cache is not None and cls._result_cache.enabled:
+            cache_key = SearchResultCache.make_key(
+                db.store_generation,
+                query=query_text,
+                limit=limit,
+                filter_criteria=filter_criteria,
+                include_topics=sorted(include_topics) if include_topics else None,
+                exclude_topics=sorted(exclude_topics) if exclude_topics else None,
+                min_confidence=min_confidence,
+                min_score=min_score,
+                text=text,
+                content=content,
+                flat=flat,
+                include_parents=include_parents
+            )
+            cached = cls._result_cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"Search result cache hit for text: {query_text}")
+                return cached.model_copy(deep=True)
+
+        results = cls._search_by_text(db, resolver, query_text, limit, filter_criteria, include_topics,
+                                      exclude_topics, min_confidence, min_score, text, content, flat,
+                                      include_parents)
+
+        if cache_key is not None:
+            cls._result_cache.set(cache_key, results.model_copy(deep=True))
+        return results
+
+    @classmethod
+    def _search_by_text(cls, db, resolver, query_text: str, limit: int, filter_criteria: Optional[Dict[str, Any]],
+                        include_topics: Optional[List[str]], exclude_topics: Optional[List[str]],
+                        min_confidence: Optional[float], min_score: float, text: bool, content: bool,
+                        flat: bool, include_parents: bool) -> SearchResults:
+        """Run a text search without consulting the result cache (see search_by_text)."""
         logger.debug(f"Searching for text: {query_text} with min_score: {min_score}")
 
         # Check if topic filtering is requested and supported
@@ -992,23 +1037,8 @@ class SearchHelper:
             filtered_elements = [(result['element_pk'], result.get('similarity', 1.0)) for result in topic_results]
 
             # Build search tree and resolve content if requested
-            def resolve_elements(items: List[ElementHierarchical]):
-                for item in items:
-                    if item.child_elements:
-                        resolve_elements(item.child_elements)
-                    if text and item.content_location:
-                        try:
-                            item.text = resolver.resolve_content(item.content_location, text=True)
-                        except Exception as e:
-                            logger.warning(f"Failed to resolve text for {item.content_location}: {e}")
-                    if content and item.content_location:
-                        try:
-                            item.content = resolver.resolve_content(item.content_location, text=False)
-                        except Exception as e:
-                            logger.warning(f"Failed to resolve content for {item.content_location}: {e}")
-
             search_tree = db.get_results_outline(filtered_elements)
-            resolve_elements(search_tree)
+            cls._resolve_tree_content(resolver, search_tree, text, content)
 
             # Get document sources and topic statistics
             element_pks = [result['element_pk'] for result in topic_results]
@@ -1062,23 +1092,8 @@ class SearchHelper:
             # Apply limit after filtering
             filtered_elements = filtered_elements[:limit]
 
-            def resolve_elements(items: List[ElementHierarchical]):
-                for item in items:
-                    if item.child_elements:
-                        resolve_elements(item.child_elements)
-                    if text and item.content_location:
-                        try:
-                            item.text = resolver.resolve_content(item.content_location, text=True)
-                        except Exception as e:
-                            logger.warning(f"Failed to resolve text for {item.content_location}: {e}")
-                    if content and item.content_location:
-                        try:
-                            item.content = resolver.resolve_content(item.content_location, text=False)
-                        except Exception as e:
-                            logger.warning(f"Failed to resolve content for {item.content_location}: {e}")
-
             search_tree = db.get_results_outline(filtered_elements)
-            resolve_elements(search_tree)
+            cls._resolve_tree_content(resolver, search_tree, text, content)
 
             # Get document sources for these elements
             document_sources = cls._get_document_sources_for_elements([pk for pk, _ in filtered_elements])
@@ -1102,6 +1117,50 @@ class SearchHelper:
                 supports_topics=supports_topics
             )
 
+    @classmethod
+    def _resolve_tree_content(cls, resolver, items: List[ElementHierarchical], text: bool, content: bool) -> None:
+        """
+        Resolve the text and/or content of every element in a search tree.
+
+        The locations are resolved in one batch per representation, so the resolver can
+        fetch each source document once; if a batch fails, the locations are resolved
+        one at a time.
+
+        Args:
+            resolver: Content resolver
+            items: Search tree
+            text: Whether to resolve the text representation
+            content: Whether to resolve the native content
+        """
+        resolvable = []
+        pending = list(items)
+        while pending:
+            item = pending.pop()
+            if item.child_elements:
+                pending.extend(item.child_elements)
+            if item.content_location:
+                resolvable.append(item)
+        if not resolvable:
+            return
+
+        for wanted, as_text, field in ((text, True, 'text'), (content, False, 'content')):
+            if not wanted:
+                continue
+            try:
+                values = resolver.resolve_content_batch([item.content_location for item in resolvable], text=as_text)
+            except Exception as e:
+                logger.warning(f"Failed to resolve {field} in batch, resolving one at a time: {e}")
+                values = None
+
+            for index, item in enumerate(resolvable):
+                if values is not None:
+                    setattr(item, field, values[index])
+                    continue
+                try:
+                    setattr(item, field, resolver.resolve_content(item.content_location, text=as_text))
+                except Exception as e:
+                    logger.warning(f"Failed to resolve {field} for {item.content_location}: {e}")
+
     @classmethod
     def _get_document_sources_for_elements(cls, element_pks: List[int]) -> List[str]:
         """
@@ -1119,18 +1178,11 @@ class SearchHelper:
         db = cls.get_database()
         unique_sources: Set[str] = set()
 
-        for pk in element_pks:
-            # Get the element
-            element = db.get_element(pk)
-            if not element:
-                continue
-
-            # Get the document
-            doc_id = element.get("doc_id", "")
-            document = db.get_document(doc_id)
-            if not document:
-                continue
+        # Fetch the elements and their documents in two batches
+        elements = db.get_elements_by_pks(element_pks)
+        documents = db.get_documents_by_ids([element.get("doc_id", "") for element in elements.values()])
 
+        for document in documents.values():
             # Add the source if it exists
             source = document.get("source")
             if source:
@@ -1188,6 +1240,11 @@ class SearchHelper:
         logger.info(f"Found {len(search_results.results)} similar elements after filtering")
 
         results = []
+        to_resolve = []
+
+        # Fetch the elements and their documents in two batches
+        elements = db.get_elements_by_pks([item.element_pk for item in search_results.results])
+        documents = db.get_documents_by_ids([element.get("doc_id", "") for element in elements.values()])
 
         # Process each search result
         for item in search_results.results:
@@ -1195,14 +1252,14 @@ class SearchHelper:
             similarity = item.similarity
 
             # Get the element
-            element = db.get_element(element_pk)
+            element = elements.get(element_pk)
             if not element:
                 logger.warning(f"Could not find element with PK: {element_pk}")
                 continue
 
             # Get the document
             doc_id = element.get("doc_id", "")
-            document = db.get_document(doc_id)
+            document = documents.get(doc_id)
             if not document:
                 logger.warning(f"Could not find document with ID: {doc_id}")
                 document = {}  # Use empty dict to avoid None errors
@@ -1245,19 +1302,36 @@ class SearchHelper:
                 resolution_error=None
             )
 
-            # Try to resolve content if requested
+            # Collect content to resolve if requested
             if resolve_content:
                 content_location = element.get("content_location")
                 if content_location and content_resolver.supports_location(content_location):
-                    try:
-                        result.resolved_content = content_resolver.resolve_content(content_location, text=False)
-                        result.resolved_text = content_resolver.resolve_content(content_location, text=True)
-                    except Exception as e:
-                        logger.error(f"Error resolving content: {str(e)}")
-                        result.resolution_error = str(e)
+                    to_resolve.append(result)
 
             results.append(result)
 
+        # Resolve content in one batch per representation, grouped by source by the resolver
+        if to_resolve:
+            locations = [result.content_location for result in to_resolve]
+            try:
+                contents = content_resolver.resolve_content_batch(locations, text=False)
+                texts = content_resolver.resolve_content_batch(locations, text=True)
+            except Exception as e:
+                logger.warning(f"Batch content resolution failed, resolving one at a time: {e}")
+                contents = texts = None
+
+            for index, result in enumerate(to_resolve):
+                if contents is not None:
+                    result.resolved_content = contents[index]
+                    result.resolved_text = texts[index]
+                    continue
+                try:
+                    result.resolved_content = content_resolver.resolve_content(result.content_location, text=False)
+                    result.resolved_text = content_resolver.resolve_content(result.content_location, text=True)
+                except Exception as e:
+                    logger.error(f"Error resolving content: {str(e)}")
+                    result.resolution_error = str(e)
+
         return results
 
 
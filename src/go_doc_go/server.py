@@ -12,7 +12,7 @@ from werkzeug.exceptions import BadRequest, InternalServerError
 from go_doc_go.adapter import create_content_resolver
 from go_doc_go.config import Config
 from go_doc_go.search import search_with_content, search_by_text, get_document_sources, SearchResult, search_structured, \
-    search_simple_structured
+    search_simple_structured, SearchHelper
 from go_doc_go.api.flask_settings_routes import settings_bp
 from go_doc_go.api.pipeline_routes import pipeline_bp
 
@@ -47,6 +47,14 @@ CORS(app, origins=cors_origins)
 app.register_blueprint(settings_bp)
 app.register_blueprint(pipeline_bp)
 
+
+@app.teardown_request
+def _release_connections(exc=None):
+    """Return per-thread database connections to their pools after each request."""
+    if db is not None:
+        db.release_connection()
+    SearchHelper.release_connection()
+
 # Get the directory where server.py is located
 SERVER_DIR = os.path.dirname(os.path.abspath(__file__))
 
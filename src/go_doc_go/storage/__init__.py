@@ -2,38 +2,46 @@
 __all__ = ['BackendCapabilities', 'DateRangeOperator', 'DateRangeOperatorEnum', 'DateSearchCriteria',
            'DateSearchRequest', 'DateTimeEncoder', 'DocumentDatabase', 'ElasticsearchDocumentDatabase', 'ElementBase',
            'ElementFlat', 'ElementHierarchical', 'ElementRelationship', 'ElementSearchCriteria', 'ElementSearchRequest',
-           'ElementType', 'EmbeddingSearchCriteria', 'ExtractedDateInfo', 'FileDocumentDatabase', 'LogicalOperator',
-           'LogicalOperatorEnum', 'MetadataSearchCriteria', 'MetadataSearchRequest', 'MongoDBDocumentDatabase',
-           'Neo4jDocumentDatabase', 'PostgreSQLDocumentDatabase', 'RelationshipCategory', 'SQLAlchemyDocumentDatabase',
-           'SQLiteDocumentDatabase', 'ScoreCombinationEnum', 'SearchCapability', 'SearchCriteriaGroup',
-           'SearchCriteriaGroupRequest', 'SearchQueryBuilder', 'SearchQueryRequest', 'SearchResponse',
-           'SearchResultItem', 'SemanticSearchRequest', 'SimilarityOperator', 'SimilarityOperatorEnum',
-           'SolrDocumentDatabase', 'StructuredSearchQuery', 'TextSearchCriteria', 'TopicSearchCriteria',
-           'TopicSearchRequest', 'UnsupportedSearchError', 'VectorSearchRequest', 'base', 'build_element_hierarchy',
+           'ElementType', 'EmbeddingMatrix', 'EmbeddingSearchCriteria', 'ExtractedDateInfo', 'FileDocumentDatabase',
+           'LogicalOperator', 'LogicalOperatorEnum', 'MetadataSearchCriteria', 'MetadataSearchRequest',
+           'MongoDBDocumentDatabase', 'Neo4jDocumentDatabase', 'PlanStep', 'PostgreSQLDocumentDatabase',
+           'QueryEmbeddingCache', 'QueryPlan', 'QueryPlanner', 'RelationshipCategory', 'SQLAlchemyDocumentDatabase',
+           'SQLiteConnectionPool', 'SQLiteDocumentDatabase', 'ScoreCombinationEnum', 'SearchCapability',
+           'SearchCriteriaGroup', 'SearchCriteriaGroupRequest', 'SearchQueryBuilder', 'SearchQueryRequest',
+           'SearchResponse', 'SearchResultCache', 'SearchResultItem', 'SegmentMapping', 'SegmentStore',
+           'SemanticSearchRequest', 'SimilarityOperator', 'SimilarityOperatorEnum', 'SolrDocumentDatabase',
+           'StructuredSearchQuery', 'TextSearchCriteria', 'TopicSearchCriteria', 'TopicSearchRequest',
+           'TopicStatisticsCache', 'UnsupportedSearchError', 'VectorSearchRequest', 'base', 'build_element_hierarchy',
            'core_results_to_pydantic', 'create_query_from_dict_examples', 'create_simple_search', 'create_topic_search',
            'demonstrate_pydantic_search', 'demonstrate_query_building', 'deserialize_search_query', 'elastic_search',
-           'element_element', 'element_relationship', 'execute_search', 'factory', 'file', 'filter_elements_by_type',
-           'flatten_hierarchy', 'get_child_elements', 'get_common_query_patterns', 'get_container_elements',
-           'get_container_relationships', 'get_document_database', 'get_explicit_links', 'get_leaf_elements',
+           'element_element', 'element_relationship', 'embedding_array', 'embedding_matrix', 'execute_plan',
+           'execute_search', 'factory', 'file', 'filter_elements_by_type', 'flatten_hierarchy', 'get_child_elements',
+           'get_common_query_patterns', 'get_container_elements', 'get_container_relationships',
+           'get_document_database', 'get_explicit_links', 'get_leaf_elements', 'get_query_embedding_cache',
            'get_root_elements', 'get_semantic_relationships', 'get_sibling_relationships',
-           'get_structural_relationships', 'mongodb', 'neo4j_graph', 'postgres', 'pydantic_to_core_query', 'search',
-           'serialize_and_deserialize_roundtrip', 'solr', 'sort_relationships_by_confidence',
-           'sort_semantic_relationships_by_similarity', 'sqlalchemy_', 'sqlite', 'structured_search',
+           'get_structural_relationships', 'mongodb', 'neo4j_graph', 'pack_embedding', 'postgres',
+           'pydantic_to_core_query', 'search', 'search_cache', 'segment_store', 'serialize_and_deserialize_roundtrip',
+           'solr', 'sort_relationships_by_confidence', 'sort_semantic_relationships_by_similarity', 'sqlalchemy_',
+           'sqlite', 'sqlite_pool', 'structured_search', 'top_k_similarity_join', 'unpack_embedding',
            'validate_query_capabilities']
 
 from . import base
 from . import elastic_search
 from . import element_element
 from . import element_relationship
+from . import embedding_matrix
 from . import factory
 from . import file
 from . import mongodb
 from . import neo4j_graph
 from . import postgres
 from . import search
+from . import search_cache
+from . import segment_store
 from . import solr
 from . import sqlalchemy_
 from . import sqlite
+from . import sqlite_pool
 from . import structured_search
 from .base import DocumentDatabase
 from .elastic_search import ElasticsearchDocumentDatabase
@@ -57,6 +65,11 @@ from .element_relationship import get_sibling_relationships
 from .element_relationship import get_structural_relationships
 from .element_relationship import sort_relationships_by_confidence
 from .element_relationship import sort_semantic_relationships_by_similarity
+from .embedding_matrix import EmbeddingMatrix
+from .embedding_matrix import embedding_array
+from .embedding_matrix import pack_embedding
+from .embedding_matrix import top_k_similarity_join
+from .embedding_matrix import unpack_embedding
 from .factory import get_document_database
 from .file import FileDocumentDatabase
 from .mongodb import MongoDBDocumentDatabase
@@ -87,9 +100,16 @@ from .search import deserialize_search_query
 from .search import execute_search
 from .search import pydantic_to_core_query
 from .search import serialize_and_deserialize_roundtrip
+from .search_cache import QueryEmbeddingCache
+from .search_cache import SearchResultCache
+from .search_cache import TopicStatisticsCache
+from .search_cache import get_query_embedding_cache
+from .segment_store import SegmentMapping
+from .segment_store import SegmentStore
 from .solr import SolrDocumentDatabase
 from .sqlalchemy_ import SQLAlchemyDocumentDatabase
 from .sqlite import SQLiteDocumentDatabase
+from .sqlite_pool import SQLiteConnectionPool
 from .structured_search import BackendCapabilities
 from .structured_search import DateRangeOperator
 from .structured_search import DateSearchCriteria
@@ -97,6 +117,9 @@ from .structured_search import ElementSearchCriteria
 from .structured_search import EmbeddingSearchCriteria
 from .structured_search import LogicalOperator
 from .structured_search import MetadataSearchCriteria
+from .structured_search import PlanStep
+from .structured_search import QueryPlan
+from .structured_search import QueryPlanner
 from .structured_search import SearchCapability
 from .structured_search import SearchCriteriaGroup
 from .structured_search import SearchQueryBuilder
@@ -106,5 +129,6 @@ from .structured_search import TextSearchCriteria
 from .structured_search import TopicSearchCriteria
 from .structured_search import UnsupportedSearchError
 from .structured_search import demonstrate_query_building
+from .structured_search import execute_plan
 from .structured_search import get_common_query_patterns
 from .structured_search import validate_query_capabilities
@@ -13,19 +13,23 @@ structured search system, ensuring backward compatibility while enabling advance
 search capabilities and flexible full-text storage options.
 """
 
+import logging
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Tuple, Union
+from typing import Callable, Dict, Any, Hashable, Iterable, List, Optional, Tuple, Union
 
 # Import existing element types
 from .element_element import ElementBase, ElementType, ElementHierarchical
 from .element_relationship import ElementRelationship
+from .search_cache import TopicStatisticsCache, get_query_embedding_cache
 # Import the structured search components
 from .structured_search import (
     StructuredSearchQuery, BackendCapabilities, SearchCapability,
     validate_query_capabilities
 )
 
+logger = logging.getLogger(__name__)
+
 
 class DocumentDatabase(ABC):
     """
@@ -34,6 +38,12 @@ class DocumentDatabase(ABC):
     flexible full-text storage configuration, and convenient document retrieval methods.
     """
 
+    # Bumped by every write; search result caches key on it (see store_generation)
+    _store_generation = 0
+
+    # Incrementally maintained topic statistics, set by backends that support it
+    _topic_statistics_cache: Optional[TopicStatisticsCache] = None
+
     def __init__(self, conn_params: Dict[str, Any]):
         """
         Initialize the document database with connection parameters and full-text configuration.
@@ -80,6 +90,15 @@ class DocumentDatabase(ABC):
         """Close the database connection."""
         pass
 
+    def release_connection(self) -> None:
+        """
+        Release any connection held for the calling thread.
+
+        Backends that give each thread its own connection return it to their pool;
+        others have nothing to release.
+        """
+        pass
+
     # ========================================
     # DOCUMENT STORAGE OPERATIONS
     # ========================================
@@ -117,6 +136,55 @@ class DocumentDatabase(ABC):
         """
         pass
 
+    def store_document_batch(self, document: Dict[str, Any], elements: List[Dict[str, Any]],
+                             relationships: List[Dict[str, Any]],
+                             element_dates: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                             embedding_fn: Optional[Callable[[List[Dict[str, Any]]], Dict[int, List[float]]]] = None,
+                             topics: Optional[List[str]] = None,
+                             confidence: float = 1.0) -> Dict[int, List[float]]:
+        """
+        Store a document together with its extracted dates and embeddings.
+
+        Backends that support it write everything in a single transaction using
+        batched inserts. This default implementation falls back to the per-record
+        methods.
+
+        Args:
+            document: Document metadata
+            elements: Document elements; element_pk is set on each element
+            relationships: Element relationships
+            element_dates: Optional extracted dates keyed by element_id
+            embedding_fn: Optional callable that receives the elements once element_pk
+                          values are assigned and returns embeddings keyed by element_pk.
+                          If it raises, the exception propagates: backends that write in one
+                          transaction store nothing (element_pk values they reserved are not
+                          reused), while this per-record fallback has already stored the document
+            topics: Topics to store with the embeddings if the backend supports topics
+            confidence: Confidence stored with topic-aware embeddings
+
+        Returns:
+            The stored embeddings, keyed by element_pk
+        """
+        self.store_document(document, elements, relationships)
+
+        if element_dates:
+            try:
+                for element_id, dates_list in element_dates.items():
+                    if dates_list:
+                        self.store_element_dates(element_id, dates_list)
+            except Exception as e:
+                logger.warning(f"Error storing element dates: {str(e)}")
+
+        embeddings = embedding_fn(elements) if embedding_fn else {}
+        use_topics = topics is not None and self.supports_topics()
+        for element_pk, embedding in embeddings.items():
+            if use_topics:
+                self.store_embedding_with_topics(element_pk, embedding, topics, confidence)
+            else:
+                self.store_embedding(element_pk, embedding)
+
+        return embeddings
+
     @abstractmethod
     def get_document(self, doc_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -193,6 +261,46 @@ class DocumentDatabase(ABC):
         """
         pass
 
+    def get_elements_by_pks(self, element_pks: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get several elements by primary key.
+
+        This default implementation fetches one element at a time; backends that
+        support it fetch all elements with one query.
+
+        Args:
+            element_pks: Element primary keys
+
+        Returns:
+            Dictionary of element_pk to element data (missing elements are omitted)
+        """
+        elements = {}
+        for element_pk in dict.fromkeys(element_pks):
+            element = self.get_element(element_pk)
+            if element:
+                elements[element_pk] = element
+        return elements
+
+    def get_documents_by_ids(self, doc_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the metadata of several documents.
+
+        This default implementation fetches one document at a time; backends that
+        support it fetch all documents with one query.
+
+        Args:
+            doc_ids: Document IDs
+
+        Returns:
+            Dictionary of doc_id to document data (missing documents are omitted)
+        """
+        documents = {}
+        for doc_id in dict.fromkeys(doc_ids):
+            document = self.get_document(doc_id)
+            if document:
+                documents[doc_id] = document
+        return documents
+
     @abstractmethod
     def delete_document(self, doc_id: str) -> bool:
         """
@@ -326,6 +434,41 @@ class DocumentDatabase(ABC):
         """Find all relationships where the specified element_pk is the source."""
         pass
 
+    def get_embeddings_by_element_type(self, element_types: List[str]) -> Optional[List[Tuple[int, str, str, Any]]]:
+        """
+        Load the embeddings of all elements of the given types in one pass.
+
+        Used by batch similarity joins. Backends that cannot enumerate embeddings
+        in bulk return None, and callers fall back to per-element search.
+
+        Args:
+            element_types: Element types to include
+
+        Returns:
+            List of (element_pk, element_id, doc_id, embedding) tuples, where embedding is a
+            list of floats or a packed float32 blob, or None if not supported
+        """
+        return None
+
+    def replace_relationships(self, source_ids: List[str], relationship_type: str,
+                              relationships: List[Dict[str, Any]]) -> None:
+        """
+        Replace the relationships of one type for a set of source elements.
+
+        Existing relationships of the type are deleted for every source element, then
+        the new relationships are stored. This default implementation works one record
+        at a time; backends that support it do both in a single transaction.
+
+        Args:
+            source_ids: Element IDs whose relationships of the type are replaced
+            relationship_type: Relationship type to replace
+            relationships: New relationships to store
+        """
+        for source_id in source_ids:
+            self.delete_relationships_for_element(source_id, relationship_type)
+        for relationship in relationships:
+            self.store_relationship(relationship)
+
     # ========================================
     # DATE STORAGE AND SEARCH METHODS
     # ========================================
@@ -2555,6 +2698,52 @@ class DocumentDatabase(ABC):
         """
         return []
 
+    # ========================================
+    # SEARCH CACHE SUPPORT
+    # ========================================
+
+    @property
+    def store_generation(self) -> Hashable:
+        """
+        Get the store generation of this database.
+
+        The generation changes whenever documents or embeddings are written through
+        this instance, so search results cached under one generation are invalidated
+        by ingestion.
+
+        Returns:
+            Hashable store generation
+        """
+        return self._store_generation
+
+    def _bump_store_generation(self, doc_ids: Optional[Iterable[str]] = None,
+                               element_pks: Optional[Iterable[int]] = None) -> None:
+        """
+        Record a write to the database.
+
+        Args:
+            doc_ids: Documents that were stored, updated or deleted
+            element_pks: Elements whose embeddings or topics were stored
+        """
+        self._store_generation += 1
+        if self._topic_statistics_cache is not None:
+            if doc_ids:
+                self._topic_statistics_cache.mark_documents(doc_ids)
+            if element_pks:
+                self._topic_statistics_cache.mark_elements(element_pks)
+
+    def _generate_query_embedding(self, search_text: str) -> List[float]:
+        """
+        Generate the embedding of a query through the process-wide query embedding cache.
+
+        Args:
+            search_text: Query text
+
+        Returns:
+            Query embedding
+        """
+        return get_query_embedding_cache().get_or_generate(self.embedding_generator, search_text)
+
     # ========================================
     # DOMAIN ONTOLOGY MAPPING METHODS
     # ========================================
@@ -2823,13 +3012,16 @@ class DocumentDatabase(ABC):
         # Final result structure
         result_tree: List[ElementHierarchical] = []
 
+        # Fetch the ancestry paths of all results at once
+        ancestries = self.get_element_ancestries([element_pk for element_pk, _ in elements])
+
         # Process each element from the search results
         for element_pk, score in elements:
             if element_pk in processed_elements:
                 continue
 
             # Find the complete ancestry path for this element
-            ancestry_path = self._get_element_ancestry_path(element_pk)
+            ancestry_path = ancestries.get(element_pk)
 
             if not ancestry_path:
                 continue
@@ -2874,65 +3066,76 @@ class DocumentDatabase(ABC):
 
         return result_tree
 
-    def _get_element_ancestry_path(self, element_pk: int) -> List[ElementBase]:
+    def get_element_ancestries(self, element_pks: List[int]) -> Dict[int, List[ElementBase]]:
         """
-        Get the complete ancestry path for an element, from root to the element itself.
+        Get the ancestry paths of several elements, from root to each element.
+
+        This default implementation walks up the hierarchy with get_element, fetching
+        each ancestor once even when it is shared by several paths. Backends that can
+        walk the hierarchy in one query override this.
 
         Args:
-            element_pk: Element primary key
+            element_pks: Element primary keys
 
         Returns:
-            List of ElementBase objects representing the ancestry path
+            Dictionary of element_pk to its ancestry path (elements that do not exist are omitted)
         """
-        # Get the element
-        element_dict = self.get_element(element_pk)
-        if not element_dict:
-            return []
+        fetched: Dict[Any, Optional[Dict[str, Any]]] = {}
 
-        # Convert to ElementBase instance
-        element = ElementBase(**element_dict)
+        def fetch(element_id_or_pk):
+            if element_id_or_pk not in fetched:
+                fetched[element_id_or_pk] = self.get_element(element_id_or_pk)
+            return fetched[element_id_or_pk]
 
-        # Start building the ancestry path with the element itself
-        ancestry = [element]
+        ancestries = {}
+        for element_pk in dict.fromkeys(element_pks):
+            ancestry = self._walk_ancestry(fetch(element_pk), fetch)
+            if ancestry:
+                ancestries[element_pk] = ancestry
+        return ancestries
 
-        # Track to avoid circular references
-        visited = {element_pk}
-
-        # Current element to process
-        current_pk = element_pk
+    def _get_element_ancestry_path(self, element_pk: int) -> List[ElementBase]:
+        """
+        Get the complete ancestry path for an element, from root to the element itself.
 
-        # Traverse up the hierarchy using parent_id
-        while True:
-            # Get the current element
-            current_element = self.get_element(current_pk)
-            if not current_element:
-                break
+        Args:
+            element_pk: Element primary key
 
-            # Get parent ID
-            parent_id = current_element.get('parent_id')
-            if not parent_id:
-                break
+        Returns:
+            List of ElementBase objects representing the ancestry path
+        """
+        return self.get_element_ancestries([element_pk]).get(element_pk, [])
 
-            # Get the parent element
-            parent_dict = self.get_element(parent_id)
-            if not parent_dict:
-                break
+    @staticmethod
+    def _walk_ancestry(element: Optional[Dict[str, Any]],
+                       get_parent: Callable[[str], Optional[Dict[str, Any]]]) -> List[ElementBase]:
+        """
+        Build the ancestry path of an element by following parent_id.
 
-            # Check for circular references
-            parent_pk = parent_dict.get('id') or parent_dict.get('pk') or parent_dict.get('element_id')
-            if parent_pk in visited:
-                break
+        Args:
+            element: Element data (None if the element does not exist)
+            get_parent: Function returning the element data for a parent_id, or None
 
-            # Convert to ElementBase
-            parent = ElementBase(**parent_dict)
+        Returns:
+            List of ElementBase objects from root to the element (empty if element is None)
+        """
+        if not element:
+            return []
 
-            # Add to visited set
-            visited.add(parent_pk)
+        ancestry = [ElementBase(**element)]
 
-            # Add parent to the beginning of the ancestry list (root first)
-            ancestry.insert(0, parent)
+        # Track to avoid circular references
+        visited = {element.get('element_id')}
 
-            # Move up to the parent
-            current_pk = parent_id
+        parent_id = element.get('parent_id')
+        while parent_id:
+            parent = get_parent(parent_id)
+            if not parent or parent.get('element_id') in visited:
+                break
+            visited.add(parent.get('element_id'))
+            ancestry.append(ElementBase(**parent))
+            parent_id = parent.get('parent_id')
 
+        # Root first
+        ancestry.reverse()
         return ancestry
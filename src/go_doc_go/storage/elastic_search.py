@@ -28,7 +28,7 @@ else:
 
 from .element_relationship import ElementRelationship
 from .base import DocumentDatabase
-from .element_element import ElementBase, ElementType, ElementHierarchical
+from .element_element import ElementType, ElementHierarchical
 
 # Import structured search components
 from .structured_search import (
@@ -886,7 +886,7 @@ class ElasticsearchDocumentDatabase(DocumentDatabase):
                 config_instance = config or Config()
                 self.embedding_generator = get_embedding_generator(config_instance)
 
-            return self.embedding_generator.generate(search_text)
+            return self._generate_query_embedding(search_text)
         except Exception as e:
             logger.error(f"Error generating embedding: {str(e)}")
             raise
@@ -1404,6 +1404,8 @@ class ElasticsearchDocumentDatabase(DocumentDatabase):
             if bulk_actions:
                 bulk(self.es, bulk_actions)
 
+            self._bump_store_generation(doc_ids=[doc_id])
+
             # Update processing history
             if source:
                 self.update_processing_history(source, content_hash)
@@ -1521,6 +1523,8 @@ class ElasticsearchDocumentDatabase(DocumentDatabase):
             if bulk_actions:
                 bulk(self.es, bulk_actions)
 
+            self._bump_store_generation(doc_ids=[doc_id])
+
             # Update processing history
             source = document.get("source", "")
             content_hash = document.get("content_hash", "")
@@ -1730,6 +1734,7 @@ class ElasticsearchDocumentDatabase(DocumentDatabase):
             # Delete document
             self.es.delete(index=self.documents_index, id=doc_id)
 
+            self._bump_store_generation(doc_ids=[doc_id])
             logger.info(f"Deleted document {doc_id} with {len(element_ids)} elements")
             return True
 
@@ -1962,6 +1967,7 @@ class ElasticsearchDocumentDatabase(DocumentDatabase):
 
             # Store in embeddings index
             self.es.index(index=self.embeddings_index, id=str(element_pk), body=embedding_doc)
+            self._bump_store_generation(element_pks=[element_pk])
             logger.debug(f"Stored embedding for element {element_pk}")
 
         except Exception as e:
@@ -2044,7 +2050,7 @@ class ElasticsearchDocumentDatabase(DocumentDatabase):
                     # Fall back to text search only
                     return self._fallback_text_search(search_text, limit, filter_criteria)
 
-            query_embedding = self.embedding_generator.generate(search_text)
+            query_embedding = self._generate_query_embedding(search_text)
 
             # Perform hybrid search: combine text search and vector search
             text_results = self._text_search_scores(search_text, limit * 2, filter_criteria)
@@ -2501,6 +2507,7 @@ class ElasticsearchDocumentDatabase(DocumentDatabase):
 
             # Store in embeddings index
             self.es.index(index=self.embeddings_index, id=str(element_pk), body=embedding_doc)
+            self._bump_store_generation(element_pks=[element_pk])
             logger.debug(f"Stored embedding with topics for element {element_pk}")
 
         except Exception as e:
@@ -2525,7 +2532,7 @@ class ElasticsearchDocumentDatabase(DocumentDatabase):
                     config_instance = config or Config()
                     self.embedding_generator = get_embedding_generator(config_instance)
 
-                query_embedding = self.embedding_generator.generate(search_text)
+                query_embedding = self._generate_query_embedding(search_text)
 
             # Build Elasticsearch query
             filters = [{"range": {"confidence": {"gte": min_confidence}}}]
@@ -2705,13 +2712,16 @@ class ElasticsearchDocumentDatabase(DocumentDatabase):
         # Final result structure
         result_tree: List[ElementHierarchical] = []
 
+        # Fetch the ancestry paths of all results at once
+        ancestries = self.get_element_ancestries([element_pk for element_pk, _ in elements])
+
         # Process each element from the search results
         for element_pk, score in elements:
             if element_pk in processed_elements:
                 continue
 
             # Find the complete ancestry path for this element
-            ancestry_path = self._get_element_ancestry_path(element_pk)
+            ancestry_path = ancestries.get(element_pk)
 
             if not ancestry_path:
                 continue
@@ -2748,62 +2758,6 @@ class ElasticsearchDocumentDatabase(DocumentDatabase):
 
         return result_tree
 
-    def _get_element_ancestry_path(self, element_pk: int) -> List[ElementBase]:
-        """Get the complete ancestry path for an element, from root to the element itself."""
-
-        # Get the element
-        element_dict = self.get_element(element_pk)
-        if not element_dict:
-            return []
-
-        # Convert to ElementBase instance
-        element = ElementBase(**element_dict)
-
-        # Start building the ancestry path with the element itself
-        ancestry = [element]
-
-        # Track to avoid circular references
-        visited = {element_pk}
-
-        # Current element to process
-        current_pk = element_pk
-
-        # Traverse up the hierarchy using parent_id
-        while True:
-            # Get the current element
-            current_element = self.get_element(current_pk)
-            if not current_element:
-                break
-
-            # Get parent ID
-            parent_id = current_element.get('parent_id')
-            if not parent_id:
-                break
-
-            # Get the parent element
-            parent_dict = self.get_element(parent_id)
-            if not parent_dict:
-                break
-
-            # Check for circular references
-            parent_pk = parent_dict.get('element_pk') or parent_dict.get('pk') or parent_dict.get('id')
-            if parent_pk in visited:
-                break
-
-            # Convert to ElementBase
-            parent = ElementBase(**parent_dict)
-
-            # Add to visited set
-            visited.add(parent_pk)
-
-            # Add parent to the beginning of the ancestry list (root first)
-            ancestry.insert(0, parent)
-
-            # Move up to the parent
-            current_pk = parent_id
-
-        return ancestry
-
     # ========================================
     # CONFIGURATION AND UTILITY METHODS (EXISTING)
     # ========================================
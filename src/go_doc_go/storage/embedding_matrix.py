@@ -0,0 +1,447 @@
+"""
+In-process embedding matrix for exact vector search.
+
+Backends without a native vector index (File, SQLite without sqlite-vec) keep their
+embeddings in an EmbeddingMatrix: a contiguous float32 matrix of L2-normalized rows
+keyed by element_pk. Brute-force search is then a single matrix-vector product
+instead of a per-row Python cosine loop, and the matrix is updated incrementally as
+embeddings are stored and deleted.
+
+Embeddings are persisted as packed little-endian float32 blobs. pack_embedding and
+unpack_embedding convert between that format and Python lists; unpack_embedding also
+accepts the legacy JSON text format so old rows keep working until migrated.
+"""
+
+import json
+import logging
+import struct
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Define global flags for availability - these will be set at runtime
+NUMPY_AVAILABLE = False
+
+# Try to import NumPy conditionally
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    logger.warning("NumPy not available. Embedding matrix search is disabled.")
+
+# Storage format for embeddings: little-endian float32
+EMBEDDING_DTYPE = '<f4'
+
+EmbeddingValue = Union[bytes, bytearray, memoryview, str, List[float]]
+
+
+def pack_embedding(embedding: Any) -> bytes:
+    """
+    Pack an embedding into a little-endian float32 blob.
+
+    Args:
+        embedding: Sequence of floats (list, tuple or NumPy array)
+
+    Returns:
+        Packed bytes, 4 bytes per dimension
+    """
+    if NUMPY_AVAILABLE:
+        return np.asarray(embedding, dtype=EMBEDDING_DTYPE).tobytes()
+    return struct.pack(f"<{len(embedding)}f", *embedding)
+
+
+def unpack_embedding(value: Optional[EmbeddingValue]) -> Optional[List[float]]:
+    """
+    Unpack a stored embedding into a list of floats.
+
+    Args:
+        value: Packed float32 blob, legacy JSON text, or an already decoded list
+
+    Returns:
+        List of floats, or None if value is None
+    """
+    if value is None:
+        return None
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        if NUMPY_AVAILABLE:
+            return np.frombuffer(value, dtype=EMBEDDING_DTYPE).tolist()
+        data = bytes(value)
+        return list(struct.unpack(f"<{len(data) // 4}f", data))
+    if isinstance(value, str):
+        return json.loads(value)
+    return list(value)
+
+
+def embedding_array(value: EmbeddingValue) -> "np.ndarray":
+    """
+    Convert a stored embedding into a float32 NumPy array.
+
+    Packed blobs are wrapped without copying; other formats are decoded first.
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return np.frombuffer(value, dtype=EMBEDDING_DTYPE)
+    if isinstance(value, str):
+        value = json.loads(value)
+    return np.asarray(value, dtype=np.float32)
+
+
+def top_k_similarity_join(queries: Any, index: Any, k: int,
+                          query_groups: Optional[Any] = None, index_groups: Optional[Any] = None,
+                          min_similarity: Optional[float] = None,
+                          block_bytes: int = 256 * 1024 * 1024) -> List[List[Tuple[int, float]]]:
+    """
+    Find the k most similar index rows for every query row by cosine similarity.
+
+    Queries are scored in blocks with one matrix-matrix product per block; the block
+    height is chosen so a block of scores fits in block_bytes. When groups are given,
+    index rows in the same group as the query (e.g. the same document) are excluded.
+
+    Args:
+        queries: Query vectors (n x d)
+        index: Index vectors (m x d)
+        k: Maximum number of matches per query
+        query_groups: Optional integer group per query row
+        index_groups: Optional integer group per index row
+        min_similarity: Drop matches below this similarity
+        block_bytes: Memory budget for one block of scores
+
+    Returns:
+        For each query row, a list of (index row, similarity) pairs, highest similarity first
+    """
+    if not NUMPY_AVAILABLE:
+        raise ImportError("NumPy is required for top_k_similarity_join")
+
+    queries = np.array(queries, dtype=np.float32, ndmin=2)
+    index = np.array(index, dtype=np.float32, ndmin=2)
+    results: List[List[Tuple[int, float]]] = [[] for _ in range(len(queries))]
+    if k <= 0 or not len(queries) or not len(index):
+        return results
+
+    EmbeddingMatrix._normalize_rows(queries)
+    EmbeddingMatrix._normalize_rows(index)
+    exclude = query_groups is not None and index_groups is not None
+    if exclude:
+        query_groups = np.asarray(query_groups)
+        index_groups = np.asarray(index_groups)
+
+    m = len(index)
+    k = min(k, m)
+    block = max(1, block_bytes // (4 * m))
+
+    for start in range(0, len(queries), block):
+        stop = min(start + block, len(queries))
+        scores = queries[start:stop] @ index.T
+        if exclude:
+            scores[query_groups[start:stop, None] == index_groups[None, :]] = -np.inf
+
+        if k < m:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(m), scores.shape)
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        keep = np.isfinite(top_scores)
+        if min_similarity is not None:
+            keep &= top_scores >= min_similarity
+        for row in range(stop - start):
+            row_keep = keep[row]
+            results[start + row] = [(int(i), float(score))
+                                    for i, score in zip(top[row][row_keep], top_scores[row][row_keep])]
+
+    return results
+
+
+class EmbeddingMatrix:
+    """
+    Normalized, contiguous embedding matrix keyed by element_pk.
+
+    Rows are stored L2-normalized so cosine similarity against a normalized query
+    is a plain dot product. Capacity grows geometrically so incremental upserts are
+    amortized O(dimensions); removals swap the last row into the freed slot.
+
+    Vectors whose dimension differs from the matrix dimension are kept aside and
+    scored individually (comparing the common prefix), matching the behaviour of the
+    per-row cosine functions used by the backends.
+    """
+
+    def __init__(self, dimensions: Optional[int] = None, initial_capacity: int = 1024):
+        """
+        Initialize an empty matrix.
+
+        Args:
+            dimensions: Vector dimension; inferred from the first vector when None
+            initial_capacity: Number of rows to allocate up front
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("NumPy is required for EmbeddingMatrix")
+
+        self.dimensions = dimensions
+        self._initial_capacity = max(1, initial_capacity)
+        self._matrix: Optional["np.ndarray"] = None
+        self._pks: Optional["np.ndarray"] = None
+        self._size = 0
+        self._rows: Dict[int, int] = {}
+        self._other: Dict[int, "np.ndarray"] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return self._size + len(self._other)
+
+    def __contains__(self, element_pk: int) -> bool:
+        return element_pk in self._rows or element_pk in self._other
+
+    def clear(self) -> None:
+        """Remove all vectors."""
+        with self._lock:
+            self._matrix = None
+            self._pks = None
+            self._size = 0
+            self._rows = {}
+            self._other = {}
+
+    def load(self, items: Iterable[Tuple[int, EmbeddingValue]]) -> None:
+        """
+        Replace the matrix contents with the given (element_pk, embedding) pairs.
+
+        Args:
+            items: Iterable of element_pk and stored embedding (blob, JSON text or list)
+        """
+        pks = []
+        vectors = []
+        other = {}
+
+        for element_pk, value in items:
+            if value is None:
+                continue
+            try:
+                vector = embedding_array(value)
+            except (ValueError, TypeError) as e:
+                logger.warning(f"Skipping unreadable embedding for element {element_pk}: {str(e)}")
+                continue
+
+            if self.dimensions is None:
+                self.dimensions = len(vector)
+
+            if len(vector) == self.dimensions:
+                pks.append(element_pk)
+                vectors.append(vector)
+            else:
+                other[element_pk] = self._normalize(vector.astype(np.float32))
+
+        with self._lock:
+            self.clear()
+            self._other = other
+            if not vectors:
+                return
+
+            capacity = max(self._initial_capacity, len(vectors))
+            self._matrix = np.zeros((capacity, self.dimensions), dtype=np.float32)
+            self._pks = np.zeros(capacity, dtype=np.int64)
+            self._matrix[:len(vectors)] = np.vstack(vectors)
+            self._normalize_rows(self._matrix[:len(vectors)])
+            self._pks[:len(vectors)] = pks
+            self._size = len(vectors)
+            self._rows = {pk: row for row, pk in enumerate(pks)}
+
+    def upsert(self, element_pk: int, embedding: EmbeddingValue) -> None:
+        """
+        Insert or replace the vector for an element.
+
+        Args:
+            element_pk: Element primary key
+            embedding: Stored embedding (blob, JSON text or list)
+        """
+        vector = embedding_array(embedding).astype(np.float32)
+
+        with self._lock:
+            if self.dimensions is None:
+                self.dimensions = len(vector)
+
+            if len(vector) != self.dimensions:
+                self._remove_row(element_pk)
+                self._other[element_pk] = self._normalize(vector)
+                return
+
+            self._other.pop(element_pk, None)
+            row = self._rows.get(element_pk)
+            if row is None:
+                self._ensure_capacity(self._size + 1)
+                row = self._size
+                self._size += 1
+                self._rows[element_pk] = row
+                self._pks[row] = element_pk
+
+            self._matrix[row] = self._normalize(vector)
+
+    def remove(self, element_pk: int) -> bool:
+        """
+        Remove the vector for an element.
+
+        Returns:
+            True if a vector was removed
+        """
+        with self._lock:
+            removed = self._other.pop(element_pk, None) is not None
+            return self._remove_row(element_pk) or removed
+
+    def remove_many(self, element_pks: Iterable[int]) -> None:
+        """Remove the vectors for several elements."""
+        with self._lock:
+            for element_pk in element_pks:
+                self.remove(element_pk)
+
+    def search(self, query_embedding: Any, limit: int = 10,
+               candidate_pks: Optional[Iterable[int]] = None) -> List[Tuple[int, float]]:
+        """
+        Find the most similar vectors to a query.
+
+        Args:
+            query_embedding: Query vector
+            limit: Maximum number of results
+            candidate_pks: Restrict the search to these element_pks (None searches all)
+
+        Returns:
+            List of (element_pk, cosine_similarity) tuples, highest similarity first
+        """
+        if limit <= 0:
+            return []
+
+        pks, scores = self._score(query_embedding, candidate_pks)
+        if len(scores) == 0:
+            return []
+
+        if limit < len(scores):
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            top = top[np.argsort(-scores[top], kind='stable')]
+        else:
+            top = np.argsort(-scores, kind='stable')
+
+        return [(int(pks[i]), float(scores[i])) for i in top]
+
+    def similarities(self, query_embedding: Any,
+                     candidate_pks: Optional[Iterable[int]] = None) -> Dict[int, float]:
+        """
+        Compute cosine similarity of a query against many vectors.
+
+        Args:
+            query_embedding: Query vector
+            candidate_pks: Restrict scoring to these element_pks (None scores all)
+
+        Returns:
+            Dictionary mapping element_pk to cosine similarity
+        """
+        pks, scores = self._score(query_embedding, candidate_pks)
+        return {int(pk): float(score) for pk, score in zip(pks, scores)}
+
+    def _score(self, query_embedding: Any,
+               candidate_pks: Optional[Iterable[int]]) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Score the query against the matrix rows and the odd-dimension vectors."""
+        query = self._normalize(np.asarray(query_embedding, dtype=np.float32))
+
+        with self._lock:
+            if candidate_pks is None:
+                matrix_pks = None
+                other_pks = list(self._other)
+            else:
+                candidates = list(candidate_pks)
+                matrix_pks = [pk for pk in candidates if pk in self._rows]
+                other_pks = [pk for pk in candidates if pk in self._other]
+
+            pks = np.zeros(0, dtype=np.int64)
+            scores = np.zeros(0, dtype=np.float32)
+
+            if len(query) != self.dimensions:
+                # Query dimension differs from the matrix: compare every vector on the common prefix
+                other_pks = (list(self._rows) if matrix_pks is None else matrix_pks) + other_pks
+            elif self._size:
+                if matrix_pks is None:
+                    pks = self._pks[:self._size].copy()
+                    scores = self._matrix[:self._size] @ query
+                elif matrix_pks:
+                    rows = np.fromiter((self._rows[pk] for pk in matrix_pks), dtype=np.int64,
+                                       count=len(matrix_pks))
+                    pks = np.asarray(matrix_pks, dtype=np.int64)
+                    scores = self._matrix[rows] @ query
+
+            if other_pks:
+                extra_scores = np.array([self._prefix_similarity(query, self._vector(pk)) for pk in other_pks],
+                                        dtype=np.float32)
+                pks = np.concatenate([pks, np.array(other_pks, dtype=np.int64)])
+                scores = np.concatenate([scores, extra_scores])
+
+        return pks, scores
+
+    def _vector(self, element_pk: int) -> "np.ndarray":
+        """Return the stored (normalized) vector for an element."""
+        if element_pk in self._other:
+            return self._other[element_pk]
+        return self._matrix[self._rows[element_pk]]
+
+    def _remove_row(self, element_pk: int) -> bool:
+        """Remove a matrix row by moving the last row into its slot."""
+        row = self._rows.pop(element_pk, None)
+        if row is None:
+            return False
+
+        last = self._size - 1
+        if row != last:
+            moved_pk = int(self._pks[last])
+            self._matrix[row] = self._matrix[last]
+            self._pks[row] = moved_pk
+            self._rows[moved_pk] = row
+        self._size = last
+        return True
+
+    def _ensure_capacity(self, size: int) -> None:
+        """Grow the backing arrays geometrically to hold at least size rows."""
+        if self._matrix is None:
+            capacity = max(self._initial_capacity, size)
+            self._matrix = np.zeros((capacity, self.dimensions), dtype=np.float32)
+            self._pks = np.zeros(capacity, dtype=np.int64)
+            return
+
+        capacity = len(self._matrix)
+        if size <= capacity:
+            return
+
+        new_capacity = max(size, capacity * 2)
+        matrix = np.zeros((new_capacity, self.dimensions), dtype=np.float32)
+        matrix[:self._size] = self._matrix[:self._size]
+        pks = np.zeros(new_capacity, dtype=np.int64)
+        pks[:self._size] = self._pks[:self._size]
+        self._matrix = matrix
+        self._pks = pks
+
+    @staticmethod
+    def _normalize(vector: "np.ndarray") -> "np.ndarray":
+        """Return an L2-normalized copy of a vector (zero vectors stay zero)."""
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return np.zeros_like(vector, dtype=np.float32)
+        return (vector / norm).astype(np.float32)
+
+    @staticmethod
+    def _normalize_rows(matrix: "np.ndarray") -> None:
+        """L2-normalize matrix rows in place (zero rows stay zero)."""
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+
+    @staticmethod
+    def _prefix_similarity(query: "np.ndarray", vector: "np.ndarray") -> float:
+        """Cosine similarity over the common prefix of two vectors of different lengths."""
+        length = min(len(query), len(vector))
+        a = query[:length]
+        b = vector[:length]
+        norm = np.linalg.norm(a) * np.linalg.norm(b)
+        if norm == 0:
+            return 0.0
+        return float(np.dot(a, b) / norm)
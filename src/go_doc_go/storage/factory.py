@@ -36,9 +36,9 @@ def get_document_database(config: Dict[str, Any]) -> DocumentDatabase:
     backend_type = config.get("backend", "file")
 
     if backend_type == "file":
-        return FileDocumentDatabase(storage_path)
+        return FileDocumentDatabase({'storage_path': storage_path, **config.get("file", {})})
     elif backend_type == "sqlite":
-        return SQLiteDocumentDatabase(storage_path)
+        return SQLiteDocumentDatabase(storage_path, **config.get("sqlite", {}))
     elif backend_type == "solr":
         return SolrDocumentDatabase(config.get("solr", {
             'host': 'localhost',
@@ -1,10 +1,11 @@
+import base64
 import fnmatch
 import glob
 import json
 import logging
 import os
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List, Tuple, Union, TYPE_CHECKING
+from typing import Iterable, Optional, Dict, Any, List, Set, Tuple, Union, TYPE_CHECKING
 
 import time
 
@@ -24,13 +25,17 @@ else:
 from .base import DocumentDatabase
 from .element_relationship import ElementRelationship
 from .element_element import ElementType, ElementBase
+from .embedding_matrix import EmbeddingMatrix, pack_embedding, unpack_embedding
+from .search_cache import TopicStatisticsCache
+from .segment_store import SegmentStore, SegmentMapping
 
 # Import structured search components
 from .structured_search import (
     StructuredSearchQuery, SearchCriteriaGroup, BackendCapabilities, SearchCapability,
     UnsupportedSearchError, TextSearchCriteria, EmbeddingSearchCriteria, DateSearchCriteria,
     TopicSearchCriteria, MetadataSearchCriteria, ElementSearchCriteria,
-    LogicalOperator, DateRangeOperator, SimilarityOperator
+    LogicalOperator, DateRangeOperator, SimilarityOperator,
+    QueryPlan, QueryPlanner, PlanStep, execute_plan
 )
 
 logger = logging.getLogger(__name__)
@@ -59,6 +64,10 @@ except Exception as e:
 class FileDocumentDatabase(DocumentDatabase):
     """File-based implementation with comprehensive structured search support and full text configuration."""
 
+    # Record fields held by the secondary indexes (and by the segment index attributes)
+    _ELEMENT_INDEX_FIELDS = ("element_pk", "doc_id", "parent_id", "element_type")
+    _RELATIONSHIP_INDEX_FIELDS = ("source_id", "target_reference")
+
     def __init__(self, conn_params: Dict[str, Any]):
         """
         Initialize file-based document database with full text configuration support.
@@ -67,6 +76,12 @@ class FileDocumentDatabase(DocumentDatabase):
             conn_params: Connection parameters for file storage
                 Core storage:
                 - storage_path: Path to storage directory (default: './file_storage')
+                - storage_mode: 'files' for one JSON file per record (default) or 'segments'
+                  for append-only segment files with an on-disk index
+                - segment_max_bytes: Segment size before rolling over (default: 64MB)
+                - segment_sync_every: Records appended between fsyncs (default: 1000)
+                - segment_sync_interval: Seconds between fsyncs while writing (default: 1.0)
+                - segment_compaction_ratio: Dead-record fraction that triggers compaction (default: 0.5)
 
                 Text storage and indexing options:
                 - store_full_text: Whether to store full text for retrieval (default: True)
@@ -85,6 +100,10 @@ class FileDocumentDatabase(DocumentDatabase):
 
         # Extract storage path from connection parameters
         self.storage_path = conn_params.get('storage_path', './file_storage')
+        self.storage_mode = conn_params.get('storage_mode', 'files')
+        if self.storage_mode not in ('files', 'segments'):
+            raise ValueError(f"Unsupported file storage mode: {self.storage_mode}")
+        self.segment_store: Optional[SegmentStore] = None
 
         # File-based storage structures
         self.documents = {}
@@ -93,9 +112,26 @@ class FileDocumentDatabase(DocumentDatabase):
         self.next_element_pk = 1  # Starting auto-increment value
         self.relationships = {}
         self.embeddings = {}  # Enhanced embedding data with topics
+        self.embedding_matrix: Optional[EmbeddingMatrix] = None  # Normalized vectors for search
         self.element_dates = {}  # Store dates by element_id
         self.processing_history = {}  # Dictionary to track processing history
         self.embedding_generator = None
+
+        # Secondary indexes, kept in step with stored records. Buckets are dicts used as
+        # insertion-ordered sets so lookups return records in storage order.
+        self._element_ids_by_doc: Dict[str, Dict[str, None]] = {}
+        self._element_ids_by_parent: Dict[str, Dict[str, None]] = {}
+        self._element_ids_by_type: Dict[str, Dict[str, None]] = {}
+        self._element_ids_by_pk: Dict[int, str] = {}
+        self._doc_ids_by_source: Dict[str, Dict[str, None]] = {}
+        self._relationship_ids_by_source: Dict[str, Dict[str, None]] = {}
+        self._relationship_ids_by_target: Dict[str, Dict[str, None]] = {}
+        self._indexed_elements: Dict[str, Tuple] = {}  # element_id -> indexed field values
+        self._indexed_documents: Dict[str, Optional[str]] = {}  # doc_id -> source
+        self._indexed_relationships: Dict[str, Tuple] = {}  # relationship_id -> (source_id, target_reference)
+
+        # Topic statistics, updated incrementally as documents and embeddings are stored
+        self._topic_statistics_cache = TopicStatisticsCache()
         
         # Domain entity storage structures
         self.entities = {}  # entity_pk -> entity dict
@@ -369,8 +405,9 @@ class FileDocumentDatabase(DocumentDatabase):
             raise UnsupportedSearchError(missing)
 
         try:
-            # Execute the root criteria group
-            raw_results = self._execute_criteria_group(query.criteria_group)
+            # Plan and execute the root criteria group
+            plan = self._plan_structured_search(query)
+            raw_results = execute_plan(plan, self._execute_plan_step, self._combine_results)
 
             # Process and enrich results
             final_results = self._process_search_results(raw_results, query)
@@ -385,56 +422,74 @@ class FileDocumentDatabase(DocumentDatabase):
             logger.error(f"Error executing structured search: {str(e)}")
             return []
 
-    def _execute_criteria_group(self, group: SearchCriteriaGroup) -> List[Dict[str, Any]]:
-        """Execute a single criteria group and return scored results."""
-
-        # Collect results from all criteria in this group
-        all_results = []
-
-        # Execute individual criteria
-        if group.text_criteria:
-            text_results = self._execute_text_criteria(group.text_criteria)
-            all_results.append(("text", text_results))
-
-        if group.embedding_criteria:
-            embedding_results = self._execute_embedding_criteria(group.embedding_criteria)
-            all_results.append(("embedding", embedding_results))
-
-        if group.date_criteria:
-            date_results = self._execute_date_criteria(group.date_criteria)
-            all_results.append(("date", date_results))
+    def explain_structured_search(self, query: StructuredSearchQuery, analyze: bool = False) -> str:
+        """
+        Show the plan chosen for a structured search query.
 
-        if group.topic_criteria:
-            topic_results = self._execute_topic_criteria(group.topic_criteria)
-            all_results.append(("topic", topic_results))
+        Args:
+            query: Structured search query
+            analyze: Execute the plan and include actual rows and timings
 
-        if group.metadata_criteria:
-            metadata_results = self._execute_metadata_criteria(group.metadata_criteria)
-            all_results.append(("metadata", metadata_results))
+        Returns:
+            EXPLAIN-style plan text
+        """
+        plan = self._plan_structured_search(query)
+        if analyze:
+            execute_plan(plan, self._execute_plan_step, self._combine_results)
+        return plan.explain()
 
-        if group.element_criteria:
-            element_results = self._execute_element_criteria(group.element_criteria)
-            all_results.append(("element", element_results))
+    def _plan_structured_search(self, query: StructuredSearchQuery) -> QueryPlan:
+        """Plan the root group of a query; only offset + limit rows are needed from it."""
+        planner = QueryPlanner(self._estimate_criteria_rows)
+        return planner.plan(query.criteria_group, limit=(query.offset or 0) + query.limit)
 
-        # Execute sub-groups recursively
-        for sub_group in group.sub_groups:
-            sub_results = self._execute_criteria_group(sub_group)
-            all_results.append(("subgroup", sub_results))
+    def _execute_criteria_group(self, group: SearchCriteriaGroup) -> List[Dict[str, Any]]:
+        """Execute a single criteria group and return scored results."""
+        plan = QueryPlanner(self._estimate_criteria_rows).plan(group)
+        return execute_plan(plan, self._execute_plan_step, self._combine_results)
+
+    def _execute_plan_step(self, step: PlanStep, candidates: Optional[Set[int]]) -> List[Dict[str, Any]]:
+        """Execute one planned criterion, restricted to candidate element_pks when given."""
+        executors = {
+            "text": self._execute_text_criteria,
+            "embedding": self._execute_embedding_criteria,
+            "date": self._execute_date_criteria,
+            "topic": self._execute_topic_criteria,
+            "metadata": self._execute_metadata_criteria,
+            "element": self._execute_element_criteria,
+        }
+        return executors[step.kind](step.criteria, candidates=candidates, limit=step.limit)
+
+    def _estimate_criteria_rows(self, kind: str, criteria: Any) -> Optional[int]:
+        """Estimate the rows a criterion matches from the in-memory indexes (None when unknown)."""
+        if kind in ("text", "embedding"):
+            return len(self.embeddings)
+        if kind == "element" and criteria.doc_ids:
+            return sum(len(self._element_ids_by_doc.get(doc_id, ())) for doc_id in criteria.doc_ids)
+        return None
 
-        # Combine results based on the group's logical operator
-        return self._combine_results(all_results, group.operator)
+    def _iter_elements(self, candidates: Optional[Set[int]] = None) -> Iterable[Dict[str, Any]]:
+        """Iterate over all elements, or only those with the candidate element_pks."""
+        if candidates is None:
+            return self.elements.values()
+        return (self.elements[self._element_ids_by_pk[element_pk]] for element_pk in candidates
+                if self._element_ids_by_pk.get(element_pk) in self.elements)
 
-    def _execute_text_criteria(self, criteria: TextSearchCriteria) -> List[Dict[str, Any]]:
+    def _execute_text_criteria(self, criteria: TextSearchCriteria, candidates: Optional[Set[int]] = None,
+                               limit: Optional[int] = 1000) -> List[Dict[str, Any]]:
         """Execute text similarity search using embeddings."""
         try:
+            if candidates is not None and not candidates:
+                return []
+
             # Generate embedding for the query text
             query_embedding = self._generate_embedding(criteria.query_text)
 
             # Perform similarity search
             similarity_results = self.search_by_embedding(
                 query_embedding,
-                limit=1000,  # Get many results for filtering
-                filter_criteria=None
+                limit=limit or len(self.embeddings),
+                filter_criteria={'element_pk_list': list(candidates)} if candidates else None
             )
 
             # Filter by similarity threshold and operator
@@ -454,13 +509,17 @@ class FileDocumentDatabase(DocumentDatabase):
             logger.error(f"Error executing text criteria: {str(e)}")
             return []
 
-    def _execute_embedding_criteria(self, criteria: EmbeddingSearchCriteria) -> List[Dict[str, Any]]:
+    def _execute_embedding_criteria(self, criteria: EmbeddingSearchCriteria, candidates: Optional[Set[int]] = None,
+                                    limit: Optional[int] = 1000) -> List[Dict[str, Any]]:
         """Execute direct embedding vector search."""
         try:
+            if candidates is not None and not candidates:
+                return []
+
             similarity_results = self.search_by_embedding(
                 criteria.embedding_vector,
-                limit=1000,
-                filter_criteria=None
+                limit=limit or len(self.embeddings),
+                filter_criteria={'element_pk_list': list(candidates)} if candidates else None
             )
 
             filtered_results = []
@@ -479,7 +538,8 @@ class FileDocumentDatabase(DocumentDatabase):
             logger.error(f"Error executing embedding criteria: {str(e)}")
             return []
 
-    def _execute_date_criteria(self, criteria: DateSearchCriteria) -> List[Dict[str, Any]]:
+    def _execute_date_criteria(self, criteria: DateSearchCriteria, candidates: Optional[Set[int]] = None,
+                               limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """Execute date-based filtering using in-memory date storage."""
         try:
             # Build date filter based on operator
@@ -534,6 +594,11 @@ class FileDocumentDatabase(DocumentDatabase):
             if criteria.specificity_levels:
                 element_pks = self._filter_by_specificity(element_pks, criteria.specificity_levels)
 
+            if candidates is not None:
+                element_pks = [element_pk for element_pk in element_pks if element_pk in candidates]
+            if limit is not None:
+                element_pks = element_pks[:limit]
+
             # Convert to result format
             results = []
             for element_pk in element_pks:
@@ -550,16 +615,22 @@ class FileDocumentDatabase(DocumentDatabase):
             logger.error(f"Error executing date criteria: {str(e)}")
             return []
 
-    def _execute_topic_criteria(self, criteria: TopicSearchCriteria) -> List[Dict[str, Any]]:
+    def _execute_topic_criteria(self, criteria: TopicSearchCriteria, candidates: Optional[Set[int]] = None,
+                                limit: Optional[int] = 1000) -> List[Dict[str, Any]]:
         """Execute topic-based filtering using in-memory storage."""
         try:
+            # Candidates are applied after the topic match, so it must not be truncated first
             topic_results = self.search_by_text_and_topics(
                 search_text=None,
                 include_topics=criteria.include_topics,
                 exclude_topics=criteria.exclude_topics,
                 min_confidence=criteria.min_confidence,
-                limit=1000
+                limit=len(self.embeddings) if candidates is not None or limit is None else limit
             )
+            if candidates is not None:
+                topic_results = [result for result in topic_results if result['element_pk'] in candidates]
+            if limit is not None:
+                topic_results = topic_results[:limit]
 
             results = []
             for result in topic_results:
@@ -576,12 +647,16 @@ class FileDocumentDatabase(DocumentDatabase):
             logger.error(f"Error executing topic criteria: {str(e)}")
             return []
 
-    def _execute_metadata_criteria(self, criteria: MetadataSearchCriteria) -> List[Dict[str, Any]]:
+    def _execute_metadata_criteria(self, criteria: MetadataSearchCriteria, candidates: Optional[Set[int]] = None,
+                                   limit: Optional[int] = 1000) -> List[Dict[str, Any]]:
         """Execute metadata-based filtering using in-memory storage."""
         try:
             results = []
 
-            for element_id, element in self.elements.items():
+            for element in self._iter_elements(candidates):
+                if limit is not None and len(results) >= limit:
+                    break
+
                 element_pk = element.get('element_pk')
                 if element_pk is None:
                     continue
@@ -658,12 +733,16 @@ class FileDocumentDatabase(DocumentDatabase):
             logger.error(f"Error executing metadata criteria: {str(e)}")
             return []
 
-    def _execute_element_criteria(self, criteria: ElementSearchCriteria) -> List[Dict[str, Any]]:
+    def _execute_element_criteria(self, criteria: ElementSearchCriteria, candidates: Optional[Set[int]] = None,
+                                  limit: Optional[int] = 1000) -> List[Dict[str, Any]]:
         """Execute element-based filtering using in-memory storage."""
         try:
             results = []
 
-            for element_id, element in self.elements.items():
+            for element in self._iter_elements(candidates):
+                if limit is not None and len(results) >= limit:
+                    break
+
                 element_pk = element.get('element_pk')
                 if element_pk is None:
                     continue
@@ -949,7 +1028,7 @@ class FileDocumentDatabase(DocumentDatabase):
             if self.embedding_generator is None:
                 self.embedding_generator = get_embedding_generator(config)
 
-            return self.embedding_generator.generate(search_text)
+            return self._generate_query_embedding(search_text)
         except Exception as e:
             logger.error(f"Error generating embedding: {str(e)}")
             raise
@@ -1041,23 +1120,25 @@ class FileDocumentDatabase(DocumentDatabase):
 
         element_type = element.get("element_type", "")
 
-        # Create a lookup map of element_id to (element_pk, element_type, content_preview)
+        # Find relationships where the element is the source (outgoing relationships)
+        outgoing_relationships = [
+            self.relationships[relationship_id]
+            for relationship_id in self._relationship_ids_by_source.get(element_id, ())
+        ]
+
+        # Create a lookup map of target element_id to (element_pk, element_type, content_preview)
         # This is similar to what we get with SQL JOIN
         element_lookup = {}
-        for eid, elem in self.elements.items():
-            if "element_pk" in elem:
-                element_lookup[eid] = (
+        for rel in outgoing_relationships:
+            target_reference = rel.get("target_reference", "")
+            elem = self.elements.get(target_reference)
+            if elem is not None and "element_pk" in elem:
+                element_lookup[target_reference] = (
                     elem.get("element_pk"),
                     elem.get("element_type"),
                     elem.get("content_preview", "")  # Added content_preview
                 )
 
-        # Find relationships where the element is the source (outgoing relationships)
-        outgoing_relationships = [
-            rel for rel in self.relationships.values()
-            if rel.get("source_id") == element_id
-        ]
-
         # Process relationships with target element lookup
         for rel in outgoing_relationships:
             target_reference = rel.get("target_reference", "")
@@ -1093,6 +1174,11 @@ class FileDocumentDatabase(DocumentDatabase):
         """Initialize the database by loading existing data."""
         os.makedirs(self.storage_path, exist_ok=True)
 
+        if self.storage_mode == 'segments':
+            self._initialize_segment_store()
+            self._rebuild_secondary_indexes()
+            return
+
         # Create subdirectories
         os.makedirs(os.path.join(self.storage_path, 'documents'), exist_ok=True)
         os.makedirs(os.path.join(self.storage_path, 'elements'), exist_ok=True)
@@ -1108,6 +1194,7 @@ class FileDocumentDatabase(DocumentDatabase):
         self._load_embeddings()
         self._load_element_dates()
         self._load_processing_history()
+        self._rebuild_secondary_indexes()
 
         logger.info(f"Loaded {len(self.documents)} documents, "
                     f"{len(self.elements)} elements, "
@@ -1117,8 +1204,15 @@ class FileDocumentDatabase(DocumentDatabase):
                     f"{len(self.processing_history)} processing history records")
 
     def close(self) -> None:
-        """Close the database (no-op for file-based database)."""
-        pass
+        """Close the database, syncing and checkpointing the segment store if used."""
+        if self.segment_store is not None:
+            self.segment_store.close()
+            self.segment_store = None
+
+    def compact(self) -> None:
+        """Reclaim space held by overwritten and deleted records in segment storage mode."""
+        if self.segment_store is not None:
+            self.segment_store.compact()
 
     def get_element(self, element_id_or_pk: Union[str, int]) -> Optional[Dict[str, Any]]:
         """
@@ -1131,10 +1225,9 @@ class FileDocumentDatabase(DocumentDatabase):
         # Try to interpret as element_pk first
         try:
             element_pk = int(element_id_or_pk)
-            # Find element with matching element_pk
-            for element in self.elements.values():
-                if element.get("element_pk") == element_pk:
-                    return element
+            element_id = self._element_ids_by_pk.get(element_pk)
+            if element_id is not None:
+                return self.elements.get(element_id)
         except (ValueError, TypeError):
             # If not an integer, treat as element_id
             if element_id_or_pk in self.elements:
@@ -1351,6 +1444,10 @@ class FileDocumentDatabase(DocumentDatabase):
         if element_id not in self.element_dates:
             return
 
+        if self.segment_store is not None:
+            self.segment_store.put('element_dates', element_id, self.element_dates[element_id])
+            return
+
         file_path = os.path.join(self.storage_path, 'element_dates', f"{element_id}.json")
 
         try:
@@ -1361,6 +1458,10 @@ class FileDocumentDatabase(DocumentDatabase):
 
     def _delete_element_dates_file(self, element_id: str) -> None:
         """Delete element dates file."""
+        if self.segment_store is not None:
+            self.segment_store.delete('element_dates', element_id)
+            return
+
         file_path = os.path.join(self.storage_path, 'element_dates', f"{element_id}.json")
 
         try:
@@ -1436,6 +1537,8 @@ class FileDocumentDatabase(DocumentDatabase):
             self.relationships[relationship_id] = relationship
             self._save_relationship(relationship_id)
 
+        self._bump_store_generation(doc_ids=[doc_id])
+
         # Update processing history
         if source_id:
             self.update_processing_history(source_id, content_hash)
@@ -1511,6 +1614,8 @@ class FileDocumentDatabase(DocumentDatabase):
                     if element_pk in self.embeddings:
                         del self.embeddings[element_pk]
                         self._delete_embedding_file(element_pk)
+                        if self.embedding_matrix is not None:
+                            self.embedding_matrix.remove(element_pk)
 
         # Update relationships - similar approach
         updated_relationship_ids = set()
@@ -1535,6 +1640,8 @@ class FileDocumentDatabase(DocumentDatabase):
                     del self.relationships[relationship_id]
                     self._delete_relationship_file(relationship_id)
 
+        self._bump_store_generation(doc_ids=[doc_id])
+
         # Update processing history
         if source_id:
             self.update_processing_history(source_id, content_hash)
@@ -1553,18 +1660,16 @@ class FileDocumentDatabase(DocumentDatabase):
 
         # If not found by doc_id, try to find by source
         if not document:
-            for doc in self.documents.values():
-                if doc.get("source") == doc_id:
-                    document = doc
-                    doc_id = document["doc_id"]
-                    break
+            for source_doc_id in self._doc_ids_by_source.get(doc_id, ()):
+                document = self.documents.get(source_doc_id)
+                doc_id = source_doc_id
+                break
 
         # If still not found, return empty list
         if not document:
             return []
 
-        return [element for element in self.elements.values()
-                if element.get("doc_id") == doc_id]
+        return [self.elements[element_id] for element_id in self._element_ids_by_doc.get(doc_id, ())]
 
     def get_document_relationships(self, doc_id: str) -> List[Dict[str, Any]]:
         """Get relationships for a document."""
@@ -1572,8 +1677,9 @@ class FileDocumentDatabase(DocumentDatabase):
         element_ids = {element["element_id"] for element in self.get_document_elements(doc_id)}
 
         # Find relationships involving these elements
-        return [relationship for relationship in self.relationships.values()
-                if relationship.get("source_id") in element_ids]
+        return [self.relationships[relationship_id]
+                for element_id in element_ids
+                for relationship_id in self._relationship_ids_by_source.get(element_id, ())]
 
     def store_relationship(self, relationship: Dict[str, Any]) -> None:
         """
@@ -1596,14 +1702,14 @@ class FileDocumentDatabase(DocumentDatabase):
             relationship_type: Optional relationship type to filter by
         """
         # Find all relationships where this element is the source
-        source_relationships = [rel_id for rel_id, rel in self.relationships.items()
-                                if rel.get("source_id") == element_id and
-                                (relationship_type is None or rel.get("relationship_type") == relationship_type)]
+        source_relationships = [rel_id for rel_id in self._relationship_ids_by_source.get(element_id, ())
+                                if relationship_type is None or
+                                self.relationships[rel_id].get("relationship_type") == relationship_type]
 
         # Find all relationships where this element is the target
-        target_relationships = [rel_id for rel_id, rel in self.relationships.items()
-                                if rel.get("target_reference") == element_id and
-                                (relationship_type is None or rel.get("relationship_type") == relationship_type)]
+        target_relationships = [rel_id for rel_id in self._relationship_ids_by_target.get(element_id, ())
+                                if relationship_type is None or
+                                self.relationships[rel_id].get("relationship_type") == relationship_type]
 
         # Delete all matching relationships
         for rel_id in source_relationships + target_relationships:
@@ -1665,9 +1771,23 @@ class FileDocumentDatabase(DocumentDatabase):
         if query is None:
             query = {}
 
+        # Resolve element type enums once rather than per element
+        if "element_type" in query:
+            query = dict(query)
+            query["element_type"] = self.prepare_element_type_query(query["element_type"])
+            if not query["element_type"]:
+                return []
+
+        # Narrow the scan to indexed candidates when the query allows it
+        candidate_ids = self._find_candidate_element_ids(query)
+        if candidate_ids is None:
+            candidates = self.elements.values()
+        else:
+            candidates = (self.elements[element_id] for element_id in candidate_ids)
+
         results = []
 
-        for element in self.elements.values():
+        for element in candidates:
             if self._matches_element_query(element, query):
                 results.append(element)
                 if len(results) >= limit:
@@ -1675,6 +1795,35 @@ class FileDocumentDatabase(DocumentDatabase):
 
         return results
 
+    def _find_candidate_element_ids(self, query: Dict[str, Any]) -> Optional[List[str]]:
+        """
+        Get element IDs that can match a query using the secondary indexes.
+
+        Returns:
+            Candidate element IDs in storage order, or None if no indexed field is queried
+        """
+        candidate_ids = None
+        for field, index in (("doc_id", self._element_ids_by_doc),
+                             ("parent_id", self._element_ids_by_parent),
+                             ("element_type", self._element_ids_by_type)):
+            if field not in query:
+                continue
+            values = query[field]
+            if not isinstance(values, list):
+                values = [values]
+
+            if not all(isinstance(value, str) for value in values):
+                continue
+
+            field_ids = set()
+            for value in values:
+                field_ids.update(index.get(value, ()))
+            candidate_ids = field_ids if candidate_ids is None else candidate_ids & field_ids
+
+        if candidate_ids is None:
+            return None
+        return sorted(candidate_ids, key=lambda element_id: self.element_pks.get(element_id, 0))
+
     def search_elements_by_content(self, search_text: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Search elements by content preview and optionally full text based on configuration.
@@ -1722,13 +1871,7 @@ class FileDocumentDatabase(DocumentDatabase):
     def store_embedding(self, element_pk: int, embedding: VectorType) -> None:
         """Store embedding for an element."""
         # Verify element pk exists in some element
-        found = False
-        for element in self.elements.values():
-            if element.get("element_pk") == element_pk:
-                found = True
-                break
-
-        if not found:
+        if element_pk not in self._element_ids_by_pk:
             raise ValueError(f"Element pk not found: {element_pk}")
 
         # Store as enhanced embedding structure
@@ -1742,6 +1885,10 @@ class FileDocumentDatabase(DocumentDatabase):
 
         self.embeddings[element_pk] = embedding_data
         self._save_embedding(element_pk)
+        self._bump_store_generation(element_pks=[element_pk])
+
+        if self.embedding_matrix is not None:
+            self.embedding_matrix.upsert(element_pk, embedding)
 
     def get_embedding(self, element_pk: int) -> Optional[VectorType]:
         """Get embedding for an element."""
@@ -1757,30 +1904,47 @@ class FileDocumentDatabase(DocumentDatabase):
 
         return None
 
+    def get_embeddings_by_element_type(self, element_types: List[str]) -> List[Tuple[int, str, str, Any]]:
+        """
+        Load the embeddings of all elements of the given types from the type index.
+
+        Args:
+            element_types: Element types to include
+
+        Returns:
+            List of (element_pk, element_id, doc_id, embedding) tuples
+        """
+        results = []
+        for element_type in element_types:
+            for element_id in self._element_ids_by_type.get(element_type, ()):
+                element = self.elements[element_id]
+                embedding = self.get_embedding(element.get("element_pk"))
+                if embedding:
+                    results.append((element["element_pk"], element_id, element.get("doc_id"), embedding))
+        return results
+
     def search_by_embedding(self, query_embedding: VectorType, limit: int = 10,
                             filter_criteria: Dict[str, Any] = None) -> List[Tuple[int, float]]:
         """
         Search elements by embedding similarity with optional filtering.
         Updated to handle enhanced embedding format and better similarity calculation.
         """
-        if NUMPY_AVAILABLE:
-            query_embedding_np = np.array(query_embedding)
-
         results = []
 
-        # Get all element_pks with embeddings
-        element_pks_with_embeddings = list(self.embeddings.keys())
-
-        # Build a dict of element_pk to element for easier lookup
-        element_pk_to_element = {}
-        for element in self.elements.values():
-            if "element_pk" in element:
-                element_pk_to_element[element["element_pk"]] = element
-
         # Apply filtering if specified
-        if filter_criteria:
+        if filter_criteria and set(filter_criteria) == {"element_pk_list"}:
+            # Candidate element_pks are known (e.g. pushed down by the query planner)
+            filtered_element_pks = [element_pk for element_pk in filter_criteria["element_pk_list"]
+                                    if element_pk in self.embeddings]
+        elif filter_criteria:
+            # Build a dict of element_pk to element for easier lookup
+            element_pk_to_element = {}
+            for element in self.elements.values():
+                if "element_pk" in element:
+                    element_pk_to_element[element["element_pk"]] = element
+
             filtered_element_pks = []
-            for element_pk in element_pks_with_embeddings:
+            for element_pk in self.embeddings:
                 # Get the associated element
                 element = element_pk_to_element.get(element_pk)
                 if not element:
@@ -1790,7 +1954,15 @@ class FileDocumentDatabase(DocumentDatabase):
                 if self._matches_filter_criteria(element, filter_criteria):
                     filtered_element_pks.append(element_pk)
         else:
-            filtered_element_pks = element_pks_with_embeddings
+            filtered_element_pks = None
+
+        # Score everything in one matrix product when NumPy is available
+        matrix = self._get_embedding_matrix()
+        if matrix is not None:
+            return matrix.search(query_embedding, limit, filtered_element_pks)
+
+        if filtered_element_pks is None:
+            filtered_element_pks = list(self.embeddings.keys())
 
         # Calculate similarity for each filtered embedding
         for element_pk in filtered_element_pks:
@@ -1804,11 +1976,8 @@ class FileDocumentDatabase(DocumentDatabase):
             else:
                 continue
 
-            # Calculate cosine similarity using the appropriate method
-            if NUMPY_AVAILABLE:
-                similarity = self._cosine_similarity_numpy(query_embedding, embedding)
-            else:
-                similarity = self._cosine_similarity_python(query_embedding, embedding)
+            # Calculate cosine similarity in pure Python
+            similarity = self._cosine_similarity_python(query_embedding, embedding)
 
             # Return element_pk instead of element_id for consistency
             results.append((element_pk, similarity))
@@ -1849,6 +2018,8 @@ class FileDocumentDatabase(DocumentDatabase):
             if element_pk in self.embeddings:
                 del self.embeddings[element_pk]
                 self._delete_embedding_file(element_pk)
+                if self.embedding_matrix is not None:
+                    self.embedding_matrix.remove(element_pk)
 
         # Delete relationships
         for relationship_id in relationship_ids:
@@ -1859,6 +2030,7 @@ class FileDocumentDatabase(DocumentDatabase):
         # Delete document
         del self.documents[doc_id]
         self._delete_document_file(doc_id)
+        self._bump_store_generation(doc_ids=[doc_id])
 
         return True
 
@@ -1882,7 +2054,7 @@ class FileDocumentDatabase(DocumentDatabase):
                 self.embedding_generator = get_embedding_generator(config)
 
             # Generate embedding for the search text
-            query_embedding = self.embedding_generator.generate(search_text)
+            query_embedding = self._generate_query_embedding(search_text)
 
             # Use the embedding to search, passing the filter criteria
             return self.search_by_embedding(query_embedding, limit, filter_criteria)
@@ -2262,13 +2434,7 @@ class FileDocumentDatabase(DocumentDatabase):
             confidence: Overall confidence in this embedding/topic assignment
         """
         # Verify element pk exists in some element
-        found = False
-        for element in self.elements.values():
-            if element.get("element_pk") == element_pk:
-                found = True
-                break
-
-        if not found:
+        if element_pk not in self._element_ids_by_pk:
             raise ValueError(f"Element pk not found: {element_pk}")
 
         try:
@@ -2283,6 +2449,10 @@ class FileDocumentDatabase(DocumentDatabase):
 
             self.embeddings[element_pk] = embedding_data
             self._save_embedding(element_pk)
+            self._bump_store_generation(element_pks=[element_pk])
+
+            if self.embedding_matrix is not None:
+                self.embedding_matrix.upsert(element_pk, embedding)
 
         except Exception as e:
             logger.error(f"Error storing embedding with topics for {element_pk}: {str(e)}")
@@ -2318,7 +2488,7 @@ class FileDocumentDatabase(DocumentDatabase):
                     from ..embeddings import get_embedding_generator
                     self.embedding_generator = get_embedding_generator(config)
 
-                query_embedding = self.embedding_generator.generate(search_text)
+                query_embedding = self._generate_query_embedding(search_text)
 
             return self._search_by_text_and_topics_fallback(
                 query_embedding, include_topics, exclude_topics, min_confidence, limit
@@ -2335,6 +2505,8 @@ class FileDocumentDatabase(DocumentDatabase):
                                             limit: int = 10) -> List[Dict[str, Any]]:
         """Fallback search using Python similarity calculation with topic filtering."""
         results = []
+        candidates = []
+        matrix = self._get_embedding_matrix() if query_embedding else None
 
         for element_pk, embedding_data in self.embeddings.items():
             # Handle both old format (direct list) and new format (dict with metadata)
@@ -2365,7 +2537,10 @@ class FileDocumentDatabase(DocumentDatabase):
             }
 
             # Calculate similarity if we have a query embedding
-            if query_embedding:
+            if query_embedding and matrix is not None:
+                # Scored below in a single matrix product
+                candidates.append(element_pk)
+            elif query_embedding:
                 try:
                     if NUMPY_AVAILABLE:
                         similarity = self._cosine_similarity_numpy(query_embedding, embedding)
@@ -2380,6 +2555,11 @@ class FileDocumentDatabase(DocumentDatabase):
 
             results.append(result)
 
+        if candidates:
+            similarities = matrix.similarities(query_embedding, candidates)
+            for result in results:
+                result['similarity'] = similarities.get(result['element_pk'], 0.0)
+
         # Sort by similarity if we calculated it
         if query_embedding:
             results.sort(key=lambda x: x['similarity'], reverse=True)
@@ -2422,6 +2602,9 @@ class FileDocumentDatabase(DocumentDatabase):
         """
         Get statistics about topic distribution across embeddings.
 
+        The statistics are cached and only documents written since the last call are
+        recomputed.
+
         Returns:
             Dictionary mapping topic strings to statistics:
             {
@@ -2433,46 +2616,51 @@ class FileDocumentDatabase(DocumentDatabase):
             }
         """
         try:
-            topic_stats = {}
-
-            for element_pk, embedding_data in self.embeddings.items():
-                # Handle both old format (direct list) and new format (dict with metadata)
-                if isinstance(embedding_data, dict):
-                    topics = embedding_data.get("topics", [])
-                    confidence = embedding_data.get("confidence", 1.0)
-
-                    # Get document for this element
-                    element = self.get_element(element_pk)
-                    doc_id = element.get("doc_id") if element else None
-
-                    for topic in topics:
-                        if topic not in topic_stats:
-                            topic_stats[topic] = {
-                                'embedding_count': 0,
-                                'document_ids': set(),
-                                'confidences': []
-                            }
-
-                        topic_stats[topic]['embedding_count'] += 1
-                        topic_stats[topic]['confidences'].append(confidence)
-                        if doc_id:
-                            topic_stats[topic]['document_ids'].add(doc_id)
-
-            # Calculate final statistics
-            final_stats = {}
-            for topic, stats in topic_stats.items():
-                final_stats[topic] = {
-                    'embedding_count': stats['embedding_count'],
-                    'document_count': len(stats['document_ids']),
-                    'avg_embedding_confidence': sum(stats['confidences']) / len(stats['confidences'])
-                }
-
-            return final_stats
+            return self._topic_statistics_cache.get(self._load_topic_statistics_rows,
+                                                    self._get_doc_ids_for_element_pks)
 
         except Exception as e:
             logger.error(f"Error getting topic statistics: {str(e)}")
             return {}
 
+    def _load_topic_statistics_rows(self, doc_ids: Optional[List[str]]) -> List[Tuple[str, str, int, float]]:
+        """Get (doc_id, topic, embedding count, confidence sum) rows for documents (all when None)."""
+        if doc_ids is None:
+            element_pks = list(self.embeddings)
+        else:
+            element_pks = [self.elements[element_id].get("element_pk")
+                           for doc_id in doc_ids
+                           for element_id in self._element_ids_by_doc.get(doc_id, {})
+                           if element_id in self.elements]
+
+        totals: Dict[Tuple[str, str], List[float]] = {}
+        for element_pk in element_pks:
+            embedding_data = self.embeddings.get(element_pk)
+            # Old format embeddings (direct lists) carry no topics
+            if not isinstance(embedding_data, dict):
+                continue
+            element_id = self._element_ids_by_pk.get(element_pk)
+            element = self.elements.get(element_id) if element_id is not None else None
+            doc_id = element.get("doc_id") if element else None
+            confidence = embedding_data.get("confidence", 1.0)
+            for topic in embedding_data.get("topics", []):
+                total = totals.setdefault((doc_id, topic), [0, 0.0])
+                total[0] += 1
+                total[1] += confidence
+
+        return [(doc_id, topic, int(count), confidence_sum)
+                for (doc_id, topic), (count, confidence_sum) in totals.items()]
+
+    def _get_doc_ids_for_element_pks(self, element_pks: List[int]) -> List[str]:
+        """Get the distinct doc_ids of elements."""
+        doc_ids = set()
+        for element_pk in element_pks:
+            element_id = self._element_ids_by_pk.get(element_pk)
+            element = self.elements.get(element_id) if element_id is not None else None
+            if element and element.get("doc_id"):
+                doc_ids.add(element["doc_id"])
+        return list(doc_ids)
+
     def get_embedding_topics(self, element_pk: int) -> List[str]:
         """
         Get topics assigned to a specific embedding.
@@ -2524,13 +2712,16 @@ class FileDocumentDatabase(DocumentDatabase):
         # Final result structure
         result_tree: List[ElementHierarchical] = []
 
+        # Fetch the ancestry paths of all results at once
+        ancestries = self.get_element_ancestries([element_pk for element_pk, _ in elements])
+
         # Process each element from the search results
         for element_pk, score in elements:
             if element_pk in processed_elements:
                 continue
 
             # Find the complete ancestry path for this element
-            ancestry_path = self._get_element_ancestry_path(element_pk)
+            ancestry_path = ancestries.get(element_pk)
 
             if not ancestry_path:
                 continue
@@ -2567,64 +2758,39 @@ class FileDocumentDatabase(DocumentDatabase):
 
         return result_tree
 
-    def _get_element_ancestry_path(self, element_pk: int) -> List[ElementBase]:
+    def get_element_ancestries(self, element_pks: List[int]) -> Dict[int, List[ElementBase]]:
         """
-        Get the complete ancestry path for an element, from root to the element itself.
+        Get the ancestry paths of several elements from the in-memory records.
 
-        Uses parent_id to find parents instead of relationships.
-        """
-        # Get the element
-        element_dict = self.get_element(element_pk)
-        if not element_dict:
-            return []
-
-        # Convert to ElementBase instance
-        element = ElementBase(**element_dict)
-
-        # Start building the ancestry path with the element itself
-        ancestry = [element]
+        Each element record on the paths is read once, even when it is shared by several
+        paths (in segment storage mode records are decoded on access).
 
-        # Track to avoid circular references
-        visited = {element_pk}
-
-        # Current element to process
-        current_pk = element_pk
-
-        # Traverse up the hierarchy using parent_id
-        while True:
-            # Get the current element
-            current_element = self.get_element(current_pk)
-            if not current_element:
-                break
-
-            # Get parent ID
-            parent_id = current_element.get('parent_id')
-            if not parent_id:
-                break
-
-            # Get the parent element
-            parent_dict = self.get_element(parent_id)
-            if not parent_dict:
-                break
-
-            # Check for circular references
-            parent_pk = parent_dict.get('id') or parent_dict.get('pk') or parent_dict.get('element_id')
-            if parent_pk in visited:
-                break
-
-            # Convert to ElementBase
-            parent = ElementBase(**parent_dict)
+        Args:
+            element_pks: Element primary keys
 
-            # Add to visited set
-            visited.add(parent_pk)
+        Returns:
+            Dictionary of element_pk to its ancestry path, from root to the element
+        """
+        records: Dict[str, Optional[Dict[str, Any]]] = {}
 
-            # Add parent to the beginning of the ancestry list (root first)
-            ancestry.insert(0, parent)
+        def get_record(element_id: str) -> Optional[Dict[str, Any]]:
+            if element_id not in records:
+                records[element_id] = self.elements.get(element_id)
+            return records[element_id]
 
-            # Move up to the parent
-            current_pk = parent_id
+        ancestries = {}
+        for element_pk in dict.fromkeys(element_pks):
+            try:
+                element_id = self._element_ids_by_pk.get(int(element_pk))
+            except (ValueError, TypeError):
+                continue
+            if element_id is None:
+                continue
 
-        return ancestry
+            ancestry = self._walk_ancestry(get_record(element_id), get_record)
+            if ancestry:
+                ancestries[element_pk] = ancestry
+        return ancestries
 
     def _cosine_similarity(self, vec1: VectorType, vec2: VectorType) -> float:
         """
@@ -2719,6 +2885,201 @@ class FileDocumentDatabase(DocumentDatabase):
     # FILE I/O METHODS
     # ========================================
 
+    # ========================================
+    # SECONDARY INDEXES
+    # ========================================
+
+    def _rebuild_secondary_indexes(self) -> None:
+        """Rebuild the secondary indexes from the stored records."""
+        for index in (self._element_ids_by_doc, self._element_ids_by_parent, self._element_ids_by_type,
+                      self._element_ids_by_pk, self._doc_ids_by_source, self._relationship_ids_by_source,
+                      self._relationship_ids_by_target, self._indexed_elements, self._indexed_documents,
+                      self._indexed_relationships):
+            index.clear()
+
+        for doc_id, fields in self._indexed_fields('document', self.documents, ("source",)):
+            self._index_document(doc_id, fields)
+        for element_id, fields in self._indexed_fields('element', self.elements, self._ELEMENT_INDEX_FIELDS):
+            self._index_element(element_id, fields)
+        for relationship_id, fields in self._indexed_fields('relationship', self.relationships,
+                                                            self._RELATIONSHIP_INDEX_FIELDS):
+            self._index_relationship(relationship_id, fields)
+
+    def _indexed_fields(self, kind: str, records: Dict[Any, Dict[str, Any]],
+                        fields: Tuple[str, ...]) -> List[Tuple[Any, Dict[str, Any]]]:
+        """
+        Get the fields to index for each record.
+
+        In segment storage mode the fields are read from the segment index attributes,
+        so records are not parsed; older records without the attributes are loaded.
+        """
+        attributes = self.segment_store.attributes(kind) if self.segment_store is not None else {}
+        result = []
+        for key in records:
+            record_fields = attributes.get(key)
+            if record_fields is None or not all(field in record_fields for field in fields):
+                record_fields = records[key]
+            result.append((key, record_fields))
+        return result
+
+    @staticmethod
+    def _index_add(index: Dict[Any, Dict[str, None]], key: Any, value: str) -> None:
+        if key is not None:
+            index.setdefault(key, {})[value] = None
+
+    @staticmethod
+    def _index_discard(index: Dict[Any, Dict[str, None]], key: Any, value: str) -> None:
+        bucket = index.get(key)
+        if bucket is not None:
+            bucket.pop(value, None)
+            if not bucket:
+                del index[key]
+
+    def _index_element(self, element_id: str, element: Dict[str, Any]) -> None:
+        """Add or move an element in the secondary indexes."""
+        fields = tuple(element.get(field) for field in self._ELEMENT_INDEX_FIELDS)
+        if self._indexed_elements.get(element_id) == fields:
+            return
+
+        self._unindex_element(element_id)
+        element_pk, doc_id, parent_id, element_type = fields
+        self._index_add(self._element_ids_by_doc, doc_id, element_id)
+        self._index_add(self._element_ids_by_parent, parent_id, element_id)
+        self._index_add(self._element_ids_by_type, element_type, element_id)
+        if element_pk is not None:
+            self._element_ids_by_pk[element_pk] = element_id
+        self._indexed_elements[element_id] = fields
+
+    def _unindex_element(self, element_id: str) -> None:
+        """Remove an element from the secondary indexes."""
+        fields = self._indexed_elements.pop(element_id, None)
+        if fields is None:
+            return
+
+        element_pk, doc_id, parent_id, element_type = fields
+        self._index_discard(self._element_ids_by_doc, doc_id, element_id)
+        self._index_discard(self._element_ids_by_parent, parent_id, element_id)
+        self._index_discard(self._element_ids_by_type, element_type, element_id)
+        if self._element_ids_by_pk.get(element_pk) == element_id:
+            del self._element_ids_by_pk[element_pk]
+
+    def _index_document(self, doc_id: str, document: Dict[str, Any]) -> None:
+        """Add or move a document in the source index."""
+        source = document.get("source")
+        if doc_id in self._indexed_documents and self._indexed_documents[doc_id] == source:
+            return
+
+        self._unindex_document(doc_id)
+        self._index_add(self._doc_ids_by_source, source, doc_id)
+        self._indexed_documents[doc_id] = source
+
+    def _unindex_document(self, doc_id: str) -> None:
+        """Remove a document from the source index."""
+        if doc_id in self._indexed_documents:
+            self._index_discard(self._doc_ids_by_source, self._indexed_documents.pop(doc_id), doc_id)
+
+    def _index_relationship(self, relationship_id: str, relationship: Dict[str, Any]) -> None:
+        """Add or move a relationship in the source and target indexes."""
+        fields = tuple(relationship.get(field) for field in self._RELATIONSHIP_INDEX_FIELDS)
+        if self._indexed_relationships.get(relationship_id) == fields:
+            return
+
+        self._unindex_relationship(relationship_id)
+        source_id, target_reference = fields
+        self._index_add(self._relationship_ids_by_source, source_id, relationship_id)
+        self._index_add(self._relationship_ids_by_target, target_reference, relationship_id)
+        self._indexed_relationships[relationship_id] = fields
+
+    def _unindex_relationship(self, relationship_id: str) -> None:
+        """Remove a relationship from the source and target indexes."""
+        fields = self._indexed_relationships.pop(relationship_id, None)
+        if fields is None:
+            return
+
+        source_id, target_reference = fields
+        self._index_discard(self._relationship_ids_by_source, source_id, relationship_id)
+        self._index_discard(self._relationship_ids_by_target, target_reference, relationship_id)
+
+    def _initialize_segment_store(self) -> None:
+        """
+        Open the append-only segment store and expose its records as lazy mappings.
+
+        Only the index is read on startup; records are parsed on first access. A
+        store created over an existing one-file-per-record layout imports that
+        layout once. The original files are left in place.
+        """
+        self.segment_store = SegmentStore(
+            os.path.join(self.storage_path, 'segments'),
+            max_segment_bytes=self.conn_params.get('segment_max_bytes', 64 * 1024 * 1024),
+            sync_every=self.conn_params.get('segment_sync_every', 1000),
+            sync_interval=self.conn_params.get('segment_sync_interval', 1.0),
+            compaction_ratio=self.conn_params.get('segment_compaction_ratio', 0.5)
+        )
+        store = self.segment_store
+
+        if not store.open():
+            self._import_file_layout()
+
+        self.documents = SegmentMapping(store, 'document')
+        self.elements = SegmentMapping(store, 'element')
+        self.relationships = SegmentMapping(store, 'relationship')
+        self.embeddings = SegmentMapping(store, 'embedding', decode=self._decode_embedding_record)
+        self.element_dates = SegmentMapping(store, 'element_dates')
+        self.processing_history = SegmentMapping(store, 'processing_history')
+        self.embedding_matrix = None
+
+        # Restore the element_id -> element_pk map from the index attributes
+        self.element_pks = {
+            element_id: attrs["element_pk"]
+            for element_id, attrs in store.attributes('element').items()
+            if attrs.get("element_pk") is not None
+        }
+        self.next_element_pk = max(self.element_pks.values(), default=0) + 1
+
+        logger.info(f"Opened segment store with {store.count('document')} documents, "
+                    f"{store.count('element')} elements, "
+                    f"{store.count('relationship')} relationships, "
+                    f"{store.count('embedding')} embeddings")
+
+    def _import_file_layout(self) -> None:
+        """Import records from the one-file-per-record layout into a new segment store."""
+        store = self.segment_store
+        self.segment_store = None
+        try:
+            self._load_documents()
+            self._load_elements()
+            self._load_relationships()
+            self._load_embeddings(migrate=False)
+            self._load_element_dates()
+            self._load_processing_history()
+        finally:
+            self.segment_store = store
+
+        for doc_id in self.documents:
+            self._save_document(doc_id)
+        for element_id in self.elements:
+            self._save_element(element_id)
+        for relationship_id in self.relationships:
+            self._save_relationship(relationship_id)
+        for element_pk in self.embeddings:
+            self._save_embedding(element_pk)
+        for element_id in self.element_dates:
+            self._save_element_dates(element_id)
+        for safe_id in self.processing_history:
+            self._save_processing_history(safe_id)
+        store.checkpoint()
+
+        if self.documents or self.elements or self.embeddings:
+            logger.info(f"Imported {len(self.documents)} documents, {len(self.elements)} elements and "
+                        f"{len(self.embeddings)} embeddings into segment storage")
+
+    @staticmethod
+    def _decode_embedding_record(record: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a stored embedding record back to the in-memory embedding format."""
+        embedding_data = dict(record)
+        embedding_data["embedding"] = unpack_embedding(base64.b64decode(embedding_data.pop("embedding_f32", "")))
+        return embedding_data
+
     def _load_processing_history(self) -> None:
         """Load processing history from files."""
         history_files = glob.glob(os.path.join(self.storage_path, 'processing_history', '*.json'))
@@ -2741,6 +3102,10 @@ class FileDocumentDatabase(DocumentDatabase):
         if safe_id not in self.processing_history:
             return
 
+        if self.segment_store is not None:
+            self.segment_store.put('processing_history', safe_id, self.processing_history[safe_id])
+            return
+
         file_path = os.path.join(self.storage_path, 'processing_history', f"{safe_id}.json")
 
         try:
@@ -2811,11 +3176,24 @@ class FileDocumentDatabase(DocumentDatabase):
             except Exception as e:
                 logger.error(f"Error loading relationship from {file_path}: {str(e)}")
 
-    def _load_embeddings(self) -> None:
-        """Load embeddings from files, supporting both old and new formats."""
+    def _load_embeddings(self, migrate: bool = True) -> None:
+        """
+        Load embeddings from files, supporting binary and legacy formats.
+
+        Embeddings are stored as ``{element_pk}.emb``: a JSON header line with the
+        embedding metadata followed by the vector as packed little-endian float32.
+        Legacy ``.npy`` and ``.json`` files are loaded and rewritten in the binary
+        format once.
+
+        Args:
+            migrate: Rewrite legacy files in the binary format (False only reads them)
+        """
+        embeddings_dir = os.path.join(self.storage_path, 'embeddings')
+        legacy_pks = set()
+
         # Load old format (.npy files)
         if NUMPY_AVAILABLE:
-            embedding_files = glob.glob(os.path.join(self.storage_path, 'embeddings', '*.npy'))
+            embedding_files = glob.glob(os.path.join(embeddings_dir, '*.npy'))
 
             for file_path in embedding_files:
                 try:
@@ -2833,11 +3211,12 @@ class FileDocumentDatabase(DocumentDatabase):
                         "created_at": time.time()
                     }
                     self.embeddings[element_pk] = embedding_data
+                    legacy_pks.add(element_pk)
                 except Exception as e:
                     logger.error(f"Error loading old format embedding from {file_path}: {str(e)}")
 
-        # Load new format (.json files) - these take precedence
-        embedding_json_files = glob.glob(os.path.join(self.storage_path, 'embeddings', '*.json'))
+        # Load JSON format (.json files) - these take precedence over .npy
+        embedding_json_files = glob.glob(os.path.join(embeddings_dir, '*.json'))
 
         for file_path in embedding_json_files:
             try:
@@ -2850,14 +3229,63 @@ class FileDocumentDatabase(DocumentDatabase):
                     embedding_data = json.load(f)
 
                 self.embeddings[element_pk] = embedding_data
+                legacy_pks.add(element_pk)
+            except Exception as e:
+                logger.error(f"Error loading JSON format embedding from {file_path}: {str(e)}")
+
+        # Load binary format (.emb files) - these take precedence
+        embedding_binary_files = glob.glob(os.path.join(embeddings_dir, '*.emb'))
+
+        for file_path in embedding_binary_files:
+            try:
+                filename = os.path.basename(file_path)
+                element_pk = int(os.path.splitext(filename)[0])
+
+                with open(file_path, 'rb') as f:
+                    header = json.loads(f.readline())
+                    header["embedding"] = unpack_embedding(f.read())
+
+                self.embeddings[element_pk] = header
+                legacy_pks.discard(element_pk)
             except Exception as e:
-                logger.error(f"Error loading new format embedding from {file_path}: {str(e)}")
+                logger.error(f"Error loading binary embedding from {file_path}: {str(e)}")
+
+        if not migrate:
+            return
+
+        # One-time migration of legacy files to the binary format
+        for element_pk in legacy_pks:
+            self._save_embedding(element_pk)
+        if legacy_pks:
+            logger.info(f"Migrated {len(legacy_pks)} embeddings to binary float32 storage")
+
+    def _get_embedding_matrix(self) -> Optional[EmbeddingMatrix]:
+        """Return the embedding matrix, building it on first use. None without NumPy."""
+        if not NUMPY_AVAILABLE:
+            return None
+
+        if self.embedding_matrix is None:
+            matrix = EmbeddingMatrix()
+            matrix.load(
+                (element_pk, embedding_data.get("embedding") if isinstance(embedding_data, dict) else embedding_data)
+                for element_pk, embedding_data in self.embeddings.items()
+            )
+            self.embedding_matrix = matrix
+
+        return self.embedding_matrix
 
     def _save_document(self, doc_id: str) -> None:
         """Save document to file."""
         if doc_id not in self.documents:
             return
 
+        self._index_document(doc_id, self.documents[doc_id])
+
+        if self.segment_store is not None:
+            document = self.documents[doc_id]
+            self.segment_store.put('document', doc_id, document, {"source": document.get("source")})
+            return
+
         file_path = os.path.join(self.storage_path, 'documents', f"{doc_id}.json")
 
         try:
@@ -2871,6 +3299,14 @@ class FileDocumentDatabase(DocumentDatabase):
         if element_id not in self.elements:
             return
 
+        element = self.elements[element_id]
+        self._index_element(element_id, element)
+
+        if self.segment_store is not None:
+            self.segment_store.put('element', element_id, element,
+                                   {field: element.get(field) for field in self._ELEMENT_INDEX_FIELDS})
+            return
+
         file_path = os.path.join(self.storage_path, 'elements', f"{element_id}.json")
 
         try:
@@ -2884,6 +3320,14 @@ class FileDocumentDatabase(DocumentDatabase):
         if relationship_id not in self.relationships:
             return
 
+        relationship = self.relationships[relationship_id]
+        self._index_relationship(relationship_id, relationship)
+
+        if self.segment_store is not None:
+            self.segment_store.put('relationship', relationship_id, relationship,
+                                   {field: relationship.get(field) for field in self._RELATIONSHIP_INDEX_FIELDS})
+            return
+
         file_path = os.path.join(self.storage_path, 'relationships', f"{relationship_id}.json")
 
         try:
@@ -2893,29 +3337,49 @@ class FileDocumentDatabase(DocumentDatabase):
             logger.error(f"Error saving relationship to {file_path}: {str(e)}")
 
     def _save_embedding(self, element_pk: int) -> None:
-        """Save embedding to file in new JSON format."""
+        """Save embedding to file as a JSON header line followed by packed float32 data."""
         if element_pk not in self.embeddings:
             return
 
-        # Save in new JSON format
-        file_path = os.path.join(self.storage_path, 'embeddings', f"{element_pk}.json")
+        embedding_data = self.embeddings[element_pk]
+        if isinstance(embedding_data, list):
+            embedding_data = {"embedding": embedding_data, "dimensions": len(embedding_data)}
+
+        header = {key: value for key, value in embedding_data.items() if key != "embedding"}
+
+        if self.segment_store is not None:
+            packed = pack_embedding(embedding_data.get("embedding") or [])
+            header["embedding_f32"] = base64.b64encode(packed).decode('ascii')
+            self.segment_store.put('embedding', element_pk, header)
+            return
+
+        file_path = os.path.join(self.storage_path, 'embeddings', f"{element_pk}.emb")
 
         try:
-            with open(file_path, 'w') as f:
-                json.dump(self.embeddings[element_pk], f, indent=2)
+            with open(file_path, 'wb') as f:
+                f.write(json.dumps(header).encode('utf-8') + b"\n")
+                f.write(pack_embedding(embedding_data.get("embedding") or []))
         except Exception as e:
             logger.error(f"Error saving embedding to {file_path}: {str(e)}")
+            return
 
-        # Also clean up old .npy file if it exists
-        old_file_path = os.path.join(self.storage_path, 'embeddings', f"{element_pk}.npy")
-        try:
-            if os.path.exists(old_file_path):
-                os.remove(old_file_path)
-        except Exception as e:
-            logger.warning(f"Could not remove old embedding file {old_file_path}: {str(e)}")
+        # Also clean up legacy .json and .npy files if they exist
+        for extension in ('json', 'npy'):
+            old_file_path = os.path.join(self.storage_path, 'embeddings', f"{element_pk}.{extension}")
+            try:
+                if os.path.exists(old_file_path):
+                    os.remove(old_file_path)
+            except Exception as e:
+                logger.warning(f"Could not remove old embedding file {old_file_path}: {str(e)}")
 
     def _delete_document_file(self, doc_id: str) -> None:
         """Delete document file."""
+        self._unindex_document(doc_id)
+
+        if self.segment_store is not None:
+            self.segment_store.delete('document', doc_id)
+            return
+
         file_path = os.path.join(self.storage_path, 'documents', f"{doc_id}.json")
 
         try:
@@ -2926,6 +3390,12 @@ class FileDocumentDatabase(DocumentDatabase):
 
     def _delete_element_file(self, element_id: str) -> None:
         """Delete element file."""
+        self._unindex_element(element_id)
+
+        if self.segment_store is not None:
+            self.segment_store.delete('element', element_id)
+            return
+
         file_path = os.path.join(self.storage_path, 'elements', f"{element_id}.json")
 
         try:
@@ -2936,6 +3406,12 @@ class FileDocumentDatabase(DocumentDatabase):
 
     def _delete_relationship_file(self, relationship_id: str) -> None:
         """Delete relationship file."""
+        self._unindex_relationship(relationship_id)
+
+        if self.segment_store is not None:
+            self.segment_store.delete('relationship', relationship_id)
+            return
+
         file_path = os.path.join(self.storage_path, 'relationships', f"{relationship_id}.json")
 
         try:
@@ -2945,7 +3421,19 @@ class FileDocumentDatabase(DocumentDatabase):
             logger.error(f"Error deleting relationship file {file_path}: {str(e)}")
 
     def _delete_embedding_file(self, element_pk: int) -> None:
-        """Delete embedding files (both old and new formats)."""
+        """Delete embedding files (binary and legacy formats)."""
+        if self.segment_store is not None:
+            self.segment_store.delete('embedding', element_pk)
+            return
+
+        # Delete binary format
+        binary_file_path = os.path.join(self.storage_path, 'embeddings', f"{element_pk}.emb")
+        try:
+            if os.path.exists(binary_file_path):
+                os.remove(binary_file_path)
+        except Exception as e:
+            logger.error(f"Error deleting embedding file {binary_file_path}: {str(e)}")
+
         # Delete new JSON format
         json_file_path = os.path.join(self.storage_path, 'embeddings', f"{element_pk}.json")
         try:
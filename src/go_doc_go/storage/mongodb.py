@@ -36,7 +36,7 @@ else:
 
 from .element_relationship import ElementRelationship
 from .base import DocumentDatabase
-from .element_element import ElementType, ElementBase  # Import existing enum and ElementBase
+from .element_element import ElementType  # Import existing enum
 
 # Import structured search components
 from .structured_search import (
@@ -523,6 +523,8 @@ class MongoDBDocumentDatabase(DocumentDatabase):
             if relationships:
                 self.db.relationships.insert_many(relationships)
 
+            self._bump_store_generation(doc_ids=[doc_id])
+
             # Update processing history
             if source:
                 self.update_processing_history(source, content_hash)
@@ -614,6 +616,8 @@ class MongoDBDocumentDatabase(DocumentDatabase):
             if relationships:
                 self.db.relationships.insert_many(relationships)
 
+            self._bump_store_generation(doc_ids=[doc_id])
+
             # Update processing history
             source = document.get("source", "")
             content_hash = document.get("content_hash", "")
@@ -814,6 +818,7 @@ class MongoDBDocumentDatabase(DocumentDatabase):
             # Delete document
             self.db.documents.delete_one({"doc_id": doc_id})
 
+            self._bump_store_generation(doc_ids=[doc_id])
             logger.info(f"Deleted document {doc_id} with {len(element_ids)} elements")
             return True
 
@@ -1057,6 +1062,7 @@ class MongoDBDocumentDatabase(DocumentDatabase):
                 upsert=True
             )
 
+            self._bump_store_generation(element_pks=[element_pk])
             logger.debug(f"Stored embedding for element {element_pk}")
 
         except Exception as e:
@@ -1394,7 +1400,7 @@ class MongoDBDocumentDatabase(DocumentDatabase):
                 raise ValueError("Embedding libraries are not installed.")
 
             # Generate embedding for the search text
-            query_embedding = self.embedding_generator.generate(search_text)
+            query_embedding = self._generate_query_embedding(search_text)
 
             # Use the embedding to search, passing the filter criteria
             return self.search_by_embedding(query_embedding, limit, filter_criteria)
@@ -2189,7 +2195,7 @@ class MongoDBDocumentDatabase(DocumentDatabase):
                     raise ValueError("Config not available")
                 self.embedding_generator = get_embedding_generator(config)
 
-            return self.embedding_generator.generate(search_text)
+            return self._generate_query_embedding(search_text)
         except Exception as e:
             logger.error(f"Error generating embedding: {str(e)}")
             raise
@@ -2427,6 +2433,7 @@ class MongoDBDocumentDatabase(DocumentDatabase):
                 upsert=True
             )
 
+            self._bump_store_generation(element_pks=[element_pk])
             logger.debug(f"Stored embedding with topics for element {element_pk}: {topics}")
 
         except Exception as e:
@@ -2454,7 +2461,7 @@ class MongoDBDocumentDatabase(DocumentDatabase):
                     logger.error(f"Embedding generator not available: {str(e)}")
                     raise ValueError("Embedding libraries are not installed.")
 
-                query_embedding = self.embedding_generator.generate(search_text)
+                query_embedding = self._generate_query_embedding(search_text)
 
             # Build aggregation pipeline for topic-aware search
             if search_text and self.vector_search:
@@ -2743,13 +2750,16 @@ class MongoDBDocumentDatabase(DocumentDatabase):
         # Final result structure
         result_tree: List[ElementHierarchical] = []
 
+        # Fetch the ancestry paths of all results at once
+        ancestries = self.get_element_ancestries([element_pk for element_pk, _ in elements])
+
         # Process each element from the search results
         for element_pk, score in elements:
             if element_pk in processed_elements:
                 continue
 
             # Find the complete ancestry path for this element
-            ancestry_path = self._get_element_ancestry_path(element_pk)
+            ancestry_path = ancestries.get(element_pk)
 
             if not ancestry_path:
                 continue
@@ -2786,61 +2796,6 @@ class MongoDBDocumentDatabase(DocumentDatabase):
 
         return result_tree
 
-    def _get_element_ancestry_path(self, element_pk: int) -> List[ElementBase]:
-        """Get the complete ancestry path for an element, from root to the element itself."""
-        # Get the element
-        element_dict = self.get_element(element_pk)
-        if not element_dict:
-            return []
-
-        # Convert to ElementBase instance
-        element = ElementBase(**element_dict)
-
-        # Start building the ancestry path with the element itself
-        ancestry = [element]
-
-        # Track to avoid circular references
-        visited = {element_pk}
-
-        # Current element to process
-        current_pk = element_pk
-
-        # Traverse up the hierarchy using parent_id
-        while True:
-            # Get the current element
-            current_element = self.get_element(current_pk)
-            if not current_element:
-                break
-
-            # Get parent ID
-            parent_id = current_element.get('parent_id')
-            if not parent_id:
-                break
-
-            # Get the parent element
-            parent_dict = self.get_element(parent_id)
-            if not parent_dict:
-                break
-
-            # Check for circular references
-            parent_pk = parent_dict.get('id') or parent_dict.get('pk') or parent_dict.get('element_id')
-            if parent_pk in visited:
-                break
-
-            # Convert to ElementBase
-            parent = ElementBase(**parent_dict)
-
-            # Add to visited set
-            visited.add(parent_pk)
-
-            # Add parent to the beginning of the ancestry list (root first)
-            ancestry.insert(0, parent)
-
-            # Move up to the parent
-            current_pk = parent_id
-
-        return ancestry
-
     # ========================================
     # DATE STORAGE AND SEARCH METHODS
     # ========================================
@@ -15,7 +15,7 @@ from typing import Optional, Dict, Any, List, Tuple, Union, TYPE_CHECKING
 
 import time
 
-from .element_element import ElementHierarchical, ElementBase
+from .element_element import ElementHierarchical
 
 # Import types for type checking only - these won't be imported at runtime
 if TYPE_CHECKING:
@@ -1081,7 +1081,7 @@ class Neo4jDocumentDatabase(DocumentDatabase):
                     raise ValueError("Config not available")
                 self.embedding_generator = get_embedding_generator(config)
 
-            return self.embedding_generator.generate(search_text)
+            return self._generate_query_embedding(search_text)
         except Exception as e:
             logger.error(f"Error generating embedding: {str(e)}")
             raise
@@ -1483,6 +1483,8 @@ class Neo4jDocumentDatabase(DocumentDatabase):
                     metadata=metadata_json
                 )
 
+            self._bump_store_generation(doc_ids=[doc_id])
+
             # Update processing history
             if source:
                 self.update_processing_history(source, content_hash)
@@ -2125,6 +2127,7 @@ class Neo4jDocumentDatabase(DocumentDatabase):
                 doc_id=doc_id
             )
 
+            self._bump_store_generation(doc_ids=[doc_id])
             return True
 
     def store_relationship(self, relationship: Dict[str, Any]) -> None:
@@ -2475,6 +2478,8 @@ class Neo4jDocumentDatabase(DocumentDatabase):
                     created_at=time.time()
                 )
 
+        self._bump_store_generation(element_pks=[element_pk])
+
     def get_embedding(self, element_pk: Union[int, str]) -> Optional[VectorType]:
         """Get embedding for an element."""
         if not self.driver:
@@ -2698,7 +2703,7 @@ class Neo4jDocumentDatabase(DocumentDatabase):
                     raise ValueError("Embedding libraries are not installed.")
 
             # Generate embedding for the search text
-            query_embedding = self.embedding_generator.generate(search_text)
+            query_embedding = self._generate_query_embedding(search_text)
 
             # Use the embedding to search
             return self.search_by_embedding(query_embedding, limit, filter_criteria)
@@ -2782,6 +2787,8 @@ class Neo4jDocumentDatabase(DocumentDatabase):
                     created_at=time.time()
                 )
 
+        self._bump_store_generation(element_pks=[element_pk])
+
     def search_by_text_and_topics(self, search_text: str = None,
                                   include_topics: Optional[List[str]] = None,
                                   exclude_topics: Optional[List[str]] = None,
@@ -2819,7 +2826,7 @@ class Neo4jDocumentDatabase(DocumentDatabase):
                         logger.error("Config not available for embedding generator")
                         return []
 
-                query_embedding = self.embedding_generator.generate(search_text)
+                query_embedding = self._generate_query_embedding(search_text)
 
             return self._search_by_text_and_topics_fallback(
                 query_embedding, include_topics, exclude_topics, min_confidence, limit
@@ -3128,13 +3135,16 @@ class Neo4jDocumentDatabase(DocumentDatabase):
         # Final result structure
         result_tree: List[ElementHierarchical] = []
 
+        # Fetch the ancestry paths of all results at once
+        ancestries = self.get_element_ancestries([element_pk for element_pk, _ in elements])
+
         # Process each element from the search results
         for element_pk, score in elements:
             if element_pk in processed_elements:
                 continue
 
             # Find the complete ancestry path for this element
-            ancestry_path = self._get_element_ancestry_path(element_pk)
+            ancestry_path = ancestries.get(element_pk)
 
             if not ancestry_path:
                 continue
@@ -3171,67 +3181,6 @@ class Neo4jDocumentDatabase(DocumentDatabase):
 
         return result_tree
 
-    def _get_element_ancestry_path(self, element_pk: int) -> List["ElementBase"]:
-        """
-        Get the complete ancestry path for an element, from root to the element itself.
-
-        Uses parent_id to find parents instead of relationships.
-        """
-        from .element_element import ElementBase
-
-        # Get the element
-        element_dict = self.get_element(element_pk)
-        if not element_dict:
-            return []
-
-        # Convert to ElementElement instance
-        element = ElementBase(**element_dict)
-
-        # Start building the ancestry path with the element itself
-        ancestry = [element]
-
-        # Track to avoid circular references
-        visited = {element_pk}
-
-        # Current element to process
-        current_pk = element_pk
-
-        # Traverse up the hierarchy using parent_id
-        while True:
-            # Get the current element
-            current_element = self.get_element(current_pk)
-            if not current_element:
-                break
-
-            # Get parent ID
-            parent_id = current_element.get('parent_id')
-            if not parent_id:
-                break
-
-            # Get the parent element
-            parent_dict = self.get_element(parent_id)
-            if not parent_dict:
-                break
-
-            # Check for circular references
-            parent_pk = parent_dict.get('id') or parent_dict.get('pk') or parent_dict.get('element_id')
-            if parent_pk in visited:
-                break
-
-            # Convert to ElementElement
-            parent = ElementBase(**parent_dict)
-
-            # Add to visited set
-            visited.add(parent_pk)
-
-            # Add parent to the beginning of the ancestry list (root first)
-            ancestry.insert(0, parent)
-
-            # Move up to the parent
-            current_pk = parent_id
-
-        return ancestry
-
     # ========================================
     # DATE STORAGE AND SEARCH METHODS (Neo4j specific implementation)
     # ========================================
@@ -27,7 +27,8 @@ else:
 
 from .base import DocumentDatabase
 from .element_relationship import ElementRelationship
-from .element_element import ElementType  # Import existing enum
+from .element_element import ElementType, ElementBase  # Import existing enum
+from .search_cache import TopicStatisticsCache
 
 # Import structured search components
 from .structured_search import (
@@ -114,6 +115,10 @@ class PostgreSQLDocumentDatabase(DocumentDatabase):
         self.vector_dimension = config.config.get('embedding', {}).get('dimensions', 384) if config else 384
         self.embedding_generator = None
 
+        # Topic statistics are updated incrementally for writes made through this instance;
+        # the TTL bounds staleness from writes made by other processes
+        self._topic_statistics_cache = TopicStatisticsCache(ttl=conn_params.get('topic_statistics_ttl', 300))
+
         # Full-text search configuration
         self.full_text_language = conn_params.get('full_text_language', 'english')
         self.full_text_weights = conn_params.get('full_text_weights', {
@@ -894,7 +899,7 @@ class PostgreSQLDocumentDatabase(DocumentDatabase):
                     config_obj = Config(os.environ.get("GO_DOC_GO_CONFIG_PATH", "./config.yaml"))
                 self.embedding_generator = get_embedding_generator(config_obj)
 
-            return self.embedding_generator.generate(search_text)
+            return self._generate_query_embedding(search_text)
         except Exception as e:
             logger.error(f"Error generating embedding: {str(e)}")
             raise
@@ -1440,6 +1445,7 @@ class PostgreSQLDocumentDatabase(DocumentDatabase):
 
             # Commit transaction
             self.conn.commit()
+            self._bump_store_generation(doc_ids=[doc_id])
 
             # Update processing history
             if source:
@@ -1539,6 +1545,7 @@ class PostgreSQLDocumentDatabase(DocumentDatabase):
         except Exception as e:
             # Rollback on error
             self.conn.rollback()
+            self._bump_store_generation(doc_ids=[doc_id])
             logger.error(f"Error updating document {doc_id}: {str(e)}")
             raise
 
@@ -1705,6 +1712,110 @@ class PostgreSQLDocumentDatabase(DocumentDatabase):
         if row is None:
             return None
 
+        return self._row_to_element(row)
+
+    def get_elements_by_pks(self, element_pks: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get several elements by primary key with one query.
+
+        Args:
+            element_pks: Element primary keys
+
+        Returns:
+            Dictionary of element_pk to element data (missing elements are omitted)
+        """
+        if not self.cursor:
+            raise ValueError("Database not initialized")
+
+        element_pks = list(dict.fromkeys(int(element_pk) for element_pk in element_pks))
+        if not element_pks:
+            return {}
+
+        placeholders = ','.join(['%s'] * len(element_pks))
+        self.cursor.execute(
+            f"SELECT {self._element_columns()} FROM elements WHERE element_pk IN ({placeholders})",
+            element_pks
+        )
+        elements = {row["element_pk"]: self._row_to_element(row) for row in self.cursor.fetchall()}
+        return {element_pk: elements[element_pk] for element_pk in element_pks if element_pk in elements}
+
+    def get_documents_by_ids(self, doc_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the metadata of several documents with one query.
+
+        Args:
+            doc_ids: Document IDs
+
+        Returns:
+            Dictionary of doc_id to document data (missing documents are omitted)
+        """
+        if not self.cursor:
+            raise ValueError("Database not initialized")
+
+        doc_ids = list(dict.fromkeys(doc_ids))
+        if not doc_ids:
+            return {}
+
+        placeholders = ','.join(['%s'] * len(doc_ids))
+        self.cursor.execute(
+            f"SELECT * FROM documents WHERE doc_id IN ({placeholders})",
+            doc_ids
+        )
+        documents = {row["doc_id"]: dict(row) for row in self.cursor.fetchall()}
+        return {doc_id: documents[doc_id] for doc_id in doc_ids if doc_id in documents}
+
+    def get_element_ancestries(self, element_pks: List[int]) -> Dict[int, List[ElementBase]]:
+        """
+        Get the ancestry paths of several elements with one recursive query.
+
+        Args:
+            element_pks: Element primary keys
+
+        Returns:
+            Dictionary of element_pk to its ancestry path, from root to the element
+        """
+        if not self.cursor:
+            raise ValueError("Database not initialized")
+
+        element_pks = list(dict.fromkeys(int(element_pk) for element_pk in element_pks))
+        if not element_pks:
+            return {}
+
+        # UNION (not UNION ALL) visits each ancestor once, which also stops at cycles
+        placeholders = ','.join(['%s'] * len(element_pks))
+        self.cursor.execute(
+            f"""
+            WITH RECURSIVE ancestry(element_pk, parent_id) AS (
+                SELECT element_pk, parent_id FROM elements WHERE element_pk IN ({placeholders})
+                UNION
+                SELECT e.element_pk, e.parent_id
+                FROM elements e JOIN ancestry a ON e.element_id = a.parent_id
+            )
+            SELECT {self._element_columns()} FROM elements
+            WHERE element_pk IN (SELECT element_pk FROM ancestry)
+            """,
+            element_pks
+        )
+        elements = [self._row_to_element(row) for row in self.cursor.fetchall()]
+        by_pk = {element["element_pk"]: element for element in elements}
+        by_id = {element["element_id"]: element for element in elements}
+
+        ancestries = {}
+        for element_pk in element_pks:
+            ancestry = self._walk_ancestry(by_pk.get(element_pk), by_id.get)
+            if ancestry:
+                ancestries[element_pk] = ancestry
+        return ancestries
+
+    def _element_columns(self) -> str:
+        """Get the elements columns to select, leaving out full_content unless it is stored."""
+        if self.store_full_text:
+            return "*"
+        return ("element_pk, element_id, doc_id, element_type, parent_id, "
+                "content_preview, content_location, content_hash, metadata")
+
+    def _row_to_element(self, row) -> Dict[str, Any]:
+        """Convert an elements row to an element dictionary."""
         element = dict(row)
 
         # Convert metadata from JSON
@@ -2071,6 +2182,7 @@ class PostgreSQLDocumentDatabase(DocumentDatabase):
 
             # Commit transaction
             self.conn.commit()
+            self._bump_store_generation(doc_ids=[doc_id])
 
             return True
 
@@ -2139,6 +2251,7 @@ class PostgreSQLDocumentDatabase(DocumentDatabase):
                 )
 
             self.conn.commit()
+            self._bump_store_generation(element_pks=[element_pk])
 
         except Exception as e:
             self.conn.rollback()
@@ -2206,7 +2319,7 @@ class PostgreSQLDocumentDatabase(DocumentDatabase):
                 self.embedding_generator = get_embedding_generator(config_obj)
 
             # Generate embedding for the search text
-            query_embedding = self.embedding_generator.generate(search_text)
+            query_embedding = self._generate_query_embedding(search_text)
 
             # Use the embedding to search, passing filter criteria
             return self.search_by_embedding(query_embedding, limit, filter_criteria)
@@ -2668,7 +2781,7 @@ class PostgreSQLDocumentDatabase(DocumentDatabase):
                     config_obj = Config(os.environ.get("GO_DOC_GO_CONFIG_PATH", "./config.yaml"))
                 self.embedding_generator = get_embedding_generator(config_obj)
 
-            query_embedding = self.embedding_generator.generate(search_text)
+            query_embedding = self._generate_query_embedding(search_text)
 
             # Build filter criteria for date range
             filter_criteria = {}
@@ -3594,6 +3707,7 @@ class PostgreSQLDocumentDatabase(DocumentDatabase):
                 )
 
             self.conn.commit()
+            self._bump_store_generation(element_pks=[element_pk])
 
         except Exception as e:
             self.conn.rollback()
@@ -3624,7 +3738,7 @@ class PostgreSQLDocumentDatabase(DocumentDatabase):
                         config_obj = Config(os.environ.get("GO_DOC_GO_CONFIG_PATH", "./config.yaml"))
                     self.embedding_generator = get_embedding_generator(config_obj)
 
-                query_embedding = self.embedding_generator.generate(search_text)
+                query_embedding = self._generate_query_embedding(search_text)
 
             # Build the query based on whether we have search text and vector support
             if search_text and self.vector_extension == "pgvector":
@@ -3782,46 +3896,53 @@ class PostgreSQLDocumentDatabase(DocumentDatabase):
         return sql, params
 
     def get_topic_statistics(self) -> Dict[str, Dict[str, Any]]:
-        """Get statistics about topic distribution across embeddings."""
+        """
+        Get statistics about topic distribution across embeddings.
+
+        The statistics are cached and only documents written through this instance
+        since the last call are recomputed.
+        """
         if not self.cursor:
             raise ValueError("Database not initialized")
 
         try:
-            # Query to get topic statistics using PostgreSQL JSON functions
-            self.cursor.execute("""
-                WITH topic_expanded AS (
-                    SELECT 
-                        jsonb_array_elements_text(topics) AS topic,
-                        confidence,
-                        e.doc_id
-                    FROM embeddings em
-                    JOIN elements e ON em.element_pk = e.element_pk
-                    WHERE topics IS NOT NULL AND jsonb_array_length(topics) > 0
-                )
-                SELECT 
-                    topic,
-                    COUNT(*) as embedding_count,
-                    COUNT(DISTINCT doc_id) as document_count,
-                    AVG(confidence) as avg_confidence
-                FROM topic_expanded
-                GROUP BY topic
-                ORDER BY embedding_count DESC
-            """)
-
-            statistics = {}
-            for row in self.cursor.fetchall():
-                statistics[row[0]] = {
-                    'embedding_count': int(row[1]),
-                    'document_count': int(row[2]),
-                    'avg_embedding_confidence': float(row[3])
-                }
-
-            return statistics
+            return self._topic_statistics_cache.get(self._load_topic_statistics_rows,
+                                                    self._get_doc_ids_for_element_pks)
 
         except Exception as e:
             logger.error(f"Error getting topic statistics: {str(e)}")
             return {}
 
+    def _load_topic_statistics_rows(self, doc_ids: Optional[List[str]]) -> List[Tuple[str, str, int, float]]:
+        """Get (doc_id, topic, embedding count, confidence sum) rows for documents (all when None)."""
+        sql = """
+            SELECT
+                e.doc_id,
+                topic,
+                COUNT(*) AS embedding_count,
+                SUM(em.confidence) AS confidence_sum
+            FROM embeddings em
+            JOIN elements e ON em.element_pk = e.element_pk
+            CROSS JOIN LATERAL jsonb_array_elements_text(em.topics) AS topic
+            WHERE em.topics IS NOT NULL AND jsonb_array_length(em.topics) > 0
+        """
+        params: List[Any] = []
+        if doc_ids is not None:
+            if not doc_ids:
+                return []
+            sql += f" AND e.doc_id IN ({','.join(['%s'] * len(doc_ids))})"
+            params.extend(doc_ids)
+        sql += " GROUP BY e.doc_id, topic"
+
+        self.cursor.execute(sql, params)
+        return [(row[0], row[1], int(row[2]), float(row[3] or 0.0)) for row in self.cursor.fetchall()]
+
+    def _get_doc_ids_for_element_pks(self, element_pks: List[int]) -> List[str]:
+        """Get the distinct doc_ids of elements."""
+        placeholders = ','.join(['%s'] * len(element_pks))
+        self.cursor.execute(f"SELECT DISTINCT doc_id FROM elements WHERE element_pk IN ({placeholders})", element_pks)
+        return [row[0] for row in self.cursor.fetchall()]
+
     def get_embedding_topics(self, element_pk: int) -> List[str]:
         """Get topics assigned to a specific embedding."""
         if not self.cursor:
@@ -3866,13 +3987,16 @@ class PostgreSQLDocumentDatabase(DocumentDatabase):
         # Final result structure
         result_tree: List[ElementHierarchical] = []
 
+        # Fetch the ancestry paths of all results at once
+        ancestries = self.get_element_ancestries([element_pk for element_pk, _ in elements])
+
         # Process each element from the search results
         for element_pk, score in elements:
             if element_pk in processed_elements:
                 continue
 
             # Find the complete ancestry path for this element
-            ancestry_path = self._get_element_ancestry_path(element_pk)
+            ancestry_path = ancestries.get(element_pk)
 
             if not ancestry_path:
                 continue
@@ -3909,65 +4033,6 @@ class PostgreSQLDocumentDatabase(DocumentDatabase):
 
         return result_tree
 
-    def _get_element_ancestry_path(self, element_pk: int) -> List["ElementBase"]:
-        """
-        Get the complete ancestry path for an element, from root to the element itself.
-        """
-        from .element_element import ElementBase
-
-        # Get the element
-        element_dict = self.get_element(element_pk)
-        if not element_dict:
-            return []
-
-        # Convert to ElementBase instance
-        element = ElementBase(**element_dict)
-
-        # Start building the ancestry path with the element itself
-        ancestry = [element]
-
-        # Track to avoid circular references
-        visited = {element_pk}
-
-        # Current element to process
-        current_pk = element_pk
-
-        # Traverse up the hierarchy using parent_id
-        while True:
-            # Get the current element
-            current_element = self.get_element(current_pk)
-            if not current_element:
-                break
-
-            # Get parent ID
-            parent_id = current_element.get('parent_id')
-            if not parent_id:
-                break
-
-            # Get the parent element
-            parent_dict = self.get_element(parent_id)
-            if not parent_dict:
-                break
-
-            # Check for circular references
-            parent_pk = parent_dict.get('id') or parent_dict.get('pk') or parent_dict.get('element_id')
-            if parent_pk in visited:
-                break
-
-            # Convert to ElementBase
-            parent = ElementBase(**parent_dict)
-
-            # Add to visited set
-            visited.add(parent_pk)
-
-            # Add parent to the beginning of the ancestry list (root first)
-            ancestry.insert(0, parent)
-
-            # Move up to the parent
-            current_pk = parent_id
-
-        return ancestry
-
     # ========================================
     # ADDITIONAL HELPER AND CONVENIENCE METHODS
     # ========================================
@@ -194,6 +194,22 @@ class SemanticSearchRequest(BaseModel):
         examples=[[], ["title", "summary"], ["content"], ["title", "abstract", "conclusion"]]
     )
 
+    use_full_text_search: bool = Field(
+        default=False,
+        title="Keyword Search",
+        description="Match query terms against the backend's full-text index instead of embeddings. "
+                   "Scores are keyword relevance (e.g. BM25) and are compared to the similarity threshold. "
+                   "Ignored by backends without full-text search"
+    )
+
+    full_text_prefilter: bool = Field(
+        default=False,
+        title="Keyword Prefilter",
+        description="Run the semantic search only over elements containing at least one query term. "
+                   "Faster on large corpora and returns both keyword and semantic scores. "
+                   "Ignored by backends without full-text search"
+    )
+
 
 class VectorSearchRequest(BaseModel):
     """
@@ -1312,7 +1328,9 @@ def pydantic_to_core_query(pydantic_query: SearchQueryRequest):
                 similarity_threshold=ts.similarity_threshold,
                 similarity_operator=SimilarityOperator(ts.similarity_operator.value),
                 boost_factor=ts.boost_factor,
-                search_fields=ts.search_fields
+                search_fields=ts.search_fields,
+                use_full_text_search=ts.use_full_text_search,
+                full_text_prefilter=ts.full_text_prefilter
             )
 
         embedding_criteria = None
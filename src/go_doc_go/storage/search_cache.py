@@ -0,0 +1,268 @@
+"""
+Caches for the search path.
+
+Search requests repeat: dashboards issue the same queries over and over, and each
+request re-embeds the query text and, for topic searches, recomputes the topic
+statistics of the whole corpus. This module provides:
+
+- QueryEmbeddingCache: bounded LRU cache with a time-to-live for query embeddings,
+  keyed by model name and query text, shared by all backends in the process
+- SearchResultCache: bounded LRU cache with a time-to-live for search results,
+  keyed by the normalized request and the store generation of the database, so
+  writes to the database invalidate cached results
+- TopicStatisticsCache: topic statistics kept per document and totalled
+  incrementally, so only documents that changed are recomputed
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _TTLCache:
+    """Bounded, thread-safe LRU cache whose entries expire after a time-to-live."""
+
+    def __init__(self, max_entries: int, ttl: Optional[float]):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries (0 disables the cache)
+            ttl: Seconds an entry stays valid (None for no limit)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[1] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def configure(self, max_entries: int, ttl: Optional[float]) -> None:
+        with self._lock:
+            self.max_entries = max_entries
+            self.ttl = ttl
+            while len(self._entries) > max(max_entries, 0):
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+            }
+
+
+class QueryEmbeddingCache(_TTLCache):
+    """LRU+TTL cache of query embeddings keyed by model name and query text."""
+
+    def __init__(self, max_entries: int = 1000, ttl: Optional[float] = 3600):
+        super().__init__(max_entries, ttl)
+
+    def get_or_generate(self, generator, text: str) -> List[float]:
+        """
+        Get the embedding of a query, generating it on a miss.
+
+        Args:
+            generator: Embedding generator
+            text: Query text
+
+        Returns:
+            Query embedding (a new list, so callers may modify it)
+        """
+        get_model_name = getattr(generator, 'get_model_name', None)
+        model = get_model_name() if get_model_name else type(generator).__qualname__
+        key = (model, text)
+        embedding = self.get(key)
+        if embedding is None:
+            # Stored as a tuple so a caller mutating its result cannot corrupt the cache
+            embedding = tuple(generator.generate(text))
+            self.set(key, embedding)
+        return list(embedding)
+
+
+class SearchResultCache(_TTLCache):
+    """LRU+TTL cache of search results keyed by the normalized request and store generation."""
+
+    def __init__(self, max_entries: int = 0, ttl: Optional[float] = 300):
+        """
+        Initialize the result cache.
+
+        Args:
+            max_entries: Maximum number of cached results (0 disables the cache)
+            ttl: Seconds a result stays valid; bounds staleness from writes the store
+                 generation does not see (e.g. other processes on some backends)
+        """
+        super().__init__(max_entries, ttl)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def make_key(generation: Hashable, **request: Any) -> Hashable:
+        """
+        Build a cache key from request parameters.
+
+        Filters and topic lists are normalized, so requests that differ only in key
+        order compare equal.
+
+        Args:
+            generation: Store generation of the database
+            **request: Request parameters
+
+        Returns:
+            Hashable cache key
+        """
+        return generation, json.dumps(request, sort_keys=True, default=str)
+
+
+class TopicStatisticsCache:
+    """
+    Topic statistics kept per document and totalled incrementally.
+
+    Backends mark the documents and elements whose embeddings or topics changed;
+    the next read recomputes the contribution of those documents only. The
+    statistics are built from rows of (doc_id, topic, embedding count, confidence sum).
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        """
+        Initialize the statistics cache.
+
+        Args:
+            ttl: Seconds after which the statistics are rebuilt from scratch (None for no
+                 limit); bounds staleness from writes made by other processes
+        """
+        self.ttl = ttl
+        self._built_at = 0.0
+        self._per_document: Dict[str, Dict[str, Tuple[int, float]]] = {}
+        # Per topic: [embedding count, confidence sum, document count]
+        self._totals: Dict[str, List[float]] = {}
+        self._built = False
+        self._dirty_documents: set = set()
+        self._dirty_elements: set = set()
+        self._lock = threading.Lock()
+
+    def mark_documents(self, doc_ids: Iterable[str]) -> None:
+        """Mark documents whose topic assignments changed."""
+        with self._lock:
+            self._dirty_documents.update(doc_ids)
+
+    def mark_elements(self, element_pks: Iterable[int]) -> None:
+        """Mark elements whose topic assignments changed."""
+        with self._lock:
+            self._dirty_elements.update(element_pks)
+
+    def invalidate(self) -> None:
+        """Drop the statistics; the next read rebuilds them."""
+        with self._lock:
+            self._built = False
+
+    def get(self, load_rows: Callable[[Optional[List[str]]], Iterable[Tuple[str, str, int, float]]],
+            resolve_documents: Callable[[List[int]], Iterable[str]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the topic statistics, refreshing changed documents.
+
+        Args:
+            load_rows: Function returning (doc_id, topic, embedding count, confidence sum) rows
+                       for the given documents, or for all documents when given None
+            resolve_documents: Function returning the doc_ids of element primary keys
+
+        Returns:
+            Dictionary of topic to embedding_count, document_count and avg_embedding_confidence,
+            ordered by embedding count
+        """
+        with self._lock:
+            if self._built and self.ttl is not None and time.monotonic() - self._built_at > self.ttl:
+                self._built = False
+            if not self._built:
+                self._per_document = {}
+                self._totals = {}
+                self._dirty_documents.clear()
+                self._dirty_elements.clear()
+                self._replace(None, load_rows(None))
+                self._built = True
+                self._built_at = time.monotonic()
+            elif self._dirty_documents or self._dirty_elements:
+                doc_ids = set(self._dirty_documents)
+                if self._dirty_elements:
+                    doc_ids.update(resolve_documents(sorted(self._dirty_elements)))
+                self._dirty_documents.clear()
+                self._dirty_elements.clear()
+                if doc_ids:
+                    self._replace(sorted(doc_ids), load_rows(sorted(doc_ids)))
+
+            ordered = sorted(self._totals.items(), key=lambda item: item[1][0], reverse=True)
+            return {
+                topic: {
+                    'embedding_count': int(count),
+                    'document_count': int(documents),
+                    'avg_embedding_confidence': confidence_sum / count
+                }
+                for topic, (count, confidence_sum, documents) in ordered
+            }
+
+    def _replace(self, doc_ids: Optional[List[str]], rows: Iterable[Tuple[str, str, int, float]]) -> None:
+        """Replace the contribution of documents (all when doc_ids is None) with new rows."""
+        for doc_id in doc_ids or []:
+            for topic, (count, confidence_sum) in self._per_document.pop(doc_id, {}).items():
+                self._add(topic, -count, -confidence_sum, -1)
+
+        for doc_id, topic, count, confidence_sum in rows:
+            topics = self._per_document.setdefault(doc_id, {})
+            previous_count, previous_sum = topics.get(topic, (0, 0.0))
+            topics[topic] = (previous_count + count, previous_sum + confidence_sum)
+            self._add(topic, count, confidence_sum, 0 if previous_count else 1)
+
+    def _add(self, topic: str, count: int, confidence_sum: float, documents: int) -> None:
+        totals = self._totals.setdefault(topic, [0, 0.0, 0])
+        totals[0] += count
+        totals[1] += confidence_sum
+        totals[2] += documents
+        if totals[0] <= 0:
+            del self._totals[topic]
+
+
+# Query embedding cache shared by all database backends in the process
+_query_embedding_cache = QueryEmbeddingCache()
+
+
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    """Get the process-wide query embedding cache."""
+    return _query_embedding_cache
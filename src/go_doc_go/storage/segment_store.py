@@ -0,0 +1,467 @@
+"""
+Append-only segment storage used by the file-based document database.
+
+Records are appended as newline-delimited JSON to numbered segment files. An
+in-memory index maps ``(kind, key)`` to the location of the latest record and
+a small set of attributes (for example an element's ``element_pk`` and
+``doc_id``). The index is checkpointed to ``index.json`` so that opening a
+store only replays the log written after the last checkpoint instead of
+parsing every record. Deleted and overwritten records are reclaimed by
+compaction, which rewrites the live records into fresh segments.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".log"
+INDEX_FILE = "index.json"
+INDEX_VERSION = 1
+
+# (segment number, offset, length, attributes)
+IndexEntry = Tuple[int, int, int, Optional[Dict[str, Any]]]
+
+
+class SegmentStore:
+    """Log-structured key/value store made of append-only segment files."""
+
+    def __init__(self, path: str,
+                 max_segment_bytes: int = 64 * 1024 * 1024,
+                 sync_every: int = 1000,
+                 sync_interval: float = 1.0,
+                 compaction_ratio: float = 0.5,
+                 min_compaction_bytes: int = 16 * 1024 * 1024):
+        """
+        Initialize the segment store.
+
+        Args:
+            path: Directory holding the segment and index files
+            max_segment_bytes: Size at which the active segment is rolled over
+            sync_every: Number of appended records after which the log is fsynced
+            sync_interval: Seconds after which pending records are fsynced on the next write
+            compaction_ratio: Fraction of dead bytes that triggers automatic compaction
+            min_compaction_bytes: Minimum total log size before automatic compaction runs
+        """
+        self.path = path
+        self.max_segment_bytes = max_segment_bytes
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.compaction_ratio = compaction_ratio
+        self.min_compaction_bytes = min_compaction_bytes
+
+        self._index: Dict[str, Dict[Hashable, IndexEntry]] = {}
+        self._segment_sizes: Dict[int, int] = {}
+        self._dead_bytes = 0
+        self._active = None
+        self._active_no = 0
+        self._readers: Dict[int, Any] = {}
+        self._pending = 0
+        self._dirty = False
+        self._last_sync = time.monotonic()
+        self._lock = threading.RLock()
+
+    # ========================================
+    # LIFECYCLE
+    # ========================================
+
+    def open(self) -> bool:
+        """
+        Open the store, loading the index checkpoint and replaying the log tail.
+
+        Returns:
+            True if the store already held data, False if it is new
+        """
+        with self._lock:
+            os.makedirs(self.path, exist_ok=True)
+            segments = self._list_segments()
+            existed = bool(segments) or os.path.exists(self._index_path())
+
+            checkpoint = self._load_index()
+            for segment_no in segments:
+                self._segment_sizes[segment_no] = os.path.getsize(self._segment_path(segment_no))
+
+            # Segments left behind by an interrupted compaction are no longer referenced
+            if checkpoint is not None:
+                referenced = {entry[0] for entries in self._index.values() for entry in entries.values()}
+                for segment_no in [s for s in segments if s < checkpoint[0] and s not in referenced]:
+                    self._remove_segment(segment_no)
+                segments = self._list_segments()
+
+            # Replay records written after the checkpoint
+            for segment_no in segments:
+                if checkpoint is None or segment_no > checkpoint[0]:
+                    self._replay_segment(segment_no, 0)
+                elif segment_no == checkpoint[0]:
+                    self._replay_segment(segment_no, checkpoint[1])
+
+            self._active_no = segments[-1] if segments else 1
+            self._open_active()
+            return existed
+
+    def close(self) -> None:
+        """Sync the log, compact if worthwhile and write an index checkpoint."""
+        with self._lock:
+            if self._active is None:
+                return
+            self.flush()
+            if self._should_compact():
+                self.compact()
+            else:
+                self.checkpoint()
+            self._active.close()
+            self._active = None
+            for reader in self._readers.values():
+                reader.close()
+            self._readers.clear()
+
+    def flush(self, sync: bool = True) -> None:
+        """Flush buffered records, optionally fsyncing the active segment."""
+        with self._lock:
+            if self._active is None:
+                return
+            self._active.flush()
+            self._dirty = False
+            if sync and self._pending:
+                os.fsync(self._active.fileno())
+                self._pending = 0
+                self._last_sync = time.monotonic()
+
+    def checkpoint(self) -> None:
+        """Persist the index so the next open only replays newer records."""
+        with self._lock:
+            self.flush()
+            state = {
+                "version": INDEX_VERSION,
+                "checkpoint": [self._active_no, self._segment_sizes.get(self._active_no, 0)],
+                "dead_bytes": self._dead_bytes,
+                "kinds": {
+                    kind: [[key, *entry] for key, entry in entries.items()]
+                    for kind, entries in self._index.items()
+                },
+            }
+            temp_path = self._index_path() + ".tmp"
+            with open(temp_path, 'w') as f:
+                json.dump(state, f, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self._index_path())
+
+    # ========================================
+    # RECORD OPERATIONS
+    # ========================================
+
+    def put(self, kind: str, key: Hashable, value: Any, attrs: Optional[Dict[str, Any]] = None) -> None:
+        """Append a record, replacing any previous record for the same key."""
+        record = {"k": kind, "id": key, "v": value}
+        if attrs:
+            record["a"] = attrs
+        with self._lock:
+            offset, length = self._append(record)
+            previous = self._index.setdefault(kind, {}).get(key)
+            if previous is not None:
+                self._dead_bytes += previous[2]
+            self._index[kind][key] = (self._active_no, offset, length, attrs or None)
+            self._after_write()
+
+    def delete(self, kind: str, key: Hashable) -> bool:
+        """Append a tombstone for a key. Returns False if the key was not present."""
+        with self._lock:
+            previous = self._index.get(kind, {}).pop(key, None)
+            if previous is None:
+                return False
+            _, length = self._append({"k": kind, "id": key, "d": 1})
+            self._dead_bytes += previous[2] + length
+            self._after_write()
+            return True
+
+    def get(self, kind: str, key: Hashable) -> Any:
+        """Read the latest value for a key. Raises KeyError if absent."""
+        with self._lock:
+            segment_no, offset, length, _ = self._index.get(kind, {})[key]
+            return json.loads(self._read(segment_no, offset, length))["v"]
+
+    def contains(self, kind: str, key: Hashable) -> bool:
+        """Check whether a key is present."""
+        return key in self._index.get(kind, {})
+
+    def keys(self, kind: str) -> List[Hashable]:
+        """Return the keys currently stored for a kind."""
+        with self._lock:
+            return list(self._index.get(kind, {}))
+
+    def count(self, kind: str) -> int:
+        """Return the number of keys stored for a kind."""
+        return len(self._index.get(kind, {}))
+
+    def attributes(self, kind: str) -> Dict[Hashable, Dict[str, Any]]:
+        """Return the index attributes recorded for each key of a kind."""
+        with self._lock:
+            return {key: entry[3] or {} for key, entry in self._index.get(kind, {}).items()}
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Return segment and index statistics."""
+        with self._lock:
+            total_bytes = sum(self._segment_sizes.values())
+            return {
+                "segments": len(self._segment_sizes),
+                "total_bytes": total_bytes,
+                "dead_bytes": self._dead_bytes,
+                "records": {kind: len(entries) for kind, entries in self._index.items()},
+            }
+
+    # ========================================
+    # COMPACTION
+    # ========================================
+
+    def compact(self) -> None:
+        """Rewrite live records into new segments and remove the old ones."""
+        with self._lock:
+            self.flush()
+            old_segments = sorted(self._segment_sizes)
+            first_new = self._active_no + 1
+            segment_no = first_new
+            output = open(self._segment_path(segment_no), 'ab')
+            size = 0
+            new_index: Dict[str, Dict[Hashable, IndexEntry]] = {}
+            new_sizes: Dict[int, int] = {}
+
+            try:
+                for kind, entries in self._index.items():
+                    new_entries = new_index.setdefault(kind, {})
+                    for key, (old_no, offset, length, attrs) in entries.items():
+                        if size >= self.max_segment_bytes:
+                            output.flush()
+                            os.fsync(output.fileno())
+                            output.close()
+                            new_sizes[segment_no] = size
+                            segment_no += 1
+                            output = open(self._segment_path(segment_no), 'ab')
+                            size = 0
+                        output.write(self._read(old_no, offset, length))
+                        new_entries[key] = (segment_no, size, length, attrs)
+                        size += length
+                output.flush()
+                os.fsync(output.fileno())
+            finally:
+                output.close()
+            new_sizes[segment_no] = size
+
+            # Switch over, checkpoint, then drop the old segments
+            self._active.close()
+            self._index = new_index
+            self._segment_sizes = new_sizes
+            self._dead_bytes = 0
+            self._active_no = segment_no
+            self._open_active()
+            self.checkpoint()
+
+            for old_no in old_segments:
+                self._remove_segment(old_no)
+
+            logger.info(f"Compacted segment store {self.path}: "
+                        f"{len(old_segments)} segments into {len(new_sizes)}")
+
+    def _should_compact(self) -> bool:
+        """Check whether dead records make compaction worthwhile."""
+        total_bytes = sum(self._segment_sizes.values())
+        return (total_bytes >= self.min_compaction_bytes and
+                self._dead_bytes >= total_bytes * self.compaction_ratio)
+
+    # ========================================
+    # INTERNAL HELPERS
+    # ========================================
+
+    def _append(self, record: Dict[str, Any]) -> Tuple[int, int]:
+        """Append a record to the active segment and return its offset and length."""
+        line = json.dumps(record, separators=(',', ':')).encode('utf-8') + b"\n"
+        offset = self._segment_sizes.get(self._active_no, 0)
+        self._active.write(line)
+        self._segment_sizes[self._active_no] = offset + len(line)
+        self._pending += 1
+        self._dirty = True
+        return offset, len(line)
+
+    def _after_write(self) -> None:
+        """Apply fsync batching, rollover and automatic compaction after a write."""
+        if self._pending >= self.sync_every or time.monotonic() - self._last_sync >= self.sync_interval:
+            self.flush()
+
+        if self._segment_sizes[self._active_no] >= self.max_segment_bytes:
+            self.flush()
+            if self._should_compact():
+                self.compact()
+                return
+            self._active.close()
+            self._active_no += 1
+            self._open_active()
+            self.checkpoint()
+
+    def _read(self, segment_no: int, offset: int, length: int) -> bytes:
+        """Read raw record bytes from a segment."""
+        if segment_no == self._active_no and self._dirty:
+            self._active.flush()
+            self._dirty = False
+
+        reader = self._readers.get(segment_no)
+        if reader is None:
+            reader = open(self._segment_path(segment_no), 'rb')
+            self._readers[segment_no] = reader
+        reader.seek(offset)
+        return reader.read(length)
+
+    def _replay_segment(self, segment_no: int, start: int) -> None:
+        """Apply records from a segment to the index, truncating a torn final record."""
+        path = self._segment_path(segment_no)
+        offset = start
+        with open(path, 'rb') as f:
+            f.seek(start)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    logger.warning(f"Truncating incomplete record at {path}:{offset}")
+                    break
+                try:
+                    record = json.loads(line)
+                    kind, key = record["k"], record["id"]
+                except (ValueError, KeyError, TypeError) as e:
+                    logger.error(f"Skipping unreadable record at {path}:{offset}: {str(e)}")
+                    self._dead_bytes += len(line)
+                    offset += len(line)
+                    continue
+
+                previous = self._index.setdefault(kind, {}).pop(key, None)
+                if previous is not None:
+                    self._dead_bytes += previous[2]
+                if record.get("d"):
+                    self._dead_bytes += len(line)
+                else:
+                    self._index[kind][key] = (segment_no, offset, len(line), record.get("a"))
+                offset += len(line)
+
+        if offset < os.path.getsize(path):
+            with open(path, 'r+b') as f:
+                f.truncate(offset)
+        self._segment_sizes[segment_no] = offset
+
+    def _load_index(self) -> Optional[Tuple[int, int]]:
+        """Load the index checkpoint. Returns the checkpoint position, or None."""
+        index_path = self._index_path()
+        if not os.path.exists(index_path):
+            return None
+
+        try:
+            with open(index_path, 'r') as f:
+                state = json.load(f)
+            if state.get("version") != INDEX_VERSION:
+                raise ValueError(f"unsupported index version {state.get('version')}")
+        except Exception as e:
+            logger.error(f"Error loading segment index {index_path}, rebuilding from segments: {str(e)}")
+            return None
+
+        for kind, entries in state.get("kinds", {}).items():
+            self._index[kind] = {
+                key: (segment_no, offset, length, attrs)
+                for key, segment_no, offset, length, attrs in entries
+            }
+        self._dead_bytes = state.get("dead_bytes", 0)
+        segment_no, offset = state["checkpoint"]
+        return segment_no, offset
+
+    def _open_active(self) -> None:
+        """Open the active segment for appending."""
+        self._active = open(self._segment_path(self._active_no), 'ab')
+        self._segment_sizes.setdefault(self._active_no, self._active.tell())
+
+    def _remove_segment(self, segment_no: int) -> None:
+        """Close and delete a segment file."""
+        reader = self._readers.pop(segment_no, None)
+        if reader is not None:
+            reader.close()
+        self._segment_sizes.pop(segment_no, None)
+        try:
+            os.remove(self._segment_path(segment_no))
+        except OSError as e:
+            logger.warning(f"Could not remove segment {segment_no}: {str(e)}")
+
+    def _list_segments(self) -> List[int]:
+        """List segment numbers present on disk, in order."""
+        segments = []
+        for filename in os.listdir(self.path):
+            if filename.startswith(SEGMENT_PREFIX) and filename.endswith(SEGMENT_SUFFIX):
+                try:
+                    segments.append(int(filename[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]))
+                except ValueError:
+                    continue
+        return sorted(segments)
+
+    def _segment_path(self, segment_no: int) -> str:
+        return os.path.join(self.path, f"{SEGMENT_PREFIX}{segment_no:06d}{SEGMENT_SUFFIX}")
+
+    def _index_path(self) -> str:
+        return os.path.join(self.path, INDEX_FILE)
+
+
+class SegmentMapping(MutableMapping):
+    """
+    Dictionary view over one kind of record in a SegmentStore.
+
+    Values are read from the store on first access and cached. Assignments only
+    update the cache; callers persist them explicitly with ``SegmentStore.put``.
+    Deletions are written through to the store.
+    """
+
+    def __init__(self, store: SegmentStore, kind: str,
+                 decode: Optional[Callable[[Any], Any]] = None):
+        self._store = store
+        self._kind = kind
+        self._decode = decode
+        self._cache: Dict[Hashable, Any] = {}
+
+    def __getitem__(self, key: Hashable) -> Any:
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        value = self._store.get(self._kind, key)
+        if self._decode is not None:
+            value = self._decode(value)
+        self._cache[key] = value
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self._cache[key] = value
+
+    def __delitem__(self, key: Hashable) -> None:
+        cached = self._cache.pop(key, _MISSING) is not _MISSING
+        stored = self._store.delete(self._kind, key)
+        if not cached and not stored:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._cache or self._store.contains(self._kind, key)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        cached = list(self._cache)
+        yield from cached
+        cached_keys = set(cached)
+        for key in self._store.keys(self._kind):
+            if key not in cached_keys:
+                yield key
+
+    def __len__(self) -> int:
+        uncached = sum(1 for key in self._cache if not self._store.contains(self._kind, key))
+        return self._store.count(self._kind) + uncached
+
+    def evict(self) -> None:
+        """Drop cached values that are persisted in the store."""
+        self._cache = {key: value for key, value in self._cache.items()
+                       if not self._store.contains(self._kind, key)}
+
+
+_MISSING = object()
@@ -30,7 +30,7 @@ else:
 
 from .element_relationship import ElementRelationship
 from .base import DocumentDatabase
-from .element_element import ElementType, ElementBase  # Import existing enum and ElementBase
+from .element_element import ElementType  # Import existing enum
 
 # Import structured search components
 from .structured_search import (
@@ -944,7 +944,7 @@ class SolrDocumentDatabase(DocumentDatabase):
                 config_instance = config or Config()
                 self.embedding_generator = get_embedding_generator(config_instance)
 
-            return self.embedding_generator.generate(search_text)
+            return self._generate_query_embedding(search_text)
         except Exception as e:
             logger.error(f"Error generating embedding: {str(e)}")
             raise
@@ -1258,6 +1258,8 @@ class SolrDocumentDatabase(DocumentDatabase):
             if solr_relationships:
                 self.relationships.add(solr_relationships)
 
+            self._bump_store_generation(doc_ids=[doc_id])
+
             # Update processing history
             if source:
                 self.update_processing_history(source, content_hash)
@@ -1384,6 +1386,8 @@ class SolrDocumentDatabase(DocumentDatabase):
             if solr_relationships:
                 self.relationships.add(solr_relationships)
 
+            self._bump_store_generation(doc_ids=[doc_id])
+
             # Update processing history
             source = document.get("source", "")
             content_hash = document.get("content_hash", "")
@@ -1633,6 +1637,7 @@ class SolrDocumentDatabase(DocumentDatabase):
             # Delete document
             self.documents.delete(f"doc_id:{escaped_doc_id}")
 
+            self._bump_store_generation(doc_ids=[doc_id])
             logger.info(f"Deleted document {doc_id} with {len(element_ids)} elements")
             return True
 
@@ -2096,6 +2101,7 @@ class SolrDocumentDatabase(DocumentDatabase):
 
             # Store in embeddings core
             self.embeddings.add([embedding_doc])
+            self._bump_store_generation(element_pks=[element_pk])
             logger.debug(f"Stored embedding for element {element_pk}")
 
         except Exception as e:
@@ -2284,7 +2290,7 @@ class SolrDocumentDatabase(DocumentDatabase):
                     self.embedding_generator = get_embedding_generator(config_instance)
 
                 # Generate embedding and perform vector search
-                query_embedding = self.embedding_generator.generate(search_text)
+                query_embedding = self._generate_query_embedding(search_text)
                 vector_results = self.search_by_embedding(query_embedding, limit, filter_criteria)
                 vector_scores = {pk: score for pk, score in vector_results}
 
@@ -2373,6 +2379,7 @@ class SolrDocumentDatabase(DocumentDatabase):
 
             # Store in embeddings core
             self.embeddings.add([embedding_doc])
+            self._bump_store_generation(element_pks=[element_pk])
             logger.debug(f"Stored embedding with topics for element {element_pk}")
 
         except Exception as e:
@@ -2413,7 +2420,7 @@ class SolrDocumentDatabase(DocumentDatabase):
                     config_instance = config or Config()
                     self.embedding_generator = get_embedding_generator(config_instance)
 
-                query_embedding = self.embedding_generator.generate(search_text)
+                query_embedding = self._generate_query_embedding(search_text)
 
             return self._search_by_text_and_topics_fallback(
                 query_embedding, include_topics, exclude_topics, min_confidence, limit
@@ -2797,7 +2804,7 @@ class SolrDocumentDatabase(DocumentDatabase):
                 config_instance = config or Config()
                 self.embedding_generator = get_embedding_generator(config_instance)
 
-            query_embedding = self.embedding_generator.generate(search_text)
+            query_embedding = self._generate_query_embedding(search_text)
             return self.search_by_embedding_and_date_range(query_embedding, start_date, end_date, limit)
 
         except Exception as e:
@@ -3178,13 +3185,16 @@ class SolrDocumentDatabase(DocumentDatabase):
         # Final result structure
         result_tree: List[ElementHierarchical] = []
 
+        # Fetch the ancestry paths of all results at once
+        ancestries = self.get_element_ancestries([element_pk for element_pk, _ in elements])
+
         # Process each element from the search results
         for element_pk, score in elements:
             if element_pk in processed_elements:
                 continue
 
             # Find the complete ancestry path for this element
-            ancestry_path = self._get_element_ancestry_path(element_pk)
+            ancestry_path = ancestries.get(element_pk)
 
             if not ancestry_path:
                 continue
@@ -3221,65 +3231,6 @@ class SolrDocumentDatabase(DocumentDatabase):
 
         return result_tree
 
-    def _get_element_ancestry_path(self, element_pk: int) -> List[ElementBase]:
-        """
-        Get the complete ancestry path for an element, from root to the element itself.
-
-        Uses parent_id to find parents instead of relationships.
-        """
-        # Get the element
-        element_dict = self.get_element(element_pk)
-        if not element_dict:
-            return []
-
-        # Convert to ElementBase instance
-        element = ElementBase(**element_dict)
-
-        # Start building the ancestry path with the element itself
-        ancestry = [element]
-
-        # Track to avoid circular references
-        visited = {element_pk}
-
-        # Current element to process
-        current_pk = element_pk
-
-        # Traverse up the hierarchy using parent_id
-        while True:
-            # Get the current element
-            current_element = self.get_element(current_pk)
-            if not current_element:
-                break
-
-            # Get parent ID
-            parent_id = current_element.get('parent_id')
-            if not parent_id:
-                break
-
-            # Get the parent element
-            parent_dict = self.get_element(parent_id)
-            if not parent_dict:
-                break
-
-            # Check for circular references
-            parent_pk = parent_dict.get('id') or parent_dict.get('pk') or parent_dict.get('element_id')
-            if parent_pk in visited:
-                break
-
-            # Convert to ElementBase
-            parent = ElementBase(**parent_dict)
-
-            # Add to visited set
-            visited.add(parent_pk)
-
-            # Add parent to the beginning of the ancestry list (root first)
-            ancestry.insert(0, parent)
-
-            # Move up to the parent
-            current_pk = parent_id
-
-        return ancestry
-
     @staticmethod
     def _cosine_similarity_numpy(vec1: VectorType, vec2: VectorType) -> float:
         """
@@ -9,7 +9,7 @@ import json
 import logging
 import os
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List, Tuple, Union, TYPE_CHECKING
+from typing import Callable, Optional, Dict, Any, List, Tuple, Union, TYPE_CHECKING
 
 import time
 
@@ -18,7 +18,7 @@ from .element_element import ElementHierarchical
 # Import types for type checking only - these won't be imported at runtime
 if TYPE_CHECKING:
     from sqlalchemy import (
-        create_engine, Column, ForeignKey, String, Integer, Float, Text, LargeBinary, func, text,
+        create_engine, Column, ForeignKey, String, Integer, Float, Text, LargeBinary, func, text, insert,
         Engine
     )
     from sqlalchemy.ext.declarative import declarative_base
@@ -39,6 +39,7 @@ else:
 from .base import DocumentDatabase
 from .element_relationship import ElementRelationship
 from .element_element import ElementType, ElementBase
+from .search_cache import TopicStatisticsCache
 
 # Import structured search components
 from .structured_search import (
@@ -57,13 +58,16 @@ PGVECTOR_AVAILABLE = False
 SQLITE_VEC_AVAILABLE = False
 SQLITE_VSS_AVAILABLE = False
 
+# Fills the pgvector column from the JSON text of an embedding
+PGVECTOR_UPDATE_SQL = "UPDATE embeddings SET vector_embedding = CAST(:embedding AS vector) WHERE element_pk = :pk"
+
 # Try to import SQLAlchemy conditionally at runtime
 try:
     from sqlalchemy import (
-        create_engine, Column, ForeignKey, String, Integer, Float, Text, LargeBinary, func, text
+        create_engine, Column, ForeignKey, String, Integer, Float, Text, LargeBinary, func, text, insert
     )
     from sqlalchemy.ext.declarative import declarative_base
-    from sqlalchemy.orm import sessionmaker, relationship, scoped_session
+    from sqlalchemy.orm import sessionmaker, relationship, scoped_session, aliased
 
     SQLALCHEMY_AVAILABLE = True
 except ImportError:
@@ -75,6 +79,7 @@ except ImportError:
     sessionmaker = None
     relationship = None
     scoped_session = None
+    aliased = None
 
 # Try to import NumPy conditionally at runtime
 try:
@@ -152,7 +157,8 @@ if SQLALCHEMY_AVAILABLE:
         relationships_as_source = relationship("Relationship", foreign_keys="Relationship.source_id",
                                                cascade="all, delete-orphan")
         children = relationship("Element", backref="parent", remote_side=[element_id])
-        dates = relationship("ElementDate", back_populates="element", cascade="all, delete-orphan")
+        dates = relationship("ElementDate", back_populates="element", cascade="all, delete-orphan",
+                             foreign_keys="ElementDate.element_pk")
 
     class Relationship(Base):
         """Relationship model for SQLAlchemy ORM."""
@@ -191,7 +197,7 @@ if SQLALCHEMY_AVAILABLE:
         metadata_ = Column('metadata', Text)
 
         # Relationships
-        element = relationship("Element", back_populates="dates")
+        element = relationship("Element", back_populates="dates", foreign_keys=[element_pk])
 
     class ProcessingHistory(Base):
         """Processing history model for SQLAlchemy ORM."""
@@ -299,6 +305,10 @@ class SQLAlchemyDocumentDatabase(DocumentDatabase):
         self._vector_dimension = config.config.get('embedding', {}).get('dimensions', 384) if config else 384
         self.embedding_generator = None
 
+        # Topic statistics are updated incrementally for writes made through this instance;
+        # the TTL bounds staleness from writes made by other processes
+        self._topic_statistics_cache = TopicStatisticsCache(ttl=300)
+
     # ========================================
     # STRUCTURED SEARCH IMPLEMENTATION
     # ========================================
@@ -950,7 +960,7 @@ class SQLAlchemyDocumentDatabase(DocumentDatabase):
                     config_obj = Config(os.environ.get("GO_DOC_GO_CONFIG_PATH", "./config.yaml"))
                 self.embedding_generator = get_embedding_generator(config_obj)
 
-            return self.embedding_generator.generate(search_text)
+            return self._generate_query_embedding(search_text)
         except Exception as e:
             logger.error(f"Error generating embedding: {str(e)}")
             raise
@@ -1086,7 +1096,100 @@ class SQLAlchemyDocumentDatabase(DocumentDatabase):
         if not element:
             return None
 
-        # Convert to dictionary
+        return self._element_to_dict(element)
+
+    def get_elements_by_pks(self, element_pks: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get several elements by primary key with one query.
+
+        Args:
+            element_pks: Element primary keys
+
+        Returns:
+            Dictionary of element_pk to element data (missing elements are omitted)
+        """
+        if not self.session:
+            raise ValueError("Database not initialized")
+
+        element_pks = list(dict.fromkeys(int(element_pk) for element_pk in element_pks))
+        if not element_pks:
+            return {}
+
+        elements = {
+            element.element_pk: self._element_to_dict(element)
+            for element in self.session.query(Element).filter(Element.element_pk.in_(element_pks)).all()
+        }
+        return {element_pk: elements[element_pk] for element_pk in element_pks if element_pk in elements}
+
+    def get_documents_by_ids(self, doc_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the metadata of several documents with one query.
+
+        Args:
+            doc_ids: Document IDs
+
+        Returns:
+            Dictionary of doc_id to document data (missing documents are omitted)
+        """
+        if not self.session:
+            raise ValueError("Database not initialized")
+
+        doc_ids = list(dict.fromkeys(doc_ids))
+        if not doc_ids:
+            return {}
+
+        documents = {
+            document.doc_id: self._document_to_dict(document)
+            for document in self.session.query(Document).filter(Document.doc_id.in_(doc_ids)).all()
+        }
+        return {doc_id: documents[doc_id] for doc_id in doc_ids if doc_id in documents}
+
+    def get_element_ancestries(self, element_pks: List[int]) -> Dict[int, List[ElementBase]]:
+        """
+        Get the ancestry paths of several elements with one recursive query.
+
+        Args:
+            element_pks: Element primary keys
+
+        Returns:
+            Dictionary of element_pk to its ancestry path, from root to the element
+        """
+        if not self.session:
+            raise ValueError("Database not initialized")
+
+        element_pks = list(dict.fromkeys(int(element_pk) for element_pk in element_pks))
+        if not element_pks:
+            return {}
+
+        # UNION (not UNION ALL) visits each ancestor once, which also stops at cycles
+        ancestry = self.session.query(Element.element_pk, Element.parent_id).filter(
+            Element.element_pk.in_(element_pks)
+        ).cte(name="ancestry", recursive=True)
+        parent = aliased(Element)
+        ancestry = ancestry.union(
+            self.session.query(parent.element_pk, parent.parent_id).join(
+                ancestry, parent.element_id == ancestry.c.parent_id
+            )
+        )
+        elements = [
+            self._element_to_dict(element)
+            for element in self.session.query(Element).filter(
+                Element.element_pk.in_(self.session.query(ancestry.c.element_pk))
+            ).all()
+        ]
+        by_pk = {element["element_pk"]: element for element in elements}
+        by_id = {element["element_id"]: element for element in elements}
+
+        ancestries = {}
+        for element_pk in element_pks:
+            ancestry_path = self._walk_ancestry(by_pk.get(element_pk), by_id.get)
+            if ancestry_path:
+                ancestries[element_pk] = ancestry_path
+        return ancestries
+
+    @staticmethod
+    def _element_to_dict(element) -> Dict[str, Any]:
+        """Convert an Element row to an element dictionary."""
         result = {
             "element_id": element.element_id,
             "element_pk": element.element_pk,
@@ -1526,6 +1629,7 @@ class SQLAlchemyDocumentDatabase(DocumentDatabase):
 
             # Commit the transaction
             self.session.commit()
+            self._bump_store_generation(doc_ids=[doc_id])
 
             # Update processing history
             if source:
@@ -1539,6 +1643,164 @@ class SQLAlchemyDocumentDatabase(DocumentDatabase):
             logger.error(f"Error storing document {document.get('doc_id')}: {str(e)}")
             raise
 
+    def store_document_batch(self, document: Dict[str, Any], elements: List[Dict[str, Any]],
+                             relationships: List[Dict[str, Any]],
+                             element_dates: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                             embedding_fn: Optional[Callable[[List[Dict[str, Any]]], Dict[int, List[float]]]] = None,
+                             topics: Optional[List[str]] = None,
+                             confidence: float = 1.0) -> Dict[int, List[float]]:
+        """
+        Store a document with its elements, relationships, dates and embeddings in one transaction.
+
+        Elements are flushed together so their element_pk values come back from a single
+        batched INSERT ... RETURNING where the dialect supports it; relationships, dates and
+        embeddings are written as bulk inserts. embedding_fn runs inside the transaction,
+        after the elements are flushed. If the source is already stored, the stored document
+        keeps its doc_id and its elements, relationships, dates and embeddings are replaced
+        in the same transaction.
+        """
+        if not self.session:
+            raise ValueError("Database not initialized")
+
+        source = document.get("source", "")
+        content_hash = document.get("content_hash", "")
+        doc_id = document["doc_id"]
+
+        try:
+            existing_doc = self.session.query(Document).filter_by(source=source).first() if source else None
+            if existing_doc:
+                doc_id = document["doc_id"] = existing_doc.doc_id
+                for element in elements:
+                    element["doc_id"] = doc_id
+                self._delete_document_contents(doc_id)
+
+                existing_doc.doc_type = document.get("doc_type", existing_doc.doc_type)
+                existing_doc.content_hash = content_hash
+                existing_doc.metadata_ = json.dumps(document.get("metadata", {}))
+                existing_doc.updated_at = document.get("updated_at", time.time())
+            else:
+                self.session.add(Document(
+                    doc_id=doc_id,
+                    doc_type=document.get("doc_type", ""),
+                    source=source,
+                    content_hash=content_hash,
+                    metadata_=json.dumps(document.get("metadata", {})),
+                    created_at=document.get("created_at", time.time()),
+                    updated_at=document.get("updated_at", time.time())
+                ))
+
+            # Store elements and read back their PKs
+            element_records = [
+                Element(
+                    element_id=element["element_id"],
+                    doc_id=element.get("doc_id", doc_id),
+                    element_type=element.get("element_type", ""),
+                    parent_id=element.get("parent_id"),
+                    content_preview=element.get("content_preview", ""),
+                    content_location=element.get("content_location", ""),
+                    content_hash=element.get("content_hash", ""),
+                    metadata_=json.dumps(element.get("metadata", {}))
+                )
+                for element in elements
+            ]
+            self.session.add_all(element_records)
+            self.session.flush()
+
+            for element, element_record in zip(elements, element_records):
+                element["element_pk"] = element_record.element_pk
+
+            # Store relationships
+            if relationships:
+                self.session.execute(insert(Relationship), [
+                    {
+                        "relationship_id": relationship["relationship_id"],
+                        "source_id": relationship.get("source_id", ""),
+                        "relationship_type": relationship.get("relationship_type", ""),
+                        "target_reference": relationship.get("target_reference", ""),
+                        "metadata_": json.dumps(relationship.get("metadata", {}))
+                    }
+                    for relationship in relationships
+                ])
+
+            # Store extracted dates
+            if element_dates:
+                element_pks = {element["element_id"]: element["element_pk"] for element in elements}
+                date_rows = [
+                    {
+                        "element_pk": element_pks[element_id],
+                        "element_id": element_id,
+                        "timestamp_value": date_dict.get('timestamp'),
+                        "date_text": date_dict.get('date_text', ''),
+                        "specificity_level": date_dict.get('specificity_level', 'day'),
+                        "metadata_": json.dumps(date_dict.get('metadata', {}))
+                    }
+                    for element_id, dates_list in element_dates.items() if element_id in element_pks
+                    for date_dict in dates_list
+                ]
+                if date_rows:
+                    self.session.execute(insert(ElementDate), date_rows)
+
+            # Generate and store embeddings
+            embeddings = embedding_fn(elements) if embedding_fn else {}
+            use_topics = topics is not None and self.supports_topics()
+            if embeddings:
+                created_at = time.time()
+                self.session.execute(insert(Embedding), [
+                    {
+                        "element_pk": element_pk,
+                        "embedding": self._encode_embedding(embedding),
+                        "dimensions": len(embedding),
+                        "topics": json.dumps(topics if use_topics else []),
+                        "confidence": confidence if use_topics else 1.0,
+                        "created_at": created_at
+                    }
+                    for element_pk, embedding in embeddings.items()
+                ])
+                self._vector_dimension = max(self._vector_dimension, max(len(e) for e in embeddings.values()))
+
+                if self._vector_extension == "pgvector" and self.db_uri.startswith('postgresql') and PGVECTOR_AVAILABLE:
+                    self._update_pgvector_column(embeddings)
+
+            self.session.commit()
+            self._bump_store_generation(doc_ids=[doc_id])
+
+        except Exception as e:
+            self.session.rollback()
+            for element in elements:
+                element.pop("element_pk", None)
+            logger.error(f"Error storing document {doc_id}: {str(e)}")
+            raise
+
+        # Update processing history
+        if source:
+            self.update_processing_history(source, content_hash)
+
+        logger.info(f"Stored document {doc_id} with {len(elements)} elements, {len(relationships)} relationships "
+                    f"and {len(embeddings)} embeddings")
+
+        return embeddings
+
+    def _delete_document_contents(self, doc_id: str) -> None:
+        """
+        Delete a document's elements, relationships, dates and embeddings in the current transaction.
+
+        Args:
+            doc_id: Document ID
+        """
+        element_ids = self.session.query(Element.element_id).filter_by(doc_id=doc_id)
+        element_pks = self.session.query(Element.element_pk).filter_by(doc_id=doc_id)
+
+        self.session.query(Relationship).filter(
+            Relationship.source_id.in_(element_ids)
+        ).delete(synchronize_session=False)
+        self.session.query(Embedding).filter(
+            Embedding.element_pk.in_(element_pks)
+        ).delete(synchronize_session=False)
+        self.session.query(ElementDate).filter(
+            ElementDate.element_pk.in_(element_pks)
+        ).delete(synchronize_session=False)
+        self.session.query(Element).filter_by(doc_id=doc_id).delete(synchronize_session=False)
+
     def update_document(self, doc_id: str, document: Dict[str, Any],
                         elements: List[Dict[str, Any]],
                         relationships: List[Dict[str, Any]]) -> None:
@@ -1637,6 +1899,7 @@ class SQLAlchemyDocumentDatabase(DocumentDatabase):
 
             # Commit the transaction
             self.session.commit()
+            self._bump_store_generation(doc_ids=[doc_id])
 
             # Update processing history
             if source:
@@ -1659,7 +1922,11 @@ class SQLAlchemyDocumentDatabase(DocumentDatabase):
         if not document:
             return None
 
-        # Convert to dictionary
+        return self._document_to_dict(document)
+
+    @staticmethod
+    def _document_to_dict(document) -> Dict[str, Any]:
+        """Convert a Document row to a document dictionary."""
         result = {
             "doc_id": document.doc_id,
             "doc_type": document.doc_type,
@@ -2148,6 +2415,7 @@ class SQLAlchemyDocumentDatabase(DocumentDatabase):
 
             # Commit changes
             self.session.commit()
+            self._bump_store_generation(doc_ids=[doc_id])
 
             logger.info(f"Deleted document {doc_id}")
             return True
@@ -2202,6 +2470,7 @@ class SQLAlchemyDocumentDatabase(DocumentDatabase):
 
             # Commit changes
             self.session.commit()
+            self._bump_store_generation(element_pks=[element_pk])
 
             # Handle vector extension specific storage
             if self._vector_extension == "pgvector" and self.db_uri.startswith('postgresql'):
@@ -2214,6 +2483,23 @@ class SQLAlchemyDocumentDatabase(DocumentDatabase):
             logger.error(f"Error storing embedding for {element_pk}: {str(e)}")
             raise
 
+    def _update_pgvector_column(self, embeddings: Dict[int, VectorType]) -> None:
+        """
+        Fill the pgvector column of embeddings stored in the current transaction.
+
+        Runs in a savepoint, so a failure only leaves the vector column empty (search
+        falls back to the stored embeddings) instead of aborting the document write.
+        """
+        try:
+            with self.session.begin_nested():
+                self.session.execute(
+                    text(PGVECTOR_UPDATE_SQL),
+                    [{"embedding": json.dumps(embedding), "pk": element_pk}
+                     for element_pk, embedding in embeddings.items()]
+                )
+        except Exception as e:
+            logger.error(f"Error storing pgvector embeddings: {str(e)}")
+
     def _store_pgvector_embedding(self, element_pk: Union[int, str], embedding: VectorType) -> None:
         """Store embedding using pgvector extension."""
         if not PGVECTOR_AVAILABLE:
@@ -2225,9 +2511,7 @@ class SQLAlchemyDocumentDatabase(DocumentDatabase):
             embedding_str = json.dumps(embedding)
 
             # Execute raw SQL to update the vector column
-            self.session.execute(text(
-                f"UPDATE embeddings SET vector_embedding = :embedding::vector WHERE element_pk = :pk"
-            ), {"embedding": embedding_str, "pk": element_pk})
+            self.session.execute(text(PGVECTOR_UPDATE_SQL), {"embedding": embedding_str, "pk": element_pk})
 
             self.session.commit()
         except Exception as e:
@@ -2300,7 +2584,7 @@ class SQLAlchemyDocumentDatabase(DocumentDatabase):
         try:
             # Start building SQL query
             sql_query = """
-            SELECT e.element_pk, 1 - (em.vector_embedding <=> :query::vector) as similarity
+            SELECT e.element_pk, 1 - (em.vector_embedding <=> CAST(:query AS vector)) as similarity
             FROM embeddings em
             JOIN elements e ON e.element_pk = em.element_pk
             JOIN documents d ON e.doc_id = d.doc_id
@@ -2364,7 +2648,7 @@ class SQLAlchemyDocumentDatabase(DocumentDatabase):
                     sql_query += f" AND {condition}"
 
             # Add ordering and limit
-            sql_query += " ORDER BY em.vector_embedding <=> :query::vector LIMIT :limit"
+            sql_query += " ORDER BY em.vector_embedding <=> CAST(:query AS vector) LIMIT :limit"
             params["limit"] = limit
 
             # Execute query
@@ -2521,7 +2805,7 @@ class SQLAlchemyDocumentDatabase(DocumentDatabase):
                     raise ValueError("Could not initialize embedding generator")
 
                 # Generate embedding for the search text
-                query_embedding = self.embedding_generator.generate(search_text)
+                query_embedding = self._generate_query_embedding(search_text)
 
                 # Use the embedding to search, passing the filter criteria
                 return self.search_by_embedding(query_embedding, limit, filter_criteria)
@@ -2782,6 +3066,7 @@ class SQLAlchemyDocumentDatabase(DocumentDatabase):
 
             # Commit changes
             self.session.commit()
+            self._bump_store_generation(element_pks=[element_pk])
 
             # Handle vector extension specific storage
             if self._vector_extension == "pgvector" and self.db_uri.startswith('postgresql'):
@@ -2828,7 +3113,7 @@ class SQLAlchemyDocumentDatabase(DocumentDatabase):
                     config_obj = config or Config()
                     self.embedding_generator = get_embedding_generator(config_obj)
 
-                query_embedding = self.embedding_generator.generate(search_text)
+                query_embedding = self._generate_query_embedding(search_text)
 
             return self._search_by_text_and_topics_fallback(
                 query_embedding, include_topics, exclude_topics, min_confidence, limit
@@ -2939,6 +3224,9 @@ class SQLAlchemyDocumentDatabase(DocumentDatabase):
         """
         Get statistics about topic distribution across embeddings.
 
+        The statistics are cached and only documents written through this instance
+        since the last call are recomputed.
+
         Returns:
             Dictionary mapping topic strings to statistics
         """
@@ -2946,52 +3234,41 @@ class SQLAlchemyDocumentDatabase(DocumentDatabase):
             raise ValueError("Database not initialized")
 
         try:
-            # Get all embeddings with topics
-            embeddings = self.session.query(Embedding).filter(Embedding.topics.isnot(None)).all()
-
-            topic_stats = {}
-            for embedding_record in embeddings:
-                confidence = embedding_record.confidence
-
-                # Parse topics
-                topics = []
-                if embedding_record.topics:
-                    try:
-                        topics = json.loads(embedding_record.topics)
-                    except (json.JSONDecodeError, TypeError):
-                        topics = []
+            return self._topic_statistics_cache.get(self._load_topic_statistics_rows,
+                                                    self._get_doc_ids_for_element_pks)
 
-                # Get document ID for this element
-                element = self.session.query(Element).filter_by(element_pk=embedding_record.element_pk).first()
-                doc_id = element.doc_id if element else None
+        except Exception as e:
+            logger.error(f"Error getting topic statistics: {str(e)}")
+            return {}
 
-                for topic in topics:
-                    if topic not in topic_stats:
-                        topic_stats[topic] = {
-                            'embedding_count': 0,
-                            'document_ids': set(),
-                            'confidences': []
-                        }
+    def _load_topic_statistics_rows(self, doc_ids: Optional[List[str]]) -> List[Tuple[str, str, int, float]]:
+        """Get (doc_id, topic, embedding count, confidence sum) rows for documents (all when None)."""
+        query = self.session.query(Element.doc_id, Embedding.topics, Embedding.confidence).join(
+            Element, Element.element_pk == Embedding.element_pk
+        ).filter(Embedding.topics.isnot(None))
+        if doc_ids is not None:
+            if not doc_ids:
+                return []
+            query = query.filter(Element.doc_id.in_(doc_ids))
 
-                    topic_stats[topic]['embedding_count'] += 1
-                    topic_stats[topic]['confidences'].append(confidence)
-                    if doc_id:
-                        topic_stats[topic]['document_ids'].add(doc_id)
-
-            # Calculate final statistics
-            final_stats = {}
-            for topic, stats in topic_stats.items():
-                final_stats[topic] = {
-                    'embedding_count': stats['embedding_count'],
-                    'document_count': len(stats['document_ids']),
-                    'avg_embedding_confidence': sum(stats['confidences']) / len(stats['confidences'])
-                }
+        totals: Dict[Tuple[str, str], List[float]] = {}
+        for doc_id, topics_json, confidence in query.all():
+            try:
+                topics = json.loads(topics_json) if topics_json else []
+            except (json.JSONDecodeError, TypeError):
+                topics = []
+            for topic in topics:
+                total = totals.setdefault((doc_id, topic), [0, 0.0])
+                total[0] += 1
+                total[1] += confidence if confidence is not None else 0.0
 
-            return final_stats
+        return [(doc_id, topic, int(count), confidence_sum)
+                for (doc_id, topic), (count, confidence_sum) in totals.items()]
 
-        except Exception as e:
-            logger.error(f"Error getting topic statistics: {str(e)}")
-            return {}
+    def _get_doc_ids_for_element_pks(self, element_pks: List[int]) -> List[str]:
+        """Get the distinct doc_ids of elements."""
+        query = self.session.query(Element.doc_id).filter(Element.element_pk.in_(element_pks)).distinct()
+        return [row[0] for row in query.all()]
 
     def get_embedding_topics(self, element_pk: Union[int, str]) -> List[str]:
         """
@@ -3046,13 +3323,16 @@ class SQLAlchemyDocumentDatabase(DocumentDatabase):
         # Final result structure
         result_tree: List[ElementHierarchical] = []
 
+        # Fetch the ancestry paths of all results at once
+        ancestries = self.get_element_ancestries([element_pk for element_pk, _ in elements])
+
         # Process each element from the search results
         for element_pk, score in elements:
             if element_pk in processed_elements:
                 continue
 
             # Find the complete ancestry path for this element
-            ancestry_path = self._get_element_ancestry_path(element_pk)
+            ancestry_path = ancestries.get(element_pk)
 
             if not ancestry_path:
                 continue
@@ -3089,65 +3369,6 @@ class SQLAlchemyDocumentDatabase(DocumentDatabase):
 
         return result_tree
 
-    def _get_element_ancestry_path(self, element_pk: int) -> List[ElementBase]:
-        """
-        Get the complete ancestry path for an element, from root to the element itself.
-
-        Uses parent_id to find parents instead of relationships.
-        """
-        # Get the element
-        element_dict = self.get_element(element_pk)
-        if not element_dict:
-            return []
-
-        # Convert to ElementBase instance
-        element = ElementBase(**element_dict)
-
-        # Start building the ancestry path with the element itself
-        ancestry = [element]
-
-        # Track to avoid circular references
-        visited = {element_pk}
-
-        # Current element to process
-        current_pk = element_pk
-
-        # Traverse up the hierarchy using parent_id
-        while True:
-            # Get the current element
-            current_element = self.get_element(current_pk)
-            if not current_element:
-                break
-
-            # Get parent ID
-            parent_id = current_element.get('parent_id')
-            if not parent_id:
-                break
-
-            # Get the parent element
-            parent_dict = self.get_element(parent_id)
-            if not parent_dict:
-                break
-
-            # Check for circular references
-            parent_pk = parent_dict.get('id') or parent_dict.get('pk') or parent_dict.get('element_id')
-            if parent_pk in visited:
-                break
-
-            # Convert to ElementBase
-            parent = ElementBase(**parent_dict)
-
-            # Add to visited set
-            visited.add(parent_pk)
-
-            # Add parent to the beginning of the ancestry list (root first)
-            ancestry.insert(0, parent)
-
-            # Move up to the parent
-            current_pk = parent_id
-
-        return ancestry
-
     # ========================================
     # UTILITY METHODS
     # ========================================
@@ -7,11 +7,15 @@ It leverages SQLite's JSON functions, custom similarity functions, and advanced
 SQL queries to provide comprehensive search functionality.
 """
 
+import functools
 import json
 import logging
 import os
+import re
+import struct
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List, Tuple, Union, TYPE_CHECKING
+from urllib.request import pathname2url
+from typing import Callable, Hashable, Optional, Dict, Any, List, Set, Tuple, Union, TYPE_CHECKING
 
 import time
 
@@ -38,17 +42,51 @@ else:
 from .base import DocumentDatabase
 from .element_relationship import ElementRelationship
 from .element_element import ElementType  # Import existing enum
+from .embedding_matrix import EmbeddingMatrix, pack_embedding, unpack_embedding
+from .search_cache import TopicStatisticsCache
+from .sqlite_pool import SQLiteConnectionPool
 
 # Import structured search components
 from .structured_search import (
     StructuredSearchQuery, SearchCriteriaGroup, BackendCapabilities, SearchCapability,
     UnsupportedSearchError, TextSearchCriteria, EmbeddingSearchCriteria, DateSearchCriteria,
     TopicSearchCriteria, MetadataSearchCriteria, ElementSearchCriteria,
-    LogicalOperator, DateRangeOperator, SimilarityOperator
+    LogicalOperator, DateRangeOperator, SimilarityOperator,
+    QueryPlan, QueryPlanner, PlanStep, execute_plan
 )
 
 logger = logging.getLogger(__name__)
 
+# Name of the sqlite-vec index table that mirrors the embeddings table
+VECTOR_INDEX_TABLE = "element_vectors"
+# sqlite-vec caps k for KNN queries; larger limits use the similarity function
+VECTOR_INDEX_MAX_K = 4096
+
+# Name of the FTS5 table indexing element content_preview and full_content
+FULL_TEXT_INDEX_TABLE = "element_fts"
+# bm25() column weights for content_preview and full_content
+FULL_TEXT_COLUMN_WEIGHTS = (2.0, 1.0)
+# Number of keyword candidates passed to the vector search by full_text_prefilter
+FULL_TEXT_PREFILTER_LIMIT = 1000
+
+# Insert statement for one element_dates row, see _element_date_row
+ELEMENT_DATES_INSERT_SQL = """
+    INSERT OR REPLACE INTO element_dates
+    (element_pk, original_text, iso_string, timestamp_value,
+     year_value, month_value, day_value, hour_value, minute_value, second_value,
+     start_position, end_position, context,
+     decade_value, century_value, quarter_value, season_value, day_of_week_value,
+     day_of_year_value, week_of_year_value, is_weekend, is_holiday_season,
+     fiscal_quarter_value, fiscal_year_value, academic_semester_value, academic_year_value,
+     time_of_day_value, is_business_hours,
+     is_relative, is_partial, date_type, relative_reference, specificity_level,
+     date_format_detected, locale_hint, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+            ?, ?, ?, ?, ?, ?, ?, ?, ?,
+            ?, ?, ?, ?, ?, ?,
+            ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 # Define global flags for availability - these will be set at runtime
 SQLITE3_AVAILABLE = False
 SQLITE_SQLEAN_AVAILABLE = False
@@ -109,22 +147,64 @@ except ImportError:
     logger.warning("NumPy not available. Fallback vector operations will be used.")
 
 
+def _write_operation(method: Callable) -> Callable:
+    """Run a method with the writer connection held by the calling thread."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._pool is None:
+            return method(self, *args, **kwargs)
+        with self._pool.writing():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _read_operation(method: Callable) -> Callable:
+    """Run a method with a read connection checked out for the calling thread until it returns."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._pool is None:
+            return method(self, *args, **kwargs)
+        with self._pool.reading():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class SQLiteDocumentDatabase(DocumentDatabase):
     """SQLite implementation of document database with comprehensive structured search support."""
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, read_pool_size: int = 4, busy_timeout: float = 5.0,
+                 read_pool_timeout: Optional[float] = 30.0, **conn_params):
         """
         Initialize SQLite document database.
 
         Args:
             db_path: Path to SQLite database file
+            read_pool_size: Maximum number of read-only connections used by other threads
+                (0 shares the writer connection across all threads)
+            busy_timeout: Seconds a connection waits on a locked database
+            read_pool_timeout: Seconds a thread waits for a free read connection
+            **conn_params: Full-text options (store_full_text, index_full_text,
+                full_text_max_length) and full_text_tokenizer for the FTS5 index
+                (default: 'porter unicode61')
         """
         if not SQLITE3_AVAILABLE and not SQLITE_SQLEAN_AVAILABLE:
             raise ImportError("Neither sqlite3 nor sqlean is available")
 
+        super().__init__(conn_params)
+        self.full_text_tokenizer = conn_params.get('full_text_tokenizer', 'porter unicode61')
+        self.full_text_index_enabled = False
+
         self.db_path = db_path
-        self.conn: SQLiteConnectionType = None
+        self.read_pool_size = read_pool_size
+        self.busy_timeout = busy_timeout
+        self.read_pool_timeout = read_pool_timeout
+        self._pool: Optional[SQLiteConnectionPool] = None
         self.vector_extension = None
+        self.vector_index_dimension = None
+        self.embedding_matrix: Optional[EmbeddingMatrix] = None
+        self._embedding_matrix_version = None
+        self._topic_statistics_cache = TopicStatisticsCache()
+        self._topic_statistics_version = None
         self.embedding_generator = None
         self.vector_dimension = config.config.get('embedding', {}).get('dimensions', 384) if config else 384
 
@@ -140,7 +220,6 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             # Core search types
             SearchCapability.TEXT_SIMILARITY,
             SearchCapability.EMBEDDING_SIMILARITY,
-            # SearchCapability.FULL_TEXT_SEARCH,  # Would need FTS extension
 
             # Date capabilities
             SearchCapability.DATE_FILTERING,
@@ -187,8 +266,13 @@ class SQLiteDocumentDatabase(DocumentDatabase):
         if self.vector_extension:
             supported.add(SearchCapability.VECTOR_SEARCH)
 
+        # FTS5 index with BM25 ranking, when this SQLite build includes FTS5
+        if self.full_text_index_enabled:
+            supported.add(SearchCapability.FULL_TEXT_SEARCH)
+
         return BackendCapabilities(supported)
 
+    @_read_operation
     def execute_structured_search(self, query: StructuredSearchQuery) -> List[Dict[str, Any]]:
         """
         Execute a structured search query using SQLite's capabilities.
@@ -202,8 +286,9 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             raise UnsupportedSearchError(missing)
 
         try:
-            # Execute the root criteria group
-            raw_results = self._execute_criteria_group(query.criteria_group)
+            # Plan and execute the root criteria group
+            plan = self._plan_structured_search(query)
+            raw_results = execute_plan(plan, self._execute_plan_step, self._combine_results)
 
             # Process and enrich results
             final_results = self._process_search_results(raw_results, query)
@@ -218,68 +303,126 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             logger.error(f"Error executing structured search: {str(e)}")
             return []
 
-    def _execute_criteria_group(self, group: SearchCriteriaGroup) -> List[Dict[str, Any]]:
-        """Execute a single criteria group and return scored results."""
+    @_read_operation
+    def explain_structured_search(self, query: StructuredSearchQuery, analyze: bool = False) -> str:
+        """
+        Show the plan chosen for a structured search query.
 
-        # Collect results from all criteria in this group
-        all_results = []
+        Args:
+            query: Structured search query
+            analyze: Execute the plan and include actual rows and timings
+
+        Returns:
+            EXPLAIN-style plan text
+        """
+        if not self.conn:
+            raise ValueError("Database not initialized")
 
-        # Execute individual criteria
-        if group.text_criteria:
-            text_results = self._execute_text_criteria(group.text_criteria)
-            all_results.append(("text", text_results))
+        plan = self._plan_structured_search(query)
+        if analyze:
+            execute_plan(plan, self._execute_plan_step, self._combine_results)
+        return plan.explain()
 
-        if group.embedding_criteria:
-            embedding_results = self._execute_embedding_criteria(group.embedding_criteria)
-            all_results.append(("embedding", embedding_results))
+    def _plan_structured_search(self, query: StructuredSearchQuery) -> QueryPlan:
+        """Plan the root group of a query; only offset + limit rows are needed from it."""
+        planner = QueryPlanner(self._estimate_criteria_rows)
+        return planner.plan(query.criteria_group, limit=(query.offset or 0) + query.limit)
 
-        if group.date_criteria:
-            date_results = self._execute_date_criteria(group.date_criteria)
-            all_results.append(("date", date_results))
+    def _execute_criteria_group(self, group: SearchCriteriaGroup) -> List[Dict[str, Any]]:
+        """Execute a single criteria group and return scored results."""
+        plan = QueryPlanner(self._estimate_criteria_rows).plan(group)
+        return execute_plan(plan, self._execute_plan_step, self._combine_results)
+
+    def _execute_plan_step(self, step: PlanStep, candidates: Optional[Set[int]]) -> List[Dict[str, Any]]:
+        """Execute one planned criterion, restricted to candidate element_pks when given."""
+        executors = {
+            "text": self._execute_text_criteria,
+            "embedding": self._execute_embedding_criteria,
+            "date": self._execute_date_criteria,
+            "topic": self._execute_topic_criteria,
+            "metadata": self._execute_metadata_criteria,
+            "element": self._execute_element_criteria,
+        }
+        return executors[step.kind](step.criteria, candidates=candidates, limit=step.limit)
 
-        if group.topic_criteria:
-            topic_results = self._execute_topic_criteria(group.topic_criteria)
-            all_results.append(("topic", topic_results))
+    def _estimate_criteria_rows(self, kind: str, criteria: Any) -> Optional[int]:
+        """Estimate the rows a criterion matches from indexed counts (None when unknown)."""
+        if kind in ("text", "embedding"):
+            return self._count_embeddings()
 
-        if group.metadata_criteria:
-            metadata_results = self._execute_metadata_criteria(group.metadata_criteria)
-            all_results.append(("metadata", metadata_results))
+        if kind == "element":
+            if criteria.doc_ids:
+                placeholders = ', '.join(['?'] * len(criteria.doc_ids))
+                return self.conn.execute(
+                    f"SELECT COUNT(*) FROM elements WHERE doc_id IN ({placeholders})", criteria.doc_ids
+                ).fetchone()[0]
+            type_values = self._prepare_element_type_query(criteria.element_types)
+            if type_values:
+                placeholders = ', '.join(['?'] * len(type_values))
+                return self.conn.execute(
+                    f"SELECT COUNT(*) FROM elements WHERE element_type IN ({placeholders})", type_values
+                ).fetchone()[0]
 
-        if group.element_criteria:
-            element_results = self._execute_element_criteria(group.element_criteria)
-            all_results.append(("element", element_results))
+        return None
 
-        # Execute sub-groups recursively
-        for sub_group in group.sub_groups:
-            sub_results = self._execute_criteria_group(sub_group)
-            all_results.append(("subgroup", sub_results))
+    def _count_embeddings(self) -> int:
+        """Get the number of stored embeddings."""
+        if self.embedding_matrix is not None:
+            return len(self.embedding_matrix)
+        return self.conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
 
-        # Combine results based on the group's logical operator
-        return self._combine_results(all_results, group.operator)
+    @staticmethod
+    def _candidate_condition(candidates: Optional[Set[int]], column: str = "element_pk") -> Tuple[str, List[Any]]:
+        """SQL condition restricting a column to candidate element_pks (empty when unrestricted)."""
+        if candidates is None:
+            return "", []
+        return f" AND {column} IN (SELECT value FROM json_each(?))", [json.dumps(list(candidates))]
+
+    def _execute_text_criteria(self, criteria: TextSearchCriteria, candidates: Optional[Set[int]] = None,
+                               limit: Optional[int] = 1000) -> List[Dict[str, Any]]:
+        """
+        Execute text search using the FTS5 index or embedding similarity.
 
-    def _execute_text_criteria(self, criteria: TextSearchCriteria) -> List[Dict[str, Any]]:
-        """Execute text similarity search using embeddings."""
+        use_full_text_search ranks keyword matches by BM25 only. full_text_prefilter
+        runs the embedding search over the elements matching any query term, so
+        both scores are returned for each result.
+        """
         try:
+            limit = limit or self._count_embeddings()
+            if criteria.use_full_text_search and self.full_text_index_enabled:
+                return self._execute_full_text_criteria(criteria, candidates, limit)
+
+            keyword_scores: Dict[int, float] = {}
+            if criteria.full_text_prefilter and self.full_text_index_enabled:
+                keyword_scores = dict(self.search_by_full_text(
+                    criteria.query_text, limit=FULL_TEXT_PREFILTER_LIMIT, match_any=True, element_pks=candidates
+                ))
+                candidates = set(keyword_scores)
+
+            filter_criteria = None
+            if candidates is not None:
+                if not candidates:
+                    return []
+                filter_criteria = {'element_pk_list': list(candidates)}
+
             # Generate embedding for the query text
             query_embedding = self._generate_embedding(criteria.query_text)
 
             # Perform similarity search
             similarity_results = self.search_by_embedding(
                 query_embedding,
-                limit=1000,  # Get many results for filtering
-                filter_criteria=None
+                limit=limit,
+                filter_criteria=filter_criteria
             )
 
             # Filter by similarity threshold and operator
             filtered_results = []
             for element_pk, similarity in similarity_results:
                 if self._compare_similarity(similarity, criteria.similarity_threshold, criteria.similarity_operator):
-                    filtered_results.append({
-                        'element_pk': element_pk,
-                        'scores': {
-                            'text_similarity': similarity * criteria.boost_factor
-                        }
-                    })
+                    scores = {'text_similarity': similarity * criteria.boost_factor}
+                    if element_pk in keyword_scores:
+                        scores['full_text_rank'] = keyword_scores[element_pk] * criteria.boost_factor
+                    filtered_results.append({'element_pk': element_pk, 'scores': scores})
 
             return filtered_results
 
@@ -287,13 +430,35 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             logger.error(f"Error executing text criteria: {str(e)}")
             return []
 
-    def _execute_embedding_criteria(self, criteria: EmbeddingSearchCriteria) -> List[Dict[str, Any]]:
+    def _execute_full_text_criteria(self, criteria: TextSearchCriteria, candidates: Optional[Set[int]] = None,
+                                    limit: int = 1000) -> List[Dict[str, Any]]:
+        """
+        Execute keyword search on the FTS5 index, scored by normalized BM25.
+
+        Every keyword match is returned: BM25 is relative to the result set, so
+        the similarity threshold (meant for embedding similarity) is not applied.
+        """
+        return [
+            {
+                'element_pk': element_pk,
+                'scores': {
+                    'full_text_rank': rank * criteria.boost_factor
+                }
+            }
+            for element_pk, rank in self.search_by_full_text(criteria.query_text, limit=limit, element_pks=candidates)
+        ]
+
+    def _execute_embedding_criteria(self, criteria: EmbeddingSearchCriteria, candidates: Optional[Set[int]] = None,
+                                    limit: Optional[int] = 1000) -> List[Dict[str, Any]]:
         """Execute direct embedding vector search."""
         try:
+            if candidates is not None and not candidates:
+                return []
+
             similarity_results = self.search_by_embedding(
                 criteria.embedding_vector,
-                limit=1000,
-                filter_criteria=None
+                limit=limit or self._count_embeddings(),
+                filter_criteria={'element_pk_list': list(candidates)} if candidates else None
             )
 
             filtered_results = []
@@ -312,7 +477,8 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             logger.error(f"Error executing embedding criteria: {str(e)}")
             return []
 
-    def _execute_date_criteria(self, criteria: DateSearchCriteria) -> List[Dict[str, Any]]:
+    def _execute_date_criteria(self, criteria: DateSearchCriteria, candidates: Optional[Set[int]] = None,
+                               limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """Execute date-based filtering using SQLite date functions."""
         try:
             # Build date filter based on operator
@@ -367,6 +533,11 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             if criteria.specificity_levels:
                 element_pks = self._filter_by_specificity(element_pks, criteria.specificity_levels)
 
+            if candidates is not None:
+                element_pks = [element_pk for element_pk in element_pks if element_pk in candidates]
+            if limit is not None:
+                element_pks = element_pks[:limit]
+
             # Convert to result format
             results = []
             for element_pk in element_pks:
@@ -383,16 +554,22 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             logger.error(f"Error executing date criteria: {str(e)}")
             return []
 
-    def _execute_topic_criteria(self, criteria: TopicSearchCriteria) -> List[Dict[str, Any]]:
+    def _execute_topic_criteria(self, criteria: TopicSearchCriteria, candidates: Optional[Set[int]] = None,
+                                limit: Optional[int] = 1000) -> List[Dict[str, Any]]:
         """Execute topic-based filtering using SQLite JSON functions."""
         try:
+            # Candidates are applied after the topic match, so it must not be truncated first
             topic_results = self.search_by_text_and_topics(
                 search_text=None,
                 include_topics=criteria.include_topics,
                 exclude_topics=criteria.exclude_topics,
                 min_confidence=criteria.min_confidence,
-                limit=1000
+                limit=self._count_embeddings() if candidates is not None or limit is None else limit
             )
+            if candidates is not None:
+                topic_results = [result for result in topic_results if result['element_pk'] in candidates]
+            if limit is not None:
+                topic_results = topic_results[:limit]
 
             results = []
             for result in topic_results:
@@ -409,7 +586,8 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             logger.error(f"Error executing topic criteria: {str(e)}")
             return []
 
-    def _execute_metadata_criteria(self, criteria: MetadataSearchCriteria) -> List[Dict[str, Any]]:
+    def _execute_metadata_criteria(self, criteria: MetadataSearchCriteria, candidates: Optional[Set[int]] = None,
+                                   limit: Optional[int] = 1000) -> List[Dict[str, Any]]:
         """Execute metadata-based filtering using SQLite JSON functions."""
         try:
             # Build SQL query for metadata filtering
@@ -446,7 +624,13 @@ class SQLiteDocumentDatabase(DocumentDatabase):
                 sql += " AND JSON_EXTRACT(metadata, ?) IS NOT NULL"
                 params.append(f'$.{key}')
 
-            sql += " LIMIT 1000"
+            condition, condition_params = self._candidate_condition(candidates)
+            sql += condition
+            params.extend(condition_params)
+
+            if limit is not None:
+                sql += " LIMIT ?"
+                params.append(limit)
 
             cursor = self.conn.execute(sql, params)
             element_pks = [row[0] for row in cursor.fetchall()]
@@ -466,7 +650,8 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             logger.error(f"Error executing metadata criteria: {str(e)}")
             return []
 
-    def _execute_element_criteria(self, criteria: ElementSearchCriteria) -> List[Dict[str, Any]]:
+    def _execute_element_criteria(self, criteria: ElementSearchCriteria, candidates: Optional[Set[int]] = None,
+                                  limit: Optional[int] = 1000) -> List[Dict[str, Any]]:
         """Execute element-based filtering using SQLite."""
         try:
             # Build SQL query for element filtering
@@ -511,7 +696,13 @@ class SQLiteDocumentDatabase(DocumentDatabase):
                 sql += f" AND parent_id IN ({placeholders})"
                 params.extend(criteria.parent_element_ids)
 
-            sql += " LIMIT 1000"
+            condition, condition_params = self._candidate_condition(candidates)
+            sql += condition
+            params.extend(condition_params)
+
+            if limit is not None:
+                sql += " LIMIT ?"
+                params.append(limit)
 
             cursor = self.conn.execute(sql, params)
             element_pks = [row[0] for row in cursor.fetchall()]
@@ -543,41 +734,31 @@ class SQLiteDocumentDatabase(DocumentDatabase):
         # Create directory if it doesn't exist
         os.makedirs(os.path.dirname(self.db_path) if os.path.dirname(self.db_path) else '.', exist_ok=True)
 
-        # Connect to database
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.row_factory = sqlite3.Row
+        # Connect to database; the writer is used by this thread and for all writes
+        self.close()
+        self._pool = SQLiteConnectionPool(self._open_connection, self.read_pool_size, self.read_pool_timeout)
 
-        # Enable foreign key constraints
-        self.conn.execute("PRAGMA foreign_keys = ON")
-        
         # Enable WAL mode for better concurrency and performance
         # WAL mode allows readers and writers to operate concurrently
         # and provides better crash recovery
         try:
-            self.conn.execute("PRAGMA journal_mode = WAL")
+            journal_mode = self.conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
             # Set WAL checkpoint interval (default is 1000 pages)
             self.conn.execute("PRAGMA wal_autocheckpoint = 1000")
             
-            # Additional optimizations for better performance
-            # Increase cache size (negative value = KB, positive = pages)
-            # Default is -2000 (2MB), we set to -8000 (8MB)
-            self.conn.execute("PRAGMA cache_size = -8000")
-            
-            # Use memory for temp storage (faster than disk)
-            self.conn.execute("PRAGMA temp_store = MEMORY")
-            
             # Synchronous mode NORMAL is safe with WAL mode and faster than FULL
             self.conn.execute("PRAGMA synchronous = NORMAL")
             
-            # Increase mmap size for better performance with large databases
-            # 268435456 = 256MB
-            self.conn.execute("PRAGMA mmap_size = 268435456")
-            
             logger.info("SQLite WAL mode and performance optimizations enabled")
         except sqlite3.OperationalError as e:
             # WAL mode might not be available in some environments (e.g., network filesystems)
+            journal_mode = None
             logger.warning(f"Could not enable WAL mode: {e}. Using default journal mode.")
 
+        # Read-only connections only run alongside the writer in WAL mode
+        if str(journal_mode).lower() != 'wal':
+            self._pool.disable_readers()
+
         # Check if extension loading is supported
         auto_discover = config.config.get("storage", {}).get("sqlite_extensions", {}).get("auto_discover",
                                                                                           True) if config else True
@@ -601,8 +782,73 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             logger.info("Using native vector search implementation (no extensions)")
 
         self._create_tables()
+        self._migrate_embedding_storage()
+        self._setup_vector_index()
+        self._setup_full_text_index()
         logger.info(f"Initialized SQLite database at {self.db_path}")
 
+    @property
+    def conn(self) -> Optional[SQLiteConnectionType]:
+        """
+        Get the connection for the calling thread.
+
+        The thread that initialized the database, and any thread running a write
+        method, gets the writer. Other threads get a read-only WAL connection from
+        the pool, so searches run concurrently with writes.
+        """
+        return self._pool.connection() if self._pool else None
+
+    def _open_connection(self, read_only: bool) -> SQLiteConnectionType:
+        """Open a writer or read-only connection with the shared settings."""
+        if read_only:
+            uri = f"file:{pathname2url(os.path.abspath(self.db_path))}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, timeout=self.busy_timeout, check_same_thread=False)
+            conn.execute("PRAGMA query_only = ON")
+        else:
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout * 1000)}")
+        # Enable foreign key constraints
+        conn.execute("PRAGMA foreign_keys = ON")
+        # Increase cache size (negative value = KB, positive = pages)
+        # Default is -2000 (2MB), we set to -8000 (8MB)
+        conn.execute("PRAGMA cache_size = -8000")
+        # Use memory for temp storage (faster than disk)
+        conn.execute("PRAGMA temp_store = MEMORY")
+        # Increase mmap size for better performance with large databases
+        # 268435456 = 256MB
+        conn.execute("PRAGMA mmap_size = 268435456")
+
+        if read_only and self.vector_extension:
+            self._load_vector_extension(conn)
+        return conn
+
+    def _load_vector_extension(self, conn: SQLiteConnectionType) -> None:
+        """Load the extension chosen by the writer into a read connection."""
+        try:
+            conn.enable_load_extension(True)
+            if self.vector_extension == "vec0":
+                sqlite_vec.load(conn)
+            elif self.vector_extension == "vss0":
+                sqlite_vss.load(conn)
+        except Exception as e:
+            logger.warning(f"Could not load {self.vector_extension} into read connection: {str(e)}")
+        finally:
+            try:
+                conn.enable_load_extension(False)
+            except Exception:
+                pass
+
+    def release_connection(self) -> None:
+        """Return a read connection the calling thread took outside a read method to the pool."""
+        if self._pool:
+            self._pool.release()
+
+    def get_connection_statistics(self) -> Dict[str, Any]:
+        """Get read pool and writer lock wait metrics."""
+        return self._pool.get_statistics() if self._pool else {}
+
     def _load_vector_extensions(self):
         """Load available vector search extensions."""
         try:
@@ -638,7 +884,293 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             except Exception:
                 pass
 
+    def _setup_vector_index(self) -> None:
+        """
+        Create and synchronize the sqlite-vec index that mirrors the embeddings table.
+
+        The vec0 table is maintained by triggers on ``embeddings``, so every write path
+        (store_embedding, store_embedding_with_topics and cascading deletes) keeps it
+        current. Writing through those triggers requires the extension, so they are
+        dropped when vec0 is not loaded and the index is rebuilt the next time it is.
+        """
+        if self.vector_extension != "vec0":
+            self._drop_vector_index_triggers()
+            self.vector_index_dimension = None
+            return
+
+        dimension = int(self.vector_dimension)
+
+        try:
+            existing_dimension = self._get_vector_index_dimension()
+            if existing_dimension is not None and existing_dimension != dimension:
+                logger.info(f"Vector index dimension changed from {existing_dimension} to {dimension}, recreating")
+                self._drop_vector_index_triggers()
+                self.conn.execute(f"DROP TABLE {VECTOR_INDEX_TABLE}")
+                existing_dimension = None
+
+            if existing_dimension is None:
+                self.conn.execute(f"""
+                CREATE VIRTUAL TABLE {VECTOR_INDEX_TABLE} USING vec0(
+                    element_pk INTEGER PRIMARY KEY,
+                    embedding float[{dimension}] distance_metric=cosine,
+                    element_type TEXT,
+                    doc_id TEXT
+                )
+                """)
+
+            # Triggers embed the dimension, so always recreate them
+            self._drop_vector_index_triggers()
+            self.conn.execute(f"""
+            CREATE TRIGGER embeddings_vector_index_insert AFTER INSERT ON embeddings
+            BEGIN
+                DELETE FROM {VECTOR_INDEX_TABLE} WHERE element_pk = NEW.element_pk;
+                INSERT INTO {VECTOR_INDEX_TABLE} (element_pk, embedding, element_type, doc_id)
+                SELECT NEW.element_pk, NEW.embedding, COALESCE(e.element_type, ''), COALESCE(e.doc_id, '')
+                FROM elements e
+                WHERE e.element_pk = NEW.element_pk AND NEW.dimensions = {dimension};
+            END
+            """)
+            self.conn.execute(f"""
+            CREATE TRIGGER embeddings_vector_index_delete AFTER DELETE ON embeddings
+            BEGIN
+                DELETE FROM {VECTOR_INDEX_TABLE} WHERE element_pk = OLD.element_pk;
+            END
+            """)
+
+            # Rebuild when the index has drifted (new index, or writes made without vec0)
+            indexed = self.conn.execute(f"SELECT COUNT(*) FROM {VECTOR_INDEX_TABLE}").fetchone()[0]
+            expected = self.conn.execute(
+                "SELECT COUNT(*) FROM embeddings WHERE dimensions = ?", (dimension,)
+            ).fetchone()[0]
+            if indexed != expected:
+                logger.info(f"Rebuilding vector index ({indexed} indexed, {expected} embeddings)")
+                self.conn.execute(f"DELETE FROM {VECTOR_INDEX_TABLE}")
+                self.conn.execute(f"""
+                INSERT INTO {VECTOR_INDEX_TABLE} (element_pk, embedding, element_type, doc_id)
+                SELECT em.element_pk, em.embedding, COALESCE(e.element_type, ''), COALESCE(e.doc_id, '')
+                FROM embeddings em
+                JOIN elements e ON e.element_pk = em.element_pk
+                WHERE em.dimensions = ?
+                """, (dimension,))
+
+            self.conn.commit()
+            self.vector_index_dimension = dimension
+            logger.info(f"SQLite vector index ready ({dimension} dimensions)")
+        except Exception as e:
+            self.conn.rollback()
+            self._drop_vector_index_triggers()
+            self.vector_index_dimension = None
+            logger.warning(f"Could not set up vector index: {str(e)}. Using similarity function search.")
+
+    def _setup_full_text_index(self) -> None:
+        """
+        Create and synchronize the FTS5 index over element content.
+
+        Triggers on ``elements`` keep the index current for inserts, updates and
+        (cascading) deletes. The index is an external-content table over ``elements``,
+        so the text is not stored twice. Full text that is indexed but not stored
+        (index_full_text set, store_full_text False) cannot be read back from
+        ``elements``, which external-content deletes need, so in that mode the index
+        is a regular FTS5 table. Such full text is written to the index by the insert
+        paths instead of the trigger, and cannot be restored by a rebuild.
+        """
+        index_only = self.index_full_text and not self.store_full_text
+        new_full_content = "NEW.full_content" if self.index_full_text else "NULL"
+        old_full_content = "OLD.full_content" if self.index_full_text else "NULL"
+        content = "" if index_only else "content = 'elements', content_rowid = 'element_pk',"
+
+        try:
+            columns = [row[1] for row in self.conn.execute("PRAGMA table_info(elements)")]
+            if 'full_content' not in columns:
+                self.conn.execute("ALTER TABLE elements ADD COLUMN full_content TEXT")
+
+            # Recreate the index when the storage settings changed its layout
+            row = self.conn.execute(
+                "SELECT sql FROM sqlite_master WHERE name = ?", (FULL_TEXT_INDEX_TABLE,)
+            ).fetchone()
+            if row and ("content = 'elements'" in row[0]) == index_only:
+                self.conn.execute(f"DROP TABLE {FULL_TEXT_INDEX_TABLE}")
+
+            self.conn.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {FULL_TEXT_INDEX_TABLE} USING fts5(
+                content_preview,
+                full_content,
+                {content}
+                tokenize = '{self.full_text_tokenizer}'
+            )
+            """)
+
+            # Triggers embed the full-text settings, so always recreate them
+            self._drop_full_text_index_triggers()
+            self.conn.execute(f"""
+            CREATE TRIGGER elements_full_text_insert AFTER INSERT ON elements
+            BEGIN
+                INSERT INTO {FULL_TEXT_INDEX_TABLE} (rowid, content_preview, full_content)
+                VALUES (NEW.element_pk, NEW.content_preview, {new_full_content});
+            END
+            """)
+            if index_only:
+                # full_content is never stored in this mode: keep what the insert path indexed
+                self.conn.execute(f"""
+                CREATE TRIGGER elements_full_text_update AFTER UPDATE OF content_preview, full_content ON elements
+                BEGIN
+                    UPDATE {FULL_TEXT_INDEX_TABLE}
+                    SET content_preview = NEW.content_preview,
+                        full_content = COALESCE(NEW.full_content, full_content)
+                    WHERE rowid = NEW.element_pk;
+                END
+                """)
+                self.conn.execute(f"""
+                CREATE TRIGGER elements_full_text_delete AFTER DELETE ON elements
+                BEGIN
+                    DELETE FROM {FULL_TEXT_INDEX_TABLE} WHERE rowid = OLD.element_pk;
+                END
+                """)
+            else:
+                # External-content rows are removed by passing the indexed values to 'delete'
+                self.conn.execute(f"""
+                CREATE TRIGGER elements_full_text_update AFTER UPDATE OF content_preview, full_content ON elements
+                BEGIN
+                    INSERT INTO {FULL_TEXT_INDEX_TABLE} ({FULL_TEXT_INDEX_TABLE}, rowid, content_preview, full_content)
+                    VALUES ('delete', OLD.element_pk, OLD.content_preview, {old_full_content});
+                    INSERT INTO {FULL_TEXT_INDEX_TABLE} (rowid, content_preview, full_content)
+                    VALUES (NEW.element_pk, NEW.content_preview, {new_full_content});
+                END
+                """)
+                self.conn.execute(f"""
+                CREATE TRIGGER elements_full_text_delete AFTER DELETE ON elements
+                BEGIN
+                    INSERT INTO {FULL_TEXT_INDEX_TABLE} ({FULL_TEXT_INDEX_TABLE}, rowid, content_preview, full_content)
+                    VALUES ('delete', OLD.element_pk, OLD.content_preview, {old_full_content});
+                END
+                """)
+
+            # Rebuild when the index has drifted (new index, or an older database). The
+            # docsize shadow table has a row per indexed element in both layouts.
+            indexed = self.conn.execute(f"SELECT COUNT(*) FROM {FULL_TEXT_INDEX_TABLE}_docsize").fetchone()[0]
+            expected = self.conn.execute("SELECT COUNT(*) FROM elements").fetchone()[0]
+            if indexed != expected:
+                logger.info(f"Rebuilding full-text index ({indexed} indexed, {expected} elements)")
+                if index_only:
+                    self.conn.execute(f"DELETE FROM {FULL_TEXT_INDEX_TABLE}")
+                else:
+                    self.conn.execute(f"INSERT INTO {FULL_TEXT_INDEX_TABLE} ({FULL_TEXT_INDEX_TABLE}) VALUES ('delete-all')")
+                self.conn.execute(f"""
+                INSERT INTO {FULL_TEXT_INDEX_TABLE} (rowid, content_preview, full_content)
+                SELECT element_pk, content_preview, {new_full_content.replace('NEW.', '')} FROM elements
+                """)
+
+            self.conn.commit()
+            self.full_text_index_enabled = True
+            logger.info("SQLite FTS5 full-text index ready")
+        except sqlite3.OperationalError as e:
+            self.conn.rollback()
+            self._drop_full_text_index_triggers()
+            self.full_text_index_enabled = False
+            logger.warning(f"Could not set up FTS5 full-text index: {str(e)}. Using LIKE content search.")
+
+    def _drop_full_text_index_triggers(self) -> None:
+        """Drop the triggers that maintain the FTS5 index."""
+        for trigger in ("elements_full_text_insert", "elements_full_text_update", "elements_full_text_delete"):
+            self.conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+
+    def _index_unstored_full_text(self, elements: List[Dict[str, Any]]) -> None:
+        """Write full text that is indexed but not stored directly to the FTS5 index."""
+        if not (self.full_text_index_enabled and self.index_full_text) or self.store_full_text:
+            return
+
+        rows = []
+        for element in elements:
+            full_content = self._element_full_text(element)
+            if full_content:
+                rows.append((full_content, element["element_pk"]))
+        if rows:
+            self.conn.executemany(
+                f"UPDATE {FULL_TEXT_INDEX_TABLE} SET full_content = ? WHERE rowid = ?", rows
+            )
+
+    def _element_full_text(self, element: Dict[str, Any]) -> Optional[str]:
+        """Get an element's full_content, truncated to full_text_max_length."""
+        full_content = element.get("full_content")
+        if not full_content:
+            return None
+        if self.full_text_max_length and len(full_content) > self.full_text_max_length:
+            full_content = full_content[:self.full_text_max_length]
+        return full_content
+
+    @staticmethod
+    def _full_text_query(search_text: str, match_any: bool = False) -> Optional[str]:
+        """Build an FTS5 MATCH expression from free text, quoting every term."""
+        terms = re.findall(r"\w+", search_text)
+        if not terms:
+            return None
+        return (" OR " if match_any else " AND ").join(f'"{term}"' for term in terms)
+
+    @_read_operation
+    def search_by_full_text(self, search_text: str, limit: int = 10, match_any: bool = False,
+                            element_pks: Optional[Set[int]] = None) -> List[Tuple[int, float]]:
+        """
+        Search elements with the FTS5 index, ranked by BM25.
+
+        Args:
+            search_text: Free text; every term must match unless match_any is set
+            limit: Maximum number of results
+            match_any: Match elements containing any of the terms
+            element_pks: Only search these elements
+
+        Returns:
+            List of (element_pk, score) tuples, best first. Scores are BM25
+            relative to the best match, so the best result scores 1.0.
+        """
+        if not self.conn:
+            raise ValueError("Database not initialized")
+
+        match = self._full_text_query(search_text, match_any)
+        if not self.full_text_index_enabled or match is None:
+            return []
+
+        weights = ", ".join(str(weight) for weight in FULL_TEXT_COLUMN_WEIGHTS)
+        condition, params = self._candidate_condition(element_pks, "rowid")
+        cursor = self.conn.execute(f"""
+            SELECT rowid, -bm25({FULL_TEXT_INDEX_TABLE}, {weights}) AS rank
+            FROM {FULL_TEXT_INDEX_TABLE}
+            WHERE {FULL_TEXT_INDEX_TABLE} MATCH ?{condition}
+            ORDER BY rank DESC
+            LIMIT ?
+        """, [match] + params + [limit])
+        rows = cursor.fetchall()
+        if not rows:
+            return []
+
+        # Absolute BM25 is tiny for frequent terms, so scale by the best rank instead
+        best = rows[0][1]
+        if best <= 0:
+            return [(row[0], 1.0) for row in rows]
+        return [(row[0], max(row[1], 0.0) / best) for row in rows]
+
+    def _get_vector_index_dimension(self) -> Optional[int]:
+        """Return the dimension of the existing vec0 index table, or None if it does not exist."""
+        row = self.conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (VECTOR_INDEX_TABLE,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        match = re.search(r"float\[(\d+)\]", row[0] or "")
+        return int(match.group(1)) if match else None
+
+    def _drop_vector_index_triggers(self) -> None:
+        """Drop the triggers that maintain the vec0 index."""
+        try:
+            self.conn.execute("DROP TRIGGER IF EXISTS embeddings_vector_index_insert")
+            self.conn.execute("DROP TRIGGER IF EXISTS embeddings_vector_index_delete")
+            self.conn.commit()
+        except Exception as e:
+            logger.debug(f"Error dropping vector index triggers: {str(e)}")
+
     # Domain Ontology Mapping Methods
+    @_write_operation
     def store_element_term_mappings(self, element_pk: int, mappings: List[Dict[str, Any]]) -> None:
         """
         Store domain term mappings for an element.
@@ -683,6 +1215,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             logger.error(f"Error storing element term mappings: {e}")
             raise
     
+    @_read_operation
     def get_element_term_mappings(self, element_pk: int) -> List[Dict[str, Any]]:
         """
         Get all domain term mappings for an element.
@@ -716,6 +1249,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
         
         return mappings
     
+    @_write_operation
     def store_entity(self, entity: Dict[str, Any]) -> int:
         """
         Store a domain entity with proper UPSERT logic.
@@ -817,6 +1351,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             logger.error(f"Error storing entity: {e}")
             raise
     
+    @_write_operation
     def store_entity_embedding(self, entity_pk: int, embedding: List[float], model: str = 'unknown') -> None:
         """Store embedding for an entity."""
         if not self.conn:
@@ -841,6 +1376,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             logger.error(f"Error storing entity embedding: {e}")
             raise
     
+    @_read_operation
     def get_entity_embedding(self, entity_pk: int) -> Optional[List[float]]:
         """Get embedding for an entity."""
         if not self.conn:
@@ -857,6 +1393,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             return json.loads(row[0])
         return None
     
+    @_read_operation
     def search_similar_entities(self, query_embedding: List[float], limit: int = 10, 
                                entity_type: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -908,6 +1445,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
         results.sort(key=lambda x: x['similarity'], reverse=True)
         return results[:limit]
     
+    @_read_operation
     def get_entity(self, entity_id: str) -> Optional[Dict[str, Any]]:
         """Get entity by ID."""
         if not self.conn:
@@ -934,6 +1472,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             }
         return None
     
+    @_write_operation
     def store_element_entity_mapping(self, mapping: Dict[str, Any]) -> None:
         """
         Store element-entity mapping.
@@ -974,6 +1513,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             logger.error(f"Error storing element-entity mapping: {e}")
             raise
     
+    @_read_operation
     def get_entities_for_element(self, element_pk: int) -> List[Dict[str, Any]]:
         """Get all entities associated with an element."""
         if not self.conn:
@@ -1003,6 +1543,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
         
         return entities
     
+    @_read_operation
     def get_entities_for_document(self, doc_id: str) -> List[Dict[str, Any]]:
         """Get all entities extracted from a document."""
         if not self.conn:
@@ -1032,6 +1573,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
         
         return entities
     
+    @_read_operation
     def get_all_entities(self) -> List[Dict[str, Any]]:
         """Get all entities."""
         if not self.conn:
@@ -1058,6 +1600,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
         
         return entities
     
+    @_read_operation
     def get_element_entity_mappings(self, element_pk: int) -> List[Dict[str, Any]]:
         """Get element-entity mappings for an element."""
         if not self.conn:
@@ -1092,6 +1635,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
         
         return mappings
     
+    @_read_operation
     def get_all_entity_relationships(self) -> List[Dict[str, Any]]:
         """Get all entity relationships."""
         if not self.conn:
@@ -1123,6 +1667,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
         
         return relationships
     
+    @_write_operation
     def store_entity_relationship(self, relationship: Dict[str, Any]) -> int:
         """Store entity-to-entity relationship and return the relationship_id."""
         if not self.conn:
@@ -1148,6 +1693,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
         self.conn.commit()
         return cursor.lastrowid
     
+    @_write_operation
     def update_entity(self, entity_pk: int, entity: Dict[str, Any]) -> bool:
         """Update an existing domain entity."""
         if not self.conn:
@@ -1175,6 +1721,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             logger.error(f"Error updating entity {entity_pk}: {e}")
             return False
     
+    @_write_operation
     def delete_entity(self, entity_pk: int) -> bool:
         """Delete a domain entity and all related mappings."""
         if not self.conn:
@@ -1204,6 +1751,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             logger.error(f"Error deleting entity {entity_pk}: {e}")
             return False
     
+    @_write_operation
     def delete_element_entity_mappings(self, element_pk: int = None, entity_pk: int = None) -> int:
         """Delete element-entity mappings."""
         if not self.conn:
@@ -1232,6 +1780,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             logger.error(f"Error deleting element-entity mappings: {e}")
             return 0
     
+    @_write_operation
     def update_entity_relationship(self, relationship_id: int, relationship: Dict[str, Any]) -> bool:
         """Update an entity-to-entity relationship."""
         if not self.conn:
@@ -1261,6 +1810,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             logger.error(f"Error updating entity relationship {relationship_id}: {e}")
             return False
     
+    @_write_operation
     def delete_entity_relationships(self, source_entity_pk: int = None, target_entity_pk: int = None) -> int:
         """Delete entity-to-entity relationships."""
         if not self.conn:
@@ -1295,6 +1845,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             logger.error(f"Error deleting entity relationships: {e}")
             return 0
     
+    @_read_operation
     def get_entity_relationships(self, entity_pk: int) -> List[Dict[str, Any]]:
         """Get all relationships for an entity (where it's source or target)."""
         if not self.conn:
@@ -1329,6 +1880,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
         
         return relationships
     
+    @_read_operation
     def find_elements_by_term(self, term: str, domain: Optional[str] = None, 
                              min_confidence: float = 0.0, limit: int = 100) -> List[Tuple[int, str, float]]:
         """
@@ -1369,6 +1921,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
         
         return cursor.fetchall()
     
+    @_read_operation
     def get_term_statistics(self, domain: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
         """
         Get usage statistics for all terms.
@@ -1433,6 +1986,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
         
         return stats
     
+    @_write_operation
     def bulk_store_term_mappings(self, mappings: List[Dict[str, Any]]) -> int:
         """
         Bulk store term mappings for multiple elements.
@@ -1486,11 +2040,13 @@ class SQLiteDocumentDatabase(DocumentDatabase):
         return count
 
     def close(self) -> None:
-        """Close the database connection."""
-        if self.conn:
-            self.conn.close()
-            self.conn = None
+        """Close the database connections."""
+        if self._pool:
+            self._pool.close()
+            self._pool = None
+        self.embedding_matrix = None
 
+    @_read_operation
     def get_last_processed_info(self, source_id: str) -> Optional[Dict[str, Any]]:
         """Get information about when a document was last processed."""
         if not self.conn:
@@ -1516,6 +2072,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             logger.error(f"Error getting processing history for {source_id}: {str(e)}")
             return None
 
+    @_write_operation
     def update_processing_history(self, source_id: str, content_hash: str) -> None:
         """Update the processing history for a document."""
         if not self.conn:
@@ -1560,6 +2117,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
         except Exception as e:
             logger.error(f"Error updating processing history for {source_id}: {str(e)}")
 
+    @_write_operation
     def store_document(self, document: Dict[str, Any], elements: List[Dict[str, Any]],
                        relationships: List[Dict[str, Any]],
                        element_dates: Optional[Dict[str, List[Dict[str, Any]]]] = None) -> None:
@@ -1621,57 +2179,31 @@ class SQLiteDocumentDatabase(DocumentDatabase):
 
             # Store elements
             for element in elements:
-                element_id = element["element_id"]
-                metadata_json = json.dumps(element.get("metadata", {}), default=self._json_default)
-                content_preview = element.get("content_preview", "")
-                if len(content_preview) > 500:
-                    content_preview = content_preview[:500] + "..."
-
                 cursor = self.conn.execute(
                     """
                     INSERT INTO elements 
                     (element_id, doc_id, element_type, parent_id, content_preview, 
-                     content_location, content_hash, metadata, element_order, document_position)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                     content_location, content_hash, metadata, element_order, document_position, full_content)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                     """,
-                    (
-                        element_id,
-                        doc_id,  # Use the document's doc_id, not element's doc_id
-                        element.get("element_type", ""),
-                        element.get("parent_id") or None,  # Use None for missing parent_id
-                        content_preview,
-                        element.get("content_location", ""),
-                        element.get("content_hash", ""),
-                        metadata_json,
-                        element.get("element_order", 0),
-                        element.get("document_position", 0)
-                    )
+                    self._element_row(doc_id, element)
                 )
 
                 # Get the SQLite auto-increment ID
                 element_pk = cursor.lastrowid
                 # Store it back into the dictionary
                 element['element_pk'] = element_pk
+            self._index_unstored_full_text(elements)
 
             # Store relationships
-            for relationship in relationships:
-                relationship_id = relationship["relationship_id"]
-                metadata_json = json.dumps(relationship.get("metadata", {}), default=self._json_default)
-
-                self.conn.execute(
-                    """
-                    INSERT INTO relationships 
-                    (relationship_id, source_id, relationship_type, target_reference, metadata)
-                    VALUES (?, ?, ?, ?, ?)
-                    """,
-                    (
-                        relationship_id,
-                        relationship.get("source_id", ""),
-                        relationship.get("relationship_type", ""),
-                        relationship.get("target_reference", ""),
-                        metadata_json
-                    )
-                )
+            self.conn.executemany(
+                """
+                INSERT INTO relationships 
+                (relationship_id, source_id, relationship_type, target_reference, metadata)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [self._relationship_row(relationship) for relationship in relationships]
+            )
 
             # Store extracted dates if provided
             if element_dates:
@@ -1686,6 +2218,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
 
             # Commit transaction
             self.conn.commit()
+            self._bump_store_generation(doc_ids=[doc_id])
 
             # Update processing history
             if source:
@@ -1697,6 +2230,266 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             logger.error(f"Error storing document {doc_id}: {str(e)}")
             raise
 
+    def store_document_batch(self, document: Dict[str, Any], elements: List[Dict[str, Any]],
+                             relationships: List[Dict[str, Any]],
+                             element_dates: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                             embedding_fn: Optional[Callable[[List[Dict[str, Any]]], Dict[int, List[float]]]] = None,
+                             topics: Optional[List[str]] = None,
+                             confidence: float = 1.0) -> Dict[int, List[float]]:
+        """
+        Store a document with its elements, relationships, dates and embeddings in one transaction.
+
+        element_pk values are reserved up front as one contiguous range, then embedding_fn
+        runs without holding the writer, so other writers are not blocked on the model. The
+        elements are not in the database yet while it runs. Everything is then written in a
+        single transaction with executemany. If the source is already stored, including by
+        another writer while the embeddings were generated, the stored document keeps its
+        doc_id and its elements, relationships, dates and embeddings are replaced in the
+        same transaction.
+
+        If embedding_fn raises, nothing is stored and the reserved element_pk range is
+        left unused.
+        """
+        if self._pool is None:
+            raise ValueError("Database not initialized")
+
+        first_pk = self._reserve_document_element_pks(len(elements))
+
+        for offset, element in enumerate(elements):
+            element["element_pk"] = first_pk + offset
+
+        try:
+            embeddings = embedding_fn(elements) if embedding_fn else {}
+            embedding_blobs, replaced_pks = self._write_document_batch(
+                document, elements, relationships, element_dates, embeddings, topics, confidence)
+        except Exception:
+            for element in elements:
+                element.pop("element_pk", None)
+            raise
+
+        if self.embedding_matrix is not None and replaced_pks:
+            self.embedding_matrix.remove_many(replaced_pks)
+        if embeddings:
+            self.vector_dimension = max(self.vector_dimension, max(len(e) for e in embeddings.values()))
+            if self.embedding_matrix is not None:
+                for element_pk, embedding_blob in embedding_blobs.items():
+                    self.embedding_matrix.upsert(element_pk, embedding_blob)
+
+        self._bump_store_generation(doc_ids=[document["doc_id"]])
+
+        # Update processing history
+        source = document.get("source", "")
+        if source:
+            self.update_processing_history(source, document.get("content_hash", ""))
+
+        return embeddings
+
+    @_write_operation
+    def _reserve_document_element_pks(self, count: int) -> int:
+        """
+        Reserve a contiguous range of element_pk values for a document's elements.
+
+        The range is committed to the AUTOINCREMENT sequence right away, so no other
+        connection hands it out while the embeddings are generated.
+
+        Returns:
+            The first reserved element_pk
+        """
+        try:
+            self.conn.execute("BEGIN IMMEDIATE")
+            first_pk = self._next_element_pk()
+            if count:
+                last_pk = first_pk + count - 1
+                cursor = self.conn.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = 'elements'", (last_pk,))
+                if cursor.rowcount == 0:
+                    self.conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('elements', ?)", (last_pk,))
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return first_pk
+
+    @_write_operation
+    def _write_document_batch(self, document: Dict[str, Any], elements: List[Dict[str, Any]],
+                              relationships: List[Dict[str, Any]],
+                              element_dates: Optional[Dict[str, List[Dict[str, Any]]]],
+                              embeddings: Dict[int, List[float]], topics: Optional[List[str]],
+                              confidence: float) -> Tuple[Dict[int, bytes], List[int]]:
+        """
+        Write a document whose elements have reserved element_pk values.
+
+        A document already stored for the same source is deleted in the same
+        transaction and its doc_id is reused.
+
+        Returns:
+            The packed embeddings and the element_pk values of the replaced elements
+        """
+        doc_id = document["doc_id"]
+        replaced_pks = []
+
+        try:
+            self.conn.execute("BEGIN IMMEDIATE")
+            cursor = self.conn.execute("SELECT doc_id FROM documents WHERE source = ?", (document.get("source", ""),))
+            existing_doc = cursor.fetchone()
+            if existing_doc:
+                doc_id = document["doc_id"] = existing_doc[0]
+                for element in elements:
+                    element["doc_id"] = doc_id
+                replaced_pks = self._delete_document_rows(doc_id)
+
+            self.conn.execute(
+                """
+                INSERT INTO documents 
+                (doc_id, doc_type, source, content_hash, metadata, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    doc_id,
+                    document.get("doc_type", ""),
+                    document.get("source", ""),
+                    document.get("content_hash", ""),
+                    json.dumps(document.get("metadata", {}), default=self._json_default),
+                    document.get("created_at", time.time()),
+                    document.get("updated_at", time.time())
+                )
+            )
+
+            self.conn.executemany(
+                """
+                INSERT INTO elements 
+                (element_pk, element_id, doc_id, element_type, parent_id, content_preview, 
+                 content_location, content_hash, metadata, element_order, document_position, full_content)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [(element["element_pk"],) + self._element_row(doc_id, element) for element in elements]
+            )
+            self._index_unstored_full_text(elements)
+
+            # Store relationships
+            self.conn.executemany(
+                """
+                INSERT INTO relationships 
+                (relationship_id, source_id, relationship_type, target_reference, metadata)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [self._relationship_row(relationship) for relationship in relationships]
+            )
+
+            # Store extracted dates
+            if element_dates:
+                element_pks = {element["element_id"]: element["element_pk"] for element in elements}
+                date_rows = []
+                for element_id, dates_list in element_dates.items():
+                    element_pk = element_pks.get(element_id)
+                    if element_pk is None:
+                        logger.warning(f"Skipping dates for unknown element {element_id}")
+                        continue
+                    date_rows.extend(self._element_date_row(element_pk, date_info) for date_info in dates_list)
+                self.conn.executemany(ELEMENT_DATES_INSERT_SQL, date_rows)
+
+            # Store embeddings
+            use_topics = topics is not None and self.supports_topics()
+            topics_json = json.dumps(topics if use_topics else [])
+            embedding_confidence = confidence if use_topics else 1.0
+            embedding_blobs = {element_pk: pack_embedding(embedding) for element_pk, embedding in embeddings.items()}
+            created_at = time.time()
+
+            self.conn.executemany(
+                """
+                INSERT OR REPLACE INTO embeddings 
+                (element_pk, embedding, dimensions, topics, confidence, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (element_pk, embedding_blobs[element_pk], len(embedding), topics_json,
+                     embedding_confidence, created_at)
+                    for element_pk, embedding in embeddings.items()
+                ]
+            )
+
+            self.conn.commit()
+
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"Error storing document {doc_id}: {str(e)}")
+            raise
+
+        return embedding_blobs, replaced_pks
+
+    def _delete_document_rows(self, doc_id: str) -> List[int]:
+        """
+        Delete a document with its elements, relationships, dates and embeddings.
+
+        Must run inside a write transaction; the caller commits and removes the
+        returned element_pk values from the embedding matrix.
+
+        Returns:
+            The element_pk values of the deleted elements
+        """
+        cursor = self.conn.execute("SELECT element_pk FROM elements WHERE doc_id = ?", (doc_id,))
+        element_pks = [row[0] for row in cursor.fetchall()]
+
+        self.conn.execute(
+            "DELETE FROM relationships WHERE source_id IN (SELECT element_id FROM elements WHERE doc_id = ?)",
+            (doc_id,))
+        self.conn.execute(
+            "DELETE FROM embeddings WHERE element_pk IN (SELECT element_pk FROM elements WHERE doc_id = ?)",
+            (doc_id,))
+        self.conn.execute(
+            "DELETE FROM element_dates WHERE element_pk IN (SELECT element_pk FROM elements WHERE doc_id = ?)",
+            (doc_id,))
+        self.conn.execute("DELETE FROM elements WHERE doc_id = ?", (doc_id,))
+        self.conn.execute("DELETE FROM documents WHERE doc_id = ?", (doc_id,))
+        return element_pks
+
+    def _next_element_pk(self) -> int:
+        """
+        Find the first element_pk that has never been handed out.
+
+        Must run inside a write transaction; the caller advances the AUTOINCREMENT
+        sequence (or inserts the keys) so the range is never handed out again.
+        """
+        cursor = self.conn.execute(
+            """
+            SELECT MAX(
+                COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'elements'), 0),
+                COALESCE((SELECT MAX(element_pk) FROM elements), 0)
+            )
+            """
+        )
+        return cursor.fetchone()[0] + 1
+
+    def _element_row(self, doc_id: str, element: Dict[str, Any]) -> Tuple:
+        """Build the elements table parameters for an element, excluding element_pk."""
+        content_preview = element.get("content_preview", "")
+        if len(content_preview) > 500:
+            content_preview = content_preview[:500] + "..."
+
+        return (
+            element["element_id"],
+            doc_id,  # Use the document's doc_id, not element's doc_id
+            element.get("element_type", ""),
+            element.get("parent_id") or None,  # Use None for missing parent_id
+            content_preview,
+            element.get("content_location", ""),
+            element.get("content_hash", ""),
+            json.dumps(element.get("metadata", {}), default=self._json_default),
+            element.get("element_order", 0),
+            element.get("document_position", 0),
+            self._element_full_text(element) if self.store_full_text else None
+        )
+
+    def _relationship_row(self, relationship: Dict[str, Any]) -> Tuple:
+        """Build the relationships table parameters for a relationship."""
+        return (
+            relationship["relationship_id"],
+            relationship.get("source_id", ""),
+            relationship.get("relationship_type", ""),
+            relationship.get("target_reference", ""),
+            json.dumps(relationship.get("metadata", {}), default=self._json_default)
+        )
+
+    @_write_operation
     def update_document(self, doc_id: str, document: Dict[str, Any],
                         elements: List[Dict[str, Any]],
                         relationships: List[Dict[str, Any]],
@@ -1730,6 +2523,8 @@ class SQLiteDocumentDatabase(DocumentDatabase):
                 element_pks_placeholders = ','.join(['?'] * len(element_pks))
                 self.conn.execute(f"DELETE FROM embeddings WHERE element_pk IN ({element_pks_placeholders})",
                                   element_pks)
+                if self.embedding_matrix is not None:
+                    self.embedding_matrix.remove_many(element_pks)
 
             # Delete dates for this document's elements
             if element_pks:
@@ -1753,9 +2548,13 @@ class SQLiteDocumentDatabase(DocumentDatabase):
         except Exception as e:
             # Rollback on error
             self.conn.rollback()
+            # Embedding deletions may have been applied to the matrix; reload it on next search
+            self.embedding_matrix = None
+            self._bump_store_generation(doc_ids=[doc_id])
             logger.error(f"Error updating document {doc_id}: {str(e)}")
             raise
 
+    @_write_operation
     def update_document_smart(self, doc_id: str, document: Dict[str, Any],
                             elements: List[Dict[str, Any]],
                             relationships: List[Dict[str, Any]],
@@ -1849,6 +2648,8 @@ class SQLiteDocumentDatabase(DocumentDatabase):
                 element_pks_placeholders = ','.join(['?'] * len(element_pks))
                 self.conn.execute(f"DELETE FROM embeddings WHERE element_pk IN ({element_pks_placeholders})",
                                   element_pks)
+                if self.embedding_matrix is not None:
+                    self.embedding_matrix.remove_many(element_pks)
 
             # Delete dates for this document's elements
             if element_pks:
@@ -1888,6 +2689,9 @@ class SQLiteDocumentDatabase(DocumentDatabase):
         except Exception as e:
             # Rollback on error
             self.conn.rollback()
+            # Embedding deletions may have been applied to the matrix; reload it on next search
+            self.embedding_matrix = None
+            self._bump_store_generation(doc_ids=[doc_id])
             logger.error(f"Error in smart document update {doc_id}: {str(e)}")
             raise
 
@@ -1921,6 +2725,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
         
         return True
 
+    @_read_operation
     def get_document(self, doc_id: str) -> Optional[Dict[str, Any]]:
         """Get document metadata by ID."""
         if not self.conn:
@@ -1935,6 +2740,37 @@ class SQLiteDocumentDatabase(DocumentDatabase):
         if row is None:
             return None
 
+        return self._row_to_document(row)
+
+    @_read_operation
+    def get_documents_by_ids(self, doc_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the metadata of several documents with one query.
+
+        Args:
+            doc_ids: Document IDs
+
+        Returns:
+            Dictionary of doc_id to document data (missing documents are omitted)
+        """
+        if not self.conn:
+            raise ValueError("Database not initialized")
+
+        doc_ids = list(dict.fromkeys(doc_ids))
+        if not doc_ids:
+            return {}
+
+        placeholders = ', '.join(['?'] * len(doc_ids))
+        cursor = self.conn.execute(
+            f"SELECT * FROM documents WHERE doc_id IN ({placeholders})",
+            doc_ids
+        )
+        documents = {row["doc_id"]: self._row_to_document(row) for row in cursor.fetchall()}
+        return {doc_id: documents[doc_id] for doc_id in doc_ids if doc_id in documents}
+
+    @staticmethod
+    def _row_to_document(row) -> Dict[str, Any]:
+        """Convert a documents row to a document dictionary."""
         doc = dict(row)
 
         # Convert metadata from JSON
@@ -1945,6 +2781,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
 
         return doc
 
+    @_read_operation
     def get_document_elements(self, doc_id: str) -> List[Dict[str, Any]]:
         """Get elements for a document."""
         if not self.conn:
@@ -1975,6 +2812,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
 
         return elements
 
+    @_read_operation
     def get_document_relationships(self, doc_id: str) -> List[Dict[str, Any]]:
         """Get relationships for a document."""
         if not self.conn:
@@ -2014,6 +2852,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
 
         return relationships
 
+    @_read_operation
     def get_element(self, element_id_or_pk: Union[int, str]) -> Optional[Dict[str, Any]]:
         """
         Get element by ID or PK.
@@ -2039,6 +2878,37 @@ class SQLiteDocumentDatabase(DocumentDatabase):
         if row is None:
             return None
 
+        return self._row_to_element(row)
+
+    @_read_operation
+    def get_elements_by_pks(self, element_pks: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get several elements by primary key with one query.
+
+        Args:
+            element_pks: Element primary keys
+
+        Returns:
+            Dictionary of element_pk to element data (missing elements are omitted)
+        """
+        if not self.conn:
+            raise ValueError("Database not initialized")
+
+        element_pks = list(dict.fromkeys(int(element_pk) for element_pk in element_pks))
+        if not element_pks:
+            return {}
+
+        placeholders = ', '.join(['?'] * len(element_pks))
+        cursor = self.conn.execute(
+            f"SELECT * FROM elements WHERE element_pk IN ({placeholders})",
+            element_pks
+        )
+        elements = {row["element_pk"]: self._row_to_element(row) for row in cursor.fetchall()}
+        return {element_pk: elements[element_pk] for element_pk in element_pks if element_pk in elements}
+
+    @staticmethod
+    def _row_to_element(row) -> Dict[str, Any]:
+        """Convert an elements row to an element dictionary."""
         element = dict(row)
 
         # Convert metadata from JSON
@@ -2049,6 +2919,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
 
         return element
 
+    @_write_operation
     def delete_document(self, doc_id: str) -> bool:
         """Delete a document and all associated elements and relationships."""
         if not self.conn:
@@ -2084,6 +2955,8 @@ class SQLiteDocumentDatabase(DocumentDatabase):
                 element_pks_placeholders = ','.join(['?'] * len(element_pks))
                 self.conn.execute(f"DELETE FROM embeddings WHERE element_pk IN ({element_pks_placeholders})",
                                   element_pks)
+                if self.embedding_matrix is not None:
+                    self.embedding_matrix.remove_many(element_pks)
 
             # Delete dates for these elements
             if element_pks:
@@ -2111,12 +2984,15 @@ class SQLiteDocumentDatabase(DocumentDatabase):
 
             # Commit transaction
             self.conn.commit()
+            self._bump_store_generation(doc_ids=[doc_id])
 
             return True
 
         except Exception as e:
             # Rollback on error
             self.conn.rollback()
+            # Embedding deletions may have been applied to the matrix; reload it on next search
+            self.embedding_matrix = None
             logger.error(f"Error deleting document {doc_id}: {str(e)}")
             return False
 
@@ -2124,6 +3000,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
     # LEGACY SEARCH METHODS
     # ========================================
 
+    @_read_operation
     def find_documents(self, query: Dict[str, Any] = None, limit: int = 100) -> List[Dict[str, Any]]:
         """
         Find documents matching query with support for LIKE patterns.
@@ -2189,6 +3066,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
 
         return documents
 
+    @_read_operation
     def find_elements(self, query: Dict[str, Any] = None, limit: int = 100) -> List[Dict[str, Any]]:
         """
         Find elements matching query with support for LIKE patterns and ElementType enums.
@@ -2266,34 +3144,38 @@ class SQLiteDocumentDatabase(DocumentDatabase):
 
         return elements
 
+    @_read_operation
     def search_elements_by_content(self, search_text: str, limit: int = 10) -> List[Dict[str, Any]]:
-        """Search elements by content preview."""
+        """
+        Search elements by content preview and indexed full text.
+
+        Uses the FTS5 index ranked by BM25 (search_rank) when available, with
+        fallback to a LIKE match on content_preview.
+        """
         if not self.conn:
             raise ValueError("Database not initialized")
 
+        ranked = self.search_by_full_text(search_text, limit)
+        if ranked:
+            elements = self.get_elements_by_pks([element_pk for element_pk, _ in ranked])
+            results = []
+            for element_pk, rank in ranked:
+                if element_pk in elements:
+                    elements[element_pk]["search_rank"] = rank
+                    results.append(elements[element_pk])
+            return results
+
         cursor = self.conn.execute(
             "SELECT * FROM elements WHERE content_preview LIKE ? LIMIT ?",
             (f"%{search_text}%", limit)
         )
-
-        elements = []
-        for row in cursor.fetchall():
-            element = dict(row)
-
-            # Convert metadata from JSON
-            try:
-                element["metadata"] = json.loads(element["metadata"]) if element["metadata"] else {}
-            except (json.JSONDecodeError, TypeError):
-                element["metadata"] = {}
-
-            elements.append(element)
-
-        return elements
+        return [self._row_to_element(row) for row in cursor.fetchall()]
 
     # ========================================
     # EMBEDDING SEARCH METHODS
     # ========================================
 
+    @_write_operation
     def store_embedding(self, element_pk: int, embedding: VectorType) -> None:
         """Store embedding for an element."""
         if not self.conn:
@@ -2312,8 +3194,8 @@ class SQLiteDocumentDatabase(DocumentDatabase):
         self.vector_dimension = max(self.vector_dimension, len(embedding))
 
         try:
-            # Store embedding in the main embeddings table
-            embedding_json = json.dumps(embedding)
+            # Store embedding in the main embeddings table as a packed float32 blob
+            embedding_blob = pack_embedding(embedding)
 
             self.conn.execute(
                 """
@@ -2323,7 +3205,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
                 """,
                 (
                     element_pk,
-                    embedding_json,
+                    embedding_blob,
                     len(embedding),
                     json.dumps([]),  # Default to empty topics
                     1.0,  # Default confidence
@@ -2332,12 +3214,17 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             )
 
             self.conn.commit()
+            self._bump_store_generation(element_pks=[element_pk])
+
+            if self.embedding_matrix is not None:
+                self.embedding_matrix.upsert(element_pk, embedding_blob)
 
         except Exception as e:
             self.conn.rollback()
             logger.error(f"Error storing embedding for {element_pk}: {str(e)}")
             raise
 
+    @_read_operation
     def get_embedding(self, element_pk: int) -> Optional[VectorType]:
         """Get embedding for an element."""
         if not self.conn:
@@ -2353,10 +3240,40 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             return None
 
         try:
-            return json.loads(row[0]) if row[0] else None
-        except (json.JSONDecodeError, TypeError):
+            return unpack_embedding(row[0]) if row[0] else None
+        except (json.JSONDecodeError, TypeError, ValueError):
             return None
 
+    @_read_operation
+    def get_embeddings_by_element_type(self, element_types: List[str]) -> List[Tuple[int, str, str, Any]]:
+        """
+        Load the embeddings of all elements of the given types with one query.
+
+        Args:
+            element_types: Element types to include
+
+        Returns:
+            List of (element_pk, element_id, doc_id, embedding blob) tuples
+        """
+        if not self.conn:
+            raise ValueError("Database not initialized")
+        if not element_types:
+            return []
+
+        placeholders = ', '.join(['?'] * len(element_types))
+        cursor = self.conn.execute(
+            f"""
+            SELECT e.element_pk, e.element_id, e.doc_id, em.embedding
+            FROM embeddings em
+            JOIN elements e ON e.element_pk = em.element_pk
+            WHERE e.element_type IN ({placeholders}) AND em.embedding IS NOT NULL
+            ORDER BY e.element_pk
+            """,
+            list(element_types)
+        )
+        return [tuple(row) for row in cursor.fetchall()]
+
+    @_read_operation
     def search_by_embedding(self, query_embedding: VectorType, limit: int = 10,
                             filter_criteria: Dict[str, Any] = None) -> List[Tuple[int, float]]:
         """
@@ -2375,6 +3292,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             # Fall back to similarity function
             return self._search_by_similarity_function(query_embedding, limit, filter_criteria)
 
+    @_read_operation
     def search_by_text(self, search_text: str, limit: int = 10,
                        filter_criteria: Dict[str, Any] = None) -> List[Tuple[int, float]]:
         """
@@ -2395,6 +3313,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             # Return empty list on error
             return []
 
+    @_read_operation
     def get_outgoing_relationships(self, element_pk: Union[int, str]) -> List[ElementRelationship]:
         """
         Find all relationships where the specified element_pk is the source.
@@ -2475,6 +3394,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             logger.error(f"Error getting outgoing relationships for element {element_pk}: {str(e)}")
             return []
 
+    @_write_operation
     def store_relationship(self, relationship: Dict[str, Any]) -> None:
         """
         Store a single relationship between elements.
@@ -2511,6 +3431,43 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             logger.error(f"Error storing relationship {relationship.get('relationship_id', 'unknown')}: {str(e)}")
             raise
 
+    @_write_operation
+    def replace_relationships(self, source_ids: List[str], relationship_type: str,
+                              relationships: List[Dict[str, Any]]) -> None:
+        """
+        Replace the relationships of one type for a set of source elements in one transaction.
+
+        Args:
+            source_ids: Element IDs whose relationships of the type are replaced
+            relationship_type: Relationship type to replace
+            relationships: New relationships to store
+        """
+        if not self.conn:
+            raise ValueError("Database not initialized")
+
+        try:
+            self.conn.executemany(
+                "DELETE FROM relationships WHERE source_id = ? AND relationship_type = ?",
+                [(source_id, relationship_type) for source_id in source_ids]
+            )
+            self.conn.executemany(
+                """
+                INSERT OR REPLACE INTO relationships 
+                (relationship_id, source_id, relationship_type, target_reference, metadata)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [self._relationship_row(relationship) for relationship in relationships]
+            )
+            self.conn.commit()
+            logger.debug(f"Replaced '{relationship_type}' relationships for {len(source_ids)} elements "
+                         f"with {len(relationships)} relationships")
+
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"Error replacing '{relationship_type}' relationships: {str(e)}")
+            raise
+
+    @_write_operation
     def delete_relationships_for_element(self, element_id: str, relationship_type: str = None) -> None:
         """
         Delete relationships where the element is the source.
@@ -2547,6 +3504,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
     # DATE STORAGE AND SEARCH METHODS
     # ========================================
 
+    @_write_operation
     def store_element_dates(self, element_id: str, dates: List[Dict[str, Any]]) -> None:
         """
         Store extracted dates associated with an element with comprehensive temporal analysis.
@@ -2564,70 +3522,10 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             raise ValueError(f"Element {element_id} has no element_pk")
 
         try:
-            for date_info in dates:
-                self.conn.execute(
-                    """
-                    INSERT OR REPLACE INTO element_dates 
-                    (element_pk, original_text, iso_string, timestamp_value, 
-                     year_value, month_value, day_value, hour_value, minute_value, second_value,
-                     start_position, end_position, context,
-                     decade_value, century_value, quarter_value, season_value, day_of_week_value,
-                     day_of_year_value, week_of_year_value, is_weekend, is_holiday_season,
-                     fiscal_quarter_value, fiscal_year_value, academic_semester_value, academic_year_value,
-                     time_of_day_value, is_business_hours,
-                     is_relative, is_partial, date_type, relative_reference, specificity_level,
-                     date_format_detected, locale_hint, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 
-                            ?, ?, ?, ?, ?, ?, ?, ?, ?,
-                            ?, ?, ?, ?, ?, ?,
-                            ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        element_pk,
-                        # Core fields
-                        date_info.get('original_text', ''),
-                        date_info.get('iso_string'),
-                        date_info.get('timestamp'),
-                        # Basic components (nullable)
-                        date_info.get('year'),
-                        date_info.get('month'),
-                        date_info.get('day'),
-                        date_info.get('hour'),
-                        date_info.get('minute'),
-                        date_info.get('second'),
-                        date_info.get('start_position', -1),
-                        date_info.get('end_position', -1),
-                        date_info.get('context', ''),
-                        # Extended temporal concepts (nullable)
-                        date_info.get('decade'),
-                        date_info.get('century'),
-                        date_info.get('quarter'),
-                        date_info.get('season'),
-                        date_info.get('day_of_week'),
-                        date_info.get('day_of_year'),
-                        date_info.get('week_of_year'),
-                        date_info.get('is_weekend'),
-                        date_info.get('is_holiday_season'),
-                        # Business/Academic periods (nullable)
-                        date_info.get('fiscal_quarter'),
-                        date_info.get('fiscal_year'),
-                        date_info.get('academic_semester'),
-                        date_info.get('academic_year'),
-                        # Time categories (nullable)
-                        date_info.get('time_of_day'),
-                        date_info.get('is_business_hours'),
-                        # Contextual information
-                        date_info.get('is_relative', False),
-                        date_info.get('is_partial', False),
-                        date_info.get('date_type', 'absolute'),
-                        date_info.get('relative_reference', ''),
-                        date_info.get('specificity_level', 'full'),
-                        # Format detection
-                        date_info.get('date_format_detected', ''),
-                        date_info.get('locale_hint', 'US'),
-                        time.time()
-                    )
-                )
+            self.conn.executemany(
+                ELEMENT_DATES_INSERT_SQL,
+                [self._element_date_row(element_pk, date_info) for date_info in dates]
+            )
 
             self.conn.commit()
             logger.debug(f"Stored {len(dates)} comprehensive dates for element {element_id}")
@@ -2637,6 +3535,56 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             logger.error(f"Error storing comprehensive dates for element {element_id}: {str(e)}")
             raise
 
+    @staticmethod
+    def _element_date_row(element_pk: int, date_info: Dict[str, Any]) -> Tuple:
+        """Build the ELEMENT_DATES_INSERT_SQL parameters for one extracted date."""
+        return (
+            element_pk,
+            # Core fields
+            date_info.get('original_text', ''),
+            date_info.get('iso_string'),
+            date_info.get('timestamp'),
+            # Basic components (nullable)
+            date_info.get('year'),
+            date_info.get('month'),
+            date_info.get('day'),
+            date_info.get('hour'),
+            date_info.get('minute'),
+            date_info.get('second'),
+            date_info.get('start_position', -1),
+            date_info.get('end_position', -1),
+            date_info.get('context', ''),
+            # Extended temporal concepts (nullable)
+            date_info.get('decade'),
+            date_info.get('century'),
+            date_info.get('quarter'),
+            date_info.get('season'),
+            date_info.get('day_of_week'),
+            date_info.get('day_of_year'),
+            date_info.get('week_of_year'),
+            date_info.get('is_weekend'),
+            date_info.get('is_holiday_season'),
+            # Business/Academic periods (nullable)
+            date_info.get('fiscal_quarter'),
+            date_info.get('fiscal_year'),
+            date_info.get('academic_semester'),
+            date_info.get('academic_year'),
+            # Time categories (nullable)
+            date_info.get('time_of_day'),
+            date_info.get('is_business_hours'),
+            # Contextual information
+            date_info.get('is_relative', False),
+            date_info.get('is_partial', False),
+            date_info.get('date_type', 'absolute'),
+            date_info.get('relative_reference', ''),
+            date_info.get('specificity_level', 'full'),
+            # Format detection
+            date_info.get('date_format_detected', ''),
+            date_info.get('locale_hint', 'US'),
+            time.time()
+        )
+
+    @_read_operation
     def get_element_dates(self, element_id: str) -> List[Dict[str, Any]]:
         """
         Get all dates associated with an element with comprehensive temporal analysis.
@@ -2726,6 +3674,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             logger.error(f"Error getting comprehensive dates for element {element_id}: {str(e)}")
             return []
 
+    @_write_operation
     def store_embedding_with_dates(self, element_id: str, embedding: List[float],
                                    dates: List[Dict[str, Any]]) -> None:
         """
@@ -2757,6 +3706,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             logger.error(f"Error storing embedding with comprehensive dates for element {element_id}: {str(e)}")
             raise
 
+    @_write_operation
     def delete_element_dates(self, element_id: str) -> bool:
         """
         Delete all dates associated with an element.
@@ -2790,6 +3740,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             logger.error(f"Error deleting dates for element {element_id}: {str(e)}")
             return False
 
+    @_read_operation
     def search_elements_by_date_range(self, start_date: datetime, end_date: datetime,
                                       limit: int = 100) -> List[Dict[str, Any]]:
         """
@@ -2830,6 +3781,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             logger.error(f"Error searching elements by date range: {str(e)}")
             return []
 
+    @_read_operation
     def search_by_text_and_date_range(self,
                                       search_text: str,
                                       start_date: Optional[datetime] = None,
@@ -2874,6 +3826,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             logger.error(f"Error in text and date range search: {str(e)}")
             return []
 
+    @_read_operation
     def search_by_embedding_and_date_range(self,
                                            query_embedding: List[float],
                                            start_date: Optional[datetime] = None,
@@ -2915,6 +3868,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             logger.error(f"Error in embedding and date range search: {str(e)}")
             return []
 
+    @_read_operation
     def get_elements_with_dates(self, limit: int = 100) -> List[Dict[str, Any]]:
         """
         Get all elements that have associated dates.
@@ -2950,6 +3904,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             logger.error(f"Error getting elements with dates: {str(e)}")
             return []
 
+    @_read_operation
     def get_date_statistics(self) -> Dict[str, Any]:
         """
         Get statistics about dates in the database with enhanced temporal analysis.
@@ -3052,6 +4007,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
         """SQLite implementation supports topic-aware embeddings."""
         return True
 
+    @_write_operation
     def store_embedding_with_topics(self, element_pk: int, embedding: VectorType,
                                     topics: List[str], confidence: float = 1.0) -> None:
         """Store embedding for an element with topic assignments."""
@@ -3071,8 +4027,8 @@ class SQLiteDocumentDatabase(DocumentDatabase):
         self.vector_dimension = max(self.vector_dimension, len(embedding))
 
         try:
-            # Store embedding with topics in the main embeddings table
-            embedding_json = json.dumps(embedding)
+            # Store embedding with topics in the main embeddings table as a packed float32 blob
+            embedding_blob = pack_embedding(embedding)
             topics_json = json.dumps(topics)
 
             self.conn.execute(
@@ -3083,7 +4039,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
                 """,
                 (
                     element_pk,
-                    embedding_json,
+                    embedding_blob,
                     len(embedding),
                     topics_json,
                     confidence,
@@ -3092,12 +4048,17 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             )
 
             self.conn.commit()
+            self._bump_store_generation(element_pks=[element_pk])
+
+            if self.embedding_matrix is not None:
+                self.embedding_matrix.upsert(element_pk, embedding_blob)
 
         except Exception as e:
             self.conn.rollback()
             logger.error(f"Error storing embedding with topics for {element_pk}: {str(e)}")
             raise
 
+    @_read_operation
     def search_by_text_and_topics(self, search_text: str = None,
                                   include_topics: Optional[List[str]] = None,
                                   exclude_topics: Optional[List[str]] = None,
@@ -3127,48 +4088,73 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             logger.error(f"Error in topic-aware search: {str(e)}")
             return []
 
+    @_read_operation
     def get_topic_statistics(self) -> Dict[str, Dict[str, Any]]:
-        """Get statistics about topic distribution across embeddings."""
+        """
+        Get statistics about topic distribution across embeddings.
+
+        The statistics are cached and only documents written since the last call are
+        recomputed. A commit from another connection (PRAGMA data_version) rebuilds them.
+        """
         if not self.conn:
             raise ValueError("Database not initialized")
 
         try:
-            # Query to get topic statistics using SQLite JSON functions
-            cursor = self.conn.execute("""
-                WITH topic_expanded AS (
-                    SELECT 
-                        json_each.value AS topic,
-                        em.confidence,
-                        e.doc_id
-                    FROM embeddings em
-                    JOIN elements e ON em.element_pk = e.element_pk
-                    JOIN json_each(em.topics) ON json_each.value IS NOT NULL
-                    WHERE em.topics IS NOT NULL AND json_array_length(em.topics) > 0
-                )
-                SELECT 
-                    topic,
-                    COUNT(*) as embedding_count,
-                    COUNT(DISTINCT doc_id) as document_count,
-                    AVG(confidence) as avg_confidence
-                FROM topic_expanded
-                GROUP BY topic
-                ORDER BY embedding_count DESC
-            """)
-
-            statistics = {}
-            for row in cursor.fetchall():
-                statistics[row[0]] = {
-                    'embedding_count': int(row[1]),
-                    'document_count': int(row[2]),
-                    'avg_embedding_confidence': float(row[3])
-                }
+            data_version = self._pool.data_version()
+            if data_version != self._topic_statistics_version:
+                self._topic_statistics_cache.invalidate()
+                self._topic_statistics_version = data_version
 
-            return statistics
+            return self._topic_statistics_cache.get(self._load_topic_statistics_rows,
+                                                    self._get_doc_ids_for_element_pks)
 
         except Exception as e:
             logger.error(f"Error getting topic statistics: {str(e)}")
             return {}
 
+    def _load_topic_statistics_rows(self, doc_ids: Optional[List[str]]) -> List[Tuple[str, str, int, float]]:
+        """Get (doc_id, topic, embedding count, confidence sum) rows for documents (all when None)."""
+        sql = """
+            SELECT
+                e.doc_id,
+                json_each.value AS topic,
+                COUNT(*) AS embedding_count,
+                SUM(em.confidence) AS confidence_sum
+            FROM embeddings em
+            JOIN elements e ON em.element_pk = e.element_pk
+            JOIN json_each(em.topics) ON json_each.value IS NOT NULL
+            WHERE em.topics IS NOT NULL AND json_array_length(em.topics) > 0
+        """
+        group_by = " GROUP BY e.doc_id, json_each.value"
+        if doc_ids is None:
+            chunks = [None]
+        else:
+            chunks = [doc_ids[start:start + 500] for start in range(0, len(doc_ids), 500)]
+
+        rows = []
+        for chunk in chunks:
+            if chunk is None:
+                cursor = self.conn.execute(sql + group_by)
+            else:
+                cursor = self.conn.execute(
+                    sql + f" AND e.doc_id IN ({','.join(['?'] * len(chunk))})" + group_by, chunk
+                )
+            rows.extend((row[0], row[1], int(row[2]), float(row[3] or 0.0)) for row in cursor.fetchall())
+        return rows
+
+    def _get_doc_ids_for_element_pks(self, element_pks: List[int]) -> List[str]:
+        """Get the distinct doc_ids of elements."""
+        doc_ids = set()
+        for start in range(0, len(element_pks), 500):
+            chunk = element_pks[start:start + 500]
+            cursor = self.conn.execute(
+                f"SELECT DISTINCT doc_id FROM elements WHERE element_pk IN ({','.join(['?'] * len(chunk))})",
+                chunk
+            )
+            doc_ids.update(row[0] for row in cursor.fetchall())
+        return list(doc_ids)
+
+    @_read_operation
     def get_embedding_topics(self, element_pk: int) -> List[str]:
         """Get topics assigned to a specific embedding."""
         if not self.conn:
@@ -3215,7 +4201,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
                     logger.error(f"Error importing embedding generator: {str(e)}")
                     raise ValueError("Embedding generator not available - embedding libraries may not be installed")
 
-            return self.embedding_generator.generate(search_text)
+            return self._generate_query_embedding(search_text)
         except Exception as e:
             logger.error(f"Error generating embedding: {str(e)}")
             raise
@@ -3262,71 +4248,172 @@ class SQLiteDocumentDatabase(DocumentDatabase):
     def _search_by_similarity_function(self, query_embedding: VectorType, limit: int = 10,
                                        filter_criteria: Dict[str, Any] = None) -> List[Tuple[int, float]]:
         """
-        Fall back to calculating similarity in Python with filtering.
+        Exact similarity search without a vector extension.
+
+        Uses the in-process embedding matrix when NumPy is available (filters are
+        resolved to candidate element_pks in SQL), otherwise calculates similarity
+        row by row in Python.
         """
+        conditions, params = self._build_embedding_filter_conditions(filter_criteria)
+
+        matrix = self._get_embedding_matrix()
+        if matrix is not None:
+            candidate_pks = None
+            if filter_criteria and set(filter_criteria) == {"element_pk_list"}:
+                # The candidates are already known; no need to resolve them in SQL
+                candidate_pks = filter_criteria["element_pk_list"] or None
+            elif conditions:
+                cursor = self.conn.execute(
+                    """
+                    SELECT em.element_pk
+                    FROM embeddings em
+                    JOIN elements e ON e.element_pk = em.element_pk
+                    WHERE """ + " AND ".join(conditions),
+                    params
+                )
+                candidate_pks = [row[0] for row in cursor.fetchall()]
+
+            return matrix.search(query_embedding, limit, candidate_pks)
+
         # Build base query to get embeddings with possible filtering
         sql = """
         SELECT em.element_pk, em.embedding, e.element_type, e.doc_id
         FROM embeddings em
         JOIN elements e ON e.element_pk = em.element_pk
         """
-        params = []
-
-        # Add WHERE clauses if we have filter criteria
-        if filter_criteria:
-            conditions = []
-
-            for key, value in filter_criteria.items():
-                if key == "element_type" and isinstance(value, list):
-                    # Handle list of allowed element types
-                    placeholders = ', '.join(['?'] * len(value))
-                    conditions.append(f"e.element_type IN ({placeholders})")
-                    params.extend(value)
-                elif key == "doc_id" and isinstance(value, list):
-                    # Handle list of document IDs to include
-                    placeholders = ', '.join(['?'] * len(value))
-                    conditions.append(f"e.doc_id IN ({placeholders})")
-                    params.extend(value)
-                elif key == "exclude_doc_id" and isinstance(value, list):
-                    # Handle list of document IDs to exclude
-                    placeholders = ', '.join(['?'] * len(value))
-                    conditions.append(f"e.doc_id NOT IN ({placeholders})")
-                    params.extend(value)
-                elif key == "element_pk_list" and isinstance(value, list):
-                    # Filter by specific element_pks (for date range filtering)
-                    if value:  # Only add condition if list is not empty
-                        placeholders = ', '.join(['?'] * len(value))
-                        conditions.append(f"em.element_pk IN ({placeholders})")
-                        params.extend(value)
-                else:
-                    # Simple equality filter
-                    conditions.append(f"e.{key} = ?")
-                    params.append(value)
 
-            # Add WHERE clause if we have conditions
-            if conditions:
-                sql += " WHERE " + " AND ".join(conditions)
+        # Add WHERE clause if we have conditions
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
 
         # Execute the query
         cursor = self.conn.execute(sql, params)
 
-        # Calculate similarities based on the available implementations
-        if NUMPY_AVAILABLE:
-            similarities = [
-                (row[0], self._cosine_similarity_numpy(query_embedding, json.loads(row[1])))
-                for row in cursor.fetchall()
-            ]
-        else:
-            similarities = [
-                (row[0], self._cosine_similarity_python(query_embedding, json.loads(row[1])))
-                for row in cursor.fetchall()
-            ]
+        similarities = [
+            (row[0], self._cosine_similarity_python(query_embedding, unpack_embedding(row[1])))
+            for row in cursor.fetchall()
+        ]
 
         # Sort by similarity (highest first)
         similarities.sort(key=lambda row: row[1], reverse=True)
 
         return similarities[:limit]
 
+    @staticmethod
+    def _build_embedding_filter_conditions(filter_criteria: Optional[Dict[str, Any]]) -> Tuple[List[str], List[Any]]:
+        """Translate embedding search filter criteria into SQL conditions over embeddings em / elements e."""
+        conditions = []
+        params = []
+
+        for key, value in (filter_criteria or {}).items():
+            if key == "element_type" and isinstance(value, list):
+                # Handle list of allowed element types
+                placeholders = ', '.join(['?'] * len(value))
+                conditions.append(f"e.element_type IN ({placeholders})")
+                params.extend(value)
+            elif key == "doc_id" and isinstance(value, list):
+                # Handle list of document IDs to include
+                placeholders = ', '.join(['?'] * len(value))
+                conditions.append(f"e.doc_id IN ({placeholders})")
+                params.extend(value)
+            elif key == "exclude_doc_id" and isinstance(value, list):
+                # Handle list of document IDs to exclude
+                placeholders = ', '.join(['?'] * len(value))
+                conditions.append(f"e.doc_id NOT IN ({placeholders})")
+                params.extend(value)
+            elif key == "element_pk_list" and isinstance(value, list):
+                # Filter by specific element_pks (date ranges, planner pushdown)
+                if value:  # Only add condition if list is not empty
+                    conditions.append("em.element_pk IN (SELECT value FROM json_each(?))")
+                    params.append(json.dumps(value))
+            else:
+                # Simple equality filter
+                conditions.append(f"e.{key} = ?")
+                params.append(value)
+
+        return conditions, params
+
+    @property
+    def store_generation(self) -> Hashable:
+        """
+        Get the store generation of this database.
+
+        Combines the local write counter with PRAGMA data_version, which changes when
+        another connection commits, so writes from other processes are seen too.
+        """
+        if not self._pool:
+            return self._store_generation
+        return self._store_generation, self._pool.data_version()
+
+    def _get_embedding_matrix(self) -> Optional[EmbeddingMatrix]:
+        """
+        Return the in-process embedding matrix, loading it on first use.
+
+        Writes made through this instance update the matrix incrementally. PRAGMA
+        data_version changes when another connection commits, in which case the
+        matrix is reloaded so searches see embeddings written by other processes.
+        """
+        if not NUMPY_AVAILABLE:
+            return None
+
+        data_version = self._pool.data_version()
+        if self.embedding_matrix is not None and data_version == self._embedding_matrix_version:
+            return self.embedding_matrix
+
+        matrix = EmbeddingMatrix(dimensions=None)
+        cursor = self.conn.execute("SELECT element_pk, embedding FROM embeddings")
+        matrix.load((row[0], row[1]) for row in cursor)
+
+        self.embedding_matrix = matrix
+        self._embedding_matrix_version = data_version
+        logger.debug(f"Loaded embedding matrix with {len(matrix)} vectors")
+        return matrix
+
+    def _migrate_embedding_storage(self, batch_size: int = 1000) -> None:
+        """
+        Convert embeddings stored as JSON text to packed float32 blobs.
+
+        Unreadable embeddings are left as text and logged, so no data is lost; they
+        are skipped when the embedding matrix is loaded.
+        """
+        migrated = 0
+        unreadable = []
+        last_pk = -1
+        try:
+            while True:
+                rows = self.conn.execute(
+                    """
+                    SELECT element_pk, embedding FROM embeddings
+                    WHERE typeof(embedding) = 'text' AND element_pk > ?
+                    ORDER BY element_pk LIMIT ?
+                    """,
+                    (last_pk, batch_size)
+                ).fetchall()
+                if not rows:
+                    break
+                last_pk = rows[-1][0]
+
+                updates = []
+                for element_pk, embedding_json in rows:
+                    try:
+                        updates.append((pack_embedding(json.loads(embedding_json)), element_pk))
+                    except (json.JSONDecodeError, TypeError, ValueError):
+                        unreadable.append(element_pk)
+
+                self.conn.executemany("UPDATE embeddings SET embedding = ? WHERE element_pk = ?", updates)
+                self.conn.commit()
+                migrated += len(updates)
+        except Exception as e:
+            self.conn.rollback()
+            logger.warning(f"Error migrating embeddings to binary storage: {str(e)}")
+
+        if migrated:
+            logger.info(f"Migrated {migrated} embeddings from JSON to float32 storage")
+        if unreadable:
+            logger.warning(f"Left {len(unreadable)} unreadable JSON embeddings unmigrated "
+                           f"(element_pk {', '.join(map(str, unreadable[:20]))}"
+                           f"{', ...' if len(unreadable) > 20 else ''})")
+
     def _search_by_embedding_with_filter(self, query_embedding: VectorType, limit: int = 10,
                                          filter_criteria: Dict[str, Any] = None) -> List[Tuple[int, float]]:
         """
@@ -3354,16 +4441,68 @@ class SQLiteDocumentDatabase(DocumentDatabase):
     def _search_by_vector_extension(self, query_embedding: VectorType, limit: int = 10,
                                     filter_criteria: Dict[str, Any] = None) -> List[Tuple[int, float]]:
         """Search using vector extension."""
-        # Implementation would depend on which extension is loaded
-        # For now, fall back to similarity function
+        if self.vector_extension == "vec0" and self.vector_index_dimension:
+            results = self._search_by_vec0_index(query_embedding, limit, filter_criteria)
+            if results is not None:
+                return results
+
+        # sqlite-vss or a query the index cannot answer: use the similarity function
         return self._search_by_similarity_function(query_embedding, limit, filter_criteria)
 
+    def _search_by_vec0_index(self, query_embedding: VectorType, limit: int = 10,
+                              filter_criteria: Dict[str, Any] = None) -> Optional[List[Tuple[int, float]]]:
+        """
+        KNN search against the vec0 index with filters pushed down into the index scan.
+
+        Returns None when the query cannot be answered by the index (dimension mismatch,
+        limit above the sqlite-vec k cap, or a filter on a column the index does not carry).
+        """
+        if len(query_embedding) != self.vector_index_dimension or limit > VECTOR_INDEX_MAX_K:
+            return None
+
+        conditions = ["embedding MATCH ?", "k = ?"]
+        params: List[Any] = [self._serialize_vector(query_embedding), limit]
+
+        for key, value in (filter_criteria or {}).items():
+            if key in ("element_type", "doc_id"):
+                if isinstance(value, list):
+                    conditions.append(f"{key} IN (SELECT value FROM json_each(?))")
+                    params.append(json.dumps(value))
+                else:
+                    conditions.append(f"{key} = ?")
+                    params.append(value)
+            elif key == "exclude_doc_id":
+                # vec0 metadata columns do not handle NOT IN reliably; chain inequalities
+                for doc_id in (value if isinstance(value, list) else [value]):
+                    conditions.append("doc_id != ?")
+                    params.append(doc_id)
+            elif key == "element_pk_list" and isinstance(value, list):
+                if value:
+                    conditions.append("element_pk IN (SELECT value FROM json_each(?))")
+                    params.append(json.dumps(value))
+            else:
+                return None
+
+        cursor = self.conn.execute(
+            f"SELECT element_pk, distance FROM {VECTOR_INDEX_TABLE} "
+            f"WHERE {' AND '.join(conditions)} ORDER BY distance",
+            params
+        )
+
+        # Cosine distance -> cosine similarity
+        return [(row[0], 1.0 - float(row[1])) for row in cursor.fetchall()]
+
+    @staticmethod
+    def _serialize_vector(vector: VectorType) -> bytes:
+        """Serialize a vector to the little-endian float32 blob format used by sqlite-vec."""
+        if NUMPY_AVAILABLE:
+            return np.asarray(vector, dtype='<f4').tobytes()
+        return struct.pack(f"<{len(vector)}f", *vector)
+
     def _search_by_vector_extension_with_filter(self, query_embedding: VectorType, limit: int = 10,
                                                 filter_criteria: Dict[str, Any] = None) -> List[Tuple[int, float]]:
         """Search using vector extension with filtering."""
-        # Implementation would depend on which extension is loaded
-        # For now, fall back to similarity function
-        return self._search_by_similarity_function_with_filter(query_embedding, limit, filter_criteria)
+        return self._search_by_vector_extension(query_embedding, limit, filter_criteria)
 
     @staticmethod
     def _cosine_similarity_numpy(vec1: VectorType, vec2: VectorType) -> float:
@@ -3442,6 +4581,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
         FROM embeddings em
         WHERE em.confidence >= ?
         """
+        matrix = self._get_embedding_matrix() if query_embedding else None
         params = [min_confidence]
 
         # Add topic filtering conditions
@@ -3476,11 +4616,14 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             if exclude_conditions:
                 sql += " AND " + " AND ".join(exclude_conditions)
 
-        cursor = self.conn.execute(sql, params)
+        rows = self.conn.execute(sql, params).fetchall()
+
+        # Score all matching rows against the query in one pass when the matrix is available
+        matrix_similarities = matrix.similarities(query_embedding, [row[0] for row in rows]) if matrix else None
 
         # Calculate similarities if we have a query embedding
         results = []
-        for row in cursor.fetchall():
+        for row in rows:
             try:
                 topics = json.loads(row[3]) if row[3] else []
             except (json.JSONDecodeError, TypeError):
@@ -3493,9 +4636,11 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             }
 
             # Calculate similarity if we have a query embedding
-            if query_embedding:
+            if matrix_similarities is not None:
+                result['similarity'] = matrix_similarities.get(row[0], 0.0)
+            elif query_embedding:
                 try:
-                    embedding = json.loads(row[1])
+                    embedding = unpack_embedding(row[1])
                     if NUMPY_AVAILABLE:
                         similarity = self._cosine_similarity_numpy(query_embedding, embedding)
                     else:
@@ -3794,13 +4939,16 @@ class SQLiteDocumentDatabase(DocumentDatabase):
         # Final result structure
         result_tree: List[ElementHierarchical] = []
 
+        # Fetch the ancestry paths of all results at once
+        ancestries = self.get_element_ancestries([element_pk for element_pk, _ in elements])
+
         # Process each element from the search results
         for element_pk, score in elements:
             if element_pk in processed_elements:
                 continue
 
             # Find the complete ancestry path for this element
-            ancestry_path = self._get_element_ancestry_path(element_pk)
+            ancestry_path = ancestries.get(element_pk)
 
             if not ancestry_path:
                 continue
@@ -3837,64 +4985,48 @@ class SQLiteDocumentDatabase(DocumentDatabase):
 
         return result_tree
 
-    def _get_element_ancestry_path(self, element_pk: int) -> List["ElementBase"]:
+    @_read_operation
+    def get_element_ancestries(self, element_pks: List[int]) -> Dict[int, List[ElementBase]]:
         """
-        Get the complete ancestry path for an element, from root to the element itself.
-        """
-        from .element_element import ElementBase
-
-        # Get the element
-        element_dict = self.get_element(element_pk)
-        if not element_dict:
-            return []
-
-        # Convert to ElementBase instance
-        element = ElementBase(**element_dict)
-
-        # Start building the ancestry path with the element itself
-        ancestry = [element]
-
-        # Track to avoid circular references
-        visited = {element_pk}
-
-        # Current element to process
-        current_pk = element_pk
-
-        # Traverse up the hierarchy using parent_id
-        while True:
-            # Get the current element
-            current_element = self.get_element(current_pk)
-            if not current_element:
-                break
-
-            # Get parent ID
-            parent_id = current_element.get('parent_id')
-            if not parent_id:
-                break
-
-            # Get the parent element
-            parent_dict = self.get_element(parent_id)
-            if not parent_dict:
-                break
-
-            # Check for circular references
-            parent_pk = parent_dict.get('id') or parent_dict.get('pk') or parent_dict.get('element_id')
-            if parent_pk in visited:
-                break
+        Get the ancestry paths of several elements with one recursive query.
 
-            # Convert to ElementBase
-            parent = ElementBase(**parent_dict)
+        Args:
+            element_pks: Element primary keys
 
-            # Add to visited set
-            visited.add(parent_pk)
+        Returns:
+            Dictionary of element_pk to its ancestry path, from root to the element
+        """
+        if not self.conn:
+            raise ValueError("Database not initialized")
 
-            # Add parent to the beginning of the ancestry list (root first)
-            ancestry.insert(0, parent)
+        element_pks = list(dict.fromkeys(int(element_pk) for element_pk in element_pks))
+        if not element_pks:
+            return {}
 
-            # Move up to the parent
-            current_pk = parent_id
+        # UNION (not UNION ALL) visits each ancestor once, which also stops at cycles
+        placeholders = ', '.join(['?'] * len(element_pks))
+        cursor = self.conn.execute(
+            f"""
+            WITH RECURSIVE ancestry(element_pk, parent_id) AS (
+                SELECT element_pk, parent_id FROM elements WHERE element_pk IN ({placeholders})
+                UNION
+                SELECT e.element_pk, e.parent_id
+                FROM elements e JOIN ancestry a ON e.element_id = a.parent_id
+            )
+            SELECT * FROM elements WHERE element_pk IN (SELECT element_pk FROM ancestry)
+            """,
+            element_pks
+        )
+        elements = [self._row_to_element(row) for row in cursor.fetchall()]
+        by_pk = {element["element_pk"]: element for element in elements}
+        by_id = {element["element_id"]: element for element in elements}
 
-        return ancestry
+        ancestries = {}
+        for element_pk in element_pks:
+            ancestry = self._walk_ancestry(by_pk.get(element_pk), by_id.get)
+            if ancestry:
+                ancestries[element_pk] = ancestry
+        return ancestries
 
     # ========================================
     # TABLE CREATION
@@ -3929,7 +5061,8 @@ class SQLiteDocumentDatabase(DocumentDatabase):
                 content_preview TEXT,
                 content_location TEXT,
                 content_hash TEXT,
-                metadata TEXT
+                metadata TEXT,
+                full_content TEXT
             )
             """)
 
@@ -4140,7 +5273,7 @@ class SQLiteDocumentDatabase(DocumentDatabase):
             self.conn.execute("""
             CREATE TABLE IF NOT EXISTS embeddings (
                 element_pk INTEGER PRIMARY KEY REFERENCES elements(element_pk) ON DELETE CASCADE,
-                embedding TEXT,
+                embedding BLOB,
                 dimensions INTEGER,
                 topics TEXT DEFAULT '[]',
                 confidence REAL DEFAULT 1.0,
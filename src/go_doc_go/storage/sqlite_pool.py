@@ -0,0 +1,242 @@
+"""
+Read/write split connection management for the SQLite backend.
+
+SQLite allows any number of readers alongside a single writer when the database
+is in WAL mode. The pool holds one serialized writer connection and a bounded set
+of read-only connections that are checked out for each read operation, so searches
+served by a threaded server do not queue behind ingestion writes.
+"""
+
+import logging
+import queue
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _ReaderLease:
+    """A read connection held by one thread outside ``reading()``, returned when the thread ends."""
+
+    def __init__(self, pool: 'SQLiteConnectionPool', conn: Any):
+        self.conn = conn
+        # The lease lives in thread-local storage, so it is collected when its thread exits
+        self._finalizer = weakref.finalize(self, pool._checkin, conn)
+
+    def release(self) -> None:
+        """Return the connection to the pool now."""
+        self._finalizer()
+
+
+class SQLiteConnectionPool:
+    """
+    A single writer connection plus a pool of read-only connections.
+
+    The thread that created the pool, and any thread inside ``writing()``, uses the
+    writer; in ``reading()`` such threads hold the write lock. Other threads check out
+    a read-only connection for the duration of a ``reading()`` block; outside one they
+    keep it until they exit or call ``release()``. With ``read_pool_size`` 0 every
+    thread uses the writer.
+    """
+
+    def __init__(self, connect: Callable[[bool], Any], read_pool_size: int = 4,
+                 read_timeout: Optional[float] = 30.0):
+        """
+        Initialize the pool and open the writer connection.
+
+        Args:
+            connect: Opens a connection; called with True for a read-only connection
+            read_pool_size: Maximum number of read-only connections (0 disables them)
+            read_timeout: Seconds to wait for a free read connection (None waits forever)
+        """
+        self._connect = connect
+        self.read_pool_size = max(0, int(read_pool_size))
+        self.read_timeout = read_timeout
+        self.writer = connect(False)
+
+        self._owner = threading.current_thread()
+        self._local = threading.local()
+        self._write_lock = threading.RLock()
+        self._lock = threading.Lock()
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._readers_open = 0
+        self._closed = False
+        self._data_version = None
+
+        self._read_checkouts = 0
+        self._read_waits = 0
+        self._read_wait_seconds = 0.0
+        self._read_max_wait_seconds = 0.0
+        self._write_acquisitions = 0
+        self._write_wait_seconds = 0.0
+        self._write_max_wait_seconds = 0.0
+
+    def disable_readers(self) -> None:
+        """Route all threads to the writer, e.g. when WAL mode is not available."""
+        self.read_pool_size = 0
+
+    def connection(self) -> Any:
+        """Get the connection the calling thread should use."""
+        if self._uses_writer():
+            return self.writer
+
+        reader = getattr(self._local, 'reader', None)
+        if reader is not None:
+            return reader
+
+        lease = getattr(self._local, 'lease', None)
+        if lease is None:
+            lease = _ReaderLease(self, self._checkout())
+            self._local.lease = lease
+        return lease.conn
+
+    @contextmanager
+    def writing(self) -> Iterator[Any]:
+        """Hold the writer for the duration of the block; reentrant within a thread."""
+        start = time.monotonic()
+        self._write_lock.acquire()
+        waited = time.monotonic() - start
+        self._local.write_depth = getattr(self._local, 'write_depth', 0) + 1
+        with self._lock:
+            self._write_acquisitions += 1
+            self._write_wait_seconds += waited
+            self._write_max_wait_seconds = max(self._write_max_wait_seconds, waited)
+        try:
+            yield self.writer
+        finally:
+            self._local.write_depth -= 1
+            self._write_lock.release()
+
+    @contextmanager
+    def reading(self) -> Iterator[Any]:
+        """
+        Hold a read connection for the duration of the block; reentrant within a thread.
+
+        Threads that read through the writer hold the write lock meanwhile, so they
+        never see another thread's uncommitted writes on the shared connection.
+        """
+        if self._uses_writer():
+            with self._write_lock:
+                yield self.writer
+            return
+
+        if getattr(self._local, 'reader', None) is not None:
+            yield self._local.reader
+            return
+
+        conn = self._checkout()
+        self._local.reader = conn
+        try:
+            yield conn
+        finally:
+            self._local.reader = None
+            self._checkin(conn)
+
+    def release(self) -> None:
+        """Return the calling thread's read connection held outside ``reading()``, if any."""
+        lease = getattr(self._local, 'lease', None)
+        if lease is not None:
+            self._local.lease = None
+            lease.release()
+
+    def data_version(self) -> Any:
+        """
+        Get PRAGMA data_version from the writer.
+
+        The value changes when another process commits. It is read without waiting
+        for a write in progress; the last value seen is returned in that case.
+        """
+        if self._write_lock.acquire(blocking=False):
+            try:
+                self._data_version = self.writer.execute("PRAGMA data_version").fetchone()[0]
+            finally:
+                self._write_lock.release()
+        return self._data_version
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get pool size and wait time metrics."""
+        with self._lock:
+            return {
+                'read_pool_size': self.read_pool_size,
+                'readers_open': self._readers_open,
+                'readers_idle': self._idle.qsize(),
+                'read_checkouts': self._read_checkouts,
+                'read_waits': self._read_waits,
+                'read_wait_seconds': self._read_wait_seconds,
+                'read_max_wait_seconds': self._read_max_wait_seconds,
+                'write_acquisitions': self._write_acquisitions,
+                'write_wait_seconds': self._write_wait_seconds,
+                'write_max_wait_seconds': self._write_max_wait_seconds,
+            }
+
+    def close(self) -> None:
+        """Close the writer and all idle read connections; leased ones close on return."""
+        with self._lock:
+            self._closed = True
+        with self._write_lock:
+            self.writer.close()
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def _uses_writer(self) -> bool:
+        """Whether the calling thread should use the writer connection."""
+        return (self.read_pool_size == 0 or bool(getattr(self._local, 'write_depth', 0))
+                or threading.current_thread() is self._owner)
+
+    def _checkout(self) -> Any:
+        """Take an idle read connection, open a new one, or wait for one to be returned."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Connection pool is closed")
+            self._read_checkouts += 1
+            create = self._idle.empty() and self._readers_open < self.read_pool_size
+            if create:
+                self._readers_open += 1
+
+        if create:
+            try:
+                return self._connect(True)
+            except Exception:
+                with self._lock:
+                    self._readers_open -= 1
+                raise
+
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        start = time.monotonic()
+        try:
+            conn = self._idle.get(timeout=self.read_timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No SQLite read connection available after {self.read_timeout}s")
+        waited = time.monotonic() - start
+        with self._lock:
+            self._read_waits += 1
+            self._read_wait_seconds += waited
+            self._read_max_wait_seconds = max(self._read_max_wait_seconds, waited)
+        logger.debug(f"Waited {waited:.3f}s for a SQLite read connection")
+        return conn
+
+    def _checkin(self, conn: Any) -> None:
+        """Return a read connection to the pool."""
+        with self._lock:
+            closed = self._closed
+            if closed:
+                self._readers_open -= 1
+        if closed:
+            conn.close()
+            return
+        try:
+            # End any read transaction left open by an unfinished cursor
+            conn.rollback()
+        except Exception:
+            pass
+        self._idle.put(conn)
@@ -10,6 +10,7 @@ Key Components:
 - Logical operators and query composition
 - Backend capability system
 - Query builder with fluent interface
+- Query planner with filter and limit pushdown
 - Serialization support
 
 Usage:
@@ -23,11 +24,12 @@ Usage:
 """
 
 import logging
+import time
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional, List, Dict, Any, Literal, Set
+from typing import Optional, List, Dict, Any, Literal, Set, Callable, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -182,6 +184,8 @@ class TextSearchCriteria:
     similarity_operator: SimilarityOperator = SimilarityOperator.GREATER_EQUAL
     boost_factor: float = 1.0
     search_fields: List[str] = field(default_factory=list)  # Specific fields to search
+    use_full_text_search: bool = False  # Keyword search on the backend's full-text index (SQLite: no threshold)
+    full_text_prefilter: bool = False  # Restrict the semantic search to keyword matches
 
     def __post_init__(self):
         if not 0.0 <= self.similarity_threshold <= 1.0:
@@ -491,7 +495,9 @@ class StructuredSearchQuery:
                 "similarity_threshold": group.text_criteria.similarity_threshold,
                 "similarity_operator": group.text_criteria.similarity_operator.value,
                 "boost_factor": group.text_criteria.boost_factor,
-                "search_fields": group.text_criteria.search_fields
+                "search_fields": group.text_criteria.search_fields,
+                "use_full_text_search": group.text_criteria.use_full_text_search,
+                "full_text_prefilter": group.text_criteria.full_text_prefilter
             }
 
         if group.embedding_criteria:
@@ -591,13 +597,16 @@ class SearchQueryBuilder:
 
     # Text search
     def text_search(self, query_text: str, similarity_threshold: float = 0.7,
-                    boost_factor: float = 1.0, search_fields: List[str] = None):
+                    boost_factor: float = 1.0, search_fields: List[str] = None,
+                    use_full_text_search: bool = False, full_text_prefilter: bool = False):
         """Add text search criteria."""
         self._current_group.text_criteria = TextSearchCriteria(
             query_text=query_text,
             similarity_threshold=similarity_threshold,
             boost_factor=boost_factor,
-            search_fields=search_fields or []
+            search_fields=search_fields or [],
+            use_full_text_search=use_full_text_search,
+            full_text_prefilter=full_text_prefilter
         )
         return self
 
@@ -827,6 +836,214 @@ class SearchQueryBuilder:
         )
 
 
+# ============================================================================
+# QUERY PLANNING
+# ============================================================================
+
+# Relative cost of evaluating each criterion type. In AND groups cheaper criteria
+# run first so their element_pk sets can be pushed down into the expensive ones.
+CRITERIA_COSTS = {
+    "element": 1,
+    "metadata": 2,
+    "date": 2,
+    "topic": 3,
+    "subgroup": 4,
+    "text": 5,
+    "embedding": 5,
+}
+
+# Criteria whose matches all get the same score, so any subset of their matches
+# ranks the same way
+FILTER_CRITERIA = {"element", "metadata", "date"}
+
+# Rows returned by a scored criterion when no tighter limit applies
+DEFAULT_CRITERIA_LIMIT = 1000
+
+
+@dataclass
+class PlanStep:
+    """One criterion of a planned criteria group."""
+    kind: str  # "text", "embedding", "date", "topic", "metadata", "element" or "subgroup"
+    criteria: Any  # The criteria object, or the QueryPlan of a sub-group
+    cost: int
+    estimated_rows: Optional[int] = None
+    pushdown: bool = False  # Restricted to the element_pks matched by earlier steps
+    limit: Optional[int] = None  # Maximum rows to return (None for all matches)
+
+    # Filled in when the plan is executed
+    input_rows: Optional[int] = None
+    actual_rows: Optional[int] = None
+    elapsed: Optional[float] = None
+    skipped: bool = False
+
+
+@dataclass
+class QueryPlan:
+    """Execution order and pushdown decisions for a criteria group."""
+    operator: LogicalOperator
+    steps: List[PlanStep]
+    limit: Optional[int] = None  # Rows needed by the caller when the plan stops early
+
+    def explain(self, indent: int = 0) -> str:
+        """Render the plan as EXPLAIN-style text, including actual rows once executed."""
+        pad = "  " * indent
+        header = f"{pad}{self.operator.value}"
+        if self.limit is not None:
+            header += f" (early stop at {self.limit})"
+        lines = [header]
+
+        for number, step in enumerate(self.steps, 1):
+            details = [f"cost={step.cost}",
+                       f"est={step.estimated_rows if step.estimated_rows is not None else '?'}"]
+            if step.pushdown:
+                details.append("pushdown")
+            if step.limit is not None:
+                details.append(f"limit={step.limit}")
+            if step.skipped:
+                details.append("skipped")
+            elif step.actual_rows is not None:
+                if step.input_rows is not None:
+                    details.append(f"in={step.input_rows}")
+                details.append(f"rows={step.actual_rows}")
+                details.append(f"time={step.elapsed * 1000:.1f}ms")
+            lines.append(f"{pad}  {number}. {step.kind} ({' '.join(details)})")
+            if step.kind == "subgroup":
+                lines.append(step.criteria.explain(indent + 2))
+
+        return "\n".join(lines)
+
+
+class QueryPlanner:
+    """
+    Orders the criteria of a group and decides what is pushed down.
+
+    AND groups run criteria cheapest first (by cost, then estimated rows) and pass
+    the element_pks matched so far to each later criterion. NOT groups pass the
+    base criterion's matches to the excluded ones. When an AND group has at most
+    one scored criterion, it runs last and only its top ``limit`` rows are needed.
+    """
+
+    def __init__(self, estimate_rows: Optional[Callable[[str, Any], Optional[int]]] = None):
+        """
+        Initialize the planner.
+
+        Args:
+            estimate_rows: Optional backend callback estimating the rows matched by a
+                criterion, called with the criterion kind and criteria object
+        """
+        self.estimate_rows = estimate_rows
+
+    def plan(self, group: SearchCriteriaGroup, limit: Optional[int] = None) -> QueryPlan:
+        """
+        Plan a criteria group.
+
+        Args:
+            group: The criteria group
+            limit: Rows needed from the group, enabling early stop (None for all)
+
+        Returns:
+            The query plan
+        """
+        steps = []
+        for kind, criteria in self._group_criteria(group):
+            estimated_rows = None
+            if self.estimate_rows:
+                try:
+                    estimated_rows = self.estimate_rows(kind, criteria)
+                except Exception as e:
+                    logger.debug(f"Could not estimate rows for {kind} criteria: {str(e)}")
+            steps.append(PlanStep(kind, criteria, CRITERIA_COSTS[kind], estimated_rows))
+
+        for sub_group in group.sub_groups:
+            steps.append(PlanStep("subgroup", self.plan(sub_group), CRITERIA_COSTS["subgroup"]))
+
+        plan = QueryPlan(group.operator, steps)
+
+        if group.operator == LogicalOperator.AND:
+            steps.sort(key=lambda step: (step.cost, step.estimated_rows
+                                         if step.estimated_rows is not None else float("inf")))
+        if group.operator in (LogicalOperator.AND, LogicalOperator.NOT):
+            for step in steps[1:]:
+                step.pushdown = True
+
+        for step in steps:
+            if step.kind in FILTER_CRITERIA and group.operator != LogicalOperator.OR:
+                step.limit = None  # Exact candidate sets are needed for pushdown
+            elif step.kind != "subgroup":
+                step.limit = DEFAULT_CRITERIA_LIMIT
+
+        scored = [step for step in steps if step.kind not in FILTER_CRITERIA]
+        if (limit is not None and steps and group.operator == LogicalOperator.AND
+                and len(scored) <= 1 and steps[-1].kind != "subgroup"):
+            plan.limit = limit
+            steps[-1].limit = min(limit, steps[-1].limit) if steps[-1].limit is not None else limit
+
+        return plan
+
+    @staticmethod
+    def _group_criteria(group: SearchCriteriaGroup) -> List[Tuple[str, Any]]:
+        """Get the (kind, criteria) pairs set on a group, in declaration order."""
+        criteria = [
+            ("text", group.text_criteria),
+            ("embedding", group.embedding_criteria),
+            ("date", group.date_criteria),
+            ("topic", group.topic_criteria),
+            ("metadata", group.metadata_criteria),
+            ("element", group.element_criteria),
+        ]
+        return [(kind, value) for kind, value in criteria if value is not None]
+
+
+def execute_plan(plan: QueryPlan,
+                 execute_step: Callable[[PlanStep, Optional[Set[int]]], List[Dict[str, Any]]],
+                 combine: Callable[[List[Tuple[str, List[Dict[str, Any]]]], LogicalOperator], List[Dict[str, Any]]],
+                 candidates: Optional[Set[int]] = None) -> List[Dict[str, Any]]:
+    """
+    Execute a query plan.
+
+    Args:
+        plan: The plan to execute
+        execute_step: Backend callback running one criterion, restricted to the given
+            element_pks when not None (backends may push the set into their query)
+        combine: Backend callback combining (kind, results) pairs with an operator
+        candidates: element_pks the whole group is restricted to
+
+    Returns:
+        Combined results of the group
+    """
+    all_results = []
+    for index, step in enumerate(plan.steps):
+        step_candidates = candidates if (step.pushdown or index == 0) else None
+        if plan.operator == LogicalOperator.OR:
+            step_candidates = candidates
+
+        if step_candidates is not None and not step_candidates:
+            for remaining in plan.steps[index:]:
+                remaining.skipped = True
+            return []
+
+        start = time.perf_counter()
+        if step.kind == "subgroup":
+            results = execute_plan(step.criteria, execute_step, combine, step_candidates)
+        else:
+            results = execute_step(step, step_candidates)
+        if step_candidates is not None:
+            results = [result for result in results if result['element_pk'] in step_candidates]
+
+        step.input_rows = len(step_candidates) if step_candidates is not None else None
+        step.actual_rows = len(results)
+        step.elapsed = time.perf_counter() - start
+        all_results.append((step.kind, results))
+
+        matched = {result['element_pk'] for result in results}
+        if plan.operator == LogicalOperator.AND:
+            candidates = matched if candidates is None else candidates & matched
+        elif plan.operator == LogicalOperator.NOT and index == 0:
+            candidates = matched
+
+    return combine(all_results, plan.operator)
+
+
 # ============================================================================
 # UTILITY FUNCTIONS
 # ============================================================================
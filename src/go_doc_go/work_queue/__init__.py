@@ -3,16 +3,23 @@ Document processing queue system for distributed work coordination.
 
 This module provides a work queue implementation that allows multiple workers
 to process documents in parallel without duplication. It uses PostgreSQL's
-row-level locking to ensure atomic work claiming.
+row-level locking to ensure atomic work claiming, or an embedded SQLite queue
+with leased claims for worker processes on a single host.
 
 Key Features:
 - Config-based run coordination (same config = same run)
 - Atomic document claiming with FOR UPDATE SKIP LOCKED
 - Automatic retry with exponential backoff
 - Worker heartbeat and failure detection
+- Change notification for idle workers instead of polling
 - Link discovery and dynamic queue addition
+- Pluggable queue backends (PostgreSQL or embedded SQLite)
 """
 
+from .backend import QueueBackend, PostgresQueueBackend, get_queue_backend
+from .notifier import QueueNotifier
+from .sqlite_queue import SQLiteQueueBackend
 from .work_queue import WorkQueue, RunCoordinator
 
-__all__ = ['WorkQueue', 'RunCoordinator']
\ No newline at end of file
+__all__ = ['WorkQueue', 'RunCoordinator', 'QueueBackend', 'PostgresQueueBackend', 'SQLiteQueueBackend',
+           'QueueNotifier', 'get_queue_backend']
\ No newline at end of file
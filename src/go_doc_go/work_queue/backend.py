@@ -0,0 +1,153 @@
+"""
+Pluggable storage backends for the work queue.
+
+A queue backend creates the WorkQueue, RunCoordinator and DeadLetterQueue for one
+queue store. The PostgreSQL backend uses the SQL in work_queue.py and schema.sql;
+the embedded SQLite backend keeps the queue in a local file so that worker
+processes on one host can share a run without any external service.
+"""
+
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+
+from .dead_letter import DeadLetterQueue
+from .migrations import check_schema_exists, create_schema
+from .notifier import PostgresQueueNotifier, QueueNotifier
+from .work_queue import WorkQueue, RunCoordinator
+
+logger = logging.getLogger(__name__)
+
+
+class QueueBackend(ABC):
+    """Abstract base class for work queue stores."""
+
+    # True when the queue needs no external service, so all workers run on this host
+    embedded = False
+
+    @abstractmethod
+    def initialize(self) -> None:
+        """Create the queue schema if it does not exist."""
+        pass
+
+    @abstractmethod
+    def create_work_queue(self, worker_id: str) -> WorkQueue:
+        """
+        Create a work queue for a worker.
+
+        Args:
+            worker_id: Unique worker identifier
+
+        Returns:
+            WorkQueue instance
+        """
+        pass
+
+    @abstractmethod
+    def create_run_coordinator(self, worker_id: str) -> RunCoordinator:
+        """
+        Create a run coordinator for a worker.
+
+        Args:
+            worker_id: Unique worker identifier
+
+        Returns:
+            RunCoordinator instance
+        """
+        pass
+
+    @abstractmethod
+    def create_dead_letter_queue(self, max_retries: int = 3) -> DeadLetterQueue:
+        """
+        Create a dead letter queue manager.
+
+        Args:
+            max_retries: Maximum retry attempts before dead lettering
+
+        Returns:
+            DeadLetterQueue instance
+        """
+        pass
+
+    def close(self) -> None:
+        """Close connections held by the backend."""
+        pass
+
+
+class PostgresQueueBackend(QueueBackend):
+    """Work queue stored in PostgreSQL, shared by workers on any number of hosts."""
+
+    def __init__(self, db):
+        """
+        Initialize the backend.
+
+        Args:
+            db: Database connection supporting execute(), execute_raw() and transaction()
+        """
+        self.db = db
+        # LISTEN needs its own connection, opened from the database's connection parameters
+        conn_params = getattr(db, 'conn_params', None)
+        self.notifier = PostgresQueueNotifier(conn_params) if conn_params else QueueNotifier()
+
+    def initialize(self) -> None:
+        """Create the queue schema if it does not exist."""
+        if not check_schema_exists(self.db):
+            create_schema(self.db)
+
+    def create_work_queue(self, worker_id: str) -> WorkQueue:
+        """Create a work queue for a worker."""
+        return WorkQueue(self.db, worker_id, self.notifier)
+
+    def create_run_coordinator(self, worker_id: str) -> RunCoordinator:
+        """Create a run coordinator for a worker."""
+        return RunCoordinator(self.db, worker_id)
+
+    def create_dead_letter_queue(self, max_retries: int = 3) -> DeadLetterQueue:
+        """Create a dead letter queue manager."""
+        return DeadLetterQueue(self.db, max_retries)
+
+    def close(self) -> None:
+        """Close the notification connection."""
+        self.notifier.close()
+
+
+def get_queue_config(config: Any) -> Dict[str, Any]:
+    """
+    Get the work queue settings (processing.queue) from a Config or dictionary.
+
+    Args:
+        config: Config object or configuration dictionary
+
+    Returns:
+        Queue configuration dictionary
+    """
+    config_data = config.config if hasattr(config, 'config') else config
+    return config_data.get('processing', {}).get('queue', {}) or {}
+
+
+def get_queue_backend(config: Any) -> QueueBackend:
+    """
+    Factory function to create the work queue backend from configuration.
+
+    Args:
+        config: Config object (processing.queue.backend selects the backend)
+
+    Returns:
+        QueueBackend instance
+
+    Raises:
+        ValueError: If the queue backend is not supported
+    """
+    queue_config = get_queue_config(config)
+    backend_type = queue_config.get('backend', 'postgresql')
+
+    if backend_type == 'sqlite':
+        from .sqlite_queue import SQLiteQueueBackend
+        path = os.path.expanduser(queue_config.get('path', './data/work_queue.db'))
+        return SQLiteQueueBackend(path, busy_timeout=queue_config.get('busy_timeout', 30.0))
+    elif backend_type.startswith('postgres'):
+        # The queue tables live alongside the documents in the PostgreSQL database
+        return PostgresQueueBackend(config.get_document_database())
+    else:
+        raise ValueError(f"Unsupported work queue backend: {backend_type}")
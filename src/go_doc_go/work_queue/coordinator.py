@@ -4,11 +4,13 @@ Elected leader worker for managing distributed document processing runs.
 
 import logging
 import time
+import uuid
 from typing import Dict, Any, List, Optional
 
 from ..config import Config
 from ..content_source.factory import get_content_source
-from .work_queue import WorkQueue, RunCoordinator
+from .backend import get_queue_backend
+from .work_queue import RunCoordinator
 
 logger = logging.getLogger(__name__)
 
@@ -30,11 +32,12 @@ class ElectedLeaderWorker:
         self.config = config
         self.worker_id = worker_id
         self.db = None
+        self.queue_backend = None
         self.work_queue = None
         self.run_coordinator = None
         self.is_leader = False
         
-        logger.info(f"Initialized ElectedLeaderWorker: {self.worker_id}")
+        logger.info(f"Initialized {type(self).__name__}: {self.worker_id}")
     
     def run_as_worker_with_leader_duties(self, source_configs: Optional[List[Dict]] = None,
                                         max_link_depth: Optional[int] = None) -> Dict[str, Any]:
@@ -127,8 +130,10 @@ class ElectedLeaderWorker:
         logger.debug(f"Database initialized: {type(self.db).__name__}")
         
         # Initialize work queue and run coordinator with worker ID
-        self.work_queue = WorkQueue(self.db, self.worker_id)
-        self.run_coordinator = RunCoordinator(self.db, self.worker_id)
+        self.queue_backend = get_queue_backend(self.config)
+        self.queue_backend.initialize()
+        self.work_queue = self.queue_backend.create_work_queue(self.worker_id)
+        self.run_coordinator = self.queue_backend.create_run_coordinator(self.worker_id)
         
         logger.debug("Coordinator components initialized")
     
@@ -166,39 +171,29 @@ class ElectedLeaderWorker:
                 # Create content source
                 source = get_content_source(source_config)
                 
-                # List all documents
-                documents = source.list_documents()
-                logger.info(f"Found {len(documents)} documents in source {source_name}")
+                # Store the source configuration once for the run; queued rows refer to it by name
+                self.work_queue.register_source(run_id, source_config)
                 
-                # Add each document to queue
-                queued_count = 0
-                for doc in documents:
-                    try:
-                        queue_id = self.work_queue.add_document(
-                            doc_id=doc['id'],
-                            source_name=source_name,
-                            run_id=run_id,
-                            source_type='configured',
-                            metadata={
-                                'max_link_depth': source_config.get('max_link_depth', 1),
-                                'source_config': source_config
-                            }
-                        )
-                        queued_count += 1
-                        total_queued += 1
-                        
-                        logger.debug(f"Queued document {doc['id']} with queue_id {queue_id}")
-                        
-                    except Exception as e:
-                        logger.error(f"Failed to queue document {doc['id']}: {str(e)}")
+                # Stream the listing into the queue in chunks
+                found = 0
+                
+                def listed_ids():
+                    nonlocal found
+                    for doc in source.iter_documents():
+                        found += 1
+                        yield doc['id']
+                
+                queued_count = self.work_queue.add_documents(listed_ids(), source_name, run_id)
+                total_queued += queued_count
+                logger.info(f"Found {found} documents in source {source_name}")
                 
                 source_stats.append({
                     "source_name": source_name,
-                    "documents_found": len(documents),
+                    "documents_found": found,
                     "documents_queued": queued_count
                 })
                 
-                logger.info(f"Completed source {source_name}: {queued_count}/{len(documents)} queued")
+                logger.info(f"Completed source {source_name}: {queued_count}/{found} queued")
                 
             except Exception as e:
                 logger.error(f"Error processing source {source_name}: {str(e)}")
@@ -226,7 +221,7 @@ class ElectedLeaderWorker:
         
         Args:
             run_id: Processing run ID
-            check_interval: How often to check status (seconds)
+            check_interval: Longest wait between status checks without a change notification (seconds)
             max_wait_time: Maximum time to wait (seconds)
             
         Returns:
@@ -236,6 +231,8 @@ class ElectedLeaderWorker:
         
         start_time = time.time()
         last_status_time = 0
+        # Keep notifications that arrive between a status check and the wait
+        self.work_queue.notifier.listen()
         
         while True:
             current_time = time.time()
@@ -246,8 +243,8 @@ class ElectedLeaderWorker:
                 logger.error(f"Processing timeout after {elapsed} seconds")
                 break
             
-            # Get queue status
-            queue_status = self.work_queue.get_queue_status(run_id)
+            # Get queue status from the trigger-maintained counters
+            queue_status = self.work_queue.get_status_counts(run_id)
             
             if not queue_status:
                 logger.warning("No queue status available - assuming completion")
@@ -275,11 +272,11 @@ class ElectedLeaderWorker:
                 logger.info("All documents processed - completion detected")
                 break
             
-            # Wait before next check
-            time.sleep(check_interval)
+            # Wait for a status change, checking again after check_interval at the latest
+            self.work_queue.wait_for_change(check_interval)
         
         # Get final statistics
-        final_status = self.work_queue.get_queue_status(run_id)
+        final_status = self.work_queue.get_status_counts(run_id) or {}
         completion_stats = {
             "documents_processed": final_status.get('completed', 0),
             "documents_failed": final_status.get('failed', 0),
@@ -348,15 +345,7 @@ class ElectedLeaderWorker:
         """
         try:
             # Query the work queue for completed documents in this run
-            queue_status_query = """
-                SELECT DISTINCT doc_id, source_name, completed_at
-                FROM document_queue 
-                WHERE run_id = %s 
-                AND status = 'completed'
-                ORDER BY completed_at
-            """
-            
-            completed_queue_items = self.db.execute(queue_status_query, (run_id,))
+            completed_queue_items = self.work_queue.get_completed_documents(run_id)
             
             # Convert queue items to document info format expected by post-processing
             completed_docs = []
@@ -373,4 +362,93 @@ class ElectedLeaderWorker:
             
         except Exception as e:
             logger.error(f"Error retrieving processed documents for run {run_id}: {str(e)}")
-            return []
\ No newline at end of file
+            return []
+
+
+class ProcessingCoordinator(ElectedLeaderWorker):
+    """
+    Coordinator for a distributed processing run.
+    
+    Queues the documents of the configured sources. When processing.local_workers
+    is set it also runs that many worker processes on this host, waits for the
+    queue to drain and performs post-processing; with the embedded SQLite queue
+    backend this needs no external services.
+    """
+    
+    def __init__(self, config: Config, coordinator_id: Optional[str] = None):
+        """
+        Initialize processing coordinator.
+        
+        Args:
+            config: Configuration object
+            coordinator_id: Optional coordinator ID (generates one if not provided)
+        """
+        super().__init__(config, coordinator_id or f"coordinator_{uuid.uuid4().hex[:8]}")
+        self.coordinator_id = self.worker_id
+    
+    def coordinate_processing_run(self, source_configs: Optional[List[Dict]] = None,
+                                  max_link_depth: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Queue the documents of a run and, if configured, process them with local workers.
+        
+        Args:
+            source_configs: Optional list of content source configs (overrides config)
+            max_link_depth: Optional override for max link depth
+            
+        Returns:
+            Run statistics
+        """
+        start_time = time.time()
+        self._initialize_components()
+        
+        run_id = RunCoordinator.get_run_id_from_config(self.config.config)
+        self.run_coordinator.ensure_run_exists(run_id, self.config.config)
+        logger.info(f"Coordinating processing run {run_id}")
+        
+        sources_to_process = source_configs or self.config.get_content_sources()
+        queuing_stats = self._discover_and_queue_documents(sources_to_process, run_id, max_link_depth)
+        
+        stats = {
+            "run_id": run_id,
+            "coordinator_id": self.coordinator_id,
+            "documents_queued": queuing_stats["documents_queued"],
+            "sources_processed": queuing_stats["sources_processed"]
+        }
+        
+        num_workers = int(self.config.config.get('processing', {}).get('local_workers', 0) or 0)
+        if num_workers > 0:
+            worker_stats = self._run_local_workers(run_id, num_workers)
+            completion_stats = self._wait_for_processing_completion(run_id, check_interval=1)
+            post_processing_stats = self._perform_post_processing(run_id)
+            
+            stats.update({
+                "local_workers": num_workers,
+                "documents_processed": completion_stats["documents_processed"],
+                "documents_failed": completion_stats["documents_failed"],
+                "elements_created": worker_stats["elements_created"],
+                "relationships_created": worker_stats["relationships_created"],
+                "links_discovered": worker_stats["links_discovered"],
+                "cross_document_relationships": post_processing_stats.get("relationships_created", 0)
+            })
+        
+        stats["total_runtime_seconds"] = time.time() - start_time
+        logger.info(f"Processing run {run_id} coordinated: {stats}")
+        return stats
+    
+    def _run_local_workers(self, run_id: str, num_workers: int) -> Dict[str, Any]:
+        """
+        Run worker processes on this host until the queue of the run is drained.
+        
+        Args:
+            run_id: Processing run ID
+            num_workers: Number of worker processes
+            
+        Returns:
+            Combined worker statistics
+        """
+        from .worker import WorkerManager
+        
+        logger.info(f"Starting {num_workers} local worker processes for run {run_id}")
+        manager = WorkerManager(self.config, num_workers, mode="process", wait_for_work=True,
+                                worker_id_prefix=f"{self.coordinator_id}_worker")
+        return manager.start_all()
@@ -3,7 +3,11 @@ Queue-enabled document processor for distributed document processing.
 """
 
 import logging
+import threading
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
 from typing import Dict, Any, Optional, List
 
 from ..document_parser.factory import get_parser_for_content
@@ -22,7 +26,10 @@ class QueuedDocumentProcessor:
     """
     
     def __init__(self, db, work_queue: WorkQueue, relationship_detector: RelationshipDetector,
-                 embedding_generator: Optional[EmbeddingGenerator] = None):
+                 embedding_generator: Optional[EmbeddingGenerator] = None,
+                 dead_letter_queue: Optional[DeadLetterQueue] = None,
+                 max_batch_size: int = 16, prefetch_depth: int = 2,
+                 batch_target_seconds: float = 5.0):
         """
         Initialize the queued document processor.
         
@@ -31,23 +38,47 @@ class QueuedDocumentProcessor:
             work_queue: WorkQueue instance for claiming and managing work
             relationship_detector: Detector for document relationships
             embedding_generator: Optional embedding generator
+            dead_letter_queue: Optional dead letter queue (defaults to one on db)
+            max_batch_size: Upper bound on documents claimed per queue round trip
+            prefetch_depth: Number of claimed documents whose content is fetched in
+                the background while the current one is processed (0 disables)
+            batch_target_seconds: Processing time a claimed batch should take; the
+                batch size is adapted to the observed time per document
         """
         self.db = db
         self.work_queue = work_queue
         self.relationship_detector = relationship_detector
         self.embedding_generator = embedding_generator
         self.worker_id = work_queue.worker_id
-        self.dead_letter_queue = DeadLetterQueue(db)
+        self.dead_letter_queue = dead_letter_queue or DeadLetterQueue(db)
+        self.max_batch_size = max(1, max_batch_size)
+        self.prefetch_depth = max(0, prefetch_depth)
+        self.batch_target_seconds = batch_target_seconds
+        self._avg_document_seconds: Optional[float] = None
+        self._stop_requested = threading.Event()
         
         logger.info(f"Initialized QueuedDocumentProcessor for worker {self.worker_id}")
     
-    def process_documents(self, run_id: str, max_documents: Optional[int] = None) -> Dict[str, Any]:
+    def stop(self) -> None:
+        """
+        Stop processing after the current document.
+        
+        Documents claimed but not yet processed are released to other workers.
+        """
+        self._stop_requested.set()
+    
+    def process_documents(self, run_id: str, max_documents: Optional[int] = None,
+                          wait_for_work: bool = False, poll_interval: float = 1.0) -> Dict[str, Any]:
         """
         Process documents from the queue until no more work is available.
         
         Args:
             run_id: Processing run ID
             max_documents: Optional limit on number of documents to process
+            wait_for_work: Keep polling while other workers still hold documents or
+                retries are scheduled, so the run is drained before returning
+            poll_interval: Longest wait for a queue change notification before checking
+                for work again
             
         Returns:
             Processing statistics
@@ -62,73 +93,51 @@ class QueuedDocumentProcessor:
         
         logger.info(f"Worker {self.worker_id} starting document processing for run {run_id}")
         
+        if wait_for_work:
+            # Keep notifications that arrive between checking for work and waiting
+            self.work_queue.notifier.listen()
+        
         documents_processed = 0
-        while max_documents is None or documents_processed < max_documents:
-            # Claim next document from queue
-            claimed_doc = self.work_queue.claim_next_document(run_id)
-            
-            if not claimed_doc:
-                logger.debug(f"No more work available for worker {self.worker_id}")
-                break
-            
-            doc_id = claimed_doc['doc_id']
-            queue_id = claimed_doc['queue_id']
-            source_name = claimed_doc['source_name']
-            
-            logger.info(f"Worker {self.worker_id} processing document: {doc_id} (queue_id: {queue_id})")
-            
-            try:
-                # Process the document
-                processing_result = self._process_single_document(
-                    doc_id, source_name, claimed_doc, run_id
-                )
-                
-                # Update statistics
-                stats["documents_processed"] += 1
-                stats["elements_created"] += processing_result.get("elements_created", 0)
-                stats["relationships_created"] += processing_result.get("relationships_created", 0)
-                stats["links_discovered"] += processing_result.get("links_discovered", 0)
-                
-                # Mark as completed in queue
-                content_hash = processing_result.get("content_hash")
-                file_size = processing_result.get("file_size")
-                self.work_queue.mark_completed(queue_id, content_hash, file_size)
-                
-                logger.info(f"Worker {self.worker_id} completed document: {doc_id}")
+        # Claimed documents waiting to be processed, as [claimed_doc, prefetched content future]
+        buffer = deque()
+        executor = None
+        if self.prefetch_depth:
+            executor = ThreadPoolExecutor(max_workers=self.prefetch_depth,
+                                          thread_name_prefix=f"prefetch-{self.worker_id}")
+        try:
+            while not self._stop_requested.is_set() and (max_documents is None or
+                                                          documents_processed < max_documents):
+                if not buffer:
+                    remaining = None if max_documents is None else max_documents - documents_processed
+                    batch = self.work_queue.claim_batch(run_id, self._next_batch_size(remaining))
+                    buffer.extend([claimed_doc, None] for claimed_doc in batch)
                 
-            except Exception as e:
-                logger.error(f"Worker {self.worker_id} failed to process document {doc_id}: {str(e)}")
+                if not buffer:
+                    if wait_for_work and self.work_queue.has_active_work(run_id):
+                        # Woken as soon as another worker adds, releases or fails a document
+                        self.work_queue.wait_for_change(poll_interval)
+                        continue
+                    logger.debug(f"No more work available for worker {self.worker_id}")
+                    break
                 
-                # Mark as failed in queue
-                error_details = {
-                    "error_type": type(e).__name__,
-                    "worker_id": self.worker_id,
-                    "timestamp": time.time()
-                }
+                claimed_doc, prefetched = buffer.popleft()
+                self._prefetch(buffer, executor)
                 
-                # Check if this document should go to dead letter queue
-                # Move to dead letter if max retries exceeded or critical error
-                retry_count = claimed_doc.get('retry_count', 0)
-                max_retries = self.work_queue.max_retries
+                started = time.time()
+                self._process_claimed_document(claimed_doc, prefetched, run_id, stats)
+                self._record_document_time(time.time() - started)
                 
-                if retry_count >= max_retries or self._is_critical_error(e):
-                    logger.warning(f"Moving document {doc_id} to dead letter queue after {retry_count} retries")
-                    self.dead_letter_queue.move_to_dead_letter(
-                        queue_id=queue_id,
-                        error_message=str(e),
-                        error_details=error_details
-                    )
-                else:
-                    # Mark for retry
-                    self.work_queue.mark_failed(queue_id, str(e), error_details)
+                documents_processed += 1
                 
-                stats["documents_failed"] += 1
-            
-            documents_processed += 1
-            
-            # Send heartbeat periodically
-            if documents_processed % 10 == 0:
-                self.work_queue.heartbeat(run_id)
+                # Send heartbeat periodically
+                if documents_processed % 10 == 0:
+                    self.work_queue.heartbeat(run_id)
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+            if buffer:
+                # Hand documents claimed but not processed back to other workers
+                self.work_queue.release_documents([claimed_doc['queue_id'] for claimed_doc, _ in buffer])
         
         logger.info(
             f"Worker {self.worker_id} completed processing: "
@@ -137,8 +146,113 @@ class QueuedDocumentProcessor:
         
         return stats
     
+    def _process_claimed_document(self, claimed_doc: Dict[str, Any], prefetched: Optional[Future],
+                                  run_id: str, stats: Dict[str, Any]) -> None:
+        """
+        Process one claimed document and record the outcome in the queue and stats.
+        
+        Args:
+            claimed_doc: Claimed document info from queue
+            prefetched: Optional future resolving to the document content
+            run_id: Processing run ID
+            stats: Processing statistics to update
+        """
+        doc_id = claimed_doc['doc_id']
+        queue_id = claimed_doc['queue_id']
+        source_name = claimed_doc['source_name']
+        
+        logger.info(f"Worker {self.worker_id} processing document: {doc_id} (queue_id: {queue_id})")
+        
+        try:
+            self.work_queue.mark_started(queue_id)
+            
+            # Process the document
+            processing_result = self._process_single_document(
+                doc_id, source_name, claimed_doc, run_id, prefetched
+            )
+            
+            # Update statistics
+            stats["documents_processed"] += 1
+            stats["elements_created"] += processing_result.get("elements_created", 0)
+            stats["relationships_created"] += processing_result.get("relationships_created", 0)
+            stats["links_discovered"] += processing_result.get("links_discovered", 0)
+            
+            # Mark as completed in queue
+            content_hash = processing_result.get("content_hash")
+            file_size = processing_result.get("file_size")
+            self.work_queue.mark_completed(queue_id, content_hash, file_size)
+            
+            logger.info(f"Worker {self.worker_id} completed document: {doc_id}")
+            
+        except Exception as e:
+            logger.error(f"Worker {self.worker_id} failed to process document {doc_id}: {str(e)}")
+            
+            # Mark as failed in queue
+            error_details = {
+                "error_type": type(e).__name__,
+                "worker_id": self.worker_id,
+                "timestamp": time.time()
+            }
+            
+            # Check if this document should go to dead letter queue
+            # Move to dead letter if max retries exceeded or critical error
+            retry_count = claimed_doc.get('retry_count', 0)
+            max_retries = self.work_queue.max_retries
+            
+            if retry_count >= max_retries or self._is_critical_error(e):
+                logger.warning(f"Moving document {doc_id} to dead letter queue after {retry_count} retries")
+                self.dead_letter_queue.move_to_dead_letter(queue_id, str(e))
+            else:
+                # Mark for retry
+                self.work_queue.mark_failed(queue_id, str(e), error_details)
+            
+            stats["documents_failed"] += 1
+    
+    def _next_batch_size(self, remaining: Optional[int] = None) -> int:
+        """
+        Choose how many documents to claim so a batch takes about batch_target_seconds.
+        
+        Args:
+            remaining: Documents left before max_documents is reached
+            
+        Returns:
+            Batch size between 1 and max_batch_size
+        """
+        if self._avg_document_seconds is None:
+            # Claim a single document until there is a processing time to go by
+            size = 1
+        else:
+            size = int(self.batch_target_seconds / max(self._avg_document_seconds, 0.001))
+        size = max(1, min(size, self.max_batch_size))
+        return min(size, remaining) if remaining is not None else size
+    
+    def _record_document_time(self, seconds: float) -> None:
+        """Fold a document's processing time into the moving average used for batch sizing."""
+        if self._avg_document_seconds is None:
+            self._avg_document_seconds = seconds
+        else:
+            self._avg_document_seconds = 0.7 * self._avg_document_seconds + 0.3 * seconds
+    
+    def _prefetch(self, buffer: deque, executor: Optional[ThreadPoolExecutor]) -> None:
+        """Start fetching content for the next buffered documents in the background."""
+        if not executor:
+            return
+        for entry in islice(buffer, self.prefetch_depth):
+            if entry[1] is None:
+                claimed_doc = entry[0]
+                entry[1] = executor.submit(self._fetch_document_content,
+                                           claimed_doc['source_name'], claimed_doc['doc_id'])
+    
+    @staticmethod
+    def _fetch_document_content(source_name: str, doc_id: str) -> Dict[str, Any]:
+        """Fetch a document's content from its registered content source."""
+        from ..content_source.factory import get_content_source_by_name
+        
+        return get_content_source_by_name(source_name).fetch_document(doc_id)
+    
     def _process_single_document(self, doc_id: str, source_name: str, 
-                                claimed_doc: Dict[str, Any], run_id: str) -> Dict[str, Any]:
+                                claimed_doc: Dict[str, Any], run_id: str,
+                                prefetched: Optional[Future] = None) -> Dict[str, Any]:
         """
         Process a single claimed document.
         
@@ -147,6 +261,7 @@ class QueuedDocumentProcessor:
             source_name: Name of the content source
             claimed_doc: Claimed document info from queue
             run_id: Processing run ID
+            prefetched: Optional future resolving to the already fetched content
             
         Returns:
             Processing results with statistics
@@ -161,7 +276,7 @@ class QueuedDocumentProcessor:
         
         # Fetch document content
         try:
-            doc_content = content_source.fetch_document(doc_id)
+            doc_content = prefetched.result() if prefetched else content_source.fetch_document(doc_id)
         except Exception as e:
             raise RuntimeError(f"Failed to fetch document content: {str(e)}")
         
@@ -267,7 +382,11 @@ class QueuedDocumentProcessor:
             Number of linked documents added to queue
         """
         current_depth = claimed_doc.get('link_depth', 0)
-        max_depth = claimed_doc.get('metadata', {}).get('max_link_depth', 1)
+        max_depth = (claimed_doc.get('metadata') or {}).get('max_link_depth')
+        if max_depth is None:
+            # Source settings are stored once per run rather than on each queued document
+            source_config = self.work_queue.get_source_config(run_id, claimed_doc['source_name'])
+            max_depth = source_config.get('max_link_depth', 1)
         
         if current_depth >= max_depth:
             logger.debug(f"Not following links - at max depth {current_depth}/{max_depth}")
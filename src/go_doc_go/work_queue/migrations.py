@@ -30,6 +30,8 @@ def create_schema(db, force: bool = False) -> None:
         if force:
             logger.warning("Dropping existing queue tables...")
             drop_sql = """
+                DROP TABLE IF EXISTS run_queue_counts CASCADE;
+                DROP TABLE IF EXISTS run_sources CASCADE;
                 DROP TABLE IF EXISTS document_dependencies CASCADE;
                 DROP TABLE IF EXISTS run_workers CASCADE;
                 DROP TABLE IF EXISTS document_queue CASCADE;
@@ -38,6 +40,7 @@ def create_schema(db, force: bool = False) -> None:
                 DROP FUNCTION IF EXISTS check_stale_workers CASCADE;
                 DROP FUNCTION IF EXISTS reclaim_stale_work CASCADE;
                 DROP FUNCTION IF EXISTS attempt_leader_election CASCADE;
+                DROP FUNCTION IF EXISTS maintain_run_queue_counts CASCADE;
             """
             db.execute_raw(drop_sql)
         
@@ -64,7 +67,9 @@ def check_schema_exists(db) -> bool:
         'processing_runs',
         'document_queue',
         'run_workers',
-        'document_dependencies'
+        'document_dependencies',
+        'run_sources',
+        'run_queue_counts'
     ]
     
     try:
@@ -167,6 +172,8 @@ def validate_schema(db) -> bool:
             db.execute("SELECT COUNT(*) FROM document_queue")
             db.execute("SELECT COUNT(*) FROM run_workers")
             db.execute("SELECT COUNT(*) FROM document_dependencies")
+            db.execute("SELECT COUNT(*) FROM run_sources")
+            db.execute("SELECT COUNT(*) FROM run_queue_counts")
         
         logger.info("Schema validation successful")
         return True
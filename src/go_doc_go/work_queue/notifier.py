@@ -0,0 +1,232 @@
+"""
+Change notification for the work queue.
+
+Idle workers and leaders waiting for a run to finish block on a notifier
+instead of sleeping for a fixed interval. The PostgreSQL notifier listens for
+the NOTIFY sent by the queue trigger; the local notifier wakes processes on
+this host through Unix datagram sockets. Every wait also ends after its
+timeout, so a missed notification only costs latency.
+"""
+
+import logging
+import os
+import select
+import socket
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Channel the queue trigger in schema.sql notifies on
+NOTIFY_CHANNEL = 'document_queue'
+
+
+class QueueNotifier:
+    """Notifier without change notification: waiting sleeps for the whole timeout."""
+
+    def listen(self) -> None:
+        """Start receiving notifications, so those sent before the next wait() are kept."""
+        pass
+
+    def notify(self) -> None:
+        """Wake processes waiting for queue changes."""
+        pass
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Wait for a queue change.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if woken by a notification, False on timeout
+        """
+        time.sleep(timeout)
+        return False
+
+    def close(self) -> None:
+        """Release resources held by the notifier."""
+        pass
+
+
+class LocalSocketNotifier(QueueNotifier):
+    """
+    Notifier for processes on one host sharing an embedded queue.
+
+    Each waiting process binds a Unix datagram socket in a shared directory;
+    notify() sends one byte to every socket there. Sockets of processes that
+    exited are removed when sending to them fails. If the socket cannot be
+    bound (e.g. the path exceeds the platform's limit for Unix socket paths),
+    waiting falls back to polling.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Initialize the notifier.
+
+        Args:
+            directory: Directory holding the waiters' sockets
+        """
+        self.directory = directory
+        self._socket: Optional[socket.socket] = None
+        self._path: Optional[str] = None
+        self._pid: Optional[int] = None
+        self._unavailable = False
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Each process binds its own socket
+        return {'directory': self.directory}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state['directory'])
+
+    def listen(self) -> None:
+        """Bind this process's socket, so notifications sent from now on are kept until wait()."""
+        if self._unavailable or (self._socket is not None and self._pid == os.getpid()):
+            return
+        path = os.path.join(self.directory, f"{os.getpid()}-{uuid.uuid4().hex[:8]}.sock")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            sock.bind(path)
+        except OSError as e:
+            sock.close()
+            logger.warning(f"Queue notifications unavailable, falling back to polling: {str(e)}")
+            self._unavailable = True
+            return
+        sock.setblocking(False)
+        self._socket, self._path, self._pid = sock, path, os.getpid()
+
+    def notify(self) -> None:
+        """Wake every process waiting on this queue."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sender:
+            sender.setblocking(False)
+            for name in names:
+                path = os.path.join(self.directory, name)
+                if not name.endswith('.sock') or path == self._path:
+                    continue
+                try:
+                    sender.sendto(b'1', path)
+                except (ConnectionRefusedError, FileNotFoundError):
+                    # The waiter exited without removing its socket
+                    try:
+                        os.unlink(path)
+                    except OSError:
+                        pass
+                except (BlockingIOError, OSError):
+                    # Receive buffer full: the waiter already has a wakeup pending
+                    pass
+
+    def wait(self, timeout: float) -> bool:
+        """Wait for a queue change."""
+        self.listen()
+        if self._socket is None:
+            return super().wait(timeout)
+        ready, _, _ = select.select([self._socket], [], [], timeout)
+        if not ready:
+            return False
+        # Several changes may have been signalled; one wakeup covers them all
+        while True:
+            try:
+                self._socket.recv(64)
+            except BlockingIOError:
+                return True
+
+    def close(self) -> None:
+        """Close and remove this process's socket."""
+        if self._socket is not None and self._pid == os.getpid():
+            self._socket.close()
+            try:
+                os.unlink(self._path)
+            except OSError:
+                pass
+        self._socket = self._path = self._pid = None
+
+
+class PostgresQueueNotifier(QueueNotifier):
+    """
+    Notifier using PostgreSQL LISTEN/NOTIFY.
+
+    The queue trigger notifies on every status change, so notify() has nothing
+    to do; wait() listens on a dedicated autocommit connection.
+    """
+
+    def __init__(self, conn_params: Dict[str, Any]):
+        """
+        Initialize the notifier.
+
+        Args:
+            conn_params: PostgreSQL connection parameters (as for the document database)
+        """
+        self.conn_params = conn_params
+        self._conn = None
+        self._unavailable = False
+
+    def _listener(self):
+        """Open the listening connection on first use."""
+        if self._conn is None and not self._unavailable:
+            try:
+                import psycopg2
+                from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+                if "uri" in self.conn_params:
+                    conn = psycopg2.connect(self.conn_params["uri"])
+                else:
+                    conn = psycopg2.connect(**self.conn_params)
+                conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                self._conn = conn
+            except Exception as e:
+                logger.warning(f"Queue notifications unavailable, falling back to polling: {str(e)}")
+                self._unavailable = True
+        return self._conn
+
+    def listen(self) -> None:
+        """Start listening, so notifications sent from now on are kept until wait()."""
+        self._listener()
+
+    def wait(self, timeout: float) -> bool:
+        """Wait for a queue change."""
+        conn = self._listener()
+        if conn is None:
+            return super().wait(timeout)
+
+        if not conn.notifies:
+            if not select.select([conn], [], [], timeout)[0]:
+                return False
+            conn.poll()
+        notified = bool(conn.notifies)
+        conn.notifies.clear()
+        return notified
+
+    def close(self) -> None:
+        """Close the listening connection."""
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception as e:
+                logger.debug(f"Error closing notification connection: {str(e)}")
+            self._conn = None
+
+
+def create_local_notifier(directory: str) -> QueueNotifier:
+    """
+    Create a notifier for processes on this host, if the platform supports it.
+
+    Args:
+        directory: Directory holding the waiters' sockets
+
+    Returns:
+        LocalSocketNotifier, or a polling QueueNotifier without Unix sockets
+    """
+    if hasattr(socket, 'AF_UNIX'):
+        return LocalSocketNotifier(directory)
+    return QueueNotifier()
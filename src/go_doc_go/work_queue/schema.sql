@@ -157,6 +157,95 @@ CREATE TABLE IF NOT EXISTS document_dependencies (
 CREATE INDEX IF NOT EXISTS idx_deps_child ON document_dependencies (child_doc_id);
 CREATE INDEX IF NOT EXISTS idx_deps_run ON document_dependencies (run_id);
 
+-- Run sources table - each content source configuration stored once per run
+-- (queued documents reference it by source_name instead of embedding it)
+CREATE TABLE IF NOT EXISTS run_sources (
+    run_id VARCHAR(16) NOT NULL REFERENCES processing_runs(run_id),
+    source_name VARCHAR(255) NOT NULL,
+    source_config JSONB NOT NULL,
+    registered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    
+    PRIMARY KEY (run_id, source_name)
+);
+
+-- Run queue counts table - per-status document counts maintained by trigger,
+-- so completion checks read one row instead of aggregating the queue
+CREATE TABLE IF NOT EXISTS run_queue_counts (
+    run_id VARCHAR(16) PRIMARY KEY REFERENCES processing_runs(run_id),
+    pending INTEGER NOT NULL DEFAULT 0,
+    processing INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    retry INTEGER NOT NULL DEFAULT 0,
+    dead_letter INTEGER NOT NULL DEFAULT 0
+);
+
+-- Backfill counts for runs queued before the table existed
+INSERT INTO run_queue_counts (run_id, pending, processing, completed, failed, retry, dead_letter)
+SELECT run_id,
+       COUNT(*) FILTER (WHERE status = 'pending'),
+       COUNT(*) FILTER (WHERE status = 'processing'),
+       COUNT(*) FILTER (WHERE status = 'completed'),
+       COUNT(*) FILTER (WHERE status = 'failed'),
+       COUNT(*) FILTER (WHERE status = 'retry'),
+       COUNT(*) FILTER (WHERE status = 'dead_letter')
+FROM document_queue
+GROUP BY run_id
+ON CONFLICT (run_id) DO NOTHING;
+
+-- Create trigger maintaining run_queue_counts and notifying listeners of queue changes
+CREATE OR REPLACE FUNCTION maintain_run_queue_counts()
+RETURNS TRIGGER AS $$
+DECLARE
+    old_status VARCHAR(20);
+    new_status VARCHAR(20);
+    queue_run_id VARCHAR(16);
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        old_status := OLD.status;
+        queue_run_id := OLD.run_id;
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        new_status := NEW.status;
+        queue_run_id := NEW.run_id;
+    END IF;
+    
+    IF old_status IS NOT DISTINCT FROM new_status THEN
+        RETURN NULL;
+    END IF;
+    
+    INSERT INTO run_queue_counts (run_id) VALUES (queue_run_id)
+    ON CONFLICT (run_id) DO NOTHING;
+    
+    UPDATE run_queue_counts
+    SET pending = pending + (new_status IS NOT DISTINCT FROM 'pending')::INTEGER
+                            - (old_status IS NOT DISTINCT FROM 'pending')::INTEGER,
+        processing = processing + (new_status IS NOT DISTINCT FROM 'processing')::INTEGER
+                                  - (old_status IS NOT DISTINCT FROM 'processing')::INTEGER,
+        completed = completed + (new_status IS NOT DISTINCT FROM 'completed')::INTEGER
+                                - (old_status IS NOT DISTINCT FROM 'completed')::INTEGER,
+        failed = failed + (new_status IS NOT DISTINCT FROM 'failed')::INTEGER
+                          - (old_status IS NOT DISTINCT FROM 'failed')::INTEGER,
+        retry = retry + (new_status IS NOT DISTINCT FROM 'retry')::INTEGER
+                        - (old_status IS NOT DISTINCT FROM 'retry')::INTEGER,
+        dead_letter = dead_letter + (new_status IS NOT DISTINCT FROM 'dead_letter')::INTEGER
+                                    - (old_status IS NOT DISTINCT FROM 'dead_letter')::INTEGER
+    WHERE run_id = queue_run_id;
+    
+    -- Wake idle workers and leaders (LISTEN document_queue); repeated payloads
+    -- within one transaction are delivered once
+    PERFORM pg_notify('document_queue', queue_run_id);
+    
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS maintain_run_queue_counts ON document_queue;
+CREATE TRIGGER maintain_run_queue_counts
+    AFTER INSERT OR DELETE OR UPDATE OF status ON document_queue
+    FOR EACH ROW
+    EXECUTE FUNCTION maintain_run_queue_counts();
+
 -- Create update trigger for updated_at
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
@@ -166,6 +255,7 @@ BEGIN
 END;
 $$ language 'plpgsql';
 
+DROP TRIGGER IF EXISTS update_document_queue_updated_at ON document_queue;
 CREATE TRIGGER update_document_queue_updated_at 
     BEFORE UPDATE ON document_queue 
     FOR EACH ROW 
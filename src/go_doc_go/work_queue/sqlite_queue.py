@@ -0,0 +1,1105 @@
+"""
+Embedded SQLite backend for the work queue.
+
+Keeps the queue in a local SQLite file so that several worker processes on one
+host can share a processing run without a PostgreSQL server. The database runs in
+WAL mode and every claim is a BEGIN IMMEDIATE transaction, which takes the write
+lock before reading, so two processes can never claim the same document. Claimed
+documents carry a lease; heartbeats extend it and other workers reclaim the
+document once it expires. Triggers keep per-status counts for each run, and
+committed writes wake waiting processes through a LocalSocketNotifier.
+Timestamps are stored as Unix epoch seconds.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+
+from .backend import QueueBackend
+from .dead_letter import DeadLetterItem, DeadLetterQueue
+from .notifier import create_local_notifier
+from .work_queue import STATUS_COLUMNS, WorkQueue, RunCoordinator, _with_total
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS processing_runs (
+    run_id TEXT PRIMARY KEY,
+    config_hash TEXT NOT NULL,
+    config_snapshot TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'active',
+    created_at REAL NOT NULL,
+    last_activity_at REAL,
+    worker_count INTEGER DEFAULT 0,
+    documents_queued INTEGER DEFAULT 0,
+    documents_processed INTEGER DEFAULT 0,
+    documents_failed INTEGER DEFAULT 0,
+    documents_retried INTEGER DEFAULT 0,
+    leader_worker_id TEXT,
+    leader_elected_at REAL,
+    leader_heartbeat REAL,
+    leader_lease_expires REAL,
+    metadata TEXT
+);
+
+CREATE TABLE IF NOT EXISTS document_queue (
+    queue_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    doc_id TEXT NOT NULL,
+    source_name TEXT NOT NULL,
+    source_type TEXT NOT NULL DEFAULT 'configured',
+    run_id TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker_id TEXT,
+    claimed_at REAL,
+    lease_expires_at REAL,
+    started_at REAL,
+    completed_at REAL,
+    failed_at REAL,
+    retry_count INTEGER DEFAULT 0,
+    max_retries INTEGER DEFAULT 3,
+    error_message TEXT,
+    error_details TEXT,
+    parent_doc_id TEXT,
+    link_depth INTEGER DEFAULT 0,
+    content_hash TEXT,
+    file_size INTEGER,
+    priority INTEGER DEFAULT 0,
+    scheduled_for REAL NOT NULL,
+    metadata TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    UNIQUE (run_id, doc_id, source_name)
+);
+
+CREATE INDEX IF NOT EXISTS idx_queue_claim
+    ON document_queue (run_id, status, priority DESC, link_depth, created_at);
+CREATE INDEX IF NOT EXISTS idx_queue_lease ON document_queue (run_id, status, lease_expires_at);
+CREATE INDEX IF NOT EXISTS idx_queue_worker ON document_queue (worker_id, status);
+
+CREATE TABLE IF NOT EXISTS run_workers (
+    run_id TEXT NOT NULL,
+    worker_id TEXT NOT NULL,
+    joined_at REAL NOT NULL,
+    last_heartbeat REAL NOT NULL,
+    left_at REAL,
+    status TEXT DEFAULT 'active',
+    documents_claimed INTEGER DEFAULT 0,
+    documents_processed INTEGER DEFAULT 0,
+    documents_failed INTEGER DEFAULT 0,
+    hostname TEXT,
+    process_id INTEGER,
+    version TEXT,
+    capabilities TEXT,
+    PRIMARY KEY (run_id, worker_id)
+);
+
+CREATE TABLE IF NOT EXISTS document_dependencies (
+    parent_doc_id TEXT NOT NULL,
+    child_doc_id TEXT NOT NULL,
+    source_name TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    link_type TEXT,
+    link_depth INTEGER NOT NULL,
+    discovered_at REAL NOT NULL,
+    discovered_by_worker TEXT,
+    PRIMARY KEY (run_id, parent_doc_id, child_doc_id, source_name)
+);
+
+CREATE TABLE IF NOT EXISTS run_sources (
+    run_id TEXT NOT NULL,
+    source_name TEXT NOT NULL,
+    source_config TEXT NOT NULL,
+    registered_at REAL NOT NULL,
+    PRIMARY KEY (run_id, source_name)
+);
+
+-- Per-status document counts, maintained by the triggers below
+CREATE TABLE IF NOT EXISTS run_queue_counts (
+    run_id TEXT PRIMARY KEY,
+    pending INTEGER NOT NULL DEFAULT 0,
+    processing INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    retry INTEGER NOT NULL DEFAULT 0,
+    dead_letter INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS queue_counts_insert AFTER INSERT ON document_queue
+BEGIN
+    INSERT OR IGNORE INTO run_queue_counts (run_id) VALUES (NEW.run_id);
+    UPDATE run_queue_counts
+    SET pending = pending + (NEW.status = 'pending'),
+        processing = processing + (NEW.status = 'processing'),
+        completed = completed + (NEW.status = 'completed'),
+        failed = failed + (NEW.status = 'failed'),
+        retry = retry + (NEW.status = 'retry'),
+        dead_letter = dead_letter + (NEW.status = 'dead_letter')
+    WHERE run_id = NEW.run_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS queue_counts_update AFTER UPDATE OF status ON document_queue
+WHEN OLD.status IS NOT NEW.status
+BEGIN
+    UPDATE run_queue_counts
+    SET pending = pending + (NEW.status = 'pending') - (OLD.status = 'pending'),
+        processing = processing + (NEW.status = 'processing') - (OLD.status = 'processing'),
+        completed = completed + (NEW.status = 'completed') - (OLD.status = 'completed'),
+        failed = failed + (NEW.status = 'failed') - (OLD.status = 'failed'),
+        retry = retry + (NEW.status = 'retry') - (OLD.status = 'retry'),
+        dead_letter = dead_letter + (NEW.status = 'dead_letter') - (OLD.status = 'dead_letter')
+    WHERE run_id = NEW.run_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS queue_counts_delete AFTER DELETE ON document_queue
+BEGIN
+    UPDATE run_queue_counts
+    SET pending = pending - (OLD.status = 'pending'),
+        processing = processing - (OLD.status = 'processing'),
+        completed = completed - (OLD.status = 'completed'),
+        failed = failed - (OLD.status = 'failed'),
+        retry = retry - (OLD.status = 'retry'),
+        dead_letter = dead_letter - (OLD.status = 'dead_letter')
+    WHERE run_id = OLD.run_id;
+END;
+"""
+
+# Columns returned when a document is claimed
+CLAIM_COLUMNS = "queue_id, doc_id, source_name, source_type, parent_doc_id, link_depth, metadata, retry_count"
+
+
+def _load_json(value: Optional[str]) -> Dict[str, Any]:
+    """Decode a JSON column, treating NULL as an empty dictionary."""
+    return json.loads(value) if value else {}
+
+
+def _to_datetime(timestamp: Optional[float]) -> Optional[datetime]:
+    """Convert an epoch timestamp column to a datetime."""
+    return datetime.fromtimestamp(timestamp) if timestamp is not None else None
+
+
+class SQLiteQueueDatabase:
+    """
+    Connections to the queue database file.
+
+    Each thread of each process gets its own connection, opened on first use, so
+    the object can be handed to worker processes and threads. Connections are in
+    autocommit mode; transaction() wraps statements in BEGIN IMMEDIATE.
+    """
+
+    def __init__(self, db_path: str, busy_timeout: float = 30.0):
+        """
+        Initialize the queue database.
+
+        Args:
+            db_path: Path to the SQLite queue file
+            busy_timeout: Seconds to wait for another process's write lock
+        """
+        self.db_path = db_path
+        self.busy_timeout = busy_timeout
+        # Optional QueueNotifier told about every committed write
+        self.notifier = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Worker processes open their own connections
+        return {'db_path': self.db_path, 'busy_timeout': self.busy_timeout, 'notifier': self.notifier}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state['db_path'], state['busy_timeout'])
+        self.notifier = state.get('notifier')
+
+    def connection(self) -> sqlite3.Connection:
+        """Get the calling thread's connection, opening it in this process if needed."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, isolation_level=None,
+                                   check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+            self._local.depth = 0
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run the block in a BEGIN IMMEDIATE transaction; nested blocks join the outer one."""
+        conn = self.connection()
+        if self._local.depth:
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        self._local.depth = 1
+        changes = conn.total_changes
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            self._local.depth = 0
+
+        if self.notifier and conn.total_changes != changes:
+            self.notifier.notify()
+
+    def execute(self, query: str, params: Optional[tuple] = None) -> Optional[Dict[str, Any]]:
+        """Execute a query and return the first row as a dictionary."""
+        cursor = self.connection().execute(query, params or ())
+        try:
+            row = cursor.fetchone()
+        finally:
+            # Finish the statement (e.g. an UPDATE ... RETURNING) before the transaction ends
+            cursor.close()
+        return dict(row) if row else None
+
+    def fetch_all(self, query: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
+        """Execute a query and return all rows as dictionaries."""
+        return [dict(row) for row in self.connection().execute(query, params or ()).fetchall()]
+
+    def execute_many(self, sql: str, seq_of_params: List[tuple]) -> int:
+        """Execute a statement once per parameter tuple and return the rows changed."""
+        return self.connection().executemany(sql, seq_of_params).rowcount
+
+    def execute_raw(self, sql: str, params: Optional[tuple] = None) -> int:
+        """Execute a statement (or a script when no parameters are given) and return the rows changed."""
+        conn = self.connection()
+        if params is None:
+            conn.executescript(sql)
+            return conn.total_changes
+        return conn.execute(sql, params).rowcount
+
+    def close(self) -> None:
+        """Close the connections opened by this process."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception as e:
+                logger.debug(f"Error closing queue connection: {str(e)}")
+        self._local = threading.local()
+
+
+class SQLiteRunCoordinator(RunCoordinator):
+    """Run coordination with leader leases stored in the SQLite queue."""
+
+    def ensure_run_exists(self, run_id: str, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Ensure a processing run exists, creating if necessary."""
+        now = time.time()
+        with self.db.transaction():
+            existing = self.db.execute("""
+                SELECT run_id, status, created_at, worker_count
+                FROM processing_runs
+                WHERE run_id = ?
+            """, (run_id,))
+
+            if existing:
+                self.db.execute_raw("""
+                    UPDATE processing_runs SET last_activity_at = ? WHERE run_id = ?
+                """, (now, run_id))
+                existing['created_at'] = _to_datetime(existing['created_at'])
+                return existing
+
+            config_str = json.dumps(config, sort_keys=True)
+            full_hash = hashlib.sha256(config_str.encode()).hexdigest()
+            self.db.execute_raw("""
+                INSERT INTO processing_runs (
+                    run_id, config_hash, config_snapshot, status, created_at, last_activity_at
+                ) VALUES (?, ?, ?, 'active', ?, ?)
+            """, (run_id, full_hash, config_str, now, now))
+
+            logger.info(f"Created new processing run: {run_id}")
+
+            return {
+                'run_id': run_id,
+                'status': 'active',
+                'created_at': _to_datetime(now),
+                'worker_count': 0
+            }
+
+    def register_worker(self, run_id: str, worker_id: str,
+                        metadata: Optional[Dict] = None) -> None:
+        """Register a worker for a processing run."""
+        now = time.time()
+        with self.db.transaction():
+            self.db.execute_raw("""
+                INSERT INTO run_workers (
+                    run_id, worker_id, joined_at, last_heartbeat, hostname, process_id,
+                    version, capabilities
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (run_id, worker_id)
+                DO UPDATE SET last_heartbeat = excluded.last_heartbeat, status = 'active'
+            """, (
+                run_id, worker_id, now, now, socket.gethostname(), os.getpid(),
+                metadata.get('version') if metadata else None,
+                json.dumps(metadata.get('capabilities', {})) if metadata else None
+            ))
+
+            self.db.execute_raw("""
+                UPDATE processing_runs
+                SET worker_count = (
+                    SELECT COUNT(DISTINCT worker_id)
+                    FROM run_workers
+                    WHERE run_workers.run_id = processing_runs.run_id
+                      AND status = 'active'
+                )
+                WHERE run_id = ?
+            """, (run_id,))
+
+    def attempt_leader_election(self, run_id: str) -> bool:
+        """Take the leader lease if it is free or expired, or renew it if this worker holds it."""
+        try:
+            now = time.time()
+            expires = now + self.leader_lease_duration
+            with self.db.transaction():
+                elected = self.db.execute_raw("""
+                    UPDATE processing_runs
+                    SET leader_worker_id = ?, leader_elected_at = ?,
+                        leader_heartbeat = ?, leader_lease_expires = ?
+                    WHERE run_id = ?
+                      AND (leader_worker_id IS NULL OR leader_lease_expires < ?)
+                """, (self.worker_id, now, now, expires, run_id, now)) > 0
+
+                if not elected:
+                    elected = self.db.execute_raw("""
+                        UPDATE processing_runs
+                        SET leader_heartbeat = ?, leader_lease_expires = ?
+                        WHERE run_id = ? AND leader_worker_id = ?
+                    """, (now, expires, run_id, self.worker_id)) > 0
+
+            self.is_leader_cache = elected
+            self.last_leader_check = time.time()
+
+            if elected:
+                logger.info(f"Worker {self.worker_id} elected as leader for run {run_id}")
+
+            return elected
+
+        except Exception as e:
+            logger.error(f"Leader election failed for worker {self.worker_id}: {e}")
+            self.is_leader_cache = False
+            return False
+
+    def is_leader(self, run_id: str) -> bool:
+        """Check if this worker is currently the leader."""
+        if (self.last_leader_check and
+                time.time() - self.last_leader_check < 10):  # 10 second cache
+            return self.is_leader_cache
+
+        try:
+            result = self.db.execute("""
+                SELECT leader_worker_id, leader_lease_expires
+                FROM processing_runs
+                WHERE run_id = ?
+            """, (run_id,))
+
+            is_leader = bool(result and result['leader_worker_id'] == self.worker_id and
+                             result['leader_lease_expires'] and result['leader_lease_expires'] > time.time())
+            self.is_leader_cache = is_leader
+            self.last_leader_check = time.time()
+            return is_leader
+
+        except Exception as e:
+            logger.error(f"Leader check failed for worker {self.worker_id}: {e}")
+            return False
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """Document work queue stored in a local SQLite file, with leased claims."""
+
+    def add_document(self, doc_id: str, source_name: str, run_id: str,
+                     source_type: str = 'configured',
+                     parent_doc_id: Optional[str] = None,
+                     link_depth: int = 0,
+                     metadata: Optional[Dict] = None) -> int:
+        """Add a document to the processing queue."""
+        now = time.time()
+        with self.db.transaction():
+            result = self.db.execute("""
+                INSERT INTO document_queue (
+                    doc_id, source_name, source_type, run_id,
+                    parent_doc_id, link_depth, metadata, scheduled_for, created_at, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (run_id, doc_id, source_name)
+                DO UPDATE SET
+                    updated_at = excluded.updated_at,
+                    link_depth = MIN(document_queue.link_depth, excluded.link_depth)
+                RETURNING queue_id
+            """, (
+                doc_id, source_name, source_type, run_id,
+                parent_doc_id, link_depth,
+                json.dumps(metadata) if metadata else None,
+                now, now, now
+            ))
+
+            self.db.execute_raw("""
+                UPDATE processing_runs
+                SET documents_queued = documents_queued + 1,
+                    last_activity_at = ?
+                WHERE run_id = ?
+            """, (now, run_id))
+
+            return result['queue_id']
+
+    def _enqueue_chunk(self, doc_ids: List[str], source_name: str, run_id: str,
+                       source_type: str) -> None:
+        """Upsert one chunk of documents with a prepared statement and update the run counters once."""
+        now = time.time()
+        with self.db.transaction():
+            # executemany keeps under SQLite's bound parameter limit for any chunk size
+            self.db.execute_many("""
+                INSERT INTO document_queue (
+                    doc_id, source_name, source_type, run_id, scheduled_for, created_at, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (run_id, doc_id, source_name)
+                DO UPDATE SET
+                    updated_at = excluded.updated_at,
+                    link_depth = MIN(document_queue.link_depth, excluded.link_depth)
+            """, [(doc_id, source_name, source_type, run_id, now, now, now) for doc_id in doc_ids])
+
+            self.db.execute_raw("""
+                UPDATE processing_runs
+                SET documents_queued = documents_queued + ?,
+                    last_activity_at = ?
+                WHERE run_id = ?
+            """, (len(doc_ids), now, run_id))
+
+    def register_source(self, run_id: str, source_config: Dict[str, Any]) -> None:
+        """Store a content source configuration once for a run."""
+        source_name = source_config['name']
+        with self.db.transaction():
+            self.db.execute_raw("""
+                INSERT INTO run_sources (run_id, source_name, source_config, registered_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (run_id, source_name)
+                DO UPDATE SET source_config = excluded.source_config
+            """, (run_id, source_name, json.dumps(source_config), time.time()))
+        self._source_configs[(run_id, source_name)] = source_config
+
+    def get_source_config(self, run_id: str, source_name: str) -> Dict[str, Any]:
+        """Get the configuration registered for a content source in a run."""
+        key = (run_id, source_name)
+        if key not in self._source_configs:
+            result = self.db.execute("""
+                SELECT source_config
+                FROM run_sources
+                WHERE run_id = ? AND source_name = ?
+            """, (run_id, source_name))
+            self._source_configs[key] = _load_json(result['source_config'] if result else None)
+        return self._source_configs[key]
+
+    def claim_next_document(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Atomically claim the next available document for processing."""
+        docs = self.claim_batch(run_id, 1)
+        return docs[0] if docs else None
+
+    def claim_batch(self, run_id: str, n: int) -> List[Dict[str, Any]]:
+        """
+        Atomically claim up to n documents in a single statement.
+
+        The BEGIN IMMEDIATE transaction holds the database write lock for the
+        UPDATE, so concurrent workers queue up instead of claiming the same
+        rows. Documents due for retry are claimed like pending ones, and
+        documents whose lease has expired (worker died or hung) are reclaimed
+        as a retry; once they are out of retries they are failed instead.
+        Claimed documents have no started_at until mark_started() is called.
+        """
+        now = time.time()
+        with self.db.transaction():
+            expired = self.db.execute_raw("""
+                UPDATE document_queue
+                SET status = 'failed',
+                    worker_id = NULL,
+                    lease_expires_at = NULL,
+                    error_message = 'Lease expired after the last retry',
+                    failed_at = ?,
+                    updated_at = ?
+                WHERE run_id = ?
+                  AND status = 'processing'
+                  AND lease_expires_at < ?
+                  AND retry_count >= max_retries
+            """, (now, now, run_id, now))
+            if expired:
+                logger.error(f"Failed {expired} documents whose lease expired after the last retry")
+                self.db.execute_raw("""
+                    UPDATE processing_runs
+                    SET documents_failed = documents_failed + ?
+                    WHERE run_id = ?
+                """, (expired, run_id))
+
+            docs = self.db.fetch_all(f"""
+                UPDATE document_queue
+                SET retry_count = CASE WHEN status = 'processing' THEN retry_count + 1 ELSE retry_count END,
+                    status = 'processing',
+                    worker_id = ?,
+                    claimed_at = ?,
+                    started_at = NULL,
+                    lease_expires_at = ?,
+                    updated_at = ?
+                WHERE queue_id IN (
+                    SELECT queue_id
+                    FROM document_queue
+                    WHERE run_id = ?
+                      AND ((status IN ('pending', 'retry') AND scheduled_for <= ?)
+                           OR (status = 'processing' AND lease_expires_at < ?))
+                    ORDER BY priority DESC, link_depth ASC, created_at ASC
+                    LIMIT ?
+                )
+                RETURNING {CLAIM_COLUMNS}, priority, created_at
+            """, (self.worker_id, now, now + self.claim_timeout, now, run_id, now, now, n))
+
+            if docs:
+                self.db.execute_raw("""
+                    UPDATE run_workers
+                    SET documents_claimed = documents_claimed + ?,
+                        last_heartbeat = ?,
+                        status = 'processing'
+                    WHERE run_id = ? AND worker_id = ?
+                """, (len(docs), now, run_id, self.worker_id))
+
+        # RETURNING does not preserve the subquery order
+        docs.sort(key=lambda d: (-d['priority'], d['link_depth'], d['created_at']))
+        for doc in docs:
+            doc['metadata'] = _load_json(doc['metadata'])
+        logger.debug(f"Worker {self.worker_id} claimed {len(docs)} documents")
+        return docs
+
+    def mark_started(self, queue_id: int) -> None:
+        """Record that processing of a claimed document has begun and give it a fresh lease."""
+        now = time.time()
+        with self.db.transaction():
+            self.db.execute_raw("""
+                UPDATE document_queue
+                SET started_at = ?,
+                    lease_expires_at = ?,
+                    updated_at = ?
+                WHERE queue_id = ?
+                  AND worker_id = ?
+                  AND status = 'processing'
+            """, (now, now + self.claim_timeout, now, queue_id, self.worker_id))
+
+    def release_documents(self, queue_ids: List[int]) -> None:
+        """Return claimed documents that were not processed to the pending state."""
+        if not queue_ids:
+            return
+        placeholders = ', '.join('?' for _ in queue_ids)
+        with self.db.transaction():
+            self.db.execute_raw(f"""
+                UPDATE document_queue
+                SET status = 'pending',
+                    worker_id = NULL,
+                    claimed_at = NULL,
+                    lease_expires_at = NULL,
+                    updated_at = ?
+                WHERE queue_id IN ({placeholders})
+                  AND worker_id = ?
+                  AND status = 'processing'
+            """, (time.time(), *queue_ids, self.worker_id))
+        logger.debug(f"Worker {self.worker_id} released {len(queue_ids)} documents")
+
+    def get_held_documents(self, started: Optional[bool] = None) -> List[int]:
+        """Get the documents claimed by this worker and not yet finished, optionally only (not) started ones."""
+        condition = {None: "", True: " AND started_at IS NOT NULL", False: " AND started_at IS NULL"}[started]
+        rows = self.db.fetch_all(f"""
+            SELECT queue_id FROM document_queue
+            WHERE worker_id = ? AND status = 'processing'{condition}
+        """, (self.worker_id,))
+        return [row['queue_id'] for row in rows]
+
+    def mark_completed(self, queue_id: int, content_hash: Optional[str] = None,
+                       file_size: Optional[int] = None) -> None:
+        """Mark a document as successfully processed."""
+        now = time.time()
+        with self.db.transaction():
+            result = self.db.execute("""
+                UPDATE document_queue
+                SET status = 'completed',
+                    completed_at = ?,
+                    updated_at = ?,
+                    lease_expires_at = NULL,
+                    content_hash = COALESCE(?, content_hash),
+                    file_size = COALESCE(?, file_size)
+                WHERE queue_id = ? AND worker_id = ?
+                RETURNING run_id
+            """, (now, now, content_hash, file_size, queue_id, self.worker_id))
+
+            if result:
+                run_id = result['run_id']
+
+                self.db.execute_raw("""
+                    UPDATE processing_runs
+                    SET documents_processed = documents_processed + 1,
+                        last_activity_at = ?
+                    WHERE run_id = ?
+                """, (now, run_id))
+
+                self.db.execute_raw("""
+                    UPDATE run_workers
+                    SET documents_processed = documents_processed + 1,
+                        last_heartbeat = ?
+                    WHERE run_id = ? AND worker_id = ?
+                """, (now, run_id, self.worker_id))
+
+                logger.debug(f"Document {queue_id} marked as completed")
+
+    def mark_failed(self, queue_id: int, error_message: str,
+                    error_details: Optional[Dict] = None) -> None:
+        """Mark a document as failed and schedule retry if applicable."""
+        now = time.time()
+        details = json.dumps(error_details) if error_details else None
+        with self.db.transaction():
+            result = self.db.execute("""
+                SELECT retry_count, max_retries, run_id
+                FROM document_queue
+                WHERE queue_id = ? AND worker_id = ?
+            """, (queue_id, self.worker_id))
+
+            if not result:
+                logger.warning(f"Document {queue_id} not found or not held by worker {self.worker_id}")
+                return
+
+            run_id = result['run_id']
+
+            if result['retry_count'] < result['max_retries']:
+                retry_delay = 2 ** result['retry_count'] * self.retry_delay
+
+                self.db.execute_raw("""
+                    UPDATE document_queue
+                    SET status = 'retry',
+                        worker_id = NULL,
+                        lease_expires_at = NULL,
+                        retry_count = retry_count + 1,
+                        scheduled_for = ?,
+                        error_message = ?,
+                        error_details = ?,
+                        failed_at = ?,
+                        updated_at = ?
+                    WHERE queue_id = ?
+                """, (now + retry_delay, error_message, details, now, now, queue_id))
+
+                logger.info(f"Document {queue_id} scheduled for retry in {retry_delay} seconds")
+
+                self.db.execute_raw("""
+                    UPDATE processing_runs
+                    SET documents_retried = documents_retried + 1
+                    WHERE run_id = ?
+                """, (run_id,))
+            else:
+                self.db.execute_raw("""
+                    UPDATE document_queue
+                    SET status = 'failed',
+                        lease_expires_at = NULL,
+                        error_message = ?,
+                        error_details = ?,
+                        failed_at = ?,
+                        updated_at = ?
+                    WHERE queue_id = ?
+                """, (error_message, details, now, now, queue_id))
+
+                logger.error(f"Document {queue_id} failed after {result['retry_count']} retries")
+
+                self.db.execute_raw("""
+                    UPDATE processing_runs
+                    SET documents_failed = documents_failed + 1
+                    WHERE run_id = ?
+                """, (run_id,))
+
+            self.db.execute_raw("""
+                UPDATE run_workers
+                SET documents_failed = documents_failed + 1,
+                    last_heartbeat = ?
+                WHERE run_id = ? AND worker_id = ?
+            """, (now, run_id, self.worker_id))
+
+    def add_linked_document(self, parent_doc_id: str, child_doc_id: str,
+                            source_name: str, run_id: str,
+                            link_depth: int) -> bool:
+        """Add a discovered linked document to the queue."""
+        try:
+            with self.db.transaction():
+                self.db.execute_raw("""
+                    INSERT INTO document_dependencies (
+                        parent_doc_id, child_doc_id, source_name, run_id,
+                        link_type, link_depth, discovered_at, discovered_by_worker
+                    ) VALUES (?, ?, ?, ?, 'discovered', ?, ?, ?)
+                    ON CONFLICT DO NOTHING
+                """, (parent_doc_id, child_doc_id, source_name, run_id,
+                      link_depth, time.time(), self.worker_id))
+
+                self.add_document(
+                    child_doc_id, source_name, run_id,
+                    source_type='linked',
+                    parent_doc_id=parent_doc_id,
+                    link_depth=link_depth
+                )
+
+            logger.info(f"Added linked document {child_doc_id} at depth {link_depth}")
+            return True
+
+        except Exception as e:
+            logger.debug(f"Document {child_doc_id} already in queue or error: {e}")
+            return False
+
+    def get_queue_status(self, run_id: str) -> Dict[str, Any]:
+        """Get current queue status for a run."""
+        return self.db.execute("""
+            SELECT
+                COUNT(*) FILTER (WHERE status = 'pending') as pending,
+                COUNT(*) FILTER (WHERE status = 'processing') as processing,
+                COUNT(*) FILTER (WHERE status = 'completed') as completed,
+                COUNT(*) FILTER (WHERE status = 'failed') as failed,
+                COUNT(*) FILTER (WHERE status = 'retry') as retry,
+                COUNT(*) as total
+            FROM document_queue
+            WHERE run_id = ?
+        """, (run_id,))
+
+    def get_status_counts(self, run_id: str) -> Dict[str, int]:
+        """Get the trigger-maintained per-status document counts for a run."""
+        counts = self.db.execute(f"""
+            SELECT {STATUS_COLUMNS}
+            FROM run_queue_counts
+            WHERE run_id = ?
+        """, (run_id,))
+        return _with_total(counts)
+
+    def get_completed_documents(self, run_id: str) -> List[Dict[str, Any]]:
+        """Get the documents completed in a run."""
+        documents = self.db.fetch_all("""
+            SELECT DISTINCT doc_id, source_name, completed_at
+            FROM document_queue
+            WHERE run_id = ?
+            AND status = 'completed'
+            ORDER BY completed_at
+        """, (run_id,))
+        for document in documents:
+            document['completed_at'] = _to_datetime(document['completed_at'])
+        return documents
+
+    def reclaim_stale_work(self, timeout: Optional[int] = None) -> int:
+        """
+        Return documents with expired leases to the pending state.
+
+        Each reclaim counts as a retry; documents that are out of retries are
+        failed instead, so a document that keeps killing its worker stops
+        being handed out.
+
+        Args:
+            timeout: Seconds since the claim after which it is stale; when not
+                given, the lease expiry recorded at claim time is used
+
+        Returns:
+            Number of documents reclaimed
+        """
+        now = time.time()
+        with self.db.transaction():
+            if timeout is None:
+                condition, params = "lease_expires_at < ?", (now,)
+            else:
+                condition, params = "claimed_at < ?", (now - timeout,)
+
+            expired = self.db.fetch_all(f"""
+                UPDATE document_queue
+                SET status = 'failed',
+                    worker_id = NULL,
+                    lease_expires_at = NULL,
+                    error_message = 'Lease expired after the last retry',
+                    failed_at = ?,
+                    updated_at = ?
+                WHERE status = 'processing'
+                  AND retry_count >= max_retries
+                  AND {condition}
+                RETURNING run_id
+            """, (now, now) + params)
+            if expired:
+                logger.error(f"Failed {len(expired)} documents whose lease expired after the last retry")
+                failed_per_run = Counter(row['run_id'] for row in expired)
+                self.db.execute_many("""
+                    UPDATE processing_runs
+                    SET documents_failed = documents_failed + ?
+                    WHERE run_id = ?
+                """, [(count, run_id) for run_id, count in failed_per_run.items()])
+
+            return self.db.execute_raw(f"""
+                UPDATE document_queue
+                SET status = 'pending',
+                    worker_id = NULL,
+                    claimed_at = NULL,
+                    lease_expires_at = NULL,
+                    retry_count = retry_count + 1,
+                    updated_at = ?
+                WHERE status = 'processing'
+                  AND {condition}
+            """, (now,) + params)
+
+    def heartbeat(self, run_id: str) -> None:
+        """
+        Send worker heartbeat and extend the leases of the documents it holds.
+
+        Leases of documents that are not started yet are always extended, so
+        the rest of a claimed batch never expires behind a slow document. A
+        started document's lease is only extended during the first
+        claim_timeout of processing, so a hung document expires within twice
+        claim_timeout.
+        """
+        now = time.time()
+        with self.db.transaction():
+            self.db.execute_raw("""
+                UPDATE run_workers
+                SET last_heartbeat = ?
+                WHERE run_id = ? AND worker_id = ?
+            """, (now, run_id, self.worker_id))
+
+            self.db.execute_raw("""
+                UPDATE document_queue
+                SET lease_expires_at = ?
+                WHERE run_id = ? AND worker_id = ? AND status = 'processing'
+                  AND (started_at IS NULL OR started_at >= ?)
+            """, (now + self.claim_timeout, run_id, self.worker_id, now - self.claim_timeout))
+
+
+class SQLiteDeadLetterQueue(DeadLetterQueue):
+    """Dead letter queue for documents in the SQLite queue."""
+
+    def move_to_dead_letter(self, queue_id: int, failure_reason: str) -> bool:
+        """Move a failed document to the dead letter queue."""
+        try:
+            with self.db.transaction():
+                doc = self.db.execute("""
+                    SELECT doc_id, retry_count, metadata
+                    FROM document_queue
+                    WHERE queue_id = ?
+                """, (queue_id,))
+                if not doc:
+                    logger.warning(f"Document with queue_id {queue_id} not found for dead lettering")
+                    return False
+
+                dead_letter_metadata = {
+                    'dead_lettered_at': datetime.now().isoformat(),
+                    'dead_letter_reason': failure_reason,
+                    'final_retry_count': doc['retry_count'] or 0,
+                    'error_history_count': len(_load_json(doc['metadata']).get('error_history', []))
+                }
+
+                now = time.time()
+                self.db.execute_raw("""
+                    UPDATE document_queue
+                    SET status = 'dead_letter',
+                        lease_expires_at = NULL,
+                        updated_at = ?,
+                        failed_at = ?,
+                        error_message = ?,
+                        metadata = json_patch(COALESCE(metadata, '{}'), ?)
+                    WHERE queue_id = ?
+                """, (now, now, failure_reason, json.dumps(dead_letter_metadata), queue_id))
+
+            logger.warning(
+                f"Moved document {doc['doc_id']} to dead letter queue. "
+                f"Reason: {failure_reason}, Retry count: {doc['retry_count'] or 0}"
+            )
+            return True
+
+        except Exception as e:
+            logger.error(f"Error moving document {queue_id} to dead letter queue: {str(e)}")
+            return False
+
+    def get_dead_letter_items(self, run_id: Optional[str] = None,
+                              limit: int = 100) -> List[DeadLetterItem]:
+        """Get items from the dead letter queue."""
+        try:
+            where_clause = "WHERE status = 'dead_letter'"
+            params: List[Any] = []
+            if run_id:
+                where_clause += " AND run_id = ?"
+                params.append(run_id)
+            params.append(limit)
+
+            rows = self.db.fetch_all(f"""
+                SELECT queue_id, doc_id, run_id, source_name,
+                       error_message, retry_count, metadata,
+                       created_at, updated_at
+                FROM document_queue
+                {where_clause}
+                ORDER BY updated_at DESC
+                LIMIT ?
+            """, tuple(params))
+
+            items = []
+            for row in rows:
+                metadata = _load_json(row['metadata'])
+                items.append(DeadLetterItem(
+                    queue_id=row['queue_id'],
+                    doc_id=row['doc_id'],
+                    run_id=row['run_id'],
+                    source_name=row['source_name'] or 'unknown',
+                    failure_reason=metadata.get('dead_letter_reason', row['error_message'] or 'Unknown failure'),
+                    failure_count=metadata.get('final_retry_count', row['retry_count'] or 0),
+                    first_failed_at=_to_datetime(row['created_at']),
+                    last_failed_at=_to_datetime(row['updated_at']),
+                    original_metadata=metadata,
+                    error_history=metadata.get('error_history', [])
+                ))
+
+            logger.debug(f"Retrieved {len(items)} dead letter items")
+            return items
+
+        except Exception as e:
+            logger.error(f"Error getting dead letter items: {str(e)}")
+            return []
+
+    def retry_dead_letter_item(self, queue_id: int) -> bool:
+        """Retry a document from the dead letter queue."""
+        try:
+            retry_metadata = {
+                'retried_from_dead_letter_at': datetime.now().isoformat(),
+                'manual_retry': True
+            }
+            now = time.time()
+            with self.db.transaction():
+                updated = self.db.execute_raw("""
+                    UPDATE document_queue
+                    SET status = 'retry',
+                        retry_count = 0,
+                        claimed_at = NULL,
+                        worker_id = NULL,
+                        scheduled_for = ?,
+                        updated_at = ?,
+                        error_message = NULL,
+                        metadata = json_patch(COALESCE(metadata, '{}'), ?)
+                    WHERE queue_id = ? AND status = 'dead_letter'
+                """, (now, now, json.dumps(retry_metadata), queue_id))
+
+            if updated:
+                logger.info(f"Successfully moved dead letter item {queue_id} back to retry queue")
+                return True
+            logger.warning(f"No dead letter item found with queue_id {queue_id}")
+            return False
+
+        except Exception as e:
+            logger.error(f"Error retrying dead letter item {queue_id}: {str(e)}")
+            return False
+
+    def purge_old_dead_letters(self, older_than_days: int = 30) -> int:
+        """Purge old dead letter items to prevent unbounded growth."""
+        try:
+            cutoff = (datetime.now() - timedelta(days=older_than_days)).timestamp()
+            with self.db.transaction():
+                purged_count = self.db.execute_raw("""
+                    DELETE FROM document_queue
+                    WHERE status = 'dead_letter'
+                    AND updated_at < ?
+                """, (cutoff,))
+
+            if purged_count:
+                logger.info(f"Purged {purged_count} old dead letter items older than {older_than_days} days")
+            return purged_count
+
+        except Exception as e:
+            logger.error(f"Error purging old dead letter items: {str(e)}")
+            return 0
+
+    def get_dead_letter_statistics(self) -> Dict[str, Any]:
+        """Get statistics about the dead letter queue."""
+        try:
+            stats = self.db.execute("""
+                SELECT
+                    COUNT(*) as total_dead_letters,
+                    COUNT(DISTINCT run_id) as affected_runs,
+                    COUNT(DISTINCT source_name) as affected_sources,
+                    MIN(updated_at) as oldest_dead_letter,
+                    MAX(updated_at) as newest_dead_letter,
+                    AVG(COALESCE(json_extract(metadata, '$.final_retry_count'), retry_count)) as avg_retry_count
+                FROM document_queue
+                WHERE status = 'dead_letter'
+            """)
+
+            reasons = self.db.fetch_all("""
+                SELECT
+                    COALESCE(json_extract(metadata, '$.dead_letter_reason'), error_message, 'Unknown') as reason,
+                    COUNT(*) as count
+                FROM document_queue
+                WHERE status = 'dead_letter'
+                GROUP BY reason
+                ORDER BY count DESC
+                LIMIT 10
+            """)
+
+            oldest = _to_datetime(stats['oldest_dead_letter'])
+            newest = _to_datetime(stats['newest_dead_letter'])
+            return {
+                'total_dead_letters': stats['total_dead_letters'] or 0,
+                'affected_runs': stats['affected_runs'] or 0,
+                'affected_sources': stats['affected_sources'] or 0,
+                'oldest_dead_letter': oldest.isoformat() if oldest else None,
+                'newest_dead_letter': newest.isoformat() if newest else None,
+                'avg_retry_count': float(stats['avg_retry_count'] or 0),
+                'failure_reasons': {row['reason']: row['count'] for row in reasons}
+            }
+
+        except Exception as e:
+            logger.error(f"Error getting dead letter statistics: {str(e)}")
+            return {'total_dead_letters': 0, 'error': str(e)}
+
+
+class SQLiteQueueBackend(QueueBackend):
+    """Work queue in a local SQLite file, for worker processes on a single host."""
+
+    embedded = True
+
+    def __init__(self, db_path: str, busy_timeout: float = 30.0):
+        """
+        Initialize the backend.
+
+        Args:
+            db_path: Path to the SQLite queue file
+            busy_timeout: Seconds to wait for another process's write lock
+        """
+        self.db_path = db_path
+        self.db = SQLiteQueueDatabase(db_path, busy_timeout)
+        self.notifier = create_local_notifier(f"{db_path}.notify")
+        self.db.notifier = self.notifier
+
+    def initialize(self) -> None:
+        """Create the queue schema if it does not exist."""
+        self.db.execute_raw(SCHEMA_SQL)
+        logger.debug(f"Initialized SQLite work queue at {self.db_path}")
+
+    def create_work_queue(self, worker_id: str) -> WorkQueue:
+        """Create a work queue for a worker."""
+        return SQLiteWorkQueue(self.db, worker_id, self.notifier)
+
+    def create_run_coordinator(self, worker_id: str) -> RunCoordinator:
+        """Create a run coordinator for a worker."""
+        return SQLiteRunCoordinator(self.db, worker_id)
+
+    def create_dead_letter_queue(self, max_retries: int = 3) -> DeadLetterQueue:
+        """Create a dead letter queue manager."""
+        return SQLiteDeadLetterQueue(self.db, max_retries)
+
+    def close(self) -> None:
+        """Close this process's queue connections and notification socket."""
+        self.notifier.close()
+        self.db.close()
@@ -10,10 +10,33 @@ import socket
 import time
 import uuid
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List, Tuple
+from itertools import islice
+from typing import Dict, Any, Iterable, Iterator, Optional, List, Tuple
+
+from .notifier import QueueNotifier
 
 logger = logging.getLogger(__name__)
 
+# Per-status document counts kept in run_queue_counts
+STATUS_COLUMNS = "pending, processing, completed, failed, retry, dead_letter"
+
+
+def _with_total(counts: Optional[Dict[str, Any]]) -> Dict[str, int]:
+    """Complete a run_queue_counts row (or its absence) with zero counts and a total."""
+    counts = {status: (counts or {}).get(status) or 0 for status in STATUS_COLUMNS.split(', ')}
+    counts['total'] = sum(counts.values())
+    return counts
+
+
+def _chunked(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    """Yield de-duplicated chunks of up to size items from an iterable without materializing it."""
+    iterator = iter(items)
+    while True:
+        chunk = list(dict.fromkeys(islice(iterator, size)))
+        if not chunk:
+            return
+        yield chunk
+
 
 class RunCoordinator:
     """Manages processing runs with elected leader coordination."""
@@ -246,18 +269,24 @@ class RunCoordinator:
 class WorkQueue:
     """Document work queue with atomic operations."""
     
-    def __init__(self, db, worker_id: str):
+    def __init__(self, db, worker_id: str, notifier: Optional[QueueNotifier] = None):
         """
         Initialize work queue.
         
         Args:
             db: Database connection
             worker_id: Unique worker identifier
+            notifier: Optional notifier for queue changes (defaults to polling)
         """
         self.db = db
         self.worker_id = worker_id
+        self.notifier = notifier or QueueNotifier()
         self.heartbeat_interval = 30  # seconds
         self.claim_timeout = 300  # 5 minutes
+        self.max_retries = 3  # Matches the max_retries column default
+        self.retry_delay = 60  # Base delay in seconds, doubled on each retry
+        self.enqueue_chunk_size = 500  # Documents inserted per statement by add_documents
+        self._source_configs: Dict[Tuple[str, str], Dict[str, Any]] = {}
     
     def add_document(self, doc_id: str, source_name: str, run_id: str,
                     source_type: str = 'configured',
@@ -306,6 +335,99 @@ class WorkQueue:
             
             return result['queue_id']
     
+    def add_documents(self, doc_ids: Iterable[str], source_name: str, run_id: str,
+                      source_type: str = 'configured', chunk_size: Optional[int] = None) -> int:
+        """
+        Add documents to the processing queue in bulk.
+        
+        The ids are consumed lazily and inserted in chunks, each with one
+        multi-row upsert and one update of the run counters, so listing a large
+        source never holds all ids in memory or touches processing_runs per
+        document. Source settings are not copied into each row; register them
+        once per run with register_source().
+        
+        Args:
+            doc_ids: Iterable of document identifiers
+            source_name: Source name
+            run_id: Processing run ID
+            source_type: Type of source ('configured', 'linked', 'discovered')
+            chunk_size: Documents per chunk (defaults to enqueue_chunk_size)
+            
+        Returns:
+            Number of documents queued
+        """
+        queued = 0
+        for chunk in _chunked(doc_ids, chunk_size or self.enqueue_chunk_size):
+            self._enqueue_chunk(chunk, source_name, run_id, source_type)
+            queued += len(chunk)
+            logger.debug(f"Queued {queued} documents from source {source_name}")
+        return queued
+    
+    def _enqueue_chunk(self, doc_ids: List[str], source_name: str, run_id: str,
+                       source_type: str) -> None:
+        """Upsert one chunk of distinct documents and update the run counters once."""
+        values = ', '.join(['(%s, %s, %s, %s)'] * len(doc_ids))
+        params = tuple(param for doc_id in doc_ids
+                       for param in (doc_id, source_name, source_type, run_id))
+        
+        with self.db.transaction():
+            self.db.execute(f"""
+                INSERT INTO document_queue (doc_id, source_name, source_type, run_id)
+                VALUES {values}
+                ON CONFLICT (run_id, doc_id, source_name) 
+                DO UPDATE SET
+                    updated_at = CURRENT_TIMESTAMP,
+                    link_depth = LEAST(document_queue.link_depth, EXCLUDED.link_depth)
+            """, params)
+            
+            self.db.execute("""
+                UPDATE processing_runs
+                SET documents_queued = documents_queued + %s,
+                    last_activity_at = CURRENT_TIMESTAMP
+                WHERE run_id = %s
+            """, (len(doc_ids), run_id))
+    
+    def register_source(self, run_id: str, source_config: Dict[str, Any]) -> None:
+        """
+        Store a content source configuration once for a run.
+        
+        Args:
+            run_id: Processing run ID
+            source_config: Content source configuration (must include 'name')
+        """
+        source_name = source_config['name']
+        self.db.execute("""
+            INSERT INTO run_sources (run_id, source_name, source_config)
+            VALUES (%s, %s, %s)
+            ON CONFLICT (run_id, source_name)
+            DO UPDATE SET source_config = EXCLUDED.source_config
+        """, (run_id, source_name, json.dumps(source_config)))
+        self._source_configs[(run_id, source_name)] = source_config
+    
+    def get_source_config(self, run_id: str, source_name: str) -> Dict[str, Any]:
+        """
+        Get the configuration registered for a content source in a run.
+        
+        Args:
+            run_id: Processing run ID
+            source_name: Source name
+            
+        Returns:
+            Source configuration (empty if the source was not registered)
+        """
+        key = (run_id, source_name)
+        if key not in self._source_configs:
+            result = self.db.execute("""
+                SELECT source_config
+                FROM run_sources
+                WHERE run_id = %s AND source_name = %s
+            """, (run_id, source_name))
+            source_config = result.get('source_config') if result else None
+            if isinstance(source_config, str):
+                source_config = json.loads(source_config)
+            self._source_configs[key] = source_config or {}
+        return self._source_configs[key]
+    
     def claim_next_document(self, run_id: str) -> Optional[Dict[str, Any]]:
         """
         Atomically claim the next available document for processing.
@@ -323,7 +445,7 @@ class WorkQueue:
             # First, try to claim a new document
             doc = self.db.execute("""
                 SELECT queue_id, doc_id, source_name, source_type,
-                       parent_doc_id, link_depth, metadata
+                       parent_doc_id, link_depth, metadata, retry_count
                 FROM document_queue
                 WHERE run_id = %s
                   AND status = 'pending'
@@ -337,7 +459,7 @@ class WorkQueue:
                 # Check for stale claims (worker died)
                 doc = self.db.execute("""
                     SELECT queue_id, doc_id, source_name, source_type,
-                           parent_doc_id, link_depth, metadata
+                           parent_doc_id, link_depth, metadata, retry_count
                     FROM document_queue
                     WHERE run_id = %s
                       AND status = 'processing'
@@ -372,6 +494,167 @@ class WorkQueue:
         
         return None
     
+    def claim_batch(self, run_id: str, n: int) -> List[Dict[str, Any]]:
+        """
+        Atomically claim up to n documents in a single statement.
+        
+        Pending documents, retries that are due and stale claims are claimed
+        together, so a worker pays one round trip and one run_workers update
+        per batch instead of per document. A stale claim counts as a retry;
+        stale documents that are out of retries are failed instead. Claimed
+        documents have no started_at until mark_started() is called for them.
+        Requires a db with fetch_all().
+        
+        Args:
+            run_id: Processing run ID
+            n: Maximum number of documents to claim
+            
+        Returns:
+            Claimed documents in priority order (empty if no work available)
+        """
+        with self.db.transaction():
+            expired = self.db.fetch_all("""
+                UPDATE document_queue
+                SET status = 'failed',
+                    worker_id = NULL,
+                    error_message = 'Claim expired after the last retry',
+                    failed_at = CURRENT_TIMESTAMP
+                WHERE queue_id IN (
+                    SELECT queue_id
+                    FROM document_queue
+                    WHERE run_id = %s
+                      AND status = 'processing'
+                      AND claimed_at < CURRENT_TIMESTAMP - INTERVAL '%s seconds'
+                      AND retry_count >= max_retries
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING queue_id
+            """, (run_id, self.claim_timeout))
+            
+            if expired:
+                logger.error(f"Failed {len(expired)} documents whose claim expired after the last retry")
+                self.db.execute("""
+                    UPDATE processing_runs
+                    SET documents_failed = documents_failed + %s
+                    WHERE run_id = %s
+                """, (len(expired), run_id))
+            
+            docs = self.db.fetch_all("""
+                UPDATE document_queue
+                SET retry_count = CASE WHEN status = 'processing' THEN retry_count + 1 ELSE retry_count END,
+                    status = 'processing',
+                    worker_id = %s,
+                    claimed_at = CURRENT_TIMESTAMP,
+                    started_at = NULL
+                WHERE queue_id IN (
+                    SELECT queue_id
+                    FROM document_queue
+                    WHERE run_id = %s
+                      AND ((status IN ('pending', 'retry') AND scheduled_for <= CURRENT_TIMESTAMP)
+                           OR (status = 'processing'
+                               AND claimed_at < CURRENT_TIMESTAMP - INTERVAL '%s seconds'))
+                    ORDER BY priority DESC, link_depth ASC, created_at ASC
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING queue_id, doc_id, source_name, source_type,
+                          parent_doc_id, link_depth, metadata, retry_count,
+                          priority, created_at
+            """, (self.worker_id, run_id, self.claim_timeout, n))
+            
+            if docs:
+                self.db.execute("""
+                    UPDATE run_workers
+                    SET documents_claimed = documents_claimed + %s,
+                        last_heartbeat = CURRENT_TIMESTAMP,
+                        status = 'processing'
+                    WHERE run_id = %s AND worker_id = %s
+                """, (len(docs), run_id, self.worker_id))
+        
+        # RETURNING does not preserve the subquery order
+        docs = sorted(docs or [], key=lambda d: (-d['priority'], d['link_depth'], d['created_at']))
+        logger.debug(f"Worker {self.worker_id} claimed {len(docs)} documents")
+        return docs
+    
+    def mark_started(self, queue_id: int) -> None:
+        """
+        Record that processing of a claimed document has begun.
+        
+        The claim is renewed so the document gets a full claim_timeout from
+        now, and from here on heartbeat() stops renewing it once claim_timeout
+        has passed, so a hung document is reclaimed.
+        
+        Args:
+            queue_id: Queue ID of a document held by this worker
+        """
+        self.db.execute("""
+            UPDATE document_queue
+            SET started_at = CURRENT_TIMESTAMP,
+                claimed_at = CURRENT_TIMESTAMP
+            WHERE queue_id = %s
+              AND worker_id = %s
+              AND status = 'processing'
+        """, (queue_id, self.worker_id))
+    
+    def release_documents(self, queue_ids: List[int]) -> None:
+        """
+        Return claimed documents that were not processed to the pending state.
+        
+        Args:
+            queue_ids: Queue IDs of documents held by this worker
+        """
+        if not queue_ids:
+            return
+        self.db.execute("""
+            UPDATE document_queue
+            SET status = 'pending',
+                worker_id = NULL,
+                claimed_at = NULL
+            WHERE queue_id = ANY(%s)
+              AND worker_id = %s
+              AND status = 'processing'
+        """, (list(queue_ids), self.worker_id))
+        logger.debug(f"Worker {self.worker_id} released {len(queue_ids)} documents")
+    
+    def get_held_documents(self, started: Optional[bool] = None) -> List[int]:
+        """
+        Get the documents claimed by this worker and not yet finished.
+        
+        Args:
+            started: Only documents whose processing has (True) or has not (False)
+                     begun; None for all
+        
+        Returns:
+            Queue IDs of the documents
+        """
+        condition = {None: "", True: " AND started_at IS NOT NULL", False: " AND started_at IS NULL"}[started]
+        rows = self.db.fetch_all(f"""
+            SELECT queue_id FROM document_queue
+            WHERE worker_id = %s AND status = 'processing'{condition}
+        """, (self.worker_id,))
+        return [row['queue_id'] for row in rows]
+    
+    def fail_held_documents(self, error_message: str) -> int:
+        """
+        Fail the document this worker was processing, e.g. after its process crashed.
+        
+        The document is retried like any other failure, so a document that
+        crashes every worker ends up failed instead of crashing workers forever.
+        Documents the worker had claimed but not started are returned to the
+        pending state without using up a retry.
+        
+        Args:
+            error_message: Failure reason recorded for the documents
+            
+        Returns:
+            Number of documents failed
+        """
+        self.release_documents(self.get_held_documents(started=False))
+        queue_ids = self.get_held_documents(started=True)
+        for queue_id in queue_ids:
+            self.mark_failed(queue_id, error_message)
+        return len(queue_ids)
+    
     def mark_completed(self, queue_id: int, content_hash: Optional[str] = None,
                       file_size: Optional[int] = None) -> None:
         """
@@ -441,7 +724,7 @@ class WorkQueue:
             
             if result['retry_count'] < result['max_retries']:
                 # Schedule retry with exponential backoff
-                retry_delay = 2 ** result['retry_count'] * 60  # 1, 2, 4 minutes
+                retry_delay = 2 ** result['retry_count'] * self.retry_delay  # 1, 2, 4 minutes by default
                 
                 self.db.execute("""
                     UPDATE document_queue
@@ -559,15 +842,108 @@ class WorkQueue:
             WHERE run_id = %s
         """, (run_id,))
     
+    def get_status_counts(self, run_id: str) -> Dict[str, int]:
+        """
+        Get per-status document counts for a run without scanning the queue.
+        
+        The counts are maintained by a trigger on document_queue, so this is a
+        single row lookup where get_queue_status aggregates the whole run.
+        
+        Args:
+            run_id: Processing run ID
+            
+        Returns:
+            Document counts by status, plus the total
+        """
+        counts = self.db.execute(f"""
+            SELECT {STATUS_COLUMNS}
+            FROM run_queue_counts
+            WHERE run_id = %s
+        """, (run_id,))
+        return _with_total(counts)
+    
+    def has_active_work(self, run_id: str) -> bool:
+        """
+        Check whether documents of a run are still pending, processing or awaiting retry.
+        
+        Args:
+            run_id: Processing run ID
+            
+        Returns:
+            True if the run has unfinished documents
+        """
+        counts = self.get_status_counts(run_id)
+        return counts['pending'] + counts['processing'] + counts['retry'] > 0
+    
+    def wait_for_change(self, timeout: float) -> bool:
+        """
+        Block until the queue changes or the timeout passes.
+        
+        Args:
+            timeout: Maximum seconds to wait
+            
+        Returns:
+            True if woken by a change notification, False on timeout
+        """
+        return self.notifier.wait(timeout)
+    
+    def get_completed_documents(self, run_id: str) -> List[Dict[str, Any]]:
+        """
+        Get the documents completed in a run.
+        
+        Args:
+            run_id: Processing run ID
+            
+        Returns:
+            List of dictionaries with doc_id, source_name and completed_at
+        """
+        return self.db.execute("""
+            SELECT DISTINCT doc_id, source_name, completed_at
+            FROM document_queue 
+            WHERE run_id = %s 
+            AND status = 'completed'
+            ORDER BY completed_at
+        """, (run_id,)) or []
+    
+    def reclaim_stale_work(self, timeout: Optional[int] = None) -> int:
+        """
+        Return documents whose worker stopped responding to the pending state.
+        
+        Args:
+            timeout: Seconds since the claim after which it is stale (defaults to claim_timeout)
+            
+        Returns:
+            Number of documents reclaimed
+        """
+        result = self.db.execute("""
+            SELECT reclaim_stale_work(%s) as reclaimed
+        """, (timeout or self.claim_timeout,))
+        return result.get('reclaimed', 0) if result else 0
+    
     def heartbeat(self, run_id: str) -> None:
         """
-        Send worker heartbeat.
+        Send worker heartbeat and renew the claims on documents it holds.
+        
+        Renewing claimed_at keeps the not yet started rest of a claimed
+        batch from being reclaimed as stale, however long it waits. Once a
+        document is started its claim is only renewed during the first
+        claim_timeout of processing, so a document whose processing hangs is
+        still reclaimed within twice claim_timeout.
         
         Args:
             run_id: Processing run ID
         """
-        self.db.execute("""
-            UPDATE run_workers
-            SET last_heartbeat = CURRENT_TIMESTAMP
-            WHERE run_id = %s AND worker_id = %s
-        """, (run_id, self.worker_id))
\ No newline at end of file
+        with self.db.transaction():
+            self.db.execute("""
+                UPDATE run_workers
+                SET last_heartbeat = CURRENT_TIMESTAMP
+                WHERE run_id = %s AND worker_id = %s
+            """, (run_id, self.worker_id))
+            
+            self.db.execute("""
+                UPDATE document_queue
+                SET claimed_at = CURRENT_TIMESTAMP
+                WHERE run_id = %s AND worker_id = %s AND status = 'processing'
+                  AND (started_at IS NULL
+                       OR started_at >= CURRENT_TIMESTAMP - INTERVAL '%s seconds')
+            """, (run_id, self.worker_id, self.claim_timeout))
\ No newline at end of file
@@ -2,18 +2,22 @@
 Document worker implementation for distributed processing.
 """
 
+import copy
 import logging
+import multiprocessing
+import queue
 import signal
 import threading
 import time
 import uuid
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 from ..config import Config
-from ..embeddings import get_embedding_generator
+from ..embeddings import EmbeddingServer, RemoteEmbeddingGenerator, get_embedding_generator
 from ..relationships import create_relationship_detector
+from .backend import get_queue_backend, get_queue_config
 from .document_processor import QueuedDocumentProcessor
-from .work_queue import WorkQueue, RunCoordinator
+from .work_queue import RunCoordinator
 
 logger = logging.getLogger(__name__)
 
@@ -24,21 +28,28 @@ class DocumentWorker:
     Handles worker lifecycle, heartbeats, and graceful shutdown.
     """
     
-    def __init__(self, config: Config, worker_id: Optional[str] = None):
+    def __init__(self, config: Config, worker_id: Optional[str] = None, wait_for_work: bool = False,
+                 embedding_server: Optional[Tuple[Any, bytes]] = None):
         """
         Initialize document worker.
         
         Args:
             config: Configuration object
             worker_id: Optional worker ID (generates UUID if not provided)
+            wait_for_work: Keep waiting while other workers may still add or fail documents
+            embedding_server: Optional (address, authkey) of a shared EmbeddingServer to
+                embed with instead of loading the embedding model in this worker
         """
         self.config = config
         self.worker_id = worker_id or f"worker_{uuid.uuid4().hex[:8]}"
+        self.wait_for_work = wait_for_work
+        self.embedding_server = embedding_server
         self.running = False
         self.shutdown_requested = False
         
         # Initialize components
         self.db = None
+        self.queue_backend = None
         self.work_queue = None
         self.processor = None
         self.heartbeat_thread = None
@@ -65,9 +76,10 @@ class DocumentWorker:
         """
         logger.info(f"Starting worker {self.worker_id}")
         
-        # Set up signal handlers for graceful shutdown
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
+        # Set up signal handlers for graceful shutdown (only possible in the main thread)
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, self._signal_handler)
+            signal.signal(signal.SIGTERM, self._signal_handler)
         
         self.stats["start_time"] = time.time()
         self.running = True
@@ -75,12 +87,14 @@ class DocumentWorker:
         try:
             # Initialize database and components
             self._initialize_components()
+            if self.shutdown_requested:
+                self.processor.stop()
             
             # Get processing run ID from configuration
             run_id = RunCoordinator.get_run_id_from_config(self.config.config)
             
             # Register worker with coordinator
-            coordinator = RunCoordinator(self.db)
+            coordinator = self.queue_backend.create_run_coordinator(self.worker_id)
             coordinator.register_worker(run_id, self.worker_id, {
                 "version": "1.0.0",  # Could get from package metadata
                 "capabilities": ["document_parsing", "link_discovery", "embedding_generation"]
@@ -92,7 +106,7 @@ class DocumentWorker:
             # Process documents until shutdown or no more work
             logger.info(f"Worker {self.worker_id} beginning document processing for run {run_id}")
             
-            processing_stats = self.processor.process_documents(run_id)
+            processing_stats = self.processor.process_documents(run_id, wait_for_work=self.wait_for_work)
             
             # Update overall statistics
             self.stats.update(processing_stats)
@@ -113,6 +127,8 @@ class DocumentWorker:
         logger.info(f"Shutdown requested for worker {self.worker_id}")
         self.shutdown_requested = True
         self.running = False
+        if self.processor:
+            self.processor.stop()
     
     def _initialize_components(self):
         """Initialize database, work queue, and processor components."""
@@ -123,13 +139,18 @@ class DocumentWorker:
         logger.debug(f"Database initialized: {type(self.db).__name__}")
         
         # Initialize work queue
-        self.work_queue = WorkQueue(self.db, self.worker_id)
+        self.queue_backend = get_queue_backend(self.config)
+        self.queue_backend.initialize()
+        self.work_queue = self.queue_backend.create_work_queue(self.worker_id)
         logger.debug(f"Work queue initialized for worker {self.worker_id}")
         
         # Initialize embedding generator (if enabled)
         embedding_generator = None
         if self.config.is_embedding_enabled():
-            embedding_generator = get_embedding_generator(self.config)
+            base_generator = None
+            if self.embedding_server:
+                base_generator = RemoteEmbeddingGenerator(self.config, *self.embedding_server)
+            embedding_generator = get_embedding_generator(self.config, base_generator)
             logger.info(f"Embedding generator initialized: {self.config.get_embedding_model()}")
         
         # Initialize relationship detector
@@ -146,11 +167,16 @@ class DocumentWorker:
         logger.debug("Relationship detector initialized")
         
         # Initialize document processor
+        queue_config = get_queue_config(self.config)
         self.processor = QueuedDocumentProcessor(
             db=self.db,
             work_queue=self.work_queue,
             relationship_detector=relationship_detector,
-            embedding_generator=embedding_generator
+            embedding_generator=embedding_generator,
+            dead_letter_queue=self.queue_backend.create_dead_letter_queue(),
+            max_batch_size=queue_config.get('max_batch_size', 16),
+            prefetch_depth=queue_config.get('prefetch_depth', 2),
+            batch_target_seconds=queue_config.get('batch_target_seconds', 5.0)
         )
         logger.debug("Document processor initialized")
     
@@ -192,6 +218,13 @@ class DocumentWorker:
         if self.heartbeat_thread and self.heartbeat_thread.is_alive():
             self.heartbeat_thread.join(timeout=5)
         
+        # Close queue connections
+        if self.queue_backend:
+            try:
+                self.queue_backend.close()
+            except Exception as e:
+                logger.warning(f"Error closing work queue: {str(e)}")
+        
         # Close database connection
         if self.db:
             try:
@@ -204,23 +237,53 @@ class DocumentWorker:
 
 class WorkerManager:
     """
-    Manager for running multiple document workers in a single process.
+    Manager for running multiple document workers on this host.
+    
+    In thread mode the workers share this process. Parsing, extraction and
+    embedding are CPU-bound, so thread workers are limited to about one core by
+    the GIL; process mode runs each worker in its own process instead. Process
+    workers embed through a shared EmbeddingServer, so the embedding model is
+    loaded once, before the workers start. A worker process that crashes has
+    its claimed documents failed (and so retried) and is restarted.
     """
     
-    def __init__(self, config: Config, num_workers: int = 1):
+    STAT_KEYS = ["documents_processed", "documents_failed", "elements_created",
+                 "relationships_created", "links_discovered"]
+    
+    def __init__(self, config: Config, num_workers: int = 1, mode: str = "thread",
+                 wait_for_work: bool = False, max_restarts: int = 3,
+                 worker_id_prefix: str = "worker"):
         """
         Initialize worker manager.
         
         Args:
             config: Configuration object
-            num_workers: Number of worker threads to run
+            num_workers: Number of workers to run
+            mode: "thread" to run the workers in this process, "process" to run
+                each worker in its own process
+            wait_for_work: Keep workers waiting while other workers may still add
+                or fail documents, so the run is drained before they exit
+            max_restarts: Restarts per worker process after a crash (process mode)
+            worker_id_prefix: Prefix of the worker IDs
+            
+        Raises:
+            ValueError: If the mode is not supported
         """
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unsupported worker mode: {mode}")
+        
         self.config = config
         self.num_workers = num_workers
+        self.mode = mode
+        self.wait_for_work = wait_for_work
+        self.max_restarts = max_restarts
+        self.worker_id_prefix = worker_id_prefix
         self.workers = []
         self.worker_threads = []
+        self.worker_processes = []
+        self.shutdown_requested = False
         
-        logger.info(f"Initialized WorkerManager with {num_workers} workers")
+        logger.info(f"Initialized WorkerManager with {num_workers} {mode} workers")
     
     def start_all(self) -> Dict[str, Any]:
         """
@@ -231,16 +294,6 @@ class WorkerManager:
         """
         logger.info(f"Starting {self.num_workers} workers")
         
-        # Create and start worker threads
-        for i in range(self.num_workers):
-            worker = DocumentWorker(self.config, f"worker_{i+1}")
-            self.workers.append(worker)
-            
-            thread = threading.Thread(target=worker.start, name=f"Worker-{i+1}")
-            self.worker_threads.append(thread)
-            thread.start()
-        
-        # Wait for all workers to complete
         combined_stats = {
             "total_workers": self.num_workers,
             "documents_processed": 0,
@@ -250,14 +303,16 @@ class WorkerManager:
             "links_discovered": 0
         }
         
-        for thread in self.worker_threads:
-            thread.join()
+        if self.mode == "process":
+            worker_stats, restarts = self._run_processes()
+            combined_stats["worker_restarts"] = restarts
+        else:
+            worker_stats = self._run_threads()
         
         # Combine statistics from all workers
-        for worker in self.workers:
-            for key in ["documents_processed", "documents_failed", "elements_created", 
-                       "relationships_created", "links_discovered"]:
-                combined_stats[key] += worker.stats.get(key, 0)
+        for stats in worker_stats:
+            for key in self.STAT_KEYS:
+                combined_stats[key] += stats.get(key, 0)
         
         logger.info(
             f"All workers completed. Processed {combined_stats['documents_processed']} documents "
@@ -269,12 +324,194 @@ class WorkerManager:
     def stop_all(self):
         """Stop all workers gracefully."""
         logger.info("Stopping all workers")
+        self.shutdown_requested = True
         
         for worker in self.workers:
             worker.stop()
         
-        # Wait for threads to finish
+        # Worker processes stop on SIGTERM after their current document
+        for process in self.worker_processes:
+            if process.is_alive():
+                process.terminate()
+        
+        # Wait for threads to finish; start_all() collects the processes
         for thread in self.worker_threads:
             thread.join(timeout=30)  # 30 second timeout
         
-        logger.info("All workers stopped")
\ No newline at end of file
+        logger.info("All workers stopped")
+    
+    def _run_threads(self) -> List[Dict[str, Any]]:
+        """Run the workers as threads of this process until they finish."""
+        # Create and start worker threads
+        for i in range(self.num_workers):
+            worker = DocumentWorker(self.config, f"{self.worker_id_prefix}_{i+1}", self.wait_for_work)
+            self.workers.append(worker)
+            
+            thread = threading.Thread(target=worker.start, name=f"Worker-{i+1}")
+            self.worker_threads.append(thread)
+            thread.start()
+        
+        # Wait for all workers to complete
+        for thread in self.worker_threads:
+            thread.join()
+        
+        return [worker.stats for worker in self.workers]
+    
+    def _run_processes(self) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Run the workers as processes until they finish, restarting crashed ones.
+        
+        Returns:
+            Statistics reported by the workers, and the number of restarts
+        """
+        # Create the document schema once, before the workers open the database concurrently
+        self.config.initialize_database()
+        
+        # Spawned workers open their own database and queue connections
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        embedding_server = self._start_embedding_server(context)
+        connection_info = embedding_server.connection_info if embedding_server else None
+        
+        def start_process(worker_id: str):
+            process = context.Process(target=run_local_worker, name=worker_id,
+                                      args=(self.config.config, worker_id, results, self.wait_for_work,
+                                            connection_info))
+            process.start()
+            self.worker_processes.append(process)
+            return process
+        
+        # Worker ID, current process and restart count of each worker slot
+        slots = []
+        for i in range(self.num_workers):
+            worker_id = f"{self.worker_id_prefix}_{i+1}"
+            slots.append([worker_id, start_process(worker_id), 0])
+        logger.info(f"Started {self.num_workers} worker processes")
+        
+        reported = {}
+        restarts = 0
+        try:
+            while slots:
+                try:
+                    worker_id, stats = results.get(timeout=1)
+                    reported[worker_id] = stats
+                    continue
+                except queue.Empty:
+                    pass
+                except KeyboardInterrupt:
+                    self.stop_all()
+                    continue
+                
+                for slot in list(slots):
+                    worker_id, process, slot_restarts = slot
+                    if process.is_alive():
+                        continue
+                    process.join()
+                    
+                    # A worker reports its statistics before exiting; no report means it crashed
+                    while process.name not in reported:
+                        try:
+                            reported_id, stats = results.get_nowait()
+                            reported[reported_id] = stats
+                        except queue.Empty:
+                            break
+                    if process.name in reported or process.exitcode == 0:
+                        slots.remove(slot)
+                        continue
+                    
+                    logger.error(f"Worker process {process.name} exited with code {process.exitcode}")
+                    self._fail_crashed_worker_documents(process.name, process.exitcode)
+                    if self.shutdown_requested or slot_restarts >= self.max_restarts:
+                        slots.remove(slot)
+                        continue
+                    
+                    # The replacement registers under a new worker ID
+                    restarts += 1
+                    slot[2] += 1
+                    slot[1] = start_process(f"{worker_id}_restart{slot[2]}")
+                    logger.info(f"Restarted crashed worker process as {slot[1].name}")
+        finally:
+            if embedding_server:
+                embedding_server.stop()
+        
+        for worker_id, stats in reported.items():
+            if "error" in stats:
+                logger.error(f"Worker {worker_id} failed: {stats['error']}")
+        
+        return list(reported.values()), restarts
+    
+    def _start_embedding_server(self, context) -> Optional[EmbeddingServer]:
+        """
+        Load the embedding model once for all worker processes.
+        
+        Hosted API providers are called by each worker directly; setting
+        processing.shared_embedding_server to false also loads the model in every worker.
+        
+        Args:
+            context: Multiprocessing context
+            
+        Returns:
+            Started EmbeddingServer, or None if workers embed on their own
+        """
+        provider = self.config.config.get("embedding", {}).get("provider")
+        shared = self.config.config.get("processing", {}).get("shared_embedding_server", True)
+        if not self.config.is_embedding_enabled() or provider == "openai" or not shared:
+            return None
+        
+        server = EmbeddingServer(copy.deepcopy(self.config.config), context)
+        server.start()
+        return server
+    
+    def _fail_crashed_worker_documents(self, worker_id: str, exitcode: Optional[int]) -> None:
+        """
+        Fail the document a crashed worker process was processing and release the ones it had
+        not started, so they are picked up again without waiting for its lease.
+        """
+        try:
+            queue_backend = get_queue_backend(self.config)
+            try:
+                failed = queue_backend.create_work_queue(worker_id).fail_held_documents(
+                    f"Worker process {worker_id} exited with code {exitcode}")
+            finally:
+                queue_backend.close()
+            if failed:
+                logger.warning(f"Failed {failed} documents held by crashed worker {worker_id}")
+        except Exception as e:
+            logger.error(f"Could not release documents of crashed worker {worker_id}: {str(e)}")
+
+
+def run_local_worker(config_data: Dict[str, Any], worker_id: str, results=None, wait_for_work: bool = True,
+                     embedding_server: Optional[Tuple[Any, bytes]] = None) -> Dict[str, Any]:
+    """
+    Entry point for a worker process started on this host by a WorkerManager.
+    
+    The process builds its own configuration, content sources and database
+    connections, then processes documents until the run is drained.
+    
+    Args:
+        config_data: Configuration dictionary of the run
+        worker_id: Worker ID
+        results: Optional multiprocessing queue receiving (worker_id, stats)
+        wait_for_work: Keep waiting while other workers may still add or fail documents
+        embedding_server: Optional (address, authkey) of a shared EmbeddingServer
+        
+    Returns:
+        Processing statistics
+    """
+    from ..content_source.factory import get_content_source, register_content_source
+    
+    config = Config()
+    config.config = config_data
+    
+    for source_config in config.get_content_sources():
+        register_content_source(source_config.get('name'), get_content_source(source_config))
+    
+    try:
+        config.initialize_database()
+        stats = DocumentWorker(config, worker_id, wait_for_work, embedding_server).start()
+    except Exception as e:
+        stats = {"error": str(e)}
+    
+    if results is not None:
+        results.put((worker_id, stats))
+    return stats
@@ -0,0 +1,189 @@
+"""
+Tests for the document source cache and the shared content resolver.
+"""
+
+import os
+import tempfile
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from go_doc_go.adapter.factory import ContentResolverFactory, create_content_resolver, clear_content_resolvers
+from go_doc_go.adapter.source_cache import DocumentSourceCache
+
+
+class ClosableDocument:
+    """Document handle that records whether it was closed."""
+
+    def __init__(self, content):
+        self.content = content
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestDocumentSourceCache:
+    """Unit tests for DocumentSourceCache."""
+
+    def test_source_fetched_once(self):
+        cache = DocumentSourceCache()
+        fetch = MagicMock(return_value={"content": b"abc"})
+
+        assert cache.get_source("s3", "s3://bucket/key", fetch)["content"] == b"abc"
+        assert cache.get_source("s3", "s3://bucket/key", fetch)["content"] == b"abc"
+        assert fetch.call_count == 1
+
+        stats = cache.get_statistics()
+        assert (stats["source_hits"], stats["source_misses"], stats["size_bytes"]) == (1, 1, 3)
+
+    def test_modified_file_is_refetched(self):
+        path = os.path.join(tempfile.mkdtemp(), "doc.txt")
+        with open(path, "w") as f:
+            f.write("one")
+        cache = DocumentSourceCache()
+
+        def fetch():
+            with open(path) as f:
+                return {"content": f.read()}
+
+        assert cache.get_source("file", path, fetch)["content"] == "one"
+        with open(path, "w") as f:
+            f.write("two!")
+        assert cache.get_source("file", path, fetch)["content"] == "two!"
+
+    def test_documents_reused_and_closed_on_eviction(self):
+        cache = DocumentSourceCache(max_bytes=10)
+        owner = object()
+        opener = MagicMock(side_effect=ClosableDocument)
+
+        first = cache.acquire_document(owner, b"123456", opener)
+        cache.release_document(first)
+        assert cache.acquire_document(owner, b"123456", opener) is first
+        cache.release_document(first)
+        assert opener.call_count == 1
+
+        # A second document exceeds the byte budget and evicts the first
+        second = cache.acquire_document(owner, b"abcdef", opener)
+        cache.release_document(second)
+        assert first.closed and not second.closed
+        assert cache.get_statistics()["evictions"] == 1
+
+        cache.clear()
+        assert second.closed
+
+    def test_fetched_content_is_hashed_once(self):
+        cache = DocumentSourceCache()
+        owner = object()
+        opener = MagicMock(side_effect=ClosableDocument)
+        content_info = cache.get_source("s3", "s3://bucket/key", lambda: {"content": b"123456"})
+
+        with patch.object(DocumentSourceCache, "_hash", wraps=DocumentSourceCache._hash) as hash_content:
+            for _ in range(3):
+                cache.release_document(cache.acquire_document(owner, content_info["content"], opener))
+            hash_content.assert_not_called()
+            # Equal content that was not fetched through the cache is hashed
+            cache.release_document(cache.acquire_document(owner, bytes(bytearray(b"123456")), opener))
+            hash_content.assert_called_once()
+
+        assert opener.call_count == 1
+
+    def test_nested_acquire_on_same_thread(self):
+        cache = DocumentSourceCache(max_bytes=10)
+        owner = object()
+        opener = MagicMock(side_effect=ClosableDocument)
+
+        outer = cache.acquire_document(owner, b"123456", opener)
+        inner = cache.acquire_document(owner, b"123456", opener)
+        assert inner is outer
+        cache.release_document(inner)
+
+        # Still lent to the outer caller, so it is not evicted
+        cache.release_document(cache.acquire_document(owner, b"abcdef", opener))
+        assert not outer.closed
+        cache.release_document(outer)
+
+        cache.release_document(cache.acquire_document(owner, b"ghijkl", opener))
+        assert outer.closed
+
+
+class TestSharedResolver:
+    """Test that resolving elements of one document fetches and opens it once."""
+
+    def test_pdf_pages_resolved_from_one_open(self):
+        fitz = pytest.importorskip("fitz")
+        path = os.path.join(tempfile.mkdtemp(), "doc.pdf")
+        doc = fitz.open()
+        for i in range(3):
+            doc.new_page().insert_text((72, 72), f"Page {i} text")
+        doc.save(path)
+        doc.close()
+
+        resolver = ContentResolverFactory.create_enhanced_resolver({})
+        adapter = resolver.adapters["file"]
+        parser = resolver.parsers["pdf"]
+        with patch.object(adapter, "get_content", wraps=adapter.get_content) as get_content, \
+                patch.object(parser, "_open_document", wraps=parser._open_document) as open_document:
+            texts = [resolver.resolve_content({"source": path, "type": "page", "page": page})
+                     for page in range(1, 4)]
+
+        assert texts == ["Page 0 text", "Page 1 text", "Page 2 text"]
+        assert get_content.call_count == 1
+        assert open_document.call_count == 1
+        resolver.cleanup()
+
+    @pytest.mark.parametrize("cache_enabled", [True, False])
+    def test_batch_fetches_each_source_once(self, cache_enabled):
+        fitz = pytest.importorskip("fitz")
+        paths = []
+        for name in ("a", "b"):
+            path = os.path.join(tempfile.mkdtemp(), f"{name}.pdf")
+            doc = fitz.open()
+            for i in range(2):
+                doc.new_page().insert_text((72, 72), f"{name} page {i}")
+            doc.save(path)
+            doc.close()
+            paths.append(path)
+
+        resolver = ContentResolverFactory.create_enhanced_resolver(
+            {}, resolver_config={"cache_enabled": cache_enabled, "resolve_workers": 2})
+        adapter = resolver.adapters["file"]
+        locations = [{"source": path, "type": "page", "page": page} for page in (1, 2) for path in paths]
+        with patch.object(adapter, "get_content", wraps=adapter.get_content) as get_content:
+            texts = resolver.resolve_content_batch(locations + [None])
+
+        assert texts == ["a page 0", "b page 0", "a page 1", "b page 1", ""]
+        assert get_content.call_count == 2
+        resolver.cleanup()
+
+    def test_create_content_resolver_is_shared(self):
+        config = MagicMock()
+        config.config = {"content_sources": [], "resolver_config": {"max_cache_size": 10}}
+        other = MagicMock()
+        other.config = {"content_sources": [], "resolver_config": {"max_cache_size": 20}}
+
+        try:
+            resolver = create_content_resolver(config)
+            assert create_content_resolver(config) is resolver
+            assert create_content_resolver(other) is not resolver
+        finally:
+            clear_content_resolvers()
+        assert create_content_resolver(config) is not resolver
+        clear_content_resolvers()
+
+    def test_cleanup_leaves_shared_resolver_intact(self):
+        config = MagicMock()
+        config.config = {"content_sources": []}
+
+        try:
+            resolver = create_content_resolver(config)
+            adapter = resolver.adapters["file"]
+            with patch.object(adapter, "cleanup") as cleanup:
+                resolver.cleanup()
+                cleanup.assert_not_called()
+                assert create_content_resolver(config) is resolver
+
+                clear_content_resolvers()
+                cleanup.assert_called_once()
+        finally:
+            clear_content_resolvers()
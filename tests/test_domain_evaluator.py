@@ -0,0 +1,159 @@
+"""
+Tests for the compiled ontology evaluator.
+"""
+
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from go_doc_go.domain import DomainOntology, OntologyEvaluator
+
+
+PHRASES = {
+    'revenue growth': [1.0, 0.0, 0.0],
+    'profit margin': [0.0, 1.0, 0.0],
+    'executive': [0.0, 0.0, 1.0],
+}
+
+
+def _ontology(constraints=None):
+    relationship = {
+        'id': 'exec_discusses_revenue',
+        'relationship_type': 'discusses',
+        'source': {'term_id': 'executive', 'semantic_phrase': 'executive', 'confidence_threshold': 0.6},
+        'target': {'term_id': 'revenue', 'semantic_phrase': 'revenue growth', 'confidence_threshold': 0.6},
+        'confidence': {'minimum': 0.6},
+    }
+    if constraints:
+        relationship['constraints'] = constraints
+    return DomainOntology.from_dict({
+        'domain': {'name': 'finance'},
+        'terms': [{'id': term, 'label': term, 'description': term} for term in ('revenue', 'margin', 'executive')],
+        'element_mappings': [
+            {'term_id': 'revenue', 'rules': [
+                {'type': 'keywords', 'keywords': ['revenue', 'sales'], 'element_types': ['paragraph']},
+                {'type': 'semantic', 'semantic_phrase': 'revenue growth', 'confidence_threshold': 0.8},
+            ]},
+            {'term_id': 'margin', 'rules': [
+                {'type': 'regex', 'pattern': r'\d+(\.\d+)?% margin'},
+                {'type': 'keywords', 'keywords': ['revenue growth'], 'word_boundary': False},
+                {'type': 'regex', 'pattern': r'(?i)GROSS'},
+            ]},
+            {'term_id': 'executive', 'rules': [
+                {'type': 'keywords', 'keywords': ['CEO'], 'case_sensitive': True},
+                {'type': 'semantic', 'semantic_phrase': 'executive', 'confidence_threshold': 0.8},
+            ]},
+        ],
+        'relationship_rules': [relationship],
+    })
+
+
+def _provider():
+    provider = MagicMock()
+    provider.generate_batch.side_effect = lambda phrases: [PHRASES[phrase] for phrase in phrases]
+    return provider
+
+
+def _element(element_id, text, embedding=None, element_type='paragraph', **extra):
+    return {'element_pk': int(element_id[1:]), 'element_id': element_id, 'element_type': element_type,
+            'text': text, 'embedding': embedding, **extra}
+
+
+def _reference_mappings(ontology, element):
+    """Rule-by-rule evaluation of the pattern rules."""
+    return {
+        (term_id, rule.type.value)
+        for term_id, rules in ontology._mappings_by_term.items()
+        for rule in rules
+        if rule.type.value != 'semantic' and rule.matches_element_type(element['element_type'])
+        and rule.get_pattern().search(element['text'])
+    }
+
+
+class TestMapping:
+    """Test term mapping with the combined patterns and the phrase matrix."""
+
+    @pytest.mark.parametrize('text', [
+        'Revenue growth was strong',
+        'Sales rose; the CEO noted a 12.5% margin',
+        'the ceo said gross revenue',
+        'nothing relevant here',
+    ])
+    def test_pattern_rules_match_rule_by_rule_evaluation(self, text):
+        ontology = _ontology()
+        evaluator = OntologyEvaluator(ontology)
+        element = _element('e1', text)
+
+        mappings = {(m.term_id, m.mapping_rule) for m in evaluator.map_element_to_terms(element)}
+        assert mappings == _reference_mappings(ontology, element)
+
+    def test_element_type_filter(self):
+        evaluator = OntologyEvaluator(_ontology())
+        mappings = evaluator.map_element_to_terms(_element('e1', 'revenue', element_type='header'))
+        assert [m.term_id for m in mappings] == []
+
+    def test_semantic_rules_scored_in_one_batch(self):
+        provider = _provider()
+        evaluator = OntologyEvaluator(_ontology(), provider)
+        elements = [_element('e1', 'x', [0.9, 0.1, 0.0]), _element('e2', 'y', [0.0, 0.2, 1.0]),
+                    _element('e3', 'z')]
+
+        results = evaluator.map_elements_to_terms(elements)
+
+        assert [(m.term_id, m.mapping_rule) for m in results[0]] == [('revenue', 'semantic')]
+        assert [(m.term_id, m.mapping_rule) for m in results[1]] == [('executive', 'semantic')]
+        assert results[2] == []
+        assert results[0][0].confidence == pytest.approx(0.9 / np.linalg.norm([0.9, 0.1]), abs=1e-6)
+        provider.generate_batch.assert_called_once()
+        provider.generate.assert_not_called()
+
+    def test_semantic_rule_without_phrase_is_skipped(self):
+        ontology = _ontology()
+        ontology._mappings_by_term['margin'][0].type = ontology._mappings_by_term['revenue'][1].type
+        ontology._mappings_by_term['margin'][0].semantic_phrase = ''
+        ontology._mappings_by_term['margin'][0].confidence_threshold = 0.1
+        evaluator = OntologyEvaluator(ontology, _provider())
+
+        mappings = evaluator.map_element_to_terms(_element('e1', 'x', [0.9, 0.1, 0.0]))
+
+        assert [(m.term_id, m.mapping_rule) for m in mappings] == [('revenue', 'semantic')]
+
+
+class TestRelationshipDiscovery:
+    """Test relationship discovery from cached similarities and constraint groups."""
+
+    def _discover(self, constraints, elements):
+        evaluator = OntologyEvaluator(_ontology(constraints), _provider())
+        by_term = {}
+        for element, mappings in zip(elements, evaluator.map_elements_to_terms(elements)):
+            for mapping in mappings:
+                by_term.setdefault(mapping.term_id, []).append((element, mapping))
+        return {(r.source_element_id, r.target_element_id)
+                for r in evaluator.discover_relationships(by_term, {e['element_id']: e for e in elements})}
+
+    def test_pairs_only_within_constraint_group(self):
+        elements = [
+            _element('e1', 'CEO remarks', [0.0, 0.0, 1.0], doc_id='a', parent_id='s1', document_position=1),
+            _element('e2', 'revenue', [1.0, 0.0, 0.0], doc_id='a', parent_id='s1', document_position=2),
+            _element('e3', 'revenue', [1.0, 0.0, 0.0], doc_id='a', parent_id='s2', document_position=3),
+            _element('e4', 'revenue', [1.0, 0.0, 0.0], doc_id='b', parent_id='s1', document_position=0),
+        ]
+
+        assert self._discover(None, elements) == {('e1', 'e2'), ('e1', 'e3'), ('e1', 'e4')}
+        assert self._discover({'hierarchy_level': -1}, elements) == {('e1', 'e2'), ('e1', 'e3')}
+        assert self._discover({'hierarchy_level': 0}, elements) == {('e1', 'e2'), ('e1', 'e4')}
+        assert self._discover({'hierarchy_level': -1, 'direction': 'backward'}, elements) == set()
+
+    def test_uses_similarities_from_mapping(self):
+        elements = [_element('e1', 'CEO', [0.0, 0.0, 1.0]), _element('e2', 'revenue', [1.0, 0.0, 0.0])]
+        evaluator = OntologyEvaluator(_ontology(), _provider())
+        mappings = evaluator.map_elements_to_terms(elements)
+
+        # Discovery gets the raw elements without embeddings
+        raw = [{k: v for k, v in element.items() if k != 'embedding'} for element in elements]
+        by_term = {m.term_id: [(raw[i], m)] for i, element_mappings in enumerate(mappings) for m in element_mappings}
+        relationships = evaluator.discover_relationships(by_term, {})
+
+        assert [(r.source_element_id, r.target_element_id) for r in relationships] == [('e1', 'e2')]
+        assert relationships[0].metadata['source_similarity'] == pytest.approx(1.0)
@@ -0,0 +1,128 @@
+"""
+Tests for context selection and batching in the contextual embedding generator.
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from go_doc_go.embeddings.base import EmbeddingGenerator
+from go_doc_go.embeddings.contextual_embedding import ContextualEmbeddingGenerator
+
+
+class RecordingGenerator(EmbeddingGenerator):
+    """Base generator that embeds a text as [len(text)] and records its calls."""
+
+    def __init__(self):
+        super().__init__(None)
+        self.batches = []
+        self.single_calls = 0
+
+    def generate(self, text):
+        self.single_calls += 1
+        return [float(len(text))]
+
+    def generate_batch(self, texts):
+        self.batches.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+    def get_dimensions(self):
+        return 1
+
+    def get_model_name(self):
+        return "recording"
+
+    def clear_cache(self):
+        pass
+
+    def generate_from_elements(self, elements, db=None):
+        return self.generate_from_element_content(elements)
+
+
+def _element(element_id, element_type="paragraph", parent_id=None, text=None, pk=None):
+    text = element_id if text is None else text
+    return {
+        "element_id": element_id,
+        "element_pk": pk if pk is not None else element_id,
+        "element_type": element_type,
+        "parent_id": parent_id,
+        "content_preview": text,
+        "content_location": {"text": text},
+    }
+
+
+@pytest.fixture
+def elements():
+    return [
+        _element("root", "root"),
+        _element("h1", "header", "root"),
+        _element("p1", parent_id="h1"),
+        _element("empty", "div", "h1", text=""),
+        _element("p2", parent_id="h1"),
+        _element("list", "list", "h1"),
+        _element("item1", "list_item", "list"),
+        _element("item2", "list_item", "list"),
+        _element("p3", parent_id="h1"),
+    ]
+
+
+@pytest.fixture
+def generator():
+    return ContextualEmbeddingGenerator(
+        _config=Mock(),
+        base_generator=RecordingGenerator(),
+        predecessor_count=2,
+        successor_count=1,
+        ancestor_depth=2,
+        child_count=1,
+        max_tokens=1000,
+        use_semantic_tags=False
+    )
+
+
+class TestContextSelection:
+    """Test the per-document context index."""
+
+    def test_selects_meaningful_neighbours(self, generator, elements):
+        index = generator._build_context_index(elements)
+        by_id = {e["element_id"]: e for e in elements}
+
+        def context_of(element_id):
+            return [e["element_id"] for e in
+                    generator._get_context_elements(by_id[element_id], elements, index["hierarchy"], None, index)]
+
+        # Ancestors first (root skipped), then predecessors, successors and children; the empty div is skipped
+        assert context_of("p2") == ["h1", "p1", "list"]
+        assert context_of("list") == ["h1", "p2", "p1", "item1"]
+        assert context_of("item2") == ["list", "h1", "item1", "p3"]
+        assert context_of("h1") == ["p1"]
+
+    def test_index_is_built_when_not_given(self, generator, elements):
+        hierarchy = generator._build_element_hierarchy(elements)
+        with_index = generator._get_context_elements(elements[4], elements, hierarchy, None,
+                                                     generator._build_context_index(elements))
+        assert generator._get_context_elements(elements[4], elements, hierarchy) == with_index
+
+
+class TestGenerateFromElements:
+    """Test the per-document embedding path."""
+
+    def test_builds_index_once_and_embeds_in_one_batch(self, generator, elements):
+        resolver = Mock()
+        resolver.resolve_content.side_effect = lambda location, text=False: location.get("text", "")
+
+        with patch('go_doc_go.embeddings.contextual_embedding.create_content_resolver', return_value=resolver), \
+                patch.object(generator, '_build_element_hierarchy',
+                             wraps=generator._build_element_hierarchy) as build_hierarchy:
+            embeddings = generator.generate_from_elements(elements)
+
+        base = generator.base_generator
+        assert build_hierarchy.call_count == 1
+        assert base.single_calls == 0
+        assert len(base.batches) == 1
+
+        # Every element with content is embedded, in document order
+        embedded = [e for e in elements if e["content_preview"]]
+        assert list(embeddings) == [e["element_pk"] for e in embedded]
+        assert embeddings["p2"] == [float(len(base.batches[0][3]))]
+        assert "=== Context ===" in base.batches[0][3]
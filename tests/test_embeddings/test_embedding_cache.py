@@ -0,0 +1,132 @@
+"""
+Tests for the memory, persistent and tiered embedding caches.
+"""
+
+import multiprocessing
+import os
+import tempfile
+
+import pytest
+
+from go_doc_go import Config
+from go_doc_go.embeddings.cache import (
+    MemoryEmbeddingCache, SQLiteEmbeddingCache, TieredEmbeddingCache, create_embedding_cache
+)
+
+
+def _write_entries(path, worker, count):
+    cache = SQLiteEmbeddingCache(path, 'model', 2)
+    for i in range(count):
+        cache.set(f'{worker}-{i}', [float(worker), float(i)])
+    cache.close()
+
+
+@pytest.fixture
+def cache_path():
+    return os.path.join(tempfile.mkdtemp(), 'cache', 'embeddings.db')
+
+
+class TestMemoryEmbeddingCache:
+    """Test the bounded in-process tier."""
+
+    def test_lru_eviction_and_metrics(self):
+        cache = MemoryEmbeddingCache(max_entries=2)
+        cache.set('a', [1.0])
+        cache.set('b', [2.0])
+        assert cache.get('a') == [1.0]
+        cache.set('c', [3.0])
+
+        assert cache.get('b') is None
+        assert cache.get_many(['a', 'c', 'x']) == {'a': [1.0], 'c': [3.0]}
+        stats = cache.get_statistics()
+        assert (stats['hits'], stats['misses'], stats['evictions'], stats['entries']) == (3, 2, 1, 2)
+        assert stats['hit_rate'] == pytest.approx(0.6)
+
+
+class TestSQLiteEmbeddingCache:
+    """Test the persistent single-file tier."""
+
+    def test_persists_across_instances(self, cache_path):
+        cache = SQLiteEmbeddingCache(cache_path, 'model', 2)
+        cache.set_many({'a': [0.5, 1.0], 'b': [2.0, 3.0]})
+        cache.close()
+
+        reopened = SQLiteEmbeddingCache(cache_path, 'model', 2)
+        assert reopened.get_many(['a', 'b', 'c']) == {'a': [0.5, 1.0], 'b': [2.0, 3.0]}
+        assert reopened.get_statistics()['misses'] == 1
+
+        # Keys are namespaced by model name and dimensions
+        other = SQLiteEmbeddingCache(cache_path, 'other-model', 2)
+        assert other.get('a') is None
+        other.set('a', [9.0, 9.0])
+        other.clear()
+        assert reopened.get('a') == [0.5, 1.0]
+        reopened.close()
+        other.close()
+
+    @pytest.mark.parametrize('eviction, survivor', [('lru', 'recent'), ('lfu', 'popular')])
+    def test_size_cap_eviction(self, cache_path, eviction, survivor):
+        # Each 2-dimension embedding takes 8 bytes; the cap holds 10
+        cache = SQLiteEmbeddingCache(cache_path, 'model', 2, max_size_mb=80 / (1024 * 1024), eviction=eviction)
+        cache.TOUCH_BATCH_SIZE = 1
+        cache.set('popular', [1.0, 1.0])
+        for _ in range(5):
+            cache.get('popular')
+        for i in range(9):
+            cache.set(f'filler-{i}', [0.0, float(i)])
+        cache.set('recent', [2.0, 2.0])
+        cache.get('recent')
+
+        cache.set('overflow', [3.0, 3.0])
+
+        stats = cache.get_statistics()
+        assert stats['size_bytes'] <= stats['max_bytes']
+        assert stats['evictions'] > 0
+        assert cache.get(survivor) is not None
+        assert cache.get('filler-0') is None
+        cache.close()
+
+    def test_concurrent_processes(self, cache_path):
+        SQLiteEmbeddingCache(cache_path, 'model', 2).close()
+        context = multiprocessing.get_context()
+        processes = [context.Process(target=_write_entries, args=(cache_path, worker, 50)) for worker in range(3)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        assert all(process.exitcode == 0 for process in processes)
+
+        cache = SQLiteEmbeddingCache(cache_path, 'model', 2)
+        assert cache.get_statistics()['entries'] == 150
+        assert cache.get('2-49') == [2.0, 49.0]
+        cache.close()
+
+
+class TestTieredEmbeddingCache:
+    """Test the memory tier in front of the persistent tier."""
+
+    def test_promotes_persistent_hits(self, cache_path):
+        back = SQLiteEmbeddingCache(cache_path, 'model', 1)
+        back.set('a', [1.0])
+        cache = TieredEmbeddingCache(MemoryEmbeddingCache(10), back)
+
+        assert cache.get('a') == [1.0]
+        assert cache.get('a') == [1.0]
+        cache.set('b', [2.0])
+        assert back.get('b') == [2.0]
+
+        stats = cache.get_statistics()
+        assert stats['memory']['hits'] == 1
+        assert stats['persistent']['hits'] == 2
+        cache.close()
+
+    def test_created_from_config(self, cache_path):
+        config = Config()
+        assert isinstance(create_embedding_cache(config, 'model', 4), MemoryEmbeddingCache)
+
+        config.config['embedding']['cache'] = {'path': cache_path, 'memory_entries': 5, 'eviction': 'lfu'}
+        cache = create_embedding_cache(config, 'model', 4)
+        assert isinstance(cache, TieredEmbeddingCache)
+        assert cache.front.max_entries == 5
+        assert cache.back.eviction == 'lfu'
+        cache.close()
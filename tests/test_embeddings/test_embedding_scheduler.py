@@ -0,0 +1,139 @@
+"""
+Tests for the cross-document embedding scheduler.
+"""
+
+import threading
+
+import pytest
+
+from go_doc_go.embeddings.base import EmbeddingGenerator
+from go_doc_go.embeddings.scheduler import EmbeddingScheduler
+
+
+class RecordingGenerator(EmbeddingGenerator):
+    """Generator that embeds a text as [len(text)] and records its batches."""
+
+    embeds_element_content = True
+
+    def __init__(self):
+        super().__init__(None)
+        self.batches = []
+
+    def generate(self, text):
+        return [float(len(text))]
+
+    def generate_batch(self, texts):
+        self.batches.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+    def get_dimensions(self):
+        return 1
+
+    def get_model_name(self):
+        return "recording"
+
+    def clear_cache(self):
+        pass
+
+    def generate_from_elements(self, elements, db=None):
+        return self.generate_from_element_content(elements)
+
+
+class TestEmbeddingScheduler:
+    """Test batching, result routing and counters."""
+
+    def test_batches_across_submissions(self):
+        generator = RecordingGenerator()
+        scheduler = EmbeddingScheduler(generator, max_batch_size=10)
+
+        first = scheduler.submit(['a', 'bb'])
+        second = scheduler.submit(['ccc'])
+        assert generator.batches == []
+
+        assert second.result() == [[3.0]]
+        assert first.result() == [[1.0], [2.0]]
+        assert generator.batches == [['a', 'bb', 'ccc']]
+
+    def test_size_and_token_budget(self):
+        generator = RecordingGenerator()
+        scheduler = EmbeddingScheduler(generator, max_batch_size=3, max_batch_tokens=20,
+                                       token_counter=len)
+
+        assert scheduler.embed(['x'] * 7) == [[1.0]] * 7
+        assert [len(batch) for batch in generator.batches] == [3, 3, 1]
+
+        generator.batches.clear()
+        # Long texts shrink the batch so the padded size stays within budget
+        scheduler.embed(['y' * 8, 'z', 'y' * 8, 'z'])
+        assert generator.batches == [['y' * 8, 'z'], ['y' * 8, 'z']]
+
+    def test_full_batches_run_on_submit(self):
+        generator = RecordingGenerator()
+        scheduler = EmbeddingScheduler(generator, max_batch_size=2)
+
+        ticket = scheduler.submit(['a', 'b', 'c'])
+        assert generator.batches == [['a', 'b']]
+        assert ticket.result() == [[1.0], [1.0], [1.0]]
+
+    def test_concurrent_callers(self):
+        generator = RecordingGenerator()
+        scheduler = EmbeddingScheduler(generator, max_batch_size=8, max_wait=0.05)
+        results = {}
+
+        def worker(n):
+            results[n] = scheduler.embed(['t' * n] * 3)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(1, 5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == {n: [[float(n)]] * 3 for n in range(1, 5)}
+        assert sum(len(batch) for batch in generator.batches) == 12
+        assert len(generator.batches) < 4
+
+    def test_statistics(self):
+        generator = RecordingGenerator()
+        scheduler = EmbeddingScheduler(generator, token_counter=len)
+        scheduler.embed(['aaaa', 'bb'])
+
+        stats = scheduler.get_statistics()
+        assert stats['texts'] == 2
+        assert stats['batches'] == 1
+        assert stats['tokens'] == 6
+        assert stats['padded_tokens'] == 8
+        assert stats['padding_waste'] == pytest.approx(0.25)
+        assert stats['pending'] == 0
+
+        scheduler.reset_statistics()
+        assert scheduler.get_statistics()['texts'] == 0
+
+    def test_errors_reach_waiters(self):
+        generator = RecordingGenerator()
+        generator.generate_batch = lambda texts: 1 / 0
+        scheduler = EmbeddingScheduler(generator)
+
+        with pytest.raises(ZeroDivisionError):
+            scheduler.embed(['a'])
+
+    def test_rejects_invalid_limits(self):
+        with pytest.raises(ValueError):
+            EmbeddingScheduler(RecordingGenerator(), max_batch_size=0)
+
+
+class TestGenerateFromElementContent:
+    """Test the shared element embedding path of the base generators."""
+
+    def test_skips_root_and_empty_elements(self):
+        generator = RecordingGenerator()
+        generator.scheduler = EmbeddingScheduler(generator)
+        elements = [
+            {'element_pk': 1, 'element_type': 'root', 'content_preview': 'root'},
+            {'element_pk': 2, 'element_type': 'paragraph', 'content_preview': 'abc'},
+            {'element_pk': 3, 'element_type': 'paragraph', 'content_preview': ''},
+            {'element_pk': 4, 'element_type': 'header', 'content_preview': 'hello'},
+        ]
+
+        assert generator.generate_from_elements(elements) == {2: [3.0], 4: [5.0]}
+        assert generator.batches == [['abc', 'hello']]
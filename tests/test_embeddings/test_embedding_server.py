@@ -0,0 +1,107 @@
+"""
+Tests for the embedding server shared by worker processes.
+"""
+
+import os
+import threading
+from multiprocessing.connection import Client, Listener
+
+import pytest
+
+from go_doc_go.embeddings.base import EmbeddingGenerator
+from go_doc_go.embeddings.scheduler import EmbeddingScheduler
+from go_doc_go.embeddings.server import RemoteEmbeddingGenerator, run_embedding_server
+
+
+class RecordingGenerator(EmbeddingGenerator):
+    """Generator that embeds a text as [len(text)] and records its batches."""
+
+    embeds_element_content = True
+
+    def __init__(self):
+        super().__init__(None)
+        self.batches = []
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def generate(self, text):
+        return [float(len(text))]
+
+    def generate_batch(self, texts):
+        self.entered.set()
+        self.release.wait(5)
+        if 'fail' in texts:
+            raise ValueError("model error")
+        self.batches.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+    def get_dimensions(self):
+        return 1
+
+    def get_model_name(self):
+        return "recording"
+
+    def clear_cache(self):
+        pass
+
+    def generate_from_elements(self, elements, db=None):
+        return self.generate_from_element_content(elements)
+
+
+@pytest.fixture
+def server():
+    """Run an embedding server for a RecordingGenerator in a background thread."""
+    generator = RecordingGenerator()
+    generator.scheduler = EmbeddingScheduler(generator, max_batch_size=32)
+    authkey = os.urandom(16)
+    listener = Listener(family='AF_UNIX', authkey=authkey)
+    stopping = threading.Event()
+    thread = threading.Thread(target=run_embedding_server, args=(generator, listener, stopping), daemon=True)
+    thread.start()
+    yield generator, listener.address, authkey
+    stopping.set()
+    thread.join(5)
+
+
+class TestEmbeddingServer:
+    """Test embedding through a shared server."""
+
+    def test_remote_generator_embeds_through_server(self, server):
+        _, address, authkey = server
+        client = RemoteEmbeddingGenerator(None, address, authkey)
+
+        assert client.get_model_name() == "recording"
+        assert client.get_dimensions() == 1
+        assert client.generate_batch(['a', 'bb']) == [[1.0], [2.0]]
+        assert client.generate('abc') == [3.0]
+        assert client.get_server_statistics()['texts'] == 3
+        client.close()
+
+    def test_requests_of_workers_share_batches(self, server):
+        generator, address, authkey = server
+        workers = [Client(address, authkey=authkey) for _ in range(3)]
+
+        # Keep the model busy while the other workers send their requests
+        generator.release.clear()
+        workers[0].send(('embed', ['x']))
+        assert generator.entered.wait(5)
+        workers[1].send(('embed', ['a']))
+        workers[2].send(('embed', ['bb']))
+        generator.release.set()
+
+        assert workers[0].recv() == ('ok', [[1.0]])
+        assert workers[1].recv() == ('ok', [[1.0]])
+        assert workers[2].recv() == ('ok', [[2.0]])
+        assert generator.batches == [['x'], ['a', 'bb']]
+        for worker in workers:
+            worker.close()
+
+    def test_model_errors_are_raised_in_worker(self, server):
+        _, address, authkey = server
+        client = RemoteEmbeddingGenerator(None, address, authkey)
+
+        with pytest.raises(RuntimeError, match="model error"):
+            client.generate_batch(['fail'])
+        assert client.generate('ok') == [2.0]
+        client.close()
@@ -24,6 +24,7 @@ class TestXMLContextualEmbeddingGenerator:
         """Mock base embedding generator."""
         generator = Mock()
         generator.generate.return_value = [0.1] * 384  # Mock 384-dimensional embedding
+        generator.embed_texts.side_effect = lambda texts: [generator.generate(text) for text in texts]
         generator.generate_batch.return_value = [[0.1] * 384, [0.2] * 384]
         generator.get_dimensions.return_value = 384
         generator.get_model_name.return_value = "mock-model"
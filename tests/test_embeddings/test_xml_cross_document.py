@@ -25,6 +25,7 @@ class TestXMLCrossDocumentEmbedding:
         """Mock base embedding generator."""
         generator = Mock()
         generator.generate.return_value = [0.1] * 384
+        generator.embed_texts.side_effect = lambda texts: [generator.generate(text) for text in texts]
         generator.get_dimensions.return_value = 384
         generator.get_model_name.return_value = "mock-model"
         generator.clear_cache.return_value = None
@@ -57,6 +57,9 @@ class MockEmbeddingGenerator:
     
     def generate_batch(self, texts: List[str]) -> List[List[float]]:
         return [self.generate(text) for text in texts]
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        return self.generate_batch(texts)
     
     def get_dimensions(self) -> int:
         return self.dimensions
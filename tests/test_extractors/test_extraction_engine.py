@@ -0,0 +1,124 @@
+"""
+Tests for the compiled extraction engine.
+"""
+
+import re
+
+import pytest
+
+from go_doc_go.extractors.base import EntityExtractor, ExtractedEntity, ExtractorRegistry, RegexExtractor
+from go_doc_go.extractors.engine import required_factors
+from go_doc_go.extractors.financial import register_financial_extractors
+from go_doc_go.extractors.legal import register_legal_extractors
+from go_doc_go.extractors.medical import register_medical_extractors
+from go_doc_go.extractors.temporal import register_temporal_extractors
+
+
+TEXTS = [
+    "Revenue grew to $2.3 billion in Q4 2023, up 12.5% from last year according to Apple Inc. (AAPL).",
+    "The patient was prescribed Atorvastatin 20 mg BID for hyperlipidemia; code E78.5 and DRG 123.",
+    "In Smith v. Jones, 123 F.3d 456, the Supreme Court of Texas held under 42 U.S.C. § 1983.",
+    "Meeting scheduled for January 5, 2024 and again next week; see the heart of the matter.",
+    "nothing of interest in this lowercase sentence",
+    "Supreme Court and the ſtatute of frauds, written with a long s",
+    "",
+]
+
+
+class AlwaysExtractor(EntityExtractor):
+    """Extractor without scan patterns."""
+
+    entity_type = "always"
+    description = "Extracts the first word"
+
+    def extract(self, text):
+        return [ExtractedEntity(text.split()[0], text.split()[0], text.split()[0], self.entity_type)]
+
+    def normalize(self, value):
+        return value
+
+
+def _registry():
+    registry = ExtractorRegistry()
+    for register in (register_financial_extractors, register_temporal_extractors,
+                     register_legal_extractors, register_medical_extractors):
+        register(registry)
+    return registry
+
+
+def _key(entities):
+    return [(e.entity_type, e.raw_value, e.normalized_value) for e in entities]
+
+
+def _reference(registry, text):
+    """Run every enabled extractor on the text."""
+    entities = []
+    for extractor in registry.get_all().values():
+        if extractor.enabled:
+            entities.extend(extractor.extract(text))
+    return entities
+
+
+class TestRequiredFactors:
+    """Test the literals derived from patterns."""
+
+    @pytest.mark.parametrize('pattern, factors', [
+        (re.compile(r'\bhearts?\b', re.I), [({'heart'}, True)]),
+        (re.compile(r'(?:Section|Sec\.?|§)\s+\d+'), [({'Section', 'Sec', '§'}, False), (set(), False)]),
+        (re.compile(r'(?-i:PROJ)-\d{4}', re.I), [({'PROJ'}, False), ({'-'}, True), (set(), False)]),
+        (re.compile(r'\d{2,3}\s*cm|\d+\'\d{1,2}"'), [(set(), False)]),
+        (re.compile(r'GAAP|IFRS', re.I), [({'gaap', 'ifrs'}, True)]),
+        (re.compile(r'\b([A-Z]{1,5})\b'), []),
+        (re.compile(r'(?:Schedule|Sch\.)\s+\d+|[A-Z]'), []),
+    ])
+    def test_factors(self, pattern, factors):
+        assert [(set(a), i) for a, i in required_factors(pattern)] == factors
+
+
+class TestExtractionEngine:
+    """Test prefiltered extraction against running every extractor."""
+
+    @pytest.mark.parametrize('text', TEXTS)
+    def test_matches_running_every_extractor(self, text):
+        registry = _registry()
+        assert _key(registry.extract_all(text)) == _key(_reference(registry, text))
+
+    def test_skips_extractors_that_cannot_match(self):
+        registry = _registry()
+        registry.extract_all("nothing of interest in this lowercase sentence")
+
+        statistics = registry.get_statistics()
+        assert statistics['_scan']['calls'] == 1
+        assert statistics['anatomy']['calls'] == 0
+        assert statistics['case_citation']['calls'] == 0
+        # Patterns that can match any word always run
+        assert statistics['ticker_symbol']['calls'] == 1
+
+    def test_extractors_without_scan_patterns_always_run(self):
+        registry = ExtractorRegistry()
+        registry.register('code', RegexExtractor('code', [r'CODE-\d+']))
+        registry.register('always', AlwaysExtractor())
+
+        assert _key(registry.extract_all("plain text")) == [('always', 'plain', 'plain')]
+        assert _key(registry.extract_all("see CODE-7")) == [('code', 'CODE-7', 'code-7'), ('always', 'see', 'see')]
+        assert _key(registry.extract_all("see CODE-7", entity_types=['always', 'code'])) == [
+            ('always', 'see', 'see'), ('code', 'CODE-7', 'code-7')
+        ]
+
+    def test_register_recompiles(self):
+        registry = ExtractorRegistry()
+        registry.register('code', RegexExtractor('code', [r'CODE-\d+']))
+        assert registry.extract_all("ID-4") == []
+
+        registry.register('id', RegexExtractor('id', [r'ID-\d+']))
+        assert _key(registry.extract_all("ID-4")) == [('id', 'ID-4', 'id-4')]
+
+    def test_batch_in_process_pool(self):
+        registry = _registry()
+        registry.compile(workers=2, process_threshold=2)
+        texts = TEXTS * 4
+
+        results = registry.extract_batch(texts)
+
+        assert [_key(entities) for entities in results] == [_key(_reference(registry, text)) for text in texts]
+        assert registry.get_statistics()['monetary_value']['calls'] > 0
@@ -0,0 +1,201 @@
+"""
+Tests for the pipelined single-process ingestion mode.
+"""
+
+import os
+import tempfile
+
+import pytest
+
+from go_doc_go import Config
+from go_doc_go.content_source.factory import get_content_source
+from go_doc_go.embeddings.base import EmbeddingGenerator
+from go_doc_go.embeddings.contextual_embedding import ContextualEmbeddingGenerator
+from go_doc_go.main import ingest_documents
+from go_doc_go.embeddings.scheduler import EmbeddingScheduler
+from go_doc_go.pipeline import IngestionPipeline, PipelineSettings, split_embedding_detector, split_relationship_detector
+from go_doc_go.relationships import create_relationship_detector
+
+
+def _make_config(storage_path, docs_path, **processing):
+    config = Config()
+    config.config['storage'] = {'backend': 'sqlite', 'path': os.path.join(storage_path, 'documents.db')}
+    config.config['embedding'] = {'enabled': False}
+    config.config['content_sources'] = [
+        {'name': 'docs', 'type': 'file', 'base_path': docs_path, 'file_pattern': '**/*.md', 'max_link_depth': 1}
+    ]
+    config.config['processing'] = processing
+    config.initialize_database()
+    return config
+
+
+@pytest.fixture
+def docs_path():
+    path = tempfile.mkdtemp()
+    for i in range(6):
+        with open(os.path.join(path, f'doc{i}.md'), 'w') as f:
+            f.write(f"# Document {i}\n\nParagraph one of document {i}.\n\n"
+                    f"## Section\n\nMore text, see [next](doc{i + 1}.md).\n")
+    return path
+
+
+class TestIngestionPipeline:
+    """Test that pipeline mode matches the sequential ingestion path."""
+
+    @pytest.mark.parametrize('parse_executor', ['thread', 'process'])
+    def test_matches_single_mode(self, docs_path, parse_executor):
+        single = _make_config(tempfile.mkdtemp(), docs_path, mode='single')
+        expected = ingest_documents(single)
+
+        pipelined = _make_config(tempfile.mkdtemp(), docs_path, mode='pipeline', io_workers=2, parse_workers=2,
+                                 parse_executor=parse_executor, queue_size=3, write_batch_size=2)
+        stats = ingest_documents(pipelined)
+
+        assert expected['documents'] == 6
+        assert stats == expected
+
+        single_db = single.get_document_database()
+        pipelined_db = pipelined.get_document_database()
+        for i in range(6):
+            doc_id = os.path.join(docs_path, f'doc{i}.md')
+            assert len(pipelined_db.get_document_elements(doc_id)) == len(single_db.get_document_elements(doc_id))
+            assert len(pipelined_db.get_document_relationships(doc_id)) == \
+                len(single_db.get_document_relationships(doc_id))
+
+        single.close_database()
+        pipelined.close_database()
+
+    def test_skips_unchanged_documents(self, docs_path):
+        config = _make_config(tempfile.mkdtemp(), docs_path, mode='pipeline', parse_executor='thread')
+        ingest_documents(config)
+
+        stats = ingest_documents(config)
+        assert stats['documents'] == 0
+        assert stats['unchanged_documents'] == 6
+        config.close_database()
+
+
+class LengthGenerator(EmbeddingGenerator):
+    """Generator that embeds a text as [len(text)] and records its batches."""
+
+    embeds_element_content = True
+
+    def __init__(self):
+        super().__init__(None)
+        self.batches = []
+        self.scheduler = EmbeddingScheduler(self)
+
+    def generate(self, text):
+        return [float(len(text))]
+
+    def generate_batch(self, texts):
+        self.batches.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+    def get_dimensions(self):
+        return 1
+
+    def get_model_name(self):
+        return "length"
+
+    def clear_cache(self):
+        pass
+
+    def generate_from_elements(self, elements, db=None):
+        return self.generate_from_element_content(elements)
+
+
+class TestPipelineEmbeddings:
+    """Test that the writer embeds a write batch across documents."""
+
+    def test_write_batch_shares_embedding_batches(self):
+        generator = LengthGenerator()
+        pipeline = IngestionPipeline(None, None, generator, {}, PipelineSettings(parse_executor='thread'))
+        parsed_docs = [
+            {'elements': [{'element_type': 'root', 'content_preview': 'root'},
+                          {'element_type': 'paragraph', 'content_preview': f'text {i}' * (i + 1)}]}
+            for i in range(3)
+        ]
+
+        embedding_fns = pipeline._submit_embeddings(parsed_docs)
+        for pk, parsed_doc in enumerate(parsed_docs):
+            for offset, element in enumerate(parsed_doc['elements']):
+                element['element_pk'] = pk * 10 + offset
+
+        results = [fn(parsed_doc['elements']) for fn, parsed_doc in zip(embedding_fns, parsed_docs)]
+        assert results == [{1: [6.0]}, {11: [12.0]}, {21: [18.0]}]
+        assert len(generator.batches) == 1
+        pipeline.close()
+
+    def test_stores_embeddings(self, docs_path):
+        config = _make_config(tempfile.mkdtemp(), docs_path, mode='pipeline', parse_executor='thread')
+        db = config.get_document_database()
+        stats = {"documents": 0, "elements": 0, "relationships": 0, "unchanged_documents": 0}
+        source_config = dict(config.get_content_sources()[0], max_link_depth=0)
+        source = get_content_source(source_config)
+        doc_ids = [doc['id'] for doc in source.list_documents()]
+
+        with IngestionPipeline(db, create_relationship_detector({}), LengthGenerator(), stats) as pipeline:
+            pipeline.run_source(source, source_config, doc_ids, set(), set(), set())
+
+        assert stats['documents'] == 6
+        element = db.get_document_elements(doc_ids[0])[1]
+        assert db.get_embedding(element['element_pk']) == [float(len(element['content_preview']))]
+        config.close_database()
+
+    def test_semantic_detector_reuses_stored_embeddings(self, docs_path):
+        config = _make_config(tempfile.mkdtemp(), docs_path, mode='pipeline', parse_executor='thread')
+        db = config.get_document_database()
+        stats = {"documents": 0, "elements": 0, "relationships": 0, "unchanged_documents": 0}
+        source_config = dict(config.get_content_sources()[0], max_link_depth=0)
+        source = get_content_source(source_config)
+        generator = LengthGenerator()
+        detector = create_relationship_detector({'semantic': True}, generator)
+
+        with IngestionPipeline(db, detector, generator, stats) as pipeline:
+            assert pipeline.embedding_detector is not None
+            pipeline.run_source(source, source_config, [doc['id'] for doc in source.list_documents()],
+                                set(), set(), set())
+
+        # Every text was embedded once, for storage only
+        embedded = sum(len(batch) for batch in generator.batches)
+        assert embedded == db.conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        semantic = db.conn.execute(
+            "SELECT COUNT(*) FROM relationships WHERE relationship_type = 'semantic_similarity'"
+        ).fetchone()[0]
+        assert semantic > 0
+        config.close_database()
+
+    def test_contextual_embeddings_are_not_reused(self):
+        generator = ContextualEmbeddingGenerator(None, LengthGenerator())
+        detector = create_relationship_detector({'semantic': True}, generator)
+
+        remaining, embedding_detector = split_embedding_detector(detector, generator)
+
+        assert embedding_detector is None
+        assert remaining is detector
+        pipeline = IngestionPipeline(None, detector, generator, {}, PipelineSettings(parse_executor='thread'))
+        assert pipeline.embedding_detector is None
+        pipeline.close()
+
+
+class TestPipelineSettings:
+    """Test reading stage settings from the processing section."""
+
+    def test_from_config(self):
+        settings = PipelineSettings.from_config({'mode': 'pipeline', 'io_workers': 3, 'parse_executor': 'thread'})
+        assert settings.io_workers == 3
+        assert settings.parse_executor == 'thread'
+        assert settings.parse_workers >= 1
+
+    def test_rejects_invalid_values(self):
+        with pytest.raises(ValueError):
+            PipelineSettings.from_config({'queue_size': 0})
+        with pytest.raises(ValueError):
+            PipelineSettings.from_config({'parse_executor': 'gpu'})
+
+    def test_split_relationship_detector(self):
+        detector = create_relationship_detector({'structural': True})
+        portable, local = split_relationship_detector(detector)
+        assert len(portable.detectors) == 2
+        assert local is None
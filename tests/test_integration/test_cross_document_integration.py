@@ -178,6 +178,7 @@ Customer retention is projected to improve with enhanced product offerings.
         
         mock_generator = Mock()
         mock_generator.generate.side_effect = generate_mock_embedding
+        mock_generator.embed_texts.side_effect = lambda texts: [mock_generator.generate(text) for text in texts]
         mock_generator.get_dimensions.return_value = 384
         mock_generator.get_model_name.return_value = "mock-model"
         mock_generator.clear_cache.return_value = None
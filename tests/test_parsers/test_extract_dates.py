@@ -0,0 +1,102 @@
+"""
+Tests for the date extractor prefilter, result cache and batch mode.
+"""
+
+import pytest
+
+from go_doc_go.document_parser.extract_dates import DateExtractor, might_contain_dates
+
+
+TEXTS = [
+    "The meeting is scheduled for January 15, 2024 at 3:00 PM.",
+    "Revenue for Q2 2023 grew in the 1990s style, and again in Spring 2024.",
+    "Invoice 2024-03-15 was paid on 03/20/2024.",
+    "See you next Tuesday.",
+    "The committee approved the proposal without objections.",
+    "Total: 1,250 units",
+    "",
+    "   ",
+]
+
+
+def _key(dates):
+    return [(d.original_text, d.iso_string, d.start_position, d.specificity_level) for d in dates]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    DateExtractor.clear_cache()
+    yield
+    DateExtractor.clear_cache()
+
+
+class TestPrefilter:
+    """Test the cheap check for date-like tokens."""
+
+    @pytest.mark.parametrize('text', TEXTS)
+    def test_prefilter_does_not_change_results(self, text):
+        extractor = DateExtractor(cache_size=0)
+        assert _key(extractor.extract_dates(text)) == _key(extractor._extract(text))
+
+    def test_rejects_text_without_date_tokens(self):
+        assert not might_contain_dates("The committee approved the proposal without objections.")
+        assert not might_contain_dates("")
+        assert might_contain_dates("Total: 1,250 units")
+        assert might_contain_dates("in the summer")
+
+
+class TestCache:
+    """Test reuse of extraction results."""
+
+    def test_repeated_text_is_extracted_once(self):
+        extractor = DateExtractor()
+        first = extractor.extract_dates(TEXTS[0])
+        second = extractor.extract_dates(TEXTS[0])
+
+        assert _key(first) == _key(second)
+        assert DateExtractor.cache_info()['hits'] == 1
+        # Callers get their own copies
+        first[0].context = "changed"
+        assert extractor.extract_dates(TEXTS[0])[0].context != "changed"
+
+    def test_settings_are_part_of_the_key(self):
+        DateExtractor(min_year=1900).extract_dates(TEXTS[0])
+        assert DateExtractor(min_year=2030).extract_dates(TEXTS[0]) == []
+
+    def test_cache_is_bounded(self):
+        extractor = DateExtractor(cache_size=2)
+        for day in range(1, 6):
+            extractor.extract_dates(f"Due on March {day}, 2024")
+        assert DateExtractor.cache_info()['size'] == 2
+
+
+class TestBatch:
+    """Test batch extraction."""
+
+    def test_batch_matches_single_extraction(self):
+        extractor = DateExtractor()
+        texts = TEXTS + TEXTS[:3]
+
+        results = extractor.extract_dates_batch(texts)
+
+        assert [_key(dates) for dates in results] == [_key(DateExtractor(cache_size=0)._extract(t)) for t in texts]
+
+    def test_batch_as_dicts(self):
+        extractor = DateExtractor()
+        results = extractor.extract_dates_batch_as_dicts(TEXTS[:2])
+        assert [len(dates) for dates in results] == [len(dates) for dates in extractor.extract_dates_batch(TEXTS[:2])]
+        assert results[0][0]['original_text'] == DateExtractor().extract_dates(TEXTS[0])[0].original_text
+
+    def test_time_budget_skips_remaining_texts(self):
+        extractor = DateExtractor(cache_size=0, time_budget=1e-9)
+        assert extractor.extract_dates_batch(TEXTS) == [[] for _ in TEXTS]
+        # The budget applies to batches only
+        assert extractor.extract_dates(TEXTS[0])
+
+    def test_batch_in_process_pool(self):
+        extractor = DateExtractor(cache_size=0, workers=2, process_threshold=2)
+        texts = TEXTS * 2
+
+        results = extractor.extract_dates_batch(texts)
+
+        assert [_key(dates) for dates in results] == [_key(extractor._extract(t)) for t in texts]
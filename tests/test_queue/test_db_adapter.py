@@ -5,7 +5,7 @@ and existing PostgreSQL database class.
 
 import contextlib
 import threading
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 
 class QueueDatabaseAdapter:
@@ -72,6 +72,12 @@ class QueueDatabaseAdapter:
                 pass
         return None
     
+    def fetch_all(self, query: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
+        """Execute SQL query and return all results as dicts."""
+        cursor = self._get_cursor()
+        cursor.execute(query, params or ())
+        return [dict(row) for row in cursor.fetchall()] if cursor.description else []
+    
     def execute_raw(self, sql: str, params: Optional[tuple] = None) -> None:
         """Execute raw SQL without returning results."""
         cursor = self._get_cursor()
@@ -306,34 +306,42 @@ class TestPhase2ErrorHandling:
         mock_db = Mock()
         mock_work_queue = Mock()
         mock_relationship_detector = Mock()
+        mock_dead_letter_queue = Mock()
+        mock_work_queue.max_retries = 3
         
         processor = QueuedDocumentProcessor(
             db=mock_db,
             work_queue=mock_work_queue,
             relationship_detector=mock_relationship_detector,
-            embedding_generator=None
+            embedding_generator=None,
+            dead_letter_queue=mock_dead_letter_queue,
+            prefetch_depth=0
         )
         
-        # Mock document claim with processing error
-        mock_work_queue.claim_next_document.return_value = {
+        # Mock a claimed batch holding one document, then an empty queue
+        mock_work_queue.claim_batch.side_effect = [[{
             'queue_id': 123,
             'doc_id': 'failing_doc',
             'source_name': 'test_source',
+            'retry_count': 0,
             'metadata': {}
-        }
+        }], []]
         
         # Mock content source that fails
         with patch('go_doc_go.content_source.factory.get_content_source_by_name') as mock_get_source:
             mock_source = Mock()
-            mock_source.get_document.side_effect = Exception("Processing failed")
+            mock_source.fetch_document.side_effect = Exception("Processing failed")
             mock_get_source.return_value = mock_source
             
             stats = processor.process_documents("run_123", max_documents=1)
             
-            # Should handle error and mark document as failed
+            # Should handle error and mark document for retry rather than dead letter
             assert stats['documents_processed'] == 0
             assert stats['documents_failed'] == 1
             mock_work_queue.mark_failed.assert_called_once()
+            assert mock_work_queue.mark_failed.call_args[0][0] == 123
+            mock_dead_letter_queue.move_to_dead_letter.assert_not_called()
+            mock_work_queue.release_documents.assert_not_called()
 
 
 @pytest.mark.performance
@@ -0,0 +1,533 @@
+"""
+Tests for the embedded SQLite work queue backend.
+"""
+
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from go_doc_go.work_queue.document_processor import QueuedDocumentProcessor
+from go_doc_go.work_queue.backend import PostgresQueueBackend, get_queue_backend
+from go_doc_go.work_queue.notifier import LocalSocketNotifier
+from go_doc_go.work_queue.sqlite_queue import SQLiteQueueBackend, SQLiteQueueDatabase, SQLiteWorkQueue
+
+
+@pytest.fixture
+def backend():
+    """Create an initialized SQLite queue backend in a temporary directory."""
+    queue_backend = SQLiteQueueBackend(os.path.join(tempfile.mkdtemp(), 'queue.db'))
+    queue_backend.initialize()
+    yield queue_backend
+    queue_backend.close()
+
+
+def _start_run(backend, run_id='run1', worker_id='worker1', documents=3):
+    """Create a run, register a worker and queue some documents."""
+    coordinator = backend.create_run_coordinator(worker_id)
+    coordinator.ensure_run_exists(run_id, {'sources': ['local']})
+    coordinator.register_worker(run_id, worker_id)
+    queue = backend.create_work_queue(worker_id)
+    for i in range(documents):
+        queue.add_document(f'doc{i}', 'local', run_id, metadata={'index': i})
+    return queue
+
+
+def _claim_all(db_path, worker_id, results):
+    """Claim and complete documents from another process until none are left."""
+    queue = SQLiteWorkQueue(SQLiteQueueDatabase(db_path), worker_id)
+    claimed = []
+    while True:
+        doc = queue.claim_next_document('run1')
+        if not doc:
+            break
+        claimed.append(doc['doc_id'])
+        queue.mark_completed(doc['queue_id'])
+    results.put(claimed)
+
+
+class TestSQLiteWorkQueue:
+    """Test claiming, completion, retries and leases."""
+
+    def test_claim_lifecycle(self, backend):
+        queue = _start_run(backend)
+
+        doc = queue.claim_next_document('run1')
+        assert doc['doc_id'] == 'doc0'
+        assert doc['metadata'] == {'index': 0}
+        queue.mark_completed(doc['queue_id'], content_hash='abc')
+
+        status = queue.get_queue_status('run1')
+        assert (status['pending'], status['completed'], status['total']) == (2, 1, 3)
+        assert [d['doc_id'] for d in queue.get_completed_documents('run1')] == ['doc0']
+
+    def test_add_document_is_idempotent(self, backend):
+        queue = _start_run(backend, documents=1)
+
+        queue.add_document('doc0', 'local', 'run1')
+
+        assert queue.get_queue_status('run1')['total'] == 1
+
+    def test_processes_do_not_claim_the_same_document(self, backend):
+        _start_run(backend, documents=40)
+        context = multiprocessing.get_context('spawn')
+        results = context.Queue()
+        processes = [context.Process(target=_claim_all, args=(backend.db.db_path, f'w{i}', results), daemon=True)
+                     for i in range(4)]
+        for process in processes:
+            process.start()
+        claimed = [doc_id for _ in processes for doc_id in results.get(timeout=30)]
+        for process in processes:
+            process.join(30)
+
+        assert [process.exitcode for process in processes] == [0] * 4
+        assert len(claimed) == 40
+        assert len(set(claimed)) == 40
+
+    def test_failed_document_is_retried_until_max_retries(self, backend):
+        queue = _start_run(backend, documents=1)
+        queue.retry_delay = 0
+
+        for _ in range(3):
+            doc = queue.claim_next_document('run1')
+            queue.mark_failed(doc['queue_id'], 'parse error')
+            assert queue.get_queue_status('run1')['retry'] == 1
+
+        doc = queue.claim_next_document('run1')
+        assert doc['retry_count'] == 3
+        queue.mark_failed(doc['queue_id'], 'parse error')
+
+        assert queue.get_queue_status('run1')['failed'] == 1
+        assert queue.claim_next_document('run1') is None
+
+    def test_retry_waits_for_backoff(self, backend):
+        queue = _start_run(backend, documents=1)
+
+        doc = queue.claim_next_document('run1')
+        queue.mark_failed(doc['queue_id'], 'timeout')
+
+        assert queue.claim_next_document('run1') is None
+
+    def test_expired_lease_is_reclaimed(self, backend):
+        _start_run(backend, documents=1)
+        crashed = backend.create_work_queue('crashed')
+        crashed.claim_timeout = 0
+        survivor = backend.create_work_queue('survivor')
+
+        doc = crashed.claim_next_document('run1')
+        time.sleep(0.01)
+
+        reclaimed = survivor.claim_next_document('run1')
+        assert reclaimed['queue_id'] == doc['queue_id']
+        survivor.mark_completed(reclaimed['queue_id'])
+        assert survivor.get_queue_status('run1')['completed'] == 1
+
+    def test_document_that_keeps_expiring_is_failed(self, backend):
+        _start_run(backend, documents=1)
+        hung = backend.create_work_queue('hung')
+        hung.claim_timeout = 0
+
+        for retry_count in range(4):
+            doc = hung.claim_next_document('run1')
+            assert doc['retry_count'] == retry_count
+            time.sleep(0.01)
+
+        assert hung.claim_next_document('run1') is None
+        status = hung.get_queue_status('run1')
+        assert (status['failed'], status['processing']) == (1, 0)
+
+    def test_only_holder_can_fail_document(self, backend):
+        _start_run(backend, documents=1)
+        expired = backend.create_work_queue('expired')
+        expired.claim_timeout = 0
+        holder = backend.create_work_queue('holder')
+
+        expired.claim_next_document('run1')
+        time.sleep(0.01)
+        doc = holder.claim_next_document('run1')
+        expired.mark_failed(doc['queue_id'], 'parse error')
+
+        assert holder.get_queue_status('run1')['processing'] == 1
+        holder.mark_completed(doc['queue_id'])
+        assert holder.get_queue_status('run1')['completed'] == 1
+
+    def test_reclaim_stale_work(self, backend):
+        queue = _start_run(backend, documents=2)
+        queue.claim_timeout = 0
+        queue.claim_next_document('run1')
+        time.sleep(0.01)
+
+        assert queue.reclaim_stale_work() == 1
+        assert queue.get_queue_status('run1')['pending'] == 2
+
+    def test_reclaim_fails_document_out_of_retries(self, backend):
+        queue = _start_run(backend, documents=1)
+        queue.claim_timeout = 0
+
+        for retry_count in range(3):
+            assert queue.claim_next_document('run1')['retry_count'] == retry_count
+            time.sleep(0.01)
+            assert queue.reclaim_stale_work() == 1
+        queue.claim_next_document('run1')
+        time.sleep(0.01)
+
+        assert queue.reclaim_stale_work() == 0
+        status = queue.get_queue_status('run1')
+        assert (status['failed'], status['pending'], status['processing']) == (1, 0, 0)
+        run = backend.db.execute("SELECT documents_failed FROM processing_runs WHERE run_id = 'run1'")
+        assert run['documents_failed'] == 1
+
+    def test_heartbeat_extends_lease(self, backend):
+        queue = _start_run(backend, documents=1)
+        queue.claim_timeout = 0
+        queue.claim_next_document('run1')
+
+        queue.claim_timeout = 300
+        queue.heartbeat('run1')
+        time.sleep(0.01)
+
+        assert queue.reclaim_stale_work() == 0
+
+    def test_heartbeat_does_not_renew_hung_document_forever(self, backend):
+        _start_run(backend, documents=1)
+        hung = backend.create_work_queue('hung')
+        hung.claim_timeout = 0.05
+        doc = hung.claim_next_document('run1')
+        hung.mark_started(doc['queue_id'])
+
+        time.sleep(0.1)
+        hung.heartbeat('run1')
+        time.sleep(0.01)
+
+        reclaimed = backend.create_work_queue('w2').claim_next_document('run1')
+        assert reclaimed['queue_id'] == doc['queue_id']
+        assert reclaimed['retry_count'] == 1
+
+
+class TestBulkEnqueue:
+    """Test streaming bulk enqueue and per-run source configuration."""
+
+    def test_add_documents_from_iterator(self, backend):
+        queue = _start_run(backend, documents=0)
+        queue.add_document('doc1', 'local', 'run1', link_depth=2)
+
+        doc_ids = iter(['doc0', 'doc0', 'doc1', 'doc2', 'doc3'])
+        queued = queue.add_documents(doc_ids, 'local', 'run1', chunk_size=3)
+
+        assert queued == 4
+        assert queue.get_queue_status('run1')['total'] == 4
+        assert [doc['link_depth'] for doc in queue.claim_batch('run1', 4)] == [0, 0, 0, 0]
+
+    def test_run_counter_updated_per_chunk(self, backend):
+        queue = _start_run(backend, documents=0)
+
+        queue.add_documents([f'doc{i}' for i in range(7)], 'local', 'run1', chunk_size=3)
+
+        run = backend.db.execute("SELECT documents_queued FROM processing_runs WHERE run_id = 'run1'")
+        assert run['documents_queued'] == 7
+
+    def test_source_config_stored_once_per_run(self, backend):
+        queue = _start_run(backend, documents=0)
+        queue.register_source('run1', {'name': 'local', 'type': 'file', 'max_link_depth': 3})
+        queue.add_documents(['doc0', 'doc1'], 'local', 'run1')
+
+        other_worker = backend.create_work_queue('worker2')
+
+        assert other_worker.get_source_config('run1', 'local')['max_link_depth'] == 3
+        assert other_worker.get_source_config('run1', 'missing') == {}
+        assert other_worker.claim_next_document('run1')['metadata'] == {}
+
+
+class TestBatchClaiming:
+    """Test claiming several documents per round trip."""
+
+    def test_claim_batch_in_priority_order(self, backend):
+        queue = _start_run(backend, documents=0)
+        queue.add_document('linked', 'local', 'run1', link_depth=1)
+        for i in range(3):
+            queue.add_document(f'doc{i}', 'local', 'run1', metadata={'index': i})
+
+        docs = queue.claim_batch('run1', 3)
+
+        assert [doc['doc_id'] for doc in docs] == ['doc0', 'doc1', 'doc2']
+        assert docs[0]['metadata'] == {'index': 0}
+        assert queue.get_queue_status('run1')['processing'] == 3
+
+    def test_batches_do_not_overlap(self, backend):
+        _start_run(backend, documents=5)
+        first = backend.create_work_queue('w1').claim_batch('run1', 3)
+        second = backend.create_work_queue('w2').claim_batch('run1', 3)
+
+        assert len(second) == 2
+        assert not {doc['queue_id'] for doc in first} & {doc['queue_id'] for doc in second}
+
+    def test_release_documents(self, backend):
+        queue = _start_run(backend, documents=3)
+        docs = queue.claim_batch('run1', 3)
+
+        queue.release_documents([doc['queue_id'] for doc in docs[1:]])
+
+        status = queue.get_queue_status('run1')
+        assert (status['processing'], status['pending']) == (1, 2)
+
+    def test_heartbeat_renews_whole_batch(self, backend):
+        queue = _start_run(backend, documents=3)
+        queue.claim_timeout = 0
+        queue.claim_batch('run1', 3)
+
+        queue.claim_timeout = 300
+        queue.heartbeat('run1')
+        time.sleep(0.01)
+
+        assert backend.create_work_queue('w2').claim_batch('run1', 3) == []
+
+    def test_buffered_document_outlives_claim_timeout(self, backend):
+        queue = _start_run(backend, documents=3)
+        queue.claim_timeout = 0.1
+        docs = queue.claim_batch('run1', 3)
+        other_worker = backend.create_work_queue('w2')
+
+        # Each document takes most of claim_timeout, so the last one waits longer than that
+        for doc in docs[:2]:
+            queue.mark_started(doc['queue_id'])
+            for _ in range(2):
+                time.sleep(0.03)
+                queue.heartbeat('run1')
+            queue.mark_completed(doc['queue_id'])
+
+        assert other_worker.claim_batch('run1', 3) == []
+        queue.mark_started(docs[2]['queue_id'])
+        queue.mark_completed(docs[2]['queue_id'])
+
+        rows = backend.db.fetch_all("SELECT status, retry_count FROM document_queue")
+        assert [(row['status'], row['retry_count']) for row in rows] == [('completed', 0)] * 3
+
+
+class TestBatchedProcessing:
+    """Test the processor's claim buffer, prefetching and adaptive batch size."""
+
+    @pytest.fixture
+    def processor(self, backend):
+        queue = _start_run(backend, documents=6)
+        processor = QueuedDocumentProcessor(None, queue, None, dead_letter_queue=backend.create_dead_letter_queue())
+        processor.fetched = []
+        processor._fetch_document_content = lambda source_name, doc_id: processor.fetched.append(doc_id) or doc_id
+
+        def process(doc_id, source_name, claimed_doc, run_id, prefetched=None):
+            assert prefetched is None or prefetched.result() == doc_id
+            return {'elements_created': 1}
+
+        processor._process_single_document = process
+        return processor
+
+    def test_batch_size_adapts_to_document_time(self, processor):
+        assert processor._next_batch_size() == 1
+
+        processor._record_document_time(0.5)
+        assert processor._next_batch_size() == 10
+        assert processor._next_batch_size(remaining=4) == 4
+
+        for _ in range(20):
+            processor._record_document_time(0.001)
+        assert processor._next_batch_size() == processor.max_batch_size
+
+    def test_processes_all_documents_with_prefetch(self, processor):
+        processor.batch_target_seconds = 60
+
+        stats = processor.process_documents('run1')
+
+        assert stats['documents_processed'] == 6
+        assert processor.work_queue.get_queue_status('run1')['completed'] == 6
+        # Everything after the first document of each batch was fetched ahead of time
+        assert set(processor.fetched) <= {f'doc{i}' for i in range(1, 6)}
+        assert processor.fetched
+
+    def test_max_documents_leaves_nothing_claimed(self, processor):
+        processor._avg_document_seconds = 0.001
+
+        stats = processor.process_documents('run1', max_documents=4)
+
+        status = processor.work_queue.get_queue_status('run1')
+        assert stats['documents_processed'] == 4
+        assert (status['completed'], status['processing'], status['pending']) == (4, 0, 2)
+
+    def test_unprocessed_batch_is_released_on_error(self, processor):
+        processor._avg_document_seconds = 0.001
+        processor.work_queue.mark_completed = Mock(side_effect=KeyboardInterrupt)
+
+        with pytest.raises(KeyboardInterrupt):
+            processor.process_documents('run1')
+
+        status = processor.work_queue.get_queue_status('run1')
+        assert (status['processing'], status['pending']) == (1, 5)
+
+    def test_stop_finishes_current_document_and_releases_batch(self, processor):
+        processor._avg_document_seconds = 0.001
+        process = processor._process_single_document
+
+        def process_then_stop(*args, **kwargs):
+            processor.stop()
+            return process(*args, **kwargs)
+
+        processor._process_single_document = process_then_stop
+
+        stats = processor.process_documents('run1', wait_for_work=True)
+
+        status = processor.work_queue.get_queue_status('run1')
+        assert stats['documents_processed'] == 1
+        assert (status['completed'], status['processing'], status['pending']) == (1, 0, 5)
+
+
+class TestStatusCounts:
+    """Test the trigger-maintained per-run status counters."""
+
+    def test_counts_follow_document_lifecycle(self, backend):
+        queue = _start_run(backend, documents=3)
+        queue.retry_delay = 0
+        assert queue.get_status_counts('run1')['pending'] == 3
+
+        first = queue.claim_next_document('run1')
+        second = queue.claim_next_document('run1')
+        queue.mark_completed(first['queue_id'])
+        queue.mark_failed(second['queue_id'], 'parse error')
+        counts = queue.get_status_counts('run1')
+
+        assert (counts['pending'], counts['completed'], counts['retry']) == (1, 1, 1)
+        exact = queue.get_queue_status('run1')
+        assert all(counts[status] == exact[status] for status in exact)
+        assert queue.has_active_work('run1')
+
+    def test_dead_letters_counted_and_purged(self, backend):
+        queue = _start_run(backend, documents=1)
+        dead_letters = backend.create_dead_letter_queue()
+        dead_letters.move_to_dead_letter(queue.claim_next_document('run1')['queue_id'], 'corrupt file')
+        assert queue.get_status_counts('run1')['dead_letter'] == 1
+        assert not queue.has_active_work('run1')
+
+        backend.db.execute_raw("UPDATE document_queue SET updated_at = 0")
+        dead_letters.purge_old_dead_letters(older_than_days=1)
+
+        assert queue.get_status_counts('run1')['total'] == 0
+
+    def test_unknown_run_has_zero_counts(self, backend):
+        queue = backend.create_work_queue('worker1')
+
+        assert queue.get_status_counts('missing')['total'] == 0
+        assert not queue.has_active_work('missing')
+
+
+class TestQueueNotifications:
+    """Test waking waiting workers on queue changes."""
+
+    def test_wait_times_out_without_changes(self, backend):
+        queue = _start_run(backend, documents=0)
+
+        assert queue.wait_for_change(0.05) is False
+
+    def test_commit_wakes_waiting_worker(self, backend):
+        waiter = _start_run(backend, documents=0)
+        waiter.notifier.listen()
+        producer = SQLiteWorkQueue(SQLiteQueueDatabase(backend.db_path), 'producer',
+                                   LocalSocketNotifier(f"{backend.db_path}.notify"))
+        producer.db.notifier = producer.notifier
+
+        threading.Timer(0.05, producer.add_document, ('doc0', 'local', 'run1')).start()
+        started = time.time()
+
+        assert waiter.wait_for_change(10) is True
+        assert time.time() - started < 5
+        assert waiter.has_active_work('run1')
+        producer.notifier.close()
+
+    def test_stale_sockets_are_removed(self, tmp_path):
+        notifier = LocalSocketNotifier(str(tmp_path))
+        stale = tmp_path / '1-dead.sock'
+        stale.touch()
+
+        notifier.notify()
+
+        assert not stale.exists()
+
+    def test_long_socket_path_falls_back_to_polling(self, tmp_path):
+        notifier = LocalSocketNotifier(str(tmp_path / ('x' * 200)))
+
+        notifier.listen()
+        started = time.monotonic()
+        assert notifier.wait(0.05) is False
+        assert time.monotonic() - started >= 0.05
+        notifier.notify()
+        notifier.close()
+
+
+class TestSQLiteRunCoordinator:
+    """Test leader election over the SQLite queue."""
+
+    def test_single_leader(self, backend):
+        _start_run(backend)
+        first = backend.create_run_coordinator('worker1')
+        second = backend.create_run_coordinator('worker2')
+
+        assert first.attempt_leader_election('run1')
+        assert not second.attempt_leader_election('run1')
+        assert first.attempt_leader_election('run1')
+        assert first.is_leader('run1')
+
+    def test_expired_leadership_moves(self, backend):
+        _start_run(backend)
+        first = backend.create_run_coordinator('worker1')
+        first.leader_lease_duration = 0
+        second = backend.create_run_coordinator('worker2')
+
+        assert first.attempt_leader_election('run1')
+        time.sleep(0.01)
+
+        assert second.attempt_leader_election('run1')
+
+
+class TestSQLiteDeadLetterQueue:
+    """Test dead letter handling."""
+
+    def test_dead_letter_and_retry(self, backend):
+        queue = _start_run(backend, documents=1)
+        dead_letters = backend.create_dead_letter_queue()
+        doc = queue.claim_next_document('run1')
+
+        assert dead_letters.move_to_dead_letter(doc['queue_id'], 'corrupt file')
+        items = dead_letters.get_dead_letter_items('run1')
+        assert [(item.doc_id, item.failure_reason) for item in items] == [('doc0', 'corrupt file')]
+        assert dead_letters.get_dead_letter_statistics()['total_dead_letters'] == 1
+
+        assert dead_letters.retry_dead_letter_item(doc['queue_id'])
+        assert queue.claim_next_document('run1')['doc_id'] == 'doc0'
+
+
+class TestQueueBackendFactory:
+    """Test backend selection from configuration."""
+
+    def test_sqlite_backend(self):
+        path = os.path.join(tempfile.mkdtemp(), 'queue.db')
+
+        backend = get_queue_backend({'processing': {'queue': {'backend': 'sqlite', 'path': path}}})
+
+        assert isinstance(backend, SQLiteQueueBackend)
+        assert backend.embedded
+
+    def test_postgres_is_default(self):
+        class Config:
+            config = {}
+
+            def get_document_database(self):
+                return 'db'
+
+        backend = get_queue_backend(Config())
+
+        assert isinstance(backend, PostgresQueueBackend)
+        assert not backend.embedded
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            get_queue_backend({'processing': {'queue': {'backend': 'redis'}}})
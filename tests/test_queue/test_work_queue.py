@@ -230,6 +230,30 @@ class TestWorkQueue:
         calls = mock_db.execute.call_args_list
         assert "status = 'failed'" in str(calls[1])
     
+    def test_add_documents_in_chunks(self, mock_db):
+        """Test bulk enqueue issues one upsert and one counter update per chunk."""
+        mock_db.execute = Mock(return_value=None)
+        queue = WorkQueue(mock_db, "worker_001")
+        
+        queued = queue.add_documents((f"doc_{i}" for i in range(5)), "test_source", "test_run_123",
+                                     chunk_size=2)
+        
+        assert queued == 5
+        assert mock_db.execute.call_count == 6
+        insert_query, insert_params = mock_db.execute.call_args_list[0][0]
+        assert insert_query.count("(%s, %s, %s, %s)") == 2
+        assert insert_params[:4] == ("doc_0", "test_source", "configured", "test_run_123")
+        assert mock_db.execute.call_args_list[5][0][1] == (1, "test_run_123")
+    
+    def test_get_source_config_is_cached(self, mock_db):
+        """Test that a run's source configuration is read once."""
+        mock_db.execute = Mock(return_value={'source_config': '{"name": "docs", "max_link_depth": 3}'})
+        queue = WorkQueue(mock_db, "worker_001")
+        
+        assert queue.get_source_config("test_run_123", "docs")['max_link_depth'] == 3
+        assert queue.get_source_config("test_run_123", "docs")['max_link_depth'] == 3
+        assert mock_db.execute.call_count == 1
+    
     def test_add_linked_document(self, mock_db):
         """Test adding a linked document."""
         queue = WorkQueue(mock_db, "worker_001")
@@ -261,6 +285,34 @@ class TestWorkQueue:
         assert status['pending'] == 10
         assert status['completed'] == 50
         assert status['total'] == 66
+    
+    def test_get_status_counts(self, mock_db):
+        """Test reading the trigger-maintained status counts."""
+        mock_db.execute = Mock(return_value={
+            'pending': 4,
+            'processing': 1,
+            'completed': 7,
+            'failed': 0,
+            'retry': None,
+            'dead_letter': 2
+        })
+        
+        queue = WorkQueue(mock_db, "worker_001")
+        counts = queue.get_status_counts("test_run_123")
+        
+        assert "FROM run_queue_counts" in mock_db.execute.call_args[0][0]
+        assert counts['retry'] == 0
+        assert counts['total'] == 14
+        assert queue.has_active_work("test_run_123")
+    
+    def test_no_status_counts_means_no_work(self, mock_db):
+        """Test that a run without a counts row has no active work."""
+        mock_db.execute = Mock(return_value=None)
+        
+        queue = WorkQueue(mock_db, "worker_001")
+        
+        assert queue.get_status_counts("test_run_123")['total'] == 0
+        assert not queue.has_active_work("test_run_123")
 
 
 @pytest.mark.integration
@@ -0,0 +1,91 @@
+"""
+Tests for running document workers in processes with WorkerManager.
+"""
+
+import os
+import tempfile
+from unittest.mock import Mock
+
+import pytest
+
+from go_doc_go.work_queue import worker as worker_module
+from go_doc_go.work_queue.sqlite_queue import SQLiteQueueBackend
+from go_doc_go.work_queue.worker import WorkerManager
+
+
+def _crash_first_run(config_data, worker_id, results, wait_for_work, embedding_server):
+    """Worker process that crashes unless it is a restarted worker."""
+    if '_restart' not in worker_id:
+        os._exit(3)
+    results.put((worker_id, {"documents_processed": 1, "elements_created": 4}))
+
+
+def _always_crash(config_data, worker_id, results, wait_for_work, embedding_server):
+    """Worker process that always crashes."""
+    os._exit(3)
+
+
+@pytest.fixture
+def queue_path():
+    return os.path.join(tempfile.mkdtemp(), 'queue.db')
+
+
+@pytest.fixture
+def config(queue_path):
+    """Configuration with an embedded queue and embeddings disabled."""
+    config = Mock()
+    config.config = {
+        "embedding": {"enabled": False},
+        "processing": {"queue": {"backend": "sqlite", "path": queue_path}}
+    }
+    config.is_embedding_enabled.return_value = False
+    return config
+
+
+class TestWorkerManager:
+    """Test the process worker mode."""
+
+    def test_unknown_mode(self, config):
+        with pytest.raises(ValueError):
+            WorkerManager(config, 2, mode="fiber")
+
+    def test_crashed_workers_are_restarted(self, config, monkeypatch):
+        monkeypatch.setattr(worker_module, 'run_local_worker', _crash_first_run)
+        manager = WorkerManager(config, 2, mode="process")
+
+        stats = manager.start_all()
+
+        assert stats["worker_restarts"] == 2
+        assert stats["documents_processed"] == 2
+        assert stats["elements_created"] == 8
+        config.initialize_database.assert_called_once()
+
+    def test_restarts_are_limited(self, config, monkeypatch):
+        monkeypatch.setattr(worker_module, 'run_local_worker', _always_crash)
+        manager = WorkerManager(config, 1, mode="process", max_restarts=1)
+
+        stats = manager.start_all()
+
+        assert stats["worker_restarts"] == 1
+        assert stats["documents_processed"] == 0
+
+    def test_documents_of_crashed_worker_are_failed(self, config, queue_path):
+        backend = SQLiteQueueBackend(queue_path)
+        backend.initialize()
+        coordinator = backend.create_run_coordinator('worker_1')
+        coordinator.ensure_run_exists('run1', {})
+        queue = backend.create_work_queue('worker_1')
+        queue.add_documents(['doc0', 'doc1', 'doc2', 'doc3'], 'local', 'run1')
+        docs = queue.claim_batch('run1', 3)
+        queue.mark_started(docs[0]['queue_id'])
+
+        WorkerManager(config, 1, mode="process")._fail_crashed_worker_documents('worker_1', -9)
+
+        status = queue.get_queue_status('run1')
+        assert (status['retry'], status['pending'], status['processing']) == (1, 3, 0)
+        assert queue.get_held_documents() == []
+        # Only the document in progress uses up a retry; the buffered ones go back unchanged
+        rows = backend.db.fetch_all("SELECT doc_id, status, retry_count FROM document_queue ORDER BY doc_id")
+        assert [(row['status'], row['retry_count']) for row in rows] == [
+            ('retry', 1), ('pending', 0), ('pending', 0), ('pending', 0)]
+        backend.close()
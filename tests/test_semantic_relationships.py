@@ -0,0 +1,61 @@
+"""
+Tests for the semantic relationship detector.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from go_doc_go.relationships.semantic import SemanticRelationshipDetector
+
+
+def _elements(count):
+    return [{'element_id': 'root', 'element_pk': 0, 'element_type': 'root', 'content_preview': 'root'}] + [
+        {'element_id': f'el{i}', 'element_pk': i + 1, 'element_type': 'paragraph', 'content_preview': f'text {i}'}
+        for i in range(count)
+    ]
+
+
+def _pairs(relationships):
+    return {(r['source_id'], r['target_reference']) for r in relationships}
+
+
+class TestSemanticRelationshipDetector:
+    """Test similarity search and embedding reuse."""
+
+    def test_top_matches_per_element(self):
+        vectors = [[1.0, 0.0], [0.95, 0.05], [0.9, 0.1], [0.0, 1.0], [0.05, 1.0]]
+        generator = MagicMock()
+        generator.generate_batch.return_value = vectors
+        detector = SemanticRelationshipDetector(generator, {'similarity_threshold': 0.8, 'max_relationships': 1})
+
+        relationships = detector.detect_relationships({'doc_id': 'doc'}, _elements(5))
+
+        # el1 is the best match of el0 and el2; mutual best matches are reported once
+        assert _pairs(relationships) == {('el0', 'el1'), ('el2', 'el1'), ('el3', 'el4')}
+        assert all(r['metadata']['similarity'] >= 0.8 for r in relationships)
+
+    def test_matches_pure_python_fallback(self, monkeypatch):
+        rng = pytest.importorskip("numpy").random.default_rng(3)
+        vectors = rng.normal(size=(40, 6)).tolist()
+        generator = MagicMock()
+        generator.generate_batch.return_value = vectors
+        detector = SemanticRelationshipDetector(generator, {'similarity_threshold': 0.2, 'max_relationships': 3})
+
+        vectorized = _pairs(detector.detect_relationships({'doc_id': 'doc'}, _elements(40)))
+        monkeypatch.setattr('go_doc_go.relationships.semantic.NUMPY_AVAILABLE', False)
+        python = _pairs(detector.detect_relationships({'doc_id': 'doc'}, _elements(40)))
+
+        assert vectorized and vectorized == python
+
+    def test_reuses_precomputed_embeddings(self):
+        generator = MagicMock()
+        generator.generate_batch.return_value = [[0.0, 1.0]]
+        detector = SemanticRelationshipDetector(generator, {'similarity_threshold': 0.9})
+
+        embeddings = {1: [1.0, 0.0], 2: [1.0, 0.01], 'el2': [0.0, 1.0]}
+        relationships = detector.detect_relationships({'doc_id': 'doc'}, _elements(4), embeddings=embeddings)
+
+        # Only el3 has no precomputed embedding
+        generator.generate_batch.assert_called_once_with(['text 3'])
+        assert _pairs(relationships) == {('el0', 'el1'), ('el2', 'el3')}
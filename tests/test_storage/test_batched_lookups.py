@@ -0,0 +1,91 @@
+"""
+Tests for batched ancestry, element and document lookups.
+"""
+
+import os
+import tempfile
+
+import pytest
+
+from go_doc_go.storage.base import DocumentDatabase
+from go_doc_go.storage.file import FileDocumentDatabase
+from go_doc_go.storage.sqlite import SQLiteDocumentDatabase
+
+
+def _document(doc_id):
+    document = {'doc_id': doc_id, 'doc_type': 'test', 'source': f'{doc_id}.txt', 'metadata': {}}
+    elements = [
+        {'element_id': f'{doc_id}_root', 'doc_id': doc_id, 'element_type': 'root', 'parent_id': None,
+         'content_preview': 'root', 'content_location': '{}', 'content_hash': ''},
+        {'element_id': f'{doc_id}_h1', 'doc_id': doc_id, 'element_type': 'header', 'parent_id': f'{doc_id}_root',
+         'content_preview': 'Heading', 'content_location': '{}', 'content_hash': ''},
+        {'element_id': f'{doc_id}_p1', 'doc_id': doc_id, 'element_type': 'paragraph', 'parent_id': f'{doc_id}_h1',
+         'content_preview': 'First', 'content_location': '{}', 'content_hash': ''},
+        {'element_id': f'{doc_id}_p2', 'doc_id': doc_id, 'element_type': 'paragraph', 'parent_id': f'{doc_id}_h1',
+         'content_preview': 'Second', 'content_location': '{}', 'content_hash': ''},
+    ]
+    return document, elements, []
+
+
+@pytest.fixture(params=['sqlite', 'files', 'segments'])
+def db(request):
+    if request.param == 'sqlite':
+        path = os.path.join(tempfile.mkdtemp(), 'test.db')
+        database = SQLiteDocumentDatabase(path)
+    else:
+        database = FileDocumentDatabase({'storage_path': tempfile.mkdtemp(), 'storage_mode': request.param})
+    database.initialize()
+    database.store_document(*_document('doc1'))
+    database.store_document(*_document('doc2'))
+    yield database
+    database.close()
+
+
+def _pk(db, element_id):
+    return db.get_element(element_id)['element_pk']
+
+
+def _paths(ancestries):
+    return {pk: [element.element_id for element in path] for pk, path in ancestries.items()}
+
+
+class TestBatchedLookups:
+    """Test the batched lookups against the one-at-a-time defaults."""
+
+    def test_ancestries(self, db):
+        pks = [_pk(db, 'doc1_p1'), _pk(db, 'doc1_p2'), _pk(db, 'doc2_h1'), _pk(db, 'doc1_root'), 999999]
+
+        ancestries = db.get_element_ancestries(pks)
+
+        assert _paths(ancestries) == {
+            pks[0]: ['doc1_root', 'doc1_h1', 'doc1_p1'],
+            pks[1]: ['doc1_root', 'doc1_h1', 'doc1_p2'],
+            pks[2]: ['doc2_root', 'doc2_h1'],
+            pks[3]: ['doc1_root'],
+        }
+        assert _paths(ancestries) == _paths(DocumentDatabase.get_element_ancestries(db, pks))
+        assert ancestries[pks[0]][-1].element_pk == pks[0]
+
+    def test_elements_and_documents(self, db):
+        pks = [_pk(db, 'doc2_p1'), _pk(db, 'doc1_h1'), _pk(db, 'doc2_p1'), 999999]
+
+        elements = db.get_elements_by_pks(pks)
+        documents = db.get_documents_by_ids(['doc2', 'missing', 'doc1'])
+
+        assert list(elements) == pks[:2]
+        assert elements[pks[0]] == db.get_element(pks[0])
+        assert list(documents) == ['doc2', 'doc1']
+        assert documents['doc1'] == db.get_document('doc1')
+
+    def test_results_outline(self, db):
+        results = [(_pk(db, 'doc1_p2'), 0.9), (_pk(db, 'doc1_p1'), 0.8), (_pk(db, 'doc2_h1'), 0.7)]
+
+        outline = db.get_results_outline(results)
+
+        assert [node.element_id for node in outline] == ['doc1_root', 'doc2_root']
+        header = outline[0].child_elements[0]
+        assert header.element_id == 'doc1_h1'
+        assert [(child.element_id, child.score) for child in header.child_elements] == [
+            ('doc1_p2', 0.9), ('doc1_p1', 0.8)
+        ]
+        assert outline[1].child_elements[0].score == 0.7
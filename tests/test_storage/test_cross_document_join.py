@@ -0,0 +1,130 @@
+"""
+Tests for the blocked top-k similarity join and the cross-document relationship pass.
+"""
+
+import os
+import tempfile
+from unittest.mock import MagicMock
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from go_doc_go import Config
+from go_doc_go.relationships.cross_document import compute_cross_document_relationships
+from go_doc_go.storage.embedding_matrix import top_k_similarity_join
+from go_doc_go.storage.sqlite import SQLiteDocumentDatabase
+
+
+def _config(threshold=0.5, **settings):
+    config = Config()
+    config.config['relationship_detection'] = {
+        'cross_document_semantic': {'similarity_threshold': threshold, **settings}
+    }
+    return config
+
+
+def _store(db, doc_id, vectors):
+    document = {'doc_id': doc_id, 'doc_type': 'test', 'source': f'{doc_id}.txt', 'metadata': {}}
+    elements = [
+        {'element_id': f'{doc_id}_s{i}', 'doc_id': doc_id, 'element_type': 'section', 'content_preview': f's{i}'}
+        for i in range(len(vectors))
+    ]
+    db.store_document(document, elements, [])
+    for element, vector in zip(elements, vectors):
+        db.store_embedding(element['element_pk'], vector)
+
+
+def _targets(db, element_id):
+    rows = db.conn.execute(
+        "SELECT target_reference FROM relationships WHERE source_id = ? AND relationship_type = ?",
+        (element_id, 'semantic_section')
+    ).fetchall()
+    return sorted(row[0] for row in rows)
+
+
+class TestTopKSimilarityJoin:
+    """Test the blocked matrix-matrix top-k join."""
+
+    def test_matches_brute_force_with_group_exclusion(self):
+        rng = np.random.default_rng(1)
+        index = rng.normal(size=(60, 8))
+        queries = index[:25]
+        groups = rng.integers(0, 5, size=60)
+
+        # A tiny block budget forces many blocks
+        results = top_k_similarity_join(queries, index, 4, query_groups=groups[:25], index_groups=groups,
+                                        block_bytes=4 * 60 * 3)
+
+        normalized = index / np.linalg.norm(index, axis=1, keepdims=True)
+        scores = normalized[:25] @ normalized.T
+        for row, matches in enumerate(results):
+            allowed = [j for j in range(60) if groups[j] != groups[row]]
+            expected = sorted(allowed, key=lambda j: -scores[row, j])[:4]
+            assert [j for j, _ in matches] == expected
+            assert [s for _, s in matches] == pytest.approx([scores[row, j] for j in expected], abs=1e-5)
+
+    def test_threshold_and_small_index(self):
+        results = top_k_similarity_join([[1.0, 0.0]], [[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]], 10,
+                                        min_similarity=0.5)
+        assert [j for j, _ in results[0]] == [0, 2]
+
+
+class TestCrossDocumentRelationships:
+    """Test the cross-document semantic relationship pass on SQLite."""
+
+    @pytest.fixture
+    def db(self):
+        db = SQLiteDocumentDatabase(os.path.join(tempfile.mkdtemp(), 'cross.db'))
+        db.initialize()
+        _store(db, 'a', [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]])
+        _store(db, 'b', [[0.9, 0.1, 0.0], [0.0, 0.0, 1.0]])
+        yield db
+        db.close()
+
+    def test_links_containers_across_documents(self, db):
+        assert compute_cross_document_relationships(db, ['a', 'b'], _config(0.8)) == 2
+        assert _targets(db, 'a_s0') == ['b_s0']
+        assert _targets(db, 'b_s0') == ['a_s0']
+        assert _targets(db, 'a_s1') == []
+
+    def test_incremental_run_replaces_only_changed_containers(self, db):
+        compute_cross_document_relationships(db, ['a', 'b'], _config(0.8))
+        _store(db, 'c', [[0.0, 0.95, 0.05]])
+
+        # Only containers of the new document are queried against the full index
+        assert compute_cross_document_relationships(db, ['c'], _config(0.8)) == 1
+        assert _targets(db, 'c_s0') == ['a_s1']
+        assert _targets(db, 'a_s1') == []
+        assert _targets(db, 'a_s0') == ['b_s0']
+
+        # A full pass recomputes every container
+        assert compute_cross_document_relationships(db, ['c'], _config(0.8, incremental=False)) == 4
+        assert _targets(db, 'a_s1') == ['c_s0']
+
+    def test_top_k_limits_matches(self, db):
+        _store(db, 'c', [[1.0, 0.05, 0.0]])
+        compute_cross_document_relationships(db, ['a', 'b', 'c'], _config(0.8, top_k=1))
+        assert _targets(db, 'a_s0') == ['c_s0']
+
+    def test_skipped_without_threshold(self, db):
+        config = Config()
+        config.config['relationship_detection'] = {}
+        assert compute_cross_document_relationships(db, ['a'], config) == 0
+
+    def test_falls_back_to_per_container_search(self):
+        db = MagicMock()
+        db.get_embeddings_by_element_type.return_value = None
+        db.get_document_elements.return_value = [
+            {'element_id': 'a_s0', 'element_pk': 1, 'element_type': 'section'},
+            {'element_id': 'a_p0', 'element_pk': 2, 'element_type': 'paragraph'},
+        ]
+        db.get_embedding.return_value = [1.0, 0.0]
+        db.search_by_embedding.return_value = [(7, 0.95), (8, 0.2)]
+        db.get_element.return_value = {'element_id': 'b_s0', 'doc_id': 'b'}
+
+        assert compute_cross_document_relationships(db, ['a'], _config(0.8)) == 1
+        source_ids, relationship_type, relationships = db.replace_relationships.call_args[0]
+        assert (source_ids, relationship_type) == (['a_s0'], 'semantic_section')
+        assert relationships[0]['relationship_id'] == 'sem_rel_a_s0_b_s0'
+        assert relationships[0]['metadata']['target_doc_id'] == 'b'
@@ -0,0 +1,237 @@
+"""
+Tests for binary embedding storage and the in-process embedding matrix.
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from go_doc_go.storage.embedding_matrix import EmbeddingMatrix, pack_embedding, unpack_embedding
+from go_doc_go.storage.file import FileDocumentDatabase
+from go_doc_go.storage.sqlite import SQLiteDocumentDatabase
+
+
+def _cosine(a, b):
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    return float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+def _document(doc_id, count):
+    document = {'doc_id': doc_id, 'doc_type': 'test', 'source': f'{doc_id}.txt', 'metadata': {}}
+    elements = [
+        {
+            'element_id': f'{doc_id}_el_{i}',
+            'doc_id': doc_id,
+            'element_type': 'paragraph' if i % 2 else 'header',
+            'content_preview': f'element {i}',
+        }
+        for i in range(count)
+    ]
+    return document, elements
+
+
+class TestEmbeddingPacking:
+    """Test float32 packing helpers."""
+
+    def test_round_trip(self):
+        vector = [0.5, -1.25, 3.0]
+        blob = pack_embedding(vector)
+        assert len(blob) == 4 * len(vector)
+        assert unpack_embedding(blob) == vector
+
+    def test_legacy_json(self):
+        assert unpack_embedding(json.dumps([1.0, 2.0])) == [1.0, 2.0]
+        assert unpack_embedding(None) is None
+
+
+class TestEmbeddingMatrix:
+    """Test EmbeddingMatrix search and incremental updates."""
+
+    def test_search_matches_cosine(self):
+        rng = np.random.default_rng(0)
+        vectors = {pk: rng.normal(size=8).tolist() for pk in range(1, 51)}
+        matrix = EmbeddingMatrix()
+        matrix.load(vectors.items())
+
+        query = rng.normal(size=8).tolist()
+        expected = sorted(((pk, _cosine(query, v)) for pk, v in vectors.items()), key=lambda x: x[1], reverse=True)
+        results = matrix.search(query, limit=5)
+
+        assert [pk for pk, _ in results] == [pk for pk, _ in expected[:5]]
+        for (_, a), (_, b) in zip(results, expected):
+            assert a == pytest.approx(b, abs=1e-5)
+
+    def test_incremental_updates(self):
+        matrix = EmbeddingMatrix(initial_capacity=1)
+        for pk in range(1, 6):
+            matrix.upsert(pk, [float(pk), 1.0])
+        assert len(matrix) == 5
+
+        matrix.remove(1)
+        matrix.upsert(2, [0.0, 1.0])
+        assert 1 not in matrix
+        assert len(matrix) == 4
+
+        results = dict(matrix.search([0.0, 1.0], limit=10))
+        assert results[2] == pytest.approx(1.0)
+        assert set(results) == {2, 3, 4, 5}
+
+    def test_candidate_filter(self):
+        matrix = EmbeddingMatrix()
+        matrix.load([(1, [1.0, 0.0]), (2, [0.9, 0.1]), (3, [0.0, 1.0])])
+        results = matrix.search([1.0, 0.0], limit=10, candidate_pks=[2, 3, 99])
+        assert [pk for pk, _ in results] == [2, 3]
+
+    def test_mixed_dimensions(self):
+        matrix = EmbeddingMatrix()
+        matrix.load([(1, [1.0, 0.0]), (2, [1.0, 0.0, 5.0])])
+        results = dict(matrix.search([1.0, 0.0], limit=10))
+        # Odd-dimension vectors are compared on the common prefix
+        assert results[1] == pytest.approx(1.0)
+        assert results[2] == pytest.approx(1.0)
+
+
+class TestSQLiteBinaryEmbeddings:
+    """Test binary embedding storage in the SQLite backend."""
+
+    @pytest.fixture
+    def db_path(self):
+        return os.path.join(tempfile.mkdtemp(), 'embeddings.db')
+
+    def test_stores_blobs_and_searches(self, db_path):
+        db = SQLiteDocumentDatabase(db_path)
+        db.initialize()
+        document, elements = _document('doc1', 4)
+        db.store_document(document, elements, [])
+        vectors = [[1.0, 0.0, 0.0], [0.8, 0.2, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+        for element, vector in zip(elements, vectors):
+            db.store_embedding(element['element_pk'], vector)
+
+        stored_type = db.conn.execute("SELECT typeof(embedding) FROM embeddings LIMIT 1").fetchone()[0]
+        assert stored_type == 'blob'
+        assert db.get_embedding(elements[0]['element_pk']) == vectors[0]
+
+        results = db.search_by_embedding([1.0, 0.1, 0.0], limit=2)
+        assert [pk for pk, _ in results] == [elements[0]['element_pk'], elements[1]['element_pk']]
+
+        # Incremental updates are visible without a reload
+        db.store_embedding(elements[3]['element_pk'], [1.0, 0.1, 0.0])
+        results = db.search_by_embedding([1.0, 0.1, 0.0], limit=1)
+        assert results[0][0] == elements[3]['element_pk']
+
+        filtered = db.search_by_embedding([1.0, 0.1, 0.0], limit=10, filter_criteria={'element_type': ['header']})
+        assert {pk for pk, _ in filtered} == {elements[0]['element_pk'], elements[2]['element_pk']}
+
+        db.delete_document('doc1')
+        assert db.search_by_embedding([1.0, 0.1, 0.0], limit=10) == []
+        db.close()
+
+    def test_migrates_json_embeddings(self, db_path):
+        db = SQLiteDocumentDatabase(db_path)
+        db.initialize()
+        document, elements = _document('doc1', 1)
+        db.store_document(document, elements, [])
+        element_pk = elements[0]['element_pk']
+        db.conn.execute(
+            "INSERT INTO embeddings (element_pk, embedding, dimensions) VALUES (?, ?, ?)",
+            (element_pk, json.dumps([0.25, 0.5]), 2)
+        )
+        db.conn.commit()
+        db.close()
+
+        db = SQLiteDocumentDatabase(db_path)
+        db.initialize()
+        stored_type = db.conn.execute("SELECT typeof(embedding) FROM embeddings").fetchone()[0]
+        assert stored_type == 'blob'
+        assert db.get_embedding(element_pk) == [0.25, 0.5]
+        db.close()
+
+    def test_unreadable_json_embeddings_are_kept(self, db_path):
+        db = SQLiteDocumentDatabase(db_path)
+        db.initialize()
+        document, elements = _document('doc1', 2)
+        db.store_document(document, elements, [])
+        db.conn.executemany(
+            "INSERT INTO embeddings (element_pk, embedding, dimensions) VALUES (?, ?, ?)",
+            [(elements[0]['element_pk'], '[0.25, 0.5', 2), (elements[1]['element_pk'], json.dumps([0.5, 0.25]), 2)]
+        )
+        db.conn.commit()
+        db.close()
+
+        db = SQLiteDocumentDatabase(db_path)
+        db.initialize()
+        rows = dict(db.conn.execute("SELECT element_pk, embedding FROM embeddings").fetchall())
+        assert rows[elements[0]['element_pk']] == '[0.25, 0.5'
+        assert db.get_embedding(elements[1]['element_pk']) == [0.5, 0.25]
+        assert [pk for pk, _ in db.search_by_embedding([0.5, 0.25], limit=10)] == [elements[1]['element_pk']]
+        db.close()
+
+    def test_sees_writes_from_other_connections(self, db_path):
+        db = SQLiteDocumentDatabase(db_path)
+        db.initialize()
+        document, elements = _document('doc1', 2)
+        db.store_document(document, elements, [])
+        db.store_embedding(elements[0]['element_pk'], [1.0, 0.0])
+        assert len(db.search_by_embedding([1.0, 0.0], limit=10)) == 1
+
+        other = sqlite3.connect(db_path)
+        other.execute(
+            "INSERT INTO embeddings (element_pk, embedding, dimensions) VALUES (?, ?, ?)",
+            (elements[1]['element_pk'], pack_embedding([0.0, 1.0]), 2)
+        )
+        other.commit()
+        other.close()
+
+        assert len(db.search_by_embedding([1.0, 0.0], limit=10)) == 2
+        db.close()
+
+
+class TestFileBinaryEmbeddings:
+    """Test binary embedding storage in the File backend."""
+
+    @pytest.fixture
+    def storage_path(self):
+        return tempfile.mkdtemp()
+
+    def test_binary_files_and_reload(self, storage_path):
+        db = FileDocumentDatabase({'storage_path': storage_path})
+        db.initialize()
+        document, elements = _document('doc1', 3)
+        db.store_document(document, elements, [])
+        vectors = [[1.0, 0.0], [0.0, 1.0], [0.7, 0.7]]
+        for element, vector in zip(elements, vectors):
+            db.store_embedding_with_topics(element['element_pk'], vector, ['topic.a'], 0.9)
+
+        embedding_files = os.listdir(os.path.join(storage_path, 'embeddings'))
+        assert sorted(embedding_files) == sorted(f"{e['element_pk']}.emb" for e in elements)
+
+        reloaded = FileDocumentDatabase({'storage_path': storage_path})
+        reloaded.initialize()
+        assert reloaded.get_embedding(elements[2]['element_pk']) == pytest.approx(vectors[2])
+        assert reloaded.get_embedding_topics(elements[2]['element_pk']) == ['topic.a']
+
+        results = reloaded.search_by_embedding([1.0, 0.1], limit=1)
+        assert results[0][0] == elements[0]['element_pk']
+
+    def test_migrates_json_files(self, storage_path):
+        db = FileDocumentDatabase({'storage_path': storage_path})
+        db.initialize()
+        document, elements = _document('doc1', 1)
+        db.store_document(document, elements, [])
+        element_pk = elements[0]['element_pk']
+
+        legacy_path = os.path.join(storage_path, 'embeddings', f"{element_pk}.json")
+        with open(legacy_path, 'w') as f:
+            json.dump({"embedding": [0.5, 0.25], "dimensions": 2, "topics": [], "confidence": 1.0}, f, indent=2)
+
+        reloaded = FileDocumentDatabase({'storage_path': storage_path})
+        reloaded.initialize()
+        assert not os.path.exists(legacy_path)
+        assert os.path.exists(os.path.join(storage_path, 'embeddings', f"{element_pk}.emb"))
+        assert reloaded.get_embedding(element_pk) == [0.5, 0.25]
@@ -0,0 +1,103 @@
+"""
+Tests for the secondary indexes of the File backend.
+"""
+
+import tempfile
+
+import pytest
+
+from go_doc_go.storage.element_element import ElementType
+from go_doc_go.storage.file import FileDocumentDatabase
+
+
+def _document(doc_id, source=None):
+    document = {'doc_id': doc_id, 'doc_type': 'test', 'source': source or f'{doc_id}.txt', 'metadata': {}}
+    root_id = f'{doc_id}_root'
+    elements = [
+        {'element_id': root_id, 'doc_id': doc_id, 'element_type': 'root', 'parent_id': None,
+         'content_preview': 'root'},
+        {'element_id': f'{doc_id}_h1', 'doc_id': doc_id, 'element_type': 'header', 'parent_id': root_id,
+         'content_preview': 'Heading'},
+        {'element_id': f'{doc_id}_p1', 'doc_id': doc_id, 'element_type': 'paragraph', 'parent_id': root_id,
+         'content_preview': 'Body text'},
+    ]
+    relationships = [
+        {'relationship_id': f'{doc_id}_r{i}', 'source_id': root_id, 'relationship_type': 'contains',
+         'target_reference': element['element_id']}
+        for i, element in enumerate(elements[1:])
+    ]
+    return document, elements, relationships
+
+
+@pytest.fixture(params=['files', 'segments'])
+def db(request):
+    database = FileDocumentDatabase({'storage_path': tempfile.mkdtemp(), 'storage_mode': request.param})
+    database.initialize()
+    yield database
+    database.close()
+
+
+class TestFileSecondaryIndexes:
+    """Test indexed lookups stay consistent across store, update and delete."""
+
+    def test_document_lookups(self, db):
+        db.store_document(*_document('doc1', source='/data/one.md'))
+        db.store_document(*_document('doc2'))
+
+        assert [e['element_id'] for e in db.get_document_elements('doc1')] == ['doc1_root', 'doc1_h1', 'doc1_p1']
+        assert len(db.get_document_elements('/data/one.md')) == 3
+        assert db.get_document_elements('missing') == []
+        assert {r['relationship_id'] for r in db.get_document_relationships('doc2')} == {'doc2_r0', 'doc2_r1'}
+
+        pk = db.get_document_elements('doc2')[1]['element_pk']
+        assert db.get_element(pk)['element_id'] == 'doc2_h1'
+
+    def test_find_elements_uses_indexed_fields(self, db):
+        db.store_document(*_document('doc1'))
+        db.store_document(*_document('doc2'))
+
+        headers = db.find_elements({'element_type': ElementType.HEADER})
+        assert [e['element_id'] for e in headers] == ['doc1_h1', 'doc2_h1']
+
+        children = db.find_elements({'parent_id': 'doc2_root', 'element_type': ['paragraph']})
+        assert [e['element_id'] for e in children] == ['doc2_p1']
+
+        roots = db.find_elements({'parent_id': None})
+        assert {e['element_id'] for e in roots} == {'doc1_root', 'doc2_root'}
+
+        matches = db.find_elements({'doc_id': ['doc1'], 'content_preview_like': '%text%'})
+        assert [e['element_id'] for e in matches] == ['doc1_p1']
+
+    def test_indexes_follow_updates_and_deletes(self, db):
+        document, elements, relationships = _document('doc1')
+        db.store_document(document, elements, relationships)
+
+        # Retype one element, drop another and move the document to a new source
+        _, updated, _ = _document('doc1')
+        updated[1]['element_type'] = 'title'
+        updated[1]['content_hash'] = 'changed'
+        updated = updated[:2]
+        db.update_document('doc1', dict(document, source='moved.txt'), updated, relationships[:1])
+
+        assert db.find_elements({'element_type': 'header'}) == []
+        assert [e['element_id'] for e in db.find_elements({'element_type': 'title'})] == ['doc1_h1']
+        assert [e['element_id'] for e in db.get_document_elements('moved.txt')] == ['doc1_root', 'doc1_h1']
+        assert db.get_document_elements('doc1.txt') == []
+        assert [r['relationship_id'] for r in db.get_document_relationships('doc1')] == ['doc1_r0']
+
+        db.delete_relationships_for_element('doc1_h1')
+        assert db.get_document_relationships('doc1') == []
+
+        db.delete_document('doc1')
+        assert db.find_elements({'doc_id': 'doc1'}) == []
+        assert db.get_element(elements[0]['element_pk']) is None
+
+    def test_indexes_rebuilt_on_reopen(self, db):
+        db.store_document(*_document('doc1'))
+        db.close()
+
+        reopened = FileDocumentDatabase(db.conn_params)
+        reopened.initialize()
+        assert [e['element_id'] for e in reopened.find_elements({'parent_id': 'doc1_root'})] == ['doc1_h1', 'doc1_p1']
+        assert len(reopened.get_outgoing_relationships(reopened.element_pks['doc1_root'])) == 2
+        reopened.close()
@@ -0,0 +1,212 @@
+"""
+Tests for the append-only segment storage mode of the File backend.
+"""
+
+import json
+import os
+import tempfile
+
+import pytest
+
+from go_doc_go.storage.file import FileDocumentDatabase
+from go_doc_go.storage.segment_store import SegmentStore, SegmentMapping, INDEX_FILE
+
+
+def _document(doc_id, count):
+    document = {'doc_id': doc_id, 'doc_type': 'test', 'source': f'{doc_id}.txt', 'metadata': {}}
+    elements = [
+        {
+            'element_id': f'{doc_id}_el_{i}',
+            'doc_id': doc_id,
+            'element_type': 'paragraph',
+            'parent_id': f'{doc_id}_el_0' if i else None,
+            'content_preview': f'element {i}',
+        }
+        for i in range(count)
+    ]
+    relationships = [
+        {
+            'relationship_id': f'{doc_id}_rel_{i}',
+            'source_id': f'{doc_id}_el_0',
+            'relationship_type': 'contains',
+            'target_reference': f'{doc_id}_el_{i}',
+        }
+        for i in range(1, count)
+    ]
+    return document, elements, relationships
+
+
+class TestSegmentStore:
+    """Test the log-structured store directly."""
+
+    @pytest.fixture
+    def path(self):
+        return tempfile.mkdtemp()
+
+    def test_put_get_delete_and_reopen(self, path):
+        store = SegmentStore(path)
+        assert store.open() is False
+        store.put('element', 'a', {'x': 1}, {'doc_id': 'd1'})
+        store.put('element', 'a', {'x': 2}, {'doc_id': 'd1'})
+        store.put('embedding', 7, {'v': 'data'})
+        store.put('element', 'b', {'x': 3})
+        assert store.delete('element', 'b') is True
+        assert store.delete('element', 'missing') is False
+        assert store.get('element', 'a') == {'x': 2}
+        store.close()
+
+        reopened = SegmentStore(path)
+        assert reopened.open() is True
+        assert reopened.get('element', 'a') == {'x': 2}
+        assert reopened.get('embedding', 7) == {'v': 'data'}
+        assert not reopened.contains('element', 'b')
+        assert reopened.attributes('element') == {'a': {'doc_id': 'd1'}}
+        reopened.close()
+
+    def test_replays_log_after_checkpoint_and_drops_torn_record(self, path):
+        store = SegmentStore(path)
+        store.open()
+        store.put('document', 'd1', {'n': 1})
+        store.checkpoint()
+        store.put('document', 'd2', {'n': 2})
+        store.flush()
+        # Simulate a crash: no checkpoint, plus a partially written record
+        segment = [f for f in os.listdir(path) if f.endswith('.log')][0]
+        with open(os.path.join(path, segment), 'ab') as f:
+            f.write(b'{"k":"document","id":"d3","v":{"n"')
+
+        reopened = SegmentStore(path)
+        reopened.open()
+        assert set(reopened.keys('document')) == {'d1', 'd2'}
+        reopened.put('document', 'd4', {'n': 4})
+        assert reopened.get('document', 'd4') == {'n': 4}
+        reopened.close()
+
+        with open(os.path.join(path, segment), 'rb') as f:
+            for line in f:
+                json.loads(line)
+
+    def test_rollover_and_compaction(self, path):
+        store = SegmentStore(path, max_segment_bytes=200, min_compaction_bytes=0)
+        store.open()
+        for i in range(50):
+            store.put('element', f'e{i % 5}', {'value': i})
+        assert store.get_statistics()['dead_bytes'] > 0
+
+        store.compact()
+        stats = store.get_statistics()
+        assert stats['dead_bytes'] == 0
+        assert stats['records'] == {'element': 5}
+        assert {store.get('element', f'e{i}')['value'] for i in range(5)} == set(range(45, 50))
+        store.close()
+
+        reopened = SegmentStore(path)
+        reopened.open()
+        assert reopened.get('element', 'e0') == {'value': 45}
+        assert os.path.exists(os.path.join(path, INDEX_FILE))
+        reopened.close()
+
+    def test_mapping_reads_lazily(self, path):
+        store = SegmentStore(path)
+        store.open()
+        store.put('document', 'd1', {'doc_id': 'd1'})
+        mapping = SegmentMapping(store, 'document')
+        mapping['d2'] = {'doc_id': 'd2'}
+        assert set(mapping) == {'d1', 'd2'}
+        assert len(mapping) == 2
+        assert mapping['d1'] == {'doc_id': 'd1'}
+
+        del mapping['d1']
+        assert 'd1' not in mapping
+        assert not store.contains('document', 'd1')
+        with pytest.raises(KeyError):
+            del mapping['d1']
+        store.close()
+
+
+class TestFileSegmentStorage:
+    """Test FileDocumentDatabase in segment storage mode."""
+
+    @pytest.fixture
+    def storage_path(self):
+        return tempfile.mkdtemp()
+
+    def _open(self, storage_path):
+        db = FileDocumentDatabase({'storage_path': storage_path, 'storage_mode': 'segments'})
+        db.initialize()
+        return db
+
+    def test_round_trip(self, storage_path):
+        db = self._open(storage_path)
+        document, elements, relationships = _document('doc1', 3)
+        db.store_document(document, elements, relationships)
+        db.store_embedding_with_topics(elements[1]['element_pk'], [0.5, 0.25], ['topic.a'], 0.9)
+        db.store_element_dates(elements[0]['element_id'], [{'original_text': 'today'}])
+        db.close()
+
+        assert os.listdir(storage_path) == ['segments']
+
+        reopened = self._open(storage_path)
+        assert reopened.get_document('doc1')['source'] == 'doc1.txt'
+        assert len(reopened.get_document_elements('doc1')) == 3
+        assert len(reopened.get_document_relationships('doc1')) == 2
+        assert reopened.get_embedding(elements[1]['element_pk']) == [0.5, 0.25]
+        assert reopened.get_embedding_topics(elements[1]['element_pk']) == ['topic.a']
+        assert reopened.get_element_dates(elements[0]['element_id']) == [{'original_text': 'today'}]
+        assert reopened.get_last_processed_info('doc1.txt') is not None
+
+        # element_pk allocation continues after the highest stored key
+        assert reopened.next_element_pk == elements[-1]['element_pk'] + 1
+        results = reopened.search_by_embedding([0.5, 0.25], limit=1)
+        assert results[0][0] == elements[1]['element_pk']
+
+        assert reopened.delete_document('doc1') is True
+        reopened.close()
+
+        final = self._open(storage_path)
+        assert final.get_document('doc1') is None
+        assert final.get_embedding(elements[1]['element_pk']) is None
+        assert len(final.elements) == 0
+        final.close()
+
+    def test_imports_file_layout(self, storage_path):
+        legacy = FileDocumentDatabase({'storage_path': storage_path})
+        legacy.initialize()
+        document, elements, relationships = _document('doc1', 2)
+        legacy.store_document(document, elements, relationships)
+        legacy.store_embedding(elements[0]['element_pk'], [1.0, 0.0])
+        legacy.close()
+
+        db = self._open(storage_path)
+        assert os.path.isdir(os.path.join(storage_path, 'segments'))
+        assert db.get_document('doc1') is not None
+        assert db.get_element(elements[1]['element_id'])['content_preview'] == 'element 1'
+        assert db.get_embedding(elements[0]['element_pk']) == [1.0, 0.0]
+        db.store_document(*_document('doc2', 1))
+        db.close()
+
+        # The import happens once; later opens read the segment index
+        reopened = self._open(storage_path)
+        assert set(reopened.documents) == {'doc1', 'doc2'}
+        reopened.close()
+
+    def test_import_leaves_legacy_embedding_files_in_place(self, storage_path):
+        legacy = FileDocumentDatabase({'storage_path': storage_path})
+        legacy.initialize()
+        document, elements, relationships = _document('doc1', 1)
+        legacy.store_document(document, elements, relationships)
+        legacy.close()
+        element_pk = elements[0]['element_pk']
+        legacy_file = os.path.join(storage_path, 'embeddings', f'{element_pk}.json')
+        with open(legacy_file, 'w') as f:
+            json.dump({'embedding': [0.5, 0.5], 'dimensions': 2}, f)
+
+        db = self._open(storage_path)
+        assert db.get_embedding(element_pk) == [0.5, 0.5]
+        db.close()
+
+        assert os.listdir(os.path.join(storage_path, 'embeddings')) == [f'{element_pk}.json']
+
+    def test_rejects_unknown_mode(self, storage_path):
+        with pytest.raises(ValueError):
+            FileDocumentDatabase({'storage_path': storage_path, 'storage_mode': 'tape'})
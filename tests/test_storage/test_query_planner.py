@@ -0,0 +1,153 @@
+"""
+Tests for structured search query planning with filter and limit pushdown.
+"""
+
+import os
+import tempfile
+
+import pytest
+
+from go_doc_go.storage.file import FileDocumentDatabase
+from go_doc_go.storage.sqlite import SQLiteDocumentDatabase
+from go_doc_go.storage.structured_search import (
+    DEFAULT_CRITERIA_LIMIT, ElementSearchCriteria, EmbeddingSearchCriteria, LogicalOperator, QueryPlanner,
+    SearchCriteriaGroup, StructuredSearchQuery, TextSearchCriteria, TopicSearchCriteria, execute_plan
+)
+
+
+class FixedGenerator:
+    """Embedding generator that embeds by keyword presence."""
+
+    def generate(self, text):
+        text = text.lower()
+        return [1.0 if 'revenue' in text else 0.0, 1.0 if 'risk' in text else 0.0, 0.1]
+
+    def get_model_name(self):
+        return 'fixed'
+
+
+PARAGRAPHS = {
+    'doc1': ['Quarterly revenue grew strongly', 'Operating costs were flat'],
+    'doc2': ['Revenue guidance was lowered', 'Currency risk increased'],
+}
+
+
+def _text():
+    return TextSearchCriteria(query_text='revenue', similarity_threshold=0.0)
+
+
+@pytest.fixture(params=['sqlite', 'files'])
+def db(request):
+    if request.param == 'sqlite':
+        database = SQLiteDocumentDatabase(os.path.join(tempfile.mkdtemp(), 'plan.db'))
+    else:
+        database = FileDocumentDatabase({'storage_path': tempfile.mkdtemp(), 'storage_mode': request.param})
+    database.initialize()
+    database.embedding_generator = FixedGenerator()
+    for doc_id, paragraphs in PARAGRAPHS.items():
+        document = {'doc_id': doc_id, 'doc_type': 'test', 'source': f'{doc_id}.txt', 'metadata': {}}
+        elements = [{'element_id': f'{doc_id}_p{i}', 'doc_id': doc_id, 'element_type': 'paragraph',
+                     'parent_id': None, 'content_preview': text, 'content_location': '{}', 'content_hash': ''}
+                    for i, text in enumerate(paragraphs)]
+        database.store_document(document, elements, [])
+        for element in database.get_document_elements(doc_id):
+            database.store_embedding(element['element_pk'], FixedGenerator().generate(element['content_preview']))
+    yield database
+    database.close()
+
+
+class TestQueryPlanner:
+    """Test ordering, pushdown and early stop decisions."""
+
+    def test_and_group_runs_cheap_filters_first(self):
+        group = SearchCriteriaGroup(text_criteria=_text(), element_criteria=ElementSearchCriteria(doc_ids=['doc1']))
+
+        plan = QueryPlanner().plan(group)
+
+        assert [step.kind for step in plan.steps] == ['element', 'text']
+        assert [step.pushdown for step in plan.steps] == [False, True]
+        assert plan.steps[0].limit is None
+        assert plan.steps[1].limit == DEFAULT_CRITERIA_LIMIT
+
+    def test_estimates_break_cost_ties(self):
+        group = SearchCriteriaGroup(text_criteria=_text(),
+                                    embedding_criteria=EmbeddingSearchCriteria(embedding_vector=[1.0, 0.0, 0.0]))
+        estimates = {'text': 10, 'embedding': 5}
+
+        plan = QueryPlanner(lambda kind, criteria: estimates[kind]).plan(group)
+
+        assert [(step.kind, step.estimated_rows) for step in plan.steps] == [('embedding', 5), ('text', 10)]
+
+    def test_early_stop_with_one_scored_criterion(self):
+        group = SearchCriteriaGroup(text_criteria=_text(), element_criteria=ElementSearchCriteria(doc_ids=['doc1']))
+
+        plan = QueryPlanner().plan(group, limit=5)
+
+        assert plan.limit == 5
+        assert plan.steps[-1].limit == 5
+
+    def test_no_early_stop_with_several_scored_criteria(self):
+        group = SearchCriteriaGroup(text_criteria=_text(),
+                                    topic_criteria=TopicSearchCriteria(include_topics=['finance%']))
+
+        plan = QueryPlanner().plan(group, limit=5)
+
+        assert plan.limit is None
+        assert all(step.limit == DEFAULT_CRITERIA_LIMIT for step in plan.steps)
+
+    def test_or_group_has_no_pushdown(self):
+        group = SearchCriteriaGroup(operator=LogicalOperator.OR, text_criteria=_text(),
+                                    element_criteria=ElementSearchCriteria(doc_ids=['doc1']))
+
+        plan = QueryPlanner().plan(group, limit=5)
+
+        assert not any(step.pushdown for step in plan.steps)
+        assert plan.limit is None
+
+    def test_empty_candidates_skip_remaining_steps(self):
+        group = SearchCriteriaGroup(text_criteria=_text(), element_criteria=ElementSearchCriteria(doc_ids=['none']))
+        plan = QueryPlanner().plan(group)
+        executed = []
+
+        def execute_step(step, candidates):
+            executed.append(step.kind)
+            return []
+
+        assert execute_plan(plan, execute_step, lambda results, operator: []) == []
+        assert executed == ['element']
+        assert plan.steps[1].skipped
+        assert 'skipped' in plan.explain()
+
+
+class TestBackendPlanning:
+    """Test planned execution in the SQLite and File backends."""
+
+    def test_and_group_with_pushdown(self, db):
+        group = SearchCriteriaGroup(text_criteria=_text(), element_criteria=ElementSearchCriteria(doc_ids=['doc2']))
+
+        results = db.execute_structured_search(StructuredSearchQuery(criteria_group=group))
+
+        assert {result['element_id'] for result in results} == {'doc2_p0', 'doc2_p1'}
+        assert results[0]['element_id'] == 'doc2_p0'
+
+    def test_not_group(self, db):
+        group = SearchCriteriaGroup(
+            operator=LogicalOperator.NOT,
+            element_criteria=ElementSearchCriteria(element_types=['paragraph']),
+            sub_groups=[SearchCriteriaGroup(element_criteria=ElementSearchCriteria(doc_ids=['doc1']))]
+        )
+
+        results = db.execute_structured_search(StructuredSearchQuery(criteria_group=group))
+
+        assert {result['element_id'] for result in results} == {'doc2_p0', 'doc2_p1'}
+
+    def test_explain_analyze(self, db):
+        group = SearchCriteriaGroup(text_criteria=_text(), element_criteria=ElementSearchCriteria(doc_ids=['doc2']))
+        query = StructuredSearchQuery(criteria_group=group, limit=1)
+
+        plan = db.explain_structured_search(query)
+        analyzed = db.explain_structured_search(query, analyze=True)
+
+        assert plan.splitlines()[0] == 'AND (early stop at 1)'
+        assert '1. element' in plan and '2. text' in plan and 'pushdown' in plan
+        assert 'rows=2' in analyzed and 'in=2' in analyzed
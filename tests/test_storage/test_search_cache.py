@@ -0,0 +1,193 @@
+"""
+Tests for the query embedding, search result and topic statistics caches.
+"""
+
+import os
+import tempfile
+import time
+
+import pytest
+
+from go_doc_go.storage.file import FileDocumentDatabase
+from go_doc_go.storage.search_cache import QueryEmbeddingCache, SearchResultCache, TopicStatisticsCache
+from go_doc_go.storage.sqlite import SQLiteDocumentDatabase
+
+
+class CountingGenerator:
+    """Embedding generator that counts calls."""
+
+    def __init__(self, model='test-model'):
+        self.model = model
+        self.calls = 0
+
+    def generate(self, text):
+        self.calls += 1
+        return [float(len(text)), 1.0, 0.0]
+
+    def get_model_name(self):
+        return self.model
+
+
+def _document(doc_id, count=2):
+    document = {'doc_id': doc_id, 'doc_type': 'test', 'source': f'{doc_id}.txt', 'metadata': {}}
+    elements = [
+        {'element_id': f'{doc_id}_p{i}', 'doc_id': doc_id, 'element_type': 'paragraph', 'parent_id': None,
+         'content_preview': f'Paragraph {i}', 'content_location': '{}', 'content_hash': ''}
+        for i in range(count)
+    ]
+    return document, elements, []
+
+
+@pytest.fixture(params=['sqlite', 'files'])
+def db(request):
+    if request.param == 'sqlite':
+        database = SQLiteDocumentDatabase(os.path.join(tempfile.mkdtemp(), 'test.db'))
+    else:
+        database = FileDocumentDatabase({'storage_path': tempfile.mkdtemp(), 'storage_mode': request.param})
+    database.initialize()
+    yield database
+    database.close()
+
+
+class TestQueryEmbeddingCache:
+    """Test the LRU+TTL query embedding cache."""
+
+    def test_repeated_query_is_generated_once(self):
+        cache = QueryEmbeddingCache(max_entries=10, ttl=None)
+        generator = CountingGenerator()
+
+        first = cache.get_or_generate(generator, 'revenue growth')
+        second = cache.get_or_generate(generator, 'revenue growth')
+
+        assert first == second
+        assert generator.calls == 1
+        assert cache.get_statistics()['hits'] == 1
+
+    def test_callers_cannot_modify_cached_embedding(self):
+        cache = QueryEmbeddingCache(max_entries=10, ttl=None)
+        generator = CountingGenerator()
+
+        first = cache.get_or_generate(generator, 'query')
+        first[0] = 99.0
+
+        assert cache.get_or_generate(generator, 'query') == [5.0, 1.0, 0.0]
+
+    def test_keyed_by_model(self):
+        cache = QueryEmbeddingCache(max_entries=10, ttl=None)
+        small, large = CountingGenerator('small'), CountingGenerator('large')
+
+        cache.get_or_generate(small, 'query')
+        cache.get_or_generate(large, 'query')
+
+        assert small.calls == 1 and large.calls == 1
+
+    def test_lru_eviction(self):
+        cache = QueryEmbeddingCache(max_entries=2, ttl=None)
+        generator = CountingGenerator()
+
+        for text in ['a', 'b', 'a', 'c', 'a', 'b']:
+            cache.get_or_generate(generator, text)
+
+        # 'b' was the least recently used entry when 'c' was added
+        assert generator.calls == 4
+        assert cache.get_statistics()['entries'] == 2
+
+    def test_ttl_expiry(self):
+        cache = QueryEmbeddingCache(max_entries=10, ttl=0.01)
+        generator = CountingGenerator()
+
+        cache.get_or_generate(generator, 'query')
+        time.sleep(0.02)
+        cache.get_or_generate(generator, 'query')
+
+        assert generator.calls == 2
+
+
+class TestSearchResultCache:
+    """Test the search result cache keys."""
+
+    def test_disabled_by_default(self):
+        cache = SearchResultCache()
+        cache.set('key', 'value')
+
+        assert not cache.enabled
+        assert cache.get('key') is None
+
+    def test_key_ignores_filter_order(self):
+        first = SearchResultCache.make_key(1, query='q', filter_criteria={'a': 1, 'b': 2})
+        second = SearchResultCache.make_key(1, query='q', filter_criteria={'b': 2, 'a': 1})
+
+        assert first == second
+
+    def test_key_includes_generation(self):
+        assert SearchResultCache.make_key(1, query='q') != SearchResultCache.make_key(2, query='q')
+
+
+class TestTopicStatisticsCache:
+    """Test incremental topic statistics."""
+
+    def test_only_changed_documents_are_reloaded(self):
+        rows = {'doc1': [('doc1', 'finance', 2, 1.5)], 'doc2': [('doc2', 'finance', 1, 1.0)]}
+        loaded = []
+
+        def load_rows(doc_ids):
+            loaded.append(doc_ids)
+            selected = rows if doc_ids is None else {doc_id: rows.get(doc_id, []) for doc_id in doc_ids}
+            return [row for doc_rows in selected.values() for row in doc_rows]
+
+        cache = TopicStatisticsCache()
+        assert cache.get(load_rows, lambda pks: [])['finance'] == {
+            'embedding_count': 3, 'document_count': 2, 'avg_embedding_confidence': 2.5 / 3
+        }
+
+        del rows['doc1']
+        cache.mark_documents(['doc1'])
+        statistics = cache.get(load_rows, lambda pks: [])
+
+        assert loaded == [None, ['doc1']]
+        assert statistics['finance'] == {
+            'embedding_count': 1, 'document_count': 1, 'avg_embedding_confidence': 1.0
+        }
+
+
+class TestStoreGeneration:
+    """Test store generation and topic statistics maintenance in the backends."""
+
+    def test_writes_change_generation(self, db):
+        generation = db.store_generation
+
+        db.store_document(*_document('doc1'))
+        after_store = db.store_generation
+        db.store_embedding(db.get_element('doc1_p0')['element_pk'], [1.0, 0.0, 0.0])
+        after_embedding = db.store_generation
+        db.delete_document('doc1')
+
+        assert len({generation, after_store, after_embedding, db.store_generation}) == 4
+
+    def test_topic_statistics_follow_writes(self, db):
+        db.store_document(*_document('doc1'))
+        db.store_document(*_document('doc2'))
+        for doc_id, topics in [('doc1', ['finance', 'risk']), ('doc2', ['finance'])]:
+            for element in db.get_document_elements(doc_id):
+                db.store_embedding_with_topics(element['element_pk'], [1.0, 0.0, 0.0], topics, 0.5)
+
+        statistics = db.get_topic_statistics()
+        assert statistics['finance']['embedding_count'] == 4
+        assert statistics['finance']['document_count'] == 2
+        assert statistics['risk']['embedding_count'] == 2
+
+        db.delete_document('doc1')
+        statistics = db.get_topic_statistics()
+
+        assert statistics['finance']['embedding_count'] == 2
+        assert statistics['finance']['document_count'] == 1
+        assert 'risk' not in statistics
+
+    def test_query_embeddings_are_cached(self, db):
+        generator = CountingGenerator(model=f'model-{id(db)}')
+        db.embedding_generator = generator
+
+        db.search_by_text('quarterly revenue')
+        db.search_by_text('quarterly revenue')
+
+        assert generator.calls == 1
@@ -0,0 +1,196 @@
+"""
+Tests for the SQLite FTS5 full-text index.
+"""
+
+import os
+import tempfile
+
+import pytest
+
+from go_doc_go.storage.sqlite import SQLiteDocumentDatabase
+from go_doc_go.storage.structured_search import (
+    SearchCapability, SearchCriteriaGroup, StructuredSearchQuery, TextSearchCriteria
+)
+
+
+class FixedGenerator:
+    """Embedding generator that embeds by keyword presence."""
+
+    def generate(self, text):
+        text = text.lower()
+        return [1.0 if 'revenue' in text else 0.0, 1.0 if 'risk' in text else 0.0, 0.1]
+
+    def get_model_name(self):
+        return 'fixed'
+
+
+PARAGRAPHS = {
+    'doc1': ['Quarterly revenue grew strongly', 'Operating costs were flat'],
+    'doc2': ['Revenue guidance was lowered', 'Currency risk increased'],
+}
+
+
+def _store(database, doc_id, full_content=None):
+    document = {'doc_id': doc_id, 'doc_type': 'test', 'source': f'{doc_id}.txt', 'metadata': {}}
+    elements = []
+    for i, text in enumerate(PARAGRAPHS[doc_id]):
+        element = {'element_id': f'{doc_id}_p{i}', 'doc_id': doc_id, 'element_type': 'paragraph',
+                   'parent_id': None, 'content_preview': text, 'content_location': '{}', 'content_hash': ''}
+        if full_content:
+            element['full_content'] = f'{text}. {full_content}'
+        elements.append(element)
+    database.store_document(document, elements, [])
+    return elements
+
+
+def _text_query(query_text, **options):
+    criteria = TextSearchCriteria(query_text=query_text, similarity_threshold=0.0, **options)
+    return StructuredSearchQuery(criteria_group=SearchCriteriaGroup(text_criteria=criteria))
+
+
+def _open(**conn_params):
+    database = SQLiteDocumentDatabase(os.path.join(tempfile.mkdtemp(), 'fts.db'), **conn_params)
+    database.initialize()
+    return database
+
+
+@pytest.fixture
+def db():
+    database = _open()
+    database.embedding_generator = FixedGenerator()
+    for doc_id in PARAGRAPHS:
+        for element in _store(database, doc_id):
+            database.store_embedding(element['element_pk'], FixedGenerator().generate(element['content_preview']))
+    yield database
+    database.close()
+
+
+class TestFullTextIndex:
+    """Test FTS5 maintenance and BM25 search."""
+
+    def test_capability_is_reported(self, db):
+        assert SearchCapability.FULL_TEXT_SEARCH in db.get_backend_capabilities().supported
+
+    def test_search_elements_by_content_is_ranked(self, db):
+        results = db.search_elements_by_content('revenue')
+
+        assert {element['element_id'] for element in results} == {'doc1_p0', 'doc2_p0'}
+        assert all(0.0 < element['search_rank'] <= 1.0 for element in results)
+        assert max(element['search_rank'] for element in results) == 1.0
+
+    def test_stemming(self, db):
+        assert [element['element_id'] for element in db.search_elements_by_content('increasing risks')] == ['doc2_p1']
+
+    def test_deleted_documents_leave_the_index(self, db):
+        db.delete_document('doc2')
+
+        assert [element['element_id'] for element in db.search_elements_by_content('revenue')] == ['doc1_p0']
+
+    def test_updated_documents_are_reindexed(self, db):
+        _store(db, 'doc1', full_content='Dividend announced')
+
+        assert [element['element_id'] for element in db.search_elements_by_content('dividend')] == \
+            ['doc1_p0', 'doc1_p1']
+
+    def test_structured_keyword_search(self, db):
+        results = db.execute_structured_search(_text_query('revenue', use_full_text_search=True))
+
+        assert {result['element_id'] for result in results} == {'doc1_p0', 'doc2_p0'}
+        assert all('full_text_rank' in result['scores'] for result in results)
+
+    def test_frequent_term_passes_default_threshold(self):
+        database = _open()
+        document = {'doc_id': 'many', 'doc_type': 'test', 'source': 'many.txt', 'metadata': {}}
+        elements = [{'element_id': f'many_p{i}', 'doc_id': 'many', 'element_type': 'paragraph',
+                     'parent_id': None, 'content_preview': f'alpha paragraph number {i}' + ' filler' * (i % 7),
+                     'content_location': '{}', 'content_hash': ''} for i in range(200)]
+        database.store_document(document, elements, [])
+
+        criteria = TextSearchCriteria(query_text='alpha', use_full_text_search=True)
+        query = StructuredSearchQuery(criteria_group=SearchCriteriaGroup(text_criteria=criteria), limit=500)
+        results = database.execute_structured_search(query)
+
+        assert len(results) == 200
+        database.close()
+
+    def test_keyword_prefilter_restricts_semantic_search(self, db):
+        results = db.execute_structured_search(_text_query('revenue lowered', full_text_prefilter=True))
+
+        assert {result['element_id'] for result in results} == {'doc1_p0', 'doc2_p0'}
+        assert all({'text_similarity', 'full_text_rank'} <= set(result['scores']) for result in results)
+
+
+class TestFullTextOptions:
+    """Test store_full_text and index_full_text handling."""
+
+    def test_full_text_is_stored_and_indexed(self):
+        database = _open()
+        _store(database, 'doc1', full_content='Dividend announced')
+
+        assert database.get_element('doc1_p0')['full_content'].endswith('Dividend announced')
+        assert len(database.search_elements_by_content('dividend')) == 2
+        database.close()
+
+    def test_index_only_full_text(self):
+        database = _open(store_full_text=False)
+        _store(database, 'doc1', full_content='Dividend announced')
+
+        assert database.get_element('doc1_p0')['full_content'] is None
+        assert len(database.search_elements_by_content('dividend')) == 2
+        database.close()
+
+    def test_index_only_full_text_survives_preview_update(self):
+        database = _open(store_full_text=False)
+        _store(database, 'doc1', full_content='Dividend announced')
+
+        database.conn.execute("UPDATE elements SET content_preview = 'Edited' WHERE element_id = 'doc1_p0'")
+        database.conn.commit()
+
+        assert len(database.search_elements_by_content('dividend')) == 2
+        assert [element['element_id'] for element in database.search_elements_by_content('edited')] == ['doc1_p0']
+        database.close()
+
+    def test_index_reads_text_from_elements(self):
+        database = _open()
+        _store(database, 'doc1')
+
+        sql = database.conn.execute("SELECT sql FROM sqlite_master WHERE name = 'element_fts'").fetchone()[0]
+        assert "content = 'elements'" in sql
+        database.conn.execute("UPDATE elements SET content_preview = 'Edited' WHERE element_id = 'doc1_p0'")
+        database.conn.commit()
+
+        assert [element['element_id'] for element in database.search_elements_by_content('quarterly')] == []
+        assert [element['element_id'] for element in database.search_elements_by_content('edited')] == ['doc1_p0']
+        database.close()
+
+    def test_layout_follows_storage_settings(self):
+        database = _open(store_full_text=False)
+        _store(database, 'doc1')
+        database.close()
+
+        database = SQLiteDocumentDatabase(database.db_path)
+        database.initialize()
+        sql = database.conn.execute("SELECT sql FROM sqlite_master WHERE name = 'element_fts'").fetchone()[0]
+        assert "content = 'elements'" in sql
+        assert len(database.search_elements_by_content('revenue')) == 1
+        database.close()
+
+    def test_store_only_full_text(self):
+        database = _open(index_full_text=False)
+        _store(database, 'doc1', full_content='Dividend announced')
+
+        assert database.get_element('doc1_p0')['full_content'] is not None
+        assert database.search_elements_by_content('dividend') == []
+        assert len(database.search_elements_by_content('revenue')) == 1
+        database.close()
+
+    def test_existing_database_is_indexed(self):
+        database = _open()
+        _store(database, 'doc1')
+        database.conn.execute("DROP TABLE element_fts")
+        database.conn.commit()
+        database.close()
+
+        database.initialize()
+        assert len(database.search_elements_by_content('revenue')) == 1
+        database.close()
@@ -0,0 +1,154 @@
+"""
+Tests for the SQLite read/write connection pool.
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+import pytest
+
+from go_doc_go.storage.sqlite import SQLiteDocumentDatabase
+
+
+def _document(doc_id):
+    document = {'doc_id': doc_id, 'doc_type': 'test', 'source': f'{doc_id}.txt', 'metadata': {}}
+    elements = [{'element_id': f'{doc_id}_p0', 'doc_id': doc_id, 'element_type': 'paragraph', 'parent_id': None,
+                 'content_preview': 'Paragraph', 'content_location': '{}', 'content_hash': ''}]
+    return document, elements, []
+
+
+def _run_in_thread(target):
+    """Run target in a new thread and return its result, re-raising its exception."""
+    outcome = {}
+
+    def run():
+        try:
+            outcome['result'] = target()
+        except Exception as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome['result']
+
+
+@pytest.fixture
+def db():
+    database = SQLiteDocumentDatabase(os.path.join(tempfile.mkdtemp(), 'pool.db'), read_pool_size=2)
+    database.initialize()
+    yield database
+    database.close()
+
+
+class TestSQLiteConnectionPool:
+    """Test connection routing between the writer and read-only connections."""
+
+    def test_other_threads_read_through_read_only_connections(self, db):
+        db.store_document(*_document('doc1'))
+
+        def read():
+            conn = db.conn
+            assert conn is not db._pool.writer
+            assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+            return db.get_document('doc1')['doc_id']
+
+        assert _run_in_thread(read) == 'doc1'
+
+    def test_other_threads_write_through_writer(self, db):
+        _run_in_thread(lambda: db.store_document(*_document('doc1')))
+
+        assert db.get_document('doc1') is not None
+        assert db.get_connection_statistics()['write_acquisitions'] >= 1
+
+    def test_reads_do_not_wait_for_writer(self, db):
+        db.store_document(*_document('doc1'))
+        read_done = threading.Event()
+
+        with db._pool.writing():
+            # A write is in progress on this thread; another thread can still read
+            _run_in_thread(lambda: read_done.set() if db.get_document('doc1') else None)
+
+        assert read_done.is_set()
+
+    def test_owner_reads_wait_for_open_write(self, db):
+        writing = threading.Event()
+
+        def uncommitted_write():
+            with db._pool.writing() as conn:
+                conn.execute("INSERT INTO documents (doc_id, source) VALUES ('doc1', 'doc1.txt')")
+                writing.set()
+                time.sleep(0.1)
+                conn.rollback()
+
+        writer = threading.Thread(target=uncommitted_write)
+        writer.start()
+        writing.wait(5)
+
+        # The owner thread reads through the writer, after the write is rolled back
+        assert db.get_document('doc1') is None
+        writer.join()
+
+    def test_connections_return_to_pool(self, db):
+        for _ in range(5):
+            _run_in_thread(lambda: db.get_document('missing'))
+
+        statistics = db.get_connection_statistics()
+        assert statistics['read_checkouts'] == 5
+        assert statistics['readers_open'] <= 2
+        assert statistics['readers_idle'] == statistics['readers_open']
+
+    def test_release_connection(self, db):
+        def read_and_release():
+            db.get_document('missing')
+            db.release_connection()
+            return db.get_connection_statistics()['readers_idle']
+
+        assert _run_in_thread(read_and_release) == 1
+
+    def test_reads_return_connection_while_thread_lives(self, db):
+        # Long-lived threads (e.g. worker pools) do not keep a read connection between calls
+        def read_twice():
+            db.get_document('missing')
+            db.get_document_elements('missing')
+            return db.get_connection_statistics()
+
+        statistics = _run_in_thread(read_twice)
+        assert statistics['read_checkouts'] == 2
+        assert statistics['readers_idle'] == statistics['readers_open'] == 1
+
+    def test_waits_are_recorded_when_pool_is_exhausted(self):
+        database = SQLiteDocumentDatabase(os.path.join(tempfile.mkdtemp(), 'pool.db'), read_pool_size=1)
+        database.initialize()
+        holding = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with database._pool.reading():
+                holding.set()
+                release.wait(5)
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        holding.wait(5)
+        waiter = threading.Thread(target=lambda: database.get_document('missing'))
+        waiter.start()
+        threading.Timer(0.05, release.set).start()
+        holder.join()
+        waiter.join()
+
+        statistics = database.get_connection_statistics()
+        database.close()
+        assert statistics['read_waits'] == 1
+        assert statistics['read_max_wait_seconds'] > 0
+
+    def test_disabled_pool_shares_writer(self):
+        database = SQLiteDocumentDatabase(os.path.join(tempfile.mkdtemp(), 'pool.db'), read_pool_size=0)
+        database.initialize()
+
+        assert _run_in_thread(lambda: database.conn) is database._pool.writer
+        database.close()
@@ -0,0 +1,129 @@
+"""
+Tests for the sqlite-vec backed vector index in the SQLite backend.
+"""
+
+import os
+import tempfile
+
+import pytest
+
+import go_doc_go.storage.sqlite as sqlite_module
+from go_doc_go.storage.sqlite import SQLiteDocumentDatabase, VECTOR_INDEX_TABLE
+
+sqlean = pytest.importorskip("sqlean")
+sqlite_vec = pytest.importorskip("sqlite_vec")
+
+
+def _document(doc_id, element_types):
+    """Build a document with one element per entry in element_types."""
+    document = {
+        'doc_id': doc_id,
+        'doc_type': 'test',
+        'source': f'{doc_id}.txt',
+        'metadata': {},
+    }
+    elements = [
+        {
+            'element_id': f'{doc_id}_el_{i}',
+            'doc_id': doc_id,
+            'element_type': element_type,
+            'content_preview': f'{doc_id} element {i}',
+        }
+        for i, element_type in enumerate(element_types)
+    ]
+    return document, elements
+
+
+class TestSQLiteVectorIndex:
+    """Test the vec0 index path of SQLiteDocumentDatabase."""
+
+    @pytest.fixture
+    def temp_db_path(self):
+        """Create a temporary database path."""
+        temp_dir = tempfile.mkdtemp()
+        yield os.path.join(temp_dir, 'vectors.db')
+
+    @pytest.fixture
+    def db(self, temp_db_path, monkeypatch):
+        """Database with sqlite-vec loaded through sqlean."""
+        monkeypatch.setattr(sqlite_module, "sqlite3", sqlean)
+        monkeypatch.setattr(sqlite_module, "sqlite_vec", sqlite_vec, raising=False)
+        monkeypatch.setattr(sqlite_module, "SQLITE_VEC_AVAILABLE", True)
+
+        database = SQLiteDocumentDatabase(temp_db_path)
+        database.vector_dimension = 3
+        database.initialize()
+        assert database.vector_extension == "vec0"
+        assert database.vector_index_dimension == 3
+        yield database
+        database.close()
+
+    def _store(self, db, doc_id, element_types, vectors):
+        document, elements = _document(doc_id, element_types)
+        db.store_document(document, elements, [])
+        for element, vector in zip(elements, vectors):
+            db.store_embedding(element['element_pk'], vector)
+        return [element['element_pk'] for element in elements]
+
+    def _indexed_pks(self, db):
+        return {row[0] for row in db.conn.execute(f"SELECT element_pk FROM {VECTOR_INDEX_TABLE}")}
+
+    def test_index_tracks_store_and_delete(self, db):
+        """Embeddings written or deleted through the normal API are mirrored in the index."""
+        pks = self._store(db, 'doc1', ['paragraph', 'header'], [[1, 0, 0], [0, 1, 0]])
+        assert self._indexed_pks(db) == set(pks)
+
+        # Replacing an embedding keeps a single index row
+        db.store_embedding(pks[0], [0, 0, 1])
+        assert self._indexed_pks(db) == set(pks)
+
+        db.delete_document('doc1')
+        assert self._indexed_pks(db) == set()
+
+    def test_search_matches_similarity_function(self, db):
+        """KNN results agree with the Python similarity scan."""
+        self._store(db, 'doc1', ['paragraph', 'header', 'paragraph'],
+                    [[1, 0, 0], [0.9, 0.1, 0], [0, 1, 0]])
+        self._store(db, 'doc2', ['paragraph', 'table'], [[0.7, 0.7, 0], [0, 0, 1]])
+
+        query = [1, 0.2, 0]
+        indexed = db.search_by_embedding(query, limit=3)
+        scanned = db._search_by_similarity_function(query, limit=3)
+
+        assert [pk for pk, _ in indexed] == [pk for pk, _ in scanned]
+        for (_, a), (_, b) in zip(indexed, scanned):
+            assert a == pytest.approx(b, abs=1e-5)
+
+    def test_filters_are_pushed_down(self, db):
+        """element_type, doc_id, exclude_doc_id and element_pk_list filters apply in the index."""
+        doc1_pks = self._store(db, 'doc1', ['paragraph', 'header'], [[1, 0, 0], [1, 0.1, 0]])
+        doc2_pks = self._store(db, 'doc2', ['paragraph', 'table'], [[1, 0.2, 0], [1, 0.3, 0]])
+        query = [1, 0, 0]
+
+        results = db.search_by_embedding(query, limit=10, filter_criteria={'element_type': ['paragraph']})
+        assert {pk for pk, _ in results} == {doc1_pks[0], doc2_pks[0]}
+
+        results = db.search_by_embedding(query, limit=10, filter_criteria={'doc_id': ['doc2']})
+        assert {pk for pk, _ in results} == set(doc2_pks)
+
+        results = db.search_by_embedding(query, limit=10, filter_criteria={'exclude_doc_id': ['doc1']})
+        assert {pk for pk, _ in results} == set(doc2_pks)
+
+        results = db.search_by_embedding(query, limit=10,
+                                         filter_criteria={'element_pk_list': [doc1_pks[1], doc2_pks[1]]})
+        assert {pk for pk, _ in results} == {doc1_pks[1], doc2_pks[1]}
+
+    def test_index_rebuilt_when_out_of_sync(self, db, temp_db_path):
+        """Embeddings written while the index was unavailable are picked up on the next initialize."""
+        pks = self._store(db, 'doc1', ['paragraph'], [[1, 0, 0]])
+        db.conn.execute(f"DELETE FROM {VECTOR_INDEX_TABLE}")
+        db.conn.commit()
+        db.close()
+
+        reopened = SQLiteDocumentDatabase(temp_db_path)
+        reopened.vector_dimension = 3
+        reopened.initialize()
+        try:
+            assert self._indexed_pks(reopened) == set(pks)
+        finally:
+            reopened.close()
@@ -0,0 +1,231 @@
+"""
+Tests for the batched store_document_batch write path.
+"""
+
+import os
+import tempfile
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from go_doc_go.storage.file import FileDocumentDatabase
+from go_doc_go.storage import sqlalchemy_
+from go_doc_go.storage.sqlalchemy_ import SQLAlchemyDocumentDatabase, SQLALCHEMY_AVAILABLE
+from go_doc_go.storage.sqlite import SQLiteDocumentDatabase
+
+
+def _document(doc_id, count):
+    document = {'doc_id': doc_id, 'doc_type': 'test', 'source': f'{doc_id}.txt', 'metadata': {'pages': 1}}
+    elements = [
+        {
+            'element_id': f'{doc_id}_el_{i}',
+            'doc_id': doc_id,
+            'element_type': 'paragraph',
+            'parent_id': f'{doc_id}_el_0' if i else None,
+            'content_preview': f'element {i}',
+            'metadata': {'index': i},
+        }
+        for i in range(count)
+    ]
+    relationships = [
+        {
+            'relationship_id': f'{doc_id}_rel_{i}',
+            'source_id': f'{doc_id}_el_0',
+            'relationship_type': 'contains',
+            'target_reference': f'{doc_id}_el_{i}',
+        }
+        for i in range(1, count)
+    ]
+    return document, elements, relationships
+
+
+def _embed(elements):
+    return {element['element_pk']: [1.0, float(i)] for i, element in enumerate(elements)}
+
+
+class TestSQLiteStoreDocumentBatch:
+    """Test the single-transaction SQLite implementation."""
+
+    @pytest.fixture
+    def db(self):
+        database = SQLiteDocumentDatabase(os.path.join(tempfile.mkdtemp(), 'batch.db'))
+        database.initialize()
+        yield database
+        database.close()
+
+    def test_writes_everything(self, db):
+        db.store_document(*_document('doc0', 2))
+        document, elements, relationships = _document('doc1', 4)
+        dates = {'doc1_el_1': [{'original_text': 'May 2020', 'year': 2020, 'month': 5}]}
+
+        seen = []
+
+        def embed(batch):
+            # The writer is free while embedding: another thread stores a document meanwhile
+            writer = threading.Thread(target=db.store_document, args=_document('doc3', 1))
+            writer.start()
+            writer.join(10)
+            assert not writer.is_alive()
+            assert db.get_element(batch[0]['element_id']) is None
+            seen.extend(element['element_pk'] for element in batch)
+            return _embed(batch)
+
+        embeddings = db.store_document_batch(document, elements, relationships, dates,
+                                             embedding_fn=embed, topics=['topic.a'], confidence=0.8)
+
+        pks = [element['element_pk'] for element in elements]
+        assert pks == list(range(pks[0], pks[0] + 4))
+        assert pks[0] > max(e['element_pk'] for e in db.get_document_elements('doc0'))
+        assert db.get_document_elements('doc3')[0]['element_pk'] == pks[-1] + 1
+        assert seen == pks
+        assert set(embeddings) == set(pks)
+
+        assert db.get_document('doc1')['metadata'] == {'pages': 1}
+        assert [e['element_id'] for e in db.get_document_elements('doc1')] == [e['element_id'] for e in elements]
+        assert len(db.get_document_relationships('doc1')) == 3
+        assert db.get_element_dates('doc1_el_1')[0]['year'] == 2020
+        assert db.get_embedding(pks[2]) == [1.0, 2.0]
+        assert db.get_embedding_topics(pks[2]) == ['topic.a']
+        assert db.get_last_processed_info('doc1.txt') is not None
+
+        # The sequence moves past the reserved range
+        _, more, _ = _document('doc2', 1)
+        db.store_document({'doc_id': 'doc2', 'source': 'doc2.txt', 'metadata': {}}, more, [])
+        assert more[0]['element_pk'] == pks[-1] + 2
+
+    def test_rolls_back_on_failure(self, db):
+        document, elements, relationships = _document('doc1', 3)
+
+        def fail(batch):
+            raise RuntimeError("embedding service unavailable")
+
+        with pytest.raises(RuntimeError):
+            db.store_document_batch(document, elements, relationships, embedding_fn=fail)
+
+        assert db.get_document('doc1') is None
+        assert db.get_document_elements('doc1') == []
+        assert all('element_pk' not in element for element in elements)
+
+    def test_existing_source_is_updated(self, db):
+        document, elements, relationships = _document('doc1', 3)
+        dates = {'doc1_el_2': [{'original_text': 'May 2020', 'year': 2020, 'month': 5}]}
+        db.store_document_batch(document, elements, relationships, dates, embedding_fn=_embed)
+        old_pks = [element['element_pk'] for element in elements]
+
+        document, elements, relationships = _document('doc1', 2)
+        document['doc_id'] = 'doc1_v2'
+        with patch.object(db, 'update_document', side_effect=AssertionError("per-record path used")), \
+                patch.object(db, 'store_document', side_effect=AssertionError("per-record path used")):
+            embeddings = db.store_document_batch(document, elements, relationships, embedding_fn=_embed)
+
+        pks = [element['element_pk'] for element in elements]
+        assert document['doc_id'] == 'doc1'
+        assert db.get_document('doc1_v2') is None
+        assert [e['element_pk'] for e in db.get_document_elements('doc1')] == pks
+        assert set(embeddings) == set(pks)
+        assert len(db.get_document_relationships('doc1')) == 1
+        for table in ('elements', 'embeddings', 'element_dates'):
+            placeholders = ','.join('?' * len(old_pks))
+            cursor = db.conn.execute(f"SELECT COUNT(*) FROM {table} WHERE element_pk IN ({placeholders})", old_pks)
+            assert cursor.fetchone()[0] == 0
+        cursor = db.conn.execute("SELECT COUNT(*) FROM relationships WHERE relationship_id = 'doc1_rel_2'")
+        assert cursor.fetchone()[0] == 0
+
+
+    def test_source_stored_while_embedding_is_updated(self, db):
+        document, elements, relationships = _document('doc1', 3)
+
+        def embed(batch):
+            # Another writer stores the same source before this one writes
+            writer = threading.Thread(target=db.store_document, args=_document('doc1', 2))
+            writer.start()
+            writer.join(10)
+            return _embed(batch)
+
+        embeddings = db.store_document_batch(document, elements, relationships, embedding_fn=embed)
+
+        pks = [element['element_pk'] for element in elements]
+        assert [e['element_pk'] for e in db.get_document_elements('doc1')] == pks
+        assert set(embeddings) == set(pks)
+        assert db.get_embedding(pks[2]) == [1.0, 2.0]
+
+
+class TestDefaultStoreDocumentBatch:
+    """Test the per-record fallback in the base class."""
+
+    def test_file_backend(self):
+        db = FileDocumentDatabase({'storage_path': tempfile.mkdtemp()})
+        db.initialize()
+        document, elements, relationships = _document('doc1', 3)
+        dates = {'doc1_el_0': [{'original_text': 'today'}]}
+
+        embeddings = db.store_document_batch(document, elements, relationships, dates,
+                                             embedding_fn=_embed, topics=['topic.a'])
+
+        assert len(embeddings) == 3
+        assert db.get_element_dates('doc1_el_0') == [{'original_text': 'today'}]
+        assert db.get_embedding_topics(elements[1]['element_pk']) == ['topic.a']
+
+
+@pytest.mark.skipif(not SQLALCHEMY_AVAILABLE, reason="SQLAlchemy not installed")
+class TestSQLAlchemyStoreDocumentBatch:
+    """Test the bulk SQLAlchemy implementation against SQLite."""
+
+    def test_writes_everything(self):
+        db = SQLAlchemyDocumentDatabase('sqlite:///' + os.path.join(tempfile.mkdtemp(), 'batch.db'))
+        db.initialize()
+        document, elements, relationships = _document('doc1', 3)
+        dates = {'doc1_el_1': [{'timestamp': 1.0, 'date_text': 'yesterday'}]}
+
+        embeddings = db.store_document_batch(document, elements, relationships, dates,
+                                             embedding_fn=_embed, topics=['topic.a'])
+
+        pks = [element['element_pk'] for element in elements]
+        assert len(set(pks)) == 3 and None not in pks
+        assert set(embeddings) == set(pks)
+        assert db.get_embedding(pks[1]) == pytest.approx([1.0, 1.0])
+        assert db.get_element_dates('doc1_el_1')[0]['date_text'] == 'yesterday'
+        assert len(db.get_document_relationships('doc1')) == 2
+        db.close()
+
+    def test_existing_source_is_replaced(self):
+        db = SQLAlchemyDocumentDatabase('sqlite:///' + os.path.join(tempfile.mkdtemp(), 'batch.db'))
+        db.initialize()
+        document, elements, relationships = _document('doc1', 3)
+        db.store_document_batch(document, elements, relationships, embedding_fn=_embed)
+        old_pks = [element['element_pk'] for element in elements]
+
+        document, elements, relationships = _document('doc1', 2)
+        document['doc_id'] = 'doc1_v2'
+        with patch.object(db, 'update_document', side_effect=AssertionError("per-record path used")):
+            embeddings = db.store_document_batch(document, elements, relationships, embedding_fn=_embed)
+
+        pks = [element['element_pk'] for element in elements]
+        assert document['doc_id'] == 'doc1'
+        assert db.get_document('doc1_v2') is None
+        assert sorted(e['element_pk'] for e in db.get_document_elements('doc1')) == sorted(pks)
+        assert set(embeddings) == set(pks)
+        assert len(db.get_document_relationships('doc1')) == 1
+        assert all(db.get_embedding(pk) is None for pk in old_pks if pk not in pks)
+        db.close()
+
+    def test_pgvector_update_binds_both_parameters(self):
+        from sqlalchemy import text
+
+        assert set(text(sqlalchemy_.PGVECTOR_UPDATE_SQL)._bindparams) == {'embedding', 'pk'}
+
+    def test_failed_vector_column_update_keeps_document(self, monkeypatch):
+        db = SQLAlchemyDocumentDatabase('sqlite:///' + os.path.join(tempfile.mkdtemp(), 'batch.db'))
+        db.initialize()
+        # SQLite has no vector_embedding column, so the pgvector step fails
+        monkeypatch.setattr(sqlalchemy_, 'PGVECTOR_AVAILABLE', True)
+        db._vector_extension = 'pgvector'
+        db.db_uri = 'postgresql://unused'
+        document, elements, relationships = _document('doc1', 2)
+
+        embeddings = db.store_document_batch(document, elements, relationships, embedding_fn=_embed)
+
+        assert len(db.get_document_elements('doc1')) == 2
+        assert db.get_embedding(elements[1]['element_pk']) == pytest.approx(embeddings[elements[1]['element_pk']])
+        db.close()